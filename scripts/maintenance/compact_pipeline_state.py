@@ -74,6 +74,10 @@ record that survives compaction is byte-identical, and record ORDER is preserved
 which is what makes `_latest_state_from_lines` (last-match-wins) still return the
 same state afterwards.
 
+Sealed segments (`<stem>.seg-NNNNNN.jsonl`) written by `pipeline_journal`'s
+rollover are compacted by the journal itself; this tool only rewrites the active
+file, and removes the journal's `.idx` sidecar so it is rebuilt on next use.
+
 Usage (run on the zoe-data host):
     python3 scripts/maintenance/compact_pipeline_state.py             # dry-run
     python3 scripts/maintenance/compact_pipeline_state.py --execute   # apply
@@ -316,6 +320,10 @@ def compact(
                     shutil.copyfileobj(tmp, handle, _COPY_CHUNK)
                 handle.truncate(kept_bytes)
                 _fsync(handle)
+                # pipeline_journal's sidecar index holds byte offsets into the
+                # file just rewritten; drop it (still under LOCK_EX) so the next
+                # reader rebuilds instead of seeking into moved records.
+                path.with_name(path.name + ".idx").unlink(missing_ok=True)
             finally:
                 tmp_path.unlink(missing_ok=True)
 
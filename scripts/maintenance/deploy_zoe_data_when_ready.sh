@@ -273,8 +273,9 @@ check_gates() {
 
 main_schedules_moonshine_startup() {
     # This verify intentionally assumes the current startup warmup idiom:
-    # scheduling the warm task via asyncio.create_task/ensure_future.
-    grep -Eq "(create_task|ensure_future)[(][^)]*warm_moonshine"
+    # scheduling the warm task via asyncio.create_task/ensure_future, or
+    # queueing it on the staged startup_profile.WarmupScheduler (warmups.add).
+    grep -Eq "(create_task|ensure_future|warmups[.]add)[(][^)]*warm_moonshine"
 }
 
 main_schedules_whisper_startup() {
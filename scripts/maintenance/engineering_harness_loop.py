@@ -248,7 +248,12 @@ def monitor_pipeline(*, task_ref_prefix: str | None, seconds: int = 90) -> dict[
         if not path.is_file():
             continue
         size = path.stat().st_size
-        if size <= start_size:
+        if size < start_size:
+            # Rolled over into a sealed segment (or compacted) in place: the
+            # file now ends with older records, so resume from its new end.
+            start_size = size
+            continue
+        if size == start_size:
             continue
         with path.open("r", encoding="utf-8") as handle:
             handle.seek(start_size)
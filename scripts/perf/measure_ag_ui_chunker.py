@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""AG-UI chunker probe — per-character batching vs index slicing on long replies.
+
+``ag_ui_stream.iter_text_message_chunks`` used to grow its buffer one character
+at a time with a ``time.monotonic()`` call per character, and
+``AgRunRecorder.emit`` parsed every encoded SSE block back with ``json.loads``
+to record it. The chunker now slices chunks by index (one ``str.find`` for the
+newline rule, one clock read per chunk) and the recorder keeps the event's
+dict and frames the line from it. This probe streams ``--replies`` synthetic
+replies of ``--kb`` KB each (prose with occasional newlines) through:
+
+  * **legacy** — the old loop and recorder, inlined here.
+  * **sliced** — ``iter_text_message_chunks`` + ``AgRunRecorder`` as shipped.
+
+for both the chat defaults (``min_chars=240``) and the OpenClaw batching
+(``min_chars=72``), and reports per-reply milliseconds (p50/p95), MB/s and
+the chunk count. The two paths must produce the same deltas; a mismatch is an
+error.
+
+SAFETY: in-process only; no server, no DB.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_ag_ui_chunker.py
+    ZOE_PERF=1 python3 scripts/perf/measure_ag_ui_chunker.py --kb 50 --replies 40 --json /tmp/agui.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+_WORDS = ("the kitchen lights are on and the thermostat is set to twenty one degrees "
+          "tomorrow looks sunny with a light breeze from the west").split()
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def _reply(rng: random.Random, size: int) -> str:
+    parts: list[str] = []
+    total = 0
+    while total < size:
+        word = rng.choice(_WORDS)
+        sep = "\n" if rng.random() < 0.03 else " "
+        parts.append(word + sep)
+        total += len(word) + 1
+    return "".join(parts)[:size]
+
+
+async def _legacy(enc, core, text: str, min_chars: int, max_interval_s: float) -> list[dict]:
+    events: list[dict] = []
+
+    def emit(event) -> str:
+        block = enc.encode(event)
+        line = block.strip()
+        if line.startswith("data: "):
+            events.append(json.loads(line[6:]))
+        return block
+
+    buf = ""
+    last_flush = time.monotonic()
+    last_idx = len(text) - 1
+    for idx, ch in enumerate(text):
+        buf += ch
+        now = time.monotonic()
+        newline_flush = ch == "\n" and len(buf) >= 48
+        if buf and (len(buf) >= min_chars or newline_flush
+                    or (now - last_flush) >= max_interval_s or idx == last_idx):
+            emit(core.TextMessageChunkEvent(type=core.EventType.TEXT_MESSAGE_CHUNK,
+                                            message_id="m1", role="assistant", delta=buf))
+            buf = ""
+            last_flush = now
+        if idx % 500 == 0:
+            await asyncio.sleep(0)
+    return events
+
+
+async def _sliced(ag_ui_stream, enc, text: str, min_chars: int, max_interval_s: float) -> list[dict]:
+    rec = ag_ui_stream.AgRunRecorder()
+    async for _ in ag_ui_stream.iter_text_message_chunks(
+            enc, rec, "m1", text, min_chars=min_chars, max_interval_s=max_interval_s):
+        pass
+    return rec.events
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import ag_ui.core as core
+    from ag_ui.encoder import EventEncoder
+
+    import ag_ui_stream
+
+    rng = random.Random(args.seed)
+    replies = [_reply(rng, args.kb * 1024) for _ in range(args.replies)]
+    enc = EventEncoder()
+    report: dict = {"kind": "ag_ui_chunker", "kb": args.kb, "replies": args.replies, "profiles": {}}
+
+    for label, min_chars, interval in (("chat", 240, 0.15), ("openclaw", 72, 0.06)):
+        prof: dict = {"min_chars": min_chars}
+        for mode in ("legacy", "sliced"):
+            times, chunks = [], 0
+            for text in replies:
+                t0 = time.perf_counter()
+                if mode == "legacy":
+                    events = await _legacy(enc, core, text, min_chars, interval)
+                else:
+                    events = await _sliced(ag_ui_stream, enc, text, min_chars, interval)
+                times.append((time.perf_counter() - t0) * 1000.0)
+                chunks += len(events)
+                if "".join(e["delta"] for e in events) != text:
+                    print(f"{label}/{mode}: deltas do not reassemble the reply", file=sys.stderr)
+                    return 1
+            mb = args.kb * args.replies / 1024.0
+            prof[mode] = {"reply_ms": _stats(times), "mb_per_s": round(mb / (sum(times) / 1000.0), 2),
+                          "chunks_per_reply": round(chunks / args.replies, 1)}
+        report["profiles"][label] = prof
+        print(f"{label} (min_chars={min_chars})")
+        for mode in ("legacy", "sliced"):
+            r = prof[mode]
+            print(f"  {mode:>7}: {r['mb_per_s']:>8} MB/s  {r['chunks_per_reply']} chunks/reply  {r['reply_ms']}")
+        print(f"  reply p50 ×{prof['legacy']['reply_ms']['p50'] / max(prof['sliced']['reply_ms']['p50'], 0.001):.1f}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--kb", type=int, default=50, help="size of each synthetic reply")
+    ap.add_argument("--replies", type=int, default=20, help="replies per mode")
+    ap.add_argument("--seed", type=int, default=7, help="text generator seed")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping AG-UI chunker probe (set ZOE_PERF=1 to run).")
+        return 0
+    return asyncio.run(_measure(str(resolve_service_dir(args.service_dir)), args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""db_pool SQL-translation probe — per-call rewrite vs the cached plan.
+
+Every ``AsyncpgCompat.execute`` translates its SQL (``?`` → ``$N``, SQLite
+``datetime('now', …)`` / bare ``NOW()`` rewrites) and classifies it as a
+fetch or an execute. The text is almost always a static literal, so
+``db_pool._translate_sql`` caches the plan per SQL string. This probe pulls the
+``--top`` most-used SQL literals out of ``routers/`` (string constants passed
+to ``execute`` / ``execute_fetchall`` / ``fetch`` / ``fetchrow`` / ``fetchval``)
+and reports per-statement p50/p95 in microseconds for:
+
+  * **uncached** — ``_translate_sql.__wrapped__``: the full rewrite + classify.
+  * **cached** — ``_translate_sql``: what every call after the first pays.
+
+Statements are replayed ``--rounds`` times in a shuffled order. The cache's
+hit/miss counters are reported alongside.
+
+SAFETY: pure CPU; no database connection is opened.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_db_translation.py
+    ZOE_PERF=1 python3 scripts/perf/measure_db_translation.py --top 50 --rounds 2000 --json /tmp/sql.json
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+_SQL_CALLS = {"execute", "execute_fetchall", "fetch", "fetchrow", "fetchval"}
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def _router_sql(routers: Path) -> Counter:
+    found: Counter = Counter()
+    for path in sorted(routers.glob("*.py")):
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in _SQL_CALLS
+                and node.args
+                and isinstance(node.args[0], ast.Constant)
+                and isinstance(node.args[0].value, str)
+            ):
+                found[node.args[0].value] += 1
+    return found
+
+
+def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import db_pool
+
+    corpus = _router_sql(Path(service_dir) / "routers")
+    statements = [sql for sql, _n in corpus.most_common(args.top)]
+    if not statements:
+        print(f"no SQL literals found under {service_dir}/routers")
+        return 1
+    order = statements * args.rounds
+    random.Random(3).shuffle(order)
+    report: dict = {"kind": "db_sql_translation", "statements": len(statements),
+                    "distinct_in_routers": len(corpus), "rounds": args.rounds}
+
+    db_pool._translate_sql.cache_clear()
+    for name, fn in (("uncached", db_pool._translate_sql.__wrapped__),
+                     ("cached", db_pool._translate_sql)):
+        samples = []
+        for sql in order:
+            t = time.perf_counter()
+            fn(sql)
+            samples.append((time.perf_counter() - t) * 1e6)
+        report[name] = {"us": _stats(samples), "total_ms": round(sum(samples) / 1000.0, 1)}
+        print(f"{name:>9}: {report[name]['us']}  total={report[name]['total_ms']}ms")
+    report["cache"] = db_pool.sql_cache_stats()
+    print(f"    cache: {report['cache']}")
+
+    print(f"\nspeedup p50 ×{report['uncached']['us']['p50'] / max(report['cached']['us']['p50'], 0.001):.0f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--top", type=int, default=50, help="most-used router SQL literals to replay")
+    ap.add_argument("--rounds", type=int, default=1000, help="replays of each statement")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping SQL-translation probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(str(resolve_service_dir(args.service_dir)), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,6 +50,26 @@ Examples:
     python3 scripts/perf/measure_endpointing.py --vad-silence-s 0.1
     # before/after for the deep-quiet fast tail (ZOE_VAD_TAIL_MS):
     python3 scripts/perf/measure_endpointing.py --tail-flag-ms 640
+    # end-of-speech -> transcript, one-pass vs streaming STT (ZOE_VOICE_STREAMING_STT):
+    python3 scripts/perf/measure_endpointing.py --stt-stream
+
+STREAMING STT (--stt-stream)
+----------------------------
+Endpointing decides WHEN the turn closes; STT then decides how long until there is
+a transcript. With `--stt-stream` each trimmed utterance (plus the LiveKit
+end-of-speech window, `--stt-endpoint-ms`) is replayed in 20ms LiveKit frames
+through zoe-data's shipped `voice_stream_stt.UtteranceStream`, which picks the
+pause cut points exactly as the agent would. Each piece is then transcribed and
+timed, and the two strategies are scored on a virtual clock (Moonshine runs one
+inference at a time, so segments queue behind each other):
+
+  * **one_pass** — the whole utterance transcribed after the endpoint (today).
+  * **streaming** — segments start at their cut time; after the endpoint only the
+    tail is transcribed, once the last segment has finished.
+
+Moonshine is used when zoe-data's voice stack can load it; otherwise the times
+come from a linear cost model (`--stt-rtf`, `--stt-overhead-ms`) and the report
+says so — a modelled number is a planning estimate, not a measurement.
 """
 from __future__ import annotations
 
@@ -59,6 +79,7 @@ import importlib.util
 import json
 import statistics
 import sys
+import time
 import types
 import wave
 from pathlib import Path
@@ -68,6 +89,7 @@ import numpy as np
 
 REPO = Path(__file__).resolve().parents[2]
 DAEMON = REPO / "scripts" / "setup" / "zoe_voice_daemon.py"
+SERVICE = REPO / "services" / "zoe-data"
 CORPUS = Path.home() / ".zoe-voice-samples"
 
 # Pi-only / side-effecting imports the endpointer itself never uses. Stubbed so the
@@ -288,6 +310,112 @@ def measure(mod: types.ModuleType, samples: list[np.ndarray], gaps_ms: list[int]
     }
 
 
+_LK_FRAME = 320      # LiveKit delivers 20ms frames at 16 kHz
+_LK_HOP_MS = 32.0    # voice_livekit counts silence in 32ms Silero hops
+
+
+def _stt_timer(rtf: float | None, overhead_ms: float):
+    """Return (`seconds(frames) -> float`, label). Real Moonshine when available."""
+    if rtf is None:
+        try:
+            from routers import voice_tts
+
+            model = voice_tts._ensure_moonshine()
+
+            def _moonshine_s(frames: list[bytes]) -> float:
+                audio = voice_tts._pcm16_to_float32(frames)
+                t0 = time.perf_counter()
+                voice_tts._moonshine_infer(model, audio, 16000, "measure_endpointing")
+                return time.perf_counter() - t0
+
+            _moonshine_s([b"\0\0" * 16000])  # load + warm
+            return _moonshine_s, "moonshine"
+        except Exception as exc:
+            print(f"Moonshine unavailable here ({exc}) — falling back to the cost model", file=sys.stderr)
+            rtf = 0.15
+
+    def _modelled_s(frames: list[bytes]) -> float:
+        audio_s = sum(len(f) for f in frames) / 32000.0
+        return overhead_ms / 1000.0 + audio_s * rtf
+
+    return _modelled_s, f"modelled(rtf={rtf}, overhead={overhead_ms:g}ms)"
+
+
+def _cut_points(utterance: np.ndarray, endpoint_ms: int, rate: int, chunk: int, is_speech,
+                pause_hops: int | None, min_segment_s: float | None):
+    """Replay one utterance through the shipped UtteranceStream; return
+    (frames, [(cut_s, segment_frames)...], tail_frames)."""
+    import asyncio
+
+    from voice_stream_stt import UtteranceStream
+
+    stream_audio = np.concatenate([utterance, silence(endpoint_ms, rate)])
+    voiced = [is_speech(stream_audio[i:i + chunk]) for i in range(0, len(stream_audio), chunk)]
+
+    async def _replay():
+        cuts: list[tuple[float, list[bytes]]] = []
+
+        async def _record(segment):
+            cuts.append((len(frames) * _LK_FRAME / rate, list(segment)))
+            return ""
+
+        frames: list[bytes] = []
+        stream = UtteranceStream(frames, transcribe=_record,
+                                 min_segment_s=min_segment_s, pause_hops=pause_hops)
+        silent_ms = 0.0
+        for start in range(0, len(stream_audio) - _LK_FRAME + 1, _LK_FRAME):
+            frames.append(stream_audio[start:start + _LK_FRAME].tobytes())
+            if voiced[min(start // chunk, len(voiced) - 1)]:
+                silent_ms = 0.0
+            else:
+                silent_ms += 1000.0 * _LK_FRAME / rate
+            stream.observe(int(silent_ms // _LK_HOP_MS))
+            await asyncio.sleep(0)  # let the recorder run at its cut time
+        await asyncio.gather(*stream.segments)
+        return frames, cuts, stream.pending_tail(frames)
+
+    return asyncio.run(_replay())
+
+
+def measure_stt_stream(samples: list[np.ndarray], rate: int, chunk: int, is_speech, *,
+                       endpoint_ms: int, rtf: float | None, overhead_ms: float,
+                       pause_hops: int | None, min_segment_s: float | None) -> dict[str, Any]:
+    """End-of-speech -> transcript latency, one-pass vs streaming (virtual clock)."""
+    sys.path.insert(0, str(SERVICE))
+    seconds, stt_label = _stt_timer(rtf, overhead_ms)
+    one_pass: list[float] = []
+    streaming: list[float] = []
+    segments: list[int] = []
+    for utt in samples:
+        frames, cuts, tail = _cut_points(utt, endpoint_ms, rate, chunk, is_speech,
+                                         pause_hops, min_segment_s)
+        endpoint_s = len(frames) * _LK_FRAME / rate
+        one_pass.append(1000.0 * seconds(frames))
+        busy_until = 0.0  # one Moonshine inference at a time
+        for cut_s, segment in cuts:
+            busy_until = max(busy_until, cut_s) + seconds(segment)
+        done = max(busy_until, endpoint_s) + (seconds(tail) if tail else 0.0)
+        streaming.append(1000.0 * (done - endpoint_s))
+        segments.append(len(cuts))
+
+    def _summary(vals: list[float]) -> dict[str, float | None]:
+        return {
+            "median": round(statistics.median(vals), 1) if vals else None,
+            "p90": round(sorted(vals)[int(0.9 * (len(vals) - 1))], 1) if vals else None,
+            "max": round(max(vals), 1) if vals else None,
+        }
+
+    return {
+        "stt": stt_label,
+        "endpoint_window_ms": endpoint_ms,
+        "n_samples": len(samples),
+        "streamed": sum(1 for n in segments if n),
+        "segments_median": statistics.median(segments) if segments else None,
+        "one_pass_ms": _summary(one_pass),
+        "streaming_ms": _summary(streaming),
+    }
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     ap.add_argument("--samples", type=int, default=25, help="corpus utterances to use")
@@ -306,6 +434,16 @@ def main() -> int:
                     help="override SILENCE_TIMEOUT_S — the amplitude-mode knob (negative control)")
     ap.add_argument("--amplitude-mode", action="store_true",
                     help="measure the LEGACY amplitude endpointer instead of the live VAD one")
+    ap.add_argument("--stt-stream", action="store_true",
+                    help="also score end-of-speech -> transcript latency, one-pass vs streaming STT")
+    ap.add_argument("--stt-endpoint-ms", type=int, default=640,
+                    help="LiveKit end-of-speech window buffered before the turn closes (20 hops)")
+    ap.add_argument("--stt-rtf", type=float,
+                    help="skip Moonshine and model STT time as overhead + audio * RTF")
+    ap.add_argument("--stt-overhead-ms", type=float, default=60.0,
+                    help="fixed per-call cost in the STT cost model")
+    ap.add_argument("--stt-pause-hops", type=int, help="override ZOE_VOICE_STREAMING_STT_PAUSE_HOPS")
+    ap.add_argument("--stt-min-segment-s", type=float, help="override ZOE_VOICE_STREAMING_STT_MIN_S")
     ap.add_argument("--json", type=Path, help="write results here")
     args = ap.parse_args()
 
@@ -392,6 +530,19 @@ def main() -> int:
         pct = "n/a" if row["rate"] is None else f"{row['rate']:.0%}"
         print(f"    pause {gap:>6}: {row['cuts']}/{row['considered']}  ({pct})")
 
+    if args.stt_stream:
+        stt = measure_stt_stream(
+            loaded, rate, chunk, _is_speech,
+            endpoint_ms=args.stt_endpoint_ms, rtf=args.stt_rtf, overhead_ms=args.stt_overhead_ms,
+            pause_hops=args.stt_pause_hops, min_segment_s=args.stt_min_segment_s,
+        )
+        result["stt_stream"] = stt
+        print(f"  end-of-speech -> transcript  (stt={stt['stt']}, "
+              f"streamed {stt['streamed']}/{stt['n_samples']}, median segments {stt['segments_median']})")
+        for label in ("one_pass", "streaming"):
+            row = stt[f"{label}_ms"]
+            print(f"    {label:>9}: median={row['median']}ms  p90={row['p90']}ms  max={row['max']}ms")
+
     if args.json:
         args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
         print(f"\nWrote {args.json}")
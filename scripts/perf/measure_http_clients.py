@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Outbound HTTP probe — per-call ``httpx.AsyncClient`` vs the shared upstream client.
+
+Call sites in zoe-data used to open a fresh ``httpx.AsyncClient`` per request,
+so every call paid a TCP connect and built (then tore down) its own pool.
+``http_clients.session()`` borrows one long-lived keep-alive client per
+upstream instead. This probe starts a throwaway keep-alive HTTP/1.1 server on
+127.0.0.1 (optionally adding ``--server-delay-ms`` of latency per response)
+and reports per-request p50/p95 in milliseconds for:
+
+  * **per_call** — ``async with httpx.AsyncClient(timeout=…)`` around each
+    request: the old call-site shape.
+  * **shared** — ``async with http_clients.session("loopback", …)`` after
+    ``http_clients.start()``: the live path.
+  * **shared_concurrent** — the shared path under ``--concurrency`` parallel
+    callers, with requests/second.
+
+The shared run also reports how many requests opened a new connection vs
+reused one (the ``zoe_http_upstream_request_count`` counter's labels).
+
+SAFETY: loopback only; no live service is contacted.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_http_clients.py
+    ZOE_PERF=1 python3 scripts/perf/measure_http_clients.py --requests 2000 --concurrency 16 --json /tmp/http.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+_BODY = b'{"ok": true}'
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+async def _serve(delay_s: float, counts: dict):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        counts["connections"] += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                if delay_s:
+                    await asyncio.sleep(delay_s)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\nConnection: keep-alive\r\n\r\n%s" % (len(_BODY), _BODY)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _reuse_counts(memory_metrics) -> dict:
+    return {
+        label: memory_metrics.http_upstream_request_count.labels(
+            upstream="loopback", connection=label)._value.get()
+        for label in ("new", "reused")
+    }
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import httpx
+
+    import http_clients
+    import memory_metrics
+
+    counts = {"connections": 0}
+    server, port = await _serve(args.server_delay_ms / 1000.0, counts)
+    url = f"http://127.0.0.1:{port}/api/agent/board"
+    report: dict = {"kind": "http_client_reuse", "requests": args.requests,
+                    "server_delay_ms": args.server_delay_ms}
+
+    samples = []
+    counts["connections"] = 0
+    for _ in range(args.requests):
+        t = time.perf_counter()
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            (await client.get(url)).raise_for_status()
+        samples.append((time.perf_counter() - t) * 1000.0)
+    report["per_call"] = {"ms": _stats(samples), "server_connections": counts["connections"]}
+
+    await http_clients.start()
+    before = _reuse_counts(memory_metrics)
+    samples = []
+    counts["connections"] = 0
+    for _ in range(args.requests):
+        t = time.perf_counter()
+        async with http_clients.session("loopback", timeout=5.0) as client:
+            (await client.get(url)).raise_for_status()
+        samples.append((time.perf_counter() - t) * 1000.0)
+    after = _reuse_counts(memory_metrics)
+    report["shared"] = {"ms": _stats(samples), "server_connections": counts["connections"],
+                        "connection": {k: int(after[k] - before[k]) for k in after}}
+
+    samples = []
+    counts["connections"] = 0
+    queue = list(range(args.requests))
+
+    async def caller() -> None:
+        while queue:
+            queue.pop()
+            t = time.perf_counter()
+            async with http_clients.session("loopback", timeout=5.0) as client:
+                (await client.get(url)).raise_for_status()
+            samples.append((time.perf_counter() - t) * 1000.0)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - wall
+    report["shared_concurrent"] = {"ms": _stats(samples), "concurrency": args.concurrency,
+                                   "requests_per_s": round(len(samples) / elapsed),
+                                   "server_connections": counts["connections"]}
+    await http_clients.aclose_all()
+    server.close()
+    await server.wait_closed()
+
+    for name in ("per_call", "shared", "shared_concurrent"):
+        print(f"{name:>17}: {report[name]['ms']}  connections={report[name]['server_connections']}")
+    print(f"  shared connections: {report['shared']['connection']}  "
+          f"concurrent: {report['shared_concurrent']['requests_per_s']} req/s")
+    print(f"\nspeedup p50 ×{report['per_call']['ms']['p50'] / max(report['shared']['ms']['p50'], 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=500, help="requests per mode")
+    ap.add_argument("--concurrency", type=int, default=8, help="parallel callers in the concurrent run")
+    ap.add_argument("--server-delay-ms", type=float, default=0.0, help="added latency per response")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping HTTP client probe (set ZOE_PERF=1 to run).")
+        return 0
+    return asyncio.run(_measure(str(resolve_service_dir(args.service_dir)), args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
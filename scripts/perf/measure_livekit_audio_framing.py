@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""LiveKit audio framing probe — JSON/base64 audio messages vs binary PCM frames.
+
+The LiveKit lane sends each reply sentence to the panel over the data channel.
+The JSON message base64-encodes the whole WAV, so it costs a third more bytes,
+an encode on the box, a decode plus blob build in the browser, and nothing can
+play until the last byte arrives. ``livekit_audio_framing`` sends raw PCM in
+``--chunk-ms`` packets behind a 16-byte header instead. For synthetic TTS
+sentences of ``--sentence-s`` seconds at ``--rate`` Hz this reports, per
+framing:
+
+  * **bytes** on the wire per sentence (payload + JSON/headers);
+  * **encode_ms / decode_ms** — the real encode (``json.dumps`` + base64, or
+    ``sentence_frames``) and decode (``json.loads`` + base64, or ``decode``)
+    measured here, the decode standing in for the browser's;
+  * **first_sample_ms** — time from "TTS finished" to "first sample playable"
+    on a ``--mbps`` link: encode + transfer of what must arrive before playback
+    starts (the whole message for JSON, the first chunk for binary) + decode.
+
+SAFETY: in-process, synthetic audio, no network.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_livekit_audio_framing.py
+    ZOE_PERF=1 python3 scripts/perf/measure_livekit_audio_framing.py --mbps 2 --chunk-ms 100 --json /tmp/lk_framing.json
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+
+def _wav(seconds: float, rate: int) -> bytes:
+    n = int(seconds * rate)
+    pcm = bytearray()
+    for i in range(n):
+        pcm += int(8000 * math.sin(2 * math.pi * 220 * i / rate)).to_bytes(2, "little", signed=True)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(bytes(pcm))
+    return buf.getvalue()
+
+
+def _timed(fn, repeats: int) -> tuple[object, float]:
+    """Result of ``fn()`` and its median wall time in ms over ``repeats`` runs."""
+    times, result = [], None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return result, statistics.median(times)
+
+
+def _measure_sentence(framing, body: bytes, args) -> dict:
+    bytes_per_ms = args.mbps * 1e6 / 8 / 1000.0
+
+    def json_encode():
+        return json.dumps({
+            "type": "audio", "audio_base64": base64.b64encode(body).decode("ascii"),
+            "content_type": "audio/wav", "seq": 0, "final": True,
+        }).encode()
+
+    message, json_enc_ms = _timed(json_encode, args.repeats)
+    _, json_dec_ms = _timed(lambda: base64.b64decode(json.loads(message)["audio_base64"]), args.repeats)
+
+    def binary_encode():
+        pcm, rate, channels = framing.wav_pcm(body)
+        return list(framing.sentence_frames(
+            pcm, turn=1, seq=0, sample_rate=rate, channels=channels,
+            reply_end=True, chunk_ms=args.chunk_ms,
+        ))
+
+    packets, bin_enc_ms = _timed(binary_encode, args.repeats)
+    _, bin_dec_ms = _timed(lambda: framing.decode(packets[0]), args.repeats)
+    # The first chunk is ready as soon as it is sliced, not after every chunk is.
+    first_enc_ms = bin_enc_ms / len(packets)
+
+    return {
+        "json": {
+            "bytes": len(message),
+            "packets": 1,
+            "encode_ms": round(json_enc_ms, 3),
+            "decode_ms": round(json_dec_ms, 3),
+            "first_sample_ms": round(json_enc_ms + len(message) / bytes_per_ms + json_dec_ms, 2),
+        },
+        "binary": {
+            "bytes": sum(len(p) for p in packets),
+            "packets": len(packets),
+            "encode_ms": round(bin_enc_ms, 3),
+            "decode_ms": round(bin_dec_ms, 3),
+            "first_sample_ms": round(first_enc_ms + len(packets[0]) / bytes_per_ms + bin_dec_ms, 2),
+        },
+    }
+
+
+def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import livekit_audio_framing as framing
+
+    report: dict = {"kind": "livekit_audio_framing", "rate": args.rate, "mbps": args.mbps,
+                    "chunk_ms": args.chunk_ms, "sentences": {}}
+    print(f"{'sentence':>9} {'framing':>7} {'bytes':>9} {'pkts':>5} {'enc ms':>8} {'dec ms':>8} {'first ms':>9}")
+    for seconds in args.sentence_s:
+        row = _measure_sentence(framing, _wav(seconds, args.rate), args)
+        report["sentences"][f"{seconds:g}s"] = row
+        for name in ("json", "binary"):
+            r = row[name]
+            print(f"{seconds:>8g}s {name:>7} {r['bytes']:>9} {r['packets']:>5} "
+                  f"{r['encode_ms']:>8.3f} {r['decode_ms']:>8.3f} {r['first_sample_ms']:>9.2f}")
+        print(f"{'':>9} bytes ×{row['json']['bytes'] / row['binary']['bytes']:.2f}  "
+              f"first sample ×{row['json']['first_sample_ms'] / max(row['binary']['first_sample_ms'], 0.001):.1f}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sentence-s", type=float, nargs="+", default=[1.0, 3.0, 6.0],
+                    help="synthetic sentence lengths in seconds")
+    ap.add_argument("--rate", type=int, default=24000, help="TTS sample rate (Kokoro: 24000)")
+    ap.add_argument("--mbps", type=float, default=5.0, help="effective data-channel throughput")
+    ap.add_argument("--chunk-ms", type=int, default=200, help="ZOE_LIVEKIT_AUDIO_CHUNK_MS equivalent")
+    ap.add_argument("--repeats", type=int, default=20, help="timing repeats per measurement")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping LiveKit audio framing probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(str(resolve_service_dir(args.service_dir)), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
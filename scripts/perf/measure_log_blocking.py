@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Logging probe — event-loop blocking with a direct vs queued file handler.
+
+``logging_setup.configure_logging`` used to attach its ``RotatingFileHandler``
+straight to the root logger, so the thread that logged also formatted, wrote,
+flushed and rotated the file. That thread was usually the event loop, in the
+middle of a chat or voice turn. The handler is now a ``QueuedHandler`` and
+the file work runs on a listener thread. This probe stands in for an SD card.
+Each write's flush sleeps ``--io-ms`` and each rotation sleeps
+``--rotate-ms``. It then logs ``--rate`` lines/s from the event loop for
+``--seconds`` through both handlers:
+
+  * **direct** — the rotating file handler on the logger, as before.
+  * **queued** — the same handler behind ``logging_setup.QueuedHandler``.
+
+A ticker coroutine asks to wake every ``--tick-ms`` and records how late it
+wakes, which is the event-loop lag a concurrent turn would feel. The probe
+reports that lag and the time each ``logger.info`` call blocked its caller,
+both as p50/p95/max in milliseconds, plus any records the queue dropped.
+
+SAFETY: writes only into a temporary directory that is removed afterwards.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_log_blocking.py
+    ZOE_PERF=1 python3 scripts/perf/measure_log_blocking.py --rate 400 --io-ms 3 --json /tmp/logq.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import logging.handlers
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+class _SlowDiskHandler(logging.handlers.RotatingFileHandler):
+    """A rotating file handler whose flush and rollover cost what an SD card does."""
+
+    io_s = 0.0
+    rotate_s = 0.0
+
+    def flush(self):
+        super().flush()
+        if self.io_s:
+            time.sleep(self.io_s)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.rotate_s:
+            time.sleep(self.rotate_s)
+
+
+async def _run(logging_setup, args, directory: str, queued: bool) -> dict:
+    _SlowDiskHandler.io_s = args.io_ms / 1000.0
+    _SlowDiskHandler.rotate_s = args.rotate_ms / 1000.0
+    sink = _SlowDiskHandler(os.path.join(directory, "app.log"), maxBytes=args.max_bytes,
+                            backupCount=3, encoding="utf-8")
+    sink.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s"))
+    handler = logging_setup.QueuedHandler(sink, maxsize=args.queue_max) if queued else sink
+    log = logging.getLogger(f"zoe.perf.{'queued' if queued else 'direct'}")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.addHandler(handler)
+
+    lags: list[float] = []
+    calls: list[float] = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        tick = args.tick_ms / 1000.0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append(max(0.0, (time.perf_counter() - t0 - tick) * 1000.0))
+
+    async def talker():
+        gap = 1.0 / args.rate
+        deadline = time.perf_counter() + args.seconds
+        n = 0
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            log.info("turn %d routed intent=%s latency_ms=%.1f %s", n, "weather", 12.5, "x" * 120)
+            calls.append((time.perf_counter() - t0) * 1000.0)
+            n += 1
+            await asyncio.sleep(gap)
+        stop.set()
+
+    tick_task = asyncio.create_task(ticker())
+    await talker()
+    await tick_task
+    log.removeHandler(handler)
+    report = {"loop_lag_ms": _stats(lags), "log_call_ms": _stats(calls)}
+    if queued:
+        handler.flush()
+        report["dropped"] = handler.dropped
+    handler.close()
+    return report
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import logging_setup
+
+    report: dict = {"kind": "log_blocking", "rate": args.rate, "seconds": args.seconds,
+                    "io_ms": args.io_ms, "rotate_ms": args.rotate_ms, "max_bytes": args.max_bytes}
+    for mode in ("direct", "queued"):
+        with tempfile.TemporaryDirectory(prefix="zoe-logq-") as directory:
+            report[mode] = await _run(logging_setup, args, directory, queued=mode == "queued")
+
+    for mode in ("direct", "queued"):
+        r = report[mode]
+        print(f"{mode:>7}: loop lag {r['loop_lag_ms']}")
+        print(f"{'':>7}  log call {r['log_call_ms']}")
+    print(f"\nrecords dropped by the queue: {report['queued']['dropped']}")
+    print(f"loop lag p95 ×{report['direct']['loop_lag_ms']['p95'] / max(report['queued']['loop_lag_ms']['p95'], 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rate", type=float, default=200.0, help="log lines per second from the loop")
+    ap.add_argument("--seconds", type=float, default=3.0, help="how long each mode runs")
+    ap.add_argument("--io-ms", type=float, default=2.0, help="simulated cost of each write's flush")
+    ap.add_argument("--rotate-ms", type=float, default=80.0, help="simulated cost of a rotation")
+    ap.add_argument("--max-bytes", type=int, default=64 * 1024, help="rotate the log at this size")
+    ap.add_argument("--tick-ms", type=float, default=5.0, help="ticker interval for the lag probe")
+    ap.add_argument("--queue-max", type=int, default=10_000, help="QueuedHandler bound")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping logging probe (set ZOE_PERF=1 to run).")
+        return 0
+    return asyncio.run(_measure(str(resolve_service_dir(args.service_dir)), args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""MCP stdio dispatch probe — in-order tool calls vs the concurrent dispatcher.
+
+The stdio worker (``mcp_server.py``) used to await each ``tools/call`` before
+reading the next line, so one slow tool (a headless browse, a panel SSH) held
+up every fast call queued behind it. ``mcp_server._StdioDispatcher`` now runs
+calls as tasks under an in-flight limit and answers by id. This probe swaps
+``handle_tool`` for fake tools that just sleep — ``--slow-ms`` for
+``--slow-share`` of the calls, ``--fast-ms`` for the rest — and replays the
+same shuffled mix through:
+
+  * **serial** — one call at a time, the old read/await/write loop.
+  * **concurrent** — the dispatcher with ``--max-inflight`` (the live default
+    is ``ZOE_MCP_MAX_INFLIGHT``, 8).
+
+It reports total throughput (calls/s) and per-call latency p50/p95 in
+milliseconds, split into fast and slow calls. Latency counts from the moment
+the request line is read, so a fast call's wait behind a slow one shows up.
+
+SAFETY: in-process, no DB, no stdio child; the real tools never run.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_mcp_dispatch.py
+    ZOE_PERF=1 python3 scripts/perf/measure_mcp_dispatch.py --calls 400 --slow-share 0.1 --json /tmp/mcp.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def _mix(args) -> list[str]:
+    rng = random.Random(args.seed)
+    n_slow = round(args.calls * args.slow_share)
+    calls = ["slow"] * n_slow + ["fast"] * (args.calls - n_slow)
+    rng.shuffle(calls)
+    return calls
+
+
+def _summary(kind: list[str], latencies: dict, elapsed: float) -> dict:
+    return {
+        "calls_per_s": round(len(kind) / elapsed, 1),
+        "wall_s": round(elapsed, 3),
+        "fast_ms": _stats([latencies[i] for i, k in enumerate(kind) if k == "fast"]),
+        "slow_ms": _stats([latencies[i] for i, k in enumerate(kind) if k == "slow"]),
+    }
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import mcp_server
+
+    delays = {"slow": args.slow_ms / 1000.0, "fast": args.fast_ms / 1000.0}
+
+    async def handle_tool(name, tool_args, actor_context=None):
+        await asyncio.sleep(delays[name])
+        return json.dumps({"ok": True})
+
+    mcp_server.handle_tool = handle_tool
+    kind = _mix(args)
+    report: dict = {"kind": "mcp_stdio_dispatch", "calls": args.calls, "slow_share": args.slow_share,
+                    "slow_ms": args.slow_ms, "fast_ms": args.fast_ms, "max_inflight": args.max_inflight}
+
+    latencies: dict = {}
+    wall = time.perf_counter()
+    for i, name in enumerate(kind):
+        await handle_tool(name, {})
+        latencies[i] = (time.perf_counter() - wall) * 1000.0
+    report["serial"] = _summary(kind, latencies, time.perf_counter() - wall)
+
+    latencies = {}
+    done = asyncio.Event()
+    wall = time.perf_counter()
+
+    def write(line: str) -> None:
+        msg = json.loads(line)
+        latencies[msg["id"]] = (time.perf_counter() - wall) * 1000.0
+        if len(latencies) == len(kind):
+            done.set()
+
+    dispatcher = mcp_server._StdioDispatcher(write, max_inflight=args.max_inflight)
+    for i, name in enumerate(kind):
+        dispatcher.dispatch({"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                             "params": {"name": name, "arguments": {}}})
+    await done.wait()
+    report["concurrent"] = _summary(kind, latencies, time.perf_counter() - wall)
+
+    for mode in ("serial", "concurrent"):
+        r = report[mode]
+        print(f"{mode:>10}: {r['calls_per_s']:>8} calls/s  fast {r['fast_ms']}  slow {r['slow_ms']}")
+    print(f"\nthroughput ×{report['concurrent']['calls_per_s'] / max(report['serial']['calls_per_s'], 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--calls", type=int, default=200, help="tool calls in the mix")
+    ap.add_argument("--slow-share", type=float, default=0.1, help="fraction of calls that are slow")
+    ap.add_argument("--slow-ms", type=float, default=250.0, help="latency of a slow tool")
+    ap.add_argument("--fast-ms", type=float, default=5.0, help="latency of a fast tool")
+    ap.add_argument("--max-inflight", type=int, default=8, help="dispatcher in-flight limit")
+    ap.add_argument("--seed", type=int, default=7, help="shuffle seed for the call mix")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping MCP dispatch probe (set ZOE_PERF=1 to run).")
+        return 0
+    return asyncio.run(_measure(str(resolve_service_dir(args.service_dir)), args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
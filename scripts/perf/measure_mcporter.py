@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""mcporter intent-path probe — spawn-per-intent vs the warm stdio worker.
+
+Intents without an in-process direct executor reach their tool through
+``intent_router._run_mcporter``. Historically that spawned ``mcporter-safe``
+(Node) which spawned a fresh ``mcp_server.py`` (full import chain + DB pool)
+for every single call; ``mcporter_worker`` keeps ONE ``mcp_server.py`` child
+warm and multiplexes calls over its stdio. This probe times the same
+utterances through both modes and reports p50/p95:
+
+  * **spawn** — ``ZOE_MCPORTER_MODE=spawn``: the pre-worker path, unchanged.
+  * **worker** — the default: the worker's first call (cold child start +
+    MCP handshake) is reported separately as ``worker_cold_ms`` so the
+    steady-state numbers are what a user pays on every later intent.
+
+Each sample is the intent leg the live path runs after routing:
+``detect_intent`` → ``_build_command`` → ``_run_mcporter`` →
+``_format_response``. Direct executors are deliberately bypassed — they never
+touch mcporter, so timing them would say nothing about either mode.
+
+SAFETY: read-only. Only utterances whose built command targets a read tool
+(``*_get_items``, ``*_list*``, ``*_today``, ``*_search``, weather) are run;
+anything that would write is refused before it executes.
+
+CI gate: requires ``ZOE_PERF=1`` and the live service ``.env``; otherwise exits
+0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_mcporter.py --runs 20
+    ZOE_PERF=1 python3 scripts/perf/measure_mcporter.py --modes worker --concurrency 4
+    ZOE_PERF=1 python3 scripts/perf/measure_mcporter.py --json /tmp/mcporter.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+DEFAULT_UTTERANCES = (
+    "what's on my shopping list",
+    "show my reminders",
+    "what's on today",
+    "what's the weather",
+    "search my notes for wifi",
+)
+
+_READ_TOOLS = (
+    "list_get_items", "reminder_list", "calendar_today", "calendar_list_events",
+    "note_search", "people_search", "weather_current", "weather_forecast",
+    "journal_get_prompts", "journal_get_streak", "transaction_summary",
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 1),
+        "p95": round(pct(0.95), 1),
+        "min": round(vals[0], 1),
+        "max": round(vals[-1], 1),
+    }
+
+
+def _load_env(service_dir: str) -> None:
+    """Mirror replay_samples._load_env so the live router imports resolve."""
+    p = os.path.join(service_dir, ".env")
+    if not os.path.exists(p):
+        return
+    for line in open(p):
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            k, v = line.split("=", 1)
+            os.environ.setdefault(k, v.strip().strip('"').strip("'"))
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    os.chdir(service_dir)
+    import intent_router
+    import mcporter_worker
+
+    plans = []
+    for text in args.utterances or DEFAULT_UTTERANCES:
+        intent = intent_router.detect_intent(text, log_miss=False)
+        cmd = intent_router._build_command(intent, args.user) if intent else None
+        parsed = mcporter_worker.parse_mcporter_command(cmd) if cmd else None
+        if parsed is None or parsed[0] not in _READ_TOOLS:
+            print(f"skip {text!r}: not a read-only mcporter intent ({cmd or 'no command'})")
+            continue
+        plans.append((text, intent))
+    if not plans:
+        print("no read-only utterances to measure.", file=sys.stderr)
+        return 0
+
+    async def one(text: str) -> tuple[float, bool]:
+        t = time.perf_counter()
+        intent = intent_router.detect_intent(text, log_miss=False)
+        raw = await intent_router._run_mcporter(intent_router._build_command(intent, args.user))
+        if raw is not None:
+            intent_router._format_response(intent, raw)
+        return (time.perf_counter() - t) * 1000.0, raw is not None
+
+    report: dict = {"kind": "mcporter_intent_latency", "service_dir": service_dir,
+                    "utterances": [p[0] for p in plans], "modes": {}}
+    for mode in args.modes:
+        os.environ[mcporter_worker.MCPORTER_MODE_ENV] = mode
+        cold_ms = None
+        if mode == "worker":
+            cold_ms, _ok = await one(plans[0][0])
+        samples: list[float] = []
+        failures = 0
+        sem = asyncio.Semaphore(max(1, args.concurrency))
+
+        async def timed(text: str) -> None:
+            nonlocal failures
+            async with sem:
+                ms, ok = await one(text)
+            if ok:
+                samples.append(ms)
+            else:
+                failures += 1
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(timed(text) for _ in range(args.runs) for text, _i in plans))
+        wall_ms = (time.perf_counter() - wall) * 1000.0
+        row = {"intent_ms": _stats(samples), "failures": failures, "wall_ms": round(wall_ms, 1)}
+        if cold_ms is not None:
+            row["worker_cold_ms"] = round(cold_ms, 1)
+            row["worker"] = mcporter_worker.get_worker().stats()
+        report["modes"][mode] = row
+        print(f"{mode:>6}: {row['intent_ms']}  failures={failures}  wall={row['wall_ms']}ms"
+              + (f"  cold={row['worker_cold_ms']}ms" if cold_ms is not None else ""))
+    await mcporter_worker.shutdown_worker()
+
+    spawn = report["modes"].get("spawn", {}).get("intent_ms", {})
+    worker = report["modes"].get("worker", {}).get("intent_ms", {})
+    if spawn and worker:
+        print(f"\nspeedup p50 ×{spawn['p50'] / max(worker['p50'], 0.1):.1f}   "
+              f"p95 ×{spawn['p95'] / max(worker['p95'], 0.1):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=10, help="passes over the utterance set per mode")
+    ap.add_argument("--modes", nargs="+", default=["spawn", "worker"], choices=["spawn", "worker"])
+    ap.add_argument("--concurrency", type=int, default=1,
+                    help="intents in flight at once (exercises worker multiplexing)")
+    ap.add_argument("--utterance", dest="utterances", action="append",
+                    help="override the utterance set (repeatable; read-only intents only)")
+    ap.add_argument("--user", default="jason", help="user_id the commands are built for")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping mcporter intent probe (set ZOE_PERF=1 to run).")
+        return 0
+
+    service_dir = str(resolve_service_dir(args.service_dir))
+    if not os.path.exists(os.path.join(service_dir, ".env")):
+        print(f"no .env in {service_dir} (live service env required) — skipping.", file=sys.stderr)
+        return 0
+    _load_env(service_dir)
+    return asyncio.run(_measure(service_dir, args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
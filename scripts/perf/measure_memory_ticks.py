@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Memory access-tick probe — per-hit writes vs the write-behind aggregator.
+
+Every ``MemoryService.load_for_prompt`` / ``search`` hit bumps
+``access_count`` / ``last_accessed`` (and ``unique_query_count`` for searches)
+on the returned rows. Historically each hit was its own ``col.get`` +
+``col.update`` under the per-user lock, competing with the next turn's reads
+for the executor and the Chroma SQLite writer. With
+``ZOE_MEMORY_TICK_WRITE_BEHIND=1`` (the default) hits are aggregated per
+memory id and flushed as one batched update per user. This probe times the
+same turns through both modes and reports p50/p95:
+
+  * **sync** — ``ZOE_MEMORY_TICK_WRITE_BEHIND=0``: a write per hit, unchanged.
+  * **write_behind** — the aggregator; the final flush is reported separately
+    as ``flush_ms`` so the turn numbers are what a user pays.
+
+A "turn" is the live prompt path: ``load_for_prompt`` + ``search`` for one
+utterance, with ``--concurrency`` turns in flight at once.
+
+SAFETY: runs against a throwaway palace in a temp dir seeded with
+``--rows`` synthetic facts; the live palace is never opened.
+
+CI gate: requires ``ZOE_PERF=1`` (the embedding model must be available);
+otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_memory_ticks.py --turns 200
+    ZOE_PERF=1 python3 scripts/perf/measure_memory_ticks.py --concurrency 4 --json /tmp/ticks.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+USER = "perf-ticks"
+QUERIES = (
+    "where do I park at work",
+    "what is the wifi password",
+    "when is my dentist appointment",
+    "what does Alice do for a living",
+    "which coffee do I like",
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 2),
+        "p95": round(pct(0.95), 2),
+        "min": round(vals[0], 2),
+        "max": round(vals[-1], 2),
+    }
+
+
+async def _run_mode(memory_service, mode: str, args) -> dict:
+    os.environ["ZOE_MEMORY_TICK_WRITE_BEHIND"] = "1" if mode == "write_behind" else "0"
+    with tempfile.TemporaryDirectory(prefix=f"zoe-ticks-{mode}-") as data_dir:
+        svc = memory_service.MemoryService(data_dir=data_dir)
+        for i in range(args.rows):
+            await svc.ingest(
+                f"Synthetic fact {i}: {QUERIES[i % len(QUERIES)]} -> answer {i}",
+                user_id=USER, source="perf", confidence=0.9,
+            )
+        # warm the embedder and the prompt hot set outside the timed window
+        await svc.search(QUERIES[0], user_id=USER)
+        await svc.load_for_prompt(USER)
+        await svc.flush_access_ticks()
+
+        samples: list[float] = []
+        sem = asyncio.Semaphore(max(1, args.concurrency))
+
+        async def turn(i: int) -> None:
+            async with sem:
+                t = time.perf_counter()
+                await svc.load_for_prompt(USER, limit=args.prompt_limit)
+                await svc.search(QUERIES[i % len(QUERIES)], user_id=USER, limit=args.search_limit)
+                samples.append((time.perf_counter() - t) * 1000.0)
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(turn(i) for i in range(args.turns)))
+        wall_ms = (time.perf_counter() - wall) * 1000.0
+        t = time.perf_counter()
+        await svc.flush_access_ticks()
+        # let the sync mode's trailing tick tasks land so both modes finish equal work
+        await asyncio.gather(*list(svc._background_tasks), return_exceptions=True)
+        flush_ms = (time.perf_counter() - t) * 1000.0
+        return {"turn_ms": _stats(samples), "wall_ms": round(wall_ms, 1),
+                "flush_ms": round(flush_ms, 1), "ticks": dict(svc.tick_stats)}
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    os.chdir(service_dir)
+    import memory_service
+
+    report: dict = {"kind": "memory_tick_latency", "service_dir": service_dir,
+                    "rows": args.rows, "turns": args.turns,
+                    "concurrency": args.concurrency, "modes": {}}
+    for mode in args.modes:
+        row = await _run_mode(memory_service, mode, args)
+        report["modes"][mode] = row
+        print(f"{mode:>12}: {row['turn_ms']}  wall={row['wall_ms']}ms  flush={row['flush_ms']}ms")
+
+    sync = report["modes"].get("sync", {}).get("turn_ms", {})
+    behind = report["modes"].get("write_behind", {}).get("turn_ms", {})
+    if sync and behind:
+        print(f"\nspeedup p50 ×{sync['p50'] / max(behind['p50'], 0.01):.2f}   "
+              f"p95 ×{sync['p95'] / max(behind['p95'], 0.01):.2f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--turns", type=int, default=100, help="timed turns per mode")
+    ap.add_argument("--rows", type=int, default=200, help="synthetic facts seeded into the temp palace")
+    ap.add_argument("--modes", nargs="+", default=["sync", "write_behind"],
+                    choices=["sync", "write_behind"])
+    ap.add_argument("--concurrency", type=int, default=1, help="turns in flight at once")
+    ap.add_argument("--prompt-limit", type=int, default=20, help="load_for_prompt limit")
+    ap.add_argument("--search-limit", type=int, default=10, help="search limit")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping memory access-tick probe (set ZOE_PERF=1 to run).")
+        return 0
+
+    service_dir = str(resolve_service_dir(args.service_dir))
+    return asyncio.run(_measure(service_dir, args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Pipeline-store probe — full-file scan vs the indexed ``pipeline_journal``.
+
+``pipeline_store.load_latest_state`` / ``save_state`` used to stream the whole
+``engineering_pipeline_runs.jsonl`` (last-match-wins) on every call, so their
+cost grew with the file — 1.59 GB on the live host before the compactor
+existed. ``pipeline_journal`` answers the same question from a sidecar index
+with one seek. This probe writes a synthetic journal of ``--size-gb`` (full
+~``--record-kb`` state snapshots, round-robin over ``--refs`` task_refs, the
+shape the live store had) and reports:
+
+  * **scan_ms** — the legacy ``_latest_state_from_lines`` pass over the file
+    (``--scan-runs`` samples; each one reads the whole journal).
+  * **index_build_ms** — first open with no sidecar: the one-time recovery scan.
+  * **load_ms** / **save_ms** — p50/p95 of ``load_latest_state`` /
+    ``save_state`` once indexed.
+  * **rollover_ms** — the one save that seals the oversized file into a
+    segment (``ZOE_PIPELINE_STORE_SEGMENT_MB``), keeping its tail in place.
+
+SAFETY: everything lives in a temp dir (or ``--dir``) via
+``ZOE_PIPELINE_STORE_PATH``; the live store is never opened. Needs roughly
+2× ``--size-gb`` free disk (the rollover seals a copy).
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_pipeline_store.py --size-gb 2
+    ZOE_PERF=1 python3 scripts/perf/measure_pipeline_store.py --size-gb 0.2 --json /tmp/store.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 2),
+        "p95": round(pct(0.95), 2),
+        "min": round(vals[0], 2),
+        "max": round(vals[-1], 2),
+    }
+
+
+def _write_journal(path: Path, args) -> dict:
+    from pipeline_evidence import EvidenceItem, PipelineState
+
+    pad = "x" * 400
+    per_item = len(pad) + 200
+    items = max(1, int(args.record_kb * 1024 / per_item))
+    evidence = [
+        EvidenceItem(kind="log", summary=f"{i}:{pad}", passed=True, metadata={"phase": "implement"})
+        for i in range(items)
+    ]
+    target = int(args.size_gb * 1024 ** 3)
+    refs = [f"multica:perf-{i:04d}" for i in range(args.refs)]
+    revisions = dict.fromkeys(refs, 0)
+    written = records = 0
+    t = time.perf_counter()
+    with path.open("w", encoding="utf-8") as fh:
+        while written < target:
+            ref = refs[records % len(refs)]
+            revisions[ref] += 1
+            state = PipelineState(task_ref=ref, phase="implement", evidence=evidence,
+                                  journal_revision=revisions[ref])
+            line = json.dumps({"event": "perf", "task_ref": ref, "phase": state.phase,
+                               "status": state.status, "state": state.model_dump(mode="json")},
+                              sort_keys=True) + "\n"
+            fh.write(line)
+            written += len(line)
+            records += 1
+    return {"bytes": written, "records": records, "refs": len(refs),
+            "write_s": round(time.perf_counter() - t, 1), "revisions": revisions}
+
+
+def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    workdir = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="zoe-pipeline-perf-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    path = workdir / "engineering_pipeline_runs.jsonl"
+    os.environ["ZOE_PIPELINE_STORE_PATH"] = str(path)
+    import pipeline_journal
+    import pipeline_store
+
+    print(f"writing {args.size_gb:g} GB synthetic journal to {path} ...")
+    gen = _write_journal(path, args)
+    revisions = gen.pop("revisions")
+    refs = list(revisions)
+    print(f"  {gen['records']} records / {gen['refs']} refs / {gen['bytes'] / 1e9:.2f} GB "
+          f"in {gen['write_s']}s")
+    report: dict = {"kind": "pipeline_store_latency", "journal": gen}
+    rng = random.Random(7)
+
+    scan = []
+    for _ in range(args.scan_runs):
+        ref = rng.choice(refs)
+        t = time.perf_counter()
+        with path.open("r", encoding="utf-8") as fh:
+            pipeline_store._latest_state_from_lines(fh, ref)
+        scan.append((time.perf_counter() - t) * 1000.0)
+    report["scan_ms"] = _stats(scan)
+    print(f"   scan: {report['scan_ms']}")
+
+    # Keep the oversized file unsealed while timing lookups; rollover is timed below.
+    os.environ["ZOE_PIPELINE_STORE_SEGMENT_MB"] = "0"
+    t = time.perf_counter()
+    pipeline_journal.journal_for(path).rebuild_index()
+    report["index_build_ms"] = round((time.perf_counter() - t) * 1000.0, 1)
+    print(f"  index: built in {report['index_build_ms']}ms")
+
+    loads, saves = [], []
+    for _ in range(args.runs):
+        ref = rng.choice(refs)
+        t = time.perf_counter()
+        state = pipeline_store.load_latest_state(ref)
+        loads.append((time.perf_counter() - t) * 1000.0)
+        assert state is not None and state.journal_revision == revisions[ref], ref
+    for _ in range(args.save_runs):
+        ref = rng.choice(refs)
+        state = pipeline_store.load_latest_state(ref)
+        t = time.perf_counter()
+        saved = pipeline_store.save_state(state, event="perf_save")
+        saves.append((time.perf_counter() - t) * 1000.0)
+        revisions[ref] = saved.journal_revision
+    report["load_ms"] = _stats(loads)
+    report["save_ms"] = _stats(saves)
+    print(f"   load: {report['load_ms']}")
+    print(f"   save: {report['save_ms']}")
+
+    os.environ["ZOE_PIPELINE_STORE_SEGMENT_MB"] = str(args.segment_mb)
+    ref = rng.choice(refs)
+    state = pipeline_store.load_latest_state(ref)
+    t = time.perf_counter()
+    revisions[ref] = pipeline_store.save_state(state, event="perf_rollover").journal_revision
+    report["rollover_ms"] = round((time.perf_counter() - t) * 1000.0, 1)
+    report["active_bytes_after_rollover"] = path.stat().st_size
+    print(f"  rollover: {report['rollover_ms']}ms (active file now "
+          f"{report['active_bytes_after_rollover'] / 1e6:.2f} MB)")
+    for ref in rng.sample(refs, min(len(refs), 20)):
+        assert pipeline_store.load_latest_state(ref).journal_revision == revisions[ref], ref
+
+    if scan and loads:
+        print(f"\nspeedup load p50 ×{report['scan_ms']['p50'] / max(report['load_ms']['p50'], 0.01):.0f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    if not args.keep:
+        for leftover in workdir.glob("engineering_pipeline_runs*"):
+            leftover.unlink()
+        if not args.dir:
+            workdir.rmdir()
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size-gb", type=float, default=2.0, help="synthetic journal size")
+    ap.add_argument("--refs", type=int, default=130, help="distinct task_refs")
+    ap.add_argument("--record-kb", type=float, default=200.0, help="approximate snapshot size")
+    ap.add_argument("--scan-runs", type=int, default=3, help="legacy full-scan samples")
+    ap.add_argument("--runs", type=int, default=200, help="indexed load samples")
+    ap.add_argument("--save-runs", type=int, default=50, help="indexed save samples")
+    ap.add_argument("--segment-mb", type=float, default=64.0, help="rollover threshold for the rollover sample")
+    ap.add_argument("--dir", help="write the journal here instead of a temp dir")
+    ap.add_argument("--keep", action="store_true", help="leave the journal + segments on disk")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping pipeline-store probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(str(resolve_service_dir(args.service_dir)), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
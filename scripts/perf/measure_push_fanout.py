@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Push fan-out probe — sequential send_json loop vs PushBroadcaster queues.
+
+``push.PushBroadcaster.broadcast`` used to ``await ws.send_json(message)`` for
+one socket after another, re-serializing the event for each, so one slow
+panel delayed every other client on the channel. It now serializes once and
+hands the frame to a writer task per connection. This probe subscribes
+``--sockets`` fake WebSockets to one channel, ``--slow`` of which take
+``--slow-ms`` per write, broadcasts ``--events`` events and reports, in
+milliseconds:
+
+  * **legacy** — the old loop (one ``send_json`` per socket, in turn),
+    replayed inline against the same sockets, slow ones first (the old
+    worst case: a slow panel early in the set).
+  * **queued** — ``PushBroadcaster.broadcast`` as shipped.
+
+For each: time for a *fast* socket to receive an event (p50/p95), the
+``broadcast()`` call's own latency, and events/s. The queued run also
+reports how many frames the slow sockets had received by the end (the rest
+were still queued, or coalesced once past ``--queue-max``).
+
+SAFETY: in-process fakes only; no server, no network.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_push_fanout.py
+    ZOE_PERF=1 python3 scripts/perf/measure_push_fanout.py --sockets 50 --slow 2 --slow-ms 40 --json /tmp/push.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+_PAYLOAD = {"action": "updated", "list": {"id": 42, "name": "Shopping",
+                                          "items": [{"id": i, "text": f"item {i}"} for i in range(20)]}}
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+class _Socket:
+    """Records when each event sequence arrived; slow sockets sleep per write."""
+
+    def __init__(self, delay_s: float, sent_at: dict):
+        self.delay_s = delay_s
+        self.sent_at = sent_at
+        self.arrivals: list[float] = []
+
+    async def accept(self):
+        pass
+
+    async def _arrive(self, seq: int) -> None:
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        self.arrivals.append((time.perf_counter() - self.sent_at[seq]) * 1000.0)
+
+    async def send_json(self, payload):
+        if "sequence" in payload and payload.get("type") != "connected":
+            await self._arrive(payload["sequence"])
+
+    async def send_text(self, text):
+        msg = json.loads(text)
+        if "sequence" in msg:
+            await self._arrive(msg["sequence"])
+
+
+async def _run(push, args, legacy: bool) -> dict:
+    bc = push.PushBroadcaster(queue_max=args.queue_max)
+    sent_at: dict = {}
+    sockets = [_Socket(args.slow_ms / 1000.0 if i < args.slow else 0.0, sent_at) for i in range(args.sockets)]
+    for ws in sockets:
+        await bc.connect(ws, "lists", user_id="u1")
+
+    calls = []
+    wall = time.perf_counter()
+    for seq in range(1, args.events + 1):
+        sent_at[seq] = time.perf_counter()
+        if legacy:
+            message = {"type": "list_updated", "channel": "lists", "data": _PAYLOAD, "sequence": seq}
+            for ws in sockets:
+                await ws.send_json(message)
+        else:
+            await bc.broadcast("lists", "list_updated", _PAYLOAD)
+        calls.append((time.perf_counter() - sent_at[seq]) * 1000.0)
+        await asyncio.sleep(args.interval_ms / 1000.0)
+    elapsed = time.perf_counter() - wall
+    fast = [ms for ws in sockets[args.slow:] for ms in ws.arrivals]
+    report = {"fast_delivery_ms": _stats(fast), "broadcast_call_ms": _stats(calls),
+              "events_per_s": round(args.events / elapsed, 1)}
+    if not legacy:
+        report["slow_frames_delivered"] = sum(len(ws.arrivals) for ws in sockets[:args.slow])
+    for ws in sockets:
+        bc.disconnect(ws, "lists")
+    return report
+
+
+async def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import push
+
+    report: dict = {"kind": "push_fanout", "sockets": args.sockets, "slow": args.slow,
+                    "slow_ms": args.slow_ms, "events": args.events}
+    report["legacy"] = await _run(push, args, legacy=True)
+    report["queued"] = await _run(push, args, legacy=False)
+
+    for mode in ("legacy", "queued"):
+        r = report[mode]
+        print(f"{mode:>7}: fast delivery {r['fast_delivery_ms']}")
+        print(f"{'':>7}  broadcast() {r['broadcast_call_ms']}  {r['events_per_s']} events/s")
+    print(f"\nslow-socket frames delivered during the run: {report['queued']['slow_frames_delivered']}")
+    print(f"fast p50 ×{report['legacy']['fast_delivery_ms']['p50'] / max(report['queued']['fast_delivery_ms']['p50'], 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sockets", type=int, default=20, help="subscribers on the channel")
+    ap.add_argument("--slow", type=int, default=1, help="how many of them are slow")
+    ap.add_argument("--slow-ms", type=float, default=200.0, help="per-write delay of a slow socket")
+    ap.add_argument("--events", type=int, default=100, help="events to broadcast")
+    ap.add_argument("--interval-ms", type=float, default=5.0, help="gap between events")
+    ap.add_argument("--queue-max", type=int, default=256, help="per-connection queue bound")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping push fan-out probe (set ZOE_PERF=1 to run).")
+        return 0
+    return asyncio.run(_measure(str(resolve_service_dir(args.service_dir)), args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""zoe-auth RBAC probe — regex wildcard scan vs the compiled permission matcher.
+
+``RBACManager.check_permission`` used to build and ``re.match`` a regex for
+every wildcard grant the user held, on every check, and re-walked the role
+inheritance chain (one query per level) whenever the per-user cache lapsed.
+``CompiledPermissions`` resolves a role once into an exact set plus a segment
+trie of ``prefix.*`` grants, so a check is a set lookup plus O(segments) dict
+walks. This probe reports checks/second and per-check p50/p95 for:
+
+  * **legacy** — the old ``re.escape`` → ``re.match`` loop over the same
+    permission set (the pre-compile algorithm, inlined here for comparison).
+  * **compiled** — ``RBACManager.check_permission`` end to end (cache hit,
+    compiled matcher) — the live path.
+  * **multi** — ``check_multiple_permissions`` over ``--batch`` permissions.
+  * **recompile_ms** — one role-table reload after ``invalidate_roles()``.
+
+A mix of exact, wildcard-granted and denied permissions is drawn for each
+check. The target is >= 10k single checks/second.
+
+SAFETY: the roles/users tables live in a temp SQLite file patched in for
+``auth_db.get_connection``; the live auth database is never opened.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_rbac.py --checks 100000
+    ZOE_PERF=1 python3 scripts/perf/measure_rbac.py --wildcards 200 --json /tmp/rbac.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+AUTH_DIR = Path(__file__).resolve().parents[2] / "services" / "zoe-auth"
+AREAS = ("calendar", "lists", "shared", "ai", "lights", "music", "weather", "users", "roles", "audit")
+ACTIONS = ("read", "create", "update", "delete", "basic", "monitor")
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def _legacy_wildcards(permission: str, user_permissions: set[str]) -> list[str]:
+    granted = []
+    for user_perm in user_permissions:
+        if '*' in user_perm:
+            pattern = re.escape(user_perm).replace(r"\*", ".*")
+            if re.match(f"^{pattern}$", permission):
+                granted.append(user_perm)
+    return granted
+
+
+def _seed(db_path: str, args) -> list[str]:
+    rng = random.Random(11)
+    base = [f"{a}.{b}" for a in AREAS for b in ACTIONS if rng.random() < 0.5]
+    wildcards = [f"{rng.choice(AREAS)}.sub{i}.*" for i in range(args.wildcards)] + ["calendar.*"]
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE roles (role_id TEXT PRIMARY KEY, name TEXT, description TEXT,
+                            permissions TEXT, inherits_from TEXT, is_system INTEGER, created_at TEXT);
+        CREATE TABLE auth_users (user_id TEXT PRIMARY KEY, role TEXT, updated_at TEXT);
+        CREATE TABLE permissions (permission_id TEXT PRIMARY KEY, name TEXT, description TEXT,
+                                  resource TEXT, action TEXT, created_at TEXT);
+        """
+    )
+    conn.execute("INSERT INTO roles VALUES ('base', 'Base', '', ?, NULL, 1, '')", (json.dumps(base),))
+    conn.execute("INSERT INTO roles VALUES ('power', 'Power', '', ?, 'base', 1, '')", (json.dumps(wildcards),))
+    conn.execute("INSERT INTO auth_users VALUES ('perf-user', 'power', '')")
+    conn.commit()
+    conn.close()
+    return base + wildcards
+
+
+def _measure(args) -> int:
+    sys.path.insert(0, str(AUTH_DIR))
+    from core import rbac
+
+    workdir = tempfile.mkdtemp(prefix="zoe-rbac-perf-")
+    db_path = os.path.join(workdir, "auth.db")
+    granted = _seed(db_path, args)
+    rbac.auth_db.get_connection = lambda: sqlite3.connect(db_path)
+    manager = rbac.RBACManager()
+
+    rng = random.Random(5)
+    probes = []
+    for _ in range(args.checks):
+        roll = rng.random()
+        if roll < 0.4:
+            probes.append(rng.choice(granted).replace("*", "leaf"))
+        elif roll < 0.7:
+            probes.append(f"calendar.{rng.choice(ACTIONS)}.{rng.randint(0, 9)}")
+        else:
+            probes.append(f"{rng.choice(AREAS)}.denied{rng.randint(0, 99)}")
+    legacy_set = set(granted)
+
+    report: dict = {"kind": "rbac_check_latency", "checks": args.checks,
+                    "grants": len(granted), "wildcards": args.wildcards + 1}
+
+    manager.check_permission("perf-user", probes[0])  # warm the compiled role + user cache
+    for name, fn in (
+        ("legacy", lambda p: p in legacy_set or bool(_legacy_wildcards(p, legacy_set))),
+        ("compiled", lambda p: manager.check_permission("perf-user", p)),
+    ):
+        samples = []
+        wall = time.perf_counter()
+        for p in probes:
+            t = time.perf_counter()
+            fn(p)
+            samples.append((time.perf_counter() - t) * 1e6)
+        elapsed = time.perf_counter() - wall
+        report[name] = {"check_us": _stats(samples), "checks_per_s": round(len(probes) / elapsed)}
+        print(f"{name:>9}: {report[name]['checks_per_s']:>9} checks/s  {report[name]['check_us']}")
+
+    batches = [probes[i:i + args.batch] for i in range(0, len(probes), args.batch)]
+    wall = time.perf_counter()
+    for batch in batches:
+        manager.check_multiple_permissions("perf-user", batch)
+    elapsed = time.perf_counter() - wall
+    report["multi"] = {"batch": args.batch, "checks_per_s": round(len(probes) / elapsed)}
+    print(f"{'multi':>9}: {report['multi']['checks_per_s']:>9} checks/s  (batch={args.batch})")
+
+    t = time.perf_counter()
+    manager.invalidate_roles()
+    manager.check_permission("perf-user", probes[0])
+    report["recompile_ms"] = round((time.perf_counter() - t) * 1000.0, 2)
+    print(f"recompile: {report['recompile_ms']}ms")
+
+    target_ok = report["compiled"]["checks_per_s"] >= 10_000
+    print(f"\nspeedup ×{report['compiled']['checks_per_s'] / max(report['legacy']['checks_per_s'], 1):.1f}   "
+          f"10k checks/s target: {'met' if target_ok else 'MISSED'}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    os.unlink(db_path)
+    os.rmdir(workdir)
+    return 0 if target_ok else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--checks", type=int, default=50_000, help="permission checks per mode")
+    ap.add_argument("--wildcards", type=int, default=40, help="extra prefix.* grants on the role")
+    ap.add_argument("--batch", type=int, default=8, help="permissions per check_multiple_permissions call")
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping RBAC probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
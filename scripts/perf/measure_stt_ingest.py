@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""STT ingest probe — WAV temp-file round trip vs in-memory PCM for Moonshine.
+
+A LiveKit voice turn used to join its PCM frames, wrap them in a WAV header,
+write that to a ``NamedTemporaryFile``, and hand Moonshine the path.
+``_run_moonshine`` then re-read and re-parsed the file before converting to
+float. ``voice_tts._transcribe_pcm`` now joins the frames in memory, views
+them with ``np.frombuffer`` and scales one float32 array. This probe builds
+``--seconds`` of synthetic 16 kHz speech-band PCM as 20 ms frames (the
+LiveKit frame size) and times, per utterance in milliseconds:
+
+  * **file** — join + WAV encode + temp-file write + ``wave`` read +
+    int16 -> float32 (a numpy stand-in for ``load_wav_file``) + unlink.
+  * **memory** — ``voice_tts._pcm16_to_float32(frames)`` as shipped.
+
+Moonshine inference itself is the same in both and is not run. The probe
+also checks that both paths produce bit-identical samples.
+
+SAFETY: synthetic audio only; temp files live in the system temp dir and are
+removed after each iteration.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_stt_ingest.py
+    ZOE_PERF=1 python3 scripts/perf/measure_stt_ingest.py --seconds 8 --iterations 300 --json /tmp/stt_ingest.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+_FRAME_SAMPLES = 320  # 20 ms @ 16 kHz
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 3),
+        "p95": round(pct(0.95), 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def _frames(np, seconds: float) -> list[bytes]:
+    t = np.arange(int(seconds * 16000)) / 16000.0
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.random.default_rng(0).standard_normal(t.size)
+    pcm = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    return [pcm[i:i + _FRAME_SAMPLES].tobytes() for i in range(0, pcm.size, _FRAME_SAMPLES)]
+
+
+def _via_file(np, frames: list[bytes]):
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tf:
+        path = tf.name
+    try:
+        with wave.open(path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"".join(frames))
+        with wave.open(path, "rb") as wf:
+            raw = wf.readframes(wf.getnframes())
+        return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        os.unlink(path)
+
+
+def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import numpy as np
+    from routers import voice_tts
+
+    frames = _frames(np, args.seconds)
+    identical = bool(np.array_equal(_via_file(np, frames), voice_tts._pcm16_to_float32(frames)))
+
+    report: dict = {"kind": "stt_ingest", "seconds": args.seconds, "frames": len(frames),
+                    "iterations": args.iterations, "bit_identical": identical}
+    for mode, run in (("file", lambda: _via_file(np, frames)),
+                      ("memory", lambda: voice_tts._pcm16_to_float32(frames))):
+        run()  # warm
+        times = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - t0) * 1000.0)
+        report[mode] = _stats(times)
+        print(f"{mode:>7}: {report[mode]}")
+
+    print(f"\nbit-identical samples: {identical}")
+    print(f"p50 ×{report['file']['p50'] / max(report['memory']['p50'], 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0 if identical else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=4.0, help="utterance length")
+    ap.add_argument("--iterations", type=int, default=200, help="timed runs per mode")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping STT ingest probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(str(resolve_service_dir(args.service_dir)), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""STT pool probe — one global Moonshine lock vs the ``stt_pool`` worker pool.
+
+Every transcription used to run under one inference lock on one shared model,
+so two panels talking at once, or an ambient segment arriving mid-command,
+queued in arrival order. This probe drives ``stt_pool.SttPool`` with a
+replayed mix of traffic: ``--speakers`` concurrent command turns (INTERACTIVE),
+arriving together every ``--period-ms``, plus ambient segments (BACKGROUND) at
+``--ambient-per-s``. Inference is a sleep of ``--infer-ms`` standing in for
+Moonshine (ONNX releases the GIL just as ``time.sleep`` does). It compares:
+
+  * **lock** — ``size=1``: one instance, i.e. the old global lock, but with
+    priority ordering;
+  * **pool** — ``size=--workers`` (default: ``stt_pool.auto_size()`` here).
+
+For each it reports per-priority **queue wait** and **total** latency
+p50/p95 in ms, and how many jobs were shed by a full queue.
+
+SAFETY: in-process, no model, no network.
+
+CI gate: requires ``ZOE_PERF=1``; otherwise exits 0 with a skip.
+
+Usage:
+    ZOE_PERF=1 python3 scripts/perf/measure_stt_pool.py
+    ZOE_PERF=1 python3 scripts/perf/measure_stt_pool.py --speakers 3 --workers 3 --json /tmp/stt_pool.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib"))
+from service_dir import (  # noqa: E402 — sibling-import convention, scripts/ is not a package
+    resolve_service_dir,
+    SERVICE_DIR_HELP,
+)
+
+
+def _stats(values: list[float]) -> dict:
+    if not values:
+        return {}
+    vals = sorted(values)
+    n = len(vals)
+
+    def pct(p: float) -> float:
+        if n == 1:
+            return vals[0]
+        return vals[min(n - 1, max(0, int(round(p * (n - 1)))))]
+
+    return {
+        "n": n,
+        "p50": round(statistics.median(vals), 1),
+        "p95": round(pct(0.95), 1),
+        "max": round(vals[-1], 1),
+    }
+
+
+def _drive(stt_pool, size: int, args) -> dict:
+    pool = stt_pool.SttPool(lambda slot: slot, size=size, max_queue=args.max_queue)
+    infer_s = args.infer_ms / 1000.0
+    records: dict[str, dict[str, list[float]]] = {
+        "interactive": {"wait": [], "total": []},
+        "background": {"wait": [], "total": []},
+    }
+    shed = {"interactive": 0, "background": 0}
+    lock = threading.Lock()
+    futures = []
+
+    def submit(priority: int, label: str) -> None:
+        queued = time.perf_counter()
+        started: list[float] = []
+
+        def job(_instance):
+            started.append(time.perf_counter())
+            time.sleep(infer_s)
+
+        fut = pool.submit(job, priority)
+
+        def done(f, label=label, queued=queued, started=started):
+            with lock:
+                if f.exception() is not None:
+                    shed[label] += 1
+                    return
+                records[label]["wait"].append((started[0] - queued) * 1000.0)
+                records[label]["total"].append((time.perf_counter() - queued) * 1000.0)
+
+        fut.add_done_callback(done)
+        futures.append(fut)
+
+    # One warm job so no worker start-up lands in the measurement.
+    pool.submit(lambda _i: None).result()
+    t_end = time.perf_counter() + args.seconds
+    next_turn = next_ambient = time.perf_counter()
+    ambient_gap = 1.0 / args.ambient_per_s if args.ambient_per_s > 0 else None
+    while time.perf_counter() < t_end:
+        now = time.perf_counter()
+        if now >= next_turn:
+            for _ in range(args.speakers):
+                submit(stt_pool.INTERACTIVE, "interactive")
+            next_turn += args.period_ms / 1000.0
+        if ambient_gap is not None and now >= next_ambient:
+            submit(stt_pool.BACKGROUND, "background")
+            next_ambient += ambient_gap
+        time.sleep(0.002)
+    for fut in futures:
+        try:
+            fut.result(timeout=60)
+        except Exception:
+            pass
+
+    return {
+        "size": size,
+        **{
+            label: {
+                "queue_wait_ms": _stats(rec["wait"]),
+                "total_ms": _stats(rec["total"]),
+                "shed": shed[label],
+            }
+            for label, rec in records.items()
+        },
+    }
+
+
+def _measure(service_dir: str, args) -> int:
+    sys.path.insert(0, service_dir)
+    import stt_pool
+
+    workers = args.workers or stt_pool.auto_size()
+    report: dict = {"kind": "stt_pool", "speakers": args.speakers, "period_ms": args.period_ms,
+                    "ambient_per_s": args.ambient_per_s, "infer_ms": args.infer_ms,
+                    "seconds": args.seconds, "max_queue": args.max_queue}
+    for mode, size in (("lock", 1), ("pool", workers)):
+        report[mode] = _drive(stt_pool, size, args)
+        print(f"{mode} (size={size}):")
+        for label in ("interactive", "background"):
+            row = report[mode][label]
+            print(f"  {label:>11}: wait {row['queue_wait_ms']}  total {row['total_ms']}  shed {row['shed']}")
+
+    lock_p95 = report["lock"]["interactive"]["total_ms"].get("p95")
+    pool_p95 = report["pool"]["interactive"]["total_ms"].get("p95")
+    if lock_p95 and pool_p95:
+        print(f"\ninteractive total p95 ×{lock_p95 / max(pool_p95, 0.001):.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--speakers", type=int, default=2, help="command turns arriving together")
+    ap.add_argument("--period-ms", type=float, default=1500.0, help="gap between turn bursts")
+    ap.add_argument("--ambient-per-s", type=float, default=0.5, help="ambient segments per second")
+    ap.add_argument("--infer-ms", type=float, default=500.0, help="simulated inference time per job")
+    ap.add_argument("--workers", type=int, default=0, help="pool size (0 = stt_pool.auto_size())")
+    ap.add_argument("--max-queue", type=int, default=6, help="ZOE_STT_MAX_QUEUE equivalent")
+    ap.add_argument("--seconds", type=float, default=10.0, help="traffic duration per mode")
+    ap.add_argument("--service-dir", default=None, help=SERVICE_DIR_HELP)
+    ap.add_argument("--json", help="write machine-readable results here")
+    args = ap.parse_args()
+
+    if os.environ.get("ZOE_PERF") != "1":
+        print("ZOE_PERF != 1 — skipping STT pool probe (set ZOE_PERF=1 to run).")
+        return 0
+    return _measure(str(resolve_service_dir(args.service_dir)), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+In-memory mirror of Home Assistant entity state.
+
+Every read endpoint used to fetch ``GET /api/states`` (the whole house) and
+filter it, so one smart-home card cost several full state dumps. The mirror
+connects to HA's websocket API once, seeds itself with ``get_states`` plus the
+entity/device/area registries, and then applies ``state_changed`` events as
+they arrive. Reads are served from memory through a domain index and an area
+index.
+
+On every (re)connect the mirror resyncs from scratch: it subscribes first,
+buffers events while the snapshot is in flight, then replays them on top of
+it, so nothing changed during the gap is lost. While disconnected ``ready`` is
+False and callers fall back to the REST API.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_EVENTS = ("entity_registry_updated", "device_registry_updated", "area_registry_updated")
+
+
+def websocket_url(base_url: str) -> str:
+    """``http://ha:8123`` -> ``ws://ha:8123/api/websocket`` (https -> wss)."""
+    url = base_url.rstrip("/")
+    if url.startswith("https://"):
+        url = "wss://" + url[len("https://"):]
+    elif url.startswith("http://"):
+        url = "ws://" + url[len("http://"):]
+    return f"{url}/api/websocket"
+
+
+class StateMirror:
+    def __init__(self, base_url: str, access_token: str, retry_max_s: float = 30.0):
+        self.url = websocket_url(base_url)
+        self.access_token = access_token
+        self.retry_max_s = retry_max_s
+        self.ready = False
+        self._states: Dict[str, Dict] = {}
+        self._domains: Dict[str, Set[str]] = {}
+        self._entity_area: Dict[str, str] = {}
+        self._area_names: Dict[str, str] = {}
+        self._areas: Dict[str, Set[str]] = {}
+        self._buffer: Optional[List[Dict]] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._registry_task: Optional[asyncio.Task] = None
+        self._counts = {"events": 0, "resyncs": 0, "disconnects": 0}
+        self._last_event_at: Optional[float] = None
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def states(self) -> List[Dict]:
+        return list(self._states.values())
+
+    def get(self, entity_id: str) -> Optional[Dict]:
+        return self._states.get(entity_id)
+
+    def by_domain(self, domain: str) -> List[Dict]:
+        return [self._states[e] for e in sorted(self._domains.get(domain, ()))]
+
+    def by_area(self, area: str) -> List[Dict]:
+        """Entities in an area, matched by area id or (case-insensitive) name."""
+        area_id = area if area in self._area_names else next(
+            (a for a, name in self._area_names.items() if name.lower() == area.lower()), area
+        )
+        return [self._states[e] for e in sorted(self._areas.get(area_id, ())) if e in self._states]
+
+    def area_of(self, entity_id: str) -> Optional[str]:
+        area_id = self._entity_area.get(entity_id)
+        return self._area_names.get(area_id, area_id) if area_id else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "entities": len(self._states),
+            "areas": len(self._area_names),
+            **self._counts,
+            "last_event_age_s": round(time.monotonic() - self._last_event_at, 1)
+            if self._last_event_at is not None else None,
+        }
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.ready = False
+
+    async def _run(self) -> None:
+        try:
+            from websockets.asyncio.client import connect
+        except ImportError:
+            logger.warning("websockets is not installed; HA state mirror disabled, reads use REST")
+            return
+        backoff = 1.0
+        while True:
+            try:
+                async with connect(self.url, max_size=None) as ws:
+                    await self._session(ws)
+                    backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("HA state mirror connection lost: %s", e)
+            finally:
+                if self.ready:
+                    self._counts["disconnects"] += 1
+                self.ready = False
+                self._ws = None
+                self._fail_pending()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.retry_max_s)
+
+    async def _session(self, ws) -> None:
+        await self._authenticate(ws)
+        self._ws = ws
+        reader = asyncio.create_task(self._read(ws))
+        try:
+            await self._call("subscribe_events", event_type="state_changed")
+            for event_type in REGISTRY_EVENTS:
+                await self._call("subscribe_events", event_type=event_type)
+            await self._resync()
+            await reader
+        finally:
+            reader.cancel()
+            if self._registry_task is not None:
+                self._registry_task.cancel()
+
+    async def _authenticate(self, ws) -> None:
+        hello = json.loads(await ws.recv())
+        if hello.get("type") != "auth_required":
+            raise ConnectionError(f"unexpected HA websocket greeting: {hello.get('type')}")
+        await ws.send(json.dumps({"type": "auth", "access_token": self.access_token}))
+        reply = json.loads(await ws.recv())
+        if reply.get("type") != "auth_ok":
+            raise ConnectionError(f"HA websocket auth failed: {reply.get('message', reply.get('type'))}")
+
+    # ── Protocol ─────────────────────────────────────────────────────────────
+
+    async def _call(self, msg_type: str, **fields) -> Any:
+        self._next_id += 1
+        msg_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        await self._ws.send(json.dumps({"id": msg_id, "type": msg_type, **fields}))
+        return await asyncio.wait_for(future, timeout=30.0)
+
+    async def _read(self, ws) -> None:
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg.get("type") == "result":
+                future = self._pending.pop(msg.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if msg.get("success"):
+                    future.set_result(msg.get("result"))
+                else:
+                    future.set_exception(RuntimeError(str(msg.get("error"))))
+            elif msg.get("type") == "event":
+                self._on_event(msg.get("event") or {})
+
+    def _fail_pending(self) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("HA websocket closed"))
+        self._pending.clear()
+
+    def _on_event(self, event: Dict) -> None:
+        event_type = event.get("event_type")
+        if event_type in REGISTRY_EVENTS:
+            if self._buffer is None and (self._registry_task is None or self._registry_task.done()):
+                self._registry_task = asyncio.create_task(self._load_registries())
+            return
+        if event_type != "state_changed":
+            return
+        self._counts["events"] += 1
+        self._last_event_at = time.monotonic()
+        if self._buffer is not None:
+            self._buffer.append(event.get("data") or {})
+        else:
+            self._apply(event.get("data") or {})
+
+    # ── State ────────────────────────────────────────────────────────────────
+
+    async def _resync(self) -> None:
+        self._buffer = []
+        states = await self._call("get_states")
+        fresh: Dict[str, Dict] = {s["entity_id"]: s for s in states or [] if s.get("entity_id")}
+        self._states = fresh
+        self._domains = {}
+        for entity_id in fresh:
+            self._domains.setdefault(entity_id.split(".", 1)[0], set()).add(entity_id)
+        buffered, self._buffer = self._buffer, None
+        for data in buffered:
+            self._apply(data)
+        await self._load_registries()
+        self._counts["resyncs"] += 1
+        self.ready = True
+        logger.info("HA state mirror synced: %d entities, %d areas", len(self._states), len(self._area_names))
+
+    def _apply(self, data: Dict) -> None:
+        entity_id = data.get("entity_id")
+        if not entity_id:
+            return
+        new_state = data.get("new_state")
+        domain = entity_id.split(".", 1)[0]
+        if new_state is None:
+            self._states.pop(entity_id, None)
+            self._domains.get(domain, set()).discard(entity_id)
+            return
+        self._states[entity_id] = new_state
+        self._domains.setdefault(domain, set()).add(entity_id)
+
+    async def _load_registries(self) -> None:
+        """Area index from the registries. Needs an admin token; without one
+        the area index stays empty and everything else still works."""
+        try:
+            areas = await self._call("config/area_registry/list")
+            devices = await self._call("config/device_registry/list")
+            entities = await self._call("config/entity_registry/list")
+        except (RuntimeError, asyncio.TimeoutError) as e:
+            logger.info("HA registries unavailable, area index disabled: %s", e)
+            return
+        self._area_names = {a["area_id"]: a.get("name") or a["area_id"] for a in areas or []}
+        device_area = {d["id"]: d.get("area_id") for d in devices or [] if d.get("id")}
+        entity_area: Dict[str, str] = {}
+        for entry in entities or []:
+            area_id = entry.get("area_id") or device_area.get(entry.get("device_id"))
+            if area_id and entry.get("entity_id"):
+                entity_area[entry["entity_id"]] = area_id
+        index: Dict[str, Set[str]] = {}
+        for entity_id, area_id in entity_area.items():
+            index.setdefault(area_id, set()).add(entity_id)
+        self._entity_area = entity_area
+        self._areas = index
@@ -13,70 +13,101 @@ import json
 import os
 import sys
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append('/app')
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-app = FastAPI(title="Zoe Home Assistant MCP Bridge", version="1.0.0")
+from ha_state_mirror import StateMirror
 
 # Configuration
 HA_BASE_URL = os.getenv("HA_BASE_URL", "http://homeassistant:8123")
 HA_ACCESS_TOKEN = os.getenv("HA_ACCESS_TOKEN", "")
+HA_STATE_MIRROR = os.getenv("HA_STATE_MIRROR", "true").lower() in ("1", "true", "yes", "on")
 ZOE_HA_VOICE_INGRESS_URL = os.getenv("ZOE_HA_VOICE_INGRESS_URL", "http://host.docker.internal:8000").rstrip("/")
 ZOE_HA_VOICE_TOKEN = os.getenv("ZOE_HA_VOICE_TOKEN", "")
 
 # Initialize Home Assistant bridge service
 class HomeAssistantBridge:
-    def __init__(self, base_url: str, access_token: str):
+    def __init__(self, base_url: str, access_token: str, mirror: Optional[StateMirror] = None):
         self.base_url = base_url.rstrip('/')
         self.access_token = access_token
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
+        # Reads come from the websocket state mirror while it is in sync;
+        # the REST API is the fallback.
+        self.mirror = mirror
+        # Shared client for the app's lifetime (set in lifespan); None = one per request.
+        self.client: Optional[httpx.AsyncClient] = None
     
     async def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
         """Make HTTP request to Home Assistant API"""
-        url = f"{self.base_url}/api/{endpoint}"
-        
+        if self.client is not None:
+            return await self._send(self.client, method, endpoint, data)
         async with httpx.AsyncClient() as client:
-            try:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=self.headers, timeout=10.0)
-                elif method.upper() == "POST":
-                    response = await client.post(url, headers=self.headers, json=data, timeout=10.0)
-                elif method.upper() == "PUT":
-                    response = await client.put(url, headers=self.headers, json=data, timeout=10.0)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
+            return await self._send(client, method, endpoint, data)
+
+    async def _send(self, client, method: str, endpoint: str, data: Dict = None) -> Dict:
+        url = f"{self.base_url}/api/{endpoint}"
+        try:
+            if method.upper() == "GET":
+                response = await client.get(url, headers=self.headers, timeout=10.0)
+            elif method.upper() == "POST":
+                response = await client.post(url, headers=self.headers, json=data, timeout=10.0)
+            elif method.upper() == "PUT":
+                response = await client.put(url, headers=self.headers, json=data, timeout=10.0)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail="Home Assistant request failed",
+                )
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail="Home Assistant request failed",
-                    )
-                    
-            except httpx.TimeoutException:
-                raise HTTPException(status_code=408, detail="Home Assistant request timeout")
-            except httpx.ConnectError:
-                raise HTTPException(status_code=503, detail="Cannot connect to Home Assistant")
-            except HTTPException:
-                raise
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Home Assistant API error: {str(e)}")
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=408, detail="Home Assistant request timeout")
+        except httpx.ConnectError:
+            raise HTTPException(status_code=503, detail="Cannot connect to Home Assistant")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Home Assistant API error: {str(e)}")
+
+    def _mirror_ready(self) -> bool:
+        return self.mirror is not None and self.mirror.ready
 
     async def _get_states_by_domain(self, domain: str) -> List[Dict]:
         """Get Home Assistant state entities for a domain."""
+        if self._mirror_ready():
+            return self.mirror.by_domain(domain)
         prefix = f"{domain}."
         states = await self.get_states()
         return [s for s in states if s.get("entity_id", "").startswith(prefix)]
     
     async def get_states(self) -> List[Dict]:
         """Get all entity states from Home Assistant"""
+        if self._mirror_ready():
+            return self.mirror.states()
         return await self._make_request("GET", "states")
+
+    async def get_state(self, entity_id: str) -> Dict:
+        """Get one entity's state (404 if Home Assistant doesn't know it)"""
+        if self._mirror_ready():
+            state = self.mirror.get(entity_id)
+            if state is None:
+                raise HTTPException(status_code=404, detail="Entity not found")
+            return state
+        return await self._make_request("GET", f"states/{entity_id}")
+
+    def area_of(self, entity_id: str) -> Optional[str]:
+        return self.mirror.area_of(entity_id) if self._mirror_ready() else None
     
     async def get_services(self) -> Dict:
         """Get all available services from Home Assistant"""
@@ -122,7 +153,24 @@ class HomeAssistantBridge:
         return await self.call_service("script", "turn_on", script_id, data)
 
 # Initialize bridge
-ha_bridge = HomeAssistantBridge(HA_BASE_URL, HA_ACCESS_TOKEN)
+ha_mirror = StateMirror(HA_BASE_URL, HA_ACCESS_TOKEN)
+ha_bridge = HomeAssistantBridge(HA_BASE_URL, HA_ACCESS_TOKEN, mirror=ha_mirror)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ha_bridge.client = httpx.AsyncClient()
+    if HA_STATE_MIRROR and HA_ACCESS_TOKEN:
+        await ha_mirror.start()
+    try:
+        yield
+    finally:
+        await ha_mirror.stop()
+        client, ha_bridge.client = ha_bridge.client, None
+        await client.aclose()
+
+
+app = FastAPI(title="Zoe Home Assistant MCP Bridge", version="1.0.0", lifespan=lifespan)
 
 # Pydantic models
 class DeviceControlRequest(BaseModel):
@@ -165,7 +213,8 @@ async def root():
             "status": "healthy",
             "version": "1.0.0",
             "ha_connected": True,
-            "entities_count": len(states)
+            "entities_count": len(states),
+            "state_mirror": ha_mirror.stats()
         }
     except Exception as e:
         return {
@@ -173,37 +222,34 @@ async def root():
             "status": "unhealthy",
             "version": "1.0.0",
             "ha_connected": False,
-            "error": str(e)
+            "error": str(e),
+            "state_mirror": ha_mirror.stats()
         }
 
 @app.get("/entities")
 async def get_entities(
     domain: Optional[str] = Query(None, description="Filter by domain (e.g., 'light', 'switch', 'sensor')"),
-    state: Optional[str] = Query(None, description="Filter by state (e.g., 'on', 'off')")
+    state: Optional[str] = Query(None, description="Filter by state (e.g., 'on', 'off')"),
+    area: Optional[str] = Query(None, description="Filter by area id or name (needs the state mirror)")
 ):
     """Get all entities from Home Assistant with optional filtering"""
     try:
-        states = await ha_bridge.get_states()
-        
-        # Filter by domain if specified
-        if domain:
-            states = [s for s in states if s.get("entity_id", "").startswith(f"{domain}.")]
+        if area:
+            if not ha_bridge._mirror_ready():
+                raise HTTPException(status_code=503, detail="Area filtering needs the Home Assistant state mirror")
+            states = ha_mirror.by_area(area)
+            if domain:
+                states = [s for s in states if s.get("entity_id", "").startswith(f"{domain}.")]
+        elif domain:
+            states = await ha_bridge._get_states_by_domain(domain)
+        else:
+            states = await ha_bridge.get_states()
         
         # Filter by state if specified
         if state:
             states = [s for s in states if s.get("state") == state]
         
-        # Format response
-        entities = []
-        for state in states:
-            entities.append({
-                "entity_id": state.get("entity_id"),
-                "state": state.get("state"),
-                "attributes": state.get("attributes", {}),
-                "last_changed": state.get("last_changed"),
-                "last_updated": state.get("last_updated")
-            })
-        
+        entities = [_format_entity(s) for s in states]
         return {"entities": entities, "count": len(entities)}
         
     except HTTPException as e:
@@ -226,19 +272,11 @@ async def get_entities(
 async def get_entity(entity_id: str):
     """Get specific entity state from Home Assistant"""
     try:
-        states = await ha_bridge.get_states()
-        
-        entity = next((s for s in states if s.get("entity_id") == entity_id), None)
+        entity = await ha_bridge.get_state(entity_id)
         if not entity:
             raise HTTPException(status_code=404, detail="Entity not found")
         
-        return {
-            "entity_id": entity.get("entity_id"),
-            "state": entity.get("state"),
-            "attributes": entity.get("attributes", {}),
-            "last_changed": entity.get("last_changed"),
-            "last_updated": entity.get("last_updated")
-        }
+        return _format_entity(entity)
         
     except HTTPException:
         raise
@@ -323,26 +361,98 @@ async def control_device(request: DeviceControlRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _format_entity(state: Dict) -> Dict:
+    return {
+        "entity_id": state.get("entity_id"),
+        "state": state.get("state"),
+        "attributes": state.get("attributes", {}),
+        "last_changed": state.get("last_changed"),
+        "last_updated": state.get("last_updated")
+    }
+
+
+def _format_light(light: Dict) -> Dict:
+    attributes = light.get("attributes", {})
+    return {
+        "entity_id": light.get("entity_id"),
+        "name": attributes.get("friendly_name", light.get("entity_id")),
+        "state": light.get("state"),
+        "brightness": attributes.get("brightness"),
+        "color_temp": attributes.get("color_temp"),
+        "rgb_color": attributes.get("rgb_color"),
+        "supported_features": attributes.get("supported_features", 0)
+    }
+
+
+def _format_switch(switch: Dict) -> Dict:
+    attributes = switch.get("attributes", {})
+    return {
+        "entity_id": switch.get("entity_id"),
+        "name": attributes.get("friendly_name", switch.get("entity_id")),
+        "state": switch.get("state"),
+        "device_class": attributes.get("device_class")
+    }
+
+
+def _format_sensor(sensor: Dict) -> Dict:
+    attributes = sensor.get("attributes", {})
+    return {
+        "entity_id": sensor.get("entity_id"),
+        "name": attributes.get("friendly_name", sensor.get("entity_id")),
+        "state": sensor.get("state"),
+        "unit_of_measurement": attributes.get("unit_of_measurement"),
+        "device_class": attributes.get("device_class")
+    }
+
+
+@app.get("/devices")
+async def get_devices():
+    """Lights, switches and input_boolean helpers in one snapshot.
+
+    Same row shapes as /lights, /switches and /entities?domain=input_boolean,
+    plus each row's Home Assistant area when the state mirror knows it. With the
+    mirror in sync this costs no Home Assistant request at all; otherwise it is
+    one state dump instead of three.
+    """
+    try:
+        if ha_bridge._mirror_ready():
+            by_domain = {d: ha_mirror.by_domain(d) for d in ("light", "switch", "input_boolean")}
+            source = "mirror"
+        else:
+            states = await ha_bridge.get_states()
+            by_domain = {"light": [], "switch": [], "input_boolean": []}
+            for s in states:
+                domain = s.get("entity_id", "").split(".")[0]
+                if domain in by_domain:
+                    by_domain[domain].append(s)
+            source = "rest"
+
+        def with_area(row: Dict) -> Dict:
+            row["area"] = ha_bridge.area_of(row["entity_id"])
+            return row
+
+        lights = [with_area(_format_light(s)) for s in by_domain["light"]]
+        switches = [with_area(_format_switch(s)) for s in by_domain["switch"]]
+        entities = [with_area(_format_entity(s)) for s in by_domain["input_boolean"]]
+        return {
+            "lights": lights,
+            "switches": switches,
+            "entities": entities,
+            "count": len(lights) + len(switches) + len(entities),
+            "source": source
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/lights")
 async def get_lights():
     """Get all lights from Home Assistant"""
     try:
-        states = await ha_bridge.get_states()
-        lights = [s for s in states if s.get("entity_id", "").startswith("light.")]
-        
-        formatted_lights = []
-        for light in lights:
-            attributes = light.get("attributes", {})
-            formatted_lights.append({
-                "entity_id": light.get("entity_id"),
-                "name": attributes.get("friendly_name", light.get("entity_id")),
-                "state": light.get("state"),
-                "brightness": attributes.get("brightness"),
-                "color_temp": attributes.get("color_temp"),
-                "rgb_color": attributes.get("rgb_color"),
-                "supported_features": attributes.get("supported_features", 0)
-            })
-        
+        lights = await ha_bridge._get_states_by_domain("light")
+        formatted_lights = [_format_light(light) for light in lights]
         return {"lights": formatted_lights, "count": len(formatted_lights)}
 
     except HTTPException:
@@ -354,19 +464,8 @@ async def get_lights():
 async def get_switches():
     """Get all switches from Home Assistant"""
     try:
-        states = await ha_bridge.get_states()
-        switches = [s for s in states if s.get("entity_id", "").startswith("switch.")]
-        
-        formatted_switches = []
-        for switch in switches:
-            attributes = switch.get("attributes", {})
-            formatted_switches.append({
-                "entity_id": switch.get("entity_id"),
-                "name": attributes.get("friendly_name", switch.get("entity_id")),
-                "state": switch.get("state"),
-                "device_class": attributes.get("device_class")
-            })
-        
+        switches = await ha_bridge._get_states_by_domain("switch")
+        formatted_switches = [_format_switch(switch) for switch in switches]
         return {"switches": formatted_switches, "count": len(formatted_switches)}
 
     except HTTPException:
@@ -378,20 +477,8 @@ async def get_switches():
 async def get_sensors():
     """Get all sensors from Home Assistant"""
     try:
-        states = await ha_bridge.get_states()
-        sensors = [s for s in states if s.get("entity_id", "").startswith("sensor.")]
-        
-        formatted_sensors = []
-        for sensor in sensors:
-            attributes = sensor.get("attributes", {})
-            formatted_sensors.append({
-                "entity_id": sensor.get("entity_id"),
-                "name": attributes.get("friendly_name", sensor.get("entity_id")),
-                "state": sensor.get("state"),
-                "unit_of_measurement": attributes.get("unit_of_measurement"),
-                "device_class": attributes.get("device_class")
-            })
-        
+        sensors = await ha_bridge._get_states_by_domain("sensor")
+        formatted_sensors = [_format_sensor(sensor) for sensor in sensors]
         return {"sensors": formatted_sensors, "count": len(formatted_sensors)}
 
     except HTTPException:
@@ -0,0 +1,187 @@
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+websockets_server = pytest.importorskip("websockets.asyncio.server")
+
+BRIDGE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BRIDGE_DIR))
+
+from ha_state_mirror import StateMirror  # noqa: E402
+
+
+def _state(entity_id, state, **attributes):
+    return {"entity_id": entity_id, "state": state, "attributes": attributes}
+
+
+class FakeHomeAssistant:
+    """Just enough of HA's websocket API: auth, subscribe_events, get_states
+    and the three registry lists, plus pushing state_changed events."""
+
+    def __init__(self):
+        self.states = {
+            "light.kitchen": _state("light.kitchen", "off", friendly_name="Kitchen", brightness=None),
+            "switch.kettle": _state("switch.kettle", "off", friendly_name="Kettle"),
+            "input_boolean.fan": _state("input_boolean.fan", "on", friendly_name="Fan"),
+            "sensor.temp": _state("sensor.temp", "21.0", unit_of_measurement="°C"),
+        }
+        self.areas = [{"area_id": "kitchen", "name": "Kitchen"}]
+        self.devices = [{"id": "dev-kettle", "area_id": "kitchen"}]
+        self.entities = [
+            {"entity_id": "light.kitchen", "area_id": "kitchen", "device_id": None},
+            {"entity_id": "switch.kettle", "area_id": None, "device_id": "dev-kettle"},
+        ]
+        self.connections = []
+        self.get_states_calls = 0
+        self._subscriptions = {}
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await websockets_server.serve(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, ws):
+        self.connections.append(ws)
+        await ws.send(json.dumps({"type": "auth_required"}))
+        auth = json.loads(await ws.recv())
+        if auth.get("access_token") != "token":
+            await ws.send(json.dumps({"type": "auth_invalid", "message": "bad token"}))
+            return
+        await ws.send(json.dumps({"type": "auth_ok"}))
+        async for raw in ws:
+            msg = json.loads(raw)
+            result = None
+            if msg["type"] == "subscribe_events":
+                self._subscriptions[(ws, msg["event_type"])] = msg["id"]
+            elif msg["type"] == "get_states":
+                self.get_states_calls += 1
+                result = list(self.states.values())
+            elif msg["type"] == "config/area_registry/list":
+                result = self.areas
+            elif msg["type"] == "config/device_registry/list":
+                result = self.devices
+            elif msg["type"] == "config/entity_registry/list":
+                result = self.entities
+            await ws.send(json.dumps({"id": msg["id"], "type": "result", "success": True, "result": result}))
+
+    async def change(self, entity_id, new_state):
+        """Update HA's state and push state_changed to every live subscriber."""
+        if new_state is None:
+            self.states.pop(entity_id, None)
+        else:
+            self.states[entity_id] = new_state
+        event = {"event_type": "state_changed", "data": {"entity_id": entity_id, "new_state": new_state}}
+        for (ws, event_type), sub_id in list(self._subscriptions.items()):
+            if event_type == "state_changed" and ws.state.name == "OPEN":
+                await ws.send(json.dumps({"id": sub_id, "type": "event", "event": event}))
+
+    async def drop_connections(self):
+        for ws in self.connections:
+            await ws.close()
+        self._subscriptions.clear()
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_mirror_seeds_indexes_and_follows_state_changed():
+    async with FakeHomeAssistant() as ha:
+        mirror = StateMirror(ha.base_url, "token", retry_max_s=0.05)
+        await mirror.start()
+        try:
+            await _until(lambda: mirror.ready)
+            assert [s["entity_id"] for s in mirror.by_domain("light")] == ["light.kitchen"]
+            assert [s["entity_id"] for s in mirror.by_area("Kitchen")] == ["light.kitchen", "switch.kettle"]
+            assert mirror.area_of("switch.kettle") == "Kitchen"
+
+            await ha.change("light.kitchen", _state("light.kitchen", "on", friendly_name="Kitchen", brightness=200))
+            await ha.change("light.porch", _state("light.porch", "on", friendly_name="Porch"))
+            await ha.change("sensor.temp", None)
+            await _until(lambda: mirror.get("light.porch") is not None)
+
+            assert mirror.get("light.kitchen")["state"] == "on"
+            assert [s["entity_id"] for s in mirror.by_domain("light")] == ["light.kitchen", "light.porch"]
+            assert mirror.by_domain("sensor") == [] and mirror.get("sensor.temp") is None
+            assert ha.get_states_calls == 1 and mirror.stats()["events"] == 3
+        finally:
+            await mirror.stop()
+
+
+@pytest.mark.asyncio
+async def test_mirror_resyncs_after_reconnect():
+    async with FakeHomeAssistant() as ha:
+        mirror = StateMirror(ha.base_url, "token", retry_max_s=0.05)
+        await mirror.start()
+        try:
+            await _until(lambda: mirror.ready)
+            await ha.drop_connections()
+            await _until(lambda: not mirror.ready)
+            # Changed while the mirror was disconnected: no event reaches it.
+            ha.states["switch.kettle"] = _state("switch.kettle", "on", friendly_name="Kettle")
+
+            await _until(lambda: mirror.ready)
+            assert mirror.get("switch.kettle")["state"] == "on"
+            assert ha.get_states_calls == 2
+            assert mirror.stats()["resyncs"] == 2 and mirror.stats()["disconnects"] == 1
+        finally:
+            await mirror.stop()
+
+
+def _load_bridge_module():
+    spec = importlib.util.spec_from_file_location("ha_bridge_mirror_main", BRIDGE_DIR / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_reads_are_served_from_the_mirror_without_rest(monkeypatch):
+    bridge = _load_bridge_module()
+
+    async def no_rest(*args, **kwargs):
+        raise AssertionError("read went to the REST API")
+
+    monkeypatch.setattr(bridge.ha_bridge, "_make_request", no_rest)
+    mirror = bridge.ha_mirror
+    mirror._states = {s["entity_id"]: s for s in [
+        _state("light.kitchen", "on", friendly_name="Kitchen", brightness=120),
+        _state("switch.kettle", "off", friendly_name="Kettle"),
+        _state("input_boolean.fan", "on", friendly_name="Fan"),
+        _state("sensor.temp", "21.0"),
+    ]}
+    mirror._domains = {}
+    for entity_id in mirror._states:
+        mirror._domains.setdefault(entity_id.split(".")[0], set()).add(entity_id)
+    mirror._area_names = {"kitchen": "Kitchen"}
+    mirror._entity_area = {"light.kitchen": "kitchen"}
+    mirror._areas = {"kitchen": {"light.kitchen"}}
+    mirror.ready = True
+    client = TestClient(bridge.app)
+
+    devices = client.get("/devices").json()
+    assert devices["source"] == "mirror" and devices["count"] == 3
+    assert devices["lights"][0]["brightness"] == 120 and devices["lights"][0]["area"] == "Kitchen"
+    assert [s["entity_id"] for s in devices["switches"]] == ["switch.kettle"]
+    assert [e["entity_id"] for e in devices["entities"]] == ["input_boolean.fan"]
+
+    assert client.get("/lights").json()["count"] == 1
+    assert client.get("/entities/sensor.temp").json()["state"] == "21.0"
+    assert client.get("/entities/light.missing").status_code == 404
+    assert client.get("/entities", params={"area": "kitchen"}).json()["count"] == 1
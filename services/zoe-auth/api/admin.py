@@ -14,6 +14,7 @@ from core.auth import auth_manager
 from core.passcode import passcode_manager
 from core.sessions import session_manager
 from core.rbac import rbac_manager
+from core.invalidation import invalidation_notifier
 from core.security import rate_limiter
 from core.account_setup import setup_token_manager, DEFAULT_TOKEN_TTL_MINUTES
 from models.database import auth_db
@@ -197,6 +198,8 @@ async def update_user(
             # Invalidate user's permission cache if role changed
             if request.role is not None:
                 rbac_manager.permission_cache.invalidate_user(user_id)
+            if request.role is not None or request.is_active is not None:
+                invalidation_notifier.users([user_id], reason="role_change")
 
         # Get updated user info
         updated_user = auth_manager.get_user_info(user_id)
@@ -0,0 +1,145 @@
+"""
+Push session invalidations to zoe-data.
+
+zoe-data caches validated sessions for ZOE_AUTH_CACHE_TTL_S (auth.get_current_user)
+so a page load's burst of API calls costs one round trip here, not dozens.
+Without a push, a logout, role change or escalation in zoe-auth stays invisible
+to zoe-data until that TTL lapses. The notifier queues the affected session and
+user ids and a daemon thread POSTs them, batched, to zoe-data's internal
+``/api/auth/invalidate`` endpoint.
+
+zoe-auth runs in a container and zoe-data on the host, so docker-compose sets
+ZOE_DATA_URL to host.docker.internal; that hop is not loopback, so zoe-data
+only accepts it with a matching ZOE_INTERNAL_TOKEN.
+
+Delivery is best-effort with a short retry: if zoe-data is down its cache is
+empty after restart anyway, and the TTL still bounds staleness otherwise.
+Callers never block on the network.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_BATCH_MAX = 500
+_BATCH_WINDOW_S = 0.05
+_RETRY_DELAYS_S = (0.5, 2.0)
+
+
+class InvalidationNotifier:
+    """Queue of (kind, id, reason) drained by one background sender thread."""
+
+    def __init__(self, url: Optional[str] = None, token: Optional[str] = None,
+                 enabled: Optional[bool] = None, background: bool = True):
+        base = os.getenv("ZOE_DATA_URL", "http://localhost:8000").rstrip("/")
+        self.url = url or f"{base}/api/auth/invalidate"
+        self.token = token if token is not None else os.getenv("ZOE_INTERNAL_TOKEN", "")
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("ZOE_AUTH_PUSH_INVALIDATION", "1").strip().lower() not in ("0", "false", "no")
+        )
+        self.background = background
+        self._queue: "queue.Queue[Tuple[str, str, str]]" = queue.Queue(maxsize=10000)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+
+    def sessions(self, session_ids: Iterable[str], reason: str) -> None:
+        """Tell zoe-data these sessions are gone or changed."""
+        self._enqueue("session", session_ids, reason)
+
+    def users(self, user_ids: Iterable[str], reason: str) -> None:
+        """Tell zoe-data every cached session of these users is stale."""
+        self._enqueue("user", user_ids, reason)
+
+    def _enqueue(self, kind: str, ids: Iterable[str], reason: str) -> None:
+        if not self.enabled:
+            return
+        for item in ids:
+            if not item:
+                continue
+            try:
+                self._queue.put_nowait((kind, item, reason))
+            except queue.Full:
+                logger.warning("Invalidation queue full; dropping %s %s (zoe-data TTL applies)", kind, reason)
+                return
+        if self.background:
+            self._ensure_thread()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="zoe-auth-invalidation", daemon=True)
+                self._thread.start()
+
+    def _take_batch(self, block: bool) -> List[Tuple[str, str, str]]:
+        try:
+            batch = [self._queue.get(block=block)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + _BATCH_WINDOW_S
+        while len(batch) < _BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if block and remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def _payload(batch: List[Tuple[str, str, str]]) -> Dict[str, List[str]]:
+        sessions = sorted({item for kind, item, _ in batch if kind == "session"})
+        users = sorted({item for kind, item, _ in batch if kind == "user"})
+        return {"session_ids": sessions, "user_ids": users,
+                "reasons": sorted({reason for _, _, reason in batch})}
+
+    def _post(self, payload: Dict[str, List[str]]) -> bool:
+        if self._client is None:
+            self._client = httpx.Client(timeout=httpx.Timeout(3.0, connect=1.0))
+        headers = {"X-Internal-Token": self.token} if self.token else {}
+        for delay in (0.0,) + _RETRY_DELAYS_S:
+            if delay:
+                time.sleep(delay)
+            try:
+                resp = self._client.post(self.url, json=payload, headers=headers)
+                if resp.status_code < 300:
+                    return True
+                if resp.status_code in (401, 403, 404):
+                    logger.warning("zoe-data refused session invalidation (%s); check ZOE_INTERNAL_TOKEN",
+                                   resp.status_code)
+                    return False
+            except httpx.HTTPError as e:
+                logger.debug(f"Session invalidation push failed: {e}")
+        logger.warning("Session invalidation push to %s failed; zoe-data TTL applies", self.url)
+        return False
+
+    def drain(self) -> bool:
+        """Send everything queued now, in batches. True when all batches landed."""
+        ok = True
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                return ok
+            ok = self._post(self._payload(batch)) and ok
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch(block=True)
+            try:
+                self._post(self._payload(batch))
+            except Exception as e:
+                logger.error(f"Session invalidation sender error: {e}")
+
+
+# Global notifier instance
+invalidation_notifier = InvalidationNotifier()
@@ -14,6 +14,7 @@ import threading
 import time
 
 from models.database import auth_db, UserRole, Role, Permission
+from core.invalidation import invalidation_notifier
 
 logger = logging.getLogger(__name__)
 
@@ -45,29 +46,37 @@ class AccessContext:
     resource_owner: Optional[str] = None
 
 class PermissionCache:
-    """High-performance permission caching"""
+    """High-performance permission caching
+
+    Entries are stamped with the RBAC role version they were resolved under;
+    a lookup under a newer version misses, so a role change invalidates every
+    user at once without walking the cache.
+    """
     
     def __init__(self, ttl_seconds: int = 300):  # 5 minutes default
-        self.cache: Dict[str, Tuple[Set[str], datetime]] = {}
+        self.cache: Dict[str, Tuple[Set[str], datetime, int]] = {}
         self.ttl = timedelta(seconds=ttl_seconds)
         self.lock = threading.RLock()
         self._start_cleanup_thread()
 
-    def get_permissions(self, user_id: str) -> Optional[Set[str]]:
+    def get_permissions(self, user_id: str, version: int = 0) -> Optional[Set[str]]:
         """Get cached permissions for user"""
         with self.lock:
             if user_id in self.cache:
-                permissions, cached_at = self.cache[user_id]
-                if datetime.now() - cached_at < self.ttl:
-                    return permissions.copy()
+                permissions, cached_at, cached_version = self.cache[user_id]
+                if cached_version == version and datetime.now() - cached_at < self.ttl:
+                    # Compiled sets are immutable; only plain sets need a copy
+                    return permissions if isinstance(permissions, frozenset) else permissions.copy()
                 else:
                     del self.cache[user_id]
             return None
 
-    def set_permissions(self, user_id: str, permissions: Set[str]):
+    def set_permissions(self, user_id: str, permissions: Set[str], version: int = 0):
         """Cache permissions for user"""
+        if not isinstance(permissions, frozenset):
+            permissions = permissions.copy()
         with self.lock:
-            self.cache[user_id] = (permissions.copy(), datetime.now())
+            self.cache[user_id] = (permissions, datetime.now(), version)
 
     def invalidate_user(self, user_id: str):
         """Invalidate cache for specific user"""
@@ -87,7 +96,7 @@ class PermissionCache:
                 with self.lock:
                     now = datetime.now()
                     expired = [
-                        user_id for user_id, (_, cached_at) in self.cache.items()
+                        user_id for user_id, (_, cached_at, _version) in self.cache.items()
                         if now - cached_at >= self.ttl
                     ]
                     for user_id in expired:
@@ -99,12 +108,76 @@ class PermissionCache:
         cleanup_thread = threading.Thread(target=cleanup, daemon=True)
         cleanup_thread.start()
 
+# Trie key marking "a trailing ``.*`` grant ends here"; never a permission segment.
+_WILDCARD_GRANT = object()
+
+class CompiledPermissions(frozenset):
+    """Effective permission set compiled for regex-free checks
+
+    Still the frozenset of permission strings it was built from, so exact
+    grants are a set lookup. Wildcard grants (``calendar.*``, ``*``) live in
+    a segment trie, making a wildcard check O(segments) no matter how many
+    grants a role carries. Wildcards outside the validated ``prefix.*`` /
+    ``*`` shapes (hand-edited role rows) are compiled to a regex once, here.
+    """
+
+    def __new__(cls, permissions=()):
+        self = super().__new__(cls, permissions)
+        self._trie: Dict[Any, Any] = {}
+        self._global = False
+        self._irregular: List[Tuple[str, "re.Pattern[str]"]] = []
+        for perm in sorted(self):
+            if '*' not in perm:
+                continue
+            head, dot, tail = perm.rpartition('.')
+            if perm == '*':
+                self._global = True
+            elif dot and tail == '*' and '*' not in head:
+                node = self._trie
+                for segment in head.split('.'):
+                    node = node.setdefault(segment, {})
+                node[_WILDCARD_GRANT] = perm
+            else:
+                pattern = re.escape(perm).replace(r"\*", ".*")
+                self._irregular.append((perm, re.compile(pattern)))
+        return self
+
+    def wildcard_matches(self, permission: str) -> List[str]:
+        """Wildcard grants covering ``permission``, most specific first"""
+        granted = []
+        node = self._trie
+        # A trailing ".*" needs at least one segment after its prefix
+        for segment in permission.split('.')[:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            grant = node.get(_WILDCARD_GRANT)
+            if grant is not None:
+                granted.append(grant)
+        granted.reverse()
+        granted.extend(perm for perm, rx in self._irregular if rx.fullmatch(permission))
+        if self._global:
+            granted.append('*')
+        return granted
+
+    def allows(self, permission: str) -> bool:
+        """True when ``permission`` is granted exactly or by any wildcard"""
+        return permission in self or bool(self.wildcard_matches(permission))
+
 class RBACManager:
     """Role-Based Access Control Manager"""
     
     def __init__(self):
         self.permission_cache = PermissionCache()
         self._resource_patterns = {}  # Compiled regex patterns for resource matching
+        # Compiled effective permissions per role, rebuilt from one roles-table
+        # read when the role version moves (assign_role / create_custom_role /
+        # invalidate_roles) or the cache TTL lapses (out-of-band role edits).
+        self._roles_lock = threading.RLock()
+        self._roles_version = 0
+        self._compiled_roles: Dict[str, CompiledPermissions] = {}
+        self._compiled_roles_version = -1
+        self._compiled_roles_at = 0.0
         self._initialize_default_permissions()
 
     def check_permission(self, user_id: str, permission: str, 
@@ -125,62 +198,67 @@ class RBACManager:
         try:
             # Get user permissions (cached or fresh)
             user_permissions = self._get_user_permissions(user_id)
-            
-            # Check direct permission match
-            if permission in user_permissions:
-                return PermissionCheck(
-                    result=PermissionResult.GRANTED,
-                    user_id=user_id,
-                    permission=permission,
-                    resource=resource,
-                    reason="direct_match"
-                )
-
-            # Check wildcard permissions
-            granted_wildcards = self._check_wildcard_permissions(permission, user_permissions)
-            if granted_wildcards:
-                return PermissionCheck(
-                    result=PermissionResult.GRANTED,
-                    user_id=user_id,
-                    permission=permission,
-                    resource=resource,
-                    reason=f"wildcard_match: {granted_wildcards[0]}"
-                )
-
-            # Check resource-specific permissions
-            if resource:
-                resource_result = self._check_resource_permission(
-                    user_id, permission, resource, user_permissions, context
-                )
-                if resource_result.result != PermissionResult.DENIED:
-                    return resource_result
-
-            # Check conditional permissions based on context
-            if context:
-                conditional_result = self._check_conditional_permissions(
-                    user_id, permission, resource, user_permissions, context
-                )
-                if conditional_result.result != PermissionResult.DENIED:
-                    return conditional_result
+            return self._evaluate_permission(user_id, permission, resource, context, user_permissions)
 
-            # Permission denied
+        except Exception as e:
+            logger.error(f"Permission check failed for user {user_id}, permission {permission}: {e}")
             return PermissionCheck(
                 result=PermissionResult.DENIED,
                 user_id=user_id,
                 permission=permission,
                 resource=resource,
-                reason="no_matching_permission"
+                reason=f"error: {str(e)}"
             )
 
-        except Exception as e:
-            logger.error(f"Permission check failed for user {user_id}, permission {permission}: {e}")
+    def _evaluate_permission(self, user_id: str, permission: str,
+                             resource: Optional[str], context: Optional[AccessContext],
+                             user_permissions: Set[str]) -> PermissionCheck:
+        """Decide one permission against an already-resolved permission set"""
+        # Check direct permission match
+        if permission in user_permissions:
             return PermissionCheck(
-                result=PermissionResult.DENIED,
+                result=PermissionResult.GRANTED,
                 user_id=user_id,
                 permission=permission,
                 resource=resource,
-                reason=f"error: {str(e)}"
+                reason="direct_match"
+            )
+
+        # Check wildcard permissions
+        granted_wildcards = self._check_wildcard_permissions(permission, user_permissions)
+        if granted_wildcards:
+            return PermissionCheck(
+                result=PermissionResult.GRANTED,
+                user_id=user_id,
+                permission=permission,
+                resource=resource,
+                reason=f"wildcard_match: {granted_wildcards[0]}"
+            )
+
+        # Check resource-specific permissions
+        if resource:
+            resource_result = self._check_resource_permission(
+                user_id, permission, resource, user_permissions, context
+            )
+            if resource_result.result != PermissionResult.DENIED:
+                return resource_result
+
+        # Check conditional permissions based on context
+        if context:
+            conditional_result = self._check_conditional_permissions(
+                user_id, permission, resource, user_permissions, context
             )
+            if conditional_result.result != PermissionResult.DENIED:
+                return conditional_result
+
+        # Permission denied
+        return PermissionCheck(
+            result=PermissionResult.DENIED,
+            user_id=user_id,
+            permission=permission,
+            resource=resource,
+            reason="no_matching_permission"
+        )
 
     def check_multiple_permissions(self, user_id: str, permissions: List[str],
                                  require_all: bool = True) -> Dict[str, PermissionCheck]:
@@ -258,15 +336,18 @@ class RBACManager:
                     SET role = ?, updated_at = ?
                     WHERE user_id = ?
                 """, (role, datetime.now().isoformat(), user_id))
+                changed = conn.total_changes > 0
 
-                if conn.total_changes > 0:
-                    # Invalidate permission cache
-                    self.permission_cache.invalidate_user(user_id)
-                    
-                    # Log role change
-                    self._log_role_change(user_id, role, assigned_by)
-                    logger.info(f"Assigned role {role} to user {user_id} by {assigned_by}")
-                    return True
+            if changed:
+                # Invalidate permission cache once the new role is committed
+                self.permission_cache.invalidate_user(user_id)
+                self.invalidate_roles()
+                invalidation_notifier.users([user_id], reason="role_change")
+                
+                # Log role change
+                self._log_role_change(user_id, role, assigned_by)
+                logger.info(f"Assigned role {role} to user {user_id} by {assigned_by}")
+                return True
 
             return False
 
@@ -314,8 +395,10 @@ class RBACManager:
                     inherits_from, 0, datetime.now().isoformat()
                 ))
 
-                logger.info(f"Created custom role {role_id} by {created_by}")
-                return True
+            # Recompile outside the write transaction so the new row is visible
+            self.invalidate_roles()
+            logger.info(f"Created custom role {role_id} by {created_by}")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to create role {role_id}: {e}")
@@ -324,58 +407,78 @@ class RBACManager:
     def get_role_permissions(self, role: str) -> Set[str]:
         """Get all permissions for a role, including inherited ones"""
         try:
-            permissions = set()
-            visited_roles = set()  # Prevent infinite recursion
-            
-            def collect_permissions(current_role: str):
-                if current_role in visited_roles:
-                    return
-                visited_roles.add(current_role)
-                
-                with auth_db.get_connection() as conn:
-                    cursor = conn.execute("""
-                        SELECT permissions, inherits_from 
-                        FROM roles 
-                        WHERE role_id = ?
-                    """, (current_role,))
-                    
-                    row = cursor.fetchone()
-                    if row:
-                        role_permissions = json.loads(row[0] or '[]')
-                        permissions.update(role_permissions)
-                        
-                        # Recursively collect from parent role
-                        if row[1]:  # inherits_from
-                            collect_permissions(row[1])
-
-            collect_permissions(role)
-            return permissions
+            return set(self._compiled_role(role))
 
         except Exception as e:
             logger.error(f"Failed to get permissions for role {role}: {e}")
             return set()
 
+    @property
+    def roles_version(self) -> int:
+        """Monotonic version of role definitions/assignments; bumps invalidate"""
+        return self._roles_version
+
+    def invalidate_roles(self):
+        """Drop every compiled role and stale every cached user permission set"""
+        with self._roles_lock:
+            self._roles_version += 1
+            self._compiled_roles = {}
+
+    def _compiled_role(self, role: str) -> CompiledPermissions:
+        """Compiled effective permissions for a role (empty if unknown)"""
+        with self._roles_lock:
+            ttl = self.permission_cache.ttl.total_seconds()
+            if (self._compiled_roles_version != self._roles_version
+                    or time.monotonic() - self._compiled_roles_at >= ttl):
+                self._compiled_roles = self._compile_roles()
+                self._compiled_roles_version = self._roles_version
+                self._compiled_roles_at = time.monotonic()
+            return self._compiled_roles.get(role) or CompiledPermissions()
+
+    def _compile_roles(self) -> Dict[str, CompiledPermissions]:
+        """Read the roles table once and flatten inheritance for every role"""
+        with auth_db.get_connection() as conn:
+            cursor = conn.execute("SELECT role_id, permissions, inherits_from FROM roles")
+            rows = cursor.fetchall()
+
+        definitions = {
+            row[0]: (json.loads(row[1] or '[]'), row[2])
+            for row in rows
+        }
+        compiled = {}
+        for role_id in definitions:
+            permissions = set()
+            visited_roles = set()  # Prevent infinite recursion
+            current = role_id
+            while current and current not in visited_roles and current in definitions:
+                visited_roles.add(current)
+                role_permissions, current = definitions[current]
+                permissions.update(role_permissions)
+            compiled[role_id] = CompiledPermissions(permissions)
+        return compiled
+
     def list_user_permissions(self, user_id: str) -> List[str]:
         """Get sorted list of all effective permissions for user"""
         permissions = self._get_user_permissions(user_id)
         return sorted(list(permissions))
 
-    def _get_user_permissions(self, user_id: str) -> Set[str]:
+    def _get_user_permissions(self, user_id: str) -> CompiledPermissions:
         """Get user permissions with caching"""
         # Check cache first
-        cached_permissions = self.permission_cache.get_permissions(user_id)
+        version = self._roles_version
+        cached_permissions = self.permission_cache.get_permissions(user_id, version)
         if cached_permissions is not None:
             return cached_permissions
 
         # Load from database
-        permissions = set()
+        permissions = CompiledPermissions()
         try:
             user_role = self.get_user_role(user_id)
             if user_role:
-                permissions = self.get_role_permissions(user_role)
+                permissions = self._compiled_role(user_role)
 
             # Cache the result
-            self.permission_cache.set_permissions(user_id, permissions)
+            self.permission_cache.set_permissions(user_id, permissions, version)
 
         except Exception as e:
             logger.error(f"Failed to load permissions for user {user_id}: {e}")
@@ -384,17 +487,9 @@ class RBACManager:
 
     def _check_wildcard_permissions(self, permission: str, user_permissions: Set[str]) -> List[str]:
         """Check if any wildcard permissions grant access"""
-        granted = []
-        
-        for user_perm in user_permissions:
-            if '*' in user_perm:
-                # Convert wildcard to regex pattern safely.
-                # Escape first, then restore wildcard semantics.
-                pattern = re.escape(user_perm).replace(r"\*", ".*")
-                if re.match(f"^{pattern}$", permission):
-                    granted.append(user_perm)
-                    
-        return granted
+        if not isinstance(user_permissions, CompiledPermissions):
+            user_permissions = CompiledPermissions(user_permissions)
+        return user_permissions.wildcard_matches(permission)
 
     def _check_resource_permission(self, user_id: str, permission: str, 
                                  resource: str, user_permissions: Set[str],
@@ -15,6 +15,7 @@ import threading
 
 from models.database import auth_db, AuthSession, SessionType, AuthMethod
 from core.rbac import rbac_manager, AccessContext
+from core.invalidation import invalidation_notifier
 
 logger = logging.getLogger(__name__)
 
@@ -324,6 +325,7 @@ class EnhancedSessionManager:
             self._save_session_to_db(session)
             
         self._log_escalation_success(session_id)
+        invalidation_notifier.sessions([session_id], reason="escalation")
         logger.info(f"Session {session_id} escalated to standard access")
         return True
 
@@ -356,7 +358,9 @@ class EnhancedSessionManager:
     def invalidate_session(self, session_id: str) -> bool:
         """Invalidate specific session"""
         with self.session_lock:
-            return self._remove_session(session_id)
+            removed = self._remove_session(session_id)
+        invalidation_notifier.sessions([session_id], reason="logout")
+        return removed
 
     def invalidate_user_sessions(self, user_id: str, except_session: Optional[str] = None) -> int:
         """Invalidate all sessions for user except optionally one"""
@@ -368,8 +372,12 @@ class EnhancedSessionManager:
             
             for session_id in sessions_to_remove:
                 self._remove_session(session_id)
-                
-            return len(sessions_to_remove)
+
+        invalidation_notifier.sessions(sessions_to_remove, reason="logout")
+        if except_session is None:
+            # Also covers sessions only zoe-data still remembers (DB-loaded, evicted here).
+            invalidation_notifier.users([user_id], reason="logout")
+        return len(sessions_to_remove)
 
     def get_user_sessions(self, user_id: str) -> List[AuthSession]:
         """Get all active sessions for user"""
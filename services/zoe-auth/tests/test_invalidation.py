@@ -0,0 +1,62 @@
+"""Session-invalidation push to zoe-data: batching, auth header, retry."""
+
+import json
+
+import httpx
+
+import core.invalidation as invalidation
+from core.invalidation import InvalidationNotifier
+
+
+def _notifier(handler, **kwargs):
+    notifier = InvalidationNotifier(url="http://zoe-data/api/auth/invalidate", token="tok",
+                                    enabled=True, background=False, **kwargs)
+    notifier._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return notifier
+
+
+def test_queued_invalidations_go_out_as_one_deduplicated_batch():
+    sent = []
+
+    def handler(request):
+        sent.append((request.headers.get("X-Internal-Token"), json.loads(request.content)))
+        return httpx.Response(200, json={"ok": True})
+
+    notifier = _notifier(handler)
+    notifier.sessions(["s-1", "s-2", ""], reason="logout")
+    notifier.users(["u-1"], reason="role_change")
+    notifier.sessions(["s-1"], reason="escalation")
+
+    assert notifier.drain() is True
+    assert sent == [("tok", {
+        "session_ids": ["s-1", "s-2"],
+        "user_ids": ["u-1"],
+        "reasons": ["escalation", "logout", "role_change"],
+    })]
+    assert notifier.drain() is True and len(sent) == 1  # queue is empty now
+
+
+def test_push_retries_transient_failures_but_not_auth_refusals(monkeypatch):
+    monkeypatch.setattr(invalidation, "_RETRY_DELAYS_S", (0.0, 0.0))
+    statuses = [503, 200]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses.pop(0))
+
+    notifier = _notifier(handler)
+    notifier.sessions(["s-1"], reason="logout")
+    assert notifier.drain() is True
+    assert len(calls) == 2
+
+    statuses[:] = [403, 200]
+    notifier.sessions(["s-2"], reason="logout")
+    assert notifier.drain() is False
+    assert len(calls) == 3
+
+
+def test_disabled_notifier_queues_nothing():
+    notifier = InvalidationNotifier(enabled=False, background=False)
+    notifier.users(["u-1"], reason="role_change")
+    assert notifier._queue.empty()
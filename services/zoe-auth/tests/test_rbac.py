@@ -1,6 +1,12 @@
 """Current-contract RBAC behavior tests."""
 
-from core.rbac import AccessContext, PermissionResult, RBACManager
+import json
+import random
+import re
+import sqlite3
+
+import core.rbac as rbac
+from core.rbac import AccessContext, CompiledPermissions, PermissionResult, RBACManager
 
 
 def test_permission_format_validation_accepts_supported_patterns():
@@ -61,3 +67,83 @@ def test_touch_panel_context_denies_admin_permissions():
     assert result.result == PermissionResult.DENIED
     assert result.reason == "admin_not_allowed_on_touch_panel"
 
+
+
+def _regex_wildcards(permission, user_permissions):
+    """The pre-compile matcher: one escaped regex per wildcard grant."""
+    granted = set()
+    for perm in user_permissions:
+        pattern = re.escape(perm).replace(r"\*", ".*")
+        if '*' in perm and re.match(f"^{pattern}$", permission):
+            granted.add(perm)
+    return granted
+
+
+def test_compiled_matcher_agrees_with_the_regex_scan():
+    rng = random.Random(7)
+    segments = ["calendar", "lists", "shared", "read", "write", "admin", "x", ""]
+    grants = {"calendar.*", "shared.calendar.*", "lists.read", "admin.system.*", ".*", "odd*grant"}
+    compiled = CompiledPermissions(grants)
+    probes = ["calendar", "calendar.", "odd-grant", "oddgrant", "shared.calendar"]
+    probes += [".".join(rng.choice(segments) for _ in range(rng.randint(1, 4))) for _ in range(500)]
+
+    for probe in probes:
+        assert set(compiled.wildcard_matches(probe)) == _regex_wildcards(probe, grants), probe
+        assert compiled.allows(probe) == (probe in grants or bool(_regex_wildcards(probe, grants)))
+    assert CompiledPermissions({"*"}).allows("anything.at.all")
+    assert compiled.wildcard_matches("shared.calendar.read") == ["shared.calendar.*"]
+
+
+def _roles_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "auth.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE roles (role_id TEXT PRIMARY KEY, name TEXT, description TEXT,
+                            permissions TEXT, inherits_from TEXT, is_system INTEGER, created_at TEXT);
+        CREATE TABLE auth_users (user_id TEXT PRIMARY KEY, role TEXT, updated_at TEXT);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO roles VALUES (?, ?, '', ?, ?, 1, '')",
+        [
+            ("admin", "Admin", json.dumps(["*"]), None),
+            ("member", "Member", json.dumps(["calendar.*", "lists.read"]), None),
+            ("child", "Child", json.dumps(["ai.chat.supervised"]), "member"),
+        ],
+    )
+    conn.executemany("INSERT INTO auth_users VALUES (?, ?, '')", [("boss", "admin"), ("kid", "child")])
+    conn.commit()
+    conn.close()
+    role_loads = []
+
+    def connect():
+        db = sqlite3.connect(path)
+        db.set_trace_callback(lambda sql: role_loads.append(sql) if "FROM roles" in sql else None)
+        return db
+
+    monkeypatch.setattr(rbac.auth_db, "get_connection", connect)
+    monkeypatch.setattr(rbac.invalidation_notifier, "enabled", False)
+    return role_loads
+
+
+def test_roles_compile_once_and_recompile_on_role_changes(tmp_path, monkeypatch):
+    role_loads = _roles_db(tmp_path, monkeypatch)
+    manager = RBACManager()
+
+    assert manager.check_permission("kid", "calendar.delete").reason == "wildcard_match: calendar.*"
+    assert manager.check_permission("kid", "ai.chat.supervised").result == PermissionResult.GRANTED
+    assert manager.check_permission("kid", "lists.delete").result == PermissionResult.DENIED
+    assert manager.check_permission("boss", "roles.create").result == PermissionResult.GRANTED
+    results = manager.check_multiple_permissions("kid", ["lists.read", "music.basic"])
+    assert [r.result for r in results.values()] == [PermissionResult.GRANTED, PermissionResult.DENIED]
+    assert manager.get_role_permissions("child") == {"calendar.*", "lists.read", "ai.chat.supervised"}
+    assert len(role_loads) == 1  # one roles-table read served every check above
+
+    version = manager.roles_version
+    assert manager.create_custom_role("teen", "Teen", "", ["music.basic"], "boss", inherits_from="child")
+    assert manager.assign_role("kid", "teen", "boss")
+    assert manager.roles_version == version + 2
+
+    assert manager.check_permission("kid", "music.basic").result == PermissionResult.GRANTED
+    assert manager.check_permission("kid", "calendar.read").result == PermissionResult.GRANTED
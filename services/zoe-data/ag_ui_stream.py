@@ -34,17 +34,29 @@ from card_contract import validate_component
 
 
 class AgRunRecorder:
-    """Records JSON payloads actually sent on the wire (for persistence / tests)."""
+    """Records JSON payloads actually sent on the wire (for persistence / tests).
+
+    ``emit`` dumps the event model to a dict once and frames the SSE line from
+    that same dict, so the recorded payload is what went out without parsing
+    the encoded block back. The framing is ``EventEncoder``'s (compact JSON,
+    optional ``None`` fields omitted); any other encoder is honoured as-is.
+    """
 
     def __init__(self) -> None:
         self.events: List[dict[str, Any]] = []
 
     def emit(self, enc: EventEncoder, event) -> str:
-        block = enc.encode(event)
-        line = block.strip()
-        if line.startswith("data: "):
-            self.events.append(json.loads(line[6:]))
-        return block
+        payload = event.model_dump(mode="json", by_alias=True)
+        self.events.append(payload)
+        if type(enc) is EventEncoder:
+            return f"data: {json.dumps(payload, separators=(',', ':'), ensure_ascii=False)}\n\n"
+        return enc.encode(event)
+
+
+# A newline only ends a chunk once this much text has been batched.
+_NEWLINE_FLUSH_MIN = 48
+# Hand the loop back after roughly this many characters of a long reply.
+_YIELD_EVERY_CHARS = 500
 
 
 async def iter_text_message_chunks(
@@ -56,32 +68,42 @@ async def iter_text_message_chunks(
     min_chars: int = 240,
     max_interval_s: float = 0.15,
 ) -> AsyncIterator[str]:
-    """Batched TEXT_MESSAGE_CHUNK events (assistant role)."""
+    """Batched TEXT_MESSAGE_CHUNK events (assistant role).
+
+    A chunk ends at ``min_chars``, at a newline once at least
+    ``_NEWLINE_FLUSH_MIN`` characters are batched, at the end of the text, or
+    after a single character when ``max_interval_s`` has passed since the last
+    flush (the consumer was slow). Chunks are sliced by index with one
+    ``str.find`` for the newline rule and one clock read per chunk, so a long
+    reply costs time linear in its length rather than per-character appends.
+    """
     if not text:
         return
-    buf = ""
+    n = len(text)
+    size = max(min_chars, 1)
+    start = 0
     last_flush = time.monotonic()
-    last_idx = len(text) - 1
-    for idx, ch in enumerate(text):
-        buf += ch
+    next_yield = 1
+    while start < n:
         now = time.monotonic()
-        newline_flush = ch == "\n" and len(buf) >= 48
-        if buf and (
-            len(buf) >= min_chars
-            or newline_flush
-            or (now - last_flush) >= max_interval_s
-            or idx == last_idx
-        ):
-            ev = TextMessageChunkEvent(
-                type=EventType.TEXT_MESSAGE_CHUNK,
-                message_id=message_id,
-                role="assistant",
-                delta=buf,
-            )
-            yield recorder.emit(enc, ev)
-            buf = ""
-            last_flush = now
-        if idx % 500 == 0:
+        if now - last_flush >= max_interval_s:
+            end = start + 1
+        else:
+            end = min(start + size, n)
+            nl = text.find("\n", start + _NEWLINE_FLUSH_MIN - 1, end)
+            if nl != -1:
+                end = nl + 1
+        ev = TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK,
+            message_id=message_id,
+            role="assistant",
+            delta=text[start:end],
+        )
+        yield recorder.emit(enc, ev)
+        last_flush = now
+        start = end
+        if start >= next_yield:
+            next_yield = (start // _YIELD_EVERY_CHARS + 1) * _YIELD_EVERY_CHARS + 1
             await asyncio.sleep(0)
 
 
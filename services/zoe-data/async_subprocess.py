@@ -248,11 +248,14 @@ async def spawn_pipe_process(
     *,
     cwd: "str | None" = None,
     env: "Mapping[str, str] | None" = None,
+    limit: "int | None" = None,
 ) -> AsyncPipeProcess:
     """Fork+exec a long-lived RPC subprocess OFF the event-loop thread.
 
     stdin/stdout are pipes exposed as asyncio streams; stderr is discarded
-    (mirrors the RPC callers, which only stream stdout events).
+    (mirrors the RPC callers, which only stream stdout events). ``limit``
+    raises the stdout reader's line-length cap for RPC peers whose single
+    response lines can exceed asyncio's 64 KiB default.
     """
     loop = asyncio.get_running_loop()
 
@@ -276,7 +279,7 @@ async def spawn_pipe_process(
         # No explicit loop= args: this coroutine runs on the loop these objects
         # will use, and the loop parameter was removed from asyncio's high-level
         # APIs in 3.10; the constructors bind the running loop themselves.
-        reader = asyncio.StreamReader()
+        reader = asyncio.StreamReader(limit=limit) if limit else asyncio.StreamReader()
         read_protocol = asyncio.StreamReaderProtocol(reader)
         await loop.connect_read_pipe(lambda: read_protocol, popen.stdout)
 
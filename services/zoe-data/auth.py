@@ -1,14 +1,25 @@
 """
 Auth integration for zoe-data.
 Validates X-Session-ID against zoe-auth and caches results.
+
+Session cache: a bounded LRU of session_id -> validated user (or None for a
+session zoe-auth rejected, kept for a much shorter TTL). Concurrent misses for
+the same session share ONE zoe-auth round trip (single-flight), so a panel
+reconnect or a page load's burst of API calls validates once. zoe-auth pushes
+logout / role-change / escalation invalidations to POST /api/auth/invalidate
+(routers/auth.py -> invalidate_sessions), so a revoked session stops working
+immediately; the 30s positive TTL only bounds how long a missed push can
+serve a stale grant.
 """
+import asyncio
 import os
 import time
 import logging
 import httpx
+import http_clients
 import hmac
 from fastapi import Request, HTTPException, Depends
-from typing import Any, Optional, Dict, Tuple
+from typing import Any, Optional, Dict, Iterable, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +32,13 @@ _UNAUTH_ROLE = os.environ.get("ZOE_UNAUTHENTICATED_ROLE", "guest").strip().lower
 _AUTH_FAIL_CLOSED = os.environ.get("ZOE_AUTH_FAIL_CLOSED", "true").lower() in (
     "1", "true", "yes",
 )
-CACHE_TTL_SECONDS = 30
+# zoe-auth's invalidation push drops entries early on logout/role change, but
+# delivery needs ZOE_INTERNAL_TOKEN on both sides — the positive TTL stays short
+# so a missed push is still bounded at 30s. The negative TTL only absorbs a
+# burst of retries with a dead/forged session id.
+CACHE_TTL_SECONDS = float(os.environ.get("ZOE_AUTH_CACHE_TTL_S", "30"))
+NEGATIVE_CACHE_TTL_SECONDS = float(os.environ.get("ZOE_AUTH_NEGATIVE_CACHE_TTL_S", "5"))
+_SESSION_CACHE_MAX = int(os.environ.get("ZOE_AUTH_SESSION_CACHE_MAX", "2048"))
 # The household-admin identity. Used ONLY for the explicit, opt-in
 # ZOE_UNAUTHENTICATED_ROLE=family-admin override below — never as a silent
 # fallback. Every other "we can't determine the user" path resolves to GUEST
@@ -31,7 +48,11 @@ DEFAULT_USER_ID = "family-admin"
 GUEST_USER_ID = "guest"
 _DEGRADED_MARK = "__zoe_degraded__"
 
-_session_cache: Dict[str, Tuple[dict, float]] = {}
+# session_id -> (user, or None for an invalid session; monotonic stored_at).
+# Plain dict in LRU order: a hit re-inserts the entry at the end.
+_session_cache: Dict[str, Tuple[Optional[dict], float]] = {}
+_validations_in_flight: Dict[str, "asyncio.Task"] = {}
+_MISS = object()
 
 
 def _degraded_user() -> Optional[Dict[str, Any]]:
@@ -49,22 +70,85 @@ def _degraded_user() -> Optional[Dict[str, Any]]:
     }
 
 
-def _cache_get(session_id: str) -> Optional[dict]:
-    entry = _session_cache.get(session_id)
-    if entry and (time.monotonic() - entry[1]) < CACHE_TTL_SECONDS:
-        return entry[0]
-    if entry:
-        del _session_cache[session_id]
-    return None
+def _observe_session_cache(result: str) -> None:
+    try:
+        from memory_metrics import auth_session_cache_count
+        auth_session_cache_count.labels(result=result).inc()
+    except Exception:
+        pass
+
+
+def _observe_validation(elapsed: float, outcome: str) -> None:
+    try:
+        from memory_metrics import auth_session_validation_seconds
+        auth_session_validation_seconds.labels(outcome=outcome).observe(elapsed)
+    except Exception:
+        pass
+
+
+def _cache_get(session_id: str) -> Any:
+    """Cached user dict, None for a cached rejection, or _MISS."""
+    entry = _session_cache.pop(session_id, None)
+    if entry is None:
+        return _MISS
+    user, stored_at = entry
+    ttl = CACHE_TTL_SECONDS if user is not None else NEGATIVE_CACHE_TTL_SECONDS
+    if (time.monotonic() - stored_at) >= ttl:
+        return _MISS
+    _session_cache[session_id] = entry
+    return user
 
 
-def _cache_set(session_id: str, user: dict):
-    if len(_session_cache) > 500:
-        cutoff = time.monotonic() - CACHE_TTL_SECONDS
-        expired = [k for k, (_, ts) in _session_cache.items() if ts < cutoff]
-        for k in expired:
-            del _session_cache[k]
+def _cache_set(session_id: str, user: Optional[dict]):
+    _session_cache.pop(session_id, None)
     _session_cache[session_id] = (user, time.monotonic())
+    while len(_session_cache) > _SESSION_CACHE_MAX:
+        del _session_cache[next(iter(_session_cache))]
+
+
+def invalidate_sessions(
+    session_ids: Iterable[str] = (), user_ids: Iterable[str] = (), *, everything: bool = False,
+) -> int:
+    """Drop cached validations so the next request re-asks zoe-auth.
+
+    Called for a local logout and for zoe-auth's invalidation push. A
+    validation still in flight for an affected session is detached so its
+    (possibly pre-logout) answer is returned to its waiters but never cached.
+    User-level invalidation detaches every in-flight validation: which user an
+    unvalidated session belongs to isn't known yet. Returns entries dropped.
+    """
+    sessions = set(session_ids)
+    users = set(user_ids)
+    if everything:
+        dropped = len(_session_cache)
+        _session_cache.clear()
+        _validations_in_flight.clear()
+        return dropped
+    doomed = [
+        sid for sid, (user, _) in _session_cache.items()
+        if sid in sessions or (user is not None and user.get("user_id") in users)
+    ]
+    for sid in doomed:
+        del _session_cache[sid]
+    if users:
+        _validations_in_flight.clear()
+    else:
+        for sid in sessions:
+            _validations_in_flight.pop(sid, None)
+    return len(doomed)
+
+
+def session_cache_stats() -> dict:
+    """Size / in-flight / TTL settings of the session cache (diagnostics)."""
+    negative = sum(1 for user, _ in _session_cache.values() if user is None)
+    return {
+        "size": len(_session_cache),
+        "negative": negative,
+        "in_flight": len(_validations_in_flight),
+        "maxsize": _SESSION_CACHE_MAX,
+        "ttl_s": CACHE_TTL_SECONDS,
+        "negative_ttl_s": NEGATIVE_CACHE_TTL_SECONDS,
+    }
 
 
 def _normalize_auth_user(data: Any) -> dict:
@@ -92,7 +176,7 @@ async def _validate_with_auth_service(session_id: str) -> Optional[dict]:
     """Call zoe-auth to validate session. Returns user dict, degraded-user dict, or None if invalid."""
     try:
         timeout = httpx.Timeout(5.0, connect=3.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with http_clients.session("zoe_auth", timeout=timeout) as client:
             resp = await client.get(
                 f"{ZOE_AUTH_URL}/api/auth/user",
                 headers={"X-Session-ID": session_id},
@@ -172,6 +256,49 @@ async def _validate_with_auth_service(session_id: str) -> Optional[dict]:
         return _degraded_user()
 
 
+async def _validate_and_cache(session_id: str) -> Optional[dict]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        validated = await _validate_with_auth_service(session_id)
+        if validated is None:
+            outcome = "invalid"
+        elif validated.get(_DEGRADED_MARK):
+            outcome = "degraded"
+        else:
+            outcome = "valid"
+    finally:
+        _observe_validation(time.perf_counter() - started, outcome)
+    # Only cache a definite answer, and only if no invalidation detached this
+    # validation while it was in flight. Degraded users and 503s never cache.
+    if outcome in ("valid", "invalid") and _validations_in_flight.get(session_id) is asyncio.current_task():
+        _cache_set(session_id, validated)
+    return validated
+
+
+async def _validate_session(session_id: str) -> Optional[dict]:
+    """Single-flight validation: concurrent misses share one zoe-auth call.
+
+    The shared call runs as its own task and every caller awaits it through
+    ``asyncio.shield``, so a client disconnecting mid-request cancels only its
+    own wait, not the validation the other callers are waiting on.
+    """
+    task = _validations_in_flight.get(session_id)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        _observe_session_cache("coalesced")
+        return await asyncio.shield(task)
+    _observe_session_cache("miss")
+    task = asyncio.ensure_future(_validate_and_cache(session_id))
+    _validations_in_flight[session_id] = task
+
+    def _done(t: "asyncio.Task") -> None:
+        if _validations_in_flight.get(session_id) is t:
+            del _validations_in_flight[session_id]
+
+    task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
 async def get_current_user(request: Request) -> dict:
     """Extract and validate user from session header against zoe-auth.
 
@@ -212,12 +339,14 @@ async def get_current_user(request: Request) -> dict:
         }
 
     cached = _cache_get(session_id)
-    if cached:
-        return cached
-
-    validated = await _validate_with_auth_service(session_id)
+    if cached is _MISS:
+        validated = await _validate_session(session_id)
+        if validated is None:
+            logger.warning("Invalid session: %s...", session_id[:20])
+    else:
+        _observe_session_cache("hit" if cached is not None else "negative_hit")
+        validated = cached
     if validated is None:
-        logger.warning("Invalid session: %s...", session_id[:20])
         raise HTTPException(status_code=401, detail="Invalid or expired session")
     if validated.get(_DEGRADED_MARK):
         if _AUTH_FAIL_CLOSED:
@@ -236,7 +365,6 @@ async def get_current_user(request: Request) -> dict:
         degraded = {k: v for k, v in validated.items() if k != _DEGRADED_MARK}
         degraded["auth_degraded"] = True
         return degraded
-    _cache_set(session_id, validated)
     return validated
 
 
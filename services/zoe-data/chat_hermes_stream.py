@@ -21,6 +21,8 @@ from ag_ui.core import (
     StateSnapshotEvent,
 )
 
+import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -138,8 +140,6 @@ async def _iter_hermes_stream_events(
     facts: str = "",
 ):
     """Yield Hermes stream events; callers own AG-UI lifecycle and persistence."""
-    import aiohttp
-
     full_text: list[str] = []
     _t0 = asyncio.get_event_loop().time()
     _hermes_error = False
@@ -151,17 +151,17 @@ async def _iter_hermes_stream_events(
         stream=True,
     )
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
+        async with http_clients.session("hermes", timeout=120) as client:
+            async with client.stream(
+                "POST",
                 f"{_HERMES_API_URL}/v1/chat/completions",
                 json=payload,
                 headers=_hermes_request_headers(session_id=session_id),
-                timeout=aiohttp.ClientTimeout(total=120),
             ) as resp:
                 resp.raise_for_status()
                 sse_event = ""
-                async for raw_line in resp.content:
-                    line = raw_line.decode("utf-8", errors="replace").strip()
+                async for raw_line in resp.aiter_lines():
+                    line = raw_line.strip()
                     if line.startswith("event:"):
                         sse_event = line[6:].strip()
                         continue
@@ -244,7 +244,6 @@ async def _hermes_completion(
     facts: str = "",
 ) -> str:
     """Return a non-streaming Hermes response with Zoe context attached."""
-    import aiohttp
     payload, _ = _build_hermes_payload(
         message,
         username=username,
@@ -252,13 +251,12 @@ async def _hermes_completion(
         facts=facts,
         stream=False,
     )
-    async with aiohttp.ClientSession() as _hses:
-        async with _hses.post(
+    async with http_clients.session("hermes", timeout=120) as _hses:
+        _hr = await _hses.post(
             f"{_HERMES_API_URL}/v1/chat/completions",
             json=payload,
             headers=_hermes_request_headers(),
-            timeout=aiohttp.ClientTimeout(total=120),
-        ) as _hr:
-            _hr.raise_for_status()
-            _hj = await _hr.json()
+        )
+        _hr.raise_for_status()
+        _hj = _hr.json()
     return _hj.get("choices", [{}])[0].get("message", {}).get("content", "") or "(no response)"
@@ -17,6 +17,8 @@ import logging
 import os
 import re
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import NamedTuple
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +91,16 @@ _SQLITE_DATETIME_OFFSET_RE = re.compile(
 _SQLITE_DATETIME_NOW_RE = re.compile(r"datetime\s*\(\s*'now'\s*\)", re.IGNORECASE)
 _NOW_RE = re.compile(r"\bNOW\(\)(?!::)", re.IGNORECASE)
 
+# SQL dialect translation is cached per original SQL string: nearly every
+# statement is a static literal, so the char-by-char rewrite + fetch/execute
+# classification is done once per distinct text, not once per query. Bounded
+# so dynamically built SQL (IN-lists, column lists) can't grow it unbounded.
+_SQL_CACHE_SIZE = int(os.environ.get("ZOE_DB_SQL_CACHE_SIZE", "1024"))
+# asyncpg prepares every parameterised fetch/execute and keeps the prepared
+# statement in a per-connection LRU (default 100). The routers issue more
+# distinct hot statements than that, so the default evicted and re-parsed them.
+_STATEMENT_CACHE_SIZE = int(os.environ.get("ZOE_DB_STATEMENT_CACHE_SIZE", "512"))
+
 
 async def _release_safely(pool: "asyncpg.Pool", conn: "asyncpg.Connection") -> None:
     """Return `conn` to `pool`, tolerating the request-cancellation teardown race.
@@ -176,6 +188,7 @@ async def init_pool() -> asyncpg.Pool:
         min_size=2,
         max_size=10,
         command_timeout=30,
+        statement_cache_size=_STATEMENT_CACHE_SIZE,
     )
     _pool_loop = current_loop
     return _pool
@@ -314,18 +327,13 @@ class AsyncpgCompat:
         return _ExecResult(self._do_execute(sql, params))
 
     async def _do_execute(self, sql: str, params) -> _Cursor:
-        sql_pg, args = _adapt_params(sql, params)
-        stripped = sql_pg.strip().upper().lstrip("(")
-        if (
-            stripped.startswith("SELECT")
-            or stripped.startswith("WITH ")
-            or stripped.startswith("EXPLAIN")
-            or "RETURNING" in stripped
-        ):
-            rows = await self._conn.fetch(sql_pg, *args)
+        plan = _translate_sql(sql)
+        args = list(params) if params is not None else []
+        if plan.returns_rows:
+            rows = await self._conn.fetch(plan.sql, *args)
             return _Cursor(list(rows))
         else:
-            status = await self._conn.execute(sql_pg, *args)
+            status = await self._conn.execute(plan.sql, *args)
             return _Cursor([], rowcount=_parse_status_rowcount(status))
 
     async def execute_fetchall(self, sql: str, params=()) -> list:
@@ -442,7 +450,25 @@ def _copy_quoted_sql(sql: str, start: int) -> tuple[str, int]:
     return sql[start:pos], pos
 
 
-def _adapt_params(sql: str, params) -> tuple[str, list]:
+class _SqlPlan(NamedTuple):
+    """A translated statement: Postgres SQL, ``?`` count, and fetch-vs-execute."""
+    sql: str
+    placeholders: int
+    returns_rows: bool
+
+
+def _returns_rows(sql_pg: str) -> bool:
+    stripped = sql_pg.strip().upper().lstrip("(")
+    return (
+        stripped.startswith("SELECT")
+        or stripped.startswith("WITH ")
+        or stripped.startswith("EXPLAIN")
+        or "RETURNING" in stripped
+    )
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _translate_sql(sql: str) -> _SqlPlan:
     """Convert ? placeholders to $1, $2, $3... for asyncpg.
 
     Also rewrites bare NOW() → NOW()::text so callers that write timestamps
@@ -451,6 +477,8 @@ def _adapt_params(sql: str, params) -> tuple[str, list]:
 
     SQL quoted literals/identifiers are copied verbatim so literal question
     marks and text like 'NOW()' do not become placeholders or casts.
+
+    Pure in ``sql``, so results are LRU-cached (see ``sql_cache_stats``).
     """
     param_index = 0
     pos = 0
@@ -463,32 +491,35 @@ def _adapt_params(sql: str, params) -> tuple[str, list]:
             converted.append(quoted)
             continue
 
-        # Rewrite SQLite datetime('now', '±N unit') → PostgreSQL CURRENT_TIMESTAMP ± INTERVAL.
-        # Result is cast to ::text so it compares correctly against TEXT timestamp columns.
-        # Uses CURRENT_TIMESTAMP (not NOW()) to avoid triggering the NOW()::text rewrite below.
-        # Handles: datetime('now', '-7 days'), datetime('now', '+1 day'), etc.
-        # Does NOT handle datetime('now', ?) — fix those at the call site.
-        datetime_match = _SQLITE_DATETIME_OFFSET_RE.match(sql, pos)
-        if datetime_match is not None:
-            sign = "-" if datetime_match.group(1) == "-" else "+"
-            converted.append(
-                f"(CURRENT_TIMESTAMP {sign} INTERVAL "
-                f"'{datetime_match.group(2)} {datetime_match.group(3)}')::text"
-            )
-            pos = datetime_match.end()
-            continue
+        # The rewrites below all start at a d/D (datetime) or n/N (NOW);
+        # skip the regex attempts everywhere else.
+        if char in "dDnN":
+            # Rewrite SQLite datetime('now', '±N unit') → PostgreSQL CURRENT_TIMESTAMP ± INTERVAL.
+            # Result is cast to ::text so it compares correctly against TEXT timestamp columns.
+            # Uses CURRENT_TIMESTAMP (not NOW()) to avoid triggering the NOW()::text rewrite below.
+            # Handles: datetime('now', '-7 days'), datetime('now', '+1 day'), etc.
+            # Does NOT handle datetime('now', ?) — fix those at the call site.
+            datetime_match = _SQLITE_DATETIME_OFFSET_RE.match(sql, pos)
+            if datetime_match is not None:
+                sign = "-" if datetime_match.group(1) == "-" else "+"
+                converted.append(
+                    f"(CURRENT_TIMESTAMP {sign} INTERVAL "
+                    f"'{datetime_match.group(2)} {datetime_match.group(3)}')::text"
+                )
+                pos = datetime_match.end()
+                continue
 
-        datetime_now_match = _SQLITE_DATETIME_NOW_RE.match(sql, pos)
-        if datetime_now_match is not None:
-            converted.append("CURRENT_TIMESTAMP::text")
-            pos = datetime_now_match.end()
-            continue
+            datetime_now_match = _SQLITE_DATETIME_NOW_RE.match(sql, pos)
+            if datetime_now_match is not None:
+                converted.append("CURRENT_TIMESTAMP::text")
+                pos = datetime_now_match.end()
+                continue
 
-        now_match = _NOW_RE.match(sql, pos)
-        if now_match is not None:
-            converted.append("NOW()::text")
-            pos = now_match.end()
-            continue
+            now_match = _NOW_RE.match(sql, pos)
+            if now_match is not None:
+                converted.append("NOW()::text")
+                pos = now_match.end()
+                continue
 
         if char == "?":
             param_index += 1
@@ -499,4 +530,16 @@ def _adapt_params(sql: str, params) -> tuple[str, list]:
         converted.append(char)
         pos += 1
 
-    return "".join(converted), list(params) if params is not None else []
+    sql_pg = "".join(converted)
+    return _SqlPlan(sql_pg, param_index, _returns_rows(sql_pg))
+
+
+def _adapt_params(sql: str, params) -> tuple[str, list]:
+    """Translate ``sql`` (cached, see ``_translate_sql``) and listify ``params``."""
+    return _translate_sql(sql).sql, list(params) if params is not None else []
+
+
+def sql_cache_stats() -> dict:
+    """Hit/miss/size counters for the SQL translation cache."""
+    info = _translate_sql.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
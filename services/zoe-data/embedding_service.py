@@ -0,0 +1,230 @@
+"""Cached, micro-batching front end for the Tier-1 router's embedding model.
+
+``semantic_router.route`` used to call ``_MODEL.embed([text])`` for every
+classification, and the same utterance is routinely classified more than once
+per turn (voice shadow log, fast-tier resolve, /api/router/classify, two-stage
+logging). :class:`EmbeddingService` sits in front of the model:
+
+* an LRU cache of unit-normalized vectors keyed by normalized text, with a TTL
+  so a long-lived process does not pin stale entries forever;
+* :meth:`EmbeddingService.embed_async` coalesces concurrent misses from
+  different coroutines into ONE ``embed`` call (a short batching window, cut
+  early at ``max_batch``), run off the event loop; identical in-flight texts
+  share a single slot;
+* :meth:`EmbeddingService.embed` is the synchronous path for callers that are
+  already off the loop (warm-up, scripts, threads) — cache first, then a
+  single-item batch.
+
+Cached vectors are returned read-only: every caller shares the same array.
+Hit/miss and batch-size counters go to ``memory_metrics`` (best effort).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_TTL_S = 900.0
+DEFAULT_BATCH_WINDOW_S = 0.003
+DEFAULT_MAX_BATCH = 16
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_key(text: str) -> str:
+    """Cache key: whitespace-collapsed, lower-cased (bge-small is uncased)."""
+    return " ".join((text or "").split()).lower()
+
+
+def _record(result: str) -> None:
+    try:
+        from memory_metrics import router_embed_cache_count
+
+        router_embed_cache_count.labels(result=result).inc()
+    except Exception:
+        pass
+
+
+def _record_batch(size: int) -> None:
+    try:
+        from memory_metrics import router_embed_batch_size
+
+        router_embed_batch_size.observe(size)
+    except Exception:
+        pass
+
+
+class EmbeddingService:
+    """LRU+TTL cache and async micro-batcher around one ``embed`` callable.
+
+    ``embed_fn`` takes a list of texts and returns an iterable of vectors in
+    the same order (fastembed's ``TextEmbedding.embed`` contract).
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], Iterable[Sequence[float]]],
+        *,
+        cache_size: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+        batch_window_s: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ):
+        self._embed_fn = embed_fn
+        self.cache_size = int(cache_size if cache_size is not None
+                              else _env_float("ZOE_ROUTER_EMBED_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+        self.ttl_s = float(ttl_s if ttl_s is not None
+                           else _env_float("ZOE_ROUTER_EMBED_CACHE_TTL_S", DEFAULT_TTL_S))
+        self.batch_window_s = float(batch_window_s if batch_window_s is not None
+                                    else _env_float("ZOE_ROUTER_EMBED_BATCH_WINDOW_S", DEFAULT_BATCH_WINDOW_S))
+        self.max_batch = max(1, int(max_batch if max_batch is not None
+                                    else _env_float("ZOE_ROUTER_EMBED_MAX_BATCH", DEFAULT_MAX_BATCH)))
+        self._cache: "OrderedDict[str, tuple[float, np.ndarray]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Async batching state — only touched from the event loop thread.
+        self._queue: "OrderedDict[str, tuple[str, asyncio.Future]]" = OrderedDict()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        # Queued OR embedding right now, so a repeat text joins instead of re-embedding.
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    # ── cache ───────────────────────────────────────────────────────────────
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        if self.cache_size <= 0:
+            return None
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored, vec = entry
+            if self.ttl_s > 0 and now - stored > self.ttl_s:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return vec
+
+    def _put(self, key: str, vec: np.ndarray) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), vec)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    # ── embedding ───────────────────────────────────────────────────────────
+
+    def _embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        """One model call; rows unit-normalized and frozen."""
+        M = np.asarray(list(self._embed_fn(texts)), dtype=np.float32).reshape(len(texts), -1)
+        M /= (np.linalg.norm(M, axis=1, keepdims=True) + 1e-9)
+        M.setflags(write=False)
+        self.batches += 1
+        self.batched_texts += len(texts)
+        _record_batch(len(texts))
+        return [M[i] for i in range(len(texts))]
+
+    def embed(self, text: str) -> np.ndarray:
+        """Synchronous unit vector for ``text`` (cache, then the model)."""
+        key = normalize_key(text)
+        vec = self._get(key)
+        if vec is not None:
+            self.hits += 1
+            _record("hit")
+            return vec
+        self.misses += 1
+        _record("miss")
+        vec = self._embed_batch([text or ""])[0]
+        self._put(key, vec)
+        return vec
+
+    async def embed_async(self, text: str) -> np.ndarray:
+        """Unit vector for ``text``; concurrent misses share one model call."""
+        key = normalize_key(text)
+        vec = self._get(key)
+        if vec is not None:
+            self.hits += 1
+            _record("hit")
+            return vec
+        shared = self._inflight.get(key)
+        if shared is not None:
+            self.coalesced += 1
+            _record("coalesced")
+            return await asyncio.shield(shared)
+        self.misses += 1
+        _record("miss")
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue[key] = (text or "", fut)
+        self._inflight[key] = fut
+        if len(self._queue) >= self.max_batch:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._fire(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window_s, self._fire, loop)
+        return await asyncio.shield(fut)
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._flush_handle = None
+        batch, self._queue = self._queue, OrderedDict()
+        task = loop.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: "OrderedDict[str, tuple[str, asyncio.Future]]") -> None:
+        keys = list(batch)
+        try:
+            vecs = await asyncio.to_thread(self._embed_batch, [batch[k][0] for k in keys])
+        except Exception as exc:
+            for key in keys:
+                self._inflight.pop(key, None)
+                fut = batch[key][1]
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for key, vec in zip(keys, vecs):
+            self._put(key, vec)
+            self._inflight.pop(key, None)
+            fut = batch[key][1]
+            if not fut.done():
+                fut.set_result(vec)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "cache_entries": len(self._cache),
+            "cache_size": self.cache_size,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+        }
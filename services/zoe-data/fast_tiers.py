@@ -176,7 +176,7 @@ async def resolve(
             # rather than silently embedding anyway.
             if not _sr.is_enabled():
                 return None
-            rr = _sr.route(text)
+            rr = await _sr.aroute(text)
         domain = rr.get("domain") if rr else None
         if domain in (None, "chat"):
             return None
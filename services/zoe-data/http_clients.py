@@ -0,0 +1,326 @@
+"""
+http_clients.py — process-wide pooled httpx clients, one per upstream.
+
+Most outbound calls in zoe-data used to open ``httpx.AsyncClient(...)`` per
+request, paying a fresh TCP (and for the weather APIs, TLS) handshake and a
+throwaway connection pool every time — on the auth path that was every
+uncached session check. This module holds ONE long-lived keep-alive client per
+upstream, each with its own limits / timeouts / HTTP/2 setting, the pattern
+``tts_waterfall`` first used for the Kokoro sidecar.
+
+Usage at a call site (drop-in for the old ``async with httpx.AsyncClient``)::
+
+    async with http_clients.session("home_assistant", timeout=5.0) as client:
+        r = await client.get(f"{bridge}/entities")
+
+``session()`` yields a view of the shared client whose requests default to
+the given per-call timeout; leaving the block does NOT close the pool. A
+transport error (reset / refused / timed out) escaping the block recycles the
+upstream's client so the next caller reconnects cleanly instead of checking
+out the same dead connection.
+
+Lifecycle: ``start()`` / ``aclose_all()`` run in the FastAPI lifespan. Outside
+it (CLI scripts, tests, one-off ``asyncio.run`` jobs) ``session()`` falls back
+to a one-shot ``httpx.AsyncClient(timeout=...)`` exactly like the old call
+sites, so a pooled client is never bound to an event loop that goes away.
+``ZOE_HTTP_SHARED_CLIENTS=0`` forces that fallback in the service too.
+
+Metrics (memory_metrics, best-effort): per-upstream response latency, request
+count split by whether the request opened a new connection or reused a pooled
+one, and transport errors.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the optional `h2` package (httpx[http2]).
+    import h2  # noqa: F401
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class UpstreamSpec:
+    """Connection policy for one upstream's shared client."""
+
+    timeout: httpx.Timeout
+    max_connections: int = 10
+    max_keepalive: int = 5
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+# Defaults only — a call site's ``timeout=`` still wins per request. Local
+# sidecars keep connections warm for longer; the public weather APIs get
+# HTTP/2 (when h2 is installed) and a shorter expiry so an idle socket isn't
+# kept open against someone else's load balancer.
+UPSTREAMS: dict[str, UpstreamSpec] = {
+    "zoe_auth": UpstreamSpec(httpx.Timeout(5.0, connect=3.0), max_connections=20, max_keepalive=10),
+    "llm": UpstreamSpec(httpx.Timeout(120.0, connect=5.0), max_connections=16, max_keepalive=8,
+                        keepalive_expiry=120.0),
+    "kokoro": UpstreamSpec(httpx.Timeout(15.0), max_connections=8, max_keepalive=4),
+    "home_assistant": UpstreamSpec(httpx.Timeout(10.0, connect=3.0), max_connections=16, max_keepalive=8),
+    "hermes": UpstreamSpec(httpx.Timeout(120.0, connect=5.0), max_connections=8, max_keepalive=4),
+    "open_meteo": UpstreamSpec(httpx.Timeout(10.0, connect=5.0), max_keepalive=4,
+                               keepalive_expiry=30.0, http2=True),
+    "openweathermap": UpstreamSpec(httpx.Timeout(10.0, connect=5.0), max_keepalive=2,
+                                   keepalive_expiry=30.0, http2=True),
+    "multica": UpstreamSpec(httpx.Timeout(10.0, connect=3.0), max_keepalive=4),
+    "music_assistant": UpstreamSpec(httpx.Timeout(5.0, connect=3.0), max_keepalive=4),
+    # zoe-data calling its own HTTP API (agent registry, board, UI broadcast).
+    "loopback": UpstreamSpec(httpx.Timeout(5.0, connect=2.0), max_connections=16, max_keepalive=8),
+}
+
+
+class _Pooled:
+    """A live shared client plus the bookkeeping needed to retire it safely."""
+
+    __slots__ = ("client", "inflight", "retired")
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.inflight = 0
+        self.retired = False
+
+
+_clients: dict[str, _Pooled] = {}
+_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def _shared_enabled() -> bool:
+    """Shared clients serve only the loop that opened them (the lifespan's).
+
+    An httpx pool's connections belong to the event loop they were opened on;
+    a caller on any other loop (a TestClient portal, an ``asyncio.run`` job
+    inside the process) gets the one-shot fallback instead.
+    """
+    if _clients_loop is None or os.environ.get("ZOE_HTTP_SHARED_CLIENTS", "1") == "0":
+        return False
+    try:
+        return asyncio.get_running_loop() is _clients_loop
+    except RuntimeError:
+        return False
+
+
+def _observe(upstream: str, elapsed: Optional[float] = None, connection: Optional[str] = None,
+             error: Optional[str] = None) -> None:
+    try:
+        from memory_metrics import (
+            http_upstream_error_count,
+            http_upstream_latency_seconds,
+            http_upstream_request_count,
+        )
+        if error is not None:
+            http_upstream_error_count.labels(upstream=upstream, error=error).inc()
+            return
+        http_upstream_latency_seconds.labels(upstream=upstream).observe(elapsed)
+        http_upstream_request_count.labels(upstream=upstream, connection=connection).inc()
+    except Exception:
+        pass
+
+
+def _event_hooks(upstream: str) -> dict:
+    """Time each request to response headers and note whether it had to connect.
+
+    httpcore reports ``connection.connect_tcp`` through the ``trace`` request
+    extension only when the pool opens a socket, so its absence means the
+    request rode an existing keep-alive connection.
+    """
+
+    async def on_request(request: httpx.Request) -> None:
+        state = {"t0": time.perf_counter(), "connected": False}
+        chained = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict) -> None:
+            if event == "connection.connect_tcp.started":
+                state["connected"] = True
+            if chained is not None:
+                await chained(event, info)
+
+        request.extensions["trace"] = trace
+        request.extensions["zoe_upstream"] = state
+
+    async def on_response(response: httpx.Response) -> None:
+        state = response.request.extensions.get("zoe_upstream")
+        if state:
+            _observe(upstream, time.perf_counter() - state["t0"],
+                     "new" if state["connected"] else "reused")
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def _build(name: str) -> httpx.AsyncClient:
+    spec = UPSTREAMS[name]
+    kwargs: dict[str, Any] = {}
+    if _transport is not None:
+        kwargs["transport"] = _transport
+    return httpx.AsyncClient(
+        timeout=spec.timeout,
+        limits=spec.limits(),
+        http2=spec.http2 and _H2_AVAILABLE,
+        event_hooks=_event_hooks(name),
+        **kwargs,
+    )
+
+
+def _pooled(name: str) -> _Pooled:
+    if name not in UPSTREAMS:
+        raise KeyError(f"unknown upstream {name!r}; add it to http_clients.UPSTREAMS")
+    entry = _clients.get(name)
+    if entry is None or entry.client.is_closed:
+        entry = _clients[name] = _Pooled(_build(name))
+    return entry
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Return the shared client for ``name``, (re)opening it if needed.
+
+    For hot paths that hold the client directly (the Kokoro sidecar, once per
+    spoken sentence). Prefer ``session()``, which also recycles on transport
+    errors and keeps the one-shot fallback outside the service lifespan.
+    """
+    return _pooled(name).client
+
+
+async def _retire(entry: _Pooled) -> None:
+    try:
+        await entry.client.aclose()
+    except Exception:
+        pass
+
+
+async def recycle(name: str, client: Optional[httpx.AsyncClient] = None) -> None:
+    """Drop ``name``'s shared client so the next caller reconnects.
+
+    ``client`` guards against a burst of concurrent failures each recycling a
+    replacement: only the client the caller actually used is retired. A
+    retired client is closed once its last in-flight ``session()`` exits.
+    """
+    entry = _clients.get(name)
+    if entry is None or (client is not None and entry.client is not client):
+        return
+    del _clients[name]
+    entry.retired = True
+    if entry.inflight == 0:
+        await _retire(entry)
+
+
+class _Session:
+    """Request methods of a shared client with a per-call default timeout."""
+
+    __slots__ = ("_client", "_timeout")
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Any):
+        self._client = client
+        self._timeout = timeout
+
+    def _kw(self, kwargs: dict) -> dict:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    async def request(self, method: str, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.request(method, url, **self._kw(kwargs))
+
+    async def get(self, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.get(url, **self._kw(kwargs))
+
+    async def post(self, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.post(url, **self._kw(kwargs))
+
+    async def put(self, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.put(url, **self._kw(kwargs))
+
+    async def patch(self, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.patch(url, **self._kw(kwargs))
+
+    async def delete(self, url: Any, **kwargs) -> httpx.Response:
+        return await self._client.delete(url, **self._kw(kwargs))
+
+    def stream(self, method: str, url: Any, **kwargs):
+        return self._client.stream(method, url, **self._kw(kwargs))
+
+
+@asynccontextmanager
+async def session(name: str, timeout: Any = None) -> AsyncIterator[Any]:
+    """Borrow ``name``'s shared client for one or more requests.
+
+    ``timeout`` (seconds or ``httpx.Timeout``) applies to every request made
+    through the yielded object unless that request passes its own.
+    """
+    if not _shared_enabled():
+        if name not in UPSTREAMS:
+            raise KeyError(f"unknown upstream {name!r}; add it to http_clients.UPSTREAMS")
+        async with httpx.AsyncClient(timeout=timeout if timeout is not None else UPSTREAMS[name].timeout) as client:
+            yield client
+        return
+
+    entry = _pooled(name)
+    entry.inflight += 1
+    try:
+        yield _Session(entry.client, timeout)
+    except httpx.TransportError as exc:
+        _observe(name, error=type(exc).__name__)
+        # PoolTimeout means "all connections busy", not "a connection broke" —
+        # recycling then would just sidestep the upstream's connection limit.
+        if not isinstance(exc, httpx.PoolTimeout):
+            logger.debug("http_clients: %s transport error, recycling pooled client: %s", name, exc)
+            await recycle(name, entry.client)
+        raise
+    finally:
+        entry.inflight -= 1
+        if entry.retired and entry.inflight == 0:
+            await _retire(entry)
+
+
+async def start(*, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """Open every upstream's client (FastAPI lifespan startup).
+
+    ``transport`` lets tests route all upstreams through an
+    ``httpx.MockTransport``.
+    """
+    global _clients_loop, _transport
+    _transport = transport
+    _clients_loop = asyncio.get_running_loop()
+    for name in UPSTREAMS:
+        _pooled(name)
+    logger.info(
+        "http_clients: %d upstream clients open (http2 %s)",
+        len(_clients), "available" if _H2_AVAILABLE else "unavailable — h2 not installed",
+    )
+
+
+async def aclose_all() -> None:
+    """Close every shared client (FastAPI lifespan shutdown)."""
+    global _clients_loop, _transport
+    _clients_loop = None
+    _transport = None
+    entries = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(_retire(e) for e in entries), return_exceptions=True)
+
+
+def pool_stats() -> dict[str, dict]:
+    """Open upstream clients and their in-flight session counts (diagnostics)."""
+    return {
+        name: {"inflight": entry.inflight, "closed": entry.client.is_closed,
+               "http2": UPSTREAMS[name].http2 and _H2_AVAILABLE}
+        for name, entry in _clients.items()
+    }
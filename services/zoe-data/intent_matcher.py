@@ -0,0 +1,352 @@
+"""Compiled, keyword-indexed first-match-wins matcher for the intent fast path.
+
+``intent_router.detect_intent`` used to run its ~150 regexes one after another
+on every chat and voice turn, several of them twice (``.search()`` in the ``if``
+and again to pull the match). This module turns that chain into a table of
+:class:`IntentRule` rows built once at import time:
+
+* Each rule keeps its declaration order as its priority, so the FIRST rule
+  whose pattern matches (and whose slot extractor accepts the match) wins —
+  exactly the semantics of the old ``if … return`` ladder.
+* Every pattern is parsed once (``re._parser``) to derive a set of literal
+  trigger strings, at least one of which MUST appear in any text the pattern
+  can match. All triggers go into one Aho-Corasick automaton; a single pass
+  over the (case-folded) utterance yields the candidate rules, and only those
+  patterns actually run. Rules with no derivable trigger (``.*``-style or
+  callable-only rules) are always candidates, so the index can skip work but
+  never change a result.
+* Per-rule evaluation / hit / nanosecond counters show which rules cost the
+  most (``stats()``; surfaced at ``GET /api/system/intent-matcher/stats``).
+
+The matcher is deliberately generic — it knows nothing about ``Intent`` — so
+the rule table and slot extractors stay in ``intent_router`` next to the
+patterns they use.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+try:  # Python 3.11+
+    from re import _constants as _sre_c  # type: ignore[attr-defined]
+    from re import _parser as _sre_parse  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover - Python 3.10 (the Jetson host)
+    import sre_constants as _sre_c  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# Which string a rule's pattern runs against. ``t`` is the normalized text
+# detect_intent builds; the raw variants exist for the handful of rules that
+# deliberately look at the user's original casing / wake word.
+SOURCE_NORMALIZED = "t"
+SOURCE_RAW = "text"
+SOURCE_RAW_STRIPPED = "text_strip"
+
+_MATCH_MODES = ("match", "search", "fullmatch")
+
+# Characters Python's IGNORECASE matcher treats as equal to an ASCII letter but
+# whose ``str.lower()`` is not that letter. Folding them before the trigger scan
+# keeps the index a strict superset of what the regexes can match.
+_TRIGGER_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s"})
+
+_REPEATS = tuple(
+    op for op in (
+        getattr(_sre_c, "MAX_REPEAT", None),
+        getattr(_sre_c, "MIN_REPEAT", None),
+        getattr(_sre_c, "POSSESSIVE_REPEAT", None),
+    ) if op is not None
+)
+
+
+def fold_for_triggers(text: str) -> str:
+    """Case-fold ``text`` the same way trigger literals are folded."""
+    return (text or "").translate(_TRIGGER_FOLD).lower()
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """One row of the compiled intent table.
+
+    ``extract(match, turn)`` returns a slots ``dict`` for ``intent``, a fully
+    built result object (for rules whose intent name is dynamic), or ``None``
+    to reject the match and fall through to the next rule. Rules without a
+    ``pattern`` call ``extract(None, turn)`` unconditionally, and then need
+    explicit ``triggers`` (or ``None`` to be evaluated on every turn).
+    """
+
+    intent: str
+    pattern: Optional[re.Pattern] = None
+    extract: Optional[Callable[[Optional[re.Match], Any], Any]] = None
+    mode: str = "match"
+    source: str = SOURCE_NORMALIZED
+    triggers: Optional[frozenset] = None
+    label: str = ""
+
+
+@dataclass
+class MatchTurn:
+    """The per-call inputs a rule can look at."""
+
+    t: str
+    text: str
+    context: Any = None
+    user_id: str = "unknown"
+    _text_strip: Optional[str] = field(default=None, repr=False)
+
+    def source(self, name: str) -> str:
+        if name == SOURCE_NORMALIZED:
+            return self.t
+        if name == SOURCE_RAW_STRIPPED:
+            if self._text_strip is None:
+                self._text_strip = (self.text or "").strip()
+            return self._text_strip
+        return self.text or ""
+
+
+# ── Trigger derivation ──────────────────────────────────────────────────────
+
+def _better(a: Optional[frozenset], b: Optional[frozenset]) -> Optional[frozenset]:
+    """Pick the more selective of two necessary-literal sets."""
+    if not a:
+        return b or None
+    if not b:
+        return a
+
+    def score(s: frozenset) -> tuple[int, int]:
+        return (min(len(x) for x in s), -len(s))
+
+    return b if score(b) > score(a) else a
+
+
+def _seq_required(items: Iterable) -> Optional[frozenset]:
+    best: Optional[frozenset] = None
+    run: list[str] = []
+
+    def flush() -> None:
+        nonlocal best
+        lit = "".join(run).lower()
+        run.clear()
+        if lit.strip():
+            best = _better(best, frozenset({lit}))
+
+    for op, av in items:
+        if op is _sre_c.LITERAL and av < 128:
+            run.append(chr(av))
+            continue
+        flush()
+        best = _better(best, _node_required(op, av))
+    flush()
+    return best
+
+
+def _node_required(op, av) -> Optional[frozenset]:
+    if op is _sre_c.SUBPATTERN:
+        return _seq_required(av[-1])
+    if op is _sre_c.BRANCH:
+        union: set[str] = set()
+        for branch in av[1]:
+            req = _seq_required(branch)
+            if not req:
+                return None
+            union |= req
+        return frozenset(union)
+    if op in _REPEATS:
+        lo, _hi, item = av
+        return _seq_required(item) if lo >= 1 else None
+    if op is getattr(_sre_c, "ATOMIC_GROUP", None):
+        return _seq_required(av)
+    return None
+
+
+def derive_triggers(pattern: re.Pattern) -> Optional[frozenset]:
+    """Literal strings of which at least one occurs in every match of ``pattern``.
+
+    Returns ``None`` when no such set can be derived (the rule is then always a
+    candidate). Literals are lower-cased; scan text with :func:`fold_for_triggers`.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:  # pragma: no cover - a pattern re.compile accepted
+        return None
+    return _seq_required(parsed)
+
+
+# ── Aho-Corasick automaton ──────────────────────────────────────────────────
+
+class _TriggerAutomaton:
+    """Multi-literal scanner: one pass over the text reports every rule whose
+    trigger literal occurs anywhere in it (overlaps included)."""
+
+    def __init__(self, literal_rules: dict[str, set[int]]):
+        self._goto: list[dict[str, int]] = [{}]
+        out: list[set[int]] = [set()]
+        for lit, rules in literal_rules.items():
+            state = 0
+            for ch in lit:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    out.append(set())
+                state = nxt
+            out[state] |= rules
+
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                out[nxt] |= out[self._fail[nxt]]
+        self._out = [frozenset(o) if o else None for o in out]
+
+    def scan(self, text: str, found: set[int]) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = out[state]
+            if hit is not None:
+                found |= hit
+
+
+# ── Matcher ─────────────────────────────────────────────────────────────────
+
+class CompiledIntentMatcher:
+    """First-match-wins evaluation of an ordered :class:`IntentRule` table."""
+
+    def __init__(
+        self,
+        rules: Sequence[IntentRule],
+        result_factory: Callable[[str, dict], Any],
+    ):
+        self._factory = result_factory
+        self._rules: list[IntentRule] = []
+        self._bound: list[Optional[Callable]] = []
+        self._always: set[int] = set()
+        literal_rules: dict[str, set[int]] = {}
+        for idx, rule in enumerate(rules):
+            if rule.mode not in _MATCH_MODES:
+                raise ValueError(f"intent rule {rule.intent!r}: unknown mode {rule.mode!r}")
+            triggers = rule.triggers
+            if triggers is None and rule.pattern is not None:
+                triggers = derive_triggers(rule.pattern)
+            label = rule.label or f"{idx:03d}:{rule.intent}"
+            rule = IntentRule(
+                intent=rule.intent,
+                pattern=rule.pattern,
+                extract=rule.extract,
+                mode=rule.mode,
+                source=rule.source,
+                triggers=frozenset(t.lower() for t in triggers) if triggers else None,
+                label=label,
+            )
+            self._rules.append(rule)
+            self._bound.append(getattr(rule.pattern, rule.mode) if rule.pattern is not None else None)
+            if rule.triggers is None:
+                self._always.add(idx)
+            else:
+                for lit in rule.triggers:
+                    literal_rules.setdefault(lit, set()).add(idx)
+        self._automaton = _TriggerAutomaton(literal_rules)
+        self.reset_stats()
+
+    @property
+    def rules(self) -> tuple[IntentRule, ...]:
+        return tuple(self._rules)
+
+    def candidates(self, turn: MatchTurn) -> list[int]:
+        """Rule indices (priority order) that could match this turn."""
+        found = set(self._always)
+        self._automaton.scan(fold_for_triggers(turn.t), found)
+        if turn.text and turn.text != turn.t:
+            self._automaton.scan(fold_for_triggers(turn.text), found)
+        return sorted(found)
+
+    def match(self, turn: MatchTurn, *, use_index: bool = True) -> Any:
+        """Return the first accepted rule's result, or ``None``.
+
+        ``use_index=False`` evaluates every rule in order; it exists so tests can
+        prove the trigger index never changes an answer.
+        """
+        order = self.candidates(turn) if use_index else range(len(self._rules))
+        evals = self._evals
+        hits = self._hits
+        nanos = self._nanos
+        perf = time.perf_counter_ns
+        result = None
+        evaluated = 0
+        for idx in order:
+            rule = self._rules[idx]
+            bound = self._bound[idx]
+            evaluated += 1
+            start = perf()
+            try:
+                if bound is None:
+                    out = rule.extract(None, turn) if rule.extract else None
+                else:
+                    m = bound(turn.source(rule.source))
+                    if m is None:
+                        out = None
+                    else:
+                        out = rule.extract(m, turn) if rule.extract else {}
+            finally:
+                evals[idx] += 1
+                nanos[idx] += perf() - start
+            if out is None:
+                continue
+            hits[idx] += 1
+            result = self._factory(rule.intent, out) if isinstance(out, dict) else out
+            break
+        # Best-effort counters: detect_intent is sync and cheap, so a rare lost
+        # increment under thread-pool concurrency is not worth a lock per turn.
+        self._calls += 1
+        self._evaluated += evaluated
+        if use_index:
+            self._skipped += len(self._rules) - evaluated
+        return result
+
+    def reset_stats(self) -> None:
+        n = len(self._rules)
+        self._evals = [0] * n
+        self._hits = [0] * n
+        self._nanos = [0] * n
+        self._calls = 0
+        self._evaluated = 0
+        self._skipped = 0
+
+    def stats(self, *, top: Optional[int] = None) -> dict:
+        """Per-rule counters, costliest first (by cumulative evaluation time)."""
+        rows = []
+        for idx, rule in enumerate(self._rules):
+            evals = self._evals[idx]
+            rows.append({
+                "rule": rule.label,
+                "intent": rule.intent,
+                "indexed": rule.triggers is not None,
+                "evaluations": evals,
+                "hits": self._hits[idx],
+                "total_ms": round(self._nanos[idx] / 1e6, 3),
+                "mean_us": round(self._nanos[idx] / evals / 1e3, 2) if evals else 0.0,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        calls = self._calls
+        return {
+            "rules": len(self._rules),
+            "indexed_rules": len(self._rules) - len(self._always),
+            "calls": calls,
+            "mean_rules_evaluated": round(self._evaluated / calls, 2) if calls else 0.0,
+            "rules_skipped_by_index": self._skipped,
+            "per_rule": rows[:top] if top else rows,
+        }
@@ -22,10 +22,17 @@ import shutil
 import unicodedata
 import uuid
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from fastapi import HTTPException
 
+from intent_matcher import (
+    SOURCE_RAW,
+    SOURCE_RAW_STRIPPED,
+    CompiledIntentMatcher,
+    IntentRule,
+    MatchTurn,
+)
 from time_utils import today_for_zoe_tz
 from zoe_pi_promotion import LOW_RISK_PI_INTENT_GROUPS
 
@@ -642,870 +649,884 @@ def _timer_minutes_value(raw: str) -> Optional[int]:
     return _TIMER_MINUTE_WORDS.get(s)
 
 
-def detect_intent(
-    text: str,
-    log_miss: bool = True,
-    context: "Optional[ConversationContext]" = None,
-    user_id: str = "unknown",
-) -> Optional[Intent]:
-    t = _normalize_chat_intent_text(text)
+# ── Inline patterns hoisted out of detect_intent so the compiled table owns them ──
+_MORNING_RE = re.compile(r"^(?:good\s+)?morning(?:\s+zoe)?\.?$")
+_MORNING_EXACT_RE = re.compile(r"morning|morning zoe|hey morning")
+_EVENING_RE = re.compile(r"^good\s+evening(?:\s+zoe)?\.?$|^good\s+night(?:\s+zoe)?\.?$")
+_EVENING_EXACT_RE = re.compile(r"evening|evening zoe")
+_PING_RE = re.compile(r"^ping\.?$")
+_WHAT_LISTS_RE = re.compile(r"^what lists do i have\??$")
+_OPEN_CONTACTS_RE = re.compile(
+    r"^(?:open|show|go to|bring up|take me to) (?:the |my )?contacts(?: page)?\??$"
+)
+_REMEMBER_THAT_RE = re.compile(r"^remember that\b.+", re.IGNORECASE)
+
+_CAL_CREATE_VERB = re.compile(r"\b(?:add|put|create|schedule|set\s*up|make|book)\b")
+_CAL_HARD_NOUNS = {"calendar", "appointment"}
+_CAL_SOFT_NOUNS = {"event", "meeting"}
+_CAL_BLOCKERS = {"note", "notes", "journal", "diary", "list", "reminder", "shopping"}
+
+_CALENDAR_SHOW_PATTERNS = (
+    r"^what(?:'s| is) on my (?:calendar|schedule)(.*)$",
+    r"^whats on my (?:calendar|schedule)(.*)$",
+    r"^(?:show|check) (?:me )?my (?:calendar|schedule|events)(.*)$",
+    r"^(?:show|open|bring up|go to|take me to) (?:the |my )?(?:calendar|schedule)(?: (?:page|screen|view))?(.*)$",
+    r"^my (?:calendar|schedule|events)$",
+    r"^(?:upcoming|today'?s) (?:events|calendar|schedule)$",
+    r"^show me (?:my )?week(?: at a glance)?$",
+    r"^whats on today$",
+    r"^what'?s on today$",
+    r"^whats happening (?:today|this afternoon|this evening|tomorrow)(.*)$",
+    r"^what'?s happening (?:today|this afternoon|this evening|tomorrow)(.*)$",
+    r"^whats my first event(?: tomorrow| today)?$",
+    r"^what'?s my first event(?: tomorrow| today)?$",
+    r"^do i have free time(?: today| tomorrow| tomorrow evening| this evening)?$",
+    r"^what (?:events )?do i have(?: today| this week| tomorrow)?$",
+)
 
-    # Bare name-as-question ("zoe?") — normalization strips the wake word to '', so
-    # catch the presence check from the raw text before the body runs.
-    if _BARE_NAME_QUERY_RE.match((text or "").strip()):
-        return Intent("status_check", {})
+# Pattern 1: "remind me to/at/in/on/about X", "set a reminder to/for/at/in/on X",
+#            "reminder to/for/at X", "remember to X"
+_REMINDER_CREATE_RE = re.compile(
+    r"^(?:remind me (?:to|at|in|on|about)|set a reminder (?:to|for|at|in|on)|reminder (?:to|for|at)|remember to) .+"
+)
+# Pattern 2: "add/create/make a reminder for X"
+_REMINDER_CREATE_VERB_RE = re.compile(r"^(?:add|create|make|schedule)\s+(?:a |an )?reminder\b.*")
+_REMINDER_LIST_PATTERNS = (
+    r"^(?:show|list|check|what are) (?:my )?reminders$",
+    r"^my reminders$",
+    r"^(?:open|show|bring up|go to|take me to) (?:the |my )?reminders(?: (?:page|screen|view))?$",
+    r"^show todays reminders$",
+    r"^show today'?s reminders$",
+)
 
-    # Full Home Assistant / automation setup → OpenClaw (execute_intent returns None; chat expands message)
-    if _is_ha_full_setup_message(t):
-        return Intent("ha_full_setup", {})
+_PEOPLE_INTRODUCE_RE = re.compile(
+    r'\b(?:zoe[,\s]+)?(?:meet|this is|introduce you to|say hi to|meet my|i\'d like you to meet)\s+'
+    r'([A-Z][a-z]{1,30}(?:\s[A-Z][a-z]{1,20})?)',
+    re.IGNORECASE,
+)
+_PEOPLE_CREATE_RE = re.compile(
+    r"^(?:add|create|save) (?:a )?(?:contact|person|entry) (?:for |named )?(.+)$"
+)
+_PEOPLE_SEARCH_RE = re.compile(r"^(?:find|search|look up) (?:a )?(?:contact|person) (?:for |named )?(.+)$")
+_WHO_IS_RE = re.compile(r"^who is (.+)$")
+
+# Unambiguous note-creation verbs (make/create/write/save/take) accept a
+# bare space, colon, or connector before the body ("make a note X",
+# "make a note: X", "write a note about X").
+_NOTE_CREATE_RE = re.compile(
+    r"^(?:make|create|write|save|take) (?:a )?note(?:s)?"
+    r"(?:\s*[:\-]\s*|\s+(?:titled|called|about|on)\s+|\s+)(.+)$"
+)
+# "add a note" is ambiguous with a shopping add ("add a note pad", "add
+# sticky notes"), so it means note_create ONLY with an explicit colon or
+# connector ("add a note: X", "add a note about X") — never a bare space.
+_NOTE_ADD_RE = re.compile(
+    r"^add (?:a )?note(?:s)?(?:\s*[:\-]\s*|\s+(?:titled|called|about|on)\s+)(.+)$"
+)
+# "jot down X" / "jot this down: X" / "note that X" / "note down X" —
+# imperative note phrasings that aren't caught above. Route straight to
+# note_create rather than defer, so the note is captured on the fast path.
+_NOTE_JOT_RE = re.compile(
+    r"^(?:jot(?:\s+(?:this|that|it))?\s+down|note\s+down|note\s+that|note\s+this)"
+    r"(?:\s*[:\-]\s*|\s+)(.+)$"
+)
+_NOTE_SEARCH_RE = re.compile(r"^(?:search|find|look up) (?:my )?notes (?:for |about )?(.+)$")
+_BROAD_PEOPLE_SEARCH_RE = re.compile(r"^(?:find|look up) (.+)$")
+_BROAD_PEOPLE_SEARCH_BLOCKED = {"notes", "note", "list", "calendar", "schedule", "events",
+                                "reminders", "recipe", "recipes", "weather", "timer"}
+
+_WEATHER_PATTERNS = (
+    r"^what(?:'s| is) the weather(?: like)?(.*)$",
+    r"^whats the weather(?: like)?(.*)$",
+    r"^how(?:'s| is) the weather(.*)$",
+    r"^(?:(?:can|could) you |please )?(?:show|open|bring up|pull up|go to|take me to)(?: me)? (?:the )?weather(?: (?:screen|page|panel))?(.*)$",
+    r"^(?:will it|is it going to) rain(.*)$",
+    r"^do i need (?:a |an )?(?:jacket|umbrella|coat)(.*)$",
+    r"^temperature (?:today|tomorrow|outside)(.*)$",
+    r"^weather(\s+(?:today|tomorrow|forecast|this week))?(.*)$",
+)
 
-    # Touch panel provisioning / status — chat.py renders AG-UI cards
-    if _PANEL_ENTER_CODE_RE.search(t):
-        m = _PANEL_ENTER_CODE_RE.search(t)
-        code = (m.group(1) or m.group(2) or "").upper()
-        return Intent("panel_confirm_code", {"code": code})
-    if _PANEL_SETUP_RE.search(t):
-        return Intent("panel_setup", {})
-    if _PANEL_STATUS_RE.search(t):
-        return Intent("panel_status", {})
-    if _PANEL_LIST_RE.search(t):
-        return Intent("panel_list", {})
+# Explicit "<verb> a journal entry[: <content>]" — the deterministic, DB-verified
+# path (_execute_journal_create_direct). "add" is included because the 4B brain
+# under-fires its journal tool on this exact phrasing (a "grateful for the rain"
+# entry misroutes to a weather answer); #1150 already stopped list_add from
+# swallowing "add a journal entry", so routing it positively here is the
+# completion of that fix, not a regression. A leading ":"/"-"/"—" separator
+# after "entry" is stripped so the colon doesn't leak into the stored content.
+_JOURNAL_CREATE_RE = re.compile(
+    r"^(?:write|create|make|start|new|add) (?:a |an )?(?:journal|diary) (?:entry)?(.*)$"
+)
+_JOURNAL_OPEN_RE = re.compile(r"^(?:write|log|add) (?:in |to )?(?:my )?(?:journal|diary)$")
+_JOURNAL_STREAK_PATTERNS = (
+    r"^(?:how'?s|what'?s|show) (?:my )?(?:journal|journaling) (?:streak|stats)$",
+    r"^journal streak$",
+)
+_JOURNAL_PROMPT_RE = re.compile(r"^(?:give me a |)journal(?:ing)? prompt")
 
-    # "forget that" — retract the most recent memory write for the caller.
-    # Matched very early so it never collides with other verbs.
-    if _FORGET_LAST_RE.match(t):
-        return Intent("memory_forget_last", {})
+_SPENT_RE = re.compile(
+    r"^i (?:spent|paid) \$?([\d.]+)(?: ?(?:dollars?|bucks?))?(?: (?:at|on|for) (.+))?$"
+)
+_BOUGHT_RE = re.compile(r"^(?:bought|purchased) (.+?) (?:for )\$?([\d.]+)$")
+_TRANSACTION_SUMMARY_PATTERNS = (
+    r"^(?:how much (?:did i|have i) (?:spent?|spend)|weekly spending|budget check|spending (?:summary|this week))(.*)$",
+    r"^what(?:'s| did) (?:i|we) spend(.*)$",
+)
+_DAILY_BRIEFING_PATTERNS = (
+    r"^what(?:'?s| is) (?:on )?(?:today|my day)(?: like)?$",
+    r"^whats (?:on )?(?:today|my day)(?: like)?$",
+    r"^(?:daily|morning) (?:briefing|update|rundown)$",
+    r"^give me (?:a |my )?(?:daily |morning )?(?:briefing|update|rundown)$",
+    r"^what(?:'s| is) (?:coming up|on|left)(?: for me)? today$",
+    r"^what (?:do i|have i got) (?:have )?(?:on )?today$",
+)
 
-    # "forget everything about X" -- entity-scoped forget (QA review F14).
-    # Only fires when the captured entity is name-shaped: "forget about it",
-    # "forget about my day" etc. fall through to normal routing.
-    m = _FORGET_ENTITY_RE.match(t)
-    if m:
-        # Prefer the raw text's capture so the name keeps the user's casing
-        # ("Mary Jane", not "mary jane"); t is lowercased by normalization.
-        _m_raw = _FORGET_ENTITY_RE.match((text or "").strip())
-        _entity = ((_m_raw or m).group("entity") or "").strip().rstrip(".!?")
-        # Quantifiers / deictics / time words the name validator lets through:
-        # "forget about everything|today|it all" must never become a sweep.
-        _FORGET_ENTITY_STOP = {
-            "everything", "anything", "something", "nothing", "all", "stuff",
-            "things", "life", "today", "tomorrow", "yesterday", "now",
-            "earlier", "before", "again", "ourselves", "yourself", "myself",
-        }
-        try:
-            from person_extractor import _looks_like_person_name
-            _namey = (_entity.lower() not in _FORGET_ENTITY_STOP
-                      and _looks_like_person_name(_entity))
-        except Exception:
-            _namey = False  # validator unavailable -> fail closed, never nuke
-        if _namey:
-            return Intent("memory_forget_entity", {"name": _entity})
+_SMART_HOME_ROOM_RE = re.compile(
+    r'\b(bedroom|kitchen|living\s+room|bathroom|lounge|office|'
+    r'dining\s+room|hallway|garage|backyard|garden|study)\b',
+    re.IGNORECASE,
+)
 
-    # Portrait intents — how well Zoe knows the user, and rebuilding understanding.
-    if _PORTRAIT_REVEAL_RE.search(t):
-        return Intent("portrait_reveal", {})
-    if _PORTRAIT_REFRESH_RE.search(t):
-        return Intent("portrait_refresh", {})
+_TIMER_PATTERNS = (
+    rf"^(?:set|start|create|add) (?:a |an )?(?:({_TIMER_MINUTES_PAT})[\s\-]minute[s]?|({_TIMER_MINUTES_PAT})[\s\-]min[s]?) timer(?: (?:called|for|named) (.+))?$",
+    rf"^(?:set|start|create) (?:a |an )?timer (?:for|of) ({_TIMER_MINUTES_PAT}) min(?:utes?)?(?:\s+(?:called|for|named) (.+))?$",
+    rf"^({_TIMER_MINUTES_PAT}) min(?:utes?)? timer(?: (?:for|called|named) (.+))?$",
+    r"^(?:set|start) (?:a |an )?timer$",
+)
 
-    # Connect ChatGPT / OpenAI to OpenClaw — admin-gated, handled via AG-UI OAuth flow.
-    if _CONNECT_CHATGPT_RE.match(t):
-        # Delegation intent — no structured slots to extract; empty dict bypasses
-        # the nlu_extractor path in detect_and_extract_intent so it returns the
-        # intent directly instead of trying (and failing) to extract slots.
-        return Intent("connect_chatgpt", {})
+_RECIPE_SEARCH_RE = re.compile(
+    r"^(?:show|find|get|search|look up)(?: me)? (?:a )?recipe (?:for |to make )?(.+)$"
+)
+_RECIPE_HOW_RE = re.compile(r"^how (?:do i |can i )?(?:make|cook|bake) (.+)$")
+
+# Checked before list_add so "add music service" doesn't misroute.
+_MUSIC_SETUP_EARLY_RE = re.compile(
+    r"^(?:set\s?up|configure|connect|add|setup)\s+"
+    r"(?:music(?:\s+assistant)?|spotify|youtube\s*music|apple\s*music"
+    r"|deezer|tidal|plex|streaming|music\s+services?|music\s+settings?)$"
+    r"|^music\s+settings?$"
+    r"|^set\s+up\s+music\s+assistant$"
+    r"|^connect\s+(?:my\s+)?(?:music|streaming)$",
+    re.IGNORECASE,
+)
 
-    # Zoe self-extension — always routes to OpenClaw (admin-gated in the skill).
-    # Checked BEFORE list/reminder/etc so "add X widget" doesn't become list_add.
-    # Empty slots: these are delegation intents with no structured fields to
-    # extract, so they must NOT carry {"raw": text} which would send them through
-    # nlu_extractor and cause detect_and_extract_intent to return None on failure.
-    if _BUILD_WIDGET_RE.match(t) or _WANT_WIDGET_RE.match(t):
-        return Intent("build_widget", {})
-    if _BUILD_PAGE_RE.match(t) or _WANT_PAGE_RE.match(t):
-        return Intent("build_page", {})
-    if _EXTEND_CAPABILITY_RE.match(t):
-        return Intent("extend_capability", {})
-    if _SELF_IMPROVE_RE.search(t):
-        return Intent("self_improve", {})
+_LIST_ADD_EXPLICIT_PATTERNS = (
+    r"^add (.+?) to (?:the |my )?(.+?) ?list$",
+    r"^put (.+?) on (?:the |my )?(.+?) ?list$",
+    r"^add (.+?) to (?:the |my )?(shopping|grocery|groceries|todo|to do|to-do|personal|work|bucket)$",
+    r"^(?:(?:can|could) you |please )?(?:add|put) (.+?) (?:to|on) (?:the |my )?(.+?) ?list$",
+)
+# Moonshine renders a leading "Add" as near-homophones: "Add council to my
+# work list" arrives as "I'd go to council to my work list" (said-vs-did
+# bug: the add regexes miss and the semantic router drifts to calendar).
+# If the utterance ENDS with "to my <known> list", treat it as an add and
+# strip the garbled lead-in. Bare navigation ("go to my work list") leaves
+# no item text, so it still falls through to the LIST SHOW/OPEN patterns.
+_LIST_ADD_GARBLED_RE = re.compile(
+    r"^(?:i'?d|id|and|at|it|hey|a)?\s*(?:go to |goto )?(.+?) "
+    r"to (?:the |my )?(shopping|grocery|groceries|todo|to do|to-do|personal|work|bucket|tasks?)"
+    r" list[.!?]?$"
+)
+_LIST_ADD_IMPLICIT_PATTERNS = (
+    r"^add (.+)$",
+    r"^put (.+)$",
+    r"^(?:(?:can|could) you |please )?add (.+)$",
+    r"^(?:(?:can|could) you |please )?put (.+)$",
+)
+_LIST_ADD_SHOPPING_RE = re.compile(
+    r"^(?:i need to buy|we need|we'?re out of|don'?t forget|buy|get) (.+)$"
+)
+_LIST_SHOW_PATTERNS = (
+    r"^(?:show|read|check) (?:me )?(?:the |my )?(.+?) ?list$",
+    r"^what(?:'?s| is) on (?:the |my )?(.+?) ?list$",
+    r"^what do i need to (?:buy|get)$",
+    r"^what'?s on my list$",
+    r"^show my list$",
+    r"^(?:open|show|bring up|go to|take me to) (?:the |my )?(?:shopping |grocery |groceries )?list(?: page| screen| view)?$",
+    r"^(?:open|show|bring up|go to|take me to) lists?$",
+    r"^(?:open|show|bring up|go to|take me to) (?:the |my )?(?:shopping|grocery|groceries)$",
+    r"^show me list$",
+)
+_LIST_REMOVE_PATTERNS = (
+    r"^(?:remove|delete|take off|cross off) (.+?) from (?:the |my )?(.+?) ?list$",
+    r"^(?:remove|delete|take off|cross off) (.+?) from (?:the |my )?(.+)$",
+    r"^(?:we got|got|we have) (.+)$",
+)
 
-    # "Let's talk" → navigate the browser panel to voice.html?conv=1 (conversation mode).
-    # Placed before greetings so "let's chat" doesn't become a greeting.
-    if _LETS_TALK_RE.search(t):
-        return Intent("lets_talk", {})
+_MUSIC_PLAY_RE = re.compile(
+    r"^(?:play|put on|play me|play some|start playing)\s+(.+)$", re.IGNORECASE
+)
+_MUSIC_CMD_RE = re.compile(
+    r"^(?P<cmd>pause|stop|resume|unpause|skip(?:\s+(?:this|the)\s+(?:song|track))?|next(?: song| track)?|previous(?: song| track)?"
+    r"|next track|prev track|previous track|what(?:'s| is)(?: currently)? playing"
+    r"|what song is this|volume up|volume down|louder|quieter|mute|unmute|shuffle|repeat)(?: the music| music)?\.?$",
+    re.IGNORECASE,
+)
+_VOLUME_SET_RE = re.compile(r"^(?:set volume|volume) (?:to |at )?(\d{1,3})(?:\s*%)?\.?$", re.IGNORECASE)
+# Favourite the current track. Verbs: like / love / favourite(+US spelling) /
+# thumbs up / heart; object: this / this song|track|tune|one / it. "I like
+# this", "favourite this song", "thumbs up this". Deliberately NOT "add …":
+# "add this to my favourites" collides with the shopping-list `list_add`
+# intent (which matches earlier), and "favourite this" already covers it.
+_MUSIC_FAVORITE_RE = re.compile(
+    r"^(?:hey zoe,?\s*)?(?:i\s+)?(?:really\s+)?"
+    r"(?:like|love|favou?rite|thumbs?\s*up|heart)\s+"
+    r"(?:this(?:\s+(?:song|track|tune|one))?|it)\.?$",
+    re.IGNORECASE,
+)
 
-    # === GREETINGS — morning/evening check-ins ===
-    if re.match(r"^(?:good\s+)?morning(?:\s+zoe)?\.?$", t) or t in {
-        "morning", "morning zoe", "hey morning",
-    }:
-        return Intent("good_morning", {})
-    if re.match(r"^good\s+evening(?:\s+zoe)?\.?$|^good\s+night(?:\s+zoe)?\.?$", t) or t in {
-        "evening", "evening zoe",
-    }:
-        return Intent("good_evening", {})
+# Conversational volume phrases — covers polite/natural speech (zoe-self-improve 2026-05-11 refined)
+_AUTOGEN_UNKNOWN_GAP = re.compile(
+    r'(?:can|could|would|will)\s+you\s+.*?(?:volume|louder|quieter)'
+    r'|(?:turn|put|make|bring|bump|crank)\s+(?:your|the|it|that)?\s*(?:volume\s*)?(?:up|down|louder|quieter)'
+    r'|(?:raise|increase|boost|lower|decrease|reduce)\s+(?:the|your)?\s*(?:volume|sound)'
+    r'|(?:a\s+bit|just\s+a?\s*(?:little|tad)|slightly)\s+(?:louder|quieter|softer)',
+    re.IGNORECASE,
+)
+_VOLUME_WORDS = dict(zero=0, one=1, two=2, three=3, four=4, five=5, six=6, seven=7, eight=8, nine=9, ten=10)
+
+# ── A2A Federation ────────────────────────────────────────────────────────
+_A2A_RE = re.compile(
+    r'\b(?:call|ask|delegate\s+to|send\s+to|route\s+to|use)\b.{0,20}\b(?:agent|hermes|openclaw)\b'
+    r'|which\s+agents?\s+(?:do\s+you|are|can)\b'
+    r'|(?:show|list|what\s+are)\s+(?:my|your|the)?\s*(?:agents?|federation|peers?)\b'
+    r'|(?:agent|federation)\s+(?:status|registry|health|card)\b'
+    r'|what\s+agents?\s+(?:do\s+you\s+know|have\s+you|are\s+available)\b'
+    r'|a2a\s+(?:status|health|check|federation)\b'
+    r'|(?:hermes|openclaw)\s+(?:status|online|running|connected|health)\b'
+    r'|are\s+(?:hermes|openclaw|peer\s+agents?)\s+(?:online|running|connected|available)\b'
+    r'|list\s+(?:connected|registered|known|peer)\s+agents?\b',
+    re.I,
+)
 
-    # === GENERAL GREETING (ZOE-42, ZOE-15) — hello/hi/hey/good afternoon/etc. ===
-    # good_morning/good_evening already handled above (they trigger the daily briefing).
-    if _GREETING_RE.match(t):
-        tod = None
-        if "afternoon" in t:
-            tod = "afternoon"
-        elif "night" in t:
-            tod = "night"
-        return Intent("greeting", {"time_of_day": tod})
+# ── Multica board visibility ───────────────────────────────────────────────
+_DISPATCH_PAUSE_RE = re.compile(r"\b(?:pause|stop)\s+(?:multica\s+|engineering\s+)?dispatch\b", re.I)
+_DISPATCH_RESUME_RE = re.compile(r"\bresume\s+(?:multica\s+|engineering\s+)?dispatch\b", re.I)
+_MOVE_TODO_RE = re.compile(r"\bmove\s+(?P<reference>ZOE-\d+|[0-9a-f-]{32,36})\s+to\s+todo\b", re.I)
+_SPLIT_TICKET_RE = re.compile(
+    r"\bsplit\s+(?P<reference>ZOE-\d+|[0-9a-f-]{32,36})\s+into\s+(?P<title>.+)$", re.I
+)
+_MULTICA_BACKLOG_RE = re.compile(r"\b(?:show|list)\s+(?:the\s+)?multica\s+backlog\b", re.I)
+_BARE_BLOCKED_RE = re.compile(r"\s*(?:what(?:'s| is)|show|list)\s+(?:currently\s+)?blocked\s*[?.!]?\s*", re.I)
+_QUALIFIED_BLOCKED_RE = re.compile(
+    r"\b(?:show|list|what(?:'s| is))\b.*\b(?:multica|engineering|tickets?)\b.*\bblocked\b"
+    r"|\b(?:show|list|what(?:'s| is))\b.*\bblocked\b.*\b(?:multica|engineering|tickets?)\b",
+    re.I,
+)
+_BOARD_RE = re.compile(
+    r"what'?s?\s+on\s+(?:the\s+)?(?:multica\s+)?board\b"
+    r"|show\s+(?:the\s+)?(?:multica\s+)?(?:active\s+)?(?:board|tasks?)\b"
+    r"|open\s+(?:the\s+)?(?:multica\s+)?(?:task\s+)?board\b"
+    r"|show\s+(?:me\s+)?multica\b"
+    r"|what\s+is\s+(?:openclaw|hermes|the\s+agent)\s+(?:doing|working\s+on|running)\b"
+    r"|any\s+(?:active\s+)?(?:agent\s+)?tasks?\s+(?:running|pending|in\s+progress)\b"
+    r"|board\s+(?:status|view|items?)\b",
+    re.I,
+)
+_AGENT_ACTIVITY_RE = re.compile(
+    r"show\s+(?:me\s+)?(?:my\s+)?(?:agent\s+)?activity\b"
+    r"|what(?:'s| is)\s+running\s+in\s+the\s+background\b"
+    r"|(?:any\s+)?background\s+tasks?\s+(?:running|active|pending)\b"
+    r"|list\s+(?:my\s+)?(?:agent\s+)?(?:background\s+)?tasks?\b",
+    re.I,
+)
 
-    if re.match(r"^ping\.?$", t):
-        return Intent("greeting", {})
+# ── Evolution proposals ────────────────────────────────────────────────────
+_EVOLVE_REVIEW_RE = re.compile(
+    r'what\s+(?:needs?|could)\s+(?:be\s+)?improv(?:ing|ed|ement)\b'
+    r'|show\s+(?:improvement\s+)?proposals?\b'
+    r'|review\s+proposals?\b'
+    r'|what\s+(?:are|is)\s+(?:you\s+)?struggling\s+with\b'
+    r'|what\s+(?:have\s+you\s+)?noticed\s+(?:that\s+needs|needs?)\s+fix\b'
+    r'|evolution\s+(?:proposals?|review|status)\b'
+    r'|(?:what|show)\s+(?:improvements?|ideas?)\s+(?:has\s+)?(?:zoe|you)\s+(?:proposed|noticed|suggested)\b'
+    r'|pending\s+proposals?\b'
+    r"|zoe'?s?\s+(?:self.?improv\w+|improvement\s+ideas?)\b"
+    r"|what\s+(?:does\s+)?(?:zoe|you)\s+want\s+to\s+change\b",
+    re.I,
+)
+_BOARD_HEAL_RE = re.compile(
+    r"\b(?:fix|heal|triage|clean\s*up|review|sort\s*out)\b"
+    r".*\b(?:board|issues?|multica|problems?|proposals?)\b"
+    r"|\b(?:board|multica)\b.*\b(?:fix|heal|triage|clean\s*up|review|sort\s*out)\b"
+    r"|self.?heal\b|board\s+review\b|check\s+the\s+board\b",
+    re.I,
+)
 
-    # Social acknowledgements & presence checks — instant, no brain.
-    if _THANKS_RE.match(t):
-        return Intent("acknowledgement", {"kind": "thanks"})
-    if _ACK_RE.match(t):
-        return Intent("acknowledgement", {"kind": "ack"})
-    if _STATUS_CHECK_RE.match(t):
-        return Intent("status_check", {})
+# ── User issue / complaint reports ────────────────────────────────────────
+_USER_ISSUE_RE = re.compile(
+    r'\byou\s+got\s+that\s+wrong\b'
+    r'|\byou\s+keep\s+(?:getting|messing)\b'
+    r'|\bthat\s+(?:didn\'?t|did\s+not)\s+work\b'
+    r'|\bthat\'?s?\s+not\s+working\b'
+    r'|\bthere\'?s?\s+(?:an?\s+)?(?:problem|issue|bug)\s+with\b'
+    r'|\bfix\s+(?:your|the)\b'
+    r'|\b\w+\s+(?:is\s+)?broken\b'
+    r'|\b\w+\s+doesn\'?t\s+work\b'
+    r'|\byou\s+should\s+know\s+that\b'
+    r'|\bi\s+keep\s+having\s+(?:issues?|problems?)\b'
+    r'|\byou\s+need\s+to\s+fix\b'
+    r'|\bthat\s+was\s+(?:wrong|incorrect)\b'
+    r'|\byou\s+(?:messed|failed)\b',
+    re.I,
+)
 
-    if re.match(r"^what lists do i have\??$", t):
-        return Intent("list_show", {})
+# Quantifiers / deictics / time words the name validator lets through:
+# "forget about everything|today|it all" must never become a sweep.
+_FORGET_ENTITY_STOP = {
+    "everything", "anything", "something", "nothing", "all", "stuff",
+    "things", "life", "today", "tomorrow", "yesterday", "now",
+    "earlier", "before", "again", "ourselves", "yourself", "myself",
+}
 
-    if re.match(
-        r"^(?:open|show|go to|bring up|take me to) (?:the |my )?contacts(?: page)?\??$",
-        t,
-    ):
-        return Intent("people_search", {"query": ""})
 
-    if re.match(r"^remember that\b.+", t, re.IGNORECASE):
-        return Intent("memory_remember", {"raw": text})
+# ── Slot extractors ─────────────────────────────────────────────────────────
+# Each takes (match, turn) and returns the slots dict, or None to reject the
+# match so the next rule in the table gets its turn (the old "fall through").
 
-    # === CLOCK / CALENDAR QUERIES — checked before domain patterns (no slots needed) ===
+def _slots_panel_code(m, turn) -> dict:
+    return {"code": (m.group(1) or m.group(2) or "").upper()}
 
-    if _TIME_PLANNING_CLARIFICATION_RE.match(t):
-        return Intent("time_planning_clarification", {"kind": "best_time_to_leave"})
 
-    if _TIME_MATH_CLARIFICATION_RE.match(t):
-        return Intent("time_planning_clarification", {"kind": "time_math"})
+def _slots_ha_full_setup(_m, turn) -> Optional[dict]:
+    return {} if _is_ha_full_setup_message(turn.t) else None
 
-    # Modelled on HA's HassGetCurrentTime and HassGetCurrentDate — two separate intents
-    if _TIME_QUERY_RE.match(t):
-        return Intent("time_query", {})
 
-    if _DATE_QUERY_RE.match(t):
-        return Intent("date_query", {})
+def _slots_forget_entity(m, turn) -> Optional[dict]:
+    # Only fires when the captured entity is name-shaped: "forget about it",
+    # "forget about my day" etc. fall through to normal routing.
+    # Prefer the raw text's capture so the name keeps the user's casing
+    # ("Mary Jane", not "mary jane"); t is lowercased by normalization.
+    _m_raw = _FORGET_ENTITY_RE.match((turn.text or "").strip())
+    _entity = ((_m_raw or m).group("entity") or "").strip().rstrip(".!?")
+    try:
+        from person_extractor import _looks_like_person_name
+        _namey = (_entity.lower() not in _FORGET_ENTITY_STOP
+                  and _looks_like_person_name(_entity))
+    except Exception:
+        _namey = False  # validator unavailable -> fail closed, never nuke
+    return {"name": _entity} if _namey else None
 
-    # --- CALCULATE (ZOE-10) — arithmetic fast-path, no LLM needed ---
-    # Percentage form: "what is 25% of 80"
-    _pct_m = _CALCULATE_PCT_RE.match(t)
-    if _pct_m:
-        pct_val, base_val = _pct_m.group(1), _pct_m.group(2)
-        return Intent("calculate", {"expression": f"{pct_val}/100*{base_val}",
-                                    "display": f"{pct_val}% of {base_val}"})
-    # Word-operator form: "what is 10 times 3" / "10 divided by 2"
-    _words_m = _CALCULATE_WORDS_RE.match(t)
-    if _words_m:
-        a, op_word, b = _words_m.group(1), _words_m.group(2).lower(), _words_m.group(3)
-        op = {"times": "*", "multiplied by": "*",
-              "divided by": "/", "plus": "+", "minus": "-"}.get(op_word, "+")
-        return Intent("calculate", {"expression": f"{a}{op}{b}",
-                                    "display": f"{a} {op_word} {b}"})
-    # Symbolic form: "2+2", "what is 100/4", "15 * 3 = ?"
-    _calc_m = _CALCULATE_RE.match(t)
-    if _calc_m and _calc_m.group(1):
-        return Intent("calculate", {"expression": _calc_m.group(1).strip()})
 
-    # === DOMAIN-SPECIFIC PATTERNS FIRST (to avoid list collisions) ===
+def _slots_greeting(m, turn) -> dict:
+    tod = None
+    if "afternoon" in turn.t:
+        tod = "afternoon"
+    elif "night" in turn.t:
+        tod = "night"
+    return {"time_of_day": tod}
 
-    # --- CALENDAR CREATE (keyword classifier → LLM fills slots via detect_and_extract_intent) ---
+
+def _slots_raw(m, turn) -> dict:
+    return {"raw": turn.text}
+
+
+def _slots_calculate_pct(m, turn) -> dict:
+    pct_val, base_val = m.group(1), m.group(2)
+    return {"expression": f"{pct_val}/100*{base_val}",
+            "display": f"{pct_val}% of {base_val}"}
+
+
+def _slots_calculate_words(m, turn) -> dict:
+    a, op_word, b = m.group(1), m.group(2).lower(), m.group(3)
+    op = {"times": "*", "multiplied by": "*",
+          "divided by": "/", "plus": "+", "minus": "-"}.get(op_word, "+")
+    return {"expression": f"{a}{op}{b}", "display": f"{a} {op_word} {b}"}
+
+
+def _slots_calculate(m, turn) -> Optional[dict]:
+    if not m.group(1):
+        return None
+    return {"expression": m.group(1).strip()}
+
+
+def _slots_calendar_create(m, turn) -> Optional[dict]:
     # Hard nouns: always calendar. Soft nouns: calendar unless note/journal/list/reminder present.
-    _CAL_CREATE_VERB = re.compile(r"\b(?:add|put|create|schedule|set\s*up|make|book)\b")
-    _CAL_HARD_NOUNS = {"calendar", "appointment"}
-    _CAL_SOFT_NOUNS = {"event", "meeting"}
-    _CAL_BLOCKERS = {"note", "notes", "journal", "diary", "list", "reminder", "shopping"}
-    if _CAL_CREATE_VERB.search(t):
-        _has_hard = any(kw in t for kw in _CAL_HARD_NOUNS)
-        _has_soft = any(kw in t for kw in _CAL_SOFT_NOUNS)
-        _blocked = any(kw in t for kw in _CAL_BLOCKERS)
-        if _has_hard or (_has_soft and not _blocked):
-            return Intent("calendar_create", {"raw": text})
+    t = turn.t
+    _has_hard = any(kw in t for kw in _CAL_HARD_NOUNS)
+    _has_soft = any(kw in t for kw in _CAL_SOFT_NOUNS)
+    _blocked = any(kw in t for kw in _CAL_BLOCKERS)
+    if _has_hard or (_has_soft and not _blocked):
+        return {"raw": turn.text}
+    return None
 
-    # --- CALENDAR SHOW ---
-    for pattern in [
-        r"^what(?:'s| is) on my (?:calendar|schedule)(.*)$",
-        r"^whats on my (?:calendar|schedule)(.*)$",
-        r"^(?:show|check) (?:me )?my (?:calendar|schedule|events)(.*)$",
-        r"^(?:show|open|bring up|go to|take me to) (?:the |my )?(?:calendar|schedule)(?: (?:page|screen|view))?(.*)$",
-        r"^my (?:calendar|schedule|events)$",
-        r"^(?:upcoming|today'?s) (?:events|calendar|schedule)$",
-        r"^show me (?:my )?week(?: at a glance)?$",
-        r"^whats on today$",
-        r"^what'?s on today$",
-        r"^whats happening (?:today|this afternoon|this evening|tomorrow)(.*)$",
-        r"^what'?s happening (?:today|this afternoon|this evening|tomorrow)(.*)$",
-        r"^whats my first event(?: tomorrow| today)?$",
-        r"^what'?s my first event(?: tomorrow| today)?$",
-        r"^do i have free time(?: today| tomorrow| tomorrow evening| this evening)?$",
-        r"^what (?:events )?do i have(?: today| this week| tomorrow)?$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            qualifier = (m.group(1) if m.lastindex else "").strip()
-            return Intent("calendar_show", {"qualifier": qualifier})
 
-    # --- REMINDERS CREATE (keyword classifier → LLM fills slots via detect_and_extract_intent) ---
-    # Pattern 1: "remind me to/at/in/on/about X", "set a reminder to/for/at/in/on X",
-    #            "reminder to/for/at X", "remember to X"
-    if re.match(
-        r"^(?:remind me (?:to|at|in|on|about)|set a reminder (?:to|for|at|in|on)|reminder (?:to|for|at)|remember to) .+",
-        t,
-    ):
-        return Intent("reminder_create", {"raw": text})
-    # Pattern 2: "add/create/make a reminder for X"
-    if re.match(r"^(?:add|create|make|schedule)\s+(?:a |an )?reminder\b.*", t):
-        return Intent("reminder_create", {"raw": text})
+def _slots_qualifier(m, turn) -> dict:
+    return {"qualifier": (m.group(1) if m.lastindex else "").strip()}
 
-    # --- REMINDERS LIST ---
-    for pattern in [
-        r"^(?:show|list|check|what are) (?:my )?reminders$",
-        r"^my reminders$",
-        r"^(?:open|show|bring up|go to|take me to) (?:the |my )?reminders(?: (?:page|screen|view))?$",
-        r"^show todays reminders$",
-        r"^show today'?s reminders$",
-    ]:
-        if re.match(pattern, t):
-            return Intent("reminder_list", {})
 
-    # --- CONTACTS INTRODUCE ---
-    _PEOPLE_INTRODUCE_RE = re.compile(
-        r'\b(?:zoe[,\s]+)?(?:meet|this is|introduce you to|say hi to|meet my|i\'d like you to meet)\s+'
-        r'([A-Z][a-z]{1,30}(?:\s[A-Z][a-z]{1,20})?)',
-        re.IGNORECASE,
-    )
-    m_intro = _PEOPLE_INTRODUCE_RE.search(t)
-    if m_intro:
-        return Intent("people_introduce", {"name": m_intro.group(1).strip()})
+def _slots_people_introduce(m, turn) -> dict:
+    return {"name": m.group(1).strip()}
 
-    # Note: third-party person-to-person relationships (e.g. "Sarah is Tom's
-    # sister") are captured from natural language by person_extractor on every
-    # turn (→ _write_relationship); there is no dedicated relate intent.
 
-    # --- CONTACTS CREATE ---
-    m = re.match(
-        r"^(?:add|create|save) (?:a )?(?:contact|person|entry) (?:for |named )?(.+)$", t
-    )
-    if m:
-        raw = m.group(1).strip()
-
-        # Extract just the name: stop at the first comma or pronoun ("she's / he's / who is")
-        name_part = re.split(
-            r",|\s+(?:she\'?s?|he\'?s?|they\'?re?|who\s+is|as\s+(?:a|my)?)\b",
-            raw, maxsplit=1, flags=re.I
-        )[0].strip()
-        # Capitalise each word (input text is normalised to lower)
-        name = " ".join(w.capitalize() for w in name_part.split()) if name_part else raw
-
-        rel = "friend"
-        context = "personal"
-        circle = "circle"
-
-        tl = t.lower()
-        # Context: work signals
-        for tag in ["colleague", "coworker", "co-worker", "boss", "client", "contractor", "vendor"]:
-            if tag in tl:
-                context = "work"
-                circle = "circle"
-                rel = tag if tag != "coworker" else "colleague"
-                break
-        # Context: personal signals (only override if not already set to work)
-        if context != "work":
-            for tag in ["friend", "family", "neighbor", "neighbour", "partner", "spouse"]:
-                if tag in tl:
-                    context = "personal"
-                    break
+def _slots_people_create(m, turn) -> dict:
+    raw = m.group(1).strip()
 
-        # Relationship label
-        rel_map = [
-            ("best friend", "best friend"),
-            ("spouse",      "spouse"),
-            ("partner",     "partner"),
-            ("colleague",   "colleague"),
-            ("friend",      "friend"),
-            ("family",      "family"),
-            ("neighbor",    "neighbor"),
-            ("neighbour",   "neighbor"),
-        ]
-        for keyword, label in rel_map:
-            if keyword in tl:
-                rel = label
-                break
+    # Extract just the name: stop at the first comma or pronoun ("she's / he's / who is")
+    name_part = re.split(
+        r",|\s+(?:she\'?s?|he\'?s?|they\'?re?|who\s+is|as\s+(?:a|my)?)\b",
+        raw, maxsplit=1, flags=re.I
+    )[0].strip()
+    # Capitalise each word (input text is normalised to lower)
+    name = " ".join(w.capitalize() for w in name_part.split()) if name_part else raw
+
+    rel = "friend"
+    context = "personal"
+    circle = "circle"
 
-        # Tier
-        for tag in ["inner circle", "best friend", "closest", "partner", "spouse"]:
+    tl = turn.t.lower()
+    # Context: work signals
+    for tag in ["colleague", "coworker", "co-worker", "boss", "client", "contractor", "vendor"]:
+        if tag in tl:
+            context = "work"
+            circle = "circle"
+            rel = tag if tag != "coworker" else "colleague"
+            break
+    # Context: personal signals (only override if not already set to work)
+    if context != "work":
+        for tag in ["friend", "family", "neighbor", "neighbour", "partner", "spouse"]:
             if tag in tl:
-                circle = "inner"
+                context = "personal"
                 break
 
-        return Intent("people_create", {"name": name, "relationship": rel, "context": context, "circle": circle})
+    # Relationship label
+    rel_map = [
+        ("best friend", "best friend"),
+        ("spouse",      "spouse"),
+        ("partner",     "partner"),
+        ("colleague",   "colleague"),
+        ("friend",      "friend"),
+        ("family",      "family"),
+        ("neighbor",    "neighbor"),
+        ("neighbour",   "neighbor"),
+    ]
+    for keyword, label in rel_map:
+        if keyword in tl:
+            rel = label
+            break
 
-    # --- CONTACTS SEARCH ---
-    m = re.match(r"^(?:find|search|look up) (?:a )?(?:contact|person) (?:for |named )?(.+)$", t)
-    if m:
-        return Intent("people_search", {"query": m.group(1).strip()})
+    # Tier
+    for tag in ["inner circle", "best friend", "closest", "partner", "spouse"]:
+        if tag in tl:
+            circle = "inner"
+            break
 
-    m = re.match(r"^who is (.+)$", t)
-    if m:
-        return Intent("people_search", {"query": m.group(1).strip()})
+    return {"name": name, "relationship": rel, "context": context, "circle": circle}
 
 
-    # --- NOTES CREATE ---
-    # Unambiguous note-creation verbs (make/create/write/save/take) accept a
-    # bare space, colon, or connector before the body ("make a note X",
-    # "make a note: X", "write a note about X").
-    m = re.match(
-        r"^(?:make|create|write|save|take) (?:a )?note(?:s)?"
-        r"(?:\s*[:\-]\s*|\s+(?:titled|called|about|on)\s+|\s+)(.+)$", t
-    )
-    if m:
-        body = m.group(1).strip()
-        return Intent("note_create", {"title": body[:60], "content": body})
-    # "add a note" is ambiguous with a shopping add ("add a note pad", "add
-    # sticky notes"), so it means note_create ONLY with an explicit colon or
-    # connector ("add a note: X", "add a note about X") — never a bare space.
-    m = re.match(
-        r"^add (?:a )?note(?:s)?(?:\s*[:\-]\s*|\s+(?:titled|called|about|on)\s+)(.+)$", t
-    )
-    if m:
-        body = m.group(1).strip()
-        return Intent("note_create", {"title": body[:60], "content": body})
+def _slots_query(m, turn) -> dict:
+    return {"query": m.group(1).strip()}
 
-    # "jot down X" / "jot this down: X" / "note that X" / "note down X" —
-    # imperative note phrasings that aren't caught above. Route straight to
-    # note_create rather than defer, so the note is captured on the fast path.
-    m = re.match(
-        r"^(?:jot(?:\s+(?:this|that|it))?\s+down|note\s+down|note\s+that|note\s+this)"
-        r"(?:\s*[:\-]\s*|\s+)(.+)$", t
-    )
-    if m:
-        body = m.group(1).strip()
-        return Intent("note_create", {"title": body[:60], "content": body})
 
-    # --- NOTES SEARCH ---
-    m = re.match(r"^(?:search|find|look up) (?:my )?notes (?:for |about )?(.+)$", t)
-    if m:
-        return Intent("note_search", {"query": m.group(1).strip()})
+def _slots_broad_people_search(m, turn) -> Optional[dict]:
+    query = m.group(1).strip()
+    if any(kw in query for kw in _BROAD_PEOPLE_SEARCH_BLOCKED):
+        return None
+    return {"query": query}
 
-    # --- BROAD PEOPLE SEARCH (after notes, to avoid collision) ---
-    m = re.match(r"^(?:find|look up) (.+)$", t)
-    if m:
-        query = m.group(1).strip()
-        blocked = {"notes", "note", "list", "calendar", "schedule", "events",
-                   "reminders", "recipe", "recipes", "weather", "timer"}
-        if not any(kw in query for kw in blocked):
-            return Intent("people_search", {"query": query})
 
-    # --- WEATHER ---
-    for pattern in [
-        r"^what(?:'s| is) the weather(?: like)?(.*)$",
-        r"^whats the weather(?: like)?(.*)$",
-        r"^how(?:'s| is) the weather(.*)$",
-        r"^(?:(?:can|could) you |please )?(?:show|open|bring up|pull up|go to|take me to)(?: me)? (?:the )?weather(?: (?:screen|page|panel))?(.*)$",
-        r"^(?:will it|is it going to) rain(.*)$",
-        r"^do i need (?:a |an )?(?:jacket|umbrella|coat)(.*)$",
-        r"^temperature (?:today|tomorrow|outside)(.*)$",
-        r"^weather(\s+(?:today|tomorrow|forecast|this week))?(.*)$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            # Collect every captured group — the "weather" pattern uses two
-            # capture groups (qualifier + trailing) so we combine them to
-            # detect "weather forecast" / "weather this week".
-            groups = m.groups() or ()
-            qualifier = " ".join((g or "").strip() for g in groups).strip()
-            is_forecast = (
-                any(kw in qualifier for kw in ("tomorrow", "week", "forecast"))
-                or any(kw in t for kw in ("tomorrow", "this week", "forecast"))
-            )
-            return Intent("weather", {"qualifier": qualifier, "forecast": is_forecast})
+def _slots_note_body(m, turn) -> dict:
+    body = m.group(1).strip()
+    return {"title": body[:60], "content": body}
 
-    # --- JOURNAL ---
-    # Explicit "<verb> a journal entry[: <content>]" — the deterministic, DB-verified
-    # path (_execute_journal_create_direct). "add" is included because the 4B brain
-    # under-fires its journal tool on this exact phrasing (a "grateful for the rain"
-    # entry misroutes to a weather answer); #1150 already stopped list_add from
-    # swallowing "add a journal entry", so routing it positively here is the
-    # completion of that fix, not a regression. A leading ":"/"-"/"—" separator
-    # after "entry" is stripped so the colon doesn't leak into the stored content.
-    m = re.match(
-        r"^(?:write|create|make|start|new|add) (?:a |an )?(?:journal|diary) (?:entry)?(.*)$", t
+
+def _slots_weather(m, turn) -> dict:
+    # Collect every captured group — the "weather" pattern uses two
+    # capture groups (qualifier + trailing) so we combine them to
+    # detect "weather forecast" / "weather this week".
+    groups = m.groups() or ()
+    qualifier = " ".join((g or "").strip() for g in groups).strip()
+    is_forecast = (
+        any(kw in qualifier for kw in ("tomorrow", "week", "forecast"))
+        or any(kw in turn.t for kw in ("tomorrow", "this week", "forecast"))
     )
-    if m:
-        content = (m.group(1) or "").strip().lstrip(":-—").strip()
-        return Intent("journal_create", {"content": content})
+    return {"qualifier": qualifier, "forecast": is_forecast}
 
-    if re.match(r"^(?:write|log|add) (?:in |to )?(?:my )?(?:journal|diary)$", t):
-        return Intent("journal_create", {"content": ""})
 
-    for pattern in [
-        r"^(?:how'?s|what'?s|show) (?:my )?(?:journal|journaling) (?:streak|stats)$",
-        r"^journal streak$",
-    ]:
-        if re.match(pattern, t):
-            return Intent("journal_streak", {})
+def _slots_journal_create(m, turn) -> dict:
+    return {"content": (m.group(1) or "").strip().lstrip(":-—").strip()}
 
-    if re.match(r"^(?:give me a |)journal(?:ing)? prompt", t):
-        return Intent("journal_prompt", {})
 
-    # --- TRANSACTIONS ---
+def _money_slots(raw: str) -> Optional[dict]:
     # Parse money exactly: integer cents (no float drift) plus the canonical
     # two-decimal dollars the command boundary still expects. A malformed match
     # (e.g. "1.2.3") returns None so we DON'T record a bogus $0 transaction —
     # the turn falls through to later intents / open-domain handling instead.
     from money import to_cents, to_dollars
 
-    def _money_slots(raw: str):
-        try:
-            cents = to_cents(raw)
-        except ValueError:
-            return None
-        return {"amount": to_dollars(cents), "amount_cents": cents}
+    try:
+        cents = to_cents(raw)
+    except ValueError:
+        return None
+    return {"amount": to_dollars(cents), "amount_cents": cents}
 
-    m = re.match(
-        r"^i (?:spent|paid) \$?([\d.]+)(?: ?(?:dollars?|bucks?))?(?: (?:at|on|for) (.+))?$", t
-    )
-    if m:
-        slots = _money_slots(m.group(1))
-        if slots is not None:
-            desc = (m.group(2) or "").strip() or "purchase"
-            return Intent("transaction_create", {**slots, "description": desc})
 
-    m = re.match(
-        r"^(?:bought|purchased) (.+?) (?:for )\$?([\d.]+)$", t
-    )
-    if m:
-        slots = _money_slots(m.group(2))
-        if slots is not None:
-            desc = m.group(1).strip()
-            return Intent("transaction_create", {**slots, "description": desc})
-
-    for pattern in [
-        r"^(?:how much (?:did i|have i) (?:spent?|spend)|weekly spending|budget check|spending (?:summary|this week))(.*)$",
-        r"^what(?:'s| did) (?:i|we) spend(.*)$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            qualifier = (m.group(1) if m.lastindex else "").strip()
-            period = "month" if "month" in qualifier else "week"
-            return Intent("transaction_summary", {"period": period})
+def _slots_spent(m, turn) -> Optional[dict]:
+    slots = _money_slots(m.group(1))
+    if slots is None:
+        return None
+    desc = (m.group(2) or "").strip() or "purchase"
+    return {**slots, "description": desc}
 
-    # --- DAILY BRIEFING (composite) ---
-    for pattern in [
-        r"^what(?:'?s| is) (?:on )?(?:today|my day)(?: like)?$",
-        r"^whats (?:on )?(?:today|my day)(?: like)?$",
-        r"^(?:daily|morning) (?:briefing|update|rundown)$",
-        r"^give me (?:a |my )?(?:daily |morning )?(?:briefing|update|rundown)$",
-        r"^what(?:'s| is) (?:coming up|on|left)(?: for me)? today$",
-        r"^what (?:do i|have i got) (?:have )?(?:on )?today$",
-    ]:
-        if re.match(pattern, t):
-            return Intent("daily_briefing", {})
 
-    # --- SMART HOME LIGHTS (ZOE-9) ---
-    if _SMART_HOME_RE.search(t):
-        # Determine action
-        if re.search(r'\bdim\b', t):
-            action = "dim"
-        elif re.search(r'\bbrighten\b', t):
-            action = "brighten"
-        elif re.search(r'\b(?:turn|switch|flip)\s+on\b|\blights?\s+on\b', t):
-            action = "turn_on"
-        else:
-            action = "turn_off"
-        # Attempt to extract a room name
-        _room_m = re.search(
-            r'\b(bedroom|kitchen|living\s+room|bathroom|lounge|office|'
-            r'dining\s+room|hallway|garage|backyard|garden|study)\b',
-            t, re.IGNORECASE,
-        )
-        room = _room_m.group(1).replace(" ", "_") if _room_m else None
-        return Intent("smart_home", {"action": action, "entity": "light", "room": room})
+def _slots_bought(m, turn) -> Optional[dict]:
+    slots = _money_slots(m.group(2))
+    if slots is None:
+        return None
+    return {**slots, "description": m.group(1).strip()}
 
-    # --- TIMER CREATE ---
-    for pattern in [
-        rf"^(?:set|start|create|add) (?:a |an )?(?:({_TIMER_MINUTES_PAT})[\s\-]minute[s]?|({_TIMER_MINUTES_PAT})[\s\-]min[s]?) timer(?: (?:called|for|named) (.+))?$",
-        rf"^(?:set|start|create) (?:a |an )?timer (?:for|of) ({_TIMER_MINUTES_PAT}) min(?:utes?)?(?:\s+(?:called|for|named) (.+))?$",
-        rf"^({_TIMER_MINUTES_PAT}) min(?:utes?)? timer(?: (?:for|called|named) (.+))?$",
-        r"^(?:set|start) (?:a |an )?timer$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            # POSITIONAL, not value-based: the label is always the final
-            # capture group, minutes always an earlier one — comparing VALUES
-            # dropped a label spelled like the duration ("... called five").
-            gs = list(m.groups()) if m.lastindex else []
-            label_raw = gs[-1] if gs else None
-            mins_raw = next((g for g in gs[:-1] if g and _timer_minutes_value(g) is not None), None)
-            mins = _timer_minutes_value(mins_raw) if mins_raw is not None else 5
-            label = label_raw if label_raw else "Timer"
-            return Intent("timer_create", {"minutes": mins, "label": label.title()})
 
-    # --- RECIPE SEARCH ---
-    m = re.match(
-        r"^(?:show|find|get|search|look up)(?: me)? (?:a )?recipe (?:for |to make )?(.+)$", t
-    )
-    if m:
-        return Intent("recipe_search", {"query": m.group(1).strip()})
+def _slots_transaction_summary(m, turn) -> dict:
+    qualifier = (m.group(1) if m.lastindex else "").strip()
+    return {"period": "month" if "month" in qualifier else "week"}
 
-    m = re.match(
-        r"^how (?:do i |can i )?(?:make|cook|bake) (.+)$", t
-    )
-    if m:
-        return Intent("recipe_search", {"query": m.group(1).strip()})
 
-    # === MUSIC SETUP (checked before list_add so "add music service" doesn't misroute) ===
-    _MUSIC_SETUP_EARLY_RE = re.compile(
-        r"^(?:set\s?up|configure|connect|add|setup)\s+"
-        r"(?:music(?:\s+assistant)?|spotify|youtube\s*music|apple\s*music"
-        r"|deezer|tidal|plex|streaming|music\s+services?|music\s+settings?)$"
-        r"|^music\s+settings?$"
-        r"|^set\s+up\s+music\s+assistant$"
-        r"|^connect\s+(?:my\s+)?(?:music|streaming)$",
-        re.IGNORECASE,
-    )
-    if _MUSIC_SETUP_EARLY_RE.match(t):
-        return Intent("music_setup", {})
+def _slots_smart_home(m, turn) -> dict:
+    t = turn.t
+    # Determine action
+    if re.search(r'\bdim\b', t):
+        action = "dim"
+    elif re.search(r'\bbrighten\b', t):
+        action = "brighten"
+    elif re.search(r'\b(?:turn|switch|flip)\s+on\b|\blights?\s+on\b', t):
+        action = "turn_on"
+    else:
+        action = "turn_off"
+    # Attempt to extract a room name
+    _room_m = _SMART_HOME_ROOM_RE.search(t)
+    room = _room_m.group(1).replace(" ", "_") if _room_m else None
+    return {"action": action, "entity": "light", "room": room}
 
-    # === LIST PATTERNS (checked after domain-specific) ===
 
-    # --- LIST ADD (with explicit list name) ---
-    for pattern in [
-        r"^add (.+?) to (?:the |my )?(.+?) ?list$",
-        r"^put (.+?) on (?:the |my )?(.+?) ?list$",
-        r"^add (.+?) to (?:the |my )?(shopping|grocery|groceries|todo|to do|to-do|personal|work|bucket)$",
-        r"^(?:(?:can|could) you |please )?(?:add|put) (.+?) (?:to|on) (?:the |my )?(.+?) ?list$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            item, lst = _sanitize_list_item(m.group(1)), m.group(2).strip()
-            list_type = _normalize_list(lst)
-            return Intent("list_add", {"item": item, "list_type": list_type})
+def _slots_timer(m, turn) -> dict:
+    # POSITIONAL, not value-based: the label is always the final
+    # capture group, minutes always an earlier one — comparing VALUES
+    # dropped a label spelled like the duration ("... called five").
+    gs = list(m.groups()) if m.lastindex else []
+    label_raw = gs[-1] if gs else None
+    mins_raw = next((g for g in gs[:-1] if g and _timer_minutes_value(g) is not None), None)
+    mins = _timer_minutes_value(mins_raw) if mins_raw is not None else 5
+    label = label_raw if label_raw else "Timer"
+    return {"minutes": mins, "label": label.title()}
 
-    # --- LIST ADD (STT-garbled leading "add") ---
-    # Moonshine renders a leading "Add" as near-homophones: "Add council to my
-    # work list" arrives as "I'd go to council to my work list" (said-vs-did
-    # bug: the add regexes miss and the semantic router drifts to calendar).
-    # If the utterance ENDS with "to my <known> list", treat it as an add and
-    # strip the garbled lead-in. Bare navigation ("go to my work list") leaves
-    # no item text, so it still falls through to the LIST SHOW/OPEN patterns.
-    m = re.match(
-        r"^(?:i'?d|id|and|at|it|hey|a)?\s*(?:go to |goto )?(.+?) "
-        r"to (?:the |my )?(shopping|grocery|groceries|todo|to do|to-do|personal|work|bucket|tasks?)"
-        r" list[.!?]?$",
-        t,
-    )
-    if m:
-        item = _sanitize_list_item(m.group(1))
-        if item and item.lower() not in {"go", "me", "take me", "us", "take us"}:
-            lst = m.group(2).strip()
-            return Intent(
-                "list_add",
-                {"item": item, "list_type": _normalize_list("tasks" if lst == "task" else lst)},
-            )
 
-    # --- LIST ADD (implicit, no list name) ---
+def _slots_list_add_explicit(m, turn) -> dict:
+    item, lst = _sanitize_list_item(m.group(1)), m.group(2).strip()
+    return {"item": item, "list_type": _normalize_list(lst)}
+
+
+def _slots_list_add_garbled(m, turn) -> Optional[dict]:
+    item = _sanitize_list_item(m.group(1))
+    if not item or item.lower() in {"go", "me", "take me", "us", "take us"}:
+        return None
+    lst = m.group(2).strip()
+    return {"item": item, "list_type": _normalize_list("tasks" if lst == "task" else lst)}
+
+
+def _slots_list_add_implicit(m, turn) -> Optional[dict]:
     # Defer to the brain when a competing-capability cue is present without an
     # explicit shopping/grocery-list target: "add a journal entry: …", "add
     # Marcus to my contacts", "add a note …" must route to their own domains
     # via the brain, not get swallowed as shopping-list items. Explicit list
     # phrasings ("… to my shopping list") are handled above and unaffected.
-    if not _has_competing_list_cue(t):
-        for pattern in [
-            r"^add (.+)$",
-            r"^put (.+)$",
-            r"^(?:(?:can|could) you |please )?add (.+)$",
-            r"^(?:(?:can|could) you |please )?put (.+)$",
-        ]:
-            m = re.match(pattern, t)
-            if m:
-                item = _sanitize_list_item(m.group(1))
-                list_type = _infer_list(item)
-                return Intent("list_add", {"item": item, "list_type": list_type})
+    if _has_competing_list_cue(turn.t):
+        return None
+    item = _sanitize_list_item(m.group(1))
+    return {"item": item, "list_type": _infer_list(item)}
 
-    # --- LIST ADD (natural language shopping) ---
-    m = re.match(
-        r"^(?:i need to buy|we need|we'?re out of|don'?t forget|buy|get) (.+)$", t
-    )
-    if m:
-        item = _sanitize_list_item(m.group(1))
-        return Intent("list_add", {"item": item, "list_type": "shopping"})
 
-    # --- LIST SHOW ---
-    for pattern in [
-        r"^(?:show|read|check) (?:me )?(?:the |my )?(.+?) ?list$",
-        r"^what(?:'?s| is) on (?:the |my )?(.+?) ?list$",
-        r"^what do i need to (?:buy|get)$",
-        r"^what'?s on my list$",
-        r"^show my list$",
-        r"^(?:open|show|bring up|go to|take me to) (?:the |my )?(?:shopping |grocery |groceries )?list(?: page| screen| view)?$",
-        r"^(?:open|show|bring up|go to|take me to) lists?$",
-        r"^(?:open|show|bring up|go to|take me to) (?:the |my )?(?:shopping|grocery|groceries)$",
-        r"^show me list$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            lst = m.group(1).strip() if m.lastindex else "shopping"
-            if lst in ("my list", "the list", "list", "my"):
-                lst = "shopping"
-            list_type = _normalize_list(lst)
-            return Intent("list_show", {"list_type": list_type})
+def _slots_list_add_shopping(m, turn) -> dict:
+    return {"item": _sanitize_list_item(m.group(1)), "list_type": "shopping"}
 
-    # --- LIST REMOVE ---
-    for pattern in [
-        r"^(?:remove|delete|take off|cross off) (.+?) from (?:the |my )?(.+?) ?list$",
-        r"^(?:remove|delete|take off|cross off) (.+?) from (?:the |my )?(.+)$",
-        r"^(?:we got|got|we have) (.+)$",
-    ]:
-        m = re.match(pattern, t)
-        if m:
-            item = m.group(1).strip()
-            lst = m.group(2).strip() if m.lastindex >= 2 else "shopping"
-            return Intent("list_remove", {"item": item, "list_type": _normalize_list(lst)})
 
-    # === MUSIC / MEDIA CONTROLS ===
-    _MUSIC_PLAY_RE = re.compile(
-        r"^(?:play|put on|play me|play some|start playing)\s+(.+)$", re.IGNORECASE
-    )
-    _MUSIC_CMD_RE = re.compile(
-        r"^(?P<cmd>pause|stop|resume|unpause|skip(?:\s+(?:this|the)\s+(?:song|track))?|next(?: song| track)?|previous(?: song| track)?"
-        r"|next track|prev track|previous track|what(?:'s| is)(?: currently)? playing"
-        r"|what song is this|volume up|volume down|louder|quieter|mute|unmute|shuffle|repeat)(?: the music| music)?\.?$",
-        re.IGNORECASE,
-    )
-    _VOLUME_SET_RE = re.compile(r"^(?:set volume|volume) (?:to |at )?(\d{1,3})(?:\s*%)?\.?$", re.IGNORECASE)
-    # Favourite the current track. Verbs: like / love / favourite(+US spelling) /
-    # thumbs up / heart; object: this / this song|track|tune|one / it. "I like
-    # this", "favourite this song", "thumbs up this". Deliberately NOT "add …":
-    # "add this to my favourites" collides with the shopping-list `list_add`
-    # intent (which matches earlier), and "favourite this" already covers it.
-    _MUSIC_FAVORITE_RE = re.compile(
-        r"^(?:hey zoe,?\s*)?(?:i\s+)?(?:really\s+)?"
-        r"(?:like|love|favou?rite|thumbs?\s*up|heart)\s+"
-        r"(?:this(?:\s+(?:song|track|tune|one))?|it)\.?$",
-        re.IGNORECASE,
-    )
+def _slots_list_show(m, turn) -> dict:
+    lst = m.group(1).strip() if m.lastindex else "shopping"
+    if lst in ("my list", "the list", "list", "my"):
+        lst = "shopping"
+    return {"list_type": _normalize_list(lst)}
 
-    m = _MUSIC_PLAY_RE.match(t)
-    if m:
-        return Intent("music_play", {"query": m.group(1).strip()})
 
-    m = _VOLUME_SET_RE.match(t)
-    if m:
-        return Intent("music_volume", {"level": int(m.group(1))})
+def _slots_list_remove(m, turn) -> dict:
+    item = m.group(1).strip()
+    lst = m.group(2).strip() if m.lastindex >= 2 else "shopping"
+    return {"item": item, "list_type": _normalize_list(lst)}
 
-    m = _MUSIC_CMD_RE.match(t)
-    if m:
-        cmd = m.group("cmd").lower().strip()
-        cmd = cmd.replace(" ", "_")
-        if cmd in {"next_song", "next_track"}: cmd = "next"
-        if cmd in {"previous_song", "previous_track", "prev_track"}: cmd = "previous"
-        if cmd in {"unpause"}: cmd = "resume"
-        if cmd in {"louder"}: cmd = "volume_up"
-        if cmd in {"quieter"}: cmd = "volume_down"
-        if "playing" in cmd or "song_is_this" in cmd: cmd = "now_playing"
-        return Intent("music_control", {"command": cmd})
 
-    # "Hey Zoe, I like this song" -> favourite the current track. Kept OUT of the
-    # command regex because it takes no HA service call — it favourites the
-    # playing item's uri via MA. Matches the natural ways someone says it; the
-    # object ("this"/"this song"/"it") is required so a bare "I like jazz" (a
-    # taste statement, not a command) does not trip it.
-    if _MUSIC_FAVORITE_RE.match(t):
-        return Intent("music_favorite", {})
+def _slots_music_play(m, turn) -> dict:
+    return {"query": m.group(1).strip()}
+
+
+def _slots_music_volume(m, turn) -> dict:
+    return {"level": int(m.group(1))}
+
+
+def _slots_music_control(m, turn) -> dict:
+    cmd = m.group("cmd").lower().strip()
+    cmd = cmd.replace(" ", "_")
+    if cmd in {"next_song", "next_track"}: cmd = "next"
+    if cmd in {"previous_song", "previous_track", "prev_track"}: cmd = "previous"
+    if cmd in {"unpause"}: cmd = "resume"
+    if cmd in {"louder"}: cmd = "volume_up"
+    if cmd in {"quieter"}: cmd = "volume_down"
+    if "playing" in cmd or "song_is_this" in cmd: cmd = "now_playing"
+    return {"command": cmd}
+
+
+def _slots_set_volume(m, turn) -> dict:
+    # Use capture groups from the matching alternative — patterns that contain \d{1,3}
+    # set group 1-4; patterns without a number leave all groups None.
+    _captured = next((g for g in m.groups() if g is not None), None)
+    _level = int(_captured) if _captured else None
+    _is_up = bool(re.search(r'\b(up|louder|raise|increase|higher|more\s+loudly)\b', turn.t, re.IGNORECASE))
+    direction = "set" if _level is not None else ("up" if _is_up else "down")
+    return {"direction": direction, "level": _level}
+
+
+def _resolve_context_coreference(_m, turn) -> Optional["Intent"]:
+    # Coreference via ConversationContext (OVOS Adapt pattern). The intent name
+    # comes from the context, so this returns a built Intent, not slots.
+    context = turn.context
+    if context is None or not context.is_fresh():
+        return None
+    _ctx_name, _ctx_slots = context.resolve_coreference(turn.t)
+    if not _ctx_name:
+        return None
+    return Intent(_ctx_name, _ctx_slots or {}, confidence=0.85)
+
+
+def _volume_gap_intent(m, turn) -> "Intent":
+    t = turn.t
+    _num = re.search(r'\b(10|[0-9])\b', t)
+    _wm = re.search(r'\b(' + '|'.join(_VOLUME_WORDS) + r')\b', t, re.IGNORECASE)
+    _lvl = int(_num.group(1)) * 10 if _num else (_VOLUME_WORDS.get(_wm.group(1).lower(), 5) * 10 if _wm else None)
+    if _lvl is not None:
+        return Intent("music_volume", {"level": _lvl})
+    _up = re.search(r'\b(up|raise|louder|increase|boost|higher)\b', t, re.IGNORECASE)
+    return Intent("music_control", {"command": "volume_up" if _up else "volume_down"})
 
 
+def _slots_ticket_move(m, turn) -> dict:
+    return {"reference": m.group("reference")}
+
+
+def _slots_ticket_split(m, turn) -> dict:
+    return {"reference": m.group("reference"), "title": m.group("title").strip()}
+
+
+def _slots_engineering_task(m, turn) -> Optional[dict]:
+    task_text = (m.group("task") or m.group("task2") or "").strip()
+    return {"task": task_text} if task_text else None
+
+
+def _fixed(**slots) -> Callable:
+    """Extractor for rules whose slots don't depend on the match."""
+    return lambda _m, _turn: dict(slots)
+
+
+def _rules(intent: str, patterns, extract=None, **kw) -> list[IntentRule]:
+    """Expand a family of alternative patterns into consecutive rules."""
+    return [IntentRule(intent, re.compile(p), extract, **kw) for p in patterns]
+
+
+# ── The compiled intent table ───────────────────────────────────────────────
+# ORDER IS PRIORITY: the first rule that matches and whose extractor accepts
+# wins, exactly like the if/return ladder this replaced. Pattern priority:
+# domain-specific (calendar, reminder, contact, note) BEFORE generic list
+# patterns to avoid collisions like "what's on my calendar" → list_show.
+_INTENT_RULES: tuple[IntentRule, ...] = (
+    # Bare name-as-question ("zoe?") — normalization strips the wake word to '', so
+    # catch the presence check from the raw text before the body runs.
+    IntentRule("status_check", _BARE_NAME_QUERY_RE, source=SOURCE_RAW_STRIPPED),
+    # Full Home Assistant / automation setup → OpenClaw (execute_intent returns None; chat expands message).
+    # Every phrasing _is_ha_full_setup_message accepts names "home …" or "hass".
+    IntentRule("ha_full_setup", None, _slots_ha_full_setup, triggers=frozenset({"home", "hass"})),
+    # Touch panel provisioning / status — chat.py renders AG-UI cards
+    IntentRule("panel_confirm_code", _PANEL_ENTER_CODE_RE, _slots_panel_code, mode="search"),
+    IntentRule("panel_setup", _PANEL_SETUP_RE, mode="search"),
+    IntentRule("panel_status", _PANEL_STATUS_RE, mode="search"),
+    IntentRule("panel_list", _PANEL_LIST_RE, mode="search"),
+    # "forget that" — retract the most recent memory write for the caller.
+    # Matched very early so it never collides with other verbs.
+    IntentRule("memory_forget_last", _FORGET_LAST_RE),
+    # "forget everything about X" -- entity-scoped forget (QA review F14).
+    IntentRule("memory_forget_entity", _FORGET_ENTITY_RE, _slots_forget_entity),
+    # Portrait intents — how well Zoe knows the user, and rebuilding understanding.
+    IntentRule("portrait_reveal", _PORTRAIT_REVEAL_RE, mode="search"),
+    IntentRule("portrait_refresh", _PORTRAIT_REFRESH_RE, mode="search"),
+    # Connect ChatGPT / OpenAI to OpenClaw — admin-gated, handled via AG-UI OAuth flow.
+    # Delegation intent — no structured slots to extract; empty dict bypasses
+    # the nlu_extractor path in detect_and_extract_intent.
+    IntentRule("connect_chatgpt", _CONNECT_CHATGPT_RE),
+    # Zoe self-extension — always routes to OpenClaw (admin-gated in the skill).
+    # Checked BEFORE list/reminder/etc so "add X widget" doesn't become list_add.
+    # Empty slots: these are delegation intents with no structured fields to
+    # extract, so they must NOT carry {"raw": text} which would send them through
+    # nlu_extractor and cause detect_and_extract_intent to return None on failure.
+    IntentRule("build_widget", _BUILD_WIDGET_RE),
+    IntentRule("build_widget", _WANT_WIDGET_RE),
+    IntentRule("build_page", _BUILD_PAGE_RE),
+    IntentRule("build_page", _WANT_PAGE_RE),
+    IntentRule("extend_capability", _EXTEND_CAPABILITY_RE),
+    IntentRule("self_improve", _SELF_IMPROVE_RE, mode="search"),
+    # "Let's talk" → navigate the browser panel to voice.html?conv=1 (conversation mode).
+    # Placed before greetings so "let's chat" doesn't become a greeting.
+    IntentRule("lets_talk", _LETS_TALK_RE, mode="search"),
+    # === GREETINGS — morning/evening check-ins ===
+    IntentRule("good_morning", _MORNING_RE),
+    IntentRule("good_morning", _MORNING_EXACT_RE, mode="fullmatch"),
+    IntentRule("good_evening", _EVENING_RE),
+    IntentRule("good_evening", _EVENING_EXACT_RE, mode="fullmatch"),
+    # === GENERAL GREETING (ZOE-42, ZOE-15) — hello/hi/hey/good afternoon/etc. ===
+    # good_morning/good_evening already handled above (they trigger the daily briefing).
+    IntentRule("greeting", _GREETING_RE, _slots_greeting),
+    IntentRule("greeting", _PING_RE),
+    # Social acknowledgements & presence checks — instant, no brain.
+    IntentRule("acknowledgement", _THANKS_RE, _fixed(kind="thanks")),
+    IntentRule("acknowledgement", _ACK_RE, _fixed(kind="ack")),
+    IntentRule("status_check", _STATUS_CHECK_RE),
+    IntentRule("list_show", _WHAT_LISTS_RE),
+    IntentRule("people_search", _OPEN_CONTACTS_RE, _fixed(query="")),
+    IntentRule("memory_remember", _REMEMBER_THAT_RE, _slots_raw),
+    # === CLOCK / CALENDAR QUERIES — checked before domain patterns (no slots needed) ===
+    IntentRule("time_planning_clarification", _TIME_PLANNING_CLARIFICATION_RE, _fixed(kind="best_time_to_leave")),
+    IntentRule("time_planning_clarification", _TIME_MATH_CLARIFICATION_RE, _fixed(kind="time_math")),
+    # Modelled on HA's HassGetCurrentTime and HassGetCurrentDate — two separate intents
+    IntentRule("time_query", _TIME_QUERY_RE),
+    IntentRule("date_query", _DATE_QUERY_RE),
+    # --- CALCULATE (ZOE-10) — arithmetic fast-path, no LLM needed ---
+    # Percentage form: "what is 25% of 80"
+    IntentRule("calculate", _CALCULATE_PCT_RE, _slots_calculate_pct),
+    # Word-operator form: "what is 10 times 3" / "10 divided by 2"
+    IntentRule("calculate", _CALCULATE_WORDS_RE, _slots_calculate_words),
+    # Symbolic form: "2+2", "what is 100/4", "15 * 3 = ?"
+    IntentRule("calculate", _CALCULATE_RE, _slots_calculate),
+    # === DOMAIN-SPECIFIC PATTERNS FIRST (to avoid list collisions) ===
+    # --- CALENDAR CREATE (keyword classifier → LLM fills slots via detect_and_extract_intent) ---
+    IntentRule("calendar_create", _CAL_CREATE_VERB, _slots_calendar_create, mode="search"),
+    # --- CALENDAR SHOW ---
+    *_rules("calendar_show", _CALENDAR_SHOW_PATTERNS, _slots_qualifier),
+    # --- REMINDERS CREATE (keyword classifier → LLM fills slots via detect_and_extract_intent) ---
+    IntentRule("reminder_create", _REMINDER_CREATE_RE, _slots_raw),
+    IntentRule("reminder_create", _REMINDER_CREATE_VERB_RE, _slots_raw),
+    # --- REMINDERS LIST ---
+    *_rules("reminder_list", _REMINDER_LIST_PATTERNS),
+    # --- CONTACTS INTRODUCE ---
+    IntentRule("people_introduce", _PEOPLE_INTRODUCE_RE, _slots_people_introduce, mode="search"),
+    # Note: third-party person-to-person relationships (e.g. "Sarah is Tom's
+    # sister") are captured from natural language by person_extractor on every
+    # turn (→ _write_relationship); there is no dedicated relate intent.
+    # --- CONTACTS CREATE ---
+    IntentRule("people_create", _PEOPLE_CREATE_RE, _slots_people_create),
+    # --- CONTACTS SEARCH ---
+    IntentRule("people_search", _PEOPLE_SEARCH_RE, _slots_query),
+    IntentRule("people_search", _WHO_IS_RE, _slots_query),
+    # --- NOTES CREATE ---
+    IntentRule("note_create", _NOTE_CREATE_RE, _slots_note_body),
+    IntentRule("note_create", _NOTE_ADD_RE, _slots_note_body),
+    IntentRule("note_create", _NOTE_JOT_RE, _slots_note_body),
+    # --- NOTES SEARCH ---
+    IntentRule("note_search", _NOTE_SEARCH_RE, _slots_query),
+    # --- BROAD PEOPLE SEARCH (after notes, to avoid collision) ---
+    IntentRule("people_search", _BROAD_PEOPLE_SEARCH_RE, _slots_broad_people_search),
+    # --- WEATHER ---
+    *_rules("weather", _WEATHER_PATTERNS, _slots_weather),
+    # --- JOURNAL ---
+    IntentRule("journal_create", _JOURNAL_CREATE_RE, _slots_journal_create),
+    IntentRule("journal_create", _JOURNAL_OPEN_RE, _fixed(content="")),
+    *_rules("journal_streak", _JOURNAL_STREAK_PATTERNS),
+    IntentRule("journal_prompt", _JOURNAL_PROMPT_RE),
+    # --- TRANSACTIONS ---
+    IntentRule("transaction_create", _SPENT_RE, _slots_spent),
+    IntentRule("transaction_create", _BOUGHT_RE, _slots_bought),
+    *_rules("transaction_summary", _TRANSACTION_SUMMARY_PATTERNS, _slots_transaction_summary),
+    # --- DAILY BRIEFING (composite) ---
+    *_rules("daily_briefing", _DAILY_BRIEFING_PATTERNS),
+    # --- SMART HOME LIGHTS (ZOE-9) ---
+    IntentRule("smart_home", _SMART_HOME_RE, _slots_smart_home, mode="search"),
+    # --- TIMER CREATE ---
+    *_rules("timer_create", _TIMER_PATTERNS, _slots_timer),
+    # --- RECIPE SEARCH ---
+    IntentRule("recipe_search", _RECIPE_SEARCH_RE, _slots_query),
+    IntentRule("recipe_search", _RECIPE_HOW_RE, _slots_query),
+    # === MUSIC SETUP (checked before list_add so "add music service" doesn't misroute) ===
+    IntentRule("music_setup", _MUSIC_SETUP_EARLY_RE),
+    # === LIST PATTERNS (checked after domain-specific) ===
+    # --- LIST ADD (with explicit list name) ---
+    *_rules("list_add", _LIST_ADD_EXPLICIT_PATTERNS, _slots_list_add_explicit),
+    # --- LIST ADD (STT-garbled leading "add") ---
+    IntentRule("list_add", _LIST_ADD_GARBLED_RE, _slots_list_add_garbled),
+    # --- LIST ADD (implicit, no list name) ---
+    *_rules("list_add", _LIST_ADD_IMPLICIT_PATTERNS, _slots_list_add_implicit),
+    # --- LIST ADD (natural language shopping) ---
+    IntentRule("list_add", _LIST_ADD_SHOPPING_RE, _slots_list_add_shopping),
+    # --- LIST SHOW ---
+    *_rules("list_show", _LIST_SHOW_PATTERNS, _slots_list_show),
+    # --- LIST REMOVE ---
+    *_rules("list_remove", _LIST_REMOVE_PATTERNS, _slots_list_remove),
+    # === MUSIC / MEDIA CONTROLS ===
+    IntentRule("music_play", _MUSIC_PLAY_RE, _slots_music_play),
+    IntentRule("music_volume", _VOLUME_SET_RE, _slots_music_volume),
+    IntentRule("music_control", _MUSIC_CMD_RE, _slots_music_control),
+    # "Hey Zoe, I like this song" -> favourite the current track. Kept OUT of the
+    # command regex because it takes no HA service call — it favourites the
+    # playing item's uri via MA. The object ("this"/"this song"/"it") is required
+    # so a bare "I like jazz" (a taste statement, not a command) does not trip it.
+    IntentRule("music_favorite", _MUSIC_FAVORITE_RE),
     # --- SET VOLUME / TTS voice volume (ZOE-13) ---
     # Checked before _AUTOGEN_UNKNOWN_GAP so "speak louder / be quieter / your volume up"
     # routes to the system-audio path instead of the music media-player path.
-    _voice_vol_m = _ZOE_VOICE_VOLUME_RE.search(t)
-    if _voice_vol_m:
-        # Use capture groups from the matching alternative — patterns that contain \d{1,3}
-        # set group 1-4; patterns without a number leave all groups None.
-        _captured = next((g for g in _voice_vol_m.groups() if g is not None), None)
-        _level = int(_captured) if _captured else None
-        _is_up = bool(re.search(r'\b(up|louder|raise|increase|higher|more\s+loudly)\b', t, re.IGNORECASE))
-        direction = "set" if _level is not None else ("up" if _is_up else "down")
-        return Intent("set_volume", {"direction": direction, "level": _level})
-
+    IntentRule("set_volume", _ZOE_VOICE_VOLUME_RE, _slots_set_volume, mode="search"),
     # Coreference before generic volume gap-fill — "turn it down a bit" / "a bit quieter"
     # after a set_volume command should stay set_volume, not fall through to music_control.
-    if context is not None and context.is_fresh():
-        _ctx_name, _ctx_slots = context.resolve_coreference(t)
-        if _ctx_name:
-            return Intent(_ctx_name, _ctx_slots or {}, confidence=0.85)
-
-    # Conversational volume phrases — covers polite/natural speech (zoe-self-improve 2026-05-11 refined)
-    _AUTOGEN_UNKNOWN_GAP = re.compile(
-        r'(?:can|could|would|will)\s+you\s+.*?(?:volume|louder|quieter)'
-        r'|(?:turn|put|make|bring|bump|crank)\s+(?:your|the|it|that)?\s*(?:volume\s*)?(?:up|down|louder|quieter)'
-        r'|(?:raise|increase|boost|lower|decrease|reduce)\s+(?:the|your)?\s*(?:volume|sound)'
-        r'|(?:a\s+bit|just\s+a?\s*(?:little|tad)|slightly)\s+(?:louder|quieter|softer)',
-        re.IGNORECASE,
-    )
-    if _AUTOGEN_UNKNOWN_GAP.search(t):
-        _wrd = dict(zero=0,one=1,two=2,three=3,four=4,five=5,six=6,seven=7,eight=8,nine=9,ten=10)
-        _num = re.search(r'\b(10|[0-9])\b', t)
-        _wm  = re.search(r'\b(' + '|'.join(_wrd) + r')\b', t, re.IGNORECASE)
-        _lvl = int(_num.group(1)) * 10 if _num else (_wrd.get(_wm.group(1).lower(), 5) * 10 if _wm else None)
-        if _lvl is not None:
-            return Intent("music_volume", {"level": _lvl})
-        _up  = re.search(r'\b(up|raise|louder|increase|boost|higher)\b', t, re.IGNORECASE)
-        return Intent("music_control", {"command": "volume_up" if _up else "volume_down"})
-
-    # ── A2A Federation ────────────────────────────────────────────────────────
-    _A2A_RE = re.compile(
-        r'\b(?:call|ask|delegate\s+to|send\s+to|route\s+to|use)\b.{0,20}\b(?:agent|hermes|openclaw)\b'
-        r'|which\s+agents?\s+(?:do\s+you|are|can)\b'
-        r'|(?:show|list|what\s+are)\s+(?:my|your|the)?\s*(?:agents?|federation|peers?)\b'
-        r'|(?:agent|federation)\s+(?:status|registry|health|card)\b'
-        r'|what\s+agents?\s+(?:do\s+you\s+know|have\s+you|are\s+available)\b'
-        r'|a2a\s+(?:status|health|check|federation)\b'
-        r'|(?:hermes|openclaw)\s+(?:status|online|running|connected|health)\b'
-        r'|are\s+(?:hermes|openclaw|peer\s+agents?)\s+(?:online|running|connected|available)\b'
-        r'|list\s+(?:connected|registered|known|peer)\s+agents?\b',
-        re.I,
-    )
-    if _A2A_RE.search(t):
-        return Intent("a2a_federation_status", {})
-
-    # ── Multica board visibility ───────────────────────────────────────────────
-    if re.search(r"\b(?:pause|stop)\s+(?:multica\s+|engineering\s+)?dispatch\b", t, re.I):
-        return Intent("engineering_dispatch_pause", {})
-    if re.search(r"\bresume\s+(?:multica\s+|engineering\s+)?dispatch\b", t, re.I):
-        return Intent("engineering_dispatch_resume", {})
-    _MOVE_TODO_RE = re.search(
-        r"\bmove\s+(?P<reference>ZOE-\d+|[0-9a-f-]{32,36})\s+to\s+todo\b",
-        text,
-        re.I,
-    )
-    if _MOVE_TODO_RE:
-        return Intent(
-            "engineering_ticket_move_todo",
-            {"reference": _MOVE_TODO_RE.group("reference")},
-        )
-    _SPLIT_TICKET_RE = re.search(
-        r"\bsplit\s+(?P<reference>ZOE-\d+|[0-9a-f-]{32,36})\s+into\s+(?P<title>.+)$",
-        text.strip(),
-        re.I,
-    )
-    if _SPLIT_TICKET_RE:
-        return Intent(
-            "engineering_ticket_split",
-            {
-                "reference": _SPLIT_TICKET_RE.group("reference"),
-                "title": _SPLIT_TICKET_RE.group("title").strip(),
-            },
-        )
-    if re.search(r"\b(?:show|list)\s+(?:the\s+)?multica\s+backlog\b", t, re.I):
-        return Intent("engineering_ticket_list", {"status": "backlog"})
-    _BARE_BLOCKED_RE = re.fullmatch(
-        r"\s*(?:what(?:'s| is)|show|list)\s+(?:currently\s+)?blocked\s*[?.!]?\s*",
-        text,
-        re.I,
-    )
-    _QUALIFIED_BLOCKED_RE = re.search(
-        r"\b(?:show|list|what(?:'s| is))\b.*\b(?:multica|engineering|tickets?)\b.*\bblocked\b"
-        r"|\b(?:show|list|what(?:'s| is))\b.*\bblocked\b.*\b(?:multica|engineering|tickets?)\b",
-        text,
-        re.I,
-    )
-    if _BARE_BLOCKED_RE or _QUALIFIED_BLOCKED_RE:
-        return Intent("engineering_ticket_list", {"status": "blocked"})
-
-    _BOARD_RE = re.compile(
-        r"what'?s?\s+on\s+(?:the\s+)?(?:multica\s+)?board\b"
-        r"|show\s+(?:the\s+)?(?:multica\s+)?(?:active\s+)?(?:board|tasks?)\b"
-        r"|open\s+(?:the\s+)?(?:multica\s+)?(?:task\s+)?board\b"
-        r"|show\s+(?:me\s+)?multica\b"
-        r"|what\s+is\s+(?:openclaw|hermes|the\s+agent)\s+(?:doing|working\s+on|running)\b"
-        r"|any\s+(?:active\s+)?(?:agent\s+)?tasks?\s+(?:running|pending|in\s+progress)\b"
-        r"|board\s+(?:status|view|items?)\b",
-        re.I,
-    )
-    if _BOARD_RE.search(t):
-        return Intent("board_status", {})
-
-    _AGENT_ACTIVITY_RE = re.compile(
-        r"show\s+(?:me\s+)?(?:my\s+)?(?:agent\s+)?activity\b"
-        r"|what(?:'s| is)\s+running\s+in\s+the\s+background\b"
-        r"|(?:any\s+)?background\s+tasks?\s+(?:running|active|pending)\b"
-        r"|list\s+(?:my\s+)?(?:agent\s+)?(?:background\s+)?tasks?\b",
-        re.I,
-    )
-    if _AGENT_ACTIVITY_RE.search(t):
-        return Intent("agent_tasks_status", {})
-
-    _eng_match = _ENGINEERING_TASK_RE.search(text.strip())
-    if _eng_match:
-        task_text = (_eng_match.group("task") or _eng_match.group("task2") or "").strip()
-        if task_text:
-            return Intent("engineering_task_create", {"task": task_text})
-
-    if _ENGINEERING_STATUS_RE.search(t):
-        return Intent("engineering_task_status", {})
-
-    # ── Evolution proposals ────────────────────────────────────────────────────
-    _EVOLVE_REVIEW_RE = re.compile(
-        r'what\s+(?:needs?|could)\s+(?:be\s+)?improv(?:ing|ed|ement)\b'
-        r'|show\s+(?:improvement\s+)?proposals?\b'
-        r'|review\s+proposals?\b'
-        r'|what\s+(?:are|is)\s+(?:you\s+)?struggling\s+with\b'
-        r'|what\s+(?:have\s+you\s+)?noticed\s+(?:that\s+needs|needs?)\s+fix\b'
-        r'|evolution\s+(?:proposals?|review|status)\b'
-        r'|(?:what|show)\s+(?:improvements?|ideas?)\s+(?:has\s+)?(?:zoe|you)\s+(?:proposed|noticed|suggested)\b'
-        r'|pending\s+proposals?\b'
-        r"|zoe'?s?\s+(?:self.?improv\w+|improvement\s+ideas?)\b"
-        r"|what\s+(?:does\s+)?(?:zoe|you)\s+want\s+to\s+change\b",
-        re.I,
-    )
-    if _EVOLVE_REVIEW_RE.search(t):
-        return Intent("evolution_proposals_review", {})
-
-    _BOARD_HEAL_RE = re.compile(
-        r"\b(?:fix|heal|triage|clean\s*up|review|sort\s*out)\b"
-        r".*\b(?:board|issues?|multica|problems?|proposals?)\b"
-        r"|\b(?:board|multica)\b.*\b(?:fix|heal|triage|clean\s*up|review|sort\s*out)\b"
-        r"|self.?heal\b|board\s+review\b|check\s+the\s+board\b",
-        re.I,
-    )
-    if _BOARD_HEAL_RE.search(t):
-        return Intent("board_heal", {})
-
-    # ── User issue / complaint reports ────────────────────────────────────────
-    _USER_ISSUE_RE = re.compile(
-        r'\byou\s+got\s+that\s+wrong\b'
-        r'|\byou\s+keep\s+(?:getting|messing)\b'
-        r'|\bthat\s+(?:didn\'?t|did\s+not)\s+work\b'
-        r'|\bthat\'?s?\s+not\s+working\b'
-        r'|\bthere\'?s?\s+(?:an?\s+)?(?:problem|issue|bug)\s+with\b'
-        r'|\bfix\s+(?:your|the)\b'
-        r'|\b\w+\s+(?:is\s+)?broken\b'
-        r'|\b\w+\s+doesn\'?t\s+work\b'
-        r'|\byou\s+should\s+know\s+that\b'
-        r'|\bi\s+keep\s+having\s+(?:issues?|problems?)\b'
-        r'|\byou\s+need\s+to\s+fix\b'
-        r'|\bthat\s+was\s+(?:wrong|incorrect)\b'
-        r'|\byou\s+(?:messed|failed)\b',
-        re.I,
-    )
-    if _USER_ISSUE_RE.search(t):
-        return Intent("user_issue_report", {"message": text})
-
+    IntentRule("context_coreference", None, _resolve_context_coreference),
+    IntentRule("music_control", _AUTOGEN_UNKNOWN_GAP, _volume_gap_intent, mode="search"),
+    # ── A2A Federation ──
+    IntentRule("a2a_federation_status", _A2A_RE, mode="search"),
+    # ── Multica board visibility ──
+    IntentRule("engineering_dispatch_pause", _DISPATCH_PAUSE_RE, mode="search"),
+    IntentRule("engineering_dispatch_resume", _DISPATCH_RESUME_RE, mode="search"),
+    IntentRule("engineering_ticket_move_todo", _MOVE_TODO_RE, _slots_ticket_move,
+               mode="search", source=SOURCE_RAW),
+    IntentRule("engineering_ticket_split", _SPLIT_TICKET_RE, _slots_ticket_split,
+               mode="search", source=SOURCE_RAW_STRIPPED),
+    IntentRule("engineering_ticket_list", _MULTICA_BACKLOG_RE, _fixed(status="backlog"), mode="search"),
+    IntentRule("engineering_ticket_list", _BARE_BLOCKED_RE, _fixed(status="blocked"),
+               mode="fullmatch", source=SOURCE_RAW),
+    IntentRule("engineering_ticket_list", _QUALIFIED_BLOCKED_RE, _fixed(status="blocked"),
+               mode="search", source=SOURCE_RAW),
+    IntentRule("board_status", _BOARD_RE, mode="search"),
+    IntentRule("agent_tasks_status", _AGENT_ACTIVITY_RE, mode="search"),
+    IntentRule("engineering_task_create", _ENGINEERING_TASK_RE, _slots_engineering_task,
+               mode="search", source=SOURCE_RAW_STRIPPED),
+    IntentRule("engineering_task_status", _ENGINEERING_STATUS_RE, mode="search"),
+    # ── Evolution proposals ──
+    IntentRule("evolution_proposals_review", _EVOLVE_REVIEW_RE, mode="search"),
+    IntentRule("board_heal", _BOARD_HEAL_RE, mode="search"),
+    # ── User issue / complaint reports ──
+    IntentRule("user_issue_report", _USER_ISSUE_RE, lambda _m, turn: {"message": turn.text}, mode="search"),
     # Open-domain Q&A / creative — route to agent (closes intent-gap backlog without brittle regex)
-    if _AGENT_CHAT_RE.search(t):
-        return Intent("extend_capability", {"raw": text})
+    IntentRule("extend_capability", _AGENT_CHAT_RE, _slots_raw, mode="search"),
+    # Context-based coreference resolution (OVOS Adapt pattern) — last resort.
+    IntentRule("context_coreference", None, _resolve_context_coreference),
+)
+
+_INTENT_MATCHER = CompiledIntentMatcher(_INTENT_RULES, Intent)
+
 
-    # Context-based coreference resolution (OVOS Adapt pattern)
-    if context is not None and context.is_fresh():
-        _ctx_name, _ctx_slots = context.resolve_coreference(t)
-        if _ctx_name:
-            from conversation_context import ConversationContext as _CC  # noqa: F401 (type-check only)
-            return Intent(_ctx_name, _ctx_slots or {}, confidence=0.85)
+def intent_matcher_stats(top: Optional[int] = None) -> dict:
+    """Per-rule evaluation/hit/time counters for the compiled intent table."""
+    return _INTENT_MATCHER.stats(top=top)
+
+
+def detect_intent(
+    text: str,
+    log_miss: bool = True,
+    context: "Optional[ConversationContext]" = None,
+    user_id: str = "unknown",
+) -> Optional[Intent]:
+    t = _normalize_chat_intent_text(text)
+    intent = _INTENT_MATCHER.match(MatchTurn(t=t, text=text, context=context, user_id=user_id))
+    if intent is not None:
+        return intent
 
     if log_miss:
         logger.info("intent_miss: %s", text)
@@ -2143,12 +2164,37 @@ def _sanitize_list_item(raw: str) -> str:
 async def _run_mcporter(cmd: str) -> Optional[str]:
     """Run a single mcporter-safe command, return raw stdout or None on failure.
 
+    ``zoe-data.<tool>`` calls go to the warm mcp_server worker
+    (mcporter_worker) instead of paying a Node + Python cold start per intent.
+    The spawn path below stays the fallback whenever the worker cannot take the
+    call, and the only path under ``ZOE_MCPORTER_MODE=spawn``.
+    """
+    env = os.environ.copy()
+    env["PATH"] = f"{NODE_BIN}:{env.get('PATH', '')}"
+    import mcporter_worker
+
+    parsed = mcporter_worker.parse_mcporter_command(cmd) if mcporter_worker.worker_mode_enabled() else None
+    if parsed is not None:
+        tool, args = parsed
+        try:
+            return await mcporter_worker.get_worker(env).call_tool(tool, args)
+        except mcporter_worker.WorkerUnavailable as exc:
+            logger.warning("mcporter worker unavailable (%s); spawning mcporter-safe", exc)
+        except mcporter_worker.WorkerCallFailed as exc:
+            # The tool may already have run; replaying a write through the spawn
+            # path could apply it twice, so fail this turn like a spawn failure.
+            logger.warning("mcporter worker call %s failed: %s", tool, exc)
+            return None
+    return await _spawn_mcporter(cmd, env)
+
+
+async def _spawn_mcporter(cmd: str, env: dict) -> Optional[str]:
+    """Spawn mcporter-safe for one command (the pre-worker path).
+
     Spawns via async_subprocess.run_to_completion so the fork happens OFF the
     event-loop thread — asyncio.create_subprocess_exec forks on the loop and
     can wedge the whole API (the 2026-06-29 outage class, #947).
     """
-    env = os.environ.copy()
-    env["PATH"] = f"{NODE_BIN}:{env.get('PATH', '')}"
     try:
         from async_subprocess import QueueTimeout, run_to_completion
 
@@ -3152,8 +3198,8 @@ async def execute_intent(intent: Intent, user_id: str = "guest") -> Optional[str
     # ── A2A Federation Status ──────────────────────────────────────────────────
     if intent.name == "a2a_federation_status":
         try:
-            import httpx as _httpx
-            async with _httpx.AsyncClient(timeout=5) as _cli:
+            import http_clients
+            async with http_clients.session("loopback", timeout=5) as _cli:
                 reg_resp, squad_resp, runtime_resp = await asyncio.gather(
                     _cli.get("http://localhost:8000/api/agent/registry"),
                     _cli.get("http://localhost:8000/api/agent/squad"),
@@ -3231,8 +3277,8 @@ async def execute_intent(intent: Intent, user_id: str = "guest") -> Optional[str
 
     if intent.name == "board_status":
         try:
-            import httpx as _httpx
-            async with _httpx.AsyncClient(timeout=5) as _cli:
+            import http_clients
+            async with http_clients.session("loopback", timeout=5) as _cli:
                 resp = await _cli.get("http://localhost:8000/api/agent/board")
                 board = resp.json()
 
@@ -3443,8 +3489,8 @@ async def execute_intent(intent: Intent, user_id: str = "guest") -> Optional[str
     # ── Evolution Proposals Review ─────────────────────────────────────────────
     if intent.name == "evolution_proposals_review":
         try:
-            import httpx as _httpx
-            async with _httpx.AsyncClient(timeout=5) as _cli:
+            import http_clients
+            async with http_clients.session("loopback", timeout=5) as _cli:
                 resp = await _cli.get(
                     "http://localhost:8000/api/agent/evolution/proposals",
                     params={"status": "pending", "limit": "5"},
@@ -4026,8 +4072,8 @@ async def _execute_music_setup(user_id: str) -> str:
     providers_str = "No streaming services connected yet."
 
     try:
-        import httpx as _httpx
-        async with _httpx.AsyncClient(timeout=4.0) as c:
+        import http_clients
+        async with http_clients.session("music_assistant", timeout=4.0) as c:
             r = await c.get(f"{ma_url}/info", headers=hdrs)
             if r.status_code == 200:
                 info = r.json()
@@ -4036,8 +4082,8 @@ async def _execute_music_setup(user_id: str) -> str:
         pass
 
     try:
-        import httpx as _httpx
-        async with _httpx.AsyncClient(timeout=5.0) as c:
+        import http_clients
+        async with http_clients.session("music_assistant", timeout=5.0) as c:
             r = await c.post(f"{ma_url}/api", json={"command": "music/providers"}, headers=hdrs)
             if r.status_code == 200:
                 data = r.json()
@@ -4135,7 +4181,8 @@ async def _post_music_ha_control(client, ha_url: str, payload: dict) -> Optional
 async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
     """Route music intents to HA media_player via zoe-data HA bridge."""
     try:
-        import os as _os, httpx as _httpx
+        import os as _os
+        import http_clients
         ha_url = _os.environ.get("ZOE_HA_BRIDGE_URL", "http://127.0.0.1:8007")
         slots = intent.slots or {}
 
@@ -4173,7 +4220,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
                     "media_content_type": "music",
                 },
             }
-            async with _httpx.AsyncClient(timeout=8.0) as c:
+            async with http_clients.session("home_assistant", timeout=8.0) as c:
                 failure = await _post_music_ha_control(c, ha_url, payload)
                 if failure:
                     return failure
@@ -4200,7 +4247,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
                     }
 
                 try:
-                    async with _httpx.AsyncClient(timeout=3) as cl:
+                    async with http_clients.session("music_assistant", timeout=3) as cl:
                         r = await cl.post(f"{_ma_url}/api",
                             json={"command": "players/all"}, headers=_ma_hdrs)
                         if r.status_code == 200 and isinstance(r.json(), list):
@@ -4215,7 +4262,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
                 await _asyncio.sleep(28)
 
                 try:
-                    async with _httpx.AsyncClient(timeout=3) as cl:
+                    async with http_clients.session("music_assistant", timeout=3) as cl:
                         r = await cl.post(f"{_ma_url}/api",
                             json={"command": "players/all"}, headers=_ma_hdrs)
                         if r.status_code != 200 or not isinstance(r.json(), list):
@@ -4304,7 +4351,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
             }
             if cmd == "now_playing":
                 # Fetch state from HA bridge
-                async with _httpx.AsyncClient(timeout=8.0) as c:
+                async with http_clients.session("home_assistant", timeout=8.0) as c:
                     r = await c.get(f"{ha_url}/states")
                     data = r.json() if r.status_code == 200 else {}
                 mp = data.get("media_player", {})
@@ -4333,7 +4380,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
                     "action": svc,
                     "data": extra,
                 }
-                async with _httpx.AsyncClient(timeout=8.0) as c:
+                async with http_clients.session("home_assistant", timeout=8.0) as c:
                     failure = await _post_music_ha_control(c, ha_url, payload)
                     if failure:
                         return failure
@@ -4377,7 +4424,7 @@ async def _execute_music_intent(intent: Intent, user_id: str) -> Optional[str]:
                 "action": "volume_set",
                 "data": {"volume_level": vol},
             }
-            async with _httpx.AsyncClient(timeout=8.0) as c:
+            async with http_clients.session("home_assistant", timeout=8.0) as c:
                 failure = await _post_music_ha_control(c, ha_url, payload)
                 if failure:
                     return failure
@@ -0,0 +1,197 @@
+"""
+keyed_state.py — bounded, evicting per-key state for long-lived registries.
+
+Several module-level dicts in zoe-data are keyed by something unbounded (a chat
+session id, a panel id) and only ever grew: ``routers.chat._SESSION_LOCKS``
+kept one ``asyncio.Lock`` per session forever, and the voice registries in
+``routers.voice_tts`` expired an entry only when the same panel happened to
+speak again. On a hub that runs for months that is a slow leak.
+
+``KeyedState`` is a drop-in ``MutableMapping`` for those dicts:
+
+* **TTL** — an entry not read or written for ``ttl_s`` is dropped, lazily on
+  access and by the background sweeper.
+* **max size** — inserting past ``max_size`` evicts the least recently used
+  entries first.
+* **lock-aware** — an entry whose value is busy is never evicted. By default
+  that is an ``asyncio.Lock`` that is held or has waiters, so a session lock
+  can't be swapped for a fresh one under a running turn. A registry can pass
+  its own ``is_busy``.
+
+Every instance registers itself with the sweeper. ``start_sweeper()`` runs in
+the FastAPI lifespan; it expires idle entries every ``ZOE_KEYED_STATE_SWEEP_S``
+seconds and publishes ``zoe_keyed_state_size{name}``. Evictions are counted in
+``zoe_keyed_state_evicted_count{name,reason}`` (memory_metrics, best-effort).
+
+Single event loop only: like the dicts it replaces, it is not thread-safe.
+"""
+import asyncio
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+from typed_env import env_float
+
+logger = logging.getLogger(__name__)
+
+# Weak refs, not a WeakSet: a Mapping compares by content, so it is unhashable.
+_REGISTRIES: "list[weakref.ref[KeyedState]]" = []
+
+
+def _lock_busy(value: Any) -> bool:
+    """A held asyncio.Lock, or one with waiters queued on it."""
+    if isinstance(value, asyncio.Lock):
+        return value.locked() or bool(getattr(value, "_waiters", None))
+    return False
+
+
+def _observe_evicted(name: str, reason: str, n: int) -> None:
+    try:
+        from memory_metrics import keyed_state_evicted_count
+        keyed_state_evicted_count.labels(name=name, reason=reason).inc(n)
+    except Exception:
+        pass
+
+
+class KeyedState(MutableMapping):
+    """A dict with an idle TTL and a size cap that never evicts busy values."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl_s: float,
+        max_size: int,
+        is_busy: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        self.name = name
+        self.ttl_s = float(ttl_s)
+        self.max_size = int(max_size)
+        self._is_busy = is_busy or _lock_busy
+        # key -> (value, last touched, monotonic); least recently used first.
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        _REGISTRIES.append(weakref.ref(self))
+
+    def _expired(self, value: Any, touched: float, now: float) -> bool:
+        return now - touched >= self.ttl_s and not self._is_busy(value)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value, touched = self._data[key]
+        now = time.monotonic()
+        if self._expired(value, touched, now):
+            del self._data[key]
+            _observe_evicted(self.name, "ttl", 1)
+            raise KeyError(key)
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._evict_over_size(keep=key)
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry[0], entry[1], time.monotonic())
+
+    def _live(self) -> list[tuple[Hashable, Any]]:
+        """(key, value) for every unexpired entry, without touching any of them."""
+        now = time.monotonic()
+        return [(key, value) for key, (value, touched) in list(self._data.items())
+                if not self._expired(value, touched, now)]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([key for key, _ in self._live()])
+
+    # Snapshots: Mapping's views would call __getitem__ per key, and an entry
+    # expiring between __iter__ and that lookup would raise KeyError mid-loop.
+    def items(self) -> list[tuple[Hashable, Any]]:  # type: ignore[override]
+        return self._live()
+
+    def values(self) -> list[Any]:  # type: ignore[override]
+        return [value for _, value in self._live()]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _evict_over_size(self, keep: Hashable) -> None:
+        excess = len(self._data) - self.max_size
+        doomed = []
+        for key, (value, _) in self._data.items():
+            if len(doomed) >= excess:
+                break
+            if key != keep and not self._is_busy(value):
+                doomed.append(key)
+        for key in doomed:
+            del self._data[key]
+        if doomed:
+            _observe_evicted(self.name, "size", len(doomed))
+
+    def sweep(self) -> int:
+        """Drop every idle, non-busy entry past its TTL. Returns how many were dropped."""
+        now = time.monotonic()
+        doomed = [key for key, (value, touched) in self._data.items() if self._expired(value, touched, now)]
+        for key in doomed:
+            del self._data[key]
+        if doomed:
+            _observe_evicted(self.name, "ttl", len(doomed))
+        return len(doomed)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "busy": sum(1 for value, _ in self._data.values() if self._is_busy(value)),
+            "max_size": self.max_size,
+            "ttl_s": self.ttl_s,
+        }
+
+
+def _live_registries() -> list:
+    _REGISTRIES[:] = [ref for ref in _REGISTRIES if ref() is not None]
+    return [registry for registry in (ref() for ref in _REGISTRIES) if registry is not None]
+
+
+def sweep_all() -> int:
+    """Sweep every live registry and publish its size gauge. Returns entries dropped."""
+    dropped = 0
+    for registry in _live_registries():
+        dropped += registry.sweep()
+        try:
+            from memory_metrics import keyed_state_size
+            keyed_state_size.labels(name=registry.name).set(len(registry))
+        except Exception:
+            pass
+    return dropped
+
+
+def registry_stats() -> list[dict]:
+    """Per-registry size / busy counts (diagnostics)."""
+    return sorted((r.stats() for r in _live_registries()), key=lambda s: s["name"])
+
+
+async def _sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(env_float("ZOE_KEYED_STATE_SWEEP_S", 60.0))
+        try:
+            dropped = sweep_all()
+            if dropped:
+                logger.debug("keyed_state: swept %d idle entries", dropped)
+        except Exception:
+            logger.warning("keyed_state sweep failed (non-fatal)", exc_info=True)
+
+
+def start_sweeper() -> asyncio.Task:
+    """Start the background sweeper. Returns the Task so main.py can cancel it on shutdown."""
+    return asyncio.create_task(_sweep_loop(), name="keyed_state_sweeper")
@@ -0,0 +1,83 @@
+"""
+lazy_routers.py — mount rarely used routers on their first request.
+
+A few routers are only ever hit from an admin page or a one-off setup flow,
+yet importing them at startup pulls in their whole dependency graph
+(``openclaw_manager``, the Pi intent lab's comparison harness, the music
+provider setup flow). ``LazyRouterMiddleware`` keeps them out of the import
+path: when a request's path falls under one of their prefixes, the module is
+imported (off the event loop) and its ``router`` is included into the app,
+once, before the request is routed. Starlette looks routes up per request, so
+the freshly added routes serve that very request.
+
+Routes mounted this way are appended after every eager route. None of the
+prefixes below overlaps an eager route, so registration order doesn't matter.
+
+``ZOE_LAZY_ROUTERS=0`` mounts them all eagerly at import instead (e.g. to get
+the complete OpenAPI schema from a dev box).
+"""
+import asyncio
+import importlib
+import logging
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+
+import startup_profile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LazyRouter:
+    name: str
+    prefix: str
+    module: str
+
+    def matches(self, path: str) -> bool:
+        return path == self.prefix or path.startswith(self.prefix + "/")
+
+
+LAZY_ROUTERS: tuple[LazyRouter, ...] = (
+    LazyRouter("openclaw", "/api/openclaw", "routers.openclaw"),
+    LazyRouter("pi_intent_lab", "/api/pi-intent-lab", "routers.pi_intent_lab"),
+    LazyRouter("music_setup", "/api/music/setup", "routers.music_setup"),
+)
+
+
+def _include(target: FastAPI, module) -> None:
+    target.include_router(module.router)
+    target.openapi_schema = None  # regenerate with the new routes
+
+
+def mount_eagerly(target: FastAPI, routers: tuple[LazyRouter, ...] = LAZY_ROUTERS) -> None:
+    for spec in routers:
+        _include(target, importlib.import_module(spec.module))
+
+
+class LazyRouterMiddleware:
+    """Pure ASGI middleware; a path check per request until everything is mounted."""
+
+    def __init__(self, app, *, target: FastAPI, routers: tuple[LazyRouter, ...] = LAZY_ROUTERS) -> None:
+        self.app = app
+        self.target = target
+        self._pending = list(routers)
+        self._lock = asyncio.Lock()
+
+    async def _mount(self, spec: LazyRouter) -> None:
+        async with self._lock:
+            if spec not in self._pending:
+                return  # another request mounted it while we waited
+            with startup_profile.phase(f"lazy_router:{spec.name}"):
+                module = await asyncio.to_thread(importlib.import_module, spec.module)
+                _include(self.target, module)
+            self._pending.remove(spec)
+            logger.info("lazy router %s mounted at %s", spec.name, spec.prefix)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self._pending and scope["type"] in ("http", "websocket"):
+            path = scope.get("path", "")
+            for spec in list(self._pending):
+                if spec.matches(path):
+                    await self._mount(spec)
+        await self.app(scope, receive, send)
@@ -0,0 +1,117 @@
+"""Binary framing for agent → panel TTS audio on the LiveKit data channel.
+
+The JSON audio message (``{"type": "audio", "audio_base64": ...}``) costs a
+third more bytes than the audio, a base64 encode here and a decode plus blob
+build in the browser, and the browser can't play any of a sentence until the
+whole message has arrived. A panel that says so in its ``identify`` message
+(``"audio_framing": ["binary-v1"]``) gets each sentence as raw PCM in short
+chunks instead, one data packet per chunk, which it schedules through Web Audio
+as they arrive.
+
+Packet layout (big-endian, 16-byte header + payload)::
+
+    0  2s  magic       b"ZA"  — never the first bytes of a JSON message
+    2  B   version     1
+    3  B   flags       bit0 = last chunk of the sentence, bit1 = last sentence of the reply
+    4  H   turn        reply id (wraps at 65536); lets a client drop a cancelled turn
+    6  H   seq         sentence index within the reply (the JSON ``seq``)
+    8  H   chunk       chunk index within the sentence
+    10 B   codec       CODEC_PCM16 (s16le); CODEC_OPUS is reserved
+    11 B   channels
+    12 I   sample_rate
+    16 ... payload
+
+A sentence with no audio (the mid-stream-failure marker) is one header with an
+empty payload and both "last" flags set. TTS output that isn't PCM WAV (e.g. an
+Edge TTS MP3 fallback) keeps the JSON message, so framing never changes what
+can be played.
+"""
+from __future__ import annotations
+
+import io
+import struct
+import wave
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+MAGIC = b"ZA"
+VERSION = 1
+FRAMING_NAME = "binary-v1"
+
+CODEC_PCM16 = 1
+CODEC_OPUS = 2  # reserved: no Opus encoder on the box today
+
+FLAG_SENTENCE_END = 0x01
+FLAG_REPLY_END = 0x02
+
+_HEADER = struct.Struct(">2sBBHHHBBI")
+HEADER_SIZE = _HEADER.size
+
+
+@dataclass(frozen=True)
+class AudioFrame:
+    turn: int
+    seq: int
+    chunk: int
+    codec: int
+    channels: int
+    sample_rate: int
+    sentence_end: bool
+    reply_end: bool
+    payload: bytes
+
+
+def is_frame(data: bytes) -> bool:
+    return len(data) >= HEADER_SIZE and data[:2] == MAGIC
+
+
+def encode(
+    *, turn: int, seq: int, chunk: int, codec: int, channels: int, sample_rate: int,
+    sentence_end: bool, reply_end: bool, payload: bytes = b"",
+) -> bytes:
+    flags = (FLAG_SENTENCE_END if sentence_end else 0) | (FLAG_REPLY_END if reply_end else 0)
+    header = _HEADER.pack(
+        MAGIC, VERSION, flags, turn & 0xFFFF, seq & 0xFFFF, chunk & 0xFFFF,
+        codec, channels, sample_rate,
+    )
+    return header + payload
+
+
+def decode(data: bytes) -> AudioFrame:
+    if not is_frame(data):
+        raise ValueError("not a binary audio frame")
+    magic, version, flags, turn, seq, chunk, codec, channels, rate = _HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"unsupported audio frame version {version}")
+    return AudioFrame(
+        turn, seq, chunk, codec, channels, rate,
+        bool(flags & FLAG_SENTENCE_END), bool(flags & FLAG_REPLY_END), bytes(data[HEADER_SIZE:]),
+    )
+
+
+def wav_pcm(body: bytes) -> Optional[tuple[bytes, int, int]]:
+    """(pcm, sample_rate, channels) for a 16-bit PCM WAV body, else None."""
+    try:
+        with wave.open(io.BytesIO(body), "rb") as wf:
+            if wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
+                return None
+            return wf.readframes(wf.getnframes()), wf.getframerate(), wf.getnchannels()
+    except (wave.Error, EOFError):
+        return None
+
+
+def sentence_frames(
+    pcm: bytes, *, turn: int, seq: int, sample_rate: int, channels: int,
+    reply_end: bool, chunk_ms: int,
+) -> Iterator[bytes]:
+    """Split one sentence's PCM into ``chunk_ms`` packets (at least one)."""
+    frame = 2 * channels
+    step = max(frame, sample_rate * frame * chunk_ms // 1000 // frame * frame)
+    starts = range(0, len(pcm), step) if pcm else [0]
+    last = len(starts) - 1
+    for chunk, start in enumerate(starts):
+        yield encode(
+            turn=turn, seq=seq, chunk=chunk, codec=CODEC_PCM16, channels=channels,
+            sample_rate=sample_rate, sentence_end=chunk == last,
+            reply_end=reply_end and chunk == last, payload=pcm[start:start + step],
+        )
@@ -28,23 +28,50 @@ rotates, and the existing log directory had grown to ~146 MB unbounded. This
 module writes to its own :class:`~logging.handlers.RotatingFileHandler` with a
 hard ceiling of ``maxBytes * (backupCount + 1)``.
 
+Writes never happen on the logging thread. Logging is usually called from the
+event loop mid chat or voice turn, and on an SD-card Pi a slow write or a
+rotation stalled the turn. :class:`QueuedHandler` puts each record on a
+bounded queue, and a :class:`~logging.handlers.QueueListener` thread formats,
+rotates and writes it. When the queue is full the record is dropped and
+counted, never blocked on. Chatty loggers can be sampled before they are
+queued (``ZOE_LOG_SAMPLE``). ``middleware.logging.setup_json_logging`` uses
+the same handler for its stderr JSON sink.
+
 Deliberately dependency-free (stdlib only, no ``typed_env``) so it can be
 called as the very first statement in ``main.py`` with no import-order risk.
 """
 from __future__ import annotations
 
+import copy
 import logging
 import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
 
-__all__ = ["configure_logging", "DEFAULT_LOG_DIR", "HANDLER_NAME"]
+__all__ = [
+    "configure_logging",
+    "QueuedHandler",
+    "parse_sample_rules",
+    "DEFAULT_LOG_DIR",
+    "DEFAULT_QUEUE_MAX",
+    "DEFAULT_SAMPLE",
+    "HANDLER_NAME",
+]
 
 DEFAULT_LOG_DIR = "~/.zoe-logs"
 DEFAULT_LEVEL = "INFO"
 DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 10 MiB
 DEFAULT_BACKUP_COUNT = 5  # ⇒ 60 MiB ceiling for the app log
 
+DEFAULT_QUEUE_MAX = 10_000  # records buffered per sink before dropping
+#: ``logger:LEVEL=N`` rules, comma separated: keep 1 in N records at or below
+#: LEVEL from that logger (and its children). WARNING+ is never sampled unless
+#: a rule names it. The shadow router logs a line per routed turn.
+DEFAULT_SAMPLE = "zoe.router_head_shadow:INFO=10"
+
 #: Identifies our handler so repeat calls are a no-op rather than a duplicate.
 HANDLER_NAME = "zoe-data-app-log"
 
@@ -76,18 +103,161 @@ def _resolve_level(raw: str | None) -> int:
     return resolved if isinstance(resolved, int) else logging.INFO
 
 
-def configure_logging(*, log_dir: str | os.PathLike[str] | None = None) -> logging.Handler | None:
-    """Attach a rotating file handler to the root logger. Idempotent.
+def parse_sample_rules(raw: str | None) -> dict[str, tuple[int, int]]:
+    """Parse ``ZOE_LOG_SAMPLE`` into {logger: (level, keep 1 in N)}; bad entries are skipped."""
+    rules: dict[str, tuple[int, int]] = {}
+    for item in (raw or "").split(","):
+        name, _, rest = item.strip().partition(":")
+        level_name, _, every = rest.partition("=")
+        try:
+            n = int(every)
+        except ValueError:
+            continue
+        level = logging.getLevelName(level_name.strip().upper())
+        if name and isinstance(level, int) and n > 1:
+            rules[name.strip()] = (level, n)
+    return rules
+
+
+class _SinkListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room on a full bounded queue."""
+
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=5.0)
+        except queue.Full:  # listener wedged on a dead disk; let the join below time out
+            pass
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self.enqueue_sentinel()
+        self._thread.join(timeout=5.0)
+        self._thread = None
+
+
+class QueuedHandler(logging.handlers.QueueHandler):
+    """Hand records to ``sink`` on a dedicated listener thread.
+
+    The calling thread only filters, samples and merges ``msg % args`` (so a
+    mutable argument changed after the call can't alter the line). The
+    listener thread does the formatting, including tracebacks and JSON, and
+    also the rotation and the write. A full queue drops the record and counts it in
+    ``dropped``. The next record that gets through is preceded by a WARNING
+    that says how many were lost. ``flush`` waits, up to a bound, for the
+    queue to drain. ``close`` drains the queue, then stops the thread and
+    closes the sink.
+    """
+
+    def __init__(self, sink: logging.Handler, *, maxsize: int = DEFAULT_QUEUE_MAX,
+                 sample: dict[str, tuple[int, int]] | None = None) -> None:
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.sink = sink
+        self.dropped = 0
+        self.sampled_out = 0
+        self._unreported_drops = 0
+        self._sample = dict(sample or {})
+        self._sample_seen: dict[tuple[str, int], int] = {}
+        self._counts_lock = threading.Lock()
+        self._listener = _SinkListener(self.queue, sink, respect_handler_level=True)
+        self._listener.start()
+
+    def _sample_rule(self, name: str) -> tuple[int, int] | None:
+        while name:
+            rule = self._sample.get(name)
+            if rule is not None:
+                return rule
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not super().filter(record):
+            return False
+        if not self._sample:
+            return True
+        rule = self._sample_rule(record.name)
+        if rule is None or record.levelno > rule[0]:
+            return True
+        key = (record.name, record.levelno)
+        with self._counts_lock:
+            seen = self._sample_seen.get(key, 0)
+            self._sample_seen[key] = seen + 1
+            if seen % rule[1] == 0:
+                return True
+            self.sampled_out += 1
+        return False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self._unreported_drops:
+                notice = logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    "log queue full: dropped %d records", (self._unreported_drops,), None,
+                )
+                self.queue.put_nowait(self.prepare(notice))
+                self._unreported_drops = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._counts_lock:
+                self.dropped += 1
+                self._unreported_drops += 1
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+        }
+
+    def flush(self, timeout: float = 5.0) -> None:
+        q = self.queue
+        deadline = time.monotonic() + timeout
+        with q.all_tasks_done:
+            while q.unfinished_tasks and self._listener._thread is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                q.all_tasks_done.wait(remaining)
+        self.sink.flush()
+
+    def close(self) -> None:
+        self._listener.stop()
+        self.sink.close()
+        super().close()
+
+
+def _queued(sink: logging.Handler) -> QueuedHandler:
+    """Wrap ``sink`` with the env-configured queue bound and sampling rules."""
+    raw = os.environ.get("ZOE_LOG_SAMPLE")
+    return QueuedHandler(
+        sink,
+        maxsize=_int_from_env("ZOE_LOG_QUEUE_MAX", DEFAULT_QUEUE_MAX),
+        sample=parse_sample_rules(DEFAULT_SAMPLE if raw is None else raw),
+    )
+
+
+def configure_logging(*, log_dir: str | os.PathLike[str] | None = None) -> QueuedHandler | None:
+    """Attach a queued rotating file handler to the root logger. Idempotent.
 
-    Returns the handler, or ``None`` if logging could not be configured (an
-    unwritable log directory must never take the service down — a Zoe that
-    answers without logs beats a Zoe that refuses to boot).
+    Returns the :class:`QueuedHandler` (its ``sink`` is the
+    ``RotatingFileHandler``), or ``None`` if logging could not be configured
+    (an unwritable log directory must never take the service down — a Zoe
+    that answers without logs beats a Zoe that refuses to boot).
 
     Environment:
         ``ZOE_LOG_LEVEL``       level name or number (default ``INFO``)
         ``ZOE_LOG_DIR``         directory for the app log (default ``~/.zoe-logs``)
         ``ZOE_LOG_MAX_BYTES``   per-file size before rotation
         ``ZOE_LOG_BACKUP_COUNT`` rotated files to retain
+        ``ZOE_LOG_QUEUE_MAX``   records buffered before dropping (default 10000)
+        ``ZOE_LOG_SAMPLE``      sampling rules, see ``DEFAULT_SAMPLE`` ("" disables)
     """
     root = logging.getLogger()
 
@@ -105,7 +275,7 @@ def configure_logging(*, log_dir: str | os.PathLike[str] | None = None) -> loggi
 
     try:
         directory.mkdir(parents=True, exist_ok=True)
-        handler: logging.Handler = logging.handlers.RotatingFileHandler(
+        sink = logging.handlers.RotatingFileHandler(
             directory / "zoe-data.app.log",
             maxBytes=_int_from_env("ZOE_LOG_MAX_BYTES", DEFAULT_MAX_BYTES),
             backupCount=_int_from_env("ZOE_LOG_BACKUP_COUNT", DEFAULT_BACKUP_COUNT),
@@ -125,14 +295,17 @@ def configure_logging(*, log_dir: str | os.PathLike[str] | None = None) -> loggi
         )
         return None
 
+    sink.setLevel(level)
+    sink.setFormatter(logging.Formatter(_FORMAT, datefmt=_DATE_FORMAT))
+    handler = _queued(sink)
     handler.name = HANDLER_NAME
     handler.setLevel(level)
-    handler.setFormatter(logging.Formatter(_FORMAT, datefmt=_DATE_FORMAT))
     root.addHandler(handler)
 
     logging.getLogger(__name__).info(
-        "app logging configured: level=%s file=%s",
+        "app logging configured: level=%s file=%s queue_max=%d",
         logging.getLevelName(level),
-        handler.baseFilename,  # type: ignore[attr-defined]
+        sink.baseFilename,
+        handler.queue.maxsize,
     )
     return handler
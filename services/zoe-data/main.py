@@ -3,6 +3,13 @@ import os
 import time
 import uuid as _uuid_mod
 from contextlib import asynccontextmanager
+
+# Before anything heavy: time every module import from here to the end of the
+# lifespan's startup (served at GET /api/system/startup).
+import startup_profile
+
+startup_profile.start_import_timer()
+
 from fastapi import Depends, FastAPI, Request, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,7 +17,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import httpx
 from database import init_db
 from gemma_endpoint import gemma_base
-from typed_env import env_float, env_int, env_list, env_str
+from typed_env import env_bool, env_float, env_int, env_list, env_str
 from push import broadcaster
 from auth import require_internal_token
 from routers import (
@@ -35,7 +42,6 @@ from routers import (
     music_router,
     skybridge_router,
     autoresearch_router,
-    pi_intent_lab_router,
 )
 from routers.dashboard import router as dashboard_router
 from routers.board import router as board_router
@@ -49,7 +55,6 @@ from routers.system import (
     _agent_card_router,
 )
 from system_updates import start_zoe_update_background_tasks
-from routers.openclaw import router as openclaw_router
 from voice_presence import is_wake_payload, is_wake_text, wake_ack_events
 import logging
 from middleware.logging import setup_json_logging
@@ -65,6 +70,9 @@ _digest_bg_task = None
 _consolidation_bg_task = None
 _runtime_health_task = None
 _zoe_update_bg_task = None
+_weather_refresh_task = None
+_keyed_state_sweeper_task = None
+_warmups_task = None
 _skills_observer = None
 _memory_capture_health: dict[str, str] = {"status": "unknown", "detail": "startup pending"}
 
@@ -156,6 +164,7 @@ async def _check_stt_ready() -> dict:
             "engine": "moonshine",
             "arch": voice_tts.moonshine_arch(),
             "loaded": loaded,
+            "pool": voice_tts.stt_pool_stats(),
             **({"error": load_error} if load_error else {}),
         }
     except Exception as exc:
@@ -1101,6 +1110,7 @@ async def _run_router_selftrain() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global _openclaw_bg_task, _digest_bg_task, _zoe_update_bg_task, _consolidation_bg_task, _runtime_health_task
+    global _weather_refresh_task, _keyed_state_sweeper_task, _warmups_task
 
     # First thing at startup: without this the root logger has no handler, so
     # every logger.info() in the service is discarded and WARNING+ falls through
@@ -1113,6 +1123,7 @@ async def lifespan(app: FastAPI):
     from logging_setup import configure_logging  # type: ignore[import]
 
     configure_logging()
+    startup_profile.mark("lifespan_start")
 
     try:
         from runtime_env import bootstrap_runtime_env  # type: ignore[import]
@@ -1127,22 +1138,34 @@ async def lifespan(app: FastAPI):
     except Exception as _env_exc:
         logger.warning("runtime_env bootstrap (non-fatal): %s", _env_exc)
 
+    # Shared keep-alive clients for outbound HTTP (zoe-auth, LLM, HA, weather…).
+    # Opened before anything that calls out; closed last on shutdown.
+    try:
+        import http_clients
+        with startup_profile.phase("http_clients"):
+            await http_clients.start()
+    except Exception:
+        logger.warning("shared HTTP clients failed to open (per-call fallback)", exc_info=True)
+
     logger.info("Initializing zoe-data database...")
-    await init_db()
+    with startup_profile.phase("init_db"):
+        await init_db()
     logger.info("Database initialized. zoe-data is ready.")
     asyncio.create_task(_wait_for_brain_startup(), name="brain_startup_readiness_probe")
     # One-time MemPalace migration: re-tag legacy records from wing="zoe" to wing="family-admin".
     # Gated behind a DB flag so the expensive ChromaDB scan only runs on first startup.
     try:
-        await _run_mempalace_migration_gate()
+        with startup_profile.phase("mempalace_migration_gate"):
+            await _run_mempalace_migration_gate()
     except Exception as _mig_exc:
         logger.warning("MemPalace migration (non-fatal): %s", _mig_exc)
     # Load device tokens into memory so voice daemons can authenticate.
     try:
         from routers.panel_auth import load_device_tokens
         from db_pool import get_db_ctx as _get_pg_db
-        async with _get_pg_db() as _db_conn:
-            await load_device_tokens(_db_conn)
+        with startup_profile.phase("device_tokens"):
+            async with _get_pg_db() as _db_conn:
+                await load_device_tokens(_db_conn)
     except Exception as _exc:
         logger.warning("Could not pre-load device tokens: %s", _exc)
     # Warm the memory-recall path FIRST — before the capture startup probe below,
@@ -1171,11 +1194,13 @@ async def lifespan(app: FastAPI):
             )
 
         _t0 = _t.monotonic()
-        await asyncio.wait_for(_svc_warm._run_sync(_embed_only_warmup), timeout=20.0)
+        with startup_profile.phase("memory_embedder_warmup"):
+            await asyncio.wait_for(_svc_warm._run_sync(_embed_only_warmup), timeout=20.0)
         logger.info("memory embedder warmed in %.1fs", _t.monotonic() - _t0)
     except Exception as _exc:
         logger.warning("memory embedder warmup failed (non-fatal): %s", _exc)
-    await _run_memory_capture_startup_probe()
+    with startup_profile.phase("memory_capture_probe"):
+        await _run_memory_capture_startup_probe()
     asyncio.create_task(_memory_capture_retry_task(), name="memory_capture_retry")
     _openclaw_bg_task = start_openclaw_background_tasks()
     _digest_bg_task = start_memory_digest_background()
@@ -1187,45 +1212,37 @@ async def lifespan(app: FastAPI):
         asyncio.create_task(start_idle_consolidation_loop(), name="memory_idle_consolidation")
     except Exception as _exc:
         logger.warning("idle consolidation loop not started: %s", _exc)
-    # Segment-stitch vocabulary prewarm (flag-gated, default OFF): synth the finite
-    # weather/time phrase vocabulary once so stitched replies are cache-hit-instant.
-    # Paced + best-effort; a no-op when the flag is off.
-    if os.environ.get("ZOE_VOICE_STITCH_ENABLED", "0").strip().lower() in ("1", "true", "yes", "on"):
-        try:
-            from voice_stitch import prewarm_vocabulary
-            from tts_waterfall import _synthesize_kokoro_sidecar
-            asyncio.create_task(
-                prewarm_vocabulary(_synthesize_kokoro_sidecar), name="voice_stitch_prewarm"
-            )
-        except Exception as _exc:
-            logger.warning("voice_stitch prewarm not started: %s", _exc)
     _zoe_update_bg_task = start_zoe_update_background_tasks()
+    # Weather: reload the last persisted readings and keep the household's
+    # locations refreshed ahead of expiry (self-gates on ZOE_WEATHER_REFRESH_ENABLED).
+    try:
+        from routers.weather import start_weather_refresh_background
+        _weather_refresh_task = start_weather_refresh_background()
+    except Exception as _exc:
+        logger.warning("weather refresh loop not started: %s", _exc)
 
+    # Background warmups, staged: lowest priority number first, at most
+    # ZOE_WARMUP_CONCURRENCY at once, so they don't all land on the Pi's cores
+    # together with the first requests (durations in GET /api/system/startup).
+    _warmups = startup_profile.WarmupScheduler()
     try:
         from routers.voice_tts import warm_moonshine
-        asyncio.create_task(warm_moonshine(), name="moonshine_warmup")
+        # Timeouts free the slot if a load hangs; each is several times the
+        # warmup's normal duration on the Pi.
+        _warmups.add("moonshine_warmup", warm_moonshine, priority=10, timeout_s=60.0)
         logger.info("Voice STT warmup scheduled (Moonshine — the only STT engine)")
         try:
             import semantic_router as _sr
             if _sr.is_enabled():
-                asyncio.create_task(asyncio.to_thread(_sr.warm), name="semantic_router_warmup")
+                _warmups.add(
+                    "semantic_router_warmup", lambda: asyncio.to_thread(_sr.warm),
+                    priority=20, timeout_s=60.0,
+                )
                 logger.info("Semantic router (Tier-1) warmup scheduled — mode=%s", _sr.mode())
         except Exception as _sr_exc:
             logger.warning("Semantic router warmup scheduling failed (non-fatal): %s", _sr_exc)
     except Exception as _voice_warmup_exc:
         logger.warning("Voice STT worker warmup scheduling failed (non-fatal): %s", _voice_warmup_exc)
-
-    # Runtime health probe — run once immediately, then refresh every 5 min
-    await _probe_runtimes()
-    _runtime_health_task = asyncio.create_task(_runtime_health_refresh_loop(), name="runtime_health_refresh")
-
-    # Background task watchdog — detects tasks stuck in 'running' state
-    try:
-        from background_runner import _watchdog_loop
-        asyncio.create_task(_watchdog_loop(), name="task_watchdog")
-        logger.info("Background task watchdog started")
-    except Exception as _wd_exc:
-        logger.warning("Task watchdog not started (non-fatal): %s", _wd_exc)
     # Zoe Agent: warm Gemma's KV cache in background so first real query is fast
     # Check env directly to avoid circular import from routers.chat
     _pi_mode = os.environ.get("HERMES_FAST_PATH", "true").lower() != "true"
@@ -1233,12 +1250,49 @@ async def lifespan(app: FastAPI):
     if _pi_mode or _jetson_mode:
         try:
             from zoe_agent import warmup_kv_cache
-            asyncio.create_task(warmup_kv_cache(), name="gemma_kv_warmup")
+            # Gemma needs ~6s to load; the delay is spent outside a warmup slot.
+            # 3 attempts at up to 15s each plus retry pauses and the voice prompt.
+            _warmups.add("gemma_kv_warmup", warmup_kv_cache, priority=30, timeout_s=90.0, delay_s=8.0)
             tier = "Jetson" if _jetson_mode else "Pi"
-            logger.info("%s Agent: Gemma KV cache warmup scheduled (fires in 8s)", tier)
+            logger.info("%s Agent: Gemma KV cache warmup scheduled (queues for a slot after 8s)", tier)
         except Exception as _wup_exc:
             logger.warning("Agent KV warmup scheduling failed (non-fatal): %s", _wup_exc)
+    # Segment-stitch vocabulary prewarm (flag-gated, default OFF): synth the finite
+    # weather/time phrase vocabulary once so stitched replies are cache-hit-instant.
+    # Paced + best-effort; a no-op when the flag is off.
+    if os.environ.get("ZOE_VOICE_STITCH_ENABLED", "0").strip().lower() in ("1", "true", "yes", "on"):
+        try:
+            from voice_stitch import prewarm_vocabulary
+            from tts_waterfall import _synthesize_kokoro_sidecar
+            _warmups.add(
+                "voice_stitch_prewarm",
+                lambda: prewarm_vocabulary(_synthesize_kokoro_sidecar),
+                priority=50,
+                timeout_s=600.0,  # ~200 paced segments; a hung sidecar must not pin the slot
+            )
+        except Exception as _exc:
+            logger.warning("voice_stitch prewarm not started: %s", _exc)
+    _warmups_task = _warmups.start()
+
+    # Expire idle session locks / voice panel state and publish registry sizes.
+    try:
+        from keyed_state import start_sweeper
+        _keyed_state_sweeper_task = start_sweeper()
+    except Exception as _exc:
+        logger.warning("keyed-state sweeper not started: %s", _exc)
+
+    # Runtime health probe — run once immediately, then refresh every 5 min
+    with startup_profile.phase("probe_runtimes"):
+        await _probe_runtimes()
+    _runtime_health_task = asyncio.create_task(_runtime_health_refresh_loop(), name="runtime_health_refresh")
 
+    # Background task watchdog — detects tasks stuck in 'running' state
+    try:
+        from background_runner import _watchdog_loop
+        asyncio.create_task(_watchdog_loop(), name="task_watchdog")
+        logger.info("Background task watchdog started")
+    except Exception as _wd_exc:
+        logger.warning("Task watchdog not started (non-fatal): %s", _wd_exc)
     # Proactive engine: APScheduler (Tier 1) + slow-loop (Tier 2).
     try:
         # Schema guard: the claim/generation logic depends on migration 0012.
@@ -1974,6 +2028,8 @@ async def lifespan(app: FastAPI):
     except Exception as _lk_exc:
         logger.warning("LiveKit setup (non-fatal): %s", _lk_exc)
 
+    startup_profile.mark("lifespan_ready")
+    startup_profile.stop_import_timer()
     yield
     # Reap run_to_completion children BEFORE interpreter teardown:
     # ThreadPoolExecutor's exit hook joins workers ahead of ordinary atexit
@@ -1997,6 +2053,13 @@ async def lifespan(app: FastAPI):
         stop_proactive_engine()
     except Exception:
         pass
+    try:
+        from memory_service import shutdown_memory_service
+        # On timeout the flush requeues what it had not written yet and the
+        # memory service's atexit flush writes it synchronously.
+        await asyncio.wait_for(shutdown_memory_service(), timeout=5.0)
+    except Exception:
+        logger.warning("memory access-tick flush on shutdown failed (non-fatal)", exc_info=True)
     try:
         from zoe_core_client import shutdown_workers
         await shutdown_workers(reset_timeout_s=2.0)
@@ -2004,14 +2067,25 @@ async def lifespan(app: FastAPI):
         logger.warning("zoe-core worker shutdown timed out (non-fatal)")
     except Exception:
         logger.warning("zoe-core worker shutdown failed (non-fatal)", exc_info=True)
+    try:
+        from mcporter_worker import shutdown_worker as shutdown_mcporter_worker
+        await asyncio.wait_for(shutdown_mcporter_worker(), timeout=3.0)
+    except Exception:
+        logger.warning("mcporter worker shutdown failed (non-fatal)", exc_info=True)
     for task in (_openclaw_bg_task, _digest_bg_task, _zoe_update_bg_task,
-                 _consolidation_bg_task, _runtime_health_task):
+                 _consolidation_bg_task, _runtime_health_task, _weather_refresh_task,
+                 _keyed_state_sweeper_task, _warmups_task):
         if task and not task.done():
             task.cancel()
             try:
                 await task
             except asyncio.CancelledError:
                 pass
+    try:
+        import http_clients
+        await asyncio.wait_for(http_clients.aclose_all(), timeout=3.0)
+    except Exception:
+        logger.warning("shared HTTP client shutdown failed (non-fatal)", exc_info=True)
     logger.info("zoe-data shutting down.")
 
 
@@ -2166,7 +2240,6 @@ app.include_router(_agent_card_router)
 app.include_router(notifications_router)
 app.include_router(chat_router)
 app.include_router(ui_router)
-app.include_router(openclaw_router)
 app.include_router(voice_tts_router)
 from routers.voice_settings import router as voice_settings_router  # noqa: E402
 from routers.face_id import router as face_id_router  # noqa: E402
@@ -2190,13 +2263,10 @@ from routers.rooms import router as rooms_router
 app.include_router(rooms_router)
 app.include_router(capability_matrix_router)
 app.include_router(music_router)
-from routers.music_setup import router as music_setup_router
-app.include_router(music_setup_router)
 from routers.smart_home_setup import router as smart_home_setup_router
 app.include_router(smart_home_setup_router)
 app.include_router(skybridge_router)
 app.include_router(autoresearch_router)
-app.include_router(pi_intent_lab_router)
 
 from routers.portrait import router as portrait_router
 app.include_router(portrait_router)
@@ -2217,6 +2287,15 @@ try:
 except Exception as _lk_router_exc:
     logger.warning("LiveKit router not loaded (non-fatal): %s", _lk_router_exc)
 
+# Admin-only / setup-flow routers: imported and mounted on their first request
+# (see lazy_routers). ZOE_LAZY_ROUTERS=0 mounts them here instead.
+from lazy_routers import LazyRouterMiddleware, mount_eagerly  # noqa: E402
+
+if env_bool("ZOE_LAZY_ROUTERS", True):
+    app.add_middleware(LazyRouterMiddleware, target=app)
+else:
+    mount_eagerly(app)
+
 
 @app.get("/.well-known/agent.json", include_in_schema=False)
 async def a2a_well_known():
@@ -2298,7 +2377,7 @@ async def router_classify(text: str, _: None = Depends(require_internal_token)):
     to influence routing if the service were LAN-exposed."""
     import semantic_router as _sr
     return {"enabled": _sr.is_enabled(), "mode": _sr.mode(),
-            "threshold": _sr.threshold(), **_sr.route(text)}
+            "threshold": _sr.threshold(), **(await _sr.aroute(text))}
 
 
 @app.get("/api/settings")
@@ -2489,7 +2568,9 @@ async def _run_push_ws_loop(
             if data == "ping":
                 await websocket.send_json({"type": "pong"})
             elif allow_catchup and data.startswith("catchup:"):
-                _, _, raw_seq = data.partition(":")
+                # "catchup:<sequence>[:<epoch>]"; the epoch is optional for older clients.
+                _, _, rest = data.partition(":")
+                raw_seq, _, epoch = rest.partition(":")
                 try:
                     seq = int(raw_seq)
                 except (TypeError, ValueError):
@@ -2504,7 +2585,7 @@ async def _run_push_ws_loop(
                         "error": "invalid_catchup_sequence",
                     })
                     continue
-                await broadcaster.catchup(websocket, seq)
+                await broadcaster.catchup(websocket, seq, epoch or None)
     except WebSocketDisconnect:
         pass
     except asyncio.TimeoutError:
@@ -3150,6 +3231,8 @@ async def websocket_voice(websocket: WebSocket, session_id: str = Query("")):
         logger.warning("Voice WS closed: %s", _exc)
 
 
+startup_profile.mark("app_built")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
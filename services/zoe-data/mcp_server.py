@@ -8,14 +8,14 @@ import json
 import random
 import sys
 import uuid
-import httpx
 from datetime import date, datetime, timedelta
 import os
 
+import http_clients
 from runtime_env import bootstrap_runtime_env
 from agent_safety import SSRFBlocked, assert_panel_url, assert_public_url, guard_browser_page
 from time_utils import today_for_zoe_tz
-from typed_env import env_str  # reads env at CALL time — importing it reads nothing
+from typed_env import env_float, env_int, env_str  # reads env at CALL time — importing it reads nothing
 
 # Load .env secrets ONLY when running as the spawned stdio worker (`python
 # mcp_server.py` via mcporter has no systemd EnvironmentFile). Guarded so that
@@ -57,7 +57,7 @@ async def _notify_ui(channel: str, event_type: str, data: dict):
         headers = {}
         if _INTERNAL_TOKEN:
             headers["X-Internal-Token"] = _INTERNAL_TOKEN
-        async with httpx.AsyncClient(timeout=3.0) as client:
+        async with http_clients.session("loopback", timeout=3.0) as client:
             await client.post(_BROADCAST_URL, json={
                 "channel": channel,
                 "event_type": event_type,
@@ -1461,6 +1461,23 @@ def _authorized_target_user(actor: dict, requested_user_id, tool_name: str) -> s
     return actor_user_id
 
 
+# Tool name -> handler, filled at import by the @_tool decorator below. Each
+# handler takes (db, name, args, actor, user_id); _execute_tool resolves the
+# actor once and dispatches with a dict lookup instead of walking an if/elif
+# chain of every tool.
+_TOOL_HANDLERS: dict = {}
+
+
+def _tool(*names: str):
+    def register(fn):
+        for tool_name in names:
+            if tool_name in _TOOL_HANDLERS:
+                raise RuntimeError(f"duplicate MCP tool handler: {tool_name}")
+            _TOOL_HANDLERS[tool_name] = fn
+        return fn
+    return register
+
+
 async def _execute_tool(db, name: str, args: dict, actor_context: dict | None = None):
     actor = await _resolve_mcp_actor(db, name, args, actor_context)
     user_id = actor["user_id"]
@@ -1468,1922 +1485,2199 @@ async def _execute_tool(db, name: str, args: dict, actor_context: dict | None =
     if "list_type" in args:
         args["list_type"] = _LIST_TYPE_ALIASES.get(args["list_type"], args["list_type"])
 
-    if name == "calendar_list_events":
-        sql = (
-            "SELECT id, title, start_date, start_time, end_time, category, location, all_day"
-            " FROM events WHERE (visibility = 'family' OR user_id = ?) AND deleted = 0"
-        )
-        params = [user_id]
-        if args.get("start_date"):
-            sql += " AND start_date >= ?"
-            params.append(args["start_date"])
-        if args.get("end_date"):
-            sql += " AND start_date <= ?"
-            params.append(args["end_date"])
-        if args.get("category"):
-            sql += " AND category = ?"
-            params.append(args["category"])
-        sql += " ORDER BY start_date, start_time LIMIT 20"
-        cursor = await db.execute(sql, params)
-        rows = await cursor.fetchall()
-        return {"events": [dict(r) for r in rows]}
-
-    elif name == "calendar_create_event":
-        from calendar_service import create_event_record
-
-        record = await create_event_record(
-            db,
-            user_id=user_id,
-            title=args["title"],
-            start_date=args["start_date"],
-            start_time=args.get("start_time"),
-            end_time=args.get("end_time"),
-            category=args.get("category", "general"),
-            location=args.get("location"),
-            all_day=bool(args.get("all_day")),
-        )
-        result = {"id": record["id"], "title": args["title"], "start_date": args["start_date"],
-                  "start_time": args.get("start_time"), "category": args.get("category", "general")}
-        await _notify_ui("calendar", "event_created", result)
-        return {**result, "date": args["start_date"], "status": "created"}
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return {"error": f"Unknown tool: {name}"}
+    return await handler(db, name, args, actor, user_id)
 
-    elif name == "calendar_today":
-        today = today_for_zoe_tz().isoformat()
+
+@_tool("calendar_list_events")
+async def _tool_calendar_list_events(db, name: str, args: dict, actor: dict, user_id: str):
+    sql = (
+        "SELECT id, title, start_date, start_time, end_time, category, location, all_day"
+        " FROM events WHERE (visibility = 'family' OR user_id = ?) AND deleted = 0"
+    )
+    params = [user_id]
+    if args.get("start_date"):
+        sql += " AND start_date >= ?"
+        params.append(args["start_date"])
+    if args.get("end_date"):
+        sql += " AND start_date <= ?"
+        params.append(args["end_date"])
+    if args.get("category"):
+        sql += " AND category = ?"
+        params.append(args["category"])
+    sql += " ORDER BY start_date, start_time LIMIT 20"
+    cursor = await db.execute(sql, params)
+    rows = await cursor.fetchall()
+    return {"events": [dict(r) for r in rows]}
+
+
+@_tool("calendar_create_event")
+async def _tool_calendar_create_event(db, name: str, args: dict, actor: dict, user_id: str):
+    from calendar_service import create_event_record
+
+    record = await create_event_record(
+        db,
+        user_id=user_id,
+        title=args["title"],
+        start_date=args["start_date"],
+        start_time=args.get("start_time"),
+        end_time=args.get("end_time"),
+        category=args.get("category", "general"),
+        location=args.get("location"),
+        all_day=bool(args.get("all_day")),
+    )
+    result = {"id": record["id"], "title": args["title"], "start_date": args["start_date"],
+              "start_time": args.get("start_time"), "category": args.get("category", "general")}
+    await _notify_ui("calendar", "event_created", result)
+    return {**result, "date": args["start_date"], "status": "created"}
+
+
+@_tool("calendar_today")
+async def _tool_calendar_today(db, name: str, args: dict, actor: dict, user_id: str):
+    today = today_for_zoe_tz().isoformat()
+    cursor = await db.execute(
+        "SELECT id, title, start_time, end_time, category, location FROM events"
+        " WHERE start_date = ? AND (visibility = 'family' OR user_id = ?) AND deleted = 0"
+        " ORDER BY start_time",
+        (today, user_id),
+    )
+    rows = await cursor.fetchall()
+    return {"date": today, "events": [dict(r) for r in rows]}
+
+
+@_tool("list_get_items")
+async def _tool_list_get_items(db, name: str, args: dict, actor: dict, user_id: str):
+    lt = args["list_type"]
+    ln = args.get("list_name")
+    if ln:
         cursor = await db.execute(
-            "SELECT id, title, start_time, end_time, category, location FROM events"
-            " WHERE start_date = ? AND (visibility = 'family' OR user_id = ?) AND deleted = 0"
-            " ORDER BY start_time",
-            (today, user_id),
+            "SELECT l.id, l.name, li.id as item_id, li.text, li.completed, li.quantity, li.category"
+            " FROM lists l LEFT JOIN list_items li ON l.id = li.list_id AND li.deleted=0"
+            " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND l.name LIKE ? AND l.deleted=0"
+            " ORDER BY li.sort_order",
+            (user_id, lt, f"%{ln}%"),
         )
-        rows = await cursor.fetchall()
-        return {"date": today, "events": [dict(r) for r in rows]}
-
-    elif name == "list_get_items":
-        lt = args["list_type"]
-        ln = args.get("list_name")
-        if ln:
-            cursor = await db.execute(
-                "SELECT l.id, l.name, li.id as item_id, li.text, li.completed, li.quantity, li.category"
-                " FROM lists l LEFT JOIN list_items li ON l.id = li.list_id AND li.deleted=0"
-                " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND l.name LIKE ? AND l.deleted=0"
-                " ORDER BY li.sort_order",
-                (user_id, lt, f"%{ln}%"),
-            )
-        else:
-            cursor = await db.execute(
-                "SELECT l.id, l.name, li.id as item_id, li.text, li.completed, li.quantity, li.category"
-                " FROM lists l LEFT JOIN list_items li ON l.id = li.list_id AND li.deleted=0"
-                " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND l.deleted=0"
-                " ORDER BY l.name, li.sort_order",
-                (user_id, lt),
-            )
-        rows = await cursor.fetchall()
-        lists_map = {}
-        for r in rows:
-            d = dict(r)
-            lid = d["id"]
-            if lid not in lists_map:
-                lists_map[lid] = {"id": lid, "name": d["name"], "items": []}
-            if d.get("item_id") and d.get("text"):
-                lists_map[lid]["items"].append({
-                    "id": d["item_id"], "text": d["text"],
-                    "completed": bool(d["completed"]),
-                    "quantity": d.get("quantity"), "category": d.get("category"),
-                })
-        return {"lists": list(lists_map.values())}
-
-    elif name == "list_add_item":
-        from list_service import add_item_to_list, default_visibility
-
-        lt = args["list_type"]
-        ln = args.get("list_name", lt.capitalize())
-        outcome = await add_item_to_list(
-            db,
-            user_id=user_id,
-            list_type=lt,
-            list_name=ln,
-            text=args["text"],
-            quantity=args.get("quantity"),
-            category=args.get("category"),
-            new_list_visibility=default_visibility(lt),
+    else:
+        cursor = await db.execute(
+            "SELECT l.id, l.name, li.id as item_id, li.text, li.completed, li.quantity, li.category"
+            " FROM lists l LEFT JOIN list_items li ON l.id = li.list_id AND li.deleted=0"
+            " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND l.deleted=0"
+            " ORDER BY l.name, li.sort_order",
+            (user_id, lt),
         )
-        list_id = outcome["list_id"]
-        item_id = outcome["item_id"]
-        result = {"item_id": item_id, "list": ln, "list_id": list_id, "text": args["text"], "status": "added"}
-        await _notify_ui("lists", "list_updated", {"action": "item_added", "list_id": list_id, "item": {"id": item_id, "text": args["text"]}})
-        return result
-
-    elif name == "list_remove_item":
-        from intent_router import _escape_like_pattern
-
-        lt = args["list_type"]
-        text = args["item_text"]
-        # Prefer an exact (case-insensitive) match so "milk" doesn't complete
-        # "almond milk" when both are on the list; fall back to a substring
-        # match (LIKE-escaped, so literal % / _ in item text aren't treated
-        # as wildcards) only if nothing matches exactly.
+    rows = await cursor.fetchall()
+    lists_map = {}
+    for r in rows:
+        d = dict(r)
+        lid = d["id"]
+        if lid not in lists_map:
+            lists_map[lid] = {"id": lid, "name": d["name"], "items": []}
+        if d.get("item_id") and d.get("text"):
+            lists_map[lid]["items"].append({
+                "id": d["item_id"], "text": d["text"],
+                "completed": bool(d["completed"]),
+                "quantity": d.get("quantity"), "category": d.get("category"),
+            })
+    return {"lists": list(lists_map.values())}
+
+
+@_tool("list_add_item")
+async def _tool_list_add_item(db, name: str, args: dict, actor: dict, user_id: str):
+    from list_service import add_item_to_list, default_visibility
+
+    lt = args["list_type"]
+    ln = args.get("list_name", lt.capitalize())
+    outcome = await add_item_to_list(
+        db,
+        user_id=user_id,
+        list_type=lt,
+        list_name=ln,
+        text=args["text"],
+        quantity=args.get("quantity"),
+        category=args.get("category"),
+        new_list_visibility=default_visibility(lt),
+    )
+    list_id = outcome["list_id"]
+    item_id = outcome["item_id"]
+    result = {"item_id": item_id, "list": ln, "list_id": list_id, "text": args["text"], "status": "added"}
+    await _notify_ui("lists", "list_updated", {"action": "item_added", "list_id": list_id, "item": {"id": item_id, "text": args["text"]}})
+    return result
+
+
+@_tool("list_remove_item")
+async def _tool_list_remove_item(db, name: str, args: dict, actor: dict, user_id: str):
+    from intent_router import _escape_like_pattern
+
+    lt = args["list_type"]
+    text = args["item_text"]
+    # Prefer an exact (case-insensitive) match so "milk" doesn't complete
+    # "almond milk" when both are on the list; fall back to a substring
+    # match (LIKE-escaped, so literal % / _ in item text aren't treated
+    # as wildcards) only if nothing matches exactly.
+    cursor = await db.execute(
+        "SELECT li.id, li.list_id FROM list_items li JOIN lists l ON li.list_id = l.id"
+        " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND LOWER(li.text)=LOWER(?)"
+        " AND li.deleted=0 AND l.deleted=0 LIMIT 1",
+        (user_id, lt, text),
+    )
+    row = await cursor.fetchone()
+    if not row:
         cursor = await db.execute(
             "SELECT li.id, li.list_id FROM list_items li JOIN lists l ON li.list_id = l.id"
-            " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND LOWER(li.text)=LOWER(?)"
+            " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND li.text LIKE ? ESCAPE '\\'"
             " AND li.deleted=0 AND l.deleted=0 LIMIT 1",
-            (user_id, lt, text),
+            (user_id, lt, f"%{_escape_like_pattern(text)}%"),
         )
         row = await cursor.fetchone()
-        if not row:
-            cursor = await db.execute(
-                "SELECT li.id, li.list_id FROM list_items li JOIN lists l ON li.list_id = l.id"
-                " WHERE (l.user_id=? OR l.visibility='family') AND l.list_type=? AND li.text LIKE ? ESCAPE '\\'"
-                " AND li.deleted=0 AND l.deleted=0 LIMIT 1",
-                (user_id, lt, f"%{_escape_like_pattern(text)}%"),
-            )
-            row = await cursor.fetchone()
-        if not row:
-            return {"error": f"Item '{text}' not found in {lt} lists"}
-        item_id = row["id"]
-        await db.execute("UPDATE list_items SET completed=1, updated_at=NOW() WHERE id=?", (item_id,))
-        await _notify_ui("lists", "list_updated", {"action": "item_completed", "list_id": row["list_id"], "item_id": item_id})
-        return {"item_id": item_id, "text": text, "status": "completed"}
-
-    elif name == "reminder_create":
-        from models import ReminderCreate
-        from reminder_service import create_reminder_record
-
-        payload = ReminderCreate(
-            title=args["title"],
-            due_date=args.get("due_date"),
-            due_time=args.get("due_time"),
-            priority=args.get("priority", "normal"),
-            category=args.get("category", "general"),
-            visibility="personal",  # the visibility the old raw MCP INSERT always used
+    if not row:
+        return {"error": f"Item '{text}' not found in {lt} lists"}
+    item_id = row["id"]
+    await db.execute("UPDATE list_items SET completed=1, updated_at=NOW() WHERE id=?", (item_id,))
+    await _notify_ui("lists", "list_updated", {"action": "item_completed", "list_id": row["list_id"], "item_id": item_id})
+    return {"item_id": item_id, "text": text, "status": "completed"}
+
+
+@_tool("reminder_create")
+async def _tool_reminder_create(db, name: str, args: dict, actor: dict, user_id: str):
+    from models import ReminderCreate
+    from reminder_service import create_reminder_record
+
+    payload = ReminderCreate(
+        title=args["title"],
+        due_date=args.get("due_date"),
+        due_time=args.get("due_time"),
+        priority=args.get("priority", "normal"),
+        category=args.get("category", "general"),
+        visibility="personal",  # the visibility the old raw MCP INSERT always used
+    )
+    # Canonical write path (same as routers/reminders.py and intent_router):
+    # policy gate + INSERT + notification row + commit + broadcaster.broadcast.
+    reminder = await create_reminder_record(payload, user=actor, db=db)
+    result = {"id": reminder.get("id"), "title": reminder.get("title", args["title"]),
+              "due_date": reminder.get("due_date"), "due_time": reminder.get("due_time"),
+              "priority": reminder.get("priority", payload.priority)}
+    if _STDIO_WORKER:
+        # The service already broadcast via the in-process broadcaster, but
+        # in the stdio worker that broadcaster has no UI clients (they hang
+        # off the zoe-data server process) — relay once over HTTP so panels
+        # still get exactly one update. In-process callers (zoe_agent) skip
+        # this: the service broadcast already reached the panels.
+        await _notify_ui("reminders", "reminder_created", result)
+    # Proactive scheduling is handled by ReminderScanTrigger (runs every 5 min),
+    # which correctly converts due_time from AWST local time to UTC.
+    return {**result, "status": "created"}
+
+
+@_tool("reminder_list")
+async def _tool_reminder_list(db, name: str, args: dict, actor: dict, user_id: str):
+    if args.get("today_only"):
+        today = today_for_zoe_tz().isoformat()
+        cursor = await db.execute(
+            "SELECT id, title, due_date, due_time, priority, category FROM reminders"
+            " WHERE due_date = ? AND (visibility = 'family' OR user_id = ?)"
+            " AND is_active = 1 AND deleted = 0 ORDER BY due_time",
+            (today, user_id),
         )
-        # Canonical write path (same as routers/reminders.py and intent_router):
-        # policy gate + INSERT + notification row + commit + broadcaster.broadcast.
-        reminder = await create_reminder_record(payload, user=actor, db=db)
-        result = {"id": reminder.get("id"), "title": reminder.get("title", args["title"]),
-                  "due_date": reminder.get("due_date"), "due_time": reminder.get("due_time"),
-                  "priority": reminder.get("priority", payload.priority)}
-        if _STDIO_WORKER:
-            # The service already broadcast via the in-process broadcaster, but
-            # in the stdio worker that broadcaster has no UI clients (they hang
-            # off the zoe-data server process) — relay once over HTTP so panels
-            # still get exactly one update. In-process callers (zoe_agent) skip
-            # this: the service broadcast already reached the panels.
-            await _notify_ui("reminders", "reminder_created", result)
-        # Proactive scheduling is handled by ReminderScanTrigger (runs every 5 min),
-        # which correctly converts due_time from AWST local time to UTC.
-        return {**result, "status": "created"}
-
-    elif name == "reminder_list":
-        if args.get("today_only"):
-            today = today_for_zoe_tz().isoformat()
-            cursor = await db.execute(
-                "SELECT id, title, due_date, due_time, priority, category FROM reminders"
-                " WHERE due_date = ? AND (visibility = 'family' OR user_id = ?)"
-                " AND is_active = 1 AND deleted = 0 ORDER BY due_time",
-                (today, user_id),
-            )
-        else:
-            cursor = await db.execute(
-                "SELECT id, title, due_date, due_time, priority, category FROM reminders"
-                " WHERE (visibility = 'family' OR user_id = ?)"
-                " AND is_active = 1 AND deleted = 0 ORDER BY due_date, due_time LIMIT 20",
-                (user_id,),
-            )
-        rows = await cursor.fetchall()
-        return {"reminders": [dict(r) for r in rows]}
-
-    elif name == "people_search":
-        q = args["query"]
+    else:
         cursor = await db.execute(
-            "SELECT id, name, relationship, birthday, phone, email FROM people WHERE name LIKE ? AND user_id=? AND deleted=0 LIMIT 10",
-            (f"%{q}%", user_id),
+            "SELECT id, title, due_date, due_time, priority, category FROM reminders"
+            " WHERE (visibility = 'family' OR user_id = ?)"
+            " AND is_active = 1 AND deleted = 0 ORDER BY due_date, due_time LIMIT 20",
+            (user_id,),
         )
-        rows = await cursor.fetchall()
-        return {"people": [dict(r) for r in rows]}
+    rows = await cursor.fetchall()
+    return {"reminders": [dict(r) for r in rows]}
 
-    elif name == "people_create":
-        pid = str(uuid.uuid4())
-        await db.execute(
-            "INSERT INTO people (id, user_id, name, relationship, birthday, phone, email, notes, visibility, circle, context) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-            (pid, user_id, args["name"], args.get("relationship"), args.get("birthday"),
-             args.get("phone"), args.get("email"), args.get("notes"), "family",
-             args.get("circle", "circle"), args.get("context", "personal")),
+
+@_tool("people_search")
+async def _tool_people_search(db, name: str, args: dict, actor: dict, user_id: str):
+    q = args["query"]
+    cursor = await db.execute(
+        "SELECT id, name, relationship, birthday, phone, email FROM people WHERE name LIKE ? AND user_id=? AND deleted=0 LIMIT 10",
+        (f"%{q}%", user_id),
+    )
+    rows = await cursor.fetchall()
+    return {"people": [dict(r) for r in rows]}
+
+
+@_tool("people_create")
+async def _tool_people_create(db, name: str, args: dict, actor: dict, user_id: str):
+    pid = str(uuid.uuid4())
+    await db.execute(
+        "INSERT INTO people (id, user_id, name, relationship, birthday, phone, email, notes, visibility, circle, context) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+        (pid, user_id, args["name"], args.get("relationship"), args.get("birthday"),
+         args.get("phone"), args.get("email"), args.get("notes"), "family",
+         args.get("circle", "circle"), args.get("context", "personal")),
+    )
+    result = {"id": pid, "name": args["name"], "relationship": args.get("relationship")}
+    await _notify_ui("all", "people:created", result)
+    # Mirror to MemPalace so OpenClaw-authored contacts show up in
+    # memory retrieval identically to HTTP-router-authored ones.
+    try:
+        from routers.people import _store_person_memory  # type: ignore
+        await _store_person_memory(
+            db, user_id,
+            {**result, "birthday": args.get("birthday"), "phone": args.get("phone"),
+             "email": args.get("email"), "notes": args.get("notes")},
+            "created",
         )
-        result = {"id": pid, "name": args["name"], "relationship": args.get("relationship")}
-        await _notify_ui("all", "people:created", result)
-        # Mirror to MemPalace so OpenClaw-authored contacts show up in
-        # memory retrieval identically to HTTP-router-authored ones.
-        try:
-            from routers.people import _store_person_memory  # type: ignore
-            await _store_person_memory(
-                db, user_id,
-                {**result, "birthday": args.get("birthday"), "phone": args.get("phone"),
-                 "email": args.get("email"), "notes": args.get("notes")},
-                "created",
-            )
-        except Exception as exc:
-            _mcp_log.info("mcp people_create memory mirror skipped: %s", exc)
-        return {**result, "status": "created"}
+    except Exception as exc:
+        _mcp_log.info("mcp people_create memory mirror skipped: %s", exc)
+    return {**result, "status": "created"}
 
-    elif name == "note_create":
-        nid = str(uuid.uuid4())
-        await db.execute(
-            "INSERT INTO notes (id, user_id, title, content, category, visibility) VALUES (?,?,?,?,?,?)",
-            (nid, user_id, args.get("title"), args["content"], args.get("category", "general"), "personal"),
+
+@_tool("note_create")
+async def _tool_note_create(db, name: str, args: dict, actor: dict, user_id: str):
+    nid = str(uuid.uuid4())
+    await db.execute(
+        "INSERT INTO notes (id, user_id, title, content, category, visibility) VALUES (?,?,?,?,?,?)",
+        (nid, user_id, args.get("title"), args["content"], args.get("category", "general"), "personal"),
+    )
+    result = {"id": nid, "title": args.get("title"), "category": args.get("category", "general")}
+    await _notify_ui("notes", "note_created", result)
+    try:
+        from routers.notes import _store_note_memory  # type: ignore
+        await _store_note_memory(
+            db, user_id,
+            {**result, "content": args["content"]},
+            "created",
         )
-        result = {"id": nid, "title": args.get("title"), "category": args.get("category", "general")}
-        await _notify_ui("notes", "note_created", result)
-        try:
-            from routers.notes import _store_note_memory  # type: ignore
-            await _store_note_memory(
-                db, user_id,
-                {**result, "content": args["content"]},
-                "created",
-            )
-        except Exception as exc:
-            _mcp_log.info("mcp note_create memory mirror skipped: %s", exc)
-        return {**result, "status": "created"}
+    except Exception as exc:
+        _mcp_log.info("mcp note_create memory mirror skipped: %s", exc)
+    return {**result, "status": "created"}
+
+
+@_tool("note_search")
+async def _tool_note_search(db, name: str, args: dict, actor: dict, user_id: str):
+    q = args["query"]
+    cursor = await db.execute(
+        "SELECT id, title, content, category, created_at FROM notes WHERE (title LIKE ? OR content LIKE ?) AND user_id=? AND deleted=0 LIMIT 10",
+        (f"%{q}%", f"%{q}%", user_id),
+    )
+    rows = await cursor.fetchall()
+    return {"notes": [dict(r) for r in rows]}
 
-    elif name == "note_search":
-        q = args["query"]
+
+@_tool("dashboard_get_layout")
+async def _tool_dashboard_get_layout(db, name: str, args: dict, actor: dict, user_id: str):
+    uid = _authorized_target_user(actor, args.get("user_id"), name)
+    cursor = await db.execute(
+        "SELECT layout, updated_at FROM dashboard_layouts WHERE user_id = ?",
+        (uid,),
+    )
+    row = await cursor.fetchone()
+    if row:
+        return {"layout": json.loads(row["layout"]), "updated_at": row["updated_at"]}
+    return {"layout": None, "message": "No layout saved yet"}
+
+
+@_tool("dashboard_save_layout")
+async def _tool_dashboard_save_layout(db, name: str, args: dict, actor: dict, user_id: str):
+    uid = _authorized_target_user(actor, args.get("user_id"), name)
+    layout_payload = json.dumps(args.get("layout", []))
+    async with db.transaction():
+        await _ensure_dashboard_layout_row(db, uid)
+        await _fetch_dashboard_layout_for_update(db, uid)
+        await db.execute(
+            "UPDATE dashboard_layouts "
+            "SET layout = $1::jsonb, updated_at = CURRENT_TIMESTAMP "
+            "WHERE user_id = $2",
+            layout_payload,
+            uid,
+        )
+    return {"status": "ok"}
+
+
+@_tool("dashboard_add_widget")
+async def _tool_dashboard_add_widget(db, name: str, args: dict, actor: dict, user_id: str):
+    uid = _authorized_target_user(actor, args.get("user_id"), name)
+    widget_ids = args.get("widgets", [])
+    VALID_WIDGETS = {
+        "weather",
+        "events",
+        "tasks",
+        "shopping",
+        "notes",
+        "reminders",
+        "calendar",
+        "people",
+        "journal",
+        "home",
+        "time",
+        "zoe-orb",
+        "week-planner",
+        "personal",
+        "work",
+        "bucket",
+    }
+    to_add = [w for w in widget_ids if w in VALID_WIDGETS]
+    if not to_add:
+        return {"status": "error", "message": "No valid widget IDs"}
+    async with db.transaction():
+        await _ensure_dashboard_layout_row(db, uid)
+        row = await _fetch_dashboard_layout_for_update(db, uid)
+        current = _decode_dashboard_layout(row["layout"]) if row else []
+        existing = {w.get("id") for w in current if isinstance(w, dict)}
+        max_y = max((w.get("y", 0) + w.get("h", 2) for w in current), default=0)
+        added = []
+        for wid in to_add:
+            if wid in existing:
+                continue
+            current.append({"id": wid, "x": 0, "y": max_y, "w": 2, "h": 2})
+            max_y += 2
+            added.append(wid)
+        await db.execute(
+            "UPDATE dashboard_layouts "
+            "SET layout = $1::jsonb, updated_at = CURRENT_TIMESTAMP "
+            "WHERE user_id = $2",
+            json.dumps(current),
+            uid,
+        )
+    return {"status": "ok", "added": added}
+
+
+@_tool("dashboard_available_widgets")
+async def _tool_dashboard_available_widgets(db, name: str, args: dict, actor: dict, user_id: str):
+    widgets = [
+        {"id": "weather", "name": "Weather", "icon": "sun"},
+        {"id": "events", "name": "Calendar Events", "icon": "calendar"},
+        {"id": "tasks", "name": "Tasks", "icon": "check"},
+        {"id": "shopping", "name": "Shopping List", "icon": "cart"},
+        {"id": "notes", "name": "Quick Notes", "icon": "note"},
+        {"id": "reminders", "name": "Reminders", "icon": "bell"},
+        {"id": "calendar", "name": "Calendar Grid", "icon": "grid"},
+        {"id": "people", "name": "People", "icon": "users"},
+        {"id": "journal", "name": "Journal", "icon": "book"},
+        {"id": "home", "name": "Home Control", "icon": "home"},
+        {"id": "time", "name": "Clock", "icon": "clock"},
+        {"id": "zoe-orb", "name": "Zoe Orb", "icon": "orb"},
+        {"id": "week-planner", "name": "Week Planner", "icon": "planner"},
+        {"id": "personal", "name": "Personal Todos", "icon": "pin"},
+        {"id": "work", "name": "Work Todos", "icon": "briefcase"},
+        {"id": "bucket", "name": "Bucket List", "icon": "star"},
+    ]
+    return {"widgets": widgets}
+
+
+# === WEATHER TOOLS (Open-Meteo — free, no API key) ===
+@_tool("weather_current")
+async def _tool_weather_current(db, name: str, args: dict, actor: dict, user_id: str):
+    # WMO weather code → human-readable description
+    _WMO = {0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+            45: "Fog", 48: "Icy fog", 51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
+            61: "Slight rain", 63: "Rain", 65: "Heavy rain", 71: "Slight snow", 73: "Snow",
+            75: "Heavy snow", 80: "Rain showers", 81: "Rain showers", 82: "Violent showers",
+            85: "Snow showers", 86: "Heavy snow showers", 95: "Thunderstorm",
+            96: "Thunderstorm with hail", 99: "Thunderstorm with heavy hail"}
+    city = args.get("city")
+    lat = lon = None
+    if not city:
         cursor = await db.execute(
-            "SELECT id, title, content, category, created_at FROM notes WHERE (title LIKE ? OR content LIKE ?) AND user_id=? AND deleted=0 LIMIT 10",
-            (f"%{q}%", f"%{q}%", user_id),
+            "SELECT latitude, longitude, city FROM weather_preferences WHERE user_id=?",
+            (user_id,),
         )
-        rows = await cursor.fetchall()
-        return {"notes": [dict(r) for r in rows]}
+        row = await cursor.fetchone()
+        if row:
+            d = dict(row)
+            lat, lon, city = d.get("latitude"), d.get("longitude"), d.get("city")
+    # Fallback to system-level default (admin setting), then env defaults.
+    if not lat:
+        default_loc = await _get_weather_default_location(db)
+        lat = default_loc["latitude"]
+        lon = default_loc["longitude"]
+        city = city or default_loc["city"]
+        tz = default_loc["timezone"]
+    else:
+        city = city or os.environ.get("ZOE_LOCATION_CITY", "Geraldton")
+        tz = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
+    params = {
+        "latitude": lat, "longitude": lon, "timezone": tz,
+        "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
+    }
+    async with http_clients.session("open_meteo", timeout=10.0) as client:
+        r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
+        r.raise_for_status()
+        data = r.json()
+    cur = data.get("current", {})
+    wmo = cur.get("weather_code", 0)
+    return {
+        "temp": cur.get("temperature_2m"),
+        "feels_like": cur.get("apparent_temperature"),
+        "humidity": cur.get("relative_humidity_2m"),
+        "wind_speed": cur.get("wind_speed_10m"),
+        "description": _WMO.get(wmo, f"WMO code {wmo}"),
+        "city": city,
+        "source": "open-meteo",
+    }
 
-    elif name == "dashboard_get_layout":
-        uid = _authorized_target_user(actor, args.get("user_id"), name)
+
+@_tool("weather_forecast")
+async def _tool_weather_forecast(db, name: str, args: dict, actor: dict, user_id: str):
+    _WMO = {0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+            45: "Fog", 48: "Icy fog", 51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
+            61: "Slight rain", 63: "Rain", 65: "Heavy rain", 71: "Slight snow", 73: "Snow",
+            75: "Heavy snow", 80: "Rain showers", 81: "Rain showers", 82: "Violent showers",
+            85: "Snow showers", 86: "Heavy snow showers", 95: "Thunderstorm"}
+    city = args.get("city")
+    days = min(int(args.get("days", 5)), 7)
+    lat = lon = None
+    if not city:
         cursor = await db.execute(
-            "SELECT layout, updated_at FROM dashboard_layouts WHERE user_id = ?",
-            (uid,),
+            "SELECT latitude, longitude, city FROM weather_preferences WHERE user_id=?",
+            (user_id,),
         )
         row = await cursor.fetchone()
         if row:
-            return {"layout": json.loads(row["layout"]), "updated_at": row["updated_at"]}
-        return {"layout": None, "message": "No layout saved yet"}
-
-    elif name == "dashboard_save_layout":
-        uid = _authorized_target_user(actor, args.get("user_id"), name)
-        layout_payload = json.dumps(args.get("layout", []))
-        async with db.transaction():
-            await _ensure_dashboard_layout_row(db, uid)
-            await _fetch_dashboard_layout_for_update(db, uid)
-            await db.execute(
-                "UPDATE dashboard_layouts "
-                "SET layout = $1::jsonb, updated_at = CURRENT_TIMESTAMP "
-                "WHERE user_id = $2",
-                layout_payload,
-                uid,
-            )
-        return {"status": "ok"}
-
-    elif name == "dashboard_add_widget":
-        uid = _authorized_target_user(actor, args.get("user_id"), name)
-        widget_ids = args.get("widgets", [])
-        VALID_WIDGETS = {
-            "weather",
-            "events",
-            "tasks",
-            "shopping",
-            "notes",
-            "reminders",
-            "calendar",
-            "people",
-            "journal",
-            "home",
-            "time",
-            "zoe-orb",
-            "week-planner",
-            "personal",
-            "work",
-            "bucket",
-        }
-        to_add = [w for w in widget_ids if w in VALID_WIDGETS]
-        if not to_add:
-            return {"status": "error", "message": "No valid widget IDs"}
-        async with db.transaction():
-            await _ensure_dashboard_layout_row(db, uid)
-            row = await _fetch_dashboard_layout_for_update(db, uid)
-            current = _decode_dashboard_layout(row["layout"]) if row else []
-            existing = {w.get("id") for w in current if isinstance(w, dict)}
-            max_y = max((w.get("y", 0) + w.get("h", 2) for w in current), default=0)
-            added = []
-            for wid in to_add:
-                if wid in existing:
-                    continue
-                current.append({"id": wid, "x": 0, "y": max_y, "w": 2, "h": 2})
-                max_y += 2
-                added.append(wid)
-            await db.execute(
-                "UPDATE dashboard_layouts "
-                "SET layout = $1::jsonb, updated_at = CURRENT_TIMESTAMP "
-                "WHERE user_id = $2",
-                json.dumps(current),
-                uid,
-            )
-        return {"status": "ok", "added": added}
-
-    elif name == "dashboard_available_widgets":
-        widgets = [
-            {"id": "weather", "name": "Weather", "icon": "sun"},
-            {"id": "events", "name": "Calendar Events", "icon": "calendar"},
-            {"id": "tasks", "name": "Tasks", "icon": "check"},
-            {"id": "shopping", "name": "Shopping List", "icon": "cart"},
-            {"id": "notes", "name": "Quick Notes", "icon": "note"},
-            {"id": "reminders", "name": "Reminders", "icon": "bell"},
-            {"id": "calendar", "name": "Calendar Grid", "icon": "grid"},
-            {"id": "people", "name": "People", "icon": "users"},
-            {"id": "journal", "name": "Journal", "icon": "book"},
-            {"id": "home", "name": "Home Control", "icon": "home"},
-            {"id": "time", "name": "Clock", "icon": "clock"},
-            {"id": "zoe-orb", "name": "Zoe Orb", "icon": "orb"},
-            {"id": "week-planner", "name": "Week Planner", "icon": "planner"},
-            {"id": "personal", "name": "Personal Todos", "icon": "pin"},
-            {"id": "work", "name": "Work Todos", "icon": "briefcase"},
-            {"id": "bucket", "name": "Bucket List", "icon": "star"},
-        ]
-        return {"widgets": widgets}
-
-    # === WEATHER TOOLS (Open-Meteo — free, no API key) ===
-    elif name == "weather_current":
-        # WMO weather code → human-readable description
-        _WMO = {0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-                45: "Fog", 48: "Icy fog", 51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
-                61: "Slight rain", 63: "Rain", 65: "Heavy rain", 71: "Slight snow", 73: "Snow",
-                75: "Heavy snow", 80: "Rain showers", 81: "Rain showers", 82: "Violent showers",
-                85: "Snow showers", 86: "Heavy snow showers", 95: "Thunderstorm",
-                96: "Thunderstorm with hail", 99: "Thunderstorm with heavy hail"}
-        city = args.get("city")
-        lat = lon = None
-        if not city:
-            cursor = await db.execute(
-                "SELECT latitude, longitude, city FROM weather_preferences WHERE user_id=?",
-                (user_id,),
-            )
-            row = await cursor.fetchone()
-            if row:
-                d = dict(row)
-                lat, lon, city = d.get("latitude"), d.get("longitude"), d.get("city")
-        # Fallback to system-level default (admin setting), then env defaults.
-        if not lat:
-            default_loc = await _get_weather_default_location(db)
-            lat = default_loc["latitude"]
-            lon = default_loc["longitude"]
-            city = city or default_loc["city"]
-            tz = default_loc["timezone"]
-        else:
-            city = city or os.environ.get("ZOE_LOCATION_CITY", "Geraldton")
-            tz = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
-        params = {
-            "latitude": lat, "longitude": lon, "timezone": tz,
-            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
-        }
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
-            r.raise_for_status()
-            data = r.json()
-        cur = data.get("current", {})
-        wmo = cur.get("weather_code", 0)
-        return {
-            "temp": cur.get("temperature_2m"),
-            "feels_like": cur.get("apparent_temperature"),
-            "humidity": cur.get("relative_humidity_2m"),
-            "wind_speed": cur.get("wind_speed_10m"),
-            "description": _WMO.get(wmo, f"WMO code {wmo}"),
-            "city": city,
-            "source": "open-meteo",
-        }
+            d = dict(row)
+            lat, lon, city = d.get("latitude"), d.get("longitude"), d.get("city")
+    if not lat:
+        default_loc = await _get_weather_default_location(db)
+        lat = default_loc["latitude"]
+        lon = default_loc["longitude"]
+        city = city or default_loc["city"]
+        tz = default_loc["timezone"]
+    else:
+        city = city or os.environ.get("ZOE_LOCATION_CITY", "Geraldton")
+        tz = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
+    params = {
+        "latitude": lat, "longitude": lon, "timezone": tz,
+        "daily": "temperature_2m_max,temperature_2m_min,weather_code,precipitation_sum",
+        "forecast_days": days,
+    }
+    async with http_clients.session("open_meteo", timeout=10.0) as client:
+        r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
+        r.raise_for_status()
+        data = r.json()
+    daily = data.get("daily", {})
+    dates = daily.get("time", [])
+    max_temps = daily.get("temperature_2m_max", [])
+    min_temps = daily.get("temperature_2m_min", [])
+    codes = daily.get("weather_code", [])
+    precip = daily.get("precipitation_sum", [])
+    return {
+        "forecast": [
+            {
+                "date": dates[i] if i < len(dates) else None,
+                "temp_max": max_temps[i] if i < len(max_temps) else None,
+                "temp_min": min_temps[i] if i < len(min_temps) else None,
+                "description": _WMO.get(codes[i] if i < len(codes) else 0, "Unknown"),
+                "precipitation_mm": precip[i] if i < len(precip) else None,
+            }
+            for i in range(len(dates))
+        ],
+        "city": city,
+        "source": "open-meteo",
+    }
+
+
+# === SELF-AWARENESS TOOLS ===
+@_tool("zoe_get_time")
+async def _tool_zoe_get_time(db, name: str, args: dict, actor: dict, user_id: str):
+    import datetime
+    tz_name = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
+    try:
+        import zoneinfo
+        tz = zoneinfo.ZoneInfo(tz_name)
+        now = datetime.datetime.now(tz)
+    except Exception:
+        now = datetime.datetime.now()
+    return {
+        "datetime": now.isoformat(),
+        "formatted": now.strftime("%A, %d %B %Y — %I:%M %p"),
+        "timezone": tz_name,
+    }
 
-    elif name == "weather_forecast":
-        _WMO = {0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-                45: "Fog", 48: "Icy fog", 51: "Light drizzle", 53: "Drizzle", 55: "Heavy drizzle",
-                61: "Slight rain", 63: "Rain", 65: "Heavy rain", 71: "Slight snow", 73: "Snow",
-                75: "Heavy snow", 80: "Rain showers", 81: "Rain showers", 82: "Violent showers",
-                85: "Snow showers", 86: "Heavy snow showers", 95: "Thunderstorm"}
-        city = args.get("city")
-        days = min(int(args.get("days", 5)), 7)
-        lat = lon = None
-        if not city:
-            cursor = await db.execute(
-                "SELECT latitude, longitude, city FROM weather_preferences WHERE user_id=?",
-                (user_id,),
-            )
-            row = await cursor.fetchone()
-            if row:
-                d = dict(row)
-                lat, lon, city = d.get("latitude"), d.get("longitude"), d.get("city")
-        if not lat:
-            default_loc = await _get_weather_default_location(db)
-            lat = default_loc["latitude"]
-            lon = default_loc["longitude"]
-            city = city or default_loc["city"]
-            tz = default_loc["timezone"]
-        else:
-            city = city or os.environ.get("ZOE_LOCATION_CITY", "Geraldton")
-            tz = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
-        params = {
-            "latitude": lat, "longitude": lon, "timezone": tz,
-            "daily": "temperature_2m_max,temperature_2m_min,weather_code,precipitation_sum",
-            "forecast_days": days,
-        }
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
-            r.raise_for_status()
-            data = r.json()
-        daily = data.get("daily", {})
-        dates = daily.get("time", [])
-        max_temps = daily.get("temperature_2m_max", [])
-        min_temps = daily.get("temperature_2m_min", [])
-        codes = daily.get("weather_code", [])
-        precip = daily.get("precipitation_sum", [])
-        return {
-            "forecast": [
-                {
-                    "date": dates[i] if i < len(dates) else None,
-                    "temp_max": max_temps[i] if i < len(max_temps) else None,
-                    "temp_min": min_temps[i] if i < len(min_temps) else None,
-                    "description": _WMO.get(codes[i] if i < len(codes) else 0, "Unknown"),
-                    "precipitation_mm": precip[i] if i < len(precip) else None,
-                }
-                for i in range(len(dates))
-            ],
-            "city": city,
-            "source": "open-meteo",
-        }
 
-    # === SELF-AWARENESS TOOLS ===
-    elif name == "zoe_get_time":
-        import datetime
-        tz_name = os.environ.get("ZOE_TIMEZONE", "Australia/Perth")
+@_tool("zoe_get_status")
+async def _tool_zoe_get_status(db, name: str, args: dict, actor: dict, user_id: str):
+    import datetime
+    import platform
+    try:
+        import psutil
+        mem = psutil.virtual_memory()
+        cpu = psutil.cpu_percent(interval=0.1)
+        mem_info = {"used_gb": round(mem.used / 1e9, 2), "total_gb": round(mem.total / 1e9, 2), "percent": mem.percent}
+    except ImportError:
+        mem_info = {}
+        cpu = None
+    return {
+        "active_agents": _active_agents_list(),
+        "available_fallback": ["OpenClaw (on-demand)"],
+        "platform": platform.machine(),
+        "python": platform.python_version(),
+        "cpu_percent": cpu,
+        "memory": mem_info,
+        "mempalace_dir": os.environ.get("MEMPALACE_DATA_DIR", os.path.expanduser("~/.mempalace")),
+        "datetime": datetime.datetime.now().isoformat(),
+    }
+
+
+@_tool("zoe_list_skills")
+async def _tool_zoe_list_skills(db, name: str, args: dict, actor: dict, user_id: str):
+    # Real OpenClaw workspace skills live under ~/.openclaw/workspace/skills.
+    # Keep the legacy ~/.openclaw/skills as a fallback.
+    skills_dirs = [
+        os.path.expanduser("~/.openclaw/workspace/skills"),
+        os.path.expanduser("~/.openclaw/skills"),
+    ]
+    skills: set[str] = set()
+    used_dir = None
+    for d in skills_dirs:
         try:
-            import zoneinfo
-            tz = zoneinfo.ZoneInfo(tz_name)
-            now = datetime.datetime.now(tz)
+            if os.path.isdir(d):
+                used_dir = used_dir or d
+                for entry in os.scandir(d):
+                    if entry.is_dir():
+                        skills.add(entry.name)
         except Exception:
-            now = datetime.datetime.now()
-        return {
-            "datetime": now.isoformat(),
-            "formatted": now.strftime("%A, %d %B %Y — %I:%M %p"),
-            "timezone": tz_name,
-        }
+            continue
+    return {
+        "skills": sorted(skills),
+        "count": len(skills),
+        "skills_dir": used_dir or skills_dirs[0],
+    }
 
-    elif name == "zoe_get_status":
-        import datetime
-        import platform
-        try:
-            import psutil
-            mem = psutil.virtual_memory()
-            cpu = psutil.cpu_percent(interval=0.1)
-            mem_info = {"used_gb": round(mem.used / 1e9, 2), "total_gb": round(mem.total / 1e9, 2), "percent": mem.percent}
-        except ImportError:
-            mem_info = {}
-            cpu = None
-        return {
-            "active_agents": _active_agents_list(),
-            "available_fallback": ["OpenClaw (on-demand)"],
-            "platform": platform.machine(),
-            "python": platform.python_version(),
-            "cpu_percent": cpu,
-            "memory": mem_info,
-            "mempalace_dir": os.environ.get("MEMPALACE_DATA_DIR", os.path.expanduser("~/.mempalace")),
-            "datetime": datetime.datetime.now().isoformat(),
-        }
 
-    elif name == "zoe_list_skills":
-        # Real OpenClaw workspace skills live under ~/.openclaw/workspace/skills.
-        # Keep the legacy ~/.openclaw/skills as a fallback.
-        skills_dirs = [
-            os.path.expanduser("~/.openclaw/workspace/skills"),
-            os.path.expanduser("~/.openclaw/skills"),
-        ]
-        skills: set[str] = set()
-        used_dir = None
-        for d in skills_dirs:
-            try:
-                if os.path.isdir(d):
-                    used_dir = used_dir or d
-                    for entry in os.scandir(d):
-                        if entry.is_dir():
-                            skills.add(entry.name)
-            except Exception:
-                continue
+@_tool("web_browse")
+async def _tool_web_browse(db, name: str, args: dict, actor: dict, user_id: str):
+    url = args.get("url", "")
+    if not url:
+        return {"error": "url is required"}
+    try:
+        import sys as _sys, os as _os
+        _zd = _os.path.dirname(_os.path.abspath(__file__))
+        if _zd not in _sys.path:
+            _sys.path.insert(0, _zd)
+        from zoe_agent import _cap_tool_result, _web_browse  # type: ignore[import]
+        result_text = await _web_browse(url, user_id=user_id)
+        # same output cap the brain path applies — a rendered page must not
+        # blow out an MCP client's context either
+        return {"content": _cap_tool_result("web_browse", result_text)}
+    except Exception as exc:
+        logger.warning("mcp web_browse failed: %s", exc)
+        return {"error": f"web_browse failed: {type(exc).__name__}"}
+
+
+@_tool("web_search")
+async def _tool_web_search(db, name: str, args: dict, actor: dict, user_id: str):
+    query = args.get("query", "")
+    if not query:
+        return {"error": "query is required"}
+    try:
+        # Fast path: ddgs primary (~3-5s), CloakBrowser stealth fallback.
+        import sys as _sys, os as _os
+        _zd = _os.path.dirname(_os.path.abspath(__file__))
+        if _zd not in _sys.path:
+            _sys.path.insert(0, _zd)
+        from zoe_agent import _web_search_ddg  # type: ignore[import]
+        caller_user_id = user_id
+        result_text = await _web_search_ddg(query, user_id=caller_user_id)
+        return {"query": query, "raw": result_text}
+    except Exception as exc:
+        return {"error": f"Web search failed: {exc}", "query": query}
+
+
+@_tool("deep_web_research")
+async def _tool_deep_web_research(db, name: str, args: dict, actor: dict, user_id: str):
+    query = args.get("query", "")
+    if not query:
+        return {"error": "query is required"}
+    try:
+        # Full pipeline: CloakBrowser + Google Maps + postcode gate filling (~60s).
+        import sys as _sys, os as _os
+        _zd = _os.path.dirname(_os.path.abspath(__file__))
+        if _zd not in _sys.path:
+            _sys.path.insert(0, _zd)
+        from zoe_agent import _web_research  # type: ignore[import]
+        caller_user_id = user_id
+        result_text = await _web_research(query, user_id=caller_user_id)
+        return {"query": query, "raw": result_text}
+    except Exception as exc:
+        return {"error": f"Deep research failed: {exc}", "query": query}
+
+
+@_tool("a2a_delegate")
+async def _tool_a2a_delegate(db, name: str, args: dict, actor: dict, user_id: str):
+    agent_name = args.get("agent_name", "")
+    task = args.get("task", "")
+    if not agent_name or not task:
+        return {"error": "agent_name and task are required"}
+    if agent_name == "openclaw" and not bool(args.get("allow_openclaw", False)):
         return {
-            "skills": sorted(skills),
-            "count": len(skills),
-            "skills_dir": used_dir or skills_dirs[0],
+            "error": (
+                "OpenClaw is available only as an explicit fallback. "
+                "Set allow_openclaw=true after the user/operator specifically asks for OpenClaw; "
+                "otherwise use agent_name='hermes'."
+            )
         }
-
-    elif name == "web_browse":
-        url = args.get("url", "")
-        if not url:
-            return {"error": "url is required"}
-        try:
-            import sys as _sys, os as _os
-            _zd = _os.path.dirname(_os.path.abspath(__file__))
-            if _zd not in _sys.path:
-                _sys.path.insert(0, _zd)
-            from zoe_agent import _cap_tool_result, _web_browse  # type: ignore[import]
-            result_text = await _web_browse(url, user_id=user_id)
-            # same output cap the brain path applies — a rendered page must not
-            # blow out an MCP client's context either
-            return {"content": _cap_tool_result("web_browse", result_text)}
-        except Exception as exc:
-            logger.warning("mcp web_browse failed: %s", exc)
-            return {"error": f"web_browse failed: {type(exc).__name__}"}
-
-    elif name == "web_search":
-        query = args.get("query", "")
-        if not query:
-            return {"error": "query is required"}
-        try:
-            # Fast path: ddgs primary (~3-5s), CloakBrowser stealth fallback.
-            import sys as _sys, os as _os
-            _zd = _os.path.dirname(_os.path.abspath(__file__))
-            if _zd not in _sys.path:
-                _sys.path.insert(0, _zd)
-            from zoe_agent import _web_search_ddg  # type: ignore[import]
-            caller_user_id = user_id
-            result_text = await _web_search_ddg(query, user_id=caller_user_id)
-            return {"query": query, "raw": result_text}
-        except Exception as exc:
-            return {"error": f"Web search failed: {exc}", "query": query}
-
-    elif name == "deep_web_research":
-        query = args.get("query", "")
-        if not query:
-            return {"error": "query is required"}
-        try:
-            # Full pipeline: CloakBrowser + Google Maps + postcode gate filling (~60s).
-            import sys as _sys, os as _os
-            _zd = _os.path.dirname(_os.path.abspath(__file__))
-            if _zd not in _sys.path:
-                _sys.path.insert(0, _zd)
-            from zoe_agent import _web_research  # type: ignore[import]
-            caller_user_id = user_id
-            result_text = await _web_research(query, user_id=caller_user_id)
-            return {"query": query, "raw": result_text}
-        except Exception as exc:
-            return {"error": f"Deep research failed: {exc}", "query": query}
-
-    elif name == "a2a_delegate":
-        agent_name = args.get("agent_name", "")
-        task = args.get("task", "")
-        if not agent_name or not task:
-            return {"error": "agent_name and task are required"}
-        if agent_name == "openclaw" and not bool(args.get("allow_openclaw", False)):
+    try:
+        if agent_name == "hermes":
+            from background_runner import enqueue_background_task  # type: ignore[import]
+            session_id = args.get("session_id") or None
+            task_id = await enqueue_background_task(
+                task,
+                str(user_id),
+                session_id=str(session_id) if session_id else None,
+                request_depth=int(args.get("request_depth") or 0),
+            )
             return {
-                "error": (
-                    "OpenClaw is available only as an explicit fallback. "
-                    "Set allow_openclaw=true after the user/operator specifically asks for OpenClaw; "
-                    "otherwise use agent_name='hermes'."
-                )
+                "agent": "hermes",
+                "result": {
+                    "status": "queued",
+                    "task_id": task_id,
+                    "result_endpoint": f"/api/agent/tasks/{task_id}",
+                },
             }
-        try:
-            if agent_name == "hermes":
-                from background_runner import enqueue_background_task  # type: ignore[import]
-                session_id = args.get("session_id") or None
-                task_id = await enqueue_background_task(
-                    task,
-                    str(user_id),
-                    session_id=str(session_id) if session_id else None,
-                    request_depth=int(args.get("request_depth") or 0),
-                )
-                return {
-                    "agent": "hermes",
-                    "result": {
-                        "status": "queued",
-                        "task_id": task_id,
-                        "result_endpoint": f"/api/agent/tasks/{task_id}",
-                    },
-                }
-            _reg = _load_agents_registry()
-            _info = _reg.get("agents", {}).get(agent_name)
-            if not _info:
-                return {"error": f"Unknown agent: {agent_name}"}
-            from a2a_client import get_a2a_client  # type: ignore[import]
-            _client = get_a2a_client()
-            result = await _client.submit_task(
-                base_url=_info["base_url"],
-                task=task,
-                caller="zoe-mcp",
-                token=_info.get("a2a_token", ""),
-            )
-            return result
-        except Exception as exc:
-            return {"error": f"Agent delegation failed: {exc}"}
+        _reg = _load_agents_registry()
+        _info = _reg.get("agents", {}).get(agent_name)
+        if not _info:
+            return {"error": f"Unknown agent: {agent_name}"}
+        from a2a_client import get_a2a_client  # type: ignore[import]
+        _client = get_a2a_client()
+        result = await _client.submit_task(
+            base_url=_info["base_url"],
+            task=task,
+            caller="zoe-mcp",
+            token=_info.get("a2a_token", ""),
+        )
+        return result
+    except Exception as exc:
+        return {"error": f"Agent delegation failed: {exc}"}
 
-    elif name == "zoe_sync_knowledge":
-        try:
-            from agent_sync import run_agent_sync  # type: ignore[import]
-            result = await run_agent_sync()
-            return result
-        except Exception as exc:
-            return {"error": f"Agent sync failed: {exc}"}
 
-    elif name == "greptile_pr_status":
-        try:
-            from greptile_client import get_pr_status  # type: ignore[import]
-            return await get_pr_status(
-                repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
-                pr_number=args.get("pr_number"),
-                default_branch=args.get("default_branch") or "main",
-            )
-        except Exception as exc:
-            return {"error": f"Greptile PR status failed: {exc}"}
+@_tool("zoe_sync_knowledge")
+async def _tool_zoe_sync_knowledge(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from agent_sync import run_agent_sync  # type: ignore[import]
+        result = await run_agent_sync()
+        return result
+    except Exception as exc:
+        return {"error": f"Agent sync failed: {exc}"}
 
-    elif name == "greptile_pr_comments":
-        try:
-            from greptile_client import list_pr_comments  # type: ignore[import]
-            return await list_pr_comments(
-                repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
-                pr_number=args.get("pr_number"),
-                default_branch=args.get("default_branch") or "main",
-                greptile_only=bool(args.get("greptile_only", True)),
-                unaddressed_only=bool(args.get("unaddressed_only", True)),
-            )
-        except Exception as exc:
-            return {"error": f"Greptile PR comments failed: {exc}"}
 
-    elif name == "greptile_trigger_review":
-        try:
-            from greploop_guard import trigger_review_with_guard_lock  # type: ignore[import]
-            return await trigger_review_with_guard_lock(
-                repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
-                pr_number=args.get("pr_number"),
-                default_branch=args.get("default_branch") or "main",
-                branch=args.get("branch"),
-                force=bool(args.get("force", False)),
-            )
-        except Exception as exc:
-            return {"error": f"Greptile trigger review failed: {exc}"}
+@_tool("greptile_pr_status")
+async def _tool_greptile_pr_status(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from greptile_client import get_pr_status  # type: ignore[import]
+        return await get_pr_status(
+            repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
+            pr_number=args.get("pr_number"),
+            default_branch=args.get("default_branch") or "main",
+        )
+    except Exception as exc:
+        return {"error": f"Greptile PR status failed: {exc}"}
 
-    elif name == "zoe_self_capabilities":
-        import datetime
-        import glob
-        import json as _json
-        import socket
 
-        # --- services (probe ports) ---
-        def _port_open(host: str, port: int, timeout: float = 0.25) -> bool:
-            try:
-                with socket.create_connection((host, port), timeout=timeout):
-                    return True
-            except Exception:
-                return False
-
-        services = [
-            {"name": "zoe-data",         "port": 8000,  "up": _port_open("127.0.0.1", 8000)},
-            {"name": "zoe-auth",         "port": 8002,  "up": _port_open("127.0.0.1", 8002)},
-            {"name": "hermes-agent",     "port": 8642,  "up": _port_open("127.0.0.1", 8642)},
-            {"name": "llama-server",     "port": 11434, "up": _port_open("127.0.0.1", 11434)},
-            {"name": "openclaw-gateway", "port": 18789, "up": _port_open("127.0.0.1", 18789), "status": "available_not_default"},
-            {"name": "nginx",            "port": 80,    "up": _port_open("127.0.0.1", 80)},
-        ]
+@_tool("greptile_pr_comments")
+async def _tool_greptile_pr_comments(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from greptile_client import list_pr_comments  # type: ignore[import]
+        return await list_pr_comments(
+            repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
+            pr_number=args.get("pr_number"),
+            default_branch=args.get("default_branch") or "main",
+            greptile_only=bool(args.get("greptile_only", True)),
+            unaddressed_only=bool(args.get("unaddressed_only", True)),
+        )
+    except Exception as exc:
+        return {"error": f"Greptile PR comments failed: {exc}"}
+
 
-        # --- active agents — matches zoe_get_status ---
-        agents = _active_agents_list()
+@_tool("greptile_trigger_review")
+async def _tool_greptile_trigger_review(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from greploop_guard import trigger_review_with_guard_lock  # type: ignore[import]
+        return await trigger_review_with_guard_lock(
+            repo=args.get("repo") or "jason-easyazz/zoe-ai-assistant",
+            pr_number=args.get("pr_number"),
+            default_branch=args.get("default_branch") or "main",
+            branch=args.get("branch"),
+            force=bool(args.get("force", False)),
+        )
+    except Exception as exc:
+        return {"error": f"Greptile trigger review failed: {exc}"}
+
+
+@_tool("zoe_self_capabilities")
+async def _tool_zoe_self_capabilities(db, name: str, args: dict, actor: dict, user_id: str):
+    import datetime
+    import glob
+    import json as _json
+    import socket
 
-        # --- widgets from widget-manifest.json ---
-        widgets: list[str] = []
-        manifest_path = "/home/zoe/assistant/services/zoe-ui/dist/js/widgets/widget-manifest.json"
+    # --- services (probe ports) ---
+    def _port_open(host: str, port: int, timeout: float = 0.25) -> bool:
         try:
-            with open(manifest_path, "r", encoding="utf-8") as fh:
-                manifest = _json.load(fh)
-            for entry in manifest.get("widgets", manifest if isinstance(manifest, list) else []):
-                wid = (entry.get("id") if isinstance(entry, dict) else None)
-                if wid:
-                    widgets.append(wid)
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
         except Exception:
-            pass
+            return False
+
+    services = [
+        {"name": "zoe-data",         "port": 8000,  "up": _port_open("127.0.0.1", 8000)},
+        {"name": "zoe-auth",         "port": 8002,  "up": _port_open("127.0.0.1", 8002)},
+        {"name": "hermes-agent",     "port": 8642,  "up": _port_open("127.0.0.1", 8642)},
+        {"name": "llama-server",     "port": 11434, "up": _port_open("127.0.0.1", 11434)},
+        {"name": "openclaw-gateway", "port": 18789, "up": _port_open("127.0.0.1", 18789), "status": "available_not_default"},
+        {"name": "nginx",            "port": 80,    "up": _port_open("127.0.0.1", 80)},
+    ]
+
+    # --- active agents — matches zoe_get_status ---
+    agents = _active_agents_list()
+
+    # --- widgets from widget-manifest.json ---
+    widgets: list[str] = []
+    manifest_path = "/home/zoe/assistant/services/zoe-ui/dist/js/widgets/widget-manifest.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fh:
+            manifest = _json.load(fh)
+        for entry in manifest.get("widgets", manifest if isinstance(manifest, list) else []):
+            wid = (entry.get("id") if isinstance(entry, dict) else None)
+            if wid:
+                widgets.append(wid)
+    except Exception:
+        pass
 
-        # --- pages from dist/*.html + touch/*.html ---
-        dist_root = "/home/zoe/assistant/services/zoe-ui/dist"
-        pages_desktop = sorted(
-            os.path.basename(p) for p in glob.glob(os.path.join(dist_root, "*.html"))
-        )
-        pages_touch = sorted(
-            os.path.basename(p) for p in glob.glob(os.path.join(dist_root, "touch", "*.html"))
-        )
+    # --- pages from dist/*.html + touch/*.html ---
+    dist_root = "/home/zoe/assistant/services/zoe-ui/dist"
+    pages_desktop = sorted(
+        os.path.basename(p) for p in glob.glob(os.path.join(dist_root, "*.html"))
+    )
+    pages_touch = sorted(
+        os.path.basename(p) for p in glob.glob(os.path.join(dist_root, "touch", "*.html"))
+    )
 
-        # --- skills (prefer workspace) ---
-        skills_list: list[str] = []
-        for d in (
-            os.path.expanduser("~/.openclaw/workspace/skills"),
-            os.path.expanduser("~/.openclaw/skills"),
-        ):
-            try:
-                if os.path.isdir(d):
-                    for entry in os.scandir(d):
-                        if entry.is_dir() and entry.name not in skills_list:
-                            skills_list.append(entry.name)
-                    break
-            except Exception:
-                continue
+    # --- skills (prefer workspace) ---
+    skills_list: list[str] = []
+    for d in (
+        os.path.expanduser("~/.openclaw/workspace/skills"),
+        os.path.expanduser("~/.openclaw/skills"),
+    ):
+        try:
+            if os.path.isdir(d):
+                for entry in os.scandir(d):
+                    if entry.is_dir() and entry.name not in skills_list:
+                        skills_list.append(entry.name)
+                break
+        except Exception:
+            continue
 
-        builder_skills_present = [
-            s for s in skills_list
-            if s in ("zoe-widget-builder", "zoe-page-builder", "zoe-capability-extender")
-        ]
+    builder_skills_present = [
+        s for s in skills_list
+        if s in ("zoe-widget-builder", "zoe-page-builder", "zoe-capability-extender")
+    ]
 
-        return {
-            "datetime": datetime.datetime.now().isoformat(),
-            "services": services,
-            "active_agents": agents,
-            "widgets": sorted(widgets),
-            "pages": {"desktop": pages_desktop, "touch": pages_touch},
-            "skills": sorted(skills_list),
-            "builder_skills_installed": sorted(builder_skills_present),
-            "can_build": ["widget", "page", "capability"],
-            "notes": (
-                "Use the builder skills to extend Zoe. "
-                "Admin gate + plan-then-confirm + staged /_preview/ apply."
-            ),
-        }
+    return {
+        "datetime": datetime.datetime.now().isoformat(),
+        "services": services,
+        "active_agents": agents,
+        "widgets": sorted(widgets),
+        "pages": {"desktop": pages_desktop, "touch": pages_touch},
+        "skills": sorted(skills_list),
+        "builder_skills_installed": sorted(builder_skills_present),
+        "can_build": ["widget", "page", "capability"],
+        "notes": (
+            "Use the builder skills to extend Zoe. "
+            "Admin gate + plan-then-confirm + staged /_preview/ apply."
+        ),
+    }
 
-    # === JOURNAL TOOLS ===
-    elif name == "journal_create_entry":
-        eid = str(uuid.uuid4())
-        tags_str = args.get("tags")
-        tags_json = json.dumps([t.strip() for t in tags_str.split(",")]) if tags_str else None
-        await db.execute(
-            """INSERT INTO journal_entries (
-                id, user_id, content, title, mood, mood_score, tags, visibility, deleted
-            ) VALUES (?,?,?,?,?,?,?,'personal',0)""",
-            (eid, user_id, args["content"], args.get("title"), args.get("mood"),
-             args.get("mood_score"), tags_json),
-        )
-        result = {"id": eid, "title": args.get("title"), "mood": args.get("mood")}
-        await _notify_ui("journal", "entry_created", result)
-        try:
-            from routers.journal import _store_journal_memory  # type: ignore
-            await _store_journal_memory(
-                db, user_id,
-                {**result, "content": args["content"], "mood_score": args.get("mood_score")},
-                "created",
-            )
-        except Exception as exc:
-            _mcp_log.info("mcp journal_create_entry memory mirror skipped: %s", exc)
-        return {**result, "status": "created"}
-
-    elif name == "journal_list_entries":
-        limit = args.get("limit", 10)
-        conditions = ["user_id=? AND deleted=0"]
-        params = [user_id]
-        if args.get("start_date"):
-            conditions.append("date(created_at) >= ?")
-            params.append(args["start_date"])
-        if args.get("end_date"):
-            conditions.append("date(created_at) <= ?")
-            params.append(args["end_date"])
-        if args.get("mood"):
-            conditions.append("mood = ?")
-            params.append(args["mood"])
-        if args.get("search"):
-            conditions.append("(title LIKE ? OR content LIKE ?)")
-            p = f"%{args['search']}%"
-            params.extend([p, p])
-        where = " AND ".join(conditions)
-        params.append(limit)
-        cursor = await db.execute(
-            f"SELECT id, title, mood, mood_score, created_at FROM journal_entries WHERE {where} ORDER BY created_at DESC LIMIT ?",
-            params,
-        )
-        rows = await cursor.fetchall()
-        return {"entries": [dict(r) for r in rows]}
 
-    elif name == "journal_get_streak":
-        cursor = await db.execute(
-            "SELECT COUNT(*) FROM journal_entries WHERE user_id=? AND deleted=0",
-            (user_id,),
-        )
-        row = await cursor.fetchone()
-        total = row[0] if row else 0
-        cursor = await db.execute(
-            "SELECT DISTINCT created_at::timestamp::date as d FROM journal_entries WHERE user_id=? AND deleted=0 ORDER BY d DESC",
-            (user_id,),
-        )
-        rows = await cursor.fetchall()
-        # created_at is TEXT in the live schema, so cast text->timestamp->date in
-        # SQL; asyncpg then hands back native date objects. Operate on dates
-        # directly rather than comparing against ISO strings.
-        dates_sorted = sorted(
-            {d for d in (_coerce_date(r[0]) for r in rows) if d is not None},
-            reverse=True,
+# === JOURNAL TOOLS ===
+@_tool("journal_create_entry")
+async def _tool_journal_create_entry(db, name: str, args: dict, actor: dict, user_id: str):
+    eid = str(uuid.uuid4())
+    tags_str = args.get("tags")
+    tags_json = json.dumps([t.strip() for t in tags_str.split(",")]) if tags_str else None
+    await db.execute(
+        """INSERT INTO journal_entries (
+            id, user_id, content, title, mood, mood_score, tags, visibility, deleted
+        ) VALUES (?,?,?,?,?,?,?,'personal',0)""",
+        (eid, user_id, args["content"], args.get("title"), args.get("mood"),
+         args.get("mood_score"), tags_json),
+    )
+    result = {"id": eid, "title": args.get("title"), "mood": args.get("mood")}
+    await _notify_ui("journal", "entry_created", result)
+    try:
+        from routers.journal import _store_journal_memory  # type: ignore
+        await _store_journal_memory(
+            db, user_id,
+            {**result, "content": args["content"], "mood_score": args.get("mood_score")},
+            "created",
         )
-        current_streak = 0
-        longest_streak = 0
-        if dates_sorted:
-            for i, d in enumerate(dates_sorted):
-                if d == date.today() - timedelta(days=i):
-                    current_streak += 1
-                else:
-                    break
-            run = 1
-            for i in range(1, len(dates_sorted)):
-                if (dates_sorted[i - 1] - dates_sorted[i]).days == 1:
-                    run += 1
-                else:
-                    longest_streak = max(longest_streak, run)
-                    run = 1
-            longest_streak = max(longest_streak, run)
-        return {"current_streak": current_streak, "longest_streak": longest_streak, "total_entries": total}
-
-    elif name == "journal_get_prompts":
-        prompts = [
-            "What was the highlight of your day?",
-            "What are you grateful for today?",
-            "What challenged you today, and how did you handle it?",
-            "Describe one thing you learned today.",
-            "How are you feeling right now, and why?",
-            "What would you do differently if you could redo today?",
-            "What made you smile today?",
-            "What are you looking forward to tomorrow?",
-            "Describe a moment of connection you had today.",
-            "What did you do today that you're proud of?",
-        ]
-        return {"prompts": random.sample(prompts, min(5, len(prompts)))}
+    except Exception as exc:
+        _mcp_log.info("mcp journal_create_entry memory mirror skipped: %s", exc)
+    return {**result, "status": "created"}
+
+
+@_tool("journal_list_entries")
+async def _tool_journal_list_entries(db, name: str, args: dict, actor: dict, user_id: str):
+    limit = args.get("limit", 10)
+    conditions = ["user_id=? AND deleted=0"]
+    params = [user_id]
+    if args.get("start_date"):
+        conditions.append("date(created_at) >= ?")
+        params.append(args["start_date"])
+    if args.get("end_date"):
+        conditions.append("date(created_at) <= ?")
+        params.append(args["end_date"])
+    if args.get("mood"):
+        conditions.append("mood = ?")
+        params.append(args["mood"])
+    if args.get("search"):
+        conditions.append("(title LIKE ? OR content LIKE ?)")
+        p = f"%{args['search']}%"
+        params.extend([p, p])
+    where = " AND ".join(conditions)
+    params.append(limit)
+    cursor = await db.execute(
+        f"SELECT id, title, mood, mood_score, created_at FROM journal_entries WHERE {where} ORDER BY created_at DESC LIMIT ?",
+        params,
+    )
+    rows = await cursor.fetchall()
+    return {"entries": [dict(r) for r in rows]}
 
-    elif name == "journal_on_this_day":
-        today_md = date.today().strftime("%m-%d")
-        # created_at is TEXT in the live schema; to_char()/date comparison need a
-        # timestamp, so cast text->timestamp before formatting and before ::date.
-        cursor = await db.execute(
-            """SELECT id, title, mood, created_at FROM journal_entries
-             WHERE user_id=? AND deleted=0 AND to_char(created_at::timestamp, 'MM-DD')=?
-             AND created_at::timestamp::date < CURRENT_DATE ORDER BY created_at DESC""",
-            (user_id, today_md),
-        )
-        rows = await cursor.fetchall()
-        return {"entries": [dict(r) for r in rows]}
-
-    # === TRANSACTION TOOLS ===
-    elif name == "transaction_create":
-        tid = str(uuid.uuid4())
-        tx_date = args.get("transaction_date", date.today().isoformat())
-        tx_type = args.get("type", "expense")
-        await db.execute(
-            """INSERT INTO transactions (
-                id, user_id, description, amount, type, transaction_date,
-                category, payment_method, status, visibility, deleted
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,0)""",
-            (tid, user_id, args["description"], args["amount"], tx_type, tx_date,
-             args.get("category", "general"), args.get("payment_method"),
-             "completed", "family"),
-        )
-        result = {"id": tid, "description": args["description"], "amount": args["amount"],
-                  "type": tx_type, "transaction_date": tx_date}
-        await _notify_ui("transactions", "transaction_created", result)
-        return {**result, "date": tx_date, "status": "created"}
 
-    elif name == "transaction_list":
-        raw_limit = args.get("limit", 20)
-        try:
-            if isinstance(raw_limit, bool):
-                raise ValueError("boolean limit is not valid")
-            limit = int(raw_limit)
-        except (TypeError, ValueError):
-            limit = 20
-        limit = max(1, min(limit, 100))
-        conditions = ["(visibility='family' OR user_id=?) AND deleted=0"]
-        params = [user_id]
-        if args.get("start_date"):
-            conditions.append("transaction_date >= ?")
-            params.append(args["start_date"])
-        if args.get("end_date"):
-            conditions.append("transaction_date <= ?")
-            params.append(args["end_date"])
-        if args.get("type"):
-            conditions.append("type = ?")
-            params.append(args["type"])
-        if args.get("category"):
-            conditions.append("category = ?")
-            params.append(args["category"])
-        where = " AND ".join(conditions)
-        params.append(limit)
-        cursor = await db.execute(
-            f"SELECT id, description, amount, type, transaction_date, category FROM transactions WHERE {where} ORDER BY transaction_date DESC LIMIT ?",
-            params,
-        )
-        rows = await cursor.fetchall()
-        return {"transactions": [dict(r) for r in rows]}
-
-    elif name == "transaction_summary":
-        period = args.get("period", "week")
-        today_d = date.today()
-        if period == "month":
-            start = today_d.replace(day=1)
-        else:
-            start = today_d - timedelta(days=6)
-        start_str = start.isoformat()
-        end_str = today_d.isoformat()
-        cursor = await db.execute(
-            """SELECT type, SUM(amount) as total FROM transactions
-             WHERE (visibility='family' OR user_id=?) AND deleted=0
-             AND transaction_date >= ? AND transaction_date <= ?
-             GROUP BY type""",
-            (user_id, start_str, end_str),
-        )
-        rows = await cursor.fetchall()
-        total_expense = 0
-        total_income = 0
-        for r in rows:
-            d = dict(r)
-            if d["type"] == "expense":
-                total_expense += d["total"]
+@_tool("journal_get_streak")
+async def _tool_journal_get_streak(db, name: str, args: dict, actor: dict, user_id: str):
+    cursor = await db.execute(
+        "SELECT COUNT(*) FROM journal_entries WHERE user_id=? AND deleted=0",
+        (user_id,),
+    )
+    row = await cursor.fetchone()
+    total = row[0] if row else 0
+    cursor = await db.execute(
+        "SELECT DISTINCT created_at::timestamp::date as d FROM journal_entries WHERE user_id=? AND deleted=0 ORDER BY d DESC",
+        (user_id,),
+    )
+    rows = await cursor.fetchall()
+    # created_at is TEXT in the live schema, so cast text->timestamp->date in
+    # SQL; asyncpg then hands back native date objects. Operate on dates
+    # directly rather than comparing against ISO strings.
+    dates_sorted = sorted(
+        {d for d in (_coerce_date(r[0]) for r in rows) if d is not None},
+        reverse=True,
+    )
+    current_streak = 0
+    longest_streak = 0
+    if dates_sorted:
+        for i, d in enumerate(dates_sorted):
+            if d == date.today() - timedelta(days=i):
+                current_streak += 1
             else:
-                total_income += d["total"]
-        return {
-            "period": period, "start_date": start_str, "end_date": end_str,
-            "total_expense": total_expense, "total_income": total_income,
-            "net": total_income - total_expense,
-        }
+                break
+        run = 1
+        for i in range(1, len(dates_sorted)):
+            if (dates_sorted[i - 1] - dates_sorted[i]).days == 1:
+                run += 1
+            else:
+                longest_streak = max(longest_streak, run)
+                run = 1
+        longest_streak = max(longest_streak, run)
+    return {"current_streak": current_streak, "longest_streak": longest_streak, "total_entries": total}
+
+
+@_tool("journal_get_prompts")
+async def _tool_journal_get_prompts(db, name: str, args: dict, actor: dict, user_id: str):
+    prompts = [
+        "What was the highlight of your day?",
+        "What are you grateful for today?",
+        "What challenged you today, and how did you handle it?",
+        "Describe one thing you learned today.",
+        "How are you feeling right now, and why?",
+        "What would you do differently if you could redo today?",
+        "What made you smile today?",
+        "What are you looking forward to tomorrow?",
+        "Describe a moment of connection you had today.",
+        "What did you do today that you're proud of?",
+    ]
+    return {"prompts": random.sample(prompts, min(5, len(prompts)))}
+
+
+@_tool("journal_on_this_day")
+async def _tool_journal_on_this_day(db, name: str, args: dict, actor: dict, user_id: str):
+    today_md = date.today().strftime("%m-%d")
+    # created_at is TEXT in the live schema; to_char()/date comparison need a
+    # timestamp, so cast text->timestamp before formatting and before ::date.
+    cursor = await db.execute(
+        """SELECT id, title, mood, created_at FROM journal_entries
+         WHERE user_id=? AND deleted=0 AND to_char(created_at::timestamp, 'MM-DD')=?
+         AND created_at::timestamp::date < CURRENT_DATE ORDER BY created_at DESC""",
+        (user_id, today_md),
+    )
+    rows = await cursor.fetchall()
+    return {"entries": [dict(r) for r in rows]}
 
-    # === CALENDAR CRUD ===
-    elif name == "calendar_update_event":
-        eid = args["event_id"]
-        cursor = await db.execute("SELECT id FROM events WHERE id=? AND user_id=? AND deleted=0", (eid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Event {eid} not found"}
-        updates, params = [], []
-        for field in ("title", "start_date", "start_time", "end_time", "location", "category"):
-            if field in args:
-                updates.append(f"{field}=?")
-                params.append(args[field])
-        if "all_day" in args:
-            updates.append("all_day=?")
-            params.append(1 if args["all_day"] else 0)
-        if not updates:
-            return {"error": "No fields to update"}
-        updates.append("updated_at=NOW()")
-        params.extend([eid, user_id])
-        await db.execute(f"UPDATE events SET {','.join(updates)} WHERE id=? AND user_id=?", params)
-        await _notify_ui("calendar", "event_updated", {"id": eid})
-        return {"id": eid, "status": "updated"}
-
-    elif name == "calendar_delete_event":
-        eid = args["event_id"]
-        cursor = await db.execute("SELECT id FROM events WHERE id=? AND user_id=? AND deleted=0", (eid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Event {eid} not found"}
-        await db.execute("UPDATE events SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (eid, user_id))
-        await _notify_ui("calendar", "event_deleted", {"id": eid})
-        return {"id": eid, "status": "deleted"}
-
-    # === REMINDER CRUD ===
-    elif name == "reminder_update":
-        rid = args["reminder_id"]
-        cursor = await db.execute("SELECT id FROM reminders WHERE id=? AND user_id=? AND deleted=0", (rid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Reminder {rid} not found"}
-        updates, params = [], []
-        for field in ("title", "due_date", "due_time", "priority"):
-            if field in args:
-                updates.append(f"{field}=?")
-                params.append(args[field])
-        if not updates:
-            return {"error": "No fields to update"}
-        updates.append("updated_at=NOW()")
-        params.extend([rid, user_id])
-        await db.execute(f"UPDATE reminders SET {','.join(updates)} WHERE id=? AND user_id=?", params)
-        await _notify_ui("reminders", "reminder_updated", {"id": rid})
-        return {"id": rid, "status": "updated"}
-
-    elif name == "reminder_delete":
-        rid = args["reminder_id"]
-        cursor = await db.execute("SELECT id FROM reminders WHERE id=? AND user_id=? AND deleted=0", (rid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Reminder {rid} not found"}
-        await db.execute("UPDATE reminders SET deleted=1, is_active=0, updated_at=NOW() WHERE id=? AND user_id=?", (rid, user_id))
-        await _notify_ui("reminders", "reminder_deleted", {"id": rid})
-        # Cancel any unfired proactive_scheduled job linked to this reminder.
-        try:
-            from proactive.triggers.reminders import cancel_reminder as _cancel_reminder
-            async with _pg_get_db() as _pdb:
-                _cur = await _pdb.execute(
-                    "SELECT id FROM proactive_scheduled WHERE item_id=? AND fired=0", (rid,)
-                )
-                _sched_rows = await _cur.fetchall()
-            for _sr in _sched_rows:
-                await _cancel_reminder(_sr["id"])
-        except Exception:
-            pass
-        return {"id": rid, "status": "deleted"}
 
-    elif name == "reminder_snooze":
-        rid = args["reminder_id"]
-        minutes = args.get("minutes", 30)
-        cursor = await db.execute("SELECT id, due_date, due_time FROM reminders WHERE id=? AND deleted=0", (rid,))
-        row = await cursor.fetchone()
-        if not row:
-            return {"error": f"Reminder {rid} not found"}
-        from datetime import timezone as _tz
-        now_utc = datetime.now(_tz.utc)
-        new_time_utc = now_utc + timedelta(minutes=minutes)
-        # Store the snooze time as a local (AWST = UTC+8) wall-clock string so the
-        # reminder scanner and UI show the expected local time.
-        _awst_offset = timedelta(hours=8)
-        new_time_local = new_time_utc + _awst_offset
-        new_date = new_time_local.strftime("%Y-%m-%d")
-        new_time_str = new_time_local.strftime("%H:%M")
-        snoozed_until_iso = new_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
-        await db.execute(
-            "UPDATE reminders SET due_date=?, due_time=?, snoozed_until=?, acknowledged=0, updated_at=NOW() WHERE id=?",
-            (new_date, new_time_str, snoozed_until_iso, rid),
-        )
-        result = {"id": rid, "snoozed_until": snoozed_until_iso}
-        await _notify_ui("reminders", "reminder_snoozed", result)
-        # Cancel existing scheduled job(s) for this reminder; ReminderScanTrigger
-        # will pick it up again after snoozed_until passes.
-        try:
-            from proactive.triggers.reminders import cancel_reminder as _cancel_reminder
-            async with _pg_get_db() as _pdb:
-                _cur = await _pdb.execute(
-                    "SELECT id FROM proactive_scheduled WHERE item_id=? AND fired=0", (rid,)
-                )
-                _sched_rows = await _cur.fetchall()
-            for _sr in _sched_rows:
-                await _cancel_reminder(_sr["id"])
-        except Exception:
-            pass
-        return {**result, "status": "snoozed"}
-
-    # === NOTE CRUD ===
-    elif name == "note_update":
-        nid = args["note_id"]
-        cursor = await db.execute("SELECT id FROM notes WHERE id=? AND user_id=? AND deleted=0", (nid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Note {nid} not found"}
-        updates, params = [], []
-        for field in ("title", "content", "category"):
-            if field in args:
-                updates.append(f"{field}=?")
-                params.append(args[field])
-        if not updates:
-            return {"error": "No fields to update"}
-        updates.append("updated_at=NOW()")
-        params.extend([nid, user_id])
-        await db.execute(f"UPDATE notes SET {','.join(updates)} WHERE id=? AND user_id=?", params)
-        await _notify_ui("notes", "note_updated", {"id": nid})
-        return {"id": nid, "status": "updated"}
-
-    elif name == "note_delete":
-        nid = args["note_id"]
-        cursor = await db.execute("SELECT id FROM notes WHERE id=? AND user_id=? AND deleted=0", (nid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Note {nid} not found"}
-        await db.execute("UPDATE notes SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (nid, user_id))
-        await _notify_ui("notes", "note_deleted", {"id": nid})
-        return {"id": nid, "status": "deleted"}
-
-    # === PEOPLE CRUD ===
-    elif name == "people_update":
-        pid = args["person_id"]
-        cursor = await db.execute("SELECT id FROM people WHERE id=? AND user_id=? AND deleted=0", (pid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Person {pid} not found"}
-        updates, params = [], []
-        for field in ("name", "relationship", "birthday", "phone", "email", "notes"):
-            if field in args:
-                updates.append(f"{field}=?")
-                params.append(args[field])
-        if not updates:
-            return {"error": "No fields to update"}
-        updates.append("updated_at=NOW()")
-        params.extend([pid, user_id])
-        await db.execute(f"UPDATE people SET {','.join(updates)} WHERE id=? AND user_id=?", params)
-        await _notify_ui("all", "people:updated", {"id": pid})
-        return {"id": pid, "status": "updated"}
-
-    elif name == "people_delete":
-        pid = args["person_id"]
-        cursor = await db.execute("SELECT id FROM people WHERE id=? AND user_id=? AND deleted=0", (pid, user_id))
-        if not await cursor.fetchone():
-            return {"error": f"Person {pid} not found"}
-        await db.execute("UPDATE people SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (pid, user_id))
-        await _notify_ui("all", "people:deleted", {"id": pid})
-        return {"id": pid, "status": "deleted"}
-
-    # === NOTIFICATION TOOL ===
-    elif name == "notification_create":
-        nid = str(uuid.uuid4())
-        await db.execute(
-            """INSERT INTO notifications (
-                id, user_id, title, message, type, delivered, created_at
-            ) VALUES (?,?,?,?,?,0,NOW())""",
-            (nid, user_id, args["title"], args["message"],
-             args.get("type", "info")),
-        )
-        result = {"id": nid, "title": args["title"], "message": args["message"],
-                  "type": args.get("type", "info")}
-        await _notify_ui("all", "notification_created", result)
-        return {**result, "status": "created"}
-
-    elif name == "panel_navigate":
-        url = str(args.get("url") or "").strip()
-        if not url or not url.startswith(("http://", "https://")):
-            return {"error": "url must be an http/https URL"}
-        panel_id = args.get("panel_id") or None
-        label = args.get("label") or f"Opening {url[:60]}"
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_navigate",
-            payload={"url": url, "label": label},
-        )
-        return {"ok": True, "action": "panel_navigate", "url": url, "panel_id": panel_id, "queued": msg}
-
-    elif name == "panel_clear":
-        panel_id = args.get("panel_id") or None
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_clear",
-            payload={},
-        )
-        return {"ok": True, "action": "panel_clear", "panel_id": panel_id, "queued": msg}
-
-    elif name == "panel_show_fullscreen":
-        image_b64 = str(args.get("image_base64") or "").strip()
-        if not image_b64:
-            return {"error": "image_base64 is required"}
-        panel_id = args.get("panel_id") or None
-        caption = args.get("caption") or ""
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_show_fullscreen",
-            payload={"image_base64": image_b64, "caption": caption},
-        )
-        return {"ok": True, "action": "panel_show_fullscreen", "panel_id": panel_id, "queued": msg}
+# === TRANSACTION TOOLS ===
+@_tool("transaction_create")
+async def _tool_transaction_create(db, name: str, args: dict, actor: dict, user_id: str):
+    tid = str(uuid.uuid4())
+    tx_date = args.get("transaction_date", date.today().isoformat())
+    tx_type = args.get("type", "expense")
+    await db.execute(
+        """INSERT INTO transactions (
+            id, user_id, description, amount, type, transaction_date,
+            category, payment_method, status, visibility, deleted
+        ) VALUES (?,?,?,?,?,?,?,?,?,?,0)""",
+        (tid, user_id, args["description"], args["amount"], tx_type, tx_date,
+         args.get("category", "general"), args.get("payment_method"),
+         "completed", "family"),
+    )
+    result = {"id": tid, "description": args["description"], "amount": args["amount"],
+              "type": tx_type, "transaction_date": tx_date}
+    await _notify_ui("transactions", "transaction_created", result)
+    return {**result, "date": tx_date, "status": "created"}
+
 
-    elif name == "panel_browser_screenshot":
-        # Screenshot-to-panel via broker-backed executor with normalized evidence.
-        panel_id = args.get("panel_id") or None
-        caption = args.get("caption") or ""
-        navigate_to = args.get("navigate_to") or None
+@_tool("transaction_list")
+async def _tool_transaction_list(db, name: str, args: dict, actor: dict, user_id: str):
+    raw_limit = args.get("limit", 20)
+    try:
+        if isinstance(raw_limit, bool):
+            raise ValueError("boolean limit is not valid")
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        limit = 20
+    limit = max(1, min(limit, 100))
+    conditions = ["(visibility='family' OR user_id=?) AND deleted=0"]
+    params = [user_id]
+    if args.get("start_date"):
+        conditions.append("transaction_date >= ?")
+        params.append(args["start_date"])
+    if args.get("end_date"):
+        conditions.append("transaction_date <= ?")
+        params.append(args["end_date"])
+    if args.get("type"):
+        conditions.append("type = ?")
+        params.append(args["type"])
+    if args.get("category"):
+        conditions.append("category = ?")
+        params.append(args["category"])
+    where = " AND ".join(conditions)
+    params.append(limit)
+    cursor = await db.execute(
+        f"SELECT id, description, amount, type, transaction_date, category FROM transactions WHERE {where} ORDER BY transaction_date DESC LIMIT ?",
+        params,
+    )
+    rows = await cursor.fetchall()
+    return {"transactions": [dict(r) for r in rows]}
+
+
+@_tool("transaction_summary")
+async def _tool_transaction_summary(db, name: str, args: dict, actor: dict, user_id: str):
+    period = args.get("period", "week")
+    today_d = date.today()
+    if period == "month":
+        start = today_d.replace(day=1)
+    else:
+        start = today_d - timedelta(days=6)
+    start_str = start.isoformat()
+    end_str = today_d.isoformat()
+    cursor = await db.execute(
+        """SELECT type, SUM(amount) as total FROM transactions
+         WHERE (visibility='family' OR user_id=?) AND deleted=0
+         AND transaction_date >= ? AND transaction_date <= ?
+         GROUP BY type""",
+        (user_id, start_str, end_str),
+    )
+    rows = await cursor.fetchall()
+    total_expense = 0
+    total_income = 0
+    for r in rows:
+        d = dict(r)
+        if d["type"] == "expense":
+            total_expense += d["total"]
+        else:
+            total_income += d["total"]
+    return {
+        "period": period, "start_date": start_str, "end_date": end_str,
+        "total_expense": total_expense, "total_income": total_income,
+        "net": total_income - total_expense,
+    }
+
+
+# === CALENDAR CRUD ===
+@_tool("calendar_update_event")
+async def _tool_calendar_update_event(db, name: str, args: dict, actor: dict, user_id: str):
+    eid = args["event_id"]
+    cursor = await db.execute("SELECT id FROM events WHERE id=? AND user_id=? AND deleted=0", (eid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Event {eid} not found"}
+    updates, params = [], []
+    for field in ("title", "start_date", "start_time", "end_time", "location", "category"):
+        if field in args:
+            updates.append(f"{field}=?")
+            params.append(args[field])
+    if "all_day" in args:
+        updates.append("all_day=?")
+        params.append(1 if args["all_day"] else 0)
+    if not updates:
+        return {"error": "No fields to update"}
+    updates.append("updated_at=NOW()")
+    params.extend([eid, user_id])
+    await db.execute(f"UPDATE events SET {','.join(updates)} WHERE id=? AND user_id=?", params)
+    await _notify_ui("calendar", "event_updated", {"id": eid})
+    return {"id": eid, "status": "updated"}
+
+
+@_tool("calendar_delete_event")
+async def _tool_calendar_delete_event(db, name: str, args: dict, actor: dict, user_id: str):
+    eid = args["event_id"]
+    cursor = await db.execute("SELECT id FROM events WHERE id=? AND user_id=? AND deleted=0", (eid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Event {eid} not found"}
+    await db.execute("UPDATE events SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (eid, user_id))
+    await _notify_ui("calendar", "event_deleted", {"id": eid})
+    return {"id": eid, "status": "deleted"}
+
+
+# === REMINDER CRUD ===
+@_tool("reminder_update")
+async def _tool_reminder_update(db, name: str, args: dict, actor: dict, user_id: str):
+    rid = args["reminder_id"]
+    cursor = await db.execute("SELECT id FROM reminders WHERE id=? AND user_id=? AND deleted=0", (rid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Reminder {rid} not found"}
+    updates, params = [], []
+    for field in ("title", "due_date", "due_time", "priority"):
+        if field in args:
+            updates.append(f"{field}=?")
+            params.append(args[field])
+    if not updates:
+        return {"error": "No fields to update"}
+    updates.append("updated_at=NOW()")
+    params.extend([rid, user_id])
+    await db.execute(f"UPDATE reminders SET {','.join(updates)} WHERE id=? AND user_id=?", params)
+    await _notify_ui("reminders", "reminder_updated", {"id": rid})
+    return {"id": rid, "status": "updated"}
+
+
+@_tool("reminder_delete")
+async def _tool_reminder_delete(db, name: str, args: dict, actor: dict, user_id: str):
+    rid = args["reminder_id"]
+    cursor = await db.execute("SELECT id FROM reminders WHERE id=? AND user_id=? AND deleted=0", (rid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Reminder {rid} not found"}
+    await db.execute("UPDATE reminders SET deleted=1, is_active=0, updated_at=NOW() WHERE id=? AND user_id=?", (rid, user_id))
+    await _notify_ui("reminders", "reminder_deleted", {"id": rid})
+    # Cancel any unfired proactive_scheduled job linked to this reminder.
+    try:
+        from proactive.triggers.reminders import cancel_reminder as _cancel_reminder
+        async with _pg_get_db() as _pdb:
+            _cur = await _pdb.execute(
+                "SELECT id FROM proactive_scheduled WHERE item_id=? AND fired=0", (rid,)
+            )
+            _sched_rows = await _cur.fetchall()
+        for _sr in _sched_rows:
+            await _cancel_reminder(_sr["id"])
+    except Exception:
+        pass
+    return {"id": rid, "status": "deleted"}
+
+
+@_tool("reminder_snooze")
+async def _tool_reminder_snooze(db, name: str, args: dict, actor: dict, user_id: str):
+    rid = args["reminder_id"]
+    minutes = args.get("minutes", 30)
+    cursor = await db.execute("SELECT id, due_date, due_time FROM reminders WHERE id=? AND deleted=0", (rid,))
+    row = await cursor.fetchone()
+    if not row:
+        return {"error": f"Reminder {rid} not found"}
+    from datetime import timezone as _tz
+    now_utc = datetime.now(_tz.utc)
+    new_time_utc = now_utc + timedelta(minutes=minutes)
+    # Store the snooze time as a local (AWST = UTC+8) wall-clock string so the
+    # reminder scanner and UI show the expected local time.
+    _awst_offset = timedelta(hours=8)
+    new_time_local = new_time_utc + _awst_offset
+    new_date = new_time_local.strftime("%Y-%m-%d")
+    new_time_str = new_time_local.strftime("%H:%M")
+    snoozed_until_iso = new_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
+    await db.execute(
+        "UPDATE reminders SET due_date=?, due_time=?, snoozed_until=?, acknowledged=0, updated_at=NOW() WHERE id=?",
+        (new_date, new_time_str, snoozed_until_iso, rid),
+    )
+    result = {"id": rid, "snoozed_until": snoozed_until_iso}
+    await _notify_ui("reminders", "reminder_snoozed", result)
+    # Cancel existing scheduled job(s) for this reminder; ReminderScanTrigger
+    # will pick it up again after snoozed_until passes.
+    try:
+        from proactive.triggers.reminders import cancel_reminder as _cancel_reminder
+        async with _pg_get_db() as _pdb:
+            _cur = await _pdb.execute(
+                "SELECT id FROM proactive_scheduled WHERE item_id=? AND fired=0", (rid,)
+            )
+            _sched_rows = await _cur.fetchall()
+        for _sr in _sched_rows:
+            await _cancel_reminder(_sr["id"])
+    except Exception:
+        pass
+    return {**result, "status": "snoozed"}
+
+
+# === NOTE CRUD ===
+@_tool("note_update")
+async def _tool_note_update(db, name: str, args: dict, actor: dict, user_id: str):
+    nid = args["note_id"]
+    cursor = await db.execute("SELECT id FROM notes WHERE id=? AND user_id=? AND deleted=0", (nid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Note {nid} not found"}
+    updates, params = [], []
+    for field in ("title", "content", "category"):
+        if field in args:
+            updates.append(f"{field}=?")
+            params.append(args[field])
+    if not updates:
+        return {"error": "No fields to update"}
+    updates.append("updated_at=NOW()")
+    params.extend([nid, user_id])
+    await db.execute(f"UPDATE notes SET {','.join(updates)} WHERE id=? AND user_id=?", params)
+    await _notify_ui("notes", "note_updated", {"id": nid})
+    return {"id": nid, "status": "updated"}
+
+
+@_tool("note_delete")
+async def _tool_note_delete(db, name: str, args: dict, actor: dict, user_id: str):
+    nid = args["note_id"]
+    cursor = await db.execute("SELECT id FROM notes WHERE id=? AND user_id=? AND deleted=0", (nid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Note {nid} not found"}
+    await db.execute("UPDATE notes SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (nid, user_id))
+    await _notify_ui("notes", "note_deleted", {"id": nid})
+    return {"id": nid, "status": "deleted"}
+
+
+# === PEOPLE CRUD ===
+@_tool("people_update")
+async def _tool_people_update(db, name: str, args: dict, actor: dict, user_id: str):
+    pid = args["person_id"]
+    cursor = await db.execute("SELECT id FROM people WHERE id=? AND user_id=? AND deleted=0", (pid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Person {pid} not found"}
+    updates, params = [], []
+    for field in ("name", "relationship", "birthday", "phone", "email", "notes"):
+        if field in args:
+            updates.append(f"{field}=?")
+            params.append(args[field])
+    if not updates:
+        return {"error": "No fields to update"}
+    updates.append("updated_at=NOW()")
+    params.extend([pid, user_id])
+    await db.execute(f"UPDATE people SET {','.join(updates)} WHERE id=? AND user_id=?", params)
+    await _notify_ui("all", "people:updated", {"id": pid})
+    return {"id": pid, "status": "updated"}
+
+
+@_tool("people_delete")
+async def _tool_people_delete(db, name: str, args: dict, actor: dict, user_id: str):
+    pid = args["person_id"]
+    cursor = await db.execute("SELECT id FROM people WHERE id=? AND user_id=? AND deleted=0", (pid, user_id))
+    if not await cursor.fetchone():
+        return {"error": f"Person {pid} not found"}
+    await db.execute("UPDATE people SET deleted=1, updated_at=NOW() WHERE id=? AND user_id=?", (pid, user_id))
+    await _notify_ui("all", "people:deleted", {"id": pid})
+    return {"id": pid, "status": "deleted"}
+
+
+# === NOTIFICATION TOOL ===
+@_tool("notification_create")
+async def _tool_notification_create(db, name: str, args: dict, actor: dict, user_id: str):
+    nid = str(uuid.uuid4())
+    await db.execute(
+        """INSERT INTO notifications (
+            id, user_id, title, message, type, delivered, created_at
+        ) VALUES (?,?,?,?,?,0,NOW())""",
+        (nid, user_id, args["title"], args["message"],
+         args.get("type", "info")),
+    )
+    result = {"id": nid, "title": args["title"], "message": args["message"],
+              "type": args.get("type", "info")}
+    await _notify_ui("all", "notification_created", result)
+    return {**result, "status": "created"}
+
+
+@_tool("panel_navigate")
+async def _tool_panel_navigate(db, name: str, args: dict, actor: dict, user_id: str):
+    url = str(args.get("url") or "").strip()
+    if not url or not url.startswith(("http://", "https://")):
+        return {"error": "url must be an http/https URL"}
+    panel_id = args.get("panel_id") or None
+    label = args.get("label") or f"Opening {url[:60]}"
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_navigate",
+        payload={"url": url, "label": label},
+    )
+    return {"ok": True, "action": "panel_navigate", "url": url, "panel_id": panel_id, "queued": msg}
+
+
+@_tool("panel_clear")
+async def _tool_panel_clear(db, name: str, args: dict, actor: dict, user_id: str):
+    panel_id = args.get("panel_id") or None
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_clear",
+        payload={},
+    )
+    return {"ok": True, "action": "panel_clear", "panel_id": panel_id, "queued": msg}
+
+
+@_tool("panel_show_fullscreen")
+async def _tool_panel_show_fullscreen(db, name: str, args: dict, actor: dict, user_id: str):
+    image_b64 = str(args.get("image_base64") or "").strip()
+    if not image_b64:
+        return {"error": "image_base64 is required"}
+    panel_id = args.get("panel_id") or None
+    caption = args.get("caption") or ""
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_show_fullscreen",
+        payload={"image_base64": image_b64, "caption": caption},
+    )
+    return {"ok": True, "action": "panel_show_fullscreen", "panel_id": panel_id, "queued": msg}
+
+
+@_tool("panel_browser_screenshot")
+async def _tool_panel_browser_screenshot(db, name: str, args: dict, actor: dict, user_id: str):
+    # Screenshot-to-panel via broker-backed executor with normalized evidence.
+    panel_id = args.get("panel_id") or None
+    caption = args.get("caption") or ""
+    navigate_to = args.get("navigate_to") or None
+    if navigate_to:
+        # SSRF guard on the browser nav target. The navigation runs in the
+        # Hermes-owned broker (out-of-process), so we cannot attach a Playwright
+        # route guard here for per-redirect-hop interception. Panels are LAN
+        # display devices, so we CONSTRAIN the INITIAL navigate_to to an allowed
+        # private-LAN panel host — we never ASK the broker to load
+        # loopback/metadata/public. (Public-website screenshots go through
+        # cloakbrowser_screenshot, which has the per-hop route guard.)
+        #
+        # ACCEPTED RESIDUAL: an allowed LAN page could itself 30x to
+        # loopback/metadata *inside the broker*; closing that requires the
+        # broker to enforce redirect-hop validation (its own route guard /
+        # CDP). That is broker-side and out of scope for this in-process diff.
+        # Documented in agent_safety.guard_browser_page + services/zoe-data/AGENTS.md.
+        try:
+            assert_panel_url(str(navigate_to))
+        except SSRFBlocked as exc:
+            return {"ok": False, "error": f"blocked: {exc}"}
+    plan = _BROWSER_BROKER.plan_action(
+        action="capture_screenshot",
+        params={
+            "navigate_to": navigate_to or "",
+            "timeout_s": 15.0,
+            "screenshot_timeout_s": 20.0,
+        },
+        user_id=user_id,
+        session_id=f"mcp:{name}",
+        action_class="read_only_research",
+        requested_surface="hermesCloak",
+    )
+    broker_result = await _BROWSER_BROKER.execute(plan)
+    if not broker_result.get("ok"):
+        # Graceful fallback: still navigate panel if URL exists.
         if navigate_to:
-            # SSRF guard on the browser nav target. The navigation runs in the
-            # Hermes-owned broker (out-of-process), so we cannot attach a Playwright
-            # route guard here for per-redirect-hop interception. Panels are LAN
-            # display devices, so we CONSTRAIN the INITIAL navigate_to to an allowed
-            # private-LAN panel host — we never ASK the broker to load
-            # loopback/metadata/public. (Public-website screenshots go through
-            # cloakbrowser_screenshot, which has the per-hop route guard.)
-            #
-            # ACCEPTED RESIDUAL: an allowed LAN page could itself 30x to
-            # loopback/metadata *inside the broker*; closing that requires the
-            # broker to enforce redirect-hop validation (its own route guard /
-            # CDP). That is broker-side and out of scope for this in-process diff.
-            # Documented in agent_safety.guard_browser_page + services/zoe-data/AGENTS.md.
-            try:
-                assert_panel_url(str(navigate_to))
-            except SSRFBlocked as exc:
-                return {"ok": False, "error": f"blocked: {exc}"}
-        plan = _BROWSER_BROKER.plan_action(
-            action="capture_screenshot",
-            params={
-                "navigate_to": navigate_to or "",
-                "timeout_s": 15.0,
-                "screenshot_timeout_s": 20.0,
-            },
-            user_id=user_id,
-            session_id=f"mcp:{name}",
-            action_class="read_only_research",
-            requested_surface="hermesCloak",
-        )
-        broker_result = await _BROWSER_BROKER.execute(plan)
-        if not broker_result.get("ok"):
-            # Graceful fallback: still navigate panel if URL exists.
-            if navigate_to:
-                fallback_msg = await _enqueue_panel_tool(
-                    db,
-                    user_id_fallback=user_id,
-                    panel_id=panel_id,
-                    action_type="panel_navigate",
-                    payload={
-                        "url": navigate_to,
-                        "label": caption or "Browser screenshot unavailable — showing live page instead",
-                    },
-                )
-                return {
-                    "ok": False,
-                    "degraded_mode": True,
-                    "error": broker_result.get("error", "Screenshot failed"),
-                    "backend": broker_result.get("surface", "hermesCloak"),
-                    "plan_id": broker_result.get("plan_id"),
-                    "fallback_action": "panel_navigate",
-                    "queued": fallback_msg,
-                }
+            fallback_msg = await _enqueue_panel_tool(
+                db,
+                user_id_fallback=user_id,
+                panel_id=panel_id,
+                action_type="panel_navigate",
+                payload={
+                    "url": navigate_to,
+                    "label": caption or "Browser screenshot unavailable — showing live page instead",
+                },
+            )
             return {
+                "ok": False,
+                "degraded_mode": True,
                 "error": broker_result.get("error", "Screenshot failed"),
                 "backend": broker_result.get("surface", "hermesCloak"),
                 "plan_id": broker_result.get("plan_id"),
+                "fallback_action": "panel_navigate",
+                "queued": fallback_msg,
             }
-        image_b64 = str(broker_result.get("image_base64") or "").strip()
-        if not image_b64:
-            return {"error": "No screenshot data in broker response", "backend": "hermesCloak"}
-
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_show_fullscreen",
-            payload={"image_base64": image_b64, "caption": caption or (f"Browser view: {navigate_to}" if navigate_to else "Browser view")},
-        )
         return {
-            "ok": True,
-            "action": "panel_browser_screenshot",
-            "panel_id": panel_id,
-            "queued": msg,
+            "error": broker_result.get("error", "Screenshot failed"),
             "backend": broker_result.get("surface", "hermesCloak"),
             "plan_id": broker_result.get("plan_id"),
-            "evidence": broker_result.get("evidence", {}),
         }
+    image_b64 = str(broker_result.get("image_base64") or "").strip()
+    if not image_b64:
+        return {"error": "No screenshot data in broker response", "backend": "hermesCloak"}
+
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_show_fullscreen",
+        payload={"image_base64": image_b64, "caption": caption or (f"Browser view: {navigate_to}" if navigate_to else "Browser view")},
+    )
+    return {
+        "ok": True,
+        "action": "panel_browser_screenshot",
+        "panel_id": panel_id,
+        "queued": msg,
+        "backend": broker_result.get("surface", "hermesCloak"),
+        "plan_id": broker_result.get("plan_id"),
+        "evidence": broker_result.get("evidence", {}),
+    }
 
-    elif name == "browser_get_capabilities":
+
+@_tool("browser_get_capabilities")
+async def _tool_browser_get_capabilities(db, name: str, args: dict, actor: dict, user_id: str):
+    return {
+        "ok": True,
+        "default_backend": _BROWSER_BROKER.default_surface(),
+        "capabilities": _BROWSER_BROKER.capabilities(),
+    }
+
+
+@_tool("browser_compare_backends")
+async def _tool_browser_compare_backends(db, name: str, args: dict, actor: dict, user_id: str):
+    report = _BROWSER_BROKER.compare_backends()
+    return {"ok": True, **report}
+
+
+@_tool("cloakbrowser_fetch")
+async def _tool_cloakbrowser_fetch(db, name: str, args: dict, actor: dict, user_id: str):
+    url = str(args.get("url") or "").strip()
+    if not url.startswith(("http://", "https://")):
+        return {"ok": False, "error": "url must start with http:// or https://"}
+    try:
+        assert_public_url(url)  # SSRF guard: block private/loopback/metadata targets
+    except SSRFBlocked as exc:
+        return {"ok": False, "error": f"blocked: {exc}"}
+    text_limit = int(args.get("text_limit") or 4000)
+    wait_until = str(args.get("wait_until") or "domcontentloaded")
+    try:
+        from cloakbrowser import launch_context_async  # type: ignore[import]
+    except ImportError:
+        return {"ok": False, "error": "cloakbrowser_not_installed"}
+    context = await launch_context_async(headless=True)
+    try:
+        page = await context.new_page()
+        # SSRF: validate EVERY request/redirect hop pre-connect (a public URL
+        # may 30x to an internal/metadata host); aborts the route before connect.
+        await guard_browser_page(page)
+        await page.goto(url, wait_until=wait_until, timeout=30000)
+        title = await page.title()
+        try:
+            text = await page.locator("body").inner_text(timeout=5000)
+        except Exception:
+            text = ""
+        if len(text) > text_limit:
+            text = text[:text_limit] + "\n...[truncated]"
         return {
             "ok": True,
-            "default_backend": _BROWSER_BROKER.default_surface(),
-            "capabilities": _BROWSER_BROKER.capabilities(),
+            "url": url,
+            "final_url": page.url,
+            "title": title,
+            "text": text,
+            "backend": _BROWSER_BROKER.default_surface(),
         }
+    except Exception as exc:
+        return {"ok": False, "error": f"CloakBrowser fetch failed: {exc}"}
+    finally:
+        await context.close()
 
-    elif name == "browser_compare_backends":
-        report = _BROWSER_BROKER.compare_backends()
-        return {"ok": True, **report}
 
-    elif name == "cloakbrowser_fetch":
-        url = str(args.get("url") or "").strip()
-        if not url.startswith(("http://", "https://")):
-            return {"ok": False, "error": "url must start with http:// or https://"}
-        try:
-            assert_public_url(url)  # SSRF guard: block private/loopback/metadata targets
-        except SSRFBlocked as exc:
-            return {"ok": False, "error": f"blocked: {exc}"}
-        text_limit = int(args.get("text_limit") or 4000)
-        wait_until = str(args.get("wait_until") or "domcontentloaded")
-        try:
-            from cloakbrowser import launch_context_async  # type: ignore[import]
-        except ImportError:
-            return {"ok": False, "error": "cloakbrowser_not_installed"}
-        context = await launch_context_async(headless=True)
-        try:
-            page = await context.new_page()
-            # SSRF: validate EVERY request/redirect hop pre-connect (a public URL
-            # may 30x to an internal/metadata host); aborts the route before connect.
-            await guard_browser_page(page)
-            await page.goto(url, wait_until=wait_until, timeout=30000)
-            title = await page.title()
-            try:
-                text = await page.locator("body").inner_text(timeout=5000)
-            except Exception:
-                text = ""
-            if len(text) > text_limit:
-                text = text[:text_limit] + "\n...[truncated]"
-            return {
-                "ok": True,
-                "url": url,
-                "final_url": page.url,
-                "title": title,
-                "text": text,
-                "backend": _BROWSER_BROKER.default_surface(),
-            }
-        except Exception as exc:
-            return {"ok": False, "error": f"CloakBrowser fetch failed: {exc}"}
-        finally:
-            await context.close()
-
-    elif name == "cloakbrowser_screenshot":
-        url = str(args.get("url") or "").strip()
-        if not url.startswith(("http://", "https://")):
-            return {"ok": False, "error": "url must start with http:// or https://"}
-        try:
-            assert_public_url(url)  # SSRF guard: block private/loopback/metadata targets
-        except SSRFBlocked as exc:
-            return {"ok": False, "error": f"blocked: {exc}"}
-        wait_until = str(args.get("wait_until") or "domcontentloaded")
-        full_page = bool(args.get("full_page", False))
-        try:
-            from cloakbrowser import launch_context_async  # type: ignore[import]
-        except ImportError:
-            return {"ok": False, "error": "cloakbrowser_not_installed"}
-        context = await launch_context_async(headless=True)
-        try:
-            page = await context.new_page()
-            # SSRF: validate every request/redirect hop pre-connect (see above).
-            await guard_browser_page(page)
-            await page.goto(url, wait_until=wait_until, timeout=30000)
-            screenshot = await page.screenshot(type="png", full_page=full_page)
-            import base64 as _base64
-            return {
-                "ok": True,
-                "url": url,
-                "final_url": page.url,
-                "image_base64": _base64.b64encode(screenshot).decode("ascii"),
-                "backend": _BROWSER_BROKER.default_surface(),
-            }
-        except Exception as exc:
-            return {"ok": False, "error": f"CloakBrowser screenshot failed: {exc}"}
-        finally:
-            await context.close()
-
-    elif name == "panel_announce":
-        message = str(args.get("message") or "").strip()
-        if not message:
-            return {"error": "message is required"}
-        panel_id = args.get("panel_id") or "all"
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_announce",
-            payload={"message": message},
-        )
-        return {"ok": True, "action": "panel_announce", "panel_id": panel_id, "message": message, "queued": msg}
-
-    elif name == "panel_request_auth":
-        panel_id = str(args.get("panel_id") or "").strip()
-        action_context = str(args.get("action_context") or "Authorise action").strip()
-        if not panel_id:
-            return {"error": "panel_id is required"}
-        from routers.panel_auth import create_pin_challenge_internal
-
-        result = await create_pin_challenge_internal(
-            panel_id=panel_id,
-            user_id=user_id,
-            action_context={"message": action_context},
-            db=db,
-        )
+@_tool("cloakbrowser_screenshot")
+async def _tool_cloakbrowser_screenshot(db, name: str, args: dict, actor: dict, user_id: str):
+    url = str(args.get("url") or "").strip()
+    if not url.startswith(("http://", "https://")):
+        return {"ok": False, "error": "url must start with http:// or https://"}
+    try:
+        assert_public_url(url)  # SSRF guard: block private/loopback/metadata targets
+    except SSRFBlocked as exc:
+        return {"ok": False, "error": f"blocked: {exc}"}
+    wait_until = str(args.get("wait_until") or "domcontentloaded")
+    full_page = bool(args.get("full_page", False))
+    try:
+        from cloakbrowser import launch_context_async  # type: ignore[import]
+    except ImportError:
+        return {"ok": False, "error": "cloakbrowser_not_installed"}
+    context = await launch_context_async(headless=True)
+    try:
+        page = await context.new_page()
+        # SSRF: validate every request/redirect hop pre-connect (see above).
+        await guard_browser_page(page)
+        await page.goto(url, wait_until=wait_until, timeout=30000)
+        screenshot = await page.screenshot(type="png", full_page=full_page)
+        import base64 as _base64
         return {
             "ok": True,
-            "challenge_id": result["challenge_id"],
-            "panel_id": panel_id,
-            "expires_at": result["expires_at"],
-            "note": "Show PIN pad to user; call panel_check_auth to confirm approval.",
+            "url": url,
+            "final_url": page.url,
+            "image_base64": _base64.b64encode(screenshot).decode("ascii"),
+            "backend": _BROWSER_BROKER.default_surface(),
         }
+    except Exception as exc:
+        return {"ok": False, "error": f"CloakBrowser screenshot failed: {exc}"}
+    finally:
+        await context.close()
+
+
+@_tool("panel_announce")
+async def _tool_panel_announce(db, name: str, args: dict, actor: dict, user_id: str):
+    message = str(args.get("message") or "").strip()
+    if not message:
+        return {"error": "message is required"}
+    panel_id = args.get("panel_id") or "all"
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_announce",
+        payload={"message": message},
+    )
+    return {"ok": True, "action": "panel_announce", "panel_id": panel_id, "message": message, "queued": msg}
+
+
+@_tool("panel_request_auth")
+async def _tool_panel_request_auth(db, name: str, args: dict, actor: dict, user_id: str):
+    panel_id = str(args.get("panel_id") or "").strip()
+    action_context = str(args.get("action_context") or "Authorise action").strip()
+    if not panel_id:
+        return {"error": "panel_id is required"}
+    from routers.panel_auth import create_pin_challenge_internal
+
+    result = await create_pin_challenge_internal(
+        panel_id=panel_id,
+        user_id=user_id,
+        action_context={"message": action_context},
+        db=db,
+    )
+    return {
+        "ok": True,
+        "challenge_id": result["challenge_id"],
+        "panel_id": panel_id,
+        "expires_at": result["expires_at"],
+        "note": "Show PIN pad to user; call panel_check_auth to confirm approval.",
+    }
 
-    elif name == "panel_check_auth":
-        challenge_id = str(args.get("challenge_id") or "").strip()
-        if not challenge_id:
-            return {"error": "challenge_id is required"}
-        row = await (await db.execute(
-            "SELECT status, expires_at FROM panel_auth_challenges WHERE challenge_id = ?", (challenge_id,)
-        )).fetchone()
-        if not row:
-            return {"error": "Challenge not found"}
-        return {"challenge_id": challenge_id, "status": row["status"], "expires_at": row["expires_at"]}
-
-    elif name == "panel_set_mode":
-        mode = str(args.get("mode") or "ambient").strip()
-        panel_id = args.get("panel_id") or None
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_set_mode",
-            payload={"mode": mode},
-        )
-        return {"ok": True, "action": "panel_set_mode", "mode": mode, "panel_id": panel_id, "queued": msg}
-
-    elif name == "panel_show_smart_home":
-        panel_id = args.get("panel_id") or None
-        entities = args.get("entities") or []
-        title = args.get("title") or "Smart Home"
-        dismiss_after = int(args.get("dismiss_after") or 30)
-        # If no entities supplied, fetch from HA bridge
-        if not entities:
-            _ha_bridge = os.environ.get("ZOE_HA_BRIDGE_URL", "http://127.0.0.1:8007")
-            try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    r = await client.get(f"{_ha_bridge}/entities")
-                    if r.status_code == 200:
-                        all_ents = r.json()
-                        if isinstance(all_ents, list):
-                            all_ents = all_ents
-                        elif isinstance(all_ents, dict):
-                            all_ents = all_ents.get("entities", [])
-                        # Filter to actionable domains
-                        entities = [
-                            e for e in all_ents
-                            if str(e.get("entity_id", "")).startswith(("light.", "switch.", "input_boolean."))
-                        ][:12]  # Cap at 12 for UI
-            except Exception:
-                pass
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_show_smart_home",
-            payload={"entities": entities, "title": title, "dismiss_after": dismiss_after},
-        )
-        return {"ok": True, "action": "panel_show_smart_home", "entity_count": len(entities), "panel_id": panel_id, "queued": msg}
-
-    elif name == "panel_show_media":
-        panel_id = args.get("panel_id") or None
-        payload = {k: v for k, v in args.items() if k != "panel_id"}
-        msg = await _enqueue_panel_tool(
-            db,
-            user_id_fallback=user_id,
-            panel_id=panel_id,
-            action_type="panel_show_media",
-            payload=payload,
-        )
-        return {"ok": True, "action": "panel_show_media", "panel_id": panel_id, "queued": msg}
-
-    elif name == "panel_ssh_exec":
-        target_panel_id = str(args.get("panel_id") or "").strip()
-        command = str(args.get("command") or "").strip()
-        timeout = min(int(args.get("timeout") or 30), 120)
-        if not target_panel_id or not command:
-            return {"error": "panel_id and command are required"}
-
-        row = await (await db.execute(
-            "SELECT ip_address, ssh_user, ssh_key_path, ssh_port FROM panels WHERE panel_id = ?",
-            (target_panel_id,),
-        )).fetchone()
-        if not row:
-            return {"error": f"Panel '{target_panel_id}' not found in registry. Call GET /api/panels to list panels."}
-
-        ip = row["ip_address"]
-        ssh_user = row["ssh_user"] or "pi"
-        ssh_key_path = row["ssh_key_path"] or os.path.expanduser("~/.ssh/zoe_pi_key")
-        ssh_port = str(row["ssh_port"] or 22)
-
-        if not ip:
-            return {"error": f"Panel '{target_panel_id}' has no ip_address in registry"}
-
-        ssh_args = [
-            "ssh",
-            "-o", "StrictHostKeyChecking=no",
-            "-o", "ConnectTimeout=10",
-            "-o", "BatchMode=yes",
-            "-p", ssh_port,
-        ]
-        if os.path.exists(ssh_key_path):
-            ssh_args += ["-i", ssh_key_path]
 
-        ssh_args += [f"{ssh_user}@{ip}", command]
-        _mcp_log.info("panel_ssh_exec: panel=%s ip=%s", target_panel_id, ip)
+@_tool("panel_check_auth")
+async def _tool_panel_check_auth(db, name: str, args: dict, actor: dict, user_id: str):
+    challenge_id = str(args.get("challenge_id") or "").strip()
+    if not challenge_id:
+        return {"error": "challenge_id is required"}
+    row = await (await db.execute(
+        "SELECT status, expires_at FROM panel_auth_challenges WHERE challenge_id = ?", (challenge_id,)
+    )).fetchone()
+    if not row:
+        return {"error": "Challenge not found"}
+    return {"challenge_id": challenge_id, "status": row["status"], "expires_at": row["expires_at"]}
+
+
+@_tool("panel_set_mode")
+async def _tool_panel_set_mode(db, name: str, args: dict, actor: dict, user_id: str):
+    mode = str(args.get("mode") or "ambient").strip()
+    panel_id = args.get("panel_id") or None
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_set_mode",
+        payload={"mode": mode},
+    )
+    return {"ok": True, "action": "panel_set_mode", "mode": mode, "panel_id": panel_id, "queued": msg}
 
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *ssh_args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout_b, stderr_b = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-            return {
-                "panel_id": target_panel_id,
-                "command": command,
-                "exit_code": proc.returncode,
-                "stdout": stdout_b.decode(errors="replace").strip(),
-                "stderr": stderr_b.decode(errors="replace").strip(),
-            }
-        except asyncio.TimeoutError:
-            try:
-                proc.kill()
-            except Exception:
-                pass
-            return {"error": f"SSH command timed out after {timeout}s", "panel_id": target_panel_id}
-        except Exception as exc:
-            return {"error": f"SSH exec failed: {exc}", "panel_id": target_panel_id}
-
-    elif name == "media_get_now_playing":
-        entity_id = str(args.get("entity_id") or "").strip()
+
+@_tool("panel_show_smart_home")
+async def _tool_panel_show_smart_home(db, name: str, args: dict, actor: dict, user_id: str):
+    panel_id = args.get("panel_id") or None
+    entities = args.get("entities") or []
+    title = args.get("title") or "Smart Home"
+    dismiss_after = int(args.get("dismiss_after") or 30)
+    # If no entities supplied, fetch from HA bridge
+    if not entities:
         _ha_bridge = os.environ.get("ZOE_HA_BRIDGE_URL", "http://127.0.0.1:8007")
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                if entity_id:
-                    r = await client.get(f"{_ha_bridge}/state/{entity_id}")
-                    r.raise_for_status()
-                    state = r.json()
-                    attrs = state.get("attributes") or {}
-                    return {
-                        "entity_id": entity_id,
-                        "state": state.get("state"),
+            async with http_clients.session("home_assistant", timeout=5.0) as client:
+                r = await client.get(f"{_ha_bridge}/entities")
+                if r.status_code == 200:
+                    all_ents = r.json()
+                    if isinstance(all_ents, list):
+                        all_ents = all_ents
+                    elif isinstance(all_ents, dict):
+                        all_ents = all_ents.get("entities", [])
+                    # Filter to actionable domains
+                    entities = [
+                        e for e in all_ents
+                        if str(e.get("entity_id", "")).startswith(("light.", "switch.", "input_boolean."))
+                    ][:12]  # Cap at 12 for UI
+        except Exception:
+            pass
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_show_smart_home",
+        payload={"entities": entities, "title": title, "dismiss_after": dismiss_after},
+    )
+    return {"ok": True, "action": "panel_show_smart_home", "entity_count": len(entities), "panel_id": panel_id, "queued": msg}
+
+
+@_tool("panel_show_media")
+async def _tool_panel_show_media(db, name: str, args: dict, actor: dict, user_id: str):
+    panel_id = args.get("panel_id") or None
+    payload = {k: v for k, v in args.items() if k != "panel_id"}
+    msg = await _enqueue_panel_tool(
+        db,
+        user_id_fallback=user_id,
+        panel_id=panel_id,
+        action_type="panel_show_media",
+        payload=payload,
+    )
+    return {"ok": True, "action": "panel_show_media", "panel_id": panel_id, "queued": msg}
+
+
+@_tool("panel_ssh_exec")
+async def _tool_panel_ssh_exec(db, name: str, args: dict, actor: dict, user_id: str):
+    target_panel_id = str(args.get("panel_id") or "").strip()
+    command = str(args.get("command") or "").strip()
+    timeout = min(int(args.get("timeout") or 30), 120)
+    if not target_panel_id or not command:
+        return {"error": "panel_id and command are required"}
+
+    row = await (await db.execute(
+        "SELECT ip_address, ssh_user, ssh_key_path, ssh_port FROM panels WHERE panel_id = ?",
+        (target_panel_id,),
+    )).fetchone()
+    if not row:
+        return {"error": f"Panel '{target_panel_id}' not found in registry. Call GET /api/panels to list panels."}
+
+    ip = row["ip_address"]
+    ssh_user = row["ssh_user"] or "pi"
+    ssh_key_path = row["ssh_key_path"] or os.path.expanduser("~/.ssh/zoe_pi_key")
+    ssh_port = str(row["ssh_port"] or 22)
+
+    if not ip:
+        return {"error": f"Panel '{target_panel_id}' has no ip_address in registry"}
+
+    ssh_args = [
+        "ssh",
+        "-o", "StrictHostKeyChecking=no",
+        "-o", "ConnectTimeout=10",
+        "-o", "BatchMode=yes",
+        "-p", ssh_port,
+    ]
+    if os.path.exists(ssh_key_path):
+        ssh_args += ["-i", ssh_key_path]
+
+    ssh_args += [f"{ssh_user}@{ip}", command]
+    _mcp_log.info("panel_ssh_exec: panel=%s ip=%s", target_panel_id, ip)
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *ssh_args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout_b, stderr_b = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        return {
+            "panel_id": target_panel_id,
+            "command": command,
+            "exit_code": proc.returncode,
+            "stdout": stdout_b.decode(errors="replace").strip(),
+            "stderr": stderr_b.decode(errors="replace").strip(),
+        }
+    except asyncio.TimeoutError:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        return {"error": f"SSH command timed out after {timeout}s", "panel_id": target_panel_id}
+    except Exception as exc:
+        return {"error": f"SSH exec failed: {exc}", "panel_id": target_panel_id}
+
+
+@_tool("media_get_now_playing")
+async def _tool_media_get_now_playing(db, name: str, args: dict, actor: dict, user_id: str):
+    entity_id = str(args.get("entity_id") or "").strip()
+    _ha_bridge = os.environ.get("ZOE_HA_BRIDGE_URL", "http://127.0.0.1:8007")
+    try:
+        async with http_clients.session("home_assistant", timeout=5.0) as client:
+            if entity_id:
+                r = await client.get(f"{_ha_bridge}/state/{entity_id}")
+                r.raise_for_status()
+                state = r.json()
+                attrs = state.get("attributes") or {}
+                return {
+                    "entity_id": entity_id,
+                    "state": state.get("state"),
+                    "title": attrs.get("media_title"),
+                    "artist": attrs.get("media_artist"),
+                    "album": attrs.get("media_album_name"),
+                    "album_art": attrs.get("entity_picture"),
+                    "volume": attrs.get("volume_level"),
+                }
+            else:
+                r = await client.get(f"{_ha_bridge}/entities")
+                r.raise_for_status()
+                ents = r.json()
+                if isinstance(ents, dict):
+                    ents = ents.get("entities", [])
+                players = [e for e in ents if str(e.get("entity_id", "")).startswith("media_player.")]
+                results = []
+                for p in players:
+                    attrs = p.get("attributes") or {}
+                    results.append({
+                        "entity_id": p.get("entity_id"),
+                        "state": p.get("state"),
                         "title": attrs.get("media_title"),
                         "artist": attrs.get("media_artist"),
-                        "album": attrs.get("media_album_name"),
                         "album_art": attrs.get("entity_picture"),
-                        "volume": attrs.get("volume_level"),
-                    }
-                else:
-                    r = await client.get(f"{_ha_bridge}/entities")
-                    r.raise_for_status()
-                    ents = r.json()
-                    if isinstance(ents, dict):
-                        ents = ents.get("entities", [])
-                    players = [e for e in ents if str(e.get("entity_id", "")).startswith("media_player.")]
-                    results = []
-                    for p in players:
-                        attrs = p.get("attributes") or {}
-                        results.append({
-                            "entity_id": p.get("entity_id"),
-                            "state": p.get("state"),
-                            "title": attrs.get("media_title"),
-                            "artist": attrs.get("media_artist"),
-                            "album_art": attrs.get("entity_picture"),
-                        })
-                    return {"players": results}
-        except Exception as exc:
-            return {"error": f"HA bridge error: {exc}"}
-
-    elif name == "ambient_search":
-        query = str(args.get("query", "")).strip()
-        if not query:
-            return {"error": "query is required"}
-        room = args.get("room")
-        speaker_id = args.get("speaker_id")
-        date_from = args.get("date_from")
-        date_to = args.get("date_to")
-        limit = min(int(args.get("limit", 10)), 50)
-
-        # Build WHERE clause for base table filters.
-        # Use explicit $N params for PostgreSQL tsvector FTS.
-        pg_params: list = [query]  # $1 = tsquery text
-        param_idx = 2  # next placeholder index
-        # Mandatory user scoping (P-F4): ambient transcripts are only readable
-        # by their owning user — always filter on the caller's resolved user.
-        conditions = [f"m.user_id = ${param_idx}"]
-        pg_params.append(user_id)
+                    })
+                return {"players": results}
+    except Exception as exc:
+        return {"error": f"HA bridge error: {exc}"}
+
+
+@_tool("ambient_search")
+async def _tool_ambient_search(db, name: str, args: dict, actor: dict, user_id: str):
+    query = str(args.get("query", "")).strip()
+    if not query:
+        return {"error": "query is required"}
+    room = args.get("room")
+    speaker_id = args.get("speaker_id")
+    date_from = args.get("date_from")
+    date_to = args.get("date_to")
+    limit = min(int(args.get("limit", 10)), 50)
+
+    # Build WHERE clause for base table filters.
+    # Use explicit $N params for PostgreSQL tsvector FTS.
+    pg_params: list = [query]  # $1 = tsquery text
+    param_idx = 2  # next placeholder index
+    # Mandatory user scoping (P-F4): ambient transcripts are only readable
+    # by their owning user — always filter on the caller's resolved user.
+    conditions = [f"m.user_id = ${param_idx}"]
+    pg_params.append(user_id)
+    param_idx += 1
+    if room:
+        conditions.append(f"m.room = ${param_idx}")
+        pg_params.append(room)
         param_idx += 1
-        if room:
-            conditions.append(f"m.room = ${param_idx}")
-            pg_params.append(room)
-            param_idx += 1
-        if speaker_id:
-            conditions.append(f"m.speaker_id = ${param_idx}")
-            pg_params.append(speaker_id)
-            param_idx += 1
-        if date_from:
-            conditions.append(f"m.timestamp >= ${param_idx}")
-            pg_params.append(date_from)
-            param_idx += 1
-        if date_to:
-            conditions.append(f"m.timestamp <= ${param_idx}")
-            pg_params.append(date_to)
-            param_idx += 1
-        pg_params.append(limit)
-        limit_idx = param_idx
-
-        where = ("AND " + " AND ".join(conditions)) if conditions else ""
-        sql = f"""
-            SELECT m.id, m.timestamp, m.panel_id, m.room, m.speaker_id, m.transcript
-            FROM ambient_memory m
-            WHERE m.search_vector @@ plainto_tsquery('english', $1)
-            {where}
-            ORDER BY ts_rank(m.search_vector, plainto_tsquery('english', $1)) DESC
-            LIMIT ${limit_idx}
-        """
-        try:
-            from db_pool import get_db_ctx as _raw_pg_get_db
-            async with _raw_pg_get_db() as _raw_conn:
-                rows = await _raw_conn.fetch(sql, *pg_params)
-            results = [
-                {
-                    "id": r["id"],
-                    "timestamp": str(r["timestamp"]) if r["timestamp"] else None,
-                    "panel_id": r["panel_id"],
-                    "room": r["room"],
-                    "speaker_id": r["speaker_id"],
-                    "transcript": r["transcript"],
-                }
-                for r in rows
-            ]
-            return {"results": results, "count": len(results), "query": query}
-        except Exception as exc:
-            return {"error": f"ambient_search failed: {exc}"}
-
-    # === PROACTIVE ENGINE ============================================
-    elif name == "proactive_schedule":
-        from datetime import datetime as _dt_cls, timezone as _tz
-        msg_text = (args.get("message") or "").strip()
-        send_at_str = (args.get("send_at") or "").strip()
-        target_uid = _authorized_target_user(actor, args.get("user_id"), name)
-        if not msg_text:
-            return {"error": "message is required"}
-        if not send_at_str:
-            return {"error": "send_at is required"}
-        try:
-            send_at_dt = _dt_cls.fromisoformat(send_at_str.replace("Z", "+00:00"))
-        except ValueError:
-            return {"error": "send_at must be ISO-8601 UTC"}
-        if send_at_dt <= _dt_cls.now(_tz.utc):
-            return {"error": "send_at must be in the future"}
+    if speaker_id:
+        conditions.append(f"m.speaker_id = ${param_idx}")
+        pg_params.append(speaker_id)
+        param_idx += 1
+    if date_from:
+        conditions.append(f"m.timestamp >= ${param_idx}")
+        pg_params.append(date_from)
+        param_idx += 1
+    if date_to:
+        conditions.append(f"m.timestamp <= ${param_idx}")
+        pg_params.append(date_to)
+        param_idx += 1
+    pg_params.append(limit)
+    limit_idx = param_idx
+
+    where = ("AND " + " AND ".join(conditions)) if conditions else ""
+    sql = f"""
+        SELECT m.id, m.timestamp, m.panel_id, m.room, m.speaker_id, m.transcript
+        FROM ambient_memory m
+        WHERE m.search_vector @@ plainto_tsquery('english', $1)
+        {where}
+        ORDER BY ts_rank(m.search_vector, plainto_tsquery('english', $1)) DESC
+        LIMIT ${limit_idx}
+    """
+    try:
+        from db_pool import get_db_ctx as _raw_pg_get_db
+        async with _raw_pg_get_db() as _raw_conn:
+            rows = await _raw_conn.fetch(sql, *pg_params)
+        results = [
+            {
+                "id": r["id"],
+                "timestamp": str(r["timestamp"]) if r["timestamp"] else None,
+                "panel_id": r["panel_id"],
+                "room": r["room"],
+                "speaker_id": r["speaker_id"],
+                "transcript": r["transcript"],
+            }
+            for r in rows
+        ]
+        return {"results": results, "count": len(results), "query": query}
+    except Exception as exc:
+        return {"error": f"ambient_search failed: {exc}"}
+
+
+# === PROACTIVE ENGINE ============================================
+@_tool("proactive_schedule")
+async def _tool_proactive_schedule(db, name: str, args: dict, actor: dict, user_id: str):
+    from datetime import datetime as _dt_cls, timezone as _tz
+    msg_text = (args.get("message") or "").strip()
+    send_at_str = (args.get("send_at") or "").strip()
+    target_uid = _authorized_target_user(actor, args.get("user_id"), name)
+    if not msg_text:
+        return {"error": "message is required"}
+    if not send_at_str:
+        return {"error": "send_at is required"}
+    try:
+        send_at_dt = _dt_cls.fromisoformat(send_at_str.replace("Z", "+00:00"))
+    except ValueError:
+        return {"error": "send_at must be ISO-8601 UTC"}
+    if send_at_dt <= _dt_cls.now(_tz.utc):
+        return {"error": "send_at must be in the future"}
+    try:
+        from proactive.triggers.reminders import schedule_reminder
+        scheduled_id = await schedule_reminder(
+            user_id=target_uid,
+            message=msg_text,
+            send_at=send_at_dt,
+        )
+        return {"id": scheduled_id, "send_at": send_at_str, "status": "scheduled"}
+    except Exception as _pe:
+        return {"error": f"proactive_schedule failed: {_pe}"}
+
+
+# === USER PORTRAIT ================================================
+@_tool("user_portrait_get")
+async def _tool_user_portrait_get(db, name: str, args: dict, actor: dict, user_id: str):
+    target_uid = _authorized_target_user(actor, args.get("user_id"), name)
+    try:
+        from user_portrait import load_portrait  # type: ignore[import]
+        portrait = await load_portrait(target_uid)
+        return {
+            "user_id": target_uid,
+            "portrait": portrait,
+            "has_portrait": bool(portrait),
+        }
+    except Exception as exc:
+        return {"error": f"portrait load failed: {exc}"}
+
+
+# === MEMORY TOOLS ================================================
+@_tool("memory_add", "memory_search", "memory_list", "memory_review", "memory_forget")
+async def _tool_memory(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from memory_service import MemoryServiceError, get_memory_service
+    except Exception as exc:
+        return {"error": f"memory service unavailable: {exc}"}
+    svc = get_memory_service()
+
+    if name == "memory_add":
+        content = (args.get("content") or "").strip()
+        if not content:
+            return {"error": "content required"}
         try:
-            from proactive.triggers.reminders import schedule_reminder
-            scheduled_id = await schedule_reminder(
-                user_id=target_uid,
-                message=msg_text,
-                send_at=send_at_dt,
+            ref = await svc.ingest(
+                content,
+                user_id=user_id,
+                source="mcp",
+                memory_type=args.get("memory_type", "fact"),
+                confidence=float(args.get("confidence", 0.85)),
+                status=args.get("status", "approved"),
+                tags=list(args.get("tags") or []),
+                entity_type=args.get("entity_type"),
+                entity_id=args.get("entity_id"),
+                expires_at=args.get("expires_at"),
             )
-            return {"id": scheduled_id, "send_at": send_at_str, "status": "scheduled"}
-        except Exception as _pe:
-            return {"error": f"proactive_schedule failed: {_pe}"}
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        if ref is None:
+            return {"status": "skipped", "reason": "duplicate_or_filtered"}
+        return {
+            "id": ref.id,
+            "status": ref.metadata.get("status", "approved"),
+            "created": True,
+        }
 
-    # === USER PORTRAIT ================================================
-    elif name == "user_portrait_get":
-        target_uid = _authorized_target_user(actor, args.get("user_id"), name)
+    if name == "memory_search":
+        query = (args.get("query") or "").strip()
+        if not query:
+            return {"error": "query required"}
+        limit = max(1, min(int(args.get("limit") or 8), 50))
         try:
-            from user_portrait import load_portrait  # type: ignore[import]
-            portrait = await load_portrait(target_uid)
-            return {
-                "user_id": target_uid,
-                "portrait": portrait,
-                "has_portrait": bool(portrait),
-            }
-        except Exception as exc:
-            return {"error": f"portrait load failed: {exc}"}
-
-    # === MEMORY TOOLS ================================================
-    elif name in {"memory_add", "memory_search", "memory_list", "memory_review", "memory_forget"}:
+            refs = await svc.search(query, user_id=user_id, limit=limit)
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        mtype_filter = (args.get("memory_type") or "").strip().lower()
+        results = []
+        for r in refs:
+            md = r.metadata or {}
+            if mtype_filter and (md.get("memory_type") or "").lower() != mtype_filter:
+                continue
+            results.append({
+                "id": r.id,
+                "content": r.text,
+                "memory_type": md.get("memory_type"),
+                "confidence": md.get("confidence"),
+                "status": md.get("status"),
+                "score": getattr(r, "score", None),
+            })
+        return {"results": results, "count": len(results)}
+
+    if name == "memory_list":
+        status = (args.get("status") or "pending").lower()
+        limit = max(1, min(int(args.get("limit") or 25), 200))
         try:
-            from memory_service import MemoryServiceError, get_memory_service
-        except Exception as exc:
-            return {"error": f"memory service unavailable: {exc}"}
-        svc = get_memory_service()
-
-        if name == "memory_add":
-            content = (args.get("content") or "").strip()
-            if not content:
-                return {"error": "content required"}
-            try:
-                ref = await svc.ingest(
-                    content,
-                    user_id=user_id,
-                    source="mcp",
-                    memory_type=args.get("memory_type", "fact"),
-                    confidence=float(args.get("confidence", 0.85)),
-                    status=args.get("status", "approved"),
-                    tags=list(args.get("tags") or []),
-                    entity_type=args.get("entity_type"),
-                    entity_id=args.get("entity_id"),
-                    expires_at=args.get("expires_at"),
-                )
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            if ref is None:
-                return {"status": "skipped", "reason": "duplicate_or_filtered"}
-            return {
-                "id": ref.id,
-                "status": ref.metadata.get("status", "approved"),
-                "created": True,
-            }
-
-        if name == "memory_search":
-            query = (args.get("query") or "").strip()
-            if not query:
-                return {"error": "query required"}
-            limit = max(1, min(int(args.get("limit") or 8), 50))
-            try:
-                refs = await svc.search(query, user_id=user_id, limit=limit)
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            mtype_filter = (args.get("memory_type") or "").strip().lower()
-            results = []
-            for r in refs:
-                md = r.metadata or {}
-                if mtype_filter and (md.get("memory_type") or "").lower() != mtype_filter:
-                    continue
-                results.append({
+            refs = await svc.list_by_status(user_id=user_id, status=status, limit=limit)
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        return {
+            "status": status,
+            "count": len(refs),
+            "items": [
+                {
                     "id": r.id,
                     "content": r.text,
-                    "memory_type": md.get("memory_type"),
-                    "confidence": md.get("confidence"),
-                    "status": md.get("status"),
-                    "score": getattr(r, "score", None),
-                })
-            return {"results": results, "count": len(results)}
-
-        if name == "memory_list":
-            status = (args.get("status") or "pending").lower()
-            limit = max(1, min(int(args.get("limit") or 25), 200))
-            try:
-                refs = await svc.list_by_status(user_id=user_id, status=status, limit=limit)
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            return {
-                "status": status,
-                "count": len(refs),
-                "items": [
-                    {
-                        "id": r.id,
-                        "content": r.text,
-                        "memory_type": (r.metadata or {}).get("memory_type"),
-                        "confidence": (r.metadata or {}).get("confidence"),
-                        "status": (r.metadata or {}).get("status"),
-                        "created_at": (r.metadata or {}).get("created_at"),
-                    }
-                    for r in refs
-                ],
-            }
-
-        if name == "memory_review":
-            mem_id = args.get("memory_id") or ""
-            decision = (args.get("decision") or "").lower()
-            if not mem_id or decision not in {"approve", "reject", "edit"}:
-                return {"error": "memory_id and decision=(approve|reject|edit) required"}
-            # Ownership check: svc.get resolves the row; MemoryService.review
-            # also audits, but we want a friendly error rather than a raise.
-            try:
-                existing = await svc.get(mem_id)
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            if existing is None:
-                return {"error": "memory not found"}
-            if (existing.metadata or {}).get("user_id") != user_id:
-                # No role info on the MCP path; strict mode → deny.
-                return {"error": "forbidden: memory belongs to another user"}
-            try:
-                ref = await svc.review(
-                    mem_id,
-                    decision=decision,
-                    actor=user_id,
-                    edits=args.get("edits"),
-                    note=args.get("note"),
-                )
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            return {
-                "id": ref.id,
-                "status": (ref.metadata or {}).get("status"),
-                "decision": decision,
-            }
-
-        if name == "memory_forget":
-            mem_id = args.get("memory_id") or ""
-            if not mem_id:
-                return {"error": "memory_id required"}
-            try:
-                existing = await svc.get(mem_id)
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            if existing is None:
-                return {"status": "not_found"}
-            if (existing.metadata or {}).get("user_id") != user_id:
-                return {"error": "forbidden: memory belongs to another user"}
-            try:
-                await svc.review(
-                    mem_id,
-                    decision="reject",
-                    actor=user_id,
-                    note=args.get("note") or "memory_forget",
-                )
-            except MemoryServiceError as exc:
-                return {"error": str(exc)}
-            return {"id": mem_id, "status": "rejected"}
+                    "memory_type": (r.metadata or {}).get("memory_type"),
+                    "confidence": (r.metadata or {}).get("confidence"),
+                    "status": (r.metadata or {}).get("status"),
+                    "created_at": (r.metadata or {}).get("created_at"),
+                }
+                for r in refs
+            ],
+        }
 
-    # === MULTICA BOARD TOOLS ============================================
-    elif name == "list_board_issues":
+    if name == "memory_review":
+        mem_id = args.get("memory_id") or ""
+        decision = (args.get("decision") or "").lower()
+        if not mem_id or decision not in {"approve", "reject", "edit"}:
+            return {"error": "memory_id and decision=(approve|reject|edit) required"}
+        # Ownership check: svc.get resolves the row; MemoryService.review
+        # also audits, but we want a friendly error rather than a raise.
         try:
-            from multica_client import get_multica_client  # type: ignore[import]
-            mc = get_multica_client()
-            if not mc.is_configured():
-                return {"error": "Multica not configured"}
-            status_filter = args.get("status", "todo")
-            issues = await mc.list_issues(status=status_filter)
-            limit = min(int(args.get("limit", 50)), 100)
-            issues = issues[:limit]
-            return {"issues": issues, "count": len(issues)}
-        except Exception as exc:
-            return {"error": f"list_board_issues failed: {exc}"}
-
-    elif name == "update_board_issue":
+            existing = await svc.get(mem_id)
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        if existing is None:
+            return {"error": "memory not found"}
+        if (existing.metadata or {}).get("user_id") != user_id:
+            # No role info on the MCP path; strict mode → deny.
+            return {"error": "forbidden: memory belongs to another user"}
         try:
-            from multica_client import get_multica_client  # type: ignore[import]
-            mc = get_multica_client()
-            if not mc.is_configured():
-                return {"error": "Multica not configured"}
-            issue_id = (args.get("issue_id") or "").strip()
-            if not issue_id:
-                return {"error": "issue_id required"}
-            update: dict = {}
-            if args.get("status"):
-                update["status"] = args["status"]
-            if args.get("description"):
-                update["description"] = args["description"]
-            if not update:
-                return {"error": "At least one of status or description required"}
-            await mc.update_issue(issue_id, **update)
-            return {"ok": True, "issue_id": issue_id, "updated": update}
-        except Exception as exc:
-            return {"error": f"update_board_issue failed: {exc}"}
-
-    elif name == "create_evolution_proposal":
-        try:
-            from multica_client import sync_evolution_proposal_to_multica  # type: ignore[import]
-            from zoe_evolution_runtime_intake import build_mcp_runtime_evolution_proposal_intake  # type: ignore[import]
-            import time as _time
-            title = (args.get("title") or "").strip()
-            description = (args.get("description") or "").strip()
-            if not title or not description:
-                return {"error": "title and description required"}
-            evidence = (args.get("evidence") or "").strip()
-            prop_id = str(uuid.uuid4()).replace("-", "")
-            proposal_user_id = (
-                str(user_id).strip()
-                if actor.get("explicit") or actor.get("source") == "legacy_fallback"
-                else None
+            ref = await svc.review(
+                mem_id,
+                decision=decision,
+                actor=user_id,
+                edits=args.get("edits"),
+                note=args.get("note"),
             )
-            intake = build_mcp_runtime_evolution_proposal_intake(
-                proposal_id=prop_id,
-                title=title,
-                description=description,
-                evidence=evidence,
-                proposal_type=args.get("proposal_type", "intent_pattern"),
-                user_id=proposal_user_id,
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        return {
+            "id": ref.id,
+            "status": (ref.metadata or {}).get("status"),
+            "decision": decision,
+        }
+
+    if name == "memory_forget":
+        mem_id = args.get("memory_id") or ""
+        if not mem_id:
+            return {"error": "memory_id required"}
+        try:
+            existing = await svc.get(mem_id)
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        if existing is None:
+            return {"status": "not_found"}
+        if (existing.metadata or {}).get("user_id") != user_id:
+            return {"error": "forbidden: memory belongs to another user"}
+        try:
+            await svc.review(
+                mem_id,
+                decision="reject",
+                actor=user_id,
+                note=args.get("note") or "memory_forget",
             )
-            row_payload = intake.to_legacy_row()
+        except MemoryServiceError as exc:
+            return {"error": str(exc)}
+        return {"id": mem_id, "status": "rejected"}
+
+
+# === MULTICA BOARD TOOLS ============================================
+@_tool("list_board_issues")
+async def _tool_list_board_issues(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from multica_client import get_multica_client  # type: ignore[import]
+        mc = get_multica_client()
+        if not mc.is_configured():
+            return {"error": "Multica not configured"}
+        status_filter = args.get("status", "todo")
+        issues = await mc.list_issues(status=status_filter)
+        limit = min(int(args.get("limit", 50)), 100)
+        issues = issues[:limit]
+        return {"issues": issues, "count": len(issues)}
+    except Exception as exc:
+        return {"error": f"list_board_issues failed: {exc}"}
+
+
+@_tool("update_board_issue")
+async def _tool_update_board_issue(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from multica_client import get_multica_client  # type: ignore[import]
+        mc = get_multica_client()
+        if not mc.is_configured():
+            return {"error": "Multica not configured"}
+        issue_id = (args.get("issue_id") or "").strip()
+        if not issue_id:
+            return {"error": "issue_id required"}
+        update: dict = {}
+        if args.get("status"):
+            update["status"] = args["status"]
+        if args.get("description"):
+            update["description"] = args["description"]
+        if not update:
+            return {"error": "At least one of status or description required"}
+        await mc.update_issue(issue_id, **update)
+        return {"ok": True, "issue_id": issue_id, "updated": update}
+    except Exception as exc:
+        return {"error": f"update_board_issue failed: {exc}"}
+
+
+@_tool("create_evolution_proposal")
+async def _tool_create_evolution_proposal(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from multica_client import sync_evolution_proposal_to_multica  # type: ignore[import]
+        from zoe_evolution_runtime_intake import build_mcp_runtime_evolution_proposal_intake  # type: ignore[import]
+        import time as _time
+        title = (args.get("title") or "").strip()
+        description = (args.get("description") or "").strip()
+        if not title or not description:
+            return {"error": "title and description required"}
+        evidence = (args.get("evidence") or "").strip()
+        prop_id = str(uuid.uuid4()).replace("-", "")
+        proposal_user_id = (
+            str(user_id).strip()
+            if actor.get("explicit") or actor.get("source") == "legacy_fallback"
+            else None
+        )
+        intake = build_mcp_runtime_evolution_proposal_intake(
+            proposal_id=prop_id,
+            title=title,
+            description=description,
+            evidence=evidence,
+            proposal_type=args.get("proposal_type", "intent_pattern"),
+            user_id=proposal_user_id,
+        )
+        row_payload = intake.to_legacy_row()
+        await db.execute(
+            """INSERT INTO evolution_proposals
+               (id, title, description, evidence, target_patterns, type, status, proposed_at)
+               VALUES ($1,$2,$3,$4,$5,$6,'pending',$7)""",
+            row_payload["id"],
+            row_payload["title"],
+            row_payload["description"],
+            row_payload["evidence"],
+            row_payload["target_patterns"],
+            row_payload["type"],
+            _time.time(),
+        )
+        multica_payload = dict(intake.multica_payload)
+        multica_id = await sync_evolution_proposal_to_multica(**multica_payload)
+        if multica_id:
             await db.execute(
-                """INSERT INTO evolution_proposals
-                   (id, title, description, evidence, target_patterns, type, status, proposed_at)
-                   VALUES ($1,$2,$3,$4,$5,$6,'pending',$7)""",
-                row_payload["id"],
-                row_payload["title"],
-                row_payload["description"],
-                row_payload["evidence"],
-                row_payload["target_patterns"],
-                row_payload["type"],
-                _time.time(),
+                "UPDATE evolution_proposals SET multica_issue_id=$1 WHERE id=$2",
+                multica_id, row_payload["id"],
             )
-            multica_payload = dict(intake.multica_payload)
-            multica_id = await sync_evolution_proposal_to_multica(**multica_payload)
-            if multica_id:
-                await db.execute(
-                    "UPDATE evolution_proposals SET multica_issue_id=$1 WHERE id=$2",
-                    multica_id, row_payload["id"],
-                )
-            return {
-                "ok": True,
-                "proposal_id": row_payload["id"],
-                "multica_issue_id": multica_id,
-                "contract_schema": "zoe_evolution_proposal",
-            }
-        except Exception as exc:
-            _mcp_log.warning(
-                "create_evolution_proposal failed — proposal NOT stored: %s", exc)
-            return {"error": f"create_evolution_proposal failed: {exc}"}
+        return {
+            "ok": True,
+            "proposal_id": row_payload["id"],
+            "multica_issue_id": multica_id,
+            "contract_schema": "zoe_evolution_proposal",
+        }
+    except Exception as exc:
+        _mcp_log.warning(
+            "create_evolution_proposal failed — proposal NOT stored: %s", exc)
+        return {"error": f"create_evolution_proposal failed: {exc}"}
+
 
-    elif name == "flag_needs_human_review":
+@_tool("flag_needs_human_review")
+async def _tool_flag_needs_human_review(db, name: str, args: dict, actor: dict, user_id: str):
+    try:
+        from multica_client import get_multica_client  # type: ignore[import]
+        mc = get_multica_client()
+        issue_id = (args.get("issue_id") or "").strip()
+        reason = (args.get("reason") or "Flagged for human review").strip()
+        urgency = args.get("urgency", "normal")
+        if issue_id and mc.is_configured():
+            # Append reason to the issue description
+            async with http_clients.session("multica", timeout=15) as hc:
+                resp = await hc.get(
+                    f"{mc._base}/api/issues/{issue_id}",
+                    headers=mc._headers(),
+                )
+                current_desc = resp.json().get("description", "") if resp.status_code == 200 else ""
+            await mc.update_issue(issue_id, description=f"{current_desc}\n\n⚠️ Needs human review: {reason}")
+        # Fire a push notification.
+        # fire_notification returns None in EVERY path (sent, deferred, or
+        # suppressed-by-quiet-hours alike) and raises only on error — it never
+        # reports device delivery. So the honest outcomes the caller can derive
+        # are: "failed" (raised), "suppressed_quiet_hours" (the engine's own
+        # predicate: quiet hours and not force_send → nothing is sent), or
+        # "submitted" (the engine attempted delivery, but it cannot be
+        # confirmed). We never claim "sent"/"delivered" — push_sent stays False
+        # because delivery is unconfirmable through this contract.
+        push_msg = f"{'🔴' if urgency == 'high' else '⚠️'} Zoe needs your input: {reason[:120]}"
+        force_send = urgency == "high"
+        push_status = "failed"
         try:
-            from multica_client import get_multica_client  # type: ignore[import]
-            mc = get_multica_client()
-            issue_id = (args.get("issue_id") or "").strip()
-            reason = (args.get("reason") or "Flagged for human review").strip()
-            urgency = args.get("urgency", "normal")
-            if issue_id and mc.is_configured():
-                # Append reason to the issue description
-                async with httpx.AsyncClient(timeout=15) as hc:
-                    resp = await hc.get(
-                        f"{mc._base}/api/issues/{issue_id}",
-                        headers=mc._headers(),
-                    )
-                    current_desc = resp.json().get("description", "") if resp.status_code == 200 else ""
-                await mc.update_issue(issue_id, description=f"{current_desc}\n\n⚠️ Needs human review: {reason}")
-            # Fire a push notification.
-            # fire_notification returns None in EVERY path (sent, deferred, or
-            # suppressed-by-quiet-hours alike) and raises only on error — it never
-            # reports device delivery. So the honest outcomes the caller can derive
-            # are: "failed" (raised), "suppressed_quiet_hours" (the engine's own
-            # predicate: quiet hours and not force_send → nothing is sent), or
-            # "submitted" (the engine attempted delivery, but it cannot be
-            # confirmed). We never claim "sent"/"delivered" — push_sent stays False
-            # because delivery is unconfirmable through this contract.
-            push_msg = f"{'🔴' if urgency == 'high' else '⚠️'} Zoe needs your input: {reason[:120]}"
-            force_send = urgency == "high"
-            push_status = "failed"
+            from proactive.engine import fire_notification, _is_in_quiet_hours  # type: ignore[import]
+            # Mirror the engine's suppression gate so a quiet-hours skip is not
+            # mislabelled as submitted.
+            suppressed = (not force_send) and _is_in_quiet_hours()
+            await fire_notification(
+                user_id=user_id,
+                message=push_msg,
+                trigger_type="needs_human_review",
+                item_id=issue_id or "board",
+                context={"force_send": force_send, "reason": reason, "issue_id": issue_id},
+            )
+            push_status = "suppressed_quiet_hours" if suppressed else "submitted"
+        except Exception as push_exc:
+            _mcp_log.warning("flag_needs_human_review: push failed: %s", push_exc)
+        return {
+            "ok": True,
+            "issue_id": issue_id,
+            "reason": reason,
+            "push_status": push_status,
+            # Delivery is not confirmable through fire_notification's contract.
+            "push_sent": False,
+        }
+    except Exception as exc:
+        return {"error": f"flag_needs_human_review failed: {exc}"}
+
+
+# ── stdio dispatch ───────────────────────────────────────────────────────────
+# tools/call requests run as concurrent tasks and each response is written the
+# moment it is ready, so a slow browse no longer holds up the list add queued
+# behind it; clients match responses by JSON-RPC id (mcporter_worker does).
+# ZOE_MCP_MAX_INFLIGHT bounds how many calls run at once — each holds a DB
+# connection for its duration and the stdio worker's pool is 10 wide. Every
+# call gets a timeout (ZOE_MCP_TOOL_TIMEOUT_S, or the per-tool override below)
+# and a client may abandon one early with ``notifications/cancelled``.
+_MCP_DEFAULT_MAX_INFLIGHT = 8
+_MCP_DEFAULT_TOOL_TIMEOUT_S = 60.0
+# Tools that legitimately outlive the default: headless browsing, SSH to a
+# panel (capped at 120s itself), and research / delegation to another agent.
+_MCP_TOOL_TIMEOUT_OVERRIDES_S = {
+    "web_browse": 90.0,
+    "cloakbrowser_fetch": 90.0,
+    "cloakbrowser_screenshot": 90.0,
+    "panel_browser_screenshot": 90.0,
+    "browser_compare_backends": 120.0,
+    "panel_ssh_exec": 150.0,
+    "deep_web_research": 180.0,
+    "a2a_delegate": 180.0,
+}
+
+
+def _tool_timeout_s(name: str) -> float:
+    return _MCP_TOOL_TIMEOUT_OVERRIDES_S.get(name) or env_float(
+        "ZOE_MCP_TOOL_TIMEOUT_S", _MCP_DEFAULT_TOOL_TIMEOUT_S
+    )
+
+
+def _rpc_result(msg_id, result: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": msg_id, "result": result}
+
+
+class _StdioDispatcher:
+    """Read JSON-RPC lines, run tool calls concurrently, write responses by id."""
+
+    def __init__(self, write, *, max_inflight: int | None = None):
+        self._write = write
+        if max_inflight is None:
+            max_inflight = env_int("ZOE_MCP_MAX_INFLIGHT", _MCP_DEFAULT_MAX_INFLIGHT)
+        self._slots = asyncio.Semaphore(max(1, max_inflight))
+        self._calls: dict = {}  # JSON-RPC id -> running tools/call task
+        self._tasks: set = set()
+
+    def _respond(self, response: dict) -> None:
+        # One whole line per write with no await in between, so concurrent
+        # completions never interleave on stdout.
+        self._write(json.dumps(response))
+
+    async def serve(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
             try:
-                from proactive.engine import fire_notification, _is_in_quiet_hours  # type: ignore[import]
-                # Mirror the engine's suppression gate so a quiet-hours skip is not
-                # mislabelled as submitted.
-                suppressed = (not force_send) and _is_in_quiet_hours()
-                await fire_notification(
-                    user_id=user_id,
-                    message=push_msg,
-                    trigger_type="needs_human_review",
-                    item_id=issue_id or "board",
-                    context={"force_send": force_send, "reason": reason, "issue_id": issue_id},
-                )
-                push_status = "suppressed_quiet_hours" if suppressed else "submitted"
-            except Exception as push_exc:
-                _mcp_log.warning("flag_needs_human_review: push failed: %s", push_exc)
-            return {
-                "ok": True,
-                "issue_id": issue_id,
-                "reason": reason,
-                "push_status": push_status,
-                # Delivery is not confirmable through fire_notification's contract.
-                "push_sent": False,
-            }
-        except Exception as exc:
-            return {"error": f"flag_needs_human_review failed: {exc}"}
+                msg = json.loads(line.decode())
+            except json.JSONDecodeError:
+                continue
+            if isinstance(msg, dict):
+                self.dispatch(msg)
+        # EOF: calls already accepted still finish and answer before exit.
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
 
-    else:
-        return {"error": f"Unknown tool: {name}"}
+    def dispatch(self, msg: dict) -> None:
+        method = msg.get("method")
+        msg_id = msg.get("id")
+        if method == "notifications/cancelled":
+            self.cancel((msg.get("params") or {}).get("requestId"))
+            return
+        # JSON-RPC notifications do not have ids and must not receive responses.
+        if msg_id is None and method not in {"tools/list", "tools/call", "initialize"}:
+            return
+
+        if method == "tools/call":
+            task = asyncio.ensure_future(self._run_call(msg))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if msg_id is not None:
+                self._calls[msg_id] = task
+                task.add_done_callback(lambda _t, key=msg_id: self._calls.pop(key, None))
+        elif method == "tools/list":
+            self._respond(_rpc_result(msg_id, {"tools": TOOLS}))
+        elif method == "initialize":
+            self._respond(_rpc_result(msg_id, {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": {"name": "zoe-data", "version": "1.0.0"},
+            }))
+        else:
+            self._respond(_rpc_result(msg_id, {}))
+
+    def cancel(self, request_id) -> bool:
+        """Cancel an in-flight tools/call; per MCP, no response is written for it."""
+        task = self._calls.get(request_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def inflight(self) -> int:
+        return len(self._tasks)
+
+    async def _run_call(self, msg: dict) -> None:
+        msg_id = msg.get("id")
+        params = msg.get("params") or {}
+        tool_name = params.get("name", "")
+        actor_context = _trusted_actor_context_from_message(msg)
+        timeout_s = _tool_timeout_s(tool_name)
+        try:
+            async with self._slots:
+                result_text = await asyncio.wait_for(
+                    handle_tool(tool_name, params.get("arguments") or {}, actor_context=actor_context),
+                    timeout_s,
+                )
+        except asyncio.TimeoutError:
+            _mcp_log.warning("mcp tools/call %s (id=%s) timed out after %ss", tool_name, msg_id, timeout_s)
+            result_text = json.dumps({"error": f"{tool_name} timed out after {timeout_s:g}s"})
+        except asyncio.CancelledError:
+            _mcp_log.info("mcp tools/call %s (id=%s) cancelled by client", tool_name, msg_id)
+            return
+        except Exception as exc:  # handle_tool maps tool errors itself; this is the backstop
+            _mcp_log.warning("mcp tools/call %s (id=%s) failed: %s", tool_name, msg_id, exc)
+            result_text = json.dumps({"error": str(exc)})
+        self._respond(_rpc_result(msg_id, {
+            "content": [{"type": "text", "text": result_text}],
+            "isError": False,
+        }))
 
 
 async def run_stdio_server():
@@ -3410,58 +3704,12 @@ async def run_stdio_server():
     protocol = asyncio.StreamReaderProtocol(reader)
     await asyncio.get_event_loop().connect_read_pipe(lambda: protocol, sys.stdin)
 
-    while True:
-        line = await reader.readline()
-        if not line:
-            break
-        try:
-            msg = json.loads(line.decode())
-        except json.JSONDecodeError:
-            continue
-        method = msg.get("method")
-        # JSON-RPC notifications do not have ids and must not receive responses.
-        if msg.get("id") is None and method not in {"tools/list", "tools/call", "initialize"}:
-            continue
-
-        if method == "tools/list":
-            response = {
-                "jsonrpc": "2.0",
-                "id": msg.get("id"),
-                "result": {"tools": TOOLS},
-            }
-        elif method == "tools/call":
-            tool_name = msg["params"]["name"]
-            tool_args = msg["params"].get("arguments", {})
-            actor_context = _trusted_actor_context_from_message(msg)
-            result_text = await handle_tool(tool_name, tool_args, actor_context=actor_context)
-            response = {
-                "jsonrpc": "2.0",
-                "id": msg.get("id"),
-                "result": {
-                    "content": [{"type": "text", "text": result_text}],
-                    "isError": False,
-                },
-            }
-        elif method == "initialize":
-            response = {
-                "jsonrpc": "2.0",
-                "id": msg.get("id"),
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {"tools": {"listChanged": False}},
-                    "serverInfo": {"name": "zoe-data", "version": "1.0.0"},
-                },
-            }
-        else:
-            response = {
-                "jsonrpc": "2.0",
-                "id": msg.get("id"),
-                "result": {},
-            }
-
-        sys.stdout.write(json.dumps(response) + "\n")
+    def _write(line: str) -> None:
+        sys.stdout.write(line + "\n")
         sys.stdout.flush()
 
+    await _StdioDispatcher(_write).serve(reader)
+
 
 if __name__ == "__main__":
     asyncio.run(run_stdio_server())
@@ -0,0 +1,412 @@
+"""Warm, multiplexed MCP stdio worker for the intent fast path's tool calls.
+
+``intent_router._run_mcporter`` used to pay a full ``mcporter-safe`` spawn per
+intent: Node start-up, mcporter config load, then a fresh ``python
+mcp_server.py`` child that imports the whole tool module and opens its own DB
+pool — for one ``tools/call`` — and then tears it all down again. mcporter is
+only a CLI MCP client in front of that stdio server, so this module talks to
+the server directly instead:
+
+* ONE long-lived ``mcp_server.py`` child, spawned off the event loop via
+  ``async_subprocess.spawn_pipe_process`` and initialized (MCP ``initialize`` +
+  ``tools/list``) once.
+* Concurrent callers are multiplexed over its stdin/stdout by JSON-RPC id: each
+  call parks on a future that a single reader task resolves.
+* A call that outlives the call timeout is abandoned with an MCP
+  ``notifications/cancelled`` — the server runs calls concurrently, so one slow
+  tool does not stall the others. A child that exits, closes stdout or times
+  out ``RECYCLE_AFTER_TIMEOUTS`` calls in a row with no answer in between is
+  wedged and torn down; every in-flight call fails and the next call respawns
+  it (with a short back-off so a child that cannot start — e.g. DB pool init
+  failure — is not fork-looped).
+
+Callers keep building the exact ``mcporter-safe call zoe-data.<tool> k=v``
+command string; :func:`parse_mcporter_command` turns it into ``(tool, args)``
+and arguments are coerced with the tool's ``inputSchema`` the way mcporter's
+CLI does. The spawn path stays the fallback: :class:`WorkerUnavailable` means
+nothing was sent and the caller may spawn mcporter instead, while
+:class:`WorkerCallFailed` means the request may have run — a write must not be
+replayed through the fallback.
+
+The child gets the same sanitized environment an MCP stdio client gives the
+servers it spawns (see :func:`stdio_child_env`), so ``mcp_server.py`` loads
+its credentials from ``.env`` exactly as it does under mcporter.
+
+``ZOE_MCPORTER_MODE=spawn`` disables the worker entirely.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+from async_subprocess import AsyncPipeProcess, spawn_pipe_process
+
+logger = logging.getLogger(__name__)
+
+MCPORTER_MODE_ENV = "ZOE_MCPORTER_MODE"
+MCPORTER_WORKER_CMD_ENV = "ZOE_MCPORTER_WORKER_CMD"
+MCP_SERVER_NAME = "zoe-data"
+
+WORKER_CALL_TIMEOUT_S = 10.0
+WORKER_START_TIMEOUT_S = 20.0
+# Seconds to wait before respawning after consecutive start failures.
+RESTART_BACKOFF_S = (1.0, 5.0, 15.0, 30.0)
+# Consecutive timed-out calls, with no response of any kind in between, after
+# which the child counts as wedged rather than busy.
+RECYCLE_AFTER_TIMEOUTS = 2
+# tools/call results are single JSON lines; list dumps can pass asyncio's 64 KiB
+# default readline cap.
+_STDOUT_LIMIT = 8 * 1024 * 1024
+
+_SERVICE_DIR = Path(__file__).resolve().parent
+
+# What the MCP SDK's stdio client (and so mcporter) passes through to a server
+# it spawns (getDefaultEnvironment on POSIX). Anything else — POSTGRES_URL in
+# particular — would pre-empt mcp_server's bootstrap_runtime_env() .env load.
+_STDIO_INHERITED_ENV = ("HOME", "LOGNAME", "PATH", "SHELL", "TERM", "USER")
+
+
+class WorkerUnavailable(RuntimeError):
+    """The worker could not take the call; nothing was sent to a tool."""
+
+
+class WorkerCallFailed(RuntimeError):
+    """The call was sent but got no result: the child crashed or timed out, or
+    answered with a JSON-RPC error. A tool's own ``isError`` result is not this."""
+
+
+def stdio_child_env(env: Mapping[str, str]) -> dict[str, str]:
+    """The subset of ``env`` an MCP stdio client hands its server child."""
+    return {
+        key: env[key]
+        for key in _STDIO_INHERITED_ENV
+        # shell-function exports, skipped like the SDK does
+        if key in env and not env[key].startswith("()")
+    }
+
+
+def worker_mode_enabled() -> bool:
+    return os.environ.get(MCPORTER_MODE_ENV, "worker").strip().lower() != "spawn"
+
+
+def parse_mcporter_command(cmd: str) -> Optional[tuple[str, dict[str, str]]]:
+    """``<mcporter> call zoe-data.<tool> k=v ...`` → ``(tool, {k: v})``.
+
+    Returns ``None`` for anything else (another server, another subcommand, a
+    positional argument) so the caller spawns it as before.
+    """
+    try:
+        parts = shlex.split(cmd)
+    except ValueError:
+        return None
+    if len(parts) < 3 or parts[1] != "call":
+        return None
+    server, _, tool = parts[2].partition(".")
+    if server != MCP_SERVER_NAME or not tool:
+        return None
+    args: dict[str, str] = {}
+    for token in parts[3:]:
+        key, sep, value = token.partition("=")
+        if not sep or not key:
+            return None
+        args[key] = value
+    return tool, args
+
+
+def _coerce_value(value: str, prop: Any) -> Any:
+    kind = prop.get("type") if isinstance(prop, dict) else None
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), None)
+    try:
+        if kind == "integer":
+            return int(value)
+        if kind == "number":
+            return float(value) if any(c in value for c in ".eE") else int(value)
+        if kind == "boolean":
+            lowered = value.strip().lower()
+            if lowered in ("true", "false"):
+                return lowered == "true"
+        if kind in ("array", "object"):
+            return json.loads(value)
+    except (ValueError, json.JSONDecodeError):
+        pass
+    return value
+
+
+def coerce_arguments(args: Mapping[str, str], input_schema: Optional[Mapping[str, Any]]) -> dict[str, Any]:
+    """Type ``key=value`` strings by the tool's JSON schema, as mcporter does."""
+    props = (input_schema or {}).get("properties") or {}
+    return {key: _coerce_value(value, props.get(key)) for key, value in args.items()}
+
+
+def _default_command() -> list[str]:
+    override = os.environ.get(MCPORTER_WORKER_CMD_ENV, "").strip()
+    if override:
+        return shlex.split(override)
+    return [sys.executable, str(_SERVICE_DIR / "mcp_server.py")]
+
+
+class McpStdioWorker:
+    """One warm ``mcp_server.py`` stdio child shared by concurrent callers."""
+
+    def __init__(
+        self,
+        command: Optional[Sequence[str]] = None,
+        *,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        call_timeout: float = WORKER_CALL_TIMEOUT_S,
+        start_timeout: float = WORKER_START_TIMEOUT_S,
+    ):
+        self.command = list(command) if command else _default_command()
+        self.cwd = cwd or str(_SERVICE_DIR)
+        self.env = stdio_child_env(os.environ if env is None else env)
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self.proc: Optional[AsyncPipeProcess] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._schemas: dict[str, dict] = {}
+        self._start_failures = 0
+        self._retry_at = 0.0
+        self._timeouts_in_a_row = 0
+        self._closed = False
+        self.starts = 0
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.proc is not None
+            and self.proc.returncode is None
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    async def call_tool(self, name: str, arguments: Mapping[str, Any], *, timeout: Optional[float] = None) -> str:
+        """Run one ``tools/call`` and return its text content (mcporter's stdout),
+        including a tool's own error text when it answers with ``isError``."""
+        await self._ensure_started()
+        schema = self._schemas.get(name)
+        args = coerce_arguments(arguments, schema) if schema is not None else dict(arguments)
+        self.calls += 1
+        result = await self._request(
+            "tools/call",
+            {"name": name, "arguments": args},
+            timeout=self.call_timeout if timeout is None else timeout,
+        )
+        content = result.get("content") if isinstance(result, dict) else None
+        text = "".join(
+            str(part.get("text") or "")
+            for part in content or ()
+            if isinstance(part, dict) and part.get("type") == "text"
+        )
+        if isinstance(result, dict) and result.get("isError"):
+            # The tool ran and reported its own error; mcporter prints that text
+            # too, so hand it back for the caller's formatter rather than failing.
+            self.failures += 1
+            logger.info("mcporter worker: %s returned an MCP error: %s", name, text[:200])
+        return text.strip()
+
+    async def close(self) -> None:
+        self._closed = True
+        async with self._start_lock:
+            await self._teardown("worker closed")
+
+    def stats(self) -> dict:
+        return {
+            "alive": self.alive,
+            "starts": self.starts,
+            "calls": self.calls,
+            "failures": self.failures,
+            "in_flight": len(self._pending),
+        }
+
+    # ── lifecycle ───────────────────────────────────────────────────────────
+
+    async def _ensure_started(self) -> None:
+        if self.alive:
+            return
+        async with self._start_lock:
+            if self.alive:
+                return
+            if self._closed:
+                raise WorkerUnavailable("worker closed")
+            now = time.monotonic()
+            if now < self._retry_at:
+                raise WorkerUnavailable(f"respawn backing off for {self._retry_at - now:.1f}s")
+            await self._teardown("respawning")
+            try:
+                self.proc = await spawn_pipe_process(
+                    self.command, cwd=self.cwd, env=self.env, limit=_STDOUT_LIMIT,
+                )
+                self._reader = asyncio.create_task(self._read_loop(self.proc), name="mcporter_worker_reader")
+                await self._request(
+                    "initialize",
+                    {
+                        "protocolVersion": "2024-11-05",
+                        "capabilities": {},
+                        "clientInfo": {"name": "zoe-intent-router", "version": "1.0.0"},
+                    },
+                    timeout=self.start_timeout,
+                )
+                await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+                listed = await self._request("tools/list", {}, timeout=self.start_timeout)
+            except (OSError, WorkerCallFailed, WorkerUnavailable, ValueError) as exc:
+                self._start_failures += 1
+                delay = RESTART_BACKOFF_S[min(self._start_failures, len(RESTART_BACKOFF_S)) - 1]
+                self._retry_at = time.monotonic() + delay
+                await self._teardown("start failed")
+                raise WorkerUnavailable(f"mcp_server worker failed to start: {exc}") from exc
+            self._schemas = {
+                tool["name"]: tool.get("inputSchema") or {}
+                for tool in (listed or {}).get("tools", [])
+                if isinstance(tool, dict) and tool.get("name")
+            }
+            self._start_failures = 0
+            self._retry_at = 0.0
+            self.starts += 1
+            logger.info(
+                "mcporter worker: mcp_server child ready (start #%d, %d tools)",
+                self.starts, len(self._schemas),
+            )
+
+    async def _teardown(self, reason: str) -> None:
+        proc, reader = self.proc, self._reader
+        self.proc, self._reader = None, None
+        self._fail_pending(reason)
+        if reader is not None and not reader.done():
+            reader.cancel()
+        if proc is None or proc.returncode is not None:
+            return
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+    def _abandon(self, reason: str) -> None:
+        """Drop the current child without awaiting it; the next call respawns."""
+        proc, self.proc, self._reader = self.proc, None, None
+        self._fail_pending(reason)
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            asyncio.ensure_future(proc.wait())
+
+    def _fail_pending(self, reason: str) -> None:
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(WorkerCallFailed(reason))
+
+    # ── wire ────────────────────────────────────────────────────────────────
+
+    async def _send(self, message: dict) -> None:
+        proc = self.proc
+        if proc is None or proc.stdin is None:
+            # Nothing written: safe for the caller to take the spawn path.
+            raise WorkerUnavailable("worker not running")
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        try:
+            async with self._write_lock:
+                proc.stdin.write(line)
+                await proc.stdin.drain()
+        except (ConnectionError, RuntimeError) as exc:
+            raise WorkerCallFailed(f"worker stdin closed: {exc}") from exc
+
+    async def _request(self, method: str, params: dict, *, timeout: float) -> Any:
+        request_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return await asyncio.wait_for(fut, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            self._timeouts_in_a_row += 1
+            if method == "tools/call" and self._timeouts_in_a_row < RECYCLE_AFTER_TIMEOUTS:
+                # The server dispatches calls concurrently: a slow tool only
+                # costs its own caller. Tell it to stop and keep the child.
+                logger.warning("mcporter worker: %s timed out after %ss; cancelling it", method, timeout)
+                try:
+                    await self._send({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                                      "params": {"requestId": request_id, "reason": "timeout"}})
+                except (WorkerCallFailed, WorkerUnavailable):
+                    pass
+            else:
+                logger.warning("mcporter worker: %s timed out after %ss; recycling child", method, timeout)
+                self._abandon(f"{method} timed out")
+            raise WorkerCallFailed(f"{method} timed out after {timeout}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self, proc: AsyncPipeProcess) -> None:
+        reason = "worker exited"
+        try:
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line.decode(errors="replace"))
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(msg, dict):
+                    continue
+                self._timeouts_in_a_row = 0
+                fut = self._pending.get(msg.get("id"))
+                if fut is None or fut.done():
+                    continue
+                if "error" in msg:
+                    err = msg["error"]
+                    detail = err.get("message") if isinstance(err, dict) else err
+                    fut.set_exception(WorkerCallFailed(f"JSON-RPC error: {detail}"))
+                else:
+                    fut.set_result(msg.get("result"))
+        except (ValueError, ConnectionError) as exc:
+            reason = f"worker stdout unreadable: {exc}"
+        finally:
+            if self.proc is proc:
+                logger.warning("mcporter worker: %s (in flight: %d)", reason, len(self._pending))
+                self._fail_pending(reason)
+                if proc.returncode is None:
+                    proc.kill()
+
+
+_WORKER: Optional[McpStdioWorker] = None
+_WORKER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_worker(env: Optional[Mapping[str, str]] = None) -> McpStdioWorker:
+    """The process-wide worker, bound to the running event loop."""
+    global _WORKER, _WORKER_LOOP
+    loop = asyncio.get_running_loop()
+    if _WORKER is None or _WORKER_LOOP is not loop or _WORKER_LOOP.is_closed():
+        stale = _WORKER
+        if stale is not None and stale.proc is not None and stale.proc.returncode is None:
+            # Its pipes belong to a dead loop; nothing can await it any more.
+            stale.proc.kill()
+        _WORKER = McpStdioWorker(env=env)
+        _WORKER_LOOP = loop
+    return _WORKER
+
+
+async def shutdown_worker() -> None:
+    """Stop the warm child (call on service shutdown)."""
+    global _WORKER, _WORKER_LOOP
+    worker, _WORKER, _WORKER_LOOP = _WORKER, None, None
+    if worker is not None:
+        await worker.close()
@@ -15,11 +15,15 @@ Manual trigger: POST /api/memories/digest?user_id=jason
 import asyncio
 import json
 import logging
+import math
 import os
 import re
 import uuid
+from collections import Counter, defaultdict
+from typing import Optional
 
-import httpx
+
+import http_clients
 from routers.journal import CREATED_AT_VALID_TIMESTAMP_SQL
 
 logger = logging.getLogger(__name__)
@@ -393,7 +397,7 @@ async def run_turn_digest(
         }
 
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
+            async with http_clients.session("llm", timeout=20.0) as client:
                 resp = await client.post(f"{_GEMMA_URL}/v1/chat/completions", json=payload)
                 resp.raise_for_status()
                 raw = resp.json()["choices"][0]["message"]["content"].strip()
@@ -698,7 +702,7 @@ async def _emotional_memory_pass(user_id: str, chat_text: str, svc) -> int:
         "stream": False,
     }
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.session("llm", timeout=30.0) as client:
             resp = await client.post(f"{_GEMMA_URL}/v1/chat/completions", json=payload)
             resp.raise_for_status()
             raw = resp.json().get("choices", [{}])[0].get("message", {}).get("content", "[]").strip()
@@ -814,7 +818,7 @@ async def _extract_facts_with_gemma(chat_text: str) -> list[dict]:
         "stream": False,
     }
     try:
-        async with httpx.AsyncClient(timeout=45.0) as client:
+        async with http_clients.session("llm", timeout=45.0) as client:
             resp = await client.post(f"{_GEMMA_URL}/v1/chat/completions", json=payload)
             resp.raise_for_status()
             raw = resp.json()
@@ -857,7 +861,7 @@ async def _is_contradiction(new_fact: str, existing_fact: str) -> bool:
         "stream": False,
     }
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with http_clients.session("llm", timeout=15.0) as client:
             resp = await client.post(f"{_GEMMA_URL}/v1/chat/completions", json=payload)
             resp.raise_for_status()
             text = resp.json()["choices"][0]["message"]["content"].strip()
@@ -891,6 +895,21 @@ async def _is_contradiction(new_fact: str, existing_fact: str) -> bool:
 # excluded from subsequent scans.
 
 
+_DUPLICATE_OVERLAP = 0.85
+_CONTRADICTION_MIN_OVERLAP = 0.25
+
+
+def _content_words(text: str) -> frozenset[str]:
+    """The word set ``_text_overlap`` compares: lowercased, len > 2."""
+    return frozenset(w for w in (text or "").lower().split() if len(w) > 2)
+
+
+def _set_overlap(wa: frozenset[str], wb: frozenset[str]) -> float:
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / max(min(len(wa), len(wb)), 1)
+
+
 def _text_overlap(a: str, b: str) -> float:
     """Containment overlap — symmetric inter/min(|A|,|B|).
 
@@ -901,16 +920,63 @@ def _text_overlap(a: str, b: str) -> float:
     other" signal, so we divide by min(|A|,|B|). Filler words (len ≤ 2)
     are ignored to keep stopwords from inflating similarity.
     """
-    wa = {w for w in a.lower().split() if len(w) > 2}
-    wb = {w for w in b.lower().split() if len(w) > 2}
-    if not wa or not wb:
-        return 0.0
-    inter = wa & wb
-    return len(inter) / max(min(len(wa), len(wb)), 1)
+    return _set_overlap(_content_words(a), _content_words(b))
+
+
+class _ContainmentIndex:
+    """Candidate keepers for a containment-overlap threshold, without a full scan.
+
+    Prefix filtering over tokens ordered rarest-first: if
+    ``|A ∩ B| >= ceil(t · min(|A|, |B|))`` then the smaller set's first
+    ``|S| - ceil(t·|S|) + 1`` tokens must meet the larger set. So each keeper
+    is posted under its prefix (found when it is the smaller side, probing
+    with every token of the incoming set) and under all its tokens (found when
+    it is the larger side, probing with the incoming set's prefix). Exact —
+    no candidate that can reach ``t`` is missed — and because prefixes are
+    the rarest ~15% of a set, posting lists stay short.
+    """
+
+    def __init__(self, threshold: float, doc_freq: Counter):
+        self._t = threshold
+        self._df = doc_freq
+        self._by_prefix: dict[str, list[int]] = defaultdict(list)
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._sets: list[frozenset[str]] = []
+
+    def _prefix(self, words: frozenset[str]) -> list[str]:
+        keep = len(words) - math.ceil(self._t * len(words)) + 1
+        return sorted(words, key=lambda w: (self._df[w], w))[:keep]
+
+    def add(self, words: frozenset[str]) -> int:
+        pos = len(self._sets)
+        self._sets.append(words)
+        for w in self._prefix(words):
+            self._by_prefix[w].append(pos)
+        for w in words:
+            self._by_token[w].append(pos)
+        return pos
+
+    def first_match(self, words: frozenset[str]) -> Optional[int]:
+        """Lowest-position entry with overlap ≥ threshold, or None."""
+        size = len(words)
+        candidates: set[int] = set()
+        for w in words:
+            candidates.update(p for p in self._by_prefix.get(w, ()) if len(self._sets[p]) <= size)
+        for w in self._prefix(words):
+            candidates.update(p for p in self._by_token.get(w, ()) if len(self._sets[p]) > size)
+        for pos in sorted(candidates):
+            if _set_overlap(words, self._sets[pos]) >= self._t:
+                return pos
+        return None
 
 
 async def _merge_near_duplicates(svc, user_id: str) -> int:
-    """Collapse near-duplicate approved rows. Returns merge count."""
+    """Collapse near-duplicate approved rows. Returns merge count.
+
+    Each row is tokenized once and matched against the keepers through a
+    ``_ContainmentIndex``; the first keeper (in keeper order) at containment
+    overlap ≥ 0.85 absorbs it, exactly as a pairwise scan would decide.
+    """
     approved = await svc.list_by_status(
         user_id=user_id, status="approved", limit=10_000
     )
@@ -924,33 +990,36 @@ async def _merge_near_duplicates(svc, user_id: str) -> int:
         ),
         reverse=False,
     )
+    rows = [(ref, _content_words((ref.text or "").strip())) for ref in approved if (ref.text or "").strip()]
+    doc_freq: Counter = Counter()
+    for _ref, words in rows:
+        doc_freq.update(words)
+    index = _ContainmentIndex(_DUPLICATE_OVERLAP, doc_freq)
     keepers: list = []
     merged = 0
-    for ref in approved:
-        text = (ref.text or "").strip()
-        if not text:
-            continue
-        matched = False
-        for keeper in keepers:
-            if _text_overlap(text, keeper.text) >= 0.85:
-                # Supersede the weaker row with the keeper's existing id.
-                try:
-                    await svc.review(
-                        ref.id,
-                        decision="edit",
-                        edits=keeper.text,
-                        actor="consolidation",
-                        note="weekly: merged near-duplicate",
-                    )
-                    merged += 1
-                except Exception as exc:
-                    logger.debug(
-                        "consolidation: merge skipped id=%s: %s", ref.id, exc
-                    )
-                matched = True
-                break
-        if not matched:
+    for ref, words in rows:
+        # A row with no content words never overlaps anything; it still
+        # becomes a keeper, as it did under the pairwise scan.
+        pos = index.first_match(words) if words else None
+        if pos is None:
+            index.add(words)
             keepers.append(ref)
+            continue
+        keeper = keepers[pos]
+        # Supersede the weaker row with the keeper's existing id.
+        try:
+            await svc.review(
+                ref.id,
+                decision="edit",
+                edits=keeper.text,
+                actor="consolidation",
+                note="weekly: merged near-duplicate",
+            )
+            merged += 1
+        except Exception as exc:
+            logger.debug(
+                "consolidation: merge skipped id=%s: %s", ref.id, exc
+            )
     return merged
 
 
@@ -966,21 +1035,25 @@ async def _resolve_contradictions(svc, user_id: str, max_pairs: int = 50) -> int
     # Sort newest-first so that on contradiction we can always supersede
     # the older row and keep the newer one.
     approved.sort(key=lambda r: r.metadata.get("added_at", ""), reverse=True)
+    words = [_content_words(r.text) for r in approved]
+    # One batched status read up front; rows this pass supersedes are tracked
+    # locally instead of being re-read before every pair.
+    current = await svc.get_many(r.id for r in approved)
+    live = {
+        rid for rid, row in current.items() if row.metadata.get("status") == "approved"
+    }
     for i, newer in enumerate(approved):
-        # Re-read newer's status in case an earlier iteration superseded
-        # it already.
-        refreshed = await svc.get(newer.id)
-        if refreshed is None or refreshed.metadata.get("status") != "approved":
+        if newer.id not in live:
             continue
         # Only compare against older rows (higher indices) that share
         # meaningful lexical overlap — cheap filter to avoid N² LLM calls.
-        for older in approved[i + 1 :]:
+        for j in range(i + 1, len(approved)):
+            older = approved[j]
             if pairs_checked >= max_pairs:
                 return resolved
-            if _text_overlap(newer.text, older.text) < 0.25:
+            if _set_overlap(words[i], words[j]) < _CONTRADICTION_MIN_OVERLAP:
                 continue
-            older_current = await svc.get(older.id)
-            if older_current is None or older_current.metadata.get("status") != "approved":
+            if older.id not in live:
                 continue
             pairs_checked += 1
             if not await _is_contradiction(newer.text, older.text):
@@ -993,6 +1066,7 @@ async def _resolve_contradictions(svc, user_id: str, max_pairs: int = 50) -> int
                     actor="consolidation",
                     note="weekly: contradicted by newer fact",
                 )
+                live.discard(older.id)
                 resolved += 1
             except Exception as exc:
                 logger.debug(
@@ -1117,7 +1191,7 @@ async def _extract_concept_tags(fact: str) -> list[str]:
     """Use Gemma to extract concept tags from a fact. Returns [] on failure."""
     prompt = _CONCEPT_EXTRACTION_PROMPT.format(fact=fact[:300])
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session("llm", timeout=10.0) as client:
             resp = await client.post(
                 f"{_GEMMA_URL}/v1/chat/completions",
                 json={
@@ -1231,6 +1305,9 @@ async def _rem_reinforce_pass(user_id: str) -> dict:
 
     except Exception as exc:
         logger.warning("REM reinforce pass failed user=%s: %s", user_id, exc)
+    # The upserts above bypass MemoryService, so its prompt hot sets (and, via
+    # the stamp, other processes') would keep serving the old metadata.
+    svc._invalidate_prompt_hot()
 
     summary = {"user_id": user_id, "linked": linked, "tagged": tagged}
     logger.info("dreaming/rem: %s", summary)
@@ -1296,6 +1373,8 @@ async def _deep_sleep_pass(user_id: str) -> dict:
     import datetime
 
     svc = get_memory_service()
+    # Promotion reads access_count / unique_query_count: land write-behind ticks first.
+    await svc.flush_access_ticks()
     col = svc._collection()
     promoted = 0
     archived = 0
@@ -1329,6 +1408,11 @@ async def _deep_sleep_pass(user_id: str) -> dict:
 
     except Exception as exc:
         logger.warning("deep sleep pass failed user=%s: %s", user_id, exc)
+    finally:
+        if promoted or archived:
+            # Status flips written straight to the collection bypass the
+            # service's load_for_prompt hot sets — drop them so they rebuild.
+            svc._invalidate_prompt_hot()
 
     summary = {"user_id": user_id, "promoted": promoted, "archived": archived}
     logger.info("dreaming/deep_sleep: %s", summary)
@@ -1388,7 +1472,7 @@ async def _synthesis_pass(user_id: str) -> dict:
             prompt = _SYNTHESIS_PROMPT.format(n=len(sample), tag=tag, facts=facts_text)
 
             try:
-                async with httpx.AsyncClient(timeout=20.0) as client:
+                async with http_clients.session("llm", timeout=20.0) as client:
                     resp = await client.post(
                         f"{_GEMMA_URL}/v1/chat/completions",
                         json={
@@ -1431,6 +1515,7 @@ async def _synthesis_pass(user_id: str) -> dict:
 
     except Exception as exc:
         logger.warning("synthesis pass failed user=%s: %s", user_id, exc)
+    svc._invalidate_prompt_hot()  # related_ids/concept_tags upsert bypassed MemoryService
 
     summary = {"user_id": user_id, "synthesized": synthesized}
     logger.info("dreaming/synthesis: %s", summary)
@@ -115,6 +115,162 @@ db_pool_free = Gauge(
     registry=REGISTRY,
 )
 
+# Proactive Tier-2 trigger evaluation (proactive.engine._slow_loop). Triggers
+# run concurrently, each on its own pooled connection with a per-trigger
+# timeout; a trigger that keeps timing out shows up here instead of silently
+# never firing.
+proactive_trigger_check_seconds = Histogram(
+    "zoe_proactive_trigger_check_seconds",
+    "Wall time of one Tier-2 ProactiveTrigger.check() call, labelled by trigger.",
+    ["trigger"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=REGISTRY,
+)
+proactive_trigger_check_count = Counter(
+    "zoe_proactive_trigger_check_count",
+    "Tier-2 trigger checks, labelled by trigger and outcome (ok/error/timeout).",
+    ["trigger", "outcome"],
+    registry=REGISTRY,
+)
+
+# Outbound HTTP through the shared per-upstream clients (http_clients). The
+# connection label splits requests that opened a socket ("new") from those
+# that rode a pooled keep-alive connection ("reused"); a falling reuse ratio
+# means keep-alive is being defeated (expiry too short, upstream closing).
+http_upstream_latency_seconds = Histogram(
+    "zoe_http_upstream_latency_seconds",
+    "Time from send to response headers for a shared-client request, labelled by upstream.",
+    ["upstream"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 120),
+    registry=REGISTRY,
+)
+http_upstream_request_count = Counter(
+    "zoe_http_upstream_request_count",
+    "Shared-client requests, labelled by upstream and connection (new/reused).",
+    ["upstream", "connection"],
+    registry=REGISTRY,
+)
+http_upstream_error_count = Counter(
+    "zoe_http_upstream_error_count",
+    "Shared-client transport errors, labelled by upstream and httpx error class.",
+    ["upstream", "error"],
+    registry=REGISTRY,
+)
+
+# Session validation (auth.get_current_user). result: hit / negative_hit (a
+# cached rejection) / miss (went to zoe-auth) / coalesced (joined a miss
+# already in flight). hit rate = (hit + negative_hit) / all.
+auth_session_cache_count = Counter(
+    "zoe_auth_session_cache_count",
+    "Session-cache lookups in get_current_user, labelled by result.",
+    ["result"],
+    registry=REGISTRY,
+)
+auth_session_validation_seconds = Histogram(
+    "zoe_auth_session_validation_seconds",
+    "Wall time of one zoe-auth session validation, labelled by outcome (valid/invalid/degraded/error).",
+    ["outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    registry=REGISTRY,
+)
+
+# Push WebSocket fan-out (push.PushBroadcaster). Each connection has its own
+# bounded send queue drained by a writer task; kind is panel / user / anon.
+# Depth is sampled at every enqueue, latency runs from enqueue to the socket
+# write completing. dropped reason: coalesced (backlog folded into a resync
+# frame) / send_timeout / send_failed (connection dropped).
+push_queue_depth = Histogram(
+    "zoe_push_queue_depth",
+    "Frames pending on a push connection's send queue after an enqueue, labelled by connection kind.",
+    ["kind"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+    registry=REGISTRY,
+)
+push_send_latency_seconds = Histogram(
+    "zoe_push_send_latency_seconds",
+    "Time from enqueue to the push frame being written to the socket, labelled by connection kind.",
+    ["kind"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    registry=REGISTRY,
+)
+push_dropped_count = Counter(
+    "zoe_push_dropped_count",
+    "Push frames coalesced or connections dropped, labelled by connection kind and reason.",
+    ["kind", "reason"],
+    registry=REGISTRY,
+)
+push_replay_count = Counter(
+    "zoe_push_replay_count",
+    "Push catchup requests, labelled by result (replayed / full_refresh).",
+    ["result"],
+    registry=REGISTRY,
+)
+
+# Weather cache (routers.weather). result: fresh (within TTL) / stale (served
+# while a background revalidation runs) / miss (waited on the provider) /
+# coalesced (joined a fetch already in flight for the same coords). Age is the
+# reading's age when served; provider latency covers one upstream fetch.
+weather_cache_count = Counter(
+    "zoe_weather_cache_count",
+    "Weather cache lookups, labelled by kind (current/forecast) and result.",
+    ["kind", "result"],
+    registry=REGISTRY,
+)
+weather_reading_age_seconds = Histogram(
+    "zoe_weather_reading_age_seconds",
+    "Age of the weather reading served to a caller, labelled by kind.",
+    ["kind"],
+    buckets=(1, 10, 60, 300, 600, 900, 1800, 3600, 7200, 21600),
+    registry=REGISTRY,
+)
+weather_provider_latency_seconds = Histogram(
+    "zoe_weather_provider_latency_seconds",
+    "Wall time of one weather provider fetch, labelled by provider, kind and outcome (ok/error).",
+    ["provider", "kind", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    registry=REGISTRY,
+)
+
+# Bounded per-key registries (keyed_state.KeyedState): session locks, voice
+# panel state. Size is published by the background sweeper; evicted reason:
+# ttl (idle past the registry's TTL) / size (least recently used, over the cap).
+keyed_state_size = Gauge(
+    "zoe_keyed_state_size",
+    "Entries held by a keyed-state registry, labelled by registry name.",
+    ["name"],
+    registry=REGISTRY,
+)
+keyed_state_evicted_count = Counter(
+    "zoe_keyed_state_evicted_count",
+    "Entries evicted from a keyed-state registry, labelled by name and reason (ttl/size).",
+    ["name", "reason"],
+    registry=REGISTRY,
+)
+
+# STT worker pool (stt_pool.SttPool): per job, time spent queued for a free
+# Moonshine instance vs time in inference, labelled by priority
+# (interactive/background); shed = jobs refused or displaced by a full queue.
+stt_queue_wait_seconds = Histogram(
+    "zoe_stt_queue_wait_seconds",
+    "Seconds an STT job waited for a free model instance, labelled by priority.",
+    ["priority"],
+    buckets=(0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+    registry=REGISTRY,
+)
+stt_inference_seconds = Histogram(
+    "zoe_stt_inference_seconds",
+    "Seconds of STT inference per job, labelled by priority.",
+    ["priority"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0),
+    registry=REGISTRY,
+)
+stt_shed_count = Counter(
+    "zoe_stt_shed_count",
+    "STT jobs shed because the queue was full, labelled by priority.",
+    ["priority"],
+    registry=REGISTRY,
+)
+
 # Reconciliation fail-open-to-ADD observability (QA concern #4). The shared
 # reconcile_for_ingest chokepoint (#1280) all conversational writers route
 # through PREFERS DUPLICATES OVER LOST FACTS: on a search timeout / empty result
@@ -207,6 +363,21 @@ routing_decision_count = Counter(
     registry=REGISTRY,
 )
 
+# Tier-1 router embeddings (embedding_service in front of semantic_router's model)
+router_embed_cache_count = Counter(
+    "zoe_router_embed_cache_count",
+    "Router embedding lookups, labelled by result: hit (cache), miss (embedded) "
+    "or coalesced (joined an identical in-flight embed).",
+    ["result"],
+    registry=REGISTRY,
+)
+router_embed_batch_size = Histogram(
+    "zoe_router_embed_batch_size",
+    "Texts per ONNX embed call made by the router embedding service.",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32),
+    registry=REGISTRY,
+)
+
 # Digest
 digest_messages_processed = Counter(
     "zoe_digest_messages_processed",
@@ -604,6 +775,25 @@ __all__ = [
     "db_pool_size",
     "db_pool_in_use",
     "db_pool_free",
+    "proactive_trigger_check_seconds",
+    "proactive_trigger_check_count",
+    "http_upstream_latency_seconds",
+    "http_upstream_request_count",
+    "http_upstream_error_count",
+    "auth_session_cache_count",
+    "auth_session_validation_seconds",
+    "push_queue_depth",
+    "push_send_latency_seconds",
+    "push_dropped_count",
+    "push_replay_count",
+    "weather_cache_count",
+    "weather_reading_age_seconds",
+    "weather_provider_latency_seconds",
+    "keyed_state_size",
+    "keyed_state_evicted_count",
+    "stt_queue_wait_seconds",
+    "stt_inference_seconds",
+    "stt_shed_count",
     "memory_reconcile_failopen_count",
     "record_reconcile_failopen",
     "reconcile_failopen_status",
@@ -611,6 +801,8 @@ __all__ = [
     "training_last_success_timestamp",
     "training_last_eval_accuracy",
     "routing_decision_count",
+    "router_embed_cache_count",
+    "router_embed_batch_size",
     "digest_messages_processed",
     "digest_facts_extracted",
     "memory_digest_last_run_timestamp",
@@ -12,7 +12,8 @@ Contract (`memory_and_self-learning_audit` plan, Phase 1):
   * load_for_prompt() - the only path the agent system prompt uses.
   * search()          - the only path any semantic query uses.
   * review()          - UI approve/reject/edit.
-  * tick_access()     - bumps access_count + last_accessed; called on every hit.
+  * tick_access()     - bumps access_count + last_accessed; called on every hit
+                        (write-behind: batched per user, see flush_access_ticks()).
   * delete_user()     - admin-only `/api/users/{id}/forget`.
   * export_user()     - admin-only full JSON dump.
 
@@ -29,6 +30,7 @@ Safety rails enforced here, not in callers:
 from __future__ import annotations
 
 import asyncio
+import atexit
 import datetime
 import hashlib
 import json
@@ -36,6 +38,7 @@ import logging
 import math
 import os
 import re
+import tempfile
 import threading
 import time
 import uuid
@@ -304,6 +307,65 @@ def _memory_expired(expires_at: Any, now: datetime.datetime | None = None) -> bo
 
 _BLOCKED_READ_STATUSES = {"archived", "rejected", "superseded", "pending", "disputed"}
 
+# Typed prompt-read metadata. Every row written through this service carries
+# ``expires_at_ts`` (epoch seconds; a far-future sentinel when the row never
+# expires), ``decay_base`` (log of the load_for_prompt decay term at age zero,
+# ``ln(confidence) + lambda * added_days``) and ``read_schema``. That lets
+# _metadata_read push status/expiry filters into the Chroma ``where`` and rank
+# without re-parsing ``added_at`` per row. Rows without ``read_schema`` (legacy
+# data, out-of-band writers) are still returned and filtered in Python.
+_READ_SCHEMA_VERSION = 1
+_NEVER_EXPIRES_TS = 253402300799.0  # 9999-12-31T23:59:59Z
+_PROMPT_DECAY_LAMBDA = math.log(2) / 70.0  # per day; 70-day half-life
+
+# Per-user hot set for load_for_prompt: the top-N rows of the last pushdown read,
+# patched in place by ingest/review/tick_access. A rebuild happens only when the
+# set is invalidated (delete_user, TTL lapse, or too few rows left to serve).
+_PROMPT_HOT_SET_SIZE = int(os.environ.get("ZOE_MEMORY_PROMPT_HOT_SET_SIZE", "200"))
+_PROMPT_HOT_SET_TTL_S = float(os.environ.get("ZOE_MEMORY_PROMPT_HOT_SET_TTL_S", "300"))
+# Other processes write the same palace (the MCP server child behind
+# memory_add/memory_review/memory_forget). Every content write replaces this
+# file in the data dir; a reader that finds a stamp it did not write drops its
+# hot sets. The TTL only bounds a write that raced the stamp.
+_PROMPT_STAMP_FILE = ".prompt_hot_stamp"
+
+# Write-behind access ticks: recall hits are aggregated per memory id and
+# flushed as one get + update per user every _TICK_FLUSH_INTERVAL_S, or as soon
+# as _TICK_FLUSH_MAX_IDS ids are pending. ZOE_MEMORY_TICK_WRITE_BEHIND=0 restores
+# the synchronous per-hit write.
+_TICK_FLUSH_INTERVAL_S = float(os.environ.get("ZOE_MEMORY_TICK_FLUSH_S", "2.0"))
+_TICK_FLUSH_MAX_IDS = int(os.environ.get("ZOE_MEMORY_TICK_FLUSH_MAX_IDS", "256"))
+
+
+def _tick_write_behind_enabled() -> bool:
+    return os.environ.get("ZOE_MEMORY_TICK_WRITE_BEHIND", "1").strip().lower() not in (
+        "0", "false", "no", "off",
+    )
+
+
+@dataclass
+class _PendingTick:
+    """Access hits for one memory id awaiting a flush."""
+    count: int = 0
+    last_accessed: str = ""
+    # distinct, in arrival order — replayed one by one so the capped
+    # _query_hashes blob evolves exactly as it would under per-hit writes
+    query_hashes: list[str] = field(default_factory=list)
+
+    def add(self, now_iso: str, query_hash: Optional[str]) -> None:
+        self.count += 1
+        self.last_accessed = now_iso
+        if query_hash and query_hash not in self.query_hashes:
+            self.query_hashes.append(query_hash)
+
+    def absorb(self, newer: "_PendingTick") -> None:
+        """Fold in hits queued after this batch was taken (used when requeueing)."""
+        self.count += newer.count
+        self.last_accessed = newer.last_accessed or self.last_accessed
+        for query_hash in newer.query_hashes:
+            if query_hash not in self.query_hashes:
+                self.query_hashes.append(query_hash)
+
 # Cap for the in-memory idempotency fast-path cache (_seen_keys). Durable dedup is
 # guaranteed by the deterministic mem_id + upsert, so this cache only avoids redundant
 # write attempts; evicting the oldest key at worst lets one duplicate reach the
@@ -380,6 +442,114 @@ def _memory_status_visible(metadata: Mapping[str, Any]) -> bool:
     return status not in _BLOCKED_READ_STATUSES
 
 
+def _with_read_fields(metadata: Mapping[str, Any]) -> dict[str, Any]:
+    """Copy of ``metadata`` carrying the typed prompt-read fields."""
+
+    md = dict(metadata)
+    expires_dt = _parse_aware_datetime(md.get("expires_at")) if md.get("expires_at") else None
+    # An unparseable expires_at is kept active on read, so it never expires here either.
+    md["expires_at_ts"] = expires_dt.timestamp() if expires_dt else _NEVER_EXPIRES_TS
+    added_dt = _parse_aware_datetime(md.get("added_at"))
+    if added_dt is not None:
+        md["decay_base"] = (
+            math.log(_row_confidence(md))
+            + _PROMPT_DECAY_LAMBDA * added_dt.timestamp() / 86400.0
+        )
+    else:
+        md.pop("decay_base", None)
+    md["read_schema"] = _READ_SCHEMA_VERSION
+    return md
+
+
+def _row_confidence(md: Mapping[str, Any]) -> float:
+    try:
+        conf = float(md.get("confidence", 0.7) or 0.7)
+    except (TypeError, ValueError):
+        conf = 0.7
+    return conf if conf > 0 else 0.7
+
+
+def _prompt_score(md: Mapping[str, Any], now: datetime.datetime) -> float:
+    """load_for_prompt rank: ``conf * exp(-lambda * age_days) + 0.1 * log1p(access)``."""
+
+    conf = _row_confidence(md)
+    try:
+        access_count = int(md.get("access_count", 0) or 0)
+    except (TypeError, ValueError):
+        access_count = 0
+    base = md.get("decay_base")
+    if isinstance(base, (int, float)) and not isinstance(base, bool):
+        # exp(min(...)) clamps future-dated rows to age 0, like the parse path.
+        exponent = min(base - _PROMPT_DECAY_LAMBDA * now.timestamp() / 86400.0, math.log(conf))
+        decay = math.exp(exponent)
+    else:
+        try:
+            dt = _parse_aware_datetime(md.get("added_at") or "")
+            age_days = max(0.0, (now - dt).total_seconds() / 86400.0) if dt else 0.0
+        except Exception:
+            age_days = 0.0
+        decay = conf * math.exp(-_PROMPT_DECAY_LAMBDA * age_days)
+    return decay + 0.1 * math.log1p(access_count)
+
+
+def _prompt_row_visible(md: Mapping[str, Any], user_id: str, now: datetime.datetime) -> bool:
+    expires_ts = md.get("expires_at_ts")
+    if md.get("read_schema") == _READ_SCHEMA_VERSION and isinstance(expires_ts, (int, float)):
+        if expires_ts <= now.timestamp():
+            return False
+    else:
+        expires = md.get("expires_at")
+        if expires and _memory_expired(expires, now):
+            return False
+    return _memory_visible_to_user(md, user_id) and _memory_status_visible(md)
+
+
+def _prompt_read_where(user_id: str, now: datetime.datetime) -> dict[str, Any]:
+    return {
+        "$and": [
+            {"$or": [{"user_id": user_id}, {"wing": user_id}, {"visibility": "family"}]},
+            # Chroma's $nin also matches rows with no status key (read as approved).
+            {"status": {"$nin": sorted(_BLOCKED_READ_STATUSES)}},
+            # $ne matches rows missing read_schema, so untyped rows still come back.
+            {"$or": [
+                {"expires_at_ts": {"$gt": now.timestamp()}},
+                {"read_schema": {"$ne": _READ_SCHEMA_VERSION}},
+            ]},
+        ]
+    }
+
+
+class _PromptHotSet:
+    """One user's cached load_for_prompt candidates.
+
+    Holds every visible row scoring at least as high as the lowest row kept
+    (all of them when ``exhaustive``), so a row can be spliced in whenever it
+    outranks the current floor without re-reading the collection.
+    """
+
+    __slots__ = ("rows", "exhaustive", "built_at")
+
+    def __init__(self, rows: list[MemoryRef], exhaustive: bool):
+        self.rows: dict[str, MemoryRef] = {r.id: r for r in rows}
+        self.exhaustive = exhaustive
+        self.built_at = time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > _PROMPT_HOT_SET_TTL_S
+
+    def upsert(self, ref: MemoryRef, user_id: str, now: datetime.datetime) -> None:
+        self.rows.pop(ref.id, None)
+        if not _prompt_row_visible(ref.metadata, user_id, now):
+            return
+        if not self.exhaustive:
+            if not self.rows:
+                return
+            floor = min(_prompt_score(r.metadata, now) for r in self.rows.values())
+            if _prompt_score(ref.metadata, now) < floor:
+                return
+        self.rows[ref.id] = ref
+
+
 def _scope_visibility(scope: Any | None) -> str:
     if scope is None:
         return "personal"
@@ -520,6 +690,21 @@ class MemoryService:
         # here as it ages out, so total size is hard-capped at _SEEN_KEYS_MAX.
         self._seen_keys_by_user: dict[str, set[str]] = {}
         self._background_tasks: set[asyncio.Task[Any]] = set()
+        # load_for_prompt hot sets (see _PromptHotSet). Touched from executor
+        # threads, so every access goes through _prompt_hot_lock; the generation
+        # counter lets a rebuild that raced a write discard its stale snapshot.
+        self._prompt_hot: dict[str, _PromptHotSet] = {}
+        self._prompt_hot_lock = threading.Lock()
+        self._prompt_hot_generation = 0
+        # (st_ino, st_mtime_ns) of the last stamp this process wrote or saw.
+        self._prompt_stamp: Optional[tuple[int, int]] = None
+        # Write-behind access ticks: {user_id: {mem_id: _PendingTick}}. Only the
+        # event-loop thread queues or swaps batches out.
+        self._pending_ticks: dict[str, dict[str, _PendingTick]] = {}
+        self._pending_tick_ids = 0
+        self._tick_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tick_atexit_registered = False
+        self.tick_stats = {"queued": 0, "flushes": 0, "rows_written": 0}
 
     async def ingest(
         self,
@@ -653,6 +838,7 @@ class MemoryService:
                 raise MemoryServiceError(f"write failed: {exc}") from exc
 
             self._remember_seen_key(user_id, idem_key)
+            self._note_prompt_rows([MemoryRef(id=mem_id, text=scrubbed, metadata=metadata)])
             await self._append_audit(
                 mem_id=mem_id,
                 user_id=user_id,
@@ -744,6 +930,10 @@ class MemoryService:
                 await self._run_sync(self._delete_audit_for_user_sync, user_id)
             except Exception as exc:
                 raise MemoryServiceError(f"delete_user failed: {exc}") from exc
+            # Queued access ticks target rows that no longer exist.
+            dropped = self._pending_ticks.pop(user_id, None)
+            if dropped:
+                self._pending_tick_ids -= len(dropped)
             # Purge this user's idempotency-cache entries so re-teaching a
             # previously known fact after a forget isn't dropped as a
             # duplicate for the rest of the process lifetime.
@@ -751,6 +941,8 @@ class MemoryService:
             if stale_keys:
                 for key in stale_keys:
                     self._seen_keys.discard(key)
+            # Family rows the user owned sit in other users' hot sets too.
+            self._invalidate_prompt_hot()
             _invalidate_agent_user_facts_cache(user_id)
             return len(ids)
 
@@ -879,6 +1071,18 @@ class MemoryService:
             return None
         return row
 
+    async def get_many(self, mem_ids: Iterable[str]) -> dict[str, MemoryRef]:
+        """Fetch rows by id in one collection read; missing ids are absent."""
+        ids = list(dict.fromkeys(mem_ids))
+        if not ids:
+            return {}
+        try:
+            rows = await self._run_sync(self._get_many_sync, ids)
+        except Exception as exc:
+            logger.warning("memory_service: get_many failed ids=%d: %s", len(ids), exc)
+            return {}
+        return {row.id: row for row in rows}
+
     async def review(
         self,
         mem_id: str,
@@ -917,6 +1121,7 @@ class MemoryService:
                 await self._run_sync(
                     self._write_row, mem_id, current.text, new_meta
                 )
+                self._note_prompt_rows([MemoryRef(id=mem_id, text=current.text, metadata=new_meta)])
                 await self._append_audit(
                     mem_id=mem_id,
                     user_id=user_id,
@@ -1008,6 +1213,8 @@ class MemoryService:
                 await self._run_sync(
                     self._write_row, mem_id, current.text, old_meta
                 )
+                self._note_prompt_rows([MemoryRef(id=mem_id, text=current.text, metadata=old_meta)])
+            self._note_prompt_rows([MemoryRef(id=new_id, text=scrubbed, metadata=new_meta)])
             await self._append_audit(
                 mem_id=new_id,
                 user_id=user_id,
@@ -1289,56 +1496,139 @@ class MemoryService:
 
     def _write_row(self, mem_id: str, text: str, metadata: dict[str, Any]) -> None:
         col = self._collection()
-        col.upsert(ids=[mem_id], documents=[text], metadatas=[metadata])
+        col.upsert(ids=[mem_id], documents=[text], metadatas=[_with_read_fields(metadata)])
 
     def _metadata_read(self, user_id: str, limit: int) -> list[MemoryRef]:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self._check_prompt_stamp()
+        with self._prompt_hot_lock:
+            hot = self._prompt_hot.get(user_id)
+            if hot is not None and hot.expired():
+                del self._prompt_hot[user_id]
+                hot = None
+            cached = list(hot.rows.values()) if hot is not None else None
+            exhaustive = hot is not None and hot.exhaustive
+        if cached is not None:
+            rows = [r for r in cached if _prompt_row_visible(r.metadata, user_id, now)]
+            if exhaustive or len(rows) >= limit:
+                return self._rank_prompt_rows(rows, now)[:limit]
+        return self._rebuild_prompt_hot(user_id, limit, now)[:limit]
+
+    @staticmethod
+    def _rank_prompt_rows(rows: list[MemoryRef], now: datetime.datetime) -> list[MemoryRef]:
+        ranked = sorted(
+            rows,
+            key=lambda r: (_prompt_score(r.metadata, now), r.metadata.get("added_at") or ""),
+            reverse=True,
+        )
+        # Fresh metadata dicts: callers must not be able to mutate the hot set.
+        return [MemoryRef(id=r.id, text=r.text, metadata=dict(r.metadata)) for r in ranked]
+
+    def _rebuild_prompt_hot(
+        self, user_id: str, limit: int, now: datetime.datetime
+    ) -> list[MemoryRef]:
+        """Pushdown read of the user's visible rows; refreshes the hot set."""
+        with self._prompt_hot_lock:
+            generation = self._prompt_hot_generation
         col = self._collection()
         result = col.get(
-            where={"$or": [{"user_id": user_id}, {"wing": user_id}, {"visibility": "family"}]},
+            where=_prompt_read_where(user_id, now),
             include=["documents", "metadatas"],
         )
         docs = result.get("documents") or []
         metas = result.get("metadatas") or []
         ids = result.get("ids") or []
-        now = datetime.datetime.now(datetime.timezone.utc)
         filtered: list[MemoryRef] = []
         for rid, doc, meta in zip(ids, docs, metas):
-            if not isinstance(meta, dict):
-                meta = {}
-            expires = meta.get("expires_at")
-            if expires and _memory_expired(expires, now):
-                continue
-            if not _memory_visible_to_user(meta, user_id):
-                continue
-            if not _memory_status_visible(meta):
+            md = dict(meta) if isinstance(meta, dict) else {}
+            # Re-checked in Python: legacy rows skip the typed filters, and
+            # status matching here is case-insensitive where Chroma's is not.
+            if not _prompt_row_visible(md, user_id, now):
                 continue
-            filtered.append(MemoryRef(id=rid, text=doc or "", metadata=dict(meta)))
+            filtered.append(MemoryRef(id=rid, text=doc or "", metadata=md))
+
+        ranked = self._rank_prompt_rows(filtered, now)
+        keep = max(_PROMPT_HOT_SET_SIZE, limit)
+        with self._prompt_hot_lock:
+            if generation == self._prompt_hot_generation:
+                self._prompt_hot[user_id] = _PromptHotSet(
+                    ranked[:keep], exhaustive=len(ranked) <= keep
+                )
+        return ranked
 
-        import math
-        HALF_LIFE_DAYS = 70.0
-        LAMBDA = math.log(2) / HALF_LIFE_DAYS
+    def _note_prompt_rows(self, refs: list[MemoryRef]) -> None:
+        """Splice freshly written rows into every hot set they can appear in."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self._prompt_hot_lock:
+            self._prompt_hot_generation += 1
+            for ref in refs:
+                md = ref.metadata
+                if str(md.get("visibility") or "").strip().lower() == "family":
+                    users = list(self._prompt_hot)
+                else:
+                    users = [
+                        u for u in (md.get("user_id"), md.get("wing"))
+                        if u and u in self._prompt_hot
+                    ]
+                    # Dropping a row must reach any set that still holds it.
+                    users += [
+                        u for u, hot in self._prompt_hot.items()
+                        if ref.id in hot.rows and u not in users
+                    ]
+                typed = MemoryRef(id=ref.id, text=ref.text, metadata=_with_read_fields(md))
+                for u in set(users):
+                    self._prompt_hot[u].upsert(typed, u, now)
+        self._bump_prompt_stamp()
+
+    def _invalidate_prompt_hot(self, user_id: Optional[str] = None) -> None:
+        with self._prompt_hot_lock:
+            self._prompt_hot_generation += 1
+            if user_id is None:
+                self._prompt_hot.clear()
+            else:
+                self._prompt_hot.pop(user_id, None)
+        self._bump_prompt_stamp()
 
-        def _score(ref: MemoryRef) -> tuple[float, str]:
-            md = ref.metadata
-            try:
-                conf = float(md.get("confidence", 0.7) or 0.7)
-            except (TypeError, ValueError):
-                conf = 0.7
-            try:
-                access_count = int(md.get("access_count", 0) or 0)
-            except (TypeError, ValueError):
-                access_count = 0
-            added_at = md.get("added_at") or ""
-            try:
-                dt = _parse_aware_datetime(added_at)
-                age_days = max(0.0, (now - dt).total_seconds() / 86400.0) if dt else 0.0
-            except Exception:
-                age_days = 0.0
-            score = conf * math.exp(-LAMBDA * age_days) + 0.1 * math.log1p(access_count)
-            return (score, added_at)
+    def _read_prompt_stamp(self) -> Optional[tuple[int, int]]:
+        try:
+            st = os.stat(os.path.join(self._data_dir, _PROMPT_STAMP_FILE))
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns)
 
-        filtered.sort(key=_score, reverse=True)
-        return filtered[:limit]
+    def _check_prompt_stamp(self) -> None:
+        """Drop every hot set if another process wrote since we last looked."""
+        stamp = self._read_prompt_stamp()
+        with self._prompt_hot_lock:
+            if stamp == self._prompt_stamp:
+                return
+            self._prompt_stamp = stamp
+            self._prompt_hot_generation += 1
+            self._prompt_hot.clear()
+
+    def _bump_prompt_stamp(self) -> None:
+        """Replace the stamp file so other processes drop their hot sets."""
+        # A foreign write since our last check would be hidden by our own stamp.
+        self._check_prompt_stamp()
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._data_dir, prefix=_PROMPT_STAMP_FILE + ".")
+        except OSError:
+            return  # no palace on disk yet: nothing to share
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(f"{os.getpid()} {time.time_ns()}\n")
+                fh.flush()
+                st = os.fstat(fh.fileno())
+            os.replace(tmp, os.path.join(self._data_dir, _PROMPT_STAMP_FILE))
+        except OSError as exc:
+            logger.debug("memory_service: prompt stamp write failed: %s", exc)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._prompt_hot_lock:
+            self._prompt_stamp = (st.st_ino, st.st_mtime_ns)
 
     def _semantic_search(
         self,
@@ -1535,6 +1825,17 @@ class MemoryService:
         meta = metas[0] if isinstance(metas[0], dict) else {}
         return MemoryRef(id=ids[0], text=docs[0] or "", metadata=dict(meta))
 
+    def _get_many_sync(self, mem_ids: list[str]) -> list[MemoryRef]:
+        col = self._collection()
+        result = col.get(ids=mem_ids, include=["documents", "metadatas"])
+        ids = result.get("ids") or []
+        docs = result.get("documents") or []
+        metas = result.get("metadatas") or []
+        return [
+            MemoryRef(id=rid, text=doc or "", metadata=dict(meta) if isinstance(meta, dict) else {})
+            for rid, doc, meta in zip(ids, docs, metas)
+        ]
+
     @staticmethod
     def _unpack_tags(raw: Any) -> list[str]:
         if not raw:
@@ -1562,6 +1863,9 @@ class MemoryService:
         ids_list = list(ids)
         if not ids_list:
             return
+        if _tick_write_behind_enabled():
+            self._queue_access_ticks(user_id, ids_list, None)
+            return
         lock = self._user_locks.setdefault(user_id, asyncio.Lock())
         try:
             async with lock:
@@ -1572,17 +1876,27 @@ class MemoryService:
     def _tick_access_sync(self, user_id: str, ids: list[str], query_hash: Optional[str] = None) -> None:
         if not ids:
             return
-        col = self._collection()
-        result = col.get(ids=ids, include=["metadatas"])
         now_iso = datetime.datetime.utcnow().isoformat() + "Z"
+        batch: dict[str, _PendingTick] = {}
+        for mem_id in ids:
+            batch.setdefault(mem_id, _PendingTick()).add(now_iso, query_hash)
+        self._apply_ticks_sync(batch)
+
+    def _apply_ticks_sync(self, batch: Mapping[str, _PendingTick]) -> None:
+        """One get + one metadata-only update for a batch of pending ticks."""
+        if not batch:
+            return
+        col = self._collection()
+        result = col.get(ids=list(batch), include=["metadatas"])
         got_ids = result.get("ids") or []
         got_metas = result.get("metadatas") or []
         new_metas = []
-        for meta in got_metas:
+        for rid, meta in zip(got_ids, got_metas):
+            tick = batch[rid]
             m = dict(meta) if isinstance(meta, dict) else {}
-            m["access_count"] = int(m.get("access_count", 0) or 0) + 1
-            m["last_accessed"] = now_iso
-            if query_hash:
+            m["access_count"] = int(m.get("access_count", 0) or 0) + tick.count
+            m["last_accessed"] = tick.last_accessed
+            if tick.query_hashes:
                 # Track distinct queries that have surfaced this memory. The hash blob
                 # is the dedup oracle AND must stay bounded, so it is capped at
                 # _MAX_QUERY_HASHES and never evicts. Once saturated we can no longer
@@ -1593,28 +1907,55 @@ class MemoryService:
                 # queries, _MAX_QUERY_HASHES); the cap (256) is far above any promotion
                 # threshold so freezing loses no real signal.
                 seen_hashes = [h for h in (m.get("_query_hashes") or "").split(",") if h]
-                if query_hash not in seen_hashes and len(seen_hashes) < _MAX_QUERY_HASHES:
-                    seen_hashes.append(query_hash)
+                seen = set(seen_hashes)
+                added = 0
+                for query_hash in tick.query_hashes:
+                    if query_hash not in seen and len(seen_hashes) < _MAX_QUERY_HASHES:
+                        seen_hashes.append(query_hash)
+                        seen.add(query_hash)
+                        added += 1
+                if added:
                     m["_query_hashes"] = ",".join(seen_hashes)
-                    m["unique_query_count"] = int(m.get("unique_query_count", 0) or 0) + 1
-            new_metas.append(m)
+                    m["unique_query_count"] = int(m.get("unique_query_count", 0) or 0) + added
+            new_metas.append(_with_read_fields(m))
         if got_ids:
             # Metadata-only write: col.update() omits documents, so Chroma does NOT
             # recompute embeddings. col.upsert() would re-embed every doc on every
             # recall hit just to bump access_count/last_accessed (pure waste).
             col.update(ids=got_ids, metadatas=new_metas)
+            self._touch_prompt_rows(dict(zip(got_ids, new_metas)))
+
+    def _touch_prompt_rows(self, metas_by_id: dict[str, dict[str, Any]]) -> None:
+        """Refresh metadata of hot-set rows after a metadata-only update.
+
+        Only rows already cached are patched (the update carries no document);
+        an access bump only raises a row's score, so it never falls below floor.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self._prompt_hot_lock:
+            self._prompt_hot_generation += 1
+            for u, hot in self._prompt_hot.items():
+                for rid, md in metas_by_id.items():
+                    cached = hot.rows.get(rid)
+                    if cached is not None:
+                        hot.upsert(MemoryRef(id=rid, text=cached.text, metadata=dict(md)), u, now)
 
     async def tick_access(self, user_id: str, ids: list[str], query: Optional[str] = None) -> None:
         """Public method: bump access_count + last_accessed for the given memory IDs.
 
         If `query` is provided, also increments `unique_query_count` when this query
         is distinct from previously seen queries (via SHA-1 hash tracking).
+        With write-behind on (the default) the hit is queued and lands on the
+        next flush; ``flush_access_ticks`` forces it out.
         """
         if not ids:
             return
         query_hash: Optional[str] = None
         if query:
             query_hash = hashlib.sha1(query.lower().strip().encode()).hexdigest()[:16]
+        if _tick_write_behind_enabled():
+            self._queue_access_ticks(user_id, ids, query_hash)
+            return
         lock = self._user_locks.setdefault(user_id, asyncio.Lock())
         try:
             async with lock:
@@ -1622,6 +1963,103 @@ class MemoryService:
         except Exception:
             pass
 
+    def _queue_access_ticks(
+        self, user_id: str, ids: Iterable[str], query_hash: Optional[str]
+    ) -> None:
+        now_iso = datetime.datetime.utcnow().isoformat() + "Z"
+        pending = self._pending_ticks.setdefault(user_id, {})
+        for mem_id in ids:
+            tick = pending.get(mem_id)
+            if tick is None:
+                tick = pending[mem_id] = _PendingTick()
+                self._pending_tick_ids += 1
+            tick.add(now_iso, query_hash)
+            self.tick_stats["queued"] += 1
+        if not self._tick_atexit_registered:
+            # Last-resort flush for processes that exit without awaiting
+            # flush_access_ticks (scripts, a crashed lifespan).
+            atexit.register(self._flush_access_ticks_at_exit)
+            self._tick_atexit_registered = True
+        if self._pending_tick_ids >= _TICK_FLUSH_MAX_IDS:
+            self._schedule_tick_flush(0.0)
+        elif self._tick_flush_handle is None:
+            self._schedule_tick_flush(_TICK_FLUSH_INTERVAL_S)
+
+    def _schedule_tick_flush(self, delay_s: float) -> None:
+        if self._tick_flush_handle is not None:
+            self._tick_flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._tick_flush_handle = loop.call_later(
+            delay_s,
+            lambda: self._track_background_task(
+                self.flush_access_ticks(), name="memory_tick_access_flush"
+            ),
+        )
+
+    def _take_pending_ticks(self) -> dict[str, dict[str, _PendingTick]]:
+        if self._tick_flush_handle is not None:
+            self._tick_flush_handle.cancel()
+            self._tick_flush_handle = None
+        pending, self._pending_ticks = self._pending_ticks, {}
+        self._pending_tick_ids = 0
+        return pending
+
+    def _requeue_ticks(self, user_id: str, batch: dict[str, _PendingTick]) -> None:
+        """Put a taken-but-unwritten batch back in front of anything queued since."""
+        pending = self._pending_ticks.setdefault(user_id, {})
+        for mem_id, tick in batch.items():
+            newer = pending.get(mem_id)
+            if newer is None:
+                self._pending_tick_ids += 1
+            else:
+                tick.absorb(newer)
+            pending[mem_id] = tick
+
+    async def flush_access_ticks(self) -> int:
+        """Write every queued access tick now. Returns rows written.
+
+        Never raises, except ``CancelledError``: a flush cancelled by a shutdown
+        timeout puts the batches it had not started back on the queue, so the
+        atexit flush still writes them.
+        """
+        written = 0
+        taken = list(self._take_pending_ticks().items())
+        for i, (user_id, batch) in enumerate(taken):
+            lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+            started = False
+            try:
+                async with lock:
+                    # Once handed to the executor the write completes even if
+                    # this flush is cancelled, so that batch is not requeued.
+                    write = asyncio.ensure_future(self._run_sync(self._apply_ticks_sync, batch))
+                    started = True
+                    await asyncio.shield(write)
+                written += len(batch)
+            except asyncio.CancelledError:
+                for unwritten_user, unwritten in taken[i + 1 if started else i:]:
+                    self._requeue_ticks(unwritten_user, unwritten)
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "memory_service: access-tick flush failed user=%s ids=%d: %s",
+                    user_id, len(batch), exc,
+                )
+        if written:
+            self.tick_stats["flushes"] += 1
+            self.tick_stats["rows_written"] += written
+        return written
+
+    def _flush_access_ticks_at_exit(self) -> None:
+        pending, self._pending_ticks = self._pending_ticks, {}
+        self._pending_tick_ids = 0
+        if not pending or not os.path.isdir(self._data_dir):
+            return
+        for user_id, batch in pending.items():
+            try:
+                self._apply_ticks_sync(batch)
+            except Exception as exc:
+                logger.warning("memory_service: exit tick flush failed user=%s: %s", user_id, exc)
+
     async def tick_consolidation(self, user_id: str, ids: list[str]) -> None:
         """Increment consolidation_count on the given memory IDs (called by deep-sleep pass)."""
         if not ids:
@@ -1647,6 +2085,7 @@ class MemoryService:
             # Metadata-only write (see _tick_access_sync): col.update() skips the
             # embedding recompute that col.upsert() would force on every doc.
             col.update(ids=got_ids, metadatas=new_metas)
+            self._touch_prompt_rows(dict(zip(got_ids, new_metas)))
 
     async def relink_entity(
         self, user_id: str, mem_id: str, entity_type: str, entity_id: str
@@ -1701,6 +2140,7 @@ class MemoryService:
         m["entity_type"] = entity_type
         m["entity_id"] = entity_id
         col.update(ids=got_ids, metadatas=[m])
+        self._touch_prompt_rows({got_ids[0]: m})
         return True
 
     async def _append_audit(
@@ -1863,4 +2303,17 @@ def get_memory_service() -> MemoryService:
     return _service_singleton
 
 
-__all__ = ["MemoryService", "MemoryRef", "MemoryServiceError", "get_memory_service", "scrub_pii"]
+async def shutdown_memory_service() -> None:
+    """Flush write-behind access ticks; called from the app lifespan shutdown."""
+    if _service_singleton is not None:
+        await _service_singleton.flush_access_ticks()
+
+
+__all__ = [
+    "MemoryService",
+    "MemoryRef",
+    "MemoryServiceError",
+    "get_memory_service",
+    "scrub_pii",
+    "shutdown_memory_service",
+]
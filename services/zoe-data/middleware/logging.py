@@ -12,6 +12,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from contextvars import ContextVar
 
+from logging_setup import QueuedHandler, _queued
+
 logger = logging.getLogger(__name__)
 
 # python-json-logger is an optional dependency. The formatter moved modules in
@@ -56,8 +58,10 @@ class ZoeJsonFormatter(_FormatterBase):
         log_record["level"] = record.levelname
         log_record["logger_name"] = record.name
         
-        # Add request metadata if available
-        metadata = _request_metadata_ctx.get()
+        # Add request metadata if available. Formatting runs on the log
+        # listener thread, so prefer the copy stamped on the record at the
+        # call site (_StampRequestMetadata) over this thread's context.
+        metadata = log_record.pop("zoe_request_metadata", None) or _request_metadata_ctx.get()
         if metadata:
             log_record.update(metadata)
         
@@ -66,6 +70,16 @@ class ZoeJsonFormatter(_FormatterBase):
             log_record["request_id"] = getattr(record, "request_id", "background")
 
 
+class _StampRequestMetadata(logging.Filter):
+    """Copy the request context onto the record before it leaves the calling thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        metadata = _request_metadata_ctx.get()
+        if metadata:
+            record.zoe_request_metadata = dict(metadata)
+        return True
+
+
 def setup_json_logging(extra_filters=None) -> None:
     """Configure JSON logging for Zoe services.
     
@@ -80,10 +94,13 @@ def setup_json_logging(extra_filters=None) -> None:
         )
         return
 
-    # Remove existing handlers to avoid duplicate logs
+    # Remove existing handlers to avoid duplicate logs (stopping the listener
+    # thread of a queued one from an earlier call)
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+        if isinstance(handler, QueuedHandler):
+            handler.close()
 
     # Create JSON formatter
     formatter = ZoeJsonFormatter(
@@ -96,9 +113,12 @@ def setup_json_logging(extra_filters=None) -> None:
         }
     )
     
-    # Add console handler for JSON output
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
+    # Add console handler for JSON output; JSON encoding and the write happen
+    # on the queue's listener thread, off the event loop.
+    stream = logging.StreamHandler()
+    stream.setFormatter(formatter)
+    handler = _queued(stream)
+    handler.addFilter(_StampRequestMetadata())
     if extra_filters:
         for f in extra_filters:
             handler.addFilter(f)
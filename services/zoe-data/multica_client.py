@@ -22,6 +22,8 @@ from typing import Any, Mapping
 
 import httpx
 
+import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -161,7 +163,7 @@ class MULClient:
             payload["assignee_id"] = assignee_id
             payload["assignee_type"] = assignee_type or "agent"
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.post(url, json=payload, headers=self._headers())
                 resp.raise_for_status()
                 return resp.json()
@@ -181,7 +183,7 @@ class MULClient:
             return {}
         url = f"{self._base}/api/issues/{issue_id}"
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.get(url, headers=self._headers())
                 resp.raise_for_status()
                 return resp.json()
@@ -242,7 +244,7 @@ class MULClient:
         if limit is not None:
             params["limit"] = max(1, int(limit))
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.get(url, params=params, headers=self._headers())
                 resp.raise_for_status()
                 data = resp.json()
@@ -283,7 +285,7 @@ class MULClient:
         if not payload:
             return {}
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.put(url, json=payload, headers=self._headers())
                 resp.raise_for_status()
                 return resp.json()
@@ -301,7 +303,7 @@ class MULClient:
         if not self.is_configured():
             return []
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.get(f"{self._base}/api/labels", headers=self._headers())
                 resp.raise_for_status()
                 data = resp.json()
@@ -325,7 +327,7 @@ class MULClient:
             if str(label.get("name") or "").lower() == wanted.lower():
                 return label
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.post(
                     f"{self._base}/api/labels",
                     json={"name": wanted, "color": _DEFAULT_LABEL_COLOR},
@@ -344,7 +346,7 @@ class MULClient:
         if not label_id or not self.is_configured():
             return {}
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.post(
                     f"{self._base}/api/issues/{issue_id}/labels",
                     json={"label_id": label_id},
@@ -361,7 +363,7 @@ class MULClient:
         if not self.is_configured():
             return []
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.get(f"{self._base}/api/projects", headers=self._headers())
                 resp.raise_for_status()
                 data = resp.json()
@@ -381,7 +383,7 @@ class MULClient:
             if str(project.get("title") or project.get("name") or "").lower() == wanted.lower():
                 return project
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("multica", timeout=_TIMEOUT) as client:
                 resp = await client.post(
                     f"{self._base}/api/projects",
                     json={"title": wanted},
@@ -526,7 +528,7 @@ async def _lookup_evolution_resources(client: MULClient) -> tuple[str | None, st
     base = client._base
 
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as http:
+        async with http_clients.session("multica", timeout=_TIMEOUT) as http:
             # Find the Self-Improvement Agent
             agents_resp = await http.get(f"{base}/api/agents", headers=headers, params=params)
             if agents_resp.status_code == 200:
@@ -636,7 +638,7 @@ async def sync_evolution_proposal_to_multica(
     params = {"workspace_id": client._workspace}
 
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as http:
+        async with http_clients.session("multica", timeout=_TIMEOUT) as http:
             # Create the issue
             resp = await http.post(
                 f"{client._base}/api/issues",
@@ -0,0 +1,540 @@
+"""Indexed, segmented storage engine for the engineering pipeline journal.
+
+``engineering_pipeline_runs.jsonl`` is event-sourced: every ``save_state``
+re-appends a full state snapshot and readers only ever want the LAST record per
+``task_ref``. Scanning the whole file for that made every load and save
+O(file size). This engine keeps the on-disk format exactly as it was — plain
+JSONL, one record per line, written by the same callers — and adds:
+
+* **Sidecar index** (``<store>.idx``): ``task_ref -> (segment, offset, length,
+  journal_revision)`` of its latest state-bearing record, plus the byte size of
+  the active file it covers and an anchor (span + CRC of the last indexed
+  line). Loads become one ``pread``; saves need only the indexed revision.
+* **Segments**: once the active file passes ``ZOE_PIPELINE_STORE_SEGMENT_MB``
+  its bytes are sealed verbatim into ``<stem>.seg-NNNNNN<suffix>`` and the
+  active file is rewritten IN PLACE to its last ``SEGMENT_KEEP_TAIL`` records.
+  The active inode never changes (writers ``flock`` the inode — see
+  ``scripts/maintenance/compact_pipeline_state.py`` for why a rename would
+  lose writes), and the kept tail is what ``engineering_harness_loop`` reads.
+* **Background compaction** of sealed segments: once more than
+  ``ZOE_PIPELINE_STORE_MAX_SEGMENTS`` exist they are merged into one holding
+  only the records the index still points at. Sealed segments are immutable,
+  so the heavy copy runs outside the store lock; only the final swap takes it.
+* **Recovery**: the index is a cache. Missing, unreadable, or inconsistent with
+  the files (inode/size/anchor mismatch, a segment appeared or vanished, a
+  lookup landing on the wrong record) → rebuilt by one last-match-wins scan
+  over the segments in order, then the active file. Lines appended by a writer
+  that bypassed the index are picked up incrementally from the indexed size.
+
+Crash ordering for a rollover: the sealed segment is fsync'd and renamed into
+place before the active file is touched, so a crash mid-rewrite leaves every
+record on disk at least once and the rebuild returns the same latest states.
+
+Locking is unchanged: shared ``flock`` on the active file for reads, exclusive
+for writes. The sidecar is only read or replaced while holding one of them.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# Mirrors engineering_harness_loop.DEFAULT_PIPELINE_TAIL: a rollover keeps this
+# many records in the active file so the harness tail-read diagnostics survive.
+SEGMENT_KEEP_TAIL = 200
+DEFAULT_SEGMENT_MB = 64.0
+DEFAULT_MAX_SEGMENTS = 4
+
+_COPY_CHUNK = 1 << 20
+_ACTIVE = 0  # segment id of the active file; sealed segments are numbered from 1
+
+
+def _segment_bytes() -> int:
+    try:
+        mb = float(os.environ.get("ZOE_PIPELINE_STORE_SEGMENT_MB", DEFAULT_SEGMENT_MB))
+    except ValueError:
+        mb = DEFAULT_SEGMENT_MB
+    return int(mb * 1024 * 1024) if mb > 0 else 0
+
+
+def _max_segments() -> int:
+    try:
+        return max(1, int(os.environ.get("ZOE_PIPELINE_STORE_MAX_SEGMENTS", DEFAULT_MAX_SEGMENTS)))
+    except ValueError:
+        return DEFAULT_MAX_SEGMENTS
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def segment_path(path: Path, seq: int) -> Path:
+    return path.with_name(f"{path.stem}.seg-{seq:06d}{path.suffix}")
+
+
+def _discover_segments(path: Path) -> list[int]:
+    prefix, suffix = f"{path.stem}.seg-", path.suffix
+    found = []
+    for candidate in path.parent.glob(f"{path.stem}.seg-*{suffix}"):
+        token = candidate.name[len(prefix): len(candidate.name) - len(suffix) or None]
+        if token.isdigit():
+            found.append(int(token))
+    return sorted(found)
+
+
+def _pread_exact(fd: int, length: int, offset: int) -> bytes:
+    chunks = []
+    while length > 0:
+        chunk = os.pread(fd, min(length, _COPY_CHUNK), offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        length -= len(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, length: int, dst_offset: int) -> None:
+    # Kernel-side copy first (no userspace round trip, reflinks where the
+    # filesystem can); pread/pwrite covers kernels or filesystems without it.
+    if hasattr(os, "copy_file_range"):
+        try:
+            while length > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, length, offset, dst_offset)
+                if not copied:
+                    break
+                offset += copied
+                dst_offset += copied
+                length -= copied
+        except OSError:
+            pass
+    while length > 0:
+        chunk = os.pread(src_fd, min(length, _COPY_CHUNK), offset)
+        if not chunk:
+            raise IOError(f"short read copying span at offset {offset}")
+        os.pwrite(dst_fd, chunk, dst_offset)
+        offset += len(chunk)
+        dst_offset += len(chunk)
+        length -= len(chunk)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _state_ref(raw: bytes) -> tuple[str, int] | None:
+    """``(task_ref, journal_revision)`` for a state-bearing line, else None."""
+    stripped = raw.strip()
+    if not stripped:
+        return None
+    try:
+        payload = json.loads(stripped)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    task_ref = payload.get("task_ref")
+    state = payload.get("state")
+    if not isinstance(task_ref, str) or "state" not in payload:
+        return None
+    try:
+        revision = int((state or {}).get("journal_revision") or 0)
+    except (AttributeError, TypeError, ValueError):
+        revision = 0
+    return task_ref, revision
+
+
+class _Index:
+    """In-memory form of the sidecar."""
+
+    def __init__(self) -> None:
+        self.refs: dict[str, tuple[int, int, int, int]] = {}
+        self.segments: list[int] = []
+        self.ino: int | None = None
+        self.size = 0
+        self.anchor: tuple[int, int, int] | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "active": {"ino": self.ino, "size": self.size, "anchor": self.anchor},
+            "segments": self.segments,
+            "refs": self.refs,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "_Index":
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported index version {data.get('version')!r}")
+        idx = cls()
+        active = data["active"]
+        idx.ino = active["ino"]
+        idx.size = int(active["size"])
+        idx.anchor = tuple(active["anchor"]) if active.get("anchor") else None
+        idx.segments = [int(s) for s in data["segments"]]
+        idx.refs = {ref: tuple(int(v) for v in entry) for ref, entry in data["refs"].items()}
+        return idx
+
+
+class JournalTxn:
+    """Operations available while the journal lock is held."""
+
+    def __init__(self, journal: "PipelineJournal", handle: BinaryIO, exclusive: bool):
+        self._journal = journal
+        self._handle = handle
+        self._fd = handle.fileno()
+        self._exclusive = exclusive
+
+    def revision(self, task_ref: str) -> int | None:
+        """``journal_revision`` of ``task_ref``'s latest record, without reading it."""
+        entry = self._journal._index.refs.get(task_ref)
+        return entry[3] if entry else None
+
+    def latest_record(self, task_ref: str) -> dict[str, Any] | None:
+        """The latest state-bearing record for ``task_ref`` (one seek + parse)."""
+        for attempt in range(2):
+            entry = self._journal._index.refs.get(task_ref)
+            if entry is None:
+                return None
+            raw = self._journal._read_entry(self._fd, entry)
+            if raw is not None and _state_ref(raw) == (task_ref, entry[3]):
+                return json.loads(raw)
+            if attempt:
+                break
+            logger.warning("pipeline_journal: index entry for %s is stale; rebuilding", task_ref)
+            self._journal._rebuild(self._handle)
+        return None
+
+    def append(self, record: dict[str, Any]) -> None:
+        if not self._exclusive:
+            raise RuntimeError("append requires an exclusive journal transaction")
+        self._journal._append(self._handle, record)
+
+
+class PipelineJournal:
+    def __init__(self, path: Path):
+        self.path = path
+        self._index = _Index()
+        self._index_sig: tuple[int, int, int] | None = None
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._compacting = threading.Lock()
+
+    # -- locking -----------------------------------------------------------
+
+    @contextmanager
+    def transaction(self, *, exclusive: bool, rebuild: bool = False) -> Iterator[JournalTxn]:
+        """Hold the store ``flock`` with a fresh index for the duration."""
+        with self._lock:
+            if exclusive:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.touch(exist_ok=True)
+            with self.path.open("r+b" if exclusive else "rb") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    if rebuild:
+                        self._rebuild(handle)
+                    else:
+                        self._refresh(handle)
+                    yield JournalTxn(self, handle, exclusive)
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    # -- index maintenance ---------------------------------------------------
+
+    def _sidecar_sig(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(index_path(self.path))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self, handle: BinaryIO) -> None:
+        st = os.fstat(handle.fileno())
+        sig = self._sidecar_sig()
+        idx = self._index
+        if (
+            self._loaded
+            and sig is not None
+            and sig == self._index_sig
+            and idx.ino == st.st_ino
+            and idx.size == st.st_size
+        ):
+            return
+        if not self._loaded or sig != self._index_sig:
+            if not self._load_sidecar(sig):
+                self._rebuild(handle)
+                return
+            idx = self._index
+        if idx.ino != st.st_ino or st.st_size < idx.size or not self._anchor_ok(handle.fileno()):
+            self._rebuild(handle)
+            return
+        if st.st_size > idx.size:
+            # Lines appended by a writer that bypassed the index.
+            self._scan_into(handle, _ACTIVE, idx.size)
+            self._persist()
+
+    def _load_sidecar(self, sig: tuple[int, int, int] | None) -> bool:
+        if sig is None:
+            return False
+        try:
+            with index_path(self.path).open("r", encoding="utf-8") as fh:
+                idx = _Index.from_json(json.load(fh))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("pipeline_journal: unreadable index %s: %s", index_path(self.path), exc)
+            return False
+        if idx.segments != _discover_segments(self.path):
+            return False
+        self._index, self._index_sig, self._loaded = idx, sig, True
+        return True
+
+    def _anchor_ok(self, fd: int) -> bool:
+        anchor = self._index.anchor
+        if anchor is None:
+            return self._index.size == 0
+        off, length, crc = anchor
+        if off + length != self._index.size:
+            return False
+        return zlib.crc32(_pread_exact(fd, length, off)) == crc
+
+    def _scan_into(self, handle: BinaryIO, seg: int, start: int) -> None:
+        """Index complete lines of ``handle`` from ``start`` (last match wins)."""
+        idx = self._index
+        handle.seek(start)
+        offset = start
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                break  # torn final line: left for the next append to heal
+            found = _state_ref(raw)
+            if found is not None:
+                idx.refs[found[0]] = (seg, offset, len(raw), found[1])
+            if seg == _ACTIVE:
+                idx.anchor = (offset, len(raw), zlib.crc32(raw))
+            offset += len(raw)
+        if seg == _ACTIVE:
+            idx.size = offset
+
+    def _rebuild(self, handle: BinaryIO) -> None:
+        idx = _Index()
+        self._index = idx
+        idx.segments = _discover_segments(self.path)
+        for seq in idx.segments:
+            with segment_path(self.path, seq).open("rb") as seg:
+                self._scan_into(seg, seq, 0)
+        idx.ino = os.fstat(handle.fileno()).st_ino
+        self._scan_into(handle, _ACTIVE, 0)
+        self._loaded = True
+        logger.info(
+            "pipeline_journal: rebuilt index for %s (%d refs, %d segments)",
+            self.path, len(idx.refs), len(idx.segments),
+        )
+        self._persist()
+
+    def _persist(self) -> None:
+        target = index_path(self.path)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(self._index.to_json(), fh, separators=(",", ":"))
+            os.replace(tmp, target)
+        except OSError as exc:
+            # The index is a cache; the next open rebuilds it.
+            logger.warning("pipeline_journal: could not write index %s: %s", target, exc)
+            tmp.unlink(missing_ok=True)
+            self._index_sig = None
+            return
+        self._index_sig = self._sidecar_sig()
+
+    # -- reads / writes ------------------------------------------------------
+
+    def _read_entry(self, active_fd: int, entry: tuple[int, int, int, int]) -> bytes | None:
+        seg, off, length, _rev = entry
+        if seg == _ACTIVE:
+            raw = _pread_exact(active_fd, length, off)
+        else:
+            try:
+                fd = os.open(str(segment_path(self.path, seg)), os.O_RDONLY)
+            except FileNotFoundError:
+                return None
+            try:
+                raw = _pread_exact(fd, length, off)
+            finally:
+                os.close(fd)
+        return raw
+
+    def _append(self, handle: BinaryIO, record: dict[str, Any]) -> None:
+        fd = handle.fileno()
+        idx = self._index
+        size = os.fstat(fd).st_size
+        if size > idx.size:
+            # A torn final line (crashed writer): terminate it so this record
+            # is not glued onto it and lost with it.
+            os.pwrite(fd, b"\n", size)
+            size += 1
+        line = (json.dumps(record, sort_keys=True) + "\n").encode("utf-8")
+        os.pwrite(fd, line, size)
+        found = _state_ref(line)
+        if found is not None:
+            idx.refs[found[0]] = (_ACTIVE, size, len(line), found[1])
+        idx.anchor = (size, len(line), zlib.crc32(line))
+        idx.size = size + len(line)
+        limit = _segment_bytes()
+        if limit and idx.size >= limit:
+            self._roll(handle)
+        self._persist()
+        if len(idx.segments) > _max_segments():
+            self._start_background_compaction()
+
+    def _roll(self, handle: BinaryIO) -> None:
+        """Seal the active file into a new segment; keep its tail in place."""
+        fd = handle.fileno()
+        idx = self._index
+        size = idx.size
+        tail: deque[int] = deque(maxlen=SEGMENT_KEEP_TAIL)
+        handle.seek(0)
+        offset = 0
+        for raw in handle:
+            if offset >= size:
+                break
+            tail.append(offset)
+            offset += len(raw)
+        cut = tail[0] if tail else size
+        seq = (idx.segments[-1] if idx.segments else 0) + 1
+        sealed = segment_path(self.path, seq)
+        tmp = sealed.with_name(sealed.name + ".tmp")
+        with tmp.open("wb") as dst:
+            _copy_range(fd, dst.fileno(), 0, size, 0)
+            os.fsync(dst.fileno())
+        os.replace(tmp, sealed)
+        _fsync_dir(self.path.parent)
+        # Every byte is now durable in the sealed segment; rewrite the active
+        # file in place to the tail (inode preserved for blocked writers).
+        sealed_fd = os.open(str(sealed), os.O_RDONLY)
+        try:
+            _copy_range(sealed_fd, fd, cut, size - cut, 0)
+        finally:
+            os.close(sealed_fd)
+        os.ftruncate(fd, size - cut)
+        os.fsync(fd)
+        for ref, (seg, off, length, rev) in list(idx.refs.items()):
+            if seg == _ACTIVE:
+                idx.refs[ref] = (_ACTIVE, off - cut, length, rev) if off >= cut else (seq, off, length, rev)
+        idx.segments.append(seq)
+        idx.size = size - cut
+        if idx.anchor is not None:
+            off, length, crc = idx.anchor
+            idx.anchor = (off - cut, length, crc) if idx.size else None
+        logger.info("pipeline_journal: sealed %s (%d bytes, kept %d tail bytes)", sealed, size, size - cut)
+
+    # -- compaction ------------------------------------------------------------
+
+    def _start_background_compaction(self) -> None:
+        if self._compacting.locked():
+            return
+        threading.Thread(
+            target=self._compact_quietly, name="pipeline-journal-compact", daemon=True
+        ).start()
+
+    def _compact_quietly(self) -> None:
+        try:
+            self.compact_segments()
+        except Exception:
+            logger.exception("pipeline_journal: segment compaction failed for %s", self.path)
+
+    def compact_segments(self) -> dict[str, Any]:
+        """Merge every sealed segment into one holding only live records."""
+        report: dict[str, Any] = {"path": str(self.path), "compacted": False}
+        if not self._compacting.acquire(blocking=False):
+            return report
+        lock_path = self.path.with_name(self.path.name + ".compact.lock")
+        try:
+            with lock_path.open("a") as lock_fh:
+                try:
+                    fcntl.flock(lock_fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return report  # another process is compacting
+                return self._compact_locked(report)
+        finally:
+            self._compacting.release()
+
+    def _compact_locked(self, report: dict[str, Any]) -> dict[str, Any]:
+        with self.transaction(exclusive=False):
+            segs = list(self._index.segments)
+            live: dict[int, list[tuple[int, int]]] = {seq: [] for seq in segs}
+            for seg, off, length, _rev in self._index.refs.values():
+                if seg in live:
+                    live[seg].append((off, length))
+        if len(segs) < 2:
+            return report
+        target = segs[-1]
+        merged = segment_path(self.path, target)
+        tmp = merged.with_name(merged.name + f".compact-{os.getpid()}.tmp")
+        moved: dict[tuple[int, int], int] = {}
+        bytes_before = sum(segment_path(self.path, seq).stat().st_size for seq in segs)
+        try:
+            with tmp.open("wb") as dst:
+                out = 0
+                for seq in segs:
+                    src_fd = os.open(str(segment_path(self.path, seq)), os.O_RDONLY)
+                    try:
+                        for off, length in sorted(live[seq]):
+                            _copy_range(src_fd, dst.fileno(), off, length, out)
+                            moved[(seq, off)] = out
+                            out += length
+                    finally:
+                        os.close(src_fd)
+                os.fsync(dst.fileno())
+            with self.transaction(exclusive=True):
+                idx = self._index
+                if idx.segments[: len(segs)] != segs:
+                    raise RuntimeError("segment set changed during compaction")
+                for ref, (seg, off, length, rev) in list(idx.refs.items()):
+                    new_off = moved.get((seg, off))
+                    if new_off is not None:
+                        idx.refs[ref] = (target, new_off, length, rev)
+                os.replace(tmp, merged)
+                for seq in segs[:-1]:
+                    segment_path(self.path, seq).unlink(missing_ok=True)
+                _fsync_dir(self.path.parent)
+                idx.segments = [target] + idx.segments[len(segs):]
+                self._persist()
+        finally:
+            tmp.unlink(missing_ok=True)
+        report.update(compacted=True, segments_before=len(segs), bytes_before=bytes_before,
+                      bytes_after=out, records_kept=len(moved))
+        logger.info("pipeline_journal: compacted %d segments %d -> %d bytes",
+                    len(segs), bytes_before, out)
+        return report
+
+    def rebuild_index(self) -> int:
+        """Force a full index rebuild; returns the number of indexed task_refs."""
+        with self.transaction(exclusive=False, rebuild=True):
+            return len(self._index.refs)
+
+
+_JOURNALS: dict[str, PipelineJournal] = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def journal_for(path: Path) -> PipelineJournal:
+    key = os.path.abspath(str(path))
+    with _JOURNALS_LOCK:
+        journal = _JOURNALS.get(key)
+        if journal is None:
+            journal = _JOURNALS[key] = PipelineJournal(Path(key))
+        return journal
@@ -1,9 +1,13 @@
-"""JSONL persistence for engineering pipeline runs."""
+"""JSONL persistence for engineering pipeline runs.
+
+Storage goes through :mod:`pipeline_journal`: the file stays append-only JSONL,
+but a sidecar index turns the latest-state lookup into one seek instead of a
+scan of the whole store.
+"""
 
 from __future__ import annotations
 
 import asyncio
-import fcntl
 import json
 import os
 import threading
@@ -11,6 +15,7 @@ from functools import partial
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Iterable
 
+from pipeline_journal import journal_for
 from pipeline_evidence import (
     EvidenceItem,
     PHASE_ORDER,
@@ -125,12 +130,11 @@ def _ensure_parent(path: Path) -> None:
 def _latest_state_from_lines(lines: Iterable[str], task_ref: str) -> PipelineState | None:
     """Last-match-wins scan for ``task_ref``'s newest state.
 
-    Takes any ITERABLE of lines — including an open file handle — so callers can
-    stream the store instead of materialising it. This is an event-sourced store:
-    every save_state re-appends a full state snapshot, so the file grows without
-    bound (it reached 1.59 GB before the compactor existed). Reading it whole would
-    pull all of that into RAM on a memory-tight Jetson. Only the latest matching
-    payload is retained here, so memory stays O(one state) regardless of file size.
+    The reference semantics for the store: ``pipeline_journal`` indexes the
+    same record this returns (the last state-bearing line for ``task_ref``) and
+    rebuilds its index with the same rule. Takes any ITERABLE of lines —
+    including an open file handle — so memory stays O(one state) regardless of
+    file size.
     """
     latest: PipelineState | None = None
     for line in lines:
@@ -151,21 +155,13 @@ def load_latest_state(task_ref: str) -> PipelineState | None:
     if not path.exists():
         return None
     with _LOCK:
-        with path.open("r", encoding="utf-8") as handle:
-            fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
-            try:
-                # Stream the handle: iterating it never materialises the file.
-                # The scan now runs INSIDE the shared lock (it has to — you cannot
-                # stream a handle after releasing it). That is the same lock TYPE
-                # and ordering as before, held across the parse rather than only
-                # the read. The trade is deliberate: the previous read() pulled the
-                # entire store into RAM under this very lock — 1.59 GB before the
-                # compactor existed — which is the hazard this fixes. LOCK_SH is
-                # shared, so concurrent readers are unaffected; only a LOCK_EX
-                # writer waits, and it already waited for the whole-file read.
-                return _latest_state_from_lines(handle, task_ref)
-            finally:
-                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        # Shared lock, one indexed seek: the record is read by offset, never by
+        # scanning (the store reached 1.59 GB before the compactor existed).
+        with journal_for(path).transaction(exclusive=False) as txn:
+            payload = txn.latest_record(task_ref)
+    if payload is None:
+        return None
+    return PipelineState.model_validate(payload["state"])
 
 
 async def _run_io(func, *args):
@@ -183,65 +179,61 @@ def save_state(
     path = store_path()
     with _LOCK:
         _ensure_parent(path)
-        with path.open("a+", encoding="utf-8") as handle:
-            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
-            try:
-                handle.seek(0)
-                # Stream rather than read() the whole store; already inside
-                # LOCK_EX, so the hold is unchanged. The scan leaves the position
-                # at EOF, and the append below re-seeks to SEEK_END explicitly, so
-                # the write is unaffected.
-                latest = _latest_state_from_lines(handle, state.task_ref)
-                incoming_is_stale = bool(
-                    latest and state.journal_revision < latest.journal_revision
+        with journal_for(path).transaction(exclusive=True) as txn:
+            # The index carries each task_ref's latest journal_revision, so the
+            # conflict check needs no read; only a stale-evidence merge loads
+            # the latest record itself.
+            latest_revision = txn.revision(state.task_ref)
+            incoming_is_stale = (
+                latest_revision is not None and state.journal_revision < latest_revision
+            )
+            if incoming_is_stale and not allow_stale_evidence_merge:
+                raise PipelineStateConflict(
+                    f"stale pipeline state for {state.task_ref}: "
+                    f"incoming revision {state.journal_revision}, "
+                    f"latest revision {latest_revision}"
                 )
-                if incoming_is_stale and not allow_stale_evidence_merge:
-                    raise PipelineStateConflict(
-                        f"stale pipeline state for {state.task_ref}: "
-                        f"incoming revision {state.journal_revision}, "
-                        f"latest revision {latest.journal_revision}"
-                    )
-                base_state = latest if incoming_is_stale and latest else state
-                if incoming_is_stale and latest:
-                    evidence_by_key = {
-                        json.dumps(
-                            item.model_dump(exclude={"created_at"}),
-                            sort_keys=True,
-                        ): item
-                        for item in [*latest.evidence, *state.evidence]
-                    }
-                    base_state = base_state.model_copy(
-                        update={
-                            "evidence": sorted(
-                                evidence_by_key.values(),
-                                key=lambda item: item.created_at,
-                            )
-                        }
-                    )
-                state = base_state.model_copy(
+            latest_payload = txn.latest_record(state.task_ref) if incoming_is_stale else None
+            latest = (
+                PipelineState.model_validate(latest_payload["state"]) if latest_payload else None
+            )
+            base_state = latest if incoming_is_stale and latest else state
+            if incoming_is_stale and latest:
+                evidence_by_key = {
+                    json.dumps(
+                        item.model_dump(exclude={"created_at"}),
+                        sort_keys=True,
+                    ): item
+                    for item in [*latest.evidence, *state.evidence]
+                }
+                base_state = base_state.model_copy(
                     update={
-                        "journal_revision": (
-                            latest.journal_revision + 1
-                            if latest
-                            else max(1, state.journal_revision)
+                        "evidence": sorted(
+                            evidence_by_key.values(),
+                            key=lambda item: item.created_at,
                         )
                     }
                 )
-
-                record: dict[str, Any] = {
-                    "event": event,
-                    "task_ref": state.task_ref,
-                    "phase": state.phase,
-                    "status": state.status,
-                    "state": state.model_dump(),
+            state = base_state.model_copy(
+                update={
+                    "journal_revision": (
+                        latest_revision + 1
+                        if latest_revision is not None
+                        else max(1, state.journal_revision)
+                    )
                 }
-                if extra:
-                    record["meta"] = extra
-                handle.seek(0, os.SEEK_END)
-                handle.write(json.dumps(record, sort_keys=True) + "\n")
-                handle.flush()
-            finally:
-                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            )
+
+            record: dict[str, Any] = {
+                "event": event,
+                "task_ref": state.task_ref,
+                "phase": state.phase,
+                "status": state.status,
+                "state": state.model_dump(),
+            }
+            if extra:
+                record["meta"] = extra
+            txn.append(record)
     return state
 
 
@@ -14,6 +14,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import time
 import zoneinfo
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -23,7 +24,7 @@ from db_compat import get_compat_db as _get_compat_db
 from proactive.composer import compose_message
 from proactive.session_utils import create_pending
 from proactive.scheduler import start_scheduler, stop_scheduler
-from proactive.triggers.base import ProactiveTrigger
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -52,6 +53,13 @@ _REMINDER_JOB_PREFIX = "reminder-"
 # reminder can't re-fire on every restart forever.
 _MAX_FIRE_ATTEMPTS = int(os.environ.get("ZOE_REMINDER_MAX_ATTEMPTS", "5"))
 
+# Tier-2 trigger evaluation: triggers run concurrently, each on its own pooled
+# connection. The concurrency cap is the slow loop's slice of the shared pool
+# (db_pool max_size=10 also serves every request handler); the per-trigger
+# timeout stops one wedged check from stalling the whole cycle.
+_TRIGGER_CONCURRENCY_DEFAULT = 3
+_TRIGGER_TIMEOUT_S_DEFAULT = 60.0
+
 
 def register_trigger(trigger: ProactiveTrigger) -> None:
     """Register a Tier 2 slow-loop trigger.
@@ -300,11 +308,98 @@ async def _send_push(user_id: str, message: str, extra: dict | None = None) -> i
         return 0
 
 
+def _trigger_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("ZOE_PROACTIVE_TRIGGER_CONCURRENCY", _TRIGGER_CONCURRENCY_DEFAULT)))
+    except ValueError:
+        return _TRIGGER_CONCURRENCY_DEFAULT
+
+
+def _trigger_timeout_s() -> float:
+    try:
+        return float(os.environ.get("ZOE_PROACTIVE_TRIGGER_TIMEOUT_S", _TRIGGER_TIMEOUT_S_DEFAULT))
+    except ValueError:
+        return _TRIGGER_TIMEOUT_S_DEFAULT
+
+
+def _observe_trigger_check(trigger_type: str, elapsed_s: float, outcome: str) -> None:
+    """Best-effort export of one check's latency + outcome. Never raises."""
+    try:
+        from memory_metrics import proactive_trigger_check_count, proactive_trigger_check_seconds
+
+        proactive_trigger_check_seconds.labels(trigger=trigger_type).observe(elapsed_s)
+        proactive_trigger_check_count.labels(trigger=trigger_type, outcome=outcome).inc()
+    except Exception:
+        pass  # metrics must never affect the slow loop
+
+
+async def _load_trigger_snapshot() -> TriggerSnapshot | None:
+    """One set-based read of the state every trigger consults.
+
+    On failure the cycle still runs: triggers given ``snapshot=None`` fall back
+    to their own queries.
+    """
+    try:
+        async with _get_compat_db() as db:
+            return await TriggerSnapshot.load(db)
+    except Exception as exc:
+        log.warning("Proactive trigger snapshot failed; triggers will query directly: %s", exc)
+        return None
+
+
+async def _run_trigger_check(
+    trigger: ProactiveTrigger,
+    snapshot: TriggerSnapshot | None,
+    slots: asyncio.Semaphore,
+    timeout_s: float,
+) -> list[TriggerResult]:
+    """Run one trigger on its own connection, bounded by ``slots`` and ``timeout_s``.
+
+    A failing or timed-out trigger yields ``[]`` so its peers still fire.
+    """
+    async with slots:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            async def _check() -> list[TriggerResult]:
+                async with _get_compat_db() as db:
+                    return list(await trigger.check(db, snapshot=snapshot) or [])
+
+            return await asyncio.wait_for(_check(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            log.error("Trigger %s timed out after %.0fs", trigger.trigger_type, timeout_s)
+            return []
+        except Exception as exc:
+            outcome = "error"
+            log.error("Trigger %s raised: %s", trigger.trigger_type, exc)
+            return []
+        finally:
+            _observe_trigger_check(trigger.trigger_type, time.perf_counter() - started, outcome)
+
+
+async def evaluate_triggers(triggers: list[ProactiveTrigger]) -> list[TriggerResult]:
+    """Evaluate Tier-2 triggers concurrently against a shared per-cycle snapshot.
+
+    Results come back in registration order, exactly as the old sequential
+    loop produced them, so firing order is unchanged.
+    """
+    if not triggers:
+        return []
+    snapshot = await _load_trigger_snapshot()
+    slots = asyncio.Semaphore(_trigger_concurrency())
+    timeout_s = _trigger_timeout_s()
+    batches = await asyncio.gather(
+        *(_run_trigger_check(t, snapshot, slots, timeout_s) for t in triggers)
+    )
+    return [r for batch in batches for r in batch]
+
+
 async def _slow_loop() -> None:
     """Tier 2 loop: poll registered triggers every SLOW_LOOP_INTERVAL seconds.
 
-    POOL DISCIPLINE: a pooled connection is held ONLY for the discrete
-    trigger.check() DB reads, never across fire_notification() — which can run
+    POOL DISCIPLINE: pooled connections are held ONLY for the discrete
+    trigger.check() DB reads (see evaluate_triggers), never across fire_notification() — which can run
     an LLM compose_message call plus push delivery, each potentially tens of
     seconds. Firing multiple Tier-2 results in one cycle while pinning a pool
     slot for the whole cycle risks pool exhaustion (same class of bug fixed in
@@ -323,16 +418,9 @@ async def _slow_loop() -> None:
             if _is_in_quiet_hours():
                 continue
 
-            # Step 1: short-lived conn — run every trigger.check(), then release
+            # Step 1: short-lived conns — run every trigger.check(), then release
             # before any fire_notification() (LLM + push) work happens.
-            pending: list[Any] = []
-            async with _get_compat_db() as db:
-                for trigger in _slow_triggers:
-                    try:
-                        results = await trigger.check(db)
-                        pending.extend(results)
-                    except Exception as exc:
-                        log.error("Trigger %s raised: %s", trigger.trigger_type, exc)
+            pending = await evaluate_triggers(_slow_triggers)
 
             # Step 2: NO pooled connection held across compose_message/push.
             for r in pending:
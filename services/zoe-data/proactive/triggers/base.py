@@ -16,16 +16,76 @@ class TriggerResult:
     context: dict[str, Any] = field(default_factory=dict)
 
 
+# Journal-like session titles (rough: "journal", "diary", "feeling").
+_JOURNAL_TITLE_SQL = "(title LIKE '%journal%' OR title LIKE '%diary%' OR title LIKE '%feeling%')"
+
+
+@dataclass
+class TriggerSnapshot:
+    """Per-cycle view shared by every Tier-2 trigger.
+
+    The slow loop loads this ONCE per cycle with a handful of set-based queries,
+    so triggers answer "who is active / who already got one today" with a set
+    lookup instead of each re-running the same scans (and a query per user).
+    It is read-only: a trigger that needs per-user content still queries it.
+
+    active_users:    user_id -> display name ("" when unknown), for anyone who
+                     chatted in the last 7 days.
+    pending_today:   (trigger_type, user_id) with any proactive_pending row today.
+    unclaimed_today: the subset whose row is still unclaimed (claimed=0).
+    journal_users:   user_ids with a journal-like session in the last 3 days.
+    """
+    active_users: dict[str, str] = field(default_factory=dict)
+    pending_today: set[tuple[str, str]] = field(default_factory=set)
+    unclaimed_today: set[tuple[str, str]] = field(default_factory=set)
+    journal_users: set[str] = field(default_factory=set)
+
+    @classmethod
+    async def load(cls, db) -> "TriggerSnapshot":
+        snap = cls()
+        async with db.execute(
+            """SELECT DISTINCT cs.user_id, u.name AS username
+               FROM chat_sessions cs
+               LEFT JOIN users u ON u.id = cs.user_id
+               WHERE cs.created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
+        ) as cur:
+            async for row in cur:
+                snap.active_users[row[0]] = row[1] or ""
+        async with db.execute(
+            "SELECT DISTINCT trigger_type, user_id, claimed FROM proactive_pending "
+            "WHERE created_at::date = CURRENT_DATE"
+        ) as cur:
+            async for row in cur:
+                snap.pending_today.add((row[0], row[1]))
+                if not row[2]:
+                    snap.unclaimed_today.add((row[0], row[1]))
+        async with db.execute(
+            "SELECT DISTINCT user_id FROM chat_sessions "
+            "WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '3 days') "
+            f"AND {_JOURNAL_TITLE_SQL}"
+        ) as cur:
+            snap.journal_users = {row[0] async for row in cur}
+        return snap
+
+    def fired_today(self, trigger_type: str, *, unclaimed_only: bool = False) -> set[str]:
+        """user_ids that already have a ``trigger_type`` row today."""
+        pairs = self.unclaimed_today if unclaimed_only else self.pending_today
+        return {user_id for t, user_id in pairs if t == trigger_type}
+
+
 class ProactiveTrigger(ABC):
     """
     Abstract trigger.  Two tiers derive from this:
       - Tier 1: APScheduler-backed (reminders) — uses register_job / cancel_job.
       - Tier 2: Slow-loop (OpenClaw checks) — implements should_fire / compose.
+
+    The slow loop passes a per-cycle ``TriggerSnapshot``; ``snapshot=None``
+    (direct callers, tests) means the trigger runs its own queries.
     """
 
     trigger_type: str = "base"
 
     @abstractmethod
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         """Return a list of TriggerResults ready to fire now."""
         ...
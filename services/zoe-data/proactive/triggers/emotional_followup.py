@@ -24,7 +24,7 @@ import re
 import zoneinfo
 from datetime import datetime, timezone
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -85,7 +85,7 @@ def _fallback_message(fact: str) -> str:
 class EmotionalFollowUpTrigger(ProactiveTrigger):
     trigger_type = "emotional_followup"
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         if not _enabled():
             return []
         now = datetime.now(_ZOE_TZ)
@@ -95,15 +95,20 @@ class EmotionalFollowUpTrigger(ProactiveTrigger):
         # Active users (anyone who chatted in the last 7 days) — same population
         # the morning brief serves. Best-effort: a transient DB error here must not
         # crash the slow-loop cycle for every trigger (peer triggers do the same).
-        try:
-            async with db.execute(
-                """SELECT DISTINCT user_id FROM chat_sessions
-                   WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
-            ) as cur:
-                users = [row[0] async for row in cur]
-        except Exception as exc:
-            log.warning("emotional_followup: active-user query failed: %s", exc)
-            return []
+        if snapshot is not None:
+            users = list(snapshot.active_users)
+            capped = snapshot.fired_today(self.trigger_type)
+        else:
+            capped = None
+            try:
+                async with db.execute(
+                    """SELECT DISTINCT user_id FROM chat_sessions
+                       WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
+                ) as cur:
+                    users = [row[0] async for row in cur]
+            except Exception as exc:
+                log.warning("emotional_followup: active-user query failed: %s", exc)
+                return []
 
         results: list[TriggerResult] = []
         for user_id in users:
@@ -114,13 +119,17 @@ class EmotionalFollowUpTrigger(ProactiveTrigger):
             try:
                 # Daily cap: at most one emotional follow-up per user per day (any
                 # claimed/unclaimed row today) so multiple worries never barrage.
-                async with db.execute(
-                    "SELECT 1 FROM proactive_pending WHERE trigger_type=? AND user_id=? "
-                    "AND created_at::date = CURRENT_DATE LIMIT 1",
-                    (self.trigger_type, user_id),
-                ) as cur:
-                    if await cur.fetchone():
+                if capped is not None:
+                    if user_id in capped:
                         continue
+                else:
+                    async with db.execute(
+                        "SELECT 1 FROM proactive_pending WHERE trigger_type=? AND user_id=? "
+                        "AND created_at::date = CURRENT_DATE LIMIT 1",
+                        (self.trigger_type, user_id),
+                    ) as cur:
+                        if await cur.fetchone():
+                            continue
                 moment = await self._pick_moment(db, user_id, now)
             except Exception as exc:
                 log.warning("emotional_followup: check failed for user %s: %s", user_id, exc)
@@ -3,7 +3,7 @@ import os
 import zoneinfo
 from datetime import datetime
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 _ZOE_TZ = zoneinfo.ZoneInfo(os.environ.get("ZOE_TIMEZONE", "Australia/Perth"))
 
@@ -11,44 +11,45 @@ _ZOE_TZ = zoneinfo.ZoneInfo(os.environ.get("ZOE_TIMEZONE", "Australia/Perth"))
 class EveningWindDownTrigger(ProactiveTrigger):
     trigger_type = "evening_windown"
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         now = datetime.now(_ZOE_TZ)
         # Only fire between 21:00 and 22:00
         if now.hour != 21:
             return []
 
-        today = now.date().isoformat()
+        if snapshot is not None:
+            already_fired = snapshot.fired_today(self.trigger_type)
+            users = list(snapshot.active_users)
+            journalled = snapshot.journal_users
+        else:
+            # Check already fired today
+            async with db.execute(
+                "SELECT user_id FROM proactive_pending WHERE trigger_type=? AND created_at::date = CURRENT_DATE",
+                ("evening_windown",),
+            ) as cur:
+                already_fired = {row[0] async for row in cur}
 
-        # Check already fired today
-        async with db.execute(
-            "SELECT user_id FROM proactive_pending WHERE trigger_type=? AND created_at::date = CURRENT_DATE",
-            ("evening_windown",),
-        ) as cur:
-            already_fired = {row[0] async for row in cur}
+            # Get active users (anyone who chatted in last 7 days)
+            async with db.execute(
+                "SELECT DISTINCT user_id FROM chat_sessions "
+                "WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"
+            ) as cur:
+                users = [row[0] async for row in cur]
 
-        # Get active users (anyone who chatted in last 7 days)
-        async with db.execute(
-            "SELECT DISTINCT user_id FROM chat_sessions "
-            "WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"
-        ) as cur:
-            users = [row[0] async for row in cur]
+            # Users with a journal-like session in the last 3 days (rough: look
+            # for "journal", "diary", "feeling") — one set query, not one per user.
+            async with db.execute(
+                """SELECT DISTINCT user_id FROM chat_sessions
+                   WHERE created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '3 days')
+                   AND (title LIKE '%journal%' OR title LIKE '%diary%' OR title LIKE '%feeling%')"""
+            ) as cur:
+                journalled = {row[0] async for row in cur}
 
         results = []
         for user_id in users:
             if user_id in already_fired:
                 continue
-
-            # Check last journal-like message (rough: look for "journal", "diary", "feeling")
-            async with db.execute(
-                """SELECT COUNT(*) FROM chat_sessions
-                   WHERE user_id=? AND created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '3 days')
-                   AND (title LIKE '%journal%' OR title LIKE '%diary%' OR title LIKE '%feeling%')""",
-                (user_id,),
-            ) as cur:
-                row = await cur.fetchone()
-                recent_journal = row[0] if row else 0
-
-            if recent_journal > 0:
+            if user_id in journalled:
                 continue  # Already journalled recently
 
             results.append(
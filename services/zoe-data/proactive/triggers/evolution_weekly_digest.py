@@ -17,7 +17,7 @@ import time
 import zoneinfo
 from datetime import datetime
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class EvolutionWeeklyDigestTrigger(ProactiveTrigger):
         super().__init__()
         self._last_fired_week: int = -1
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         """Fire once per week on Friday at 6pm local time."""
         now = datetime.now(_ZOE_TZ)
         if now.weekday() != _FIRE_DAY_OF_WEEK:
@@ -46,18 +46,21 @@ class EvolutionWeeklyDigestTrigger(ProactiveTrigger):
         if week_number == self._last_fired_week:
             return []
 
-        # Get active users (anyone who chatted in last 7 days)
-        try:
-            async with db.execute(
-                """SELECT DISTINCT cs.user_id, u.name AS username
-                   FROM chat_sessions cs
-                   LEFT JOIN users u ON u.id = cs.user_id
-                   WHERE cs.created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
-            ) as cur:
-                users = [(row[0], row[1] or "") async for row in cur]
-        except Exception as exc:
-            log.warning("EvolutionWeeklyDigest: failed to fetch users: %s", exc)
-            users = []
+        if snapshot is not None:
+            users = list(snapshot.active_users.items())
+        else:
+            # Get active users (anyone who chatted in last 7 days)
+            try:
+                async with db.execute(
+                    """SELECT DISTINCT cs.user_id, u.name AS username
+                       FROM chat_sessions cs
+                       LEFT JOIN users u ON u.id = cs.user_id
+                       WHERE cs.created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
+                ) as cur:
+                    users = [(row[0], row[1] or "") async for row in cur]
+            except Exception as exc:
+                log.warning("EvolutionWeeklyDigest: failed to fetch users: %s", exc)
+                users = []
 
         if not users:
             return []
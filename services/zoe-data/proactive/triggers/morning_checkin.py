@@ -8,7 +8,7 @@ import os
 import zoneinfo
 from datetime import datetime, timedelta
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -191,7 +191,7 @@ def _compose_morning_message(ctx: dict, user_name: str, day_str: str) -> str:
 class MorningCheckInTrigger(ProactiveTrigger):
     trigger_type = "morning_checkin"
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         now = datetime.now(_ZOE_TZ)
         # Only fire between 7:30 and 8:30am
         if not (_FIRE_HOUR <= now.hour < _FIRE_HOUR + 1 and now.minute >= _FIRE_MINUTE):
@@ -199,21 +199,25 @@ class MorningCheckInTrigger(ProactiveTrigger):
 
         today = now.date().isoformat()
 
-        # Check already fired today for each active user
-        async with db.execute(
-            "SELECT user_id FROM proactive_pending WHERE trigger_type=? AND created_at::date = CURRENT_DATE AND claimed=0",
-            ("morning_checkin",),
-        ) as cur:
-            already_fired = {row[0] async for row in cur}
-
-        # Get active users with their display names (anyone who chatted in last 7 days)
-        async with db.execute(
-            """SELECT DISTINCT cs.user_id, u.name AS username
-               FROM chat_sessions cs
-               LEFT JOIN users u ON u.id = cs.user_id
-               WHERE cs.created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
-        ) as cur:
-            users = [(row[0], row[1] or "") async for row in cur]
+        if snapshot is not None:
+            already_fired = snapshot.fired_today(self.trigger_type, unclaimed_only=True)
+            users = list(snapshot.active_users.items())
+        else:
+            # Check already fired today for each active user
+            async with db.execute(
+                "SELECT user_id FROM proactive_pending WHERE trigger_type=? AND created_at::date = CURRENT_DATE AND claimed=0",
+                ("morning_checkin",),
+            ) as cur:
+                already_fired = {row[0] async for row in cur}
+
+            # Get active users with their display names (anyone who chatted in last 7 days)
+            async with db.execute(
+                """SELECT DISTINCT cs.user_id, u.name AS username
+                   FROM chat_sessions cs
+                   LEFT JOIN users u ON u.id = cs.user_id
+                   WHERE cs.created_at::timestamptz > (CURRENT_TIMESTAMP - INTERVAL '7 days')"""
+            ) as cur:
+                users = [(row[0], row[1] or "") async for row in cur]
 
         results = []
         for user_id, username in users:
@@ -12,9 +12,8 @@ import logging
 import os
 from typing import Any
 
-import httpx
-
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+import http_clients
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -59,7 +58,7 @@ class OpenClawTrigger(ProactiveTrigger):
         or None on failure.
         """
         try:
-            async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+            async with http_clients.session("hermes", timeout=_TIMEOUT) as client:
                 r = await client.post(
                     _HERMES_URL,
                     headers=_hermes_headers(session_id=f"proactive-trigger:{self.trigger_type}"),
@@ -89,7 +88,7 @@ class OpenClawTrigger(ProactiveTrigger):
             log.warning("OpenClawTrigger._run_hermes failed: %s", exc)
             return None
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         results: list[TriggerResult] = []
         context: dict[str, Any] = {}
         prompt = self._build_prompt(context)
@@ -10,7 +10,7 @@ import os
 import zoneinfo
 from datetime import datetime, date
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ class PeopleHealthTrigger(ProactiveTrigger):
 
     trigger_type = "people_health"
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         now_local = datetime.now(_ZOE_TZ)
         if now_local.hour != _FIRE_HOUR:
             return []
@@ -23,7 +23,7 @@ import re
 import zoneinfo
 from datetime import datetime, timedelta, timezone, date
 
-from proactive.triggers.base import ProactiveTrigger, TriggerResult
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -156,7 +156,7 @@ class ReminderScanTrigger(ProactiveTrigger):
 
     trigger_type = "reminder_scan"
 
-    async def check(self, db) -> list[TriggerResult]:
+    async def check(self, db, snapshot: TriggerSnapshot | None = None) -> list[TriggerResult]:
         now_utc = datetime.now(timezone.utc)
 
         # Fetch active, unacknowledged, non-deleted reminders that have a due_time
@@ -1,11 +1,90 @@
 import asyncio
 import json
-from typing import Dict, Set
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from fastapi import WebSocket
 import logging
 
+from typed_env import env_float, env_int
+
 logger = logging.getLogger(__name__)
 
+# Per-connection send queue bound. A consumer that falls this far behind has
+# its backlog collapsed into one "resync" frame (it can catch up from the
+# replay buffer) instead of growing the queue without limit.
+PUSH_QUEUE_MAX_DEFAULT = 256
+# Recent events kept per channel for catchup(since_sequence).
+PUSH_REPLAY_MAX_DEFAULT = 512
+# One socket write longer than this marks the connection dead; it is dropped.
+PUSH_SEND_TIMEOUT_S_DEFAULT = 10.0
+# How long broadcast() waits for idle connections' writers to confirm delivery
+# before returning the count so far. A healthy socket write only hits the
+# transport buffer (well under a millisecond); one that takes longer is under
+# backpressure, and every connection has its own writer, so this only bounds
+# how long the caller waits for its count.
+PUSH_DELIVERY_WAIT_S_DEFAULT = 0.05
+
+
+def _dumps(message: dict) -> str:
+    # Same encoding as Starlette's WebSocket.send_json, so clients see
+    # identical frames now that each event is serialized once for everyone.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def _observe(metric: str, kind: str, value: float = 1.0, reason: Optional[str] = None) -> None:
+    try:
+        import memory_metrics
+        if metric == "depth":
+            memory_metrics.push_queue_depth.labels(kind=kind).observe(value)
+        elif metric == "latency":
+            memory_metrics.push_send_latency_seconds.labels(kind=kind).observe(value)
+        elif metric == "dropped":
+            memory_metrics.push_dropped_count.labels(kind=kind, reason=reason).inc(value)
+        elif metric == "replay":
+            memory_metrics.push_replay_count.labels(result=kind).inc(value)
+    except Exception:
+        pass
+
+
+class _Frame:
+    """One serialized event waiting on a connection's queue."""
+
+    __slots__ = ("seq", "text", "enqueued_at", "ack", "resync")
+
+    def __init__(self, seq: int, text: Optional[str], ack: Optional[asyncio.Future] = None,
+                 resync: bool = False):
+        self.seq = seq
+        self.text = text
+        self.enqueued_at = time.perf_counter()
+        self.ack = ack
+        self.resync = resync
+
+    def resolve(self, delivered: bool) -> None:
+        if self.ack is not None and not self.ack.done():
+            self.ack.set_result(delivered)
+
+
+class _Connection:
+    """A subscribed socket's send queue, writer task and subscription state."""
+
+    __slots__ = ("ws", "user_id", "kind", "channels", "queue", "wake", "writer", "sending", "closing",
+                 "resync_from")
+
+    def __init__(self, ws: WebSocket, user_id: Optional[str], kind: str, channels: Set[str]):
+        self.ws = ws
+        self.user_id = user_id
+        self.kind = kind
+        self.channels = channels
+        self.queue: Deque[_Frame] = deque()
+        self.wake = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.sending = False
+        self.closing = False
+        # Sequence after which this connection missed events (backlog coalesced).
+        self.resync_from: Optional[int] = None
+
 
 class PushBroadcaster:
     """WebSocket push broadcaster for real-time UI updates.
@@ -18,15 +97,62 @@ class PushBroadcaster:
     only delivered to connections owned by that user, preventing cross-user
     data leakage.  Panel connections are exempt from user scoping (they use
     connect_panel and broadcast_to_panel instead).
+
+    Fan-out: each event is serialized once and put on every target
+    connection's bounded queue; a writer task per connection drains it, so a
+    slow or half-dead panel only delays itself. On overflow the connection's
+    backlog is coalesced into a single ``resync`` frame; a write that times
+    out or fails drops the connection. Each channel keeps a ring buffer of
+    recent events so catchup(since_sequence) can replay what a reconnecting
+    client missed instead of forcing a full reload. Sequences restart with the
+    process, so every frame carries this process's ``epoch`` and a catchup
+    from another epoch gets a full refresh.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        queue_max: Optional[int] = None,
+        replay_max: Optional[int] = None,
+        send_timeout_s: Optional[float] = None,
+        delivery_wait_s: Optional[float] = None,
+    ):
         self._connections: Dict[str, Set[WebSocket]] = {}
         # Track which panel_id owns each WebSocket for disconnect cleanup.
         self._ws_panels: Dict[WebSocket, str] = {}
         # Map WebSocket → user_id for scoped delivery (None = panel/anonymous).
         self._ws_users: Dict[WebSocket, str | None] = {}
+        self._conns: Dict[WebSocket, _Connection] = {}
+        # channel → recent (sequence, serialized event, user_id scope).
+        self._replay: Dict[str, Deque[Tuple[int, str, Optional[str]]]] = {}
+        # channel → highest sequence evicted from its ring (replay gap marker).
+        self._replay_floor: Dict[str, int] = {}
         self._sequence = 0
+        self.epoch = uuid.uuid4().hex[:12]
+        self.queue_max = max(1, queue_max if queue_max is not None
+                             else env_int("ZOE_PUSH_QUEUE_MAX", PUSH_QUEUE_MAX_DEFAULT))
+        self.replay_max = max(0, replay_max if replay_max is not None
+                              else env_int("ZOE_PUSH_REPLAY_MAX", PUSH_REPLAY_MAX_DEFAULT))
+        self.send_timeout_s = (send_timeout_s if send_timeout_s is not None
+                               else env_float("ZOE_PUSH_SEND_TIMEOUT_S", PUSH_SEND_TIMEOUT_S_DEFAULT))
+        self.delivery_wait_s = (delivery_wait_s if delivery_wait_s is not None
+                                else env_float("ZOE_PUSH_DELIVERY_WAIT_S", PUSH_DELIVERY_WAIT_S_DEFAULT))
+
+    # ── subscription ────────────────────────────────────────────────────────
+
+    def _register(self, websocket: WebSocket, user_id: Optional[str], kind: str,
+                  channels: Set[str]) -> _Connection:
+        old = self._conns.get(websocket)
+        if old is not None:
+            old.channels |= channels
+            return old
+        conn = _Connection(websocket, user_id, kind, set(channels))
+        self._conns[websocket] = conn
+        return conn
+
+    def _start_writer(self, conn: _Connection) -> None:
+        if conn.writer is None:
+            conn.writer = asyncio.ensure_future(self._write_loop(conn))
 
     async def connect(self, websocket: WebSocket, channel: str = "all", user_id: str | None = None):
         await websocket.accept()
@@ -34,11 +160,15 @@ class PushBroadcaster:
             self._connections[channel] = set()
         self._connections[channel].add(websocket)
         self._ws_users[websocket] = user_id
+        conn = self._register(websocket, user_id, "user" if user_id else "anon", {channel})
         await websocket.send_json({
             "type": "connected",
             "channel": channel,
-            "sequence": self._sequence
+            "sequence": self._sequence,
+            "epoch": self.epoch,
         })
+        # Events broadcast during the ack above wait on the queue and follow it.
+        self._start_writer(conn)
 
     async def connect_panel(self, websocket: WebSocket, panel_id: str):
         """Subscribe a panel WebSocket to both 'all' (global) and its own panel channel."""
@@ -49,12 +179,15 @@ class PushBroadcaster:
                 self._connections[ch] = set()
             self._connections[ch].add(websocket)
         self._ws_panels[websocket] = panel_id
+        conn = self._register(websocket, None, "panel", {"all", panel_channel})
         await websocket.send_json({
             "type": "connected",
             "channel": panel_channel,
             "panel_id": panel_id,
             "sequence": self._sequence,
+            "epoch": self.epoch,
         })
+        self._start_writer(conn)
 
     def disconnect(self, websocket: WebSocket, channel: str = "all"):
         if channel in self._connections:
@@ -68,6 +201,128 @@ class PushBroadcaster:
             if "all" in self._connections:
                 self._connections["all"].discard(websocket)
         self._ws_users.pop(websocket, None)
+        conn = self._conns.pop(websocket, None)
+        if conn is not None:
+            for ch in conn.channels:
+                if ch in self._connections:
+                    self._connections[ch].discard(websocket)
+            # The writer still flushes frames queued before the disconnect
+            # (a send to a closed socket fails fast), then exits.
+            conn.closing = True
+            conn.wake.set()
+            if conn.writer is None:
+                self._fail_queue(conn)
+
+    # ── per-connection queue ────────────────────────────────────────────────
+
+    def _fail_queue(self, conn: _Connection) -> None:
+        while conn.queue:
+            conn.queue.popleft().resolve(False)
+
+    def _enqueue(self, conn: _Connection, frame: _Frame) -> None:
+        if conn.closing:
+            frame.resolve(False)
+            return
+        if conn.resync_from is not None:
+            # Backlog already collapsed: the pending resync frame covers this.
+            frame.resolve(False)
+            _observe("dropped", conn.kind, reason="coalesced")
+            return
+        if len(conn.queue) >= self.queue_max:
+            coalesced = len(conn.queue) + 1
+            conn.resync_from = min(conn.queue[0].seq, frame.seq) - 1
+            self._fail_queue(conn)
+            frame.resolve(False)
+            conn.queue.append(_Frame(frame.seq, None, resync=True))
+            conn.wake.set()
+            _observe("dropped", conn.kind, coalesced, reason="coalesced")
+            logger.info("push: %s connection fell %d frames behind; coalesced into resync",
+                        conn.kind, coalesced)
+            return
+        conn.queue.append(frame)
+        conn.wake.set()
+        _observe("depth", conn.kind, len(conn.queue))
+
+    def _drop(self, conn: _Connection, reason: str) -> None:
+        _observe("dropped", conn.kind, reason=reason)
+        logger.info("push: dropping %s connection (%s)", conn.kind, reason)
+        for ch in list(conn.channels):
+            self.disconnect(conn.ws, ch)
+        if reason == "send_timeout":
+            asyncio.ensure_future(self._close_quietly(conn.ws))
+
+    async def _close_quietly(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(1013, "Slow consumer"), 1.0)
+        except Exception:
+            pass
+
+    async def _write_loop(self, conn: _Connection) -> None:
+        ws = conn.ws
+        while True:
+            if not conn.queue:
+                if conn.closing:
+                    return
+                conn.wake.clear()
+                await conn.wake.wait()
+                continue
+            frame = conn.queue.popleft()
+            text = frame.text
+            if frame.resync:
+                text = _dumps({
+                    "type": "resync",
+                    "since_sequence": conn.resync_from,
+                    "current_sequence": self._sequence,
+                    "epoch": self.epoch,
+                })
+                conn.resync_from = None
+            conn.sending = True
+            try:
+                await asyncio.wait_for(ws.send_text(text), self.send_timeout_s)
+            except Exception as exc:
+                frame.resolve(False)
+                if not conn.closing:
+                    self._drop(conn, "send_timeout" if isinstance(exc, asyncio.TimeoutError) else "send_failed")
+                self._fail_queue(conn)
+                return
+            finally:
+                conn.sending = False
+            frame.resolve(True)
+            _observe("latency", conn.kind, time.perf_counter() - frame.enqueued_at)
+
+    # ── replay buffer ───────────────────────────────────────────────────────
+
+    def _remember(self, channel: str, seq: int, text: str, user_id: Optional[str]) -> None:
+        if self.replay_max <= 0:
+            return
+        ring = self._replay.get(channel)
+        if ring is None:
+            ring = self._replay[channel] = deque(maxlen=self.replay_max)
+        if len(ring) == ring.maxlen:
+            self._replay_floor[channel] = ring[0][0]
+        ring.append((seq, text, user_id))
+
+    def _missed(self, conn: _Connection, since_sequence: int,
+                epoch: Optional[str] = None) -> Optional[List[Tuple[int, str]]]:
+        """Events after ``since_sequence`` visible to ``conn``, or None if any were evicted."""
+        if epoch is not None and epoch != self.epoch:
+            return None  # sequence from before a restart
+        if since_sequence > self._sequence:
+            return None  # same, for a client that sent no epoch
+        missed: List[Tuple[int, str]] = []
+        for ch in conn.channels:
+            if self._replay_floor.get(ch, 0) > since_sequence:
+                return None
+            for seq, text, scope in self._replay.get(ch, ()):
+                if seq <= since_sequence:
+                    continue
+                if scope is not None and conn.user_id is not None and scope != conn.user_id:
+                    continue
+                missed.append((seq, text))
+        missed.sort()
+        return missed
+
+    # ── fan-out ─────────────────────────────────────────────────────────────
 
     async def broadcast(
         self,
@@ -82,37 +337,40 @@ class PushBroadcaster:
         user.  Connections without an associated user (panels, anonymous) are
         always included so that global events still reach them.
 
-        Returns the number of subscribers that received the message
-        successfully.  Returns 0 if the channel has no connections or all
-        sends failed.
+        Returns the number of subscribers whose writer confirmed the send
+        within ``delivery_wait_s`` (a connection still busy with earlier
+        frames counts if its backlog drains in that window).  Returns 0 if the
+        channel has no connections or all sends failed.
         """
         self._sequence += 1
-        message = {
+        seq = self._sequence
+        text = _dumps({
             "type": event_type,
             "channel": channel,
             "data": data,
-            "sequence": self._sequence
-        }
+            "sequence": seq,
+            "epoch": self.epoch,
+        })
+        self._remember(channel, seq, text, user_id)
         if channel not in self._connections:
             return 0
 
-        dead = set()
-        delivered = 0
+        loop = asyncio.get_running_loop()
+        acks = []
         for ws in list(self._connections[channel]):
+            conn = self._conns.get(ws)
+            if conn is None:
+                continue
             # Skip if this connection belongs to a different user.
-            ws_user = self._ws_users.get(ws)
-            if user_id is not None and ws_user is not None and ws_user != user_id:
+            if user_id is not None and conn.user_id is not None and conn.user_id != user_id:
                 continue
-            try:
-                await ws.send_json(message)
-                delivered += 1
-            except Exception:
-                dead.add(ws)
-
-        for ws in dead:
-            self.disconnect(ws, channel)
-
-        return delivered
+            ack = loop.create_future()
+            acks.append(ack)
+            self._enqueue(conn, _Frame(seq, text, ack))
+        if not acks:
+            return 0
+        done, _ = await asyncio.wait(acks, timeout=self.delivery_wait_s)
+        return sum(1 for ack in done if ack.result())
 
     async def broadcast_to_panel(self, panel_id: str, event_type: str, data: dict) -> int:
         """Send an event to the named panel's dedicated channel.
@@ -132,16 +390,63 @@ class PushBroadcaster:
 
     async def broadcast_all(self, event_type: str, data: dict):
         """Broadcast to all channels."""
-        for channel in list(self._connections.keys()):
-            await self.broadcast(channel, event_type, data)
+        await asyncio.gather(*(
+            self.broadcast(channel, event_type, data) for channel in list(self._connections.keys())
+        ))
 
-    async def catchup(self, websocket: WebSocket, since_sequence: int):
-        """Client reconnection catch-up. For now, just send current sequence."""
-        await websocket.send_json({
+    async def catchup(self, websocket: WebSocket, since_sequence: int,
+                      epoch: Optional[str] = None):
+        """Client reconnection catch-up: replay events after ``since_sequence``.
+
+        Replayed frames are the original serialized events, queued behind
+        anything already pending for the socket, followed by a ``catchup``
+        summary. A client can see an event twice (live, then replayed) and
+        should skip sequences it already has. When the ring buffer no longer
+        reaches back that far, only the summary is sent and a full state
+        refresh is recommended, as before. So it is when ``epoch`` (from the
+        frames the client last saw) is not this process's: its sequence
+        numbers belong to an earlier boot.
+        """
+        conn = self._conns.get(websocket)
+        missed = self._missed(conn, since_sequence, epoch) if conn is not None else None
+        if missed is None or len(missed) > self.queue_max:
+            _observe("replay", "full_refresh")
+            summary = {
+                "type": "catchup",
+                "current_sequence": self._sequence,
+                "epoch": self.epoch,
+                "replayed": 0,
+                "message": "Full state refresh recommended"
+            }
+            if conn is None:
+                await websocket.send_json(summary)
+            else:
+                self._enqueue(conn, _Frame(self._sequence, _dumps(summary)))
+            return
+        _observe("replay", "replayed")
+        for seq, text in missed:
+            self._enqueue(conn, _Frame(seq, text))
+        self._enqueue(conn, _Frame(self._sequence, _dumps({
             "type": "catchup",
+            "since_sequence": since_sequence,
             "current_sequence": self._sequence,
-            "message": "Full state refresh recommended"
-        })
+            "epoch": self.epoch,
+            "replayed": len(missed),
+        })))
+
+    def stats(self) -> dict:
+        """Connection and queue snapshot for diagnostics."""
+        return {
+            "sequence": self._sequence,
+            "epoch": self.epoch,
+            "channels": {ch: len(conns) for ch, conns in self._connections.items()},
+            "connections": [
+                {"kind": c.kind, "channels": sorted(c.channels), "queue_depth": len(c.queue),
+                 "resync_pending": c.resync_from is not None}
+                for c in self._conns.values()
+            ],
+            "replay": {ch: len(ring) for ch, ring in self._replay.items()},
+        }
 
 
 broadcaster = PushBroadcaster()
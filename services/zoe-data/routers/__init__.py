@@ -19,7 +19,6 @@ from .capability_matrix import router as capability_matrix_router
 from .music import router as music_router
 from .skybridge import router as skybridge_router
 from .autoresearch import router as autoresearch_router
-from .pi_intent_lab import router as pi_intent_lab_router
 
 __all__ = [
     "people_router",
@@ -43,5 +42,14 @@ __all__ = [
     "music_router",
     "skybridge_router",
     "autoresearch_router",
-    "pi_intent_lab_router",
 ]
+
+
+def __getattr__(name):
+    # The Pi intent lab router is mounted lazily by main (see lazy_routers), so
+    # importing this package must not import it. Still reachable by name.
+    if name == "pi_intent_lab_router":
+        from .pi_intent_lab import router
+
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
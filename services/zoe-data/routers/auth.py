@@ -2,17 +2,23 @@
 Auth-related endpoints for zoe-data.
 
 Currently exposes:
-  POST /api/auth/logout  — invalidate the caller's session in zoe-auth and
-                           immediately evict it from the local _session_cache so
-                           the session cannot be replayed for up to CACHE_TTL_SECONDS.
+  POST /api/auth/logout      — invalidate the caller's session in zoe-auth and
+                               immediately evict it from the local _session_cache so
+                               the session cannot be replayed for up to CACHE_TTL_SECONDS.
+  POST /api/auth/invalidate  — internal: zoe-auth pushes logouts, role changes and
+                               escalations here (core/invalidation.py over there) so
+                               cached validations are dropped instead of aging out.
 """
 import logging
 import os
+from typing import List
 
 import httpx
 from fastapi import APIRouter, Depends, Request
+from pydantic import BaseModel, Field
 
 import auth as _auth_module
+import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +46,7 @@ async def logout(
     if session_id:
         try:
             timeout = httpx.Timeout(5.0, connect=3.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with http_clients.session("zoe_auth", timeout=timeout) as client:
                 resp = await client.post(
                     f"{ZOE_AUTH_URL}/api/auth/logout",
                     headers={"X-Session-ID": session_id},
@@ -56,8 +62,7 @@ async def logout(
             logger.warning("auth/logout: upstream call failed (%s) — evicting cache anyway", exc)
 
     # ── Evict immediately from local cache (fix ZOE-ea67ad3a) ─────────────────
-    if session_id and session_id in _auth_module._session_cache:
-        del _auth_module._session_cache[session_id]
+    if session_id and _auth_module.invalidate_sessions(session_ids=[session_id]):
         logger.info(
             "auth/logout: evicted session %s... from local cache (user=%s)",
             session_id[:20],
@@ -65,3 +70,28 @@ async def logout(
         )
 
     return {"ok": True, "upstream_invalidated": upstream_ok}
+
+
+class SessionInvalidation(BaseModel):
+    session_ids: List[str] = Field(default_factory=list, max_length=10000)
+    user_ids: List[str] = Field(default_factory=list, max_length=10000)
+    reasons: List[str] = Field(default_factory=list, max_length=32)
+    all: bool = False
+
+
+@router.post("/invalidate", dependencies=[Depends(_auth_module.require_internal_token)])
+async def invalidate(body: SessionInvalidation):
+    """Drop cached session validations named by zoe-auth (internal only).
+
+    Loopback or X-Internal-Token: the worst a caller can do here is force
+    re-validation, so the standard internal gate is enough.
+    """
+    dropped = _auth_module.invalidate_sessions(
+        session_ids=body.session_ids, user_ids=body.user_ids, everything=body.all,
+    )
+    logger.info(
+        "auth/invalidate: %d session(s), %d user(s)%s -> dropped %d cached (%s)",
+        len(body.session_ids), len(body.user_ids), " +all" if body.all else "",
+        dropped, ",".join(body.reasons) or "-",
+    )
+    return {"ok": True, "dropped": dropped}
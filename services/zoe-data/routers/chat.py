@@ -358,6 +358,7 @@ from brain_dispatch import (
 from auth import get_current_user, resolve_acting_user
 from database import get_db
 from db_pool import get_db_ctx
+from keyed_state import KeyedState
 from ui_orchestrator import enqueue_ui_action
 from zoe_ui_components import auto_extract_components
 from research_evidence import (
@@ -1098,17 +1099,24 @@ async def _chatgpt_connect_flow(emit, enc, recorder, assistant_message_id, tool_
 # Per-session concurrency guard: only one OpenClaw turn runs per session at a time.
 # If a second request arrives for the same session while one is running, it waits
 # up to _SESSION_LOCK_TIMEOUT_S before being rejected to avoid duplicate responses.
-_SESSION_LOCKS: dict[str, asyncio.Lock] = {}
+# Idle locks are evicted (KeyedState never drops a held or contended one), so
+# the registry no longer grows by one lock per session ever seen.
+_SESSION_LOCKS = KeyedState("chat_session_locks", ttl_s=1800, max_size=4096)
 _SESSION_LOCK_TIMEOUT_S = float(os.environ.get("ZOE_SESSION_LOCK_TIMEOUT_S", "5"))
 
 
 def _get_session_lock(session_id: str) -> asyncio.Lock:
-    if session_id not in _SESSION_LOCKS:
-        _SESSION_LOCKS[session_id] = asyncio.Lock()
-    return _SESSION_LOCKS[session_id]
+    lock = _SESSION_LOCKS.get(session_id)
+    if lock is None:
+        lock = _SESSION_LOCKS[session_id] = asyncio.Lock()
+    return lock
 
 async def _persist_ag_ui_run(session_id: str, run_id: str, events: list) -> None:
-    """Best-effort persistence of the wire-format event list for debugging / future resume."""
+    """Best-effort persistence of the wire-format event list for debugging / future resume.
+
+    ``events`` are the recorder's payload dicts; they are stored as compact JSON
+    like the SSE lines they were sent as.
+    """
     if not events:
         return
     try:
@@ -1118,7 +1126,8 @@ async def _persist_ag_ui_run(session_id: str, run_id: str, events: list) -> None
             await db.execute(
                 """INSERT INTO chat_ag_ui_runs (id, session_id, run_id, events)
                    VALUES (?, ?, ?, ?)""",
-                (uuid.uuid4().hex[:16], session_id, run_id, json.dumps(events)),
+                (uuid.uuid4().hex[:16], session_id, run_id,
+                 json.dumps(events, separators=(",", ":"), ensure_ascii=False)),
             )
             await db.commit()
     except Exception as e:
@@ -223,6 +223,14 @@ async def get_system_status(
     }
 
 
+@router.get("/startup")
+async def get_startup_profile(user: dict = Depends(require_admin)):
+    """Where this process's boot went: lifespan phases, warmups, slowest imports."""
+    import startup_profile
+
+    return startup_profile.snapshot()
+
+
 @router.get("/memory-router/status")
 async def get_memory_router_status(user: dict = Depends(require_admin)):
     """Read-only status for Zoe's disabled-by-default memory router runtime."""
@@ -902,6 +910,22 @@ async def get_reconcile_failopen_status(user: dict = Depends(require_admin)):
     return {"reconcile_failopen": reconcile_failopen_status()}
 
 
+@router.get("/intent-matcher/stats")
+async def get_intent_matcher_stats(
+    top: int = Query(25, ge=1, le=500),
+    user: dict = Depends(require_admin),
+):
+    """Per-rule counters for the compiled intent table behind ``detect_intent``.
+
+    Rows are sorted costliest-first by cumulative evaluation time, so the rule
+    worth rewriting (or re-ordering) is at the top. ``indexed: false`` rows have
+    no literal trigger and run on every turn.
+    """
+    from intent_router import intent_matcher_stats
+
+    return intent_matcher_stats(top=top)
+
+
 @router.post("/memories/consolidate")
 async def trigger_memory_consolidation(
     user_id: Optional[str] = None,
@@ -23,11 +23,14 @@ Data channel messages sent to browser:
   {"type": "state",      "state": "listening"|"thinking"|"responding"|"ambient"}
   {"type": "transcript", "role": "user"|"zoe", "text": "..."}
   {"type": "audio",      "audio_base64": "...", "content_type": "audio/wav"}
+  binary audio frames — instead of "audio" when every panel in the room
+                              negotiated them (see livekit_audio_framing)
   {"type": "stop_playback"}   — barge-in: stop TTS playback immediately
   {"type": "done"}
 
 Data channel messages accepted from browser:
-  {"type": "identify",       "user_id": "...", "session_id": "..."}
+  {"type": "identify",       "user_id": "...", "session_id": "...",
+   "audio_framing": ["binary-v1"]}  — audio_framing optional; omitted = JSON audio
   {"type": "ptt_start"}       — explicit PTT start (disables VAD for this turn)
   {"type": "ptt_stop"}        — explicit PTT stop (triggers processing)
   {"type": "playback_done"}   — browser finished playing audio, re-enable listening
@@ -54,6 +57,9 @@ from typing import Optional
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import JSONResponse
 
+import livekit_audio_framing
+import voice_stream_stt
+
 # Auth inputs for `_require_livekit_media_auth` (below). Both are imported at
 # module level so they are the SAME callables FastAPI keys `dependency_overrides`
 # on. `routers.voice_tts` never imports this module at module level (only lazily,
@@ -166,6 +172,13 @@ _VOICE_HEALTH: dict = {
     "last_disconnected_at": None,
     "last_error": None,
     "stage_latency_ms": {},
+    # Last turn's utterance length and STT real-time factor (stt ms / audio ms).
+    "stt_audio_ms": None,
+    "stt_rtf": None,
+    # Segments transcribed during the speaker's pauses (ZOE_VOICE_STREAMING_STT).
+    "stt_streamed_segments": 0,
+    # Framing of the last reply's audio: "json" or livekit_audio_framing.FRAMING_NAME.
+    "audio_framing": None,
 }
 _INITIAL_VOICE_HEALTH = copy.deepcopy(_VOICE_HEALTH)
 _agent_running = False
@@ -182,6 +195,11 @@ _cooldown_task: Optional["asyncio.Task"] = None
 _lifecycle_lock: Optional["asyncio.Lock"] = None
 _last_activity: float = 0.0
 _active_participant_sids: set = set()
+# Participants whose identify asked for binary audio frames. Binary is only
+# used while it covers every active participant: the aiortc backend cannot
+# address a single participant, so every reply goes to the whole room.
+_binary_audio_sids: set = set()
+_audio_turn: int = 0
 # Flipped True once the native livekit-ffi AudioStream is proven broken on this
 # host (e.g. the Jetson Tegra FFI backend), so the agent loop switches permanently
 # to the aiortc backend — sticky even across agent-loop restarts in this process.
@@ -320,6 +338,7 @@ async def stop_livekit_ondemand(reason: str = "idle") -> None:
             idle.cancel()
             _idle_task = None
         _active_participant_sids.clear()
+        _binary_audio_sids.clear()
         logger.info("LiveKit on-demand: stopping container '%s' (reason=%s)", _CONTAINER_NAME, reason)
         await _docker_cmd("stop", _CONTAINER_NAME, timeout=30)
         _health_update(status="stopped", connected=False)
@@ -452,23 +471,6 @@ def _mint_agent_token() -> str:
     return _jwt.encode(payload, api_secret, algorithm="HS256")
 
 
-def _pcm_frames_to_wav(frames: list[bytes], sample_rate: int = 16000, channels: int = 1) -> bytes:
-    """Concatenate raw int16-LE PCM frames and wrap in a WAV header."""
-    raw = b"".join(frames)
-    bits = 16
-    byte_rate = sample_rate * channels * bits // 8
-    block_align = channels * bits // 8
-    data_len = len(raw)
-    header = struct.pack(
-        "<4sI4s4sIHHIIHH4sI",
-        b"RIFF", 36 + data_len, b"WAVE",
-        b"fmt ", 16, 1, channels, sample_rate,
-        byte_rate, block_align, bits,
-        b"data", data_len,
-    )
-    return header + raw
-
-
 async def _send_data(local_participant, payload: dict) -> None:
     """Broadcast a JSON data message to all participants in the room."""
     try:
@@ -477,6 +479,89 @@ async def _send_data(local_participant, payload: dict) -> None:
         logger.debug("LiveKit data send error: %s", exc)
 
 
+def _binary_audio_enabled() -> bool:
+    """ZOE_LIVEKIT_BINARY_AUDIO — kill switch for binary audio frames (default
+    ON). Panels still have to ask for them in ``identify``; this only lets an
+    operator force everyone back to JSON audio."""
+    return os.environ.get("ZOE_LIVEKIT_BINARY_AUDIO", "1").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _audio_chunk_ms() -> int:
+    """Audio per binary data packet (ZOE_LIVEKIT_AUDIO_CHUNK_MS, default 200ms).
+    Smaller chunks start playback sooner; each costs a 16-byte header and a
+    publish round."""
+    try:
+        return min(1000, max(20, int(os.environ.get("ZOE_LIVEKIT_AUDIO_CHUNK_MS", "200"))))
+    except (TypeError, ValueError):
+        return 200
+
+
+def _binary_audio_ok() -> bool:
+    """Binary frames only when every panel in the room negotiated them — an
+    older panel would otherwise receive packets it cannot parse."""
+    return (
+        _binary_audio_enabled()
+        and bool(_active_participant_sids)
+        and _active_participant_sids <= _binary_audio_sids
+    )
+
+
+def _next_audio_turn() -> int:
+    """Reply id for binary audio frames, so a panel can drop a cancelled turn."""
+    global _audio_turn
+    _audio_turn = (_audio_turn + 1) & 0xFFFF
+    return _audio_turn
+
+
+async def _send_audio(
+    local_participant,
+    body: bytes,
+    media_type: str,
+    *,
+    turn: int,
+    seq: Optional[int] = None,
+    final: Optional[bool] = None,
+    binary: Optional[bool] = None,
+) -> None:
+    """Send one reply (or one sentence of a streamed reply, ``seq``/``final``).
+
+    Binary PCM frames when the room negotiated them and ``body`` is a PCM WAV;
+    otherwise the JSON audio message, unchanged (no ``seq``/``final`` keys for
+    a single-message reply). An empty ``body`` is the streamed-reply failure
+    marker. ``binary`` pins the framing a streamed turn chose up front; the
+    caller then guarantees a binary body is PCM WAV (or empty)."""
+    if binary is None:
+        binary = _binary_audio_ok()
+    if binary:
+        if body:
+            parsed = livekit_audio_framing.wav_pcm(body)
+        else:
+            parsed = (b"", 0, 1)
+        if parsed is not None:
+            pcm, rate, channels = parsed
+            for frame in livekit_audio_framing.sentence_frames(
+                pcm, turn=turn, seq=seq or 0, sample_rate=rate, channels=channels,
+                reply_end=final is None or final, chunk_ms=_audio_chunk_ms(),
+            ):
+                try:
+                    await local_participant.publish_data(frame, reliable=True)
+                except Exception as exc:
+                    logger.debug("LiveKit audio frame send error: %s", exc)
+                    break
+            _health_update(audio_framing=livekit_audio_framing.FRAMING_NAME)
+            return
+    payload = {
+        "type": "audio",
+        "audio_base64": base64.b64encode(body).decode("ascii"),
+        "content_type": media_type,
+    }
+    if seq is not None:
+        payload["seq"] = seq
+        payload["final"] = bool(final)
+    await _send_data(local_participant, payload)
+    _health_update(audio_framing="json")
+
+
 def _livekit_fast_tiers_enabled() -> bool:
     """LiveKit's opt-in deterministic fast tier — OFF unless explicitly enabled.
 
@@ -511,7 +596,24 @@ async def _stream_sentence_audio(local_participant, text: str, user_id: str) ->
 
     sentences = _split_sentences(text)
     last = len(sentences) - 1
+    turn = _next_audio_turn()
+    # One framing per turn: the panel plays binary frames and JSON messages
+    # through separate queues, so a mixed reply could overlap itself.
+    binary = _binary_audio_ok()
     sent_any = False
+
+    async def _end_with_text(seq: int) -> None:
+        # Audio already played: do NOT let the caller re-send the whole reply
+        # as text (it would duplicate what was heard). Send only the unspoken
+        # remainder as text, plus an empty final-flagged marker so the client
+        # reconciles the turn.
+        await _send_data(local_participant, {
+            "type": "text", "content": " ".join(sentences[seq:]),
+        })
+        await _send_audio(
+            local_participant, b"", "audio/wav", turn=turn, seq=seq, final=True, binary=binary,
+        )
+
     for seq, sentence in enumerate(sentences):
         await asyncio.sleep(0)  # cancel-token checkpoint between sentences
         try:
@@ -519,28 +621,26 @@ async def _stream_sentence_audio(local_participant, text: str, user_id: str) ->
         except Exception:
             if not sent_any:
                 raise  # nothing spoken yet — caller's existing text fallback handles it
-            # Mid-stream failure with audio already played: do NOT let the
-            # caller re-send the whole reply as text (it would duplicate what
-            # was heard). Send only the unspoken remainder as text, plus an
-            # empty final-flagged marker so the client reconciles the turn.
             logger.warning(
                 "LiveKit streamed TTS failed mid-reply (sentence %d/%d)", seq + 1, last + 1
             )
-            await _send_data(local_participant, {
-                "type": "text", "content": " ".join(sentences[seq:]),
-            })
-            await _send_data(local_participant, {
-                "type": "audio", "audio_base64": "", "content_type": "audio/wav",
-                "seq": seq, "final": True,
-            })
+            await _end_with_text(seq)
             return
-        await _send_data(local_participant, {
-            "type": "audio",
-            "audio_base64": base64.b64encode(tts_resp.body).decode("ascii"),
-            "content_type": tts_resp.media_type,
-            "seq": seq,
-            "final": seq == last,
-        })
+        if binary and livekit_audio_framing.wav_pcm(tts_resp.body) is None:
+            # A fallback engine answered with compressed audio (Edge/local MP3).
+            if not sent_any:
+                binary = False  # nothing sent yet: the whole turn goes as JSON
+            else:
+                logger.warning(
+                    "LiveKit streamed TTS switched to %s mid-reply (sentence %d/%d)",
+                    tts_resp.media_type, seq + 1, last + 1,
+                )
+                await _end_with_text(seq)
+                return
+        await _send_audio(
+            local_participant, tts_resp.body, tts_resp.media_type,
+            turn=turn, seq=seq, final=seq == last, binary=binary,
+        )
         sent_any = True
 
 
@@ -582,8 +682,8 @@ async def _run_pipeline(local_participant, frames: list[bytes], user_id: str, se
 
     Cancellation-safe (barge-in cancels this task): every ``except Exception``
     below deliberately lets ``asyncio.CancelledError`` (a BaseException)
-    propagate, the STT temp file is unlinked in a ``finally``, and no counters
-    are mutated on the cancel path — so a cancelled turn leaks no state.
+    propagate, and no counters are mutated on the cancel path — so a cancelled
+    turn leaks no state. STT runs on the frames in memory (no temp file).
     """
     pipeline_started = time.monotonic()
     await _send_data(local_participant, {"type": "state", "state": "thinking"})
@@ -592,27 +692,28 @@ async def _run_pipeline(local_participant, frames: list[bytes], user_id: str, se
     transcript = ""
     stage_started = time.monotonic()
     _health_update(last_stage="stt", last_error=None)
+    stt_stream = getattr(frames, "stt_stream", None)
     try:
-        wav_bytes = _pcm_frames_to_wav(frames)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tf:
-            tf.write(wav_bytes)
-            tmp_path = tf.name
-        try:
-            from routers.voice_tts import _transcribe_audio
-            transcript = await _transcribe_audio(tmp_path)
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+        if stt_stream is not None:
+            # ZOE_VOICE_STREAMING_STT: most of the utterance was transcribed
+            # during the speaker's pauses; only the tail is left.
+            transcript = await stt_stream.finalize(frames)
+        else:
+            from routers.voice_tts import _transcribe_pcm
+            transcript = await _transcribe_pcm(frames)
     except Exception as exc:
         _VOICE_HEALTH["pipeline_failures"] += 1
         _health_update(last_stage="stt_failed", last_error=str(exc)[:240])
         logger.warning("LiveKit STT failed: %s", exc)
         await _send_data(local_participant, {"type": "state", "state": "ambient"})
         return
-    _VOICE_HEALTH["stage_latency_ms"]["stt"] = round(
-        (time.monotonic() - stage_started) * 1000, 1
+    stt_ms = (time.monotonic() - stage_started) * 1000
+    audio_ms = sum(len(f) for f in frames) / 32.0  # 16 kHz mono int16: 32 bytes per ms
+    _VOICE_HEALTH["stage_latency_ms"]["stt"] = round(stt_ms, 1)
+    _health_update(
+        stt_audio_ms=round(audio_ms, 1),
+        stt_rtf=round(stt_ms / audio_ms, 3) if audio_ms else None,
+        stt_streamed_segments=len(stt_stream.segments) if stt_stream is not None else 0,
     )
 
     if not transcript:
@@ -628,11 +729,9 @@ async def _run_pipeline(local_participant, frames: list[bytes], user_id: str, se
                 {"text": canned}, caller={"source": "livekit", "user_id": user_id}
             )
             await _send_data(local_participant, {"type": "transcript", "role": "zoe", "text": canned})
-            await _send_data(local_participant, {
-                "type": "audio",
-                "audio_base64": base64.b64encode(tts_resp.body).decode("ascii"),
-                "content_type": tts_resp.media_type,
-            })
+            await _send_audio(
+                local_participant, tts_resp.body, tts_resp.media_type, turn=_next_audio_turn(),
+            )
         except Exception as exc:
             logger.debug("LiveKit empty-transcript feedback failed: %s", exc)
         await _send_data(local_participant, {"type": "state", "state": "ambient"})
@@ -709,11 +808,9 @@ async def _run_pipeline(local_participant, frames: list[bytes], user_id: str, se
         else:
             from routers.voice_tts import synthesize as _synth
             tts_resp = await _synth({"text": response}, caller={"source": "livekit", "user_id": user_id})
-            await _send_data(local_participant, {
-                "type": "audio",
-                "audio_base64": base64.b64encode(tts_resp.body).decode("ascii"),
-                "content_type": tts_resp.media_type,
-            })
+            await _send_audio(
+                local_participant, tts_resp.body, tts_resp.media_type, turn=_next_audio_turn(),
+            )
     except Exception as exc:
         _VOICE_HEALTH["pipeline_failures"] += 1
         _health_update(last_stage="tts_failed", last_error=str(exc)[:240])
@@ -771,11 +868,9 @@ async def _run_text_pipeline(local_participant, message: str, user_id: str, sess
         else:
             from routers.voice_tts import synthesize as _synth
             tts_resp = await _synth({"text": response}, caller={"source": "livekit", "user_id": user_id})
-            await _send_data(local_participant, {
-                "type": "audio",
-                "audio_base64": base64.b64encode(tts_resp.body).decode("ascii"),
-                "content_type": tts_resp.media_type,
-            })
+            await _send_audio(
+                local_participant, tts_resp.body, tts_resp.media_type, turn=_next_audio_turn(),
+            )
     except Exception as exc:
         _VOICE_HEALTH["pipeline_failures"] += 1
         _health_update(last_stage="tts_failed", last_error=str(exc)[:240])
@@ -841,7 +936,7 @@ def _end_turn(sid: str, ps: dict, local_participant) -> None:
         sid[:8], len(ps["frames"]),
     )
     ps["state"] = _ParticipantState.PROCESSING
-    frames_snapshot = list(ps["frames"])
+    frames_snapshot = voice_stream_stt.snapshot(ps, ps["frames"])
     ps["frames"] = []
     ps["speech_count"] = 0
     ps["silence_count"] = 0
@@ -927,6 +1022,7 @@ async def _handle_frame_barge_in(raw: bytes, sid: str, ps: dict, local_participa
 
     elif state == _ParticipantState.LISTENING:
         ps["frames"].append(raw)
+        voice_stream_stt.observe(ps)
         if not probs:
             return
         if max(probs) >= threshold:
@@ -1086,6 +1182,7 @@ async def _collect_audio_stream(
 
             elif state == _ParticipantState.LISTENING:
                 ps["frames"].append(raw)
+                voice_stream_stt.observe(ps)
                 if energy >= _VAD_ENERGY_THRESHOLD:
                     ps["silence_count"] = 0
                 else:
@@ -1097,7 +1194,7 @@ async def _collect_audio_stream(
                             sid[:8], len(ps["frames"]),
                         )
                         ps["state"] = _ParticipantState.PROCESSING
-                        frames_snapshot = list(ps["frames"])
+                        frames_snapshot = voice_stream_stt.snapshot(ps, ps["frames"])
                         ps["frames"] = []
                         ps["speech_count"] = 0
                         ps["silence_count"] = 0
@@ -1192,6 +1289,7 @@ def _build_room_handlers(room, participant_state: dict, audio_tasks: dict) -> No
     def on_participant_disconnected(participant) -> None:
         logger.info("LiveKit: participant left %s", participant.identity)
         _active_participant_sids.discard(participant.sid)
+        _binary_audio_sids.discard(participant.sid)
         note_voice_activity()
         participant_state.pop(participant.sid, None)
         task = audio_tasks.pop(participant.sid, None)
@@ -1247,6 +1345,11 @@ def _build_room_handlers(room, participant_state: dict, audio_tasks: dict) -> No
         if msg_type == "identify":
             ps["user_id"] = msg.get("user_id") or "guest"
             ps["session_id"] = msg.get("session_id") or ps["session_id"]
+            framing = msg.get("audio_framing")
+            if isinstance(framing, list) and livekit_audio_framing.FRAMING_NAME in framing:
+                _binary_audio_sids.add(sid)
+            else:
+                _binary_audio_sids.discard(sid)
 
         elif msg_type == "ptt_start":
             ps["ptt_active"] = True
@@ -1425,6 +1528,7 @@ async def _agent_loop() -> None:
                     # Room torn down → drop stale participant tracking so the idle
                     # reaper isn't held open by sids that can no longer disconnect.
                     _active_participant_sids.clear()
+                    _binary_audio_sids.clear()
                 for task in list(audio_tasks.values()):
                     if not task.done():
                         task.cancel()
@@ -21,9 +21,12 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, R
 from fastapi.responses import StreamingResponse
 from auth import get_current_user
 from database import get_db
+from keyed_state import KeyedState
+import stt_pool
 from stt_wake_strip import _strip_wake_word
 from typed_env import env_bool, env_float, env_int, env_str
-from voice_speaker_id import _compute_resemblyzer_embedding, _cosine_similarity
+from voice_speaker_id import PROFILE_INDEX as _SPEAKER_PROFILES
+from voice_speaker_id import _compute_resemblyzer_embedding, run_encoder as _run_speaker_encoder
 # Waterfall engine mechanics live in tts_waterfall; they are re-exported here so
 # existing importers (main.py health detail, tests that monkeypatch this module,
 # tests/replay_samples.py, scripts/perf/measure_tts.py) keep working unchanged.
@@ -66,17 +69,19 @@ def _spawn_bg(coro) -> None:
 # the same 5-min TTL so mid-conversation turns don't re-challenge.
 # Dict: panel_id → {"session_id": str, "last_at": float,
 #                   "bound_user_id": str|None, "context": ConversationContext}
-_VOICE_SESSIONS: dict[str, dict] = {}
+# The entry outlives the 5-min session TTL on purpose (it carries the bound
+# identity across rollovers); KeyedState drops a panel silent for a week.
+_VOICE_SESSIONS = KeyedState("voice_sessions", ttl_s=7 * 24 * 3600, max_size=256)
 _VOICE_SESSION_TTL_S = 5 * 60  # Reset after 5 min silence
 
 # Pass 3 B4: stash of voice turns awaiting PIN confirmation.
 # Dict: panel_id → {pending_id, transcript, session_id, expire_at}
-_PENDING_VOICE_IDENT: dict[str, dict] = {}
+_PENDING_VOICE_IDENT = KeyedState("voice_pending_ident", ttl_s=600, max_size=256)
 
 # Introduction flow state: panel_id → {person_id, person_name, step, expires}
 # step 0 = greeted, awaiting job/interest answer
 # step 1 = collected first answer, asking follow-up
-_INTRO_STATE: dict[str, dict] = {}
+_INTRO_STATE = KeyedState("voice_intro_state", ttl_s=600, max_size=256)
 
 # Identity sentinels that are not real user accounts. Chat persistence must
 # never attribute a turn to one of them: "voice-guest" has no `users` row, so
@@ -2146,10 +2151,17 @@ def _log_voice_stt_sample(
 _moonshine_model = None  # moonshine_voice v2 Transcriber
 _moonshine_load_error = None
 _moonshine_lock = threading.Lock()
-# Serializes Moonshine INFERENCE across executor threads: the wake-time warmup dummy
-# inference and a real command transcription share one singleton transcriber, so they
-# must not run concurrently (the model isn't guaranteed thread-safe per-inference).
-_moonshine_infer_lock = threading.Lock()
+# Moonshine INFERENCE runs on stt_pool workers: each owns one transcriber (worker 0
+# the shared singleton below, the others their own), so no instance ever runs two
+# inferences at once (the model isn't guaranteed thread-safe per-inference), while
+# two speakers no longer queue behind a single global lock.
+_stt_pool: Optional["stt_pool.SttPool"] = None
+_stt_pool_guard = threading.Lock()
+# Queue priority for this request's STT. Set to BACKGROUND by ambient capture and
+# instrument callers; a ContextVar so it stays scoped to the request's task.
+_stt_priority_var: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "stt_priority", default=stt_pool.INTERACTIVE
+)
 
 
 def moonshine_arch() -> str:
@@ -2174,13 +2186,7 @@ def _ensure_moonshine():
     with _moonshine_lock:
         if _moonshine_model is None:
             try:
-                import moonshine_voice as mv
-                from moonshine_voice.transcriber import Transcriber
-
-                archname = env_str("ZOE_MOONSHINE_ARCH", "MEDIUM_STREAMING")
-                arch = getattr(mv.ModelArch, archname, mv.ModelArch.MEDIUM_STREAMING)
-                model_path, resolved_arch = mv.get_model_for_language("en", arch)
-                _moonshine_model = Transcriber(model_path, resolved_arch)
+                _moonshine_model = _new_moonshine()
                 _moonshine_load_error = None
             except Exception as exc:
                 _moonshine_load_error = exc.__class__.__name__
@@ -2188,6 +2194,49 @@ def _ensure_moonshine():
     return _moonshine_model
 
 
+def _new_moonshine():
+    import moonshine_voice as mv
+    from moonshine_voice.transcriber import Transcriber
+
+    archname = env_str("ZOE_MOONSHINE_ARCH", "MEDIUM_STREAMING")
+    arch = getattr(mv.ModelArch, archname, mv.ModelArch.MEDIUM_STREAMING)
+    model_path, resolved_arch = mv.get_model_for_language("en", arch)
+    return Transcriber(model_path, resolved_arch)
+
+
+def _moonshine_for_slot(slot: int):
+    # Looked up by name on each call so tests can swap _ensure_moonshine.
+    return _ensure_moonshine() if slot == 0 else _new_moonshine()
+
+
+def _warm_moonshine_instance(tr) -> None:
+    import numpy as _np
+
+    # ~1s of very-low-amplitude noise @ 16kHz — NOT pure silence (which Moonshine
+    # may VAD-short-circuit without running the encoder, leaving the pages cold);
+    # real low-level input forces the inference path so the model faults back in.
+    buf = _np.random.default_rng(0).standard_normal(16000).astype(_np.float32) * 0.003
+    tr.transcribe_without_streaming(buf, 16000)
+
+
+def _get_stt_pool() -> "stt_pool.SttPool":
+    global _stt_pool
+    if _stt_pool is None:
+        with _stt_pool_guard:
+            if _stt_pool is None:
+                _stt_pool = stt_pool.SttPool(
+                    _moonshine_for_slot,
+                    size=stt_pool.configured_size(),
+                    max_queue=env_int("ZOE_STT_MAX_QUEUE", 6),
+                    warmer=_warm_moonshine_instance,
+                )
+    return _stt_pool
+
+
+def stt_pool_stats() -> Optional[dict]:
+    return _stt_pool.stats() if _stt_pool is not None else None
+
+
 _MOONSHINE_SAMPLE_RATE = 16000
 
 
@@ -2252,39 +2301,70 @@ def _prepare_audio_for_moonshine(audio, sample_rate: int):
     return resampled.tolist(), _MOONSHINE_SAMPLE_RATE
 
 
+def _moonshine_infer(tr, audio, sr, source: str) -> str:
+    """Blocking Moonshine call on one pool instance, shared by the file and
+    in-memory entry points."""
+    # Moonshine wants mono 16 kHz; load_wav_file doesn't resample. This is an
+    # identity for the live 16 kHz path and only resamples off-rate capture.
+    audio, sr = _prepare_audio_for_moonshine(audio, sr)
+    if not isinstance(sr, int) or sr <= 0:
+        # Corrupt/malformed WAV metadata (rate 0/None): _prepare_audio... hands
+        # the rate back for us to surface — never feed it into the C transcribe
+        # call. Treat the clip as unusable -> empty transcript (the caller's
+        # empty_transcript handling re-prompts).
+        logger.warning("Moonshine: unusable sample rate %r for %s — skipping clip", sr, source)
+        return ""
+    out = tr.transcribe_without_streaming(audio, sr)
+    # Moonshine segments speech into lines and emits the wake phrase ("Hey Zoe.")
+    # as its own leading line. Strip the wake word from those lines so the
+    # leading "Hey Zoe" can't corrupt the command transcript (wake-word bleed).
+    lines = [getattr(ln, "text", "") or "" for ln in getattr(out, "lines", [])]
+    if lines:
+        text = _strip_wake_word(lines)
+        if text:
+            return text
+    # Fallback: some builds expose a flat .text; strip the wake prefix from it.
+    flat = getattr(out, "text", None)
+    if isinstance(flat, str) and flat.strip():
+        return _strip_wake_word([flat])
+    return ""
+
+
 async def _run_moonshine(wav_path: str) -> str:
     from moonshine_voice.utils import load_wav_file
 
-    def _work() -> str:
-        tr = _ensure_moonshine()
+    def _work(tr) -> str:
         audio, sr = load_wav_file(wav_path)
-        # Moonshine wants mono 16 kHz; load_wav_file doesn't resample. This is an
-        # identity for the live 16 kHz path and only resamples off-rate capture.
-        audio, sr = _prepare_audio_for_moonshine(audio, sr)
-        if not isinstance(sr, int) or sr <= 0:
-            # Corrupt/malformed WAV metadata (rate 0/None): _prepare_audio... hands
-            # the rate back for us to surface — never feed it into the C transcribe
-            # call. Treat the clip as unusable -> empty transcript (the caller's
-            # empty_transcript handling re-prompts).
-            logger.warning("Moonshine: unusable sample rate %r for %s — skipping clip", sr, wav_path)
-            return ""
-        with _moonshine_infer_lock:
-            out = tr.transcribe_without_streaming(audio, sr)
-        # Moonshine segments speech into lines and emits the wake phrase ("Hey Zoe.")
-        # as its own leading line. Strip the wake word from those lines so the
-        # leading "Hey Zoe" can't corrupt the command transcript (wake-word bleed).
-        lines = [getattr(ln, "text", "") or "" for ln in getattr(out, "lines", [])]
-        if lines:
-            text = _strip_wake_word(lines)
-            if text:
-                return text
-        # Fallback: some builds expose a flat .text; strip the wake prefix from it.
-        flat = getattr(out, "text", None)
-        if isinstance(flat, str) and flat.strip():
-            return _strip_wake_word([flat])
-        return ""
+        return _moonshine_infer(tr, audio, sr, wav_path)
+
+    return await _get_stt_pool().run(_work, _stt_priority_var.get())
+
+
+def _pcm16_to_float32(pcm):
+    """Mono int16-LE PCM -> float32 in [-1, 1), scaled exactly as ``load_wav_file``.
+
+    ``pcm`` is one bytes-like buffer or a sequence of them (LiveKit frames).
+    A single buffer is viewed in place with ``np.frombuffer``; frames are
+    joined first (one memcpy: ~30x cheaper than a ufunc call per 20 ms frame).
+    The int16 -> float32 conversion is then the only other copy, scaled in
+    place. Multiplying by 2**-15 is exact, so the samples are bit-identical to
+    what the WAV-file path produced.
+    """
+    import numpy as np
+
+    if not isinstance(pcm, (bytes, bytearray, memoryview)):
+        pcm = b"".join(pcm)
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    out = samples.astype(np.float32)
+    out *= np.float32(1.0 / 32768.0)
+    return out
 
-    return await asyncio.get_running_loop().run_in_executor(None, _work)
+
+async def _run_moonshine_pcm(pcm, sample_rate: int = _MOONSHINE_SAMPLE_RATE) -> str:
+    def _work(tr) -> str:
+        return _moonshine_infer(tr, _pcm16_to_float32(pcm), sample_rate, "in-memory PCM")
+
+    return await _get_stt_pool().run(_work, _stt_priority_var.get())
 
 
 async def warm_moonshine() -> bool:
@@ -2302,11 +2382,16 @@ async def warm_moonshine() -> bool:
         return False
 
 
-async def _maybe_capture_stt(wav_path: str, primary: str) -> None:
+async def _maybe_capture_stt(
+    wav_path: Optional[str], primary: str, *, pcm=None, sample_rate: int = _MOONSHINE_SAMPLE_RATE
+) -> None:
     """When ZOE_VOICE_SAVE_AUDIO is set, save the real utterance to the operator's
     permanent regression corpus (~/.zoe-voice-samples) and log the Moonshine
     transcript. This is corpus capture only — there is NO whisper A/B; whisper
-    must never run on a live turn (Moonshine is the only STT engine)."""
+    must never run on a live turn (Moonshine is the only STT engine).
+
+    In-memory turns pass ``pcm`` (bytes or frames) instead of a path; the WAV is
+    only written here, when capture is on."""
     if not env_bool("ZOE_VOICE_SAVE_AUDIO", default=False):
         return
     try:
@@ -2316,8 +2401,18 @@ async def _maybe_capture_stt(wav_path: str, primary: str) -> None:
         d = os.environ.get("ZOE_VOICE_SAMPLE_DIR") or "/home/zoe/.zoe-voice-samples"
         os.makedirs(d, exist_ok=True)
         dst = os.path.join(d, f"{_t.strftime('%H%M%S')}_{int(_t.time()*1000)%1000:03d}.wav")
-        # Copy synchronously (fast) before the caller unlinks the original.
-        shutil.copyfile(wav_path, dst)
+        if pcm is not None:
+            import wave
+
+            with wave.open(dst, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(sample_rate)
+                for frame in ([pcm] if isinstance(pcm, (bytes, bytearray, memoryview)) else pcm):
+                    wf.writeframesraw(frame)
+        else:
+            # Copy synchronously (fast) before the caller unlinks the original.
+            shutil.copyfile(wav_path, dst)
     except Exception as exc:
         logger.warning("STT capture failed: %s", exc)
         return
@@ -2338,6 +2433,18 @@ async def _transcribe_audio(wav_path: str, capture: bool = True) -> str:
     return text
 
 
+async def _transcribe_pcm(pcm, sample_rate: int = _MOONSHINE_SAMPLE_RATE, capture: bool = True) -> str:
+    """In-memory STT: mono int16 PCM (bytes, or a list of frames) straight into
+    Moonshine — the LiveKit turn path. Same semantics as ``_transcribe_audio``
+    (empty on silence, raises on a backend failure, corpus capture) without the
+    WAV encode / temp file / re-parse round trip. ``/api/voice/transcribe`` and
+    the upload endpoints keep the file-based ``_transcribe_audio``."""
+    text = await _moonshine_result(_run_moonshine_pcm(pcm, sample_rate))
+    if capture:
+        await _maybe_capture_stt(None, text, pcm=pcm, sample_rate=sample_rate)
+    return text
+
+
 # Records which backend produced the transcript for the current turn, so the STT
 # audit log reflects reality instead of a hardcoded "base.en". A ContextVar (not a
 # module global) keeps this per-asyncio-task, so overlapping voice turns / an A/B
@@ -2354,8 +2461,12 @@ async def _transcribe_audio_impl(wav_path: str) -> str:
     Moonshine BACKEND failure (missing model, OOM, runtime dep) RAISES, so callers
     can tell a real failure apart from silence instead of masking it as success.
     """
+    return await _moonshine_result(_run_moonshine(wav_path))
+
+
+async def _moonshine_result(run) -> str:
     try:
-        text = await _run_moonshine(wav_path)
+        text = await run
     except Exception as exc:
         logger.warning("Moonshine STT failed (backend error, surfacing): %s", exc)
         raise
@@ -2416,6 +2527,8 @@ async def voice_transcribe(payload: dict, caller: dict = Depends(_require_voice_
         # corpus capture by picking a name (Greptile, #1572). The harness
         # authenticates with the device token, so it satisfies both.
         is_instrument = _suppress_ui_broadcast(panel_id) and caller.get("source") == "device"
+        if is_instrument:
+            _stt_priority_var.set(stt_pool.BACKGROUND)
         try:
             text = await _transcribe_audio(wav_path, capture=not is_instrument)
         finally:
@@ -2704,7 +2817,7 @@ async def voice_command(
     try:
         import semantic_router as _sr
         if _sr.is_enabled():
-            _rr = _sr.route(text)
+            _rr = await _sr.aroute(text)
             _router_decision = _rr
             logger.warning("ROUTER_SHADOW text=%r -> routed=%s (best=%s %.2f) %.1fms scores=%s",
                            text[:70], _rr["routed"], _rr["domain"], _rr["score"], _rr["ms"], _rr["scores"])
@@ -5014,20 +5127,9 @@ async def _prewarm_stt_on_wake() -> None:
     try:
         if not _stt_prewarm_on_wake_enabled():
             return
-        loop = asyncio.get_running_loop()
-
-        def _warm() -> None:
-            import numpy as _np
-            tr = _ensure_moonshine()
-            # ~1s of very-low-amplitude noise @ 16kHz — NOT pure silence (which Moonshine
-            # may VAD-short-circuit without running the encoder, leaving the pages cold);
-            # real low-level input forces the inference path so the model faults back in.
-            # Serialized against real transcriptions so the warmup can't race a command.
-            buf = _np.random.default_rng(0).standard_normal(16000).astype(_np.float32) * 0.003
-            with _moonshine_infer_lock:
-                tr.transcribe_without_streaming(buf, 16000)
-
-        await loop.run_in_executor(None, _warm)
+        # Every pool worker warms its own instance, each only once no command is
+        # waiting for it — a warm-up never delays a real transcription.
+        await asyncio.wrap_future(_get_stt_pool().warm())
     except Exception as exc:
         logger.debug("voice/wake STT prewarm failed (non-fatal): %s", exc)
 
@@ -5132,6 +5234,9 @@ async def voice_ambient(payload: dict, caller: dict = Depends(_require_voice_aut
         tmp.write(raw)
         wav_path = tmp.name
     transcript = ""
+    # Ambient capture never waits in front of a command turn (and is the first
+    # thing shed when the STT queue is full).
+    _stt_priority_var.set(stt_pool.BACKGROUND)
     try:
         transcript = await _transcribe_audio_impl(wav_path)
     except Exception as exc:
@@ -5287,7 +5392,7 @@ async def voice_enroll(payload: dict, caller: dict = Depends(_require_voice_auth
         wav_path = tmp.name
 
     try:
-        embedding_bytes = _compute_resemblyzer_embedding(wav_path)
+        embedding_bytes = await _run_speaker_encoder(_compute_resemblyzer_embedding, wav_path)
     finally:
         try:
             os.unlink(wav_path)
@@ -5346,6 +5451,7 @@ async def voice_enroll(payload: dict, caller: dict = Depends(_require_voice_auth
                         (profile_id, user_id, display_name, embedding_bytes, panel_id or None),
                     )
             await db.commit()
+        _SPEAKER_PROFILES.invalidate()
     except Exception as exc:
         logger.error("voice/enroll DB error: %s", exc)
         raise HTTPException(status_code=500, detail="Failed to store profile") from exc
@@ -5361,14 +5467,21 @@ async def voice_identify(payload: dict, caller: dict = Depends(_require_voice_au
     - { "embedding_base64": "...", "panel_id": "..." }  — pre-computed float32 embedding bytes
       (sent by zoe_voice_daemon.py which computes resemblyzer locally on Pi/Jetson)
     - { "audio_base64": "...", "panel_id": "..." }  — raw WAV bytes; server computes embedding
-    Returns best-match profile with confidence score.
+    Returns best-match profile with confidence score, plus the top-k
+    (``top_k``, default 3) candidates.
+
+    Profiles are matched against the resident ``PROFILE_INDEX`` matrix — one
+    matrix-vector product — which is reloaded from the DB only after an
+    enroll/delete invalidation or when its TTL lapses.
     """
     from db_compat import get_compat_db as _get_compat_db
 
     payload = payload or {}
+    t0 = time.perf_counter()
 
     # Fast path: pre-computed embedding from the voice daemon
     emb_b64 = str(payload.get("embedding_base64", "")).strip()
+    source = "embedding" if emb_b64 else "audio"
     if emb_b64:
         try:
             query_emb = base64.b64decode(emb_b64, validate=True)
@@ -5390,7 +5503,7 @@ async def voice_identify(payload: dict, caller: dict = Depends(_require_voice_au
             wav_path = tmp.name
 
         try:
-            query_emb = _compute_resemblyzer_embedding(wav_path)
+            query_emb = await _run_speaker_encoder(_compute_resemblyzer_embedding, wav_path)
         finally:
             try:
                 os.unlink(wav_path)
@@ -5400,48 +5513,62 @@ async def voice_identify(payload: dict, caller: dict = Depends(_require_voice_au
         if query_emb is None:
             raise HTTPException(status_code=503, detail="resemblyzer not available")
 
-    try:
-        async with _get_compat_db() as db:
-            async with db.execute(
-                "SELECT id, user_id, display_name, embedding_blob FROM speaker_profiles "
-                "WHERE consent_at IS NOT NULL"
-            ) as cur:
-                profiles = await cur.fetchall()
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail="DB error") from exc
+    if not _SPEAKER_PROFILES.fresh:
+        generation = _SPEAKER_PROFILES.generation
+        try:
+            async with _get_compat_db() as db:
+                async with db.execute(
+                    "SELECT id, user_id, display_name, embedding_blob FROM speaker_profiles "
+                    "WHERE consent_at IS NOT NULL"
+                ) as cur:
+                    profiles = await cur.fetchall()
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail="DB error") from exc
+        _SPEAKER_PROFILES.load(profiles, generation)
 
-    if not profiles:
+    if not _SPEAKER_PROFILES.enrolled:
         return {"ok": True, "identified": False, "reason": "no_profiles"}
 
-    best_id = None
-    best_user_id = None
-    best_name = None
-    best_score = -1.0
-    for row in profiles:
-        pid, uid, dname, emb_blob = row
-        score = _cosine_similarity(query_emb, emb_blob)
-        if score > best_score:
-            best_score = score
-            best_id = pid
-            best_user_id = uid
-            best_name = dname
+    try:
+        top_k = max(1, min(int(payload.get("top_k") or 3), 10))
+    except (TypeError, ValueError):
+        top_k = 3
+    ranked = _SPEAKER_PROFILES.top_k(query_emb, top_k)
+    try:
+        from voice_metrics import speaker_id_identify_seconds
+        speaker_id_identify_seconds.labels(source=source).observe(time.perf_counter() - t0)
+    except Exception:
+        pass
+
+    candidates = [
+        {"profile_id": c["profile_id"], "user_id": c["user_id"],
+         "display_name": c["display_name"], "confidence": round(c["score"], 4)}
+        for c in ranked
+    ]
+    # An unusable query (truncated bytes, wrong width, zero vector) or profiles
+    # that can't be compared with it rank nothing, so it reports
+    # best_confidence 0.0 and identified: false.
+    best = ranked[0] if ranked else None
+    best_score = best["score"] if best else 0.0
 
     # Resemblyzer cosine similarity > 0.82 is typically a match.
     threshold = _speaker_id_threshold()
-    if best_score >= threshold:
+    if best is not None and best_score >= threshold:
         return {
             "ok": True,
             "identified": True,
-            "profile_id": best_id,
-            "user_id": best_user_id,
-            "display_name": best_name,
+            "profile_id": best["profile_id"],
+            "user_id": best["user_id"],
+            "display_name": best["display_name"],
             "confidence": round(best_score, 4),
+            "candidates": candidates,
         }
     return {
         "ok": True,
         "identified": False,
         "best_confidence": round(best_score, 4),
         "threshold": threshold,
+        "candidates": candidates,
     }
 
 
@@ -5553,6 +5680,7 @@ async def voice_profile_delete(profile_id: str, caller: dict = Depends(_require_
             )
             await db.execute("DELETE FROM speaker_profiles WHERE id=?", (profile_id,))
             await db.commit()
+        _SPEAKER_PROFILES.invalidate()
         return {"ok": True, "deleted": profile_id}
     except HTTPException:
         raise
@@ -5672,7 +5800,8 @@ async def get_livekit_token(request: Request, caller: dict = Depends(_require_li
 
 # ── Voice confirmation state ───────────────────────────────────────────────
 # Track pending confirmations per panel: panel_id → {intent_name, slots, expire_at, session_id}
-_PENDING_CONFIRMATIONS: dict[str, dict] = {}
+# An unanswered one is swept a few minutes after its own expire_at.
+_PENDING_CONFIRMATIONS = KeyedState("voice_pending_confirmations", ttl_s=300, max_size=256)
 _CONFIRM_TIMEOUT_S = 30  # seconds to wait for "yes/confirm" before expiring
 
 # Intents that require confirmation before execution (irreversible writes).
@@ -9,7 +9,14 @@ Data sources (priority order):
 Geocoding (location search):
   1. OpenWeatherMap Geocoding — if API key set
   2. Open-Meteo Geocoding API — free fallback
+
+Readings are served stale-while-revalidate from a keyed in-process cache:
+concurrent misses for the same (kind, lat, lon) share one provider fetch, the
+household's locations are refreshed in the background ahead of expiry, and
+the last good readings are persisted to disk so a restart does not start cold.
 """
+import asyncio
+import functools
 import os
 import json
 import logging
@@ -18,29 +25,38 @@ from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import http_clients
 from auth import get_current_user, require_admin
 from database import get_db
 from models import WeatherPreferences
 from push import broadcaster
+from typed_env import env_bool, env_float, env_str
 
 router = APIRouter(prefix="/api/weather", tags=["weather"])
 logger = logging.getLogger(__name__)
 
 OPENWEATHERMAP_API_KEY = os.environ.get("OPENWEATHERMAP_API_KEY", "")
 
-# Keyed TTL cache: {(kind, lat, lon) -> {"ts": monotonic, "data": reading}}.
+# Keyed TTL cache: {(kind, lat, lon) -> {"ts": monotonic, "wall": epoch, "data": reading}}.
 # Coords are rounded to 3 dp (~110 m) so home-prefs jitter still hits. Replaces
 # the old single flat slot, whose one-reading-across-users design forced two
 # workarounds (skybridge's cached-city mismatch check and the named-location
 # cache=False bypass) — a keyed cache makes both structurally impossible: a
 # "weather in Perth" reading lives under Perth's coords and can never feed a
-# home-area (or another user's) query.
+# home-area (or another user's) query. "wall" is only there so a persisted
+# reading keeps its true age across a restart.
 _weather_cache: dict = {}
 _WEATHER_TTL_S = float(os.environ.get("ZOE_WEATHER_CACHE_TTL_S", "600"))
+# (kind, lat, lon) -> the provider fetch in flight for those coords. Panels,
+# the daily briefing and skybridge cards all asking at the moment of expiry
+# share this one task instead of each calling the provider.
+_weather_inflight: dict = {}
+_weather_dirty = False
+# Persisted readings older than this are not worth reloading after a restart.
+_PERSIST_MAX_AGE_S = 24 * 3600.0
 
 
 def _ckey(kind: str, lat: float, lon: float) -> tuple:
@@ -64,7 +80,154 @@ def _cache_get_stale(kind: str, lat: float, lon: float) -> dict | None:
 
 
 def _cache_put(kind: str, lat: float, lon: float, data: dict) -> None:
-    _weather_cache[_ckey(kind, lat, lon)] = {"ts": time.monotonic(), "data": data}
+    global _weather_dirty
+    _weather_cache[_ckey(kind, lat, lon)] = {"ts": time.monotonic(), "wall": time.time(), "data": data}
+    _weather_dirty = True
+
+
+def _stale_max_s() -> float:
+    """Oldest reading still served while a revalidation runs; older ones wait on the provider."""
+    return env_float("ZOE_WEATHER_STALE_MAX_S", 3600.0)
+
+
+def _observe_cache(kind: str, result: str, age: float) -> None:
+    try:
+        from memory_metrics import weather_cache_count, weather_reading_age_seconds
+        weather_cache_count.labels(kind=kind, result=result).inc()
+        weather_reading_age_seconds.labels(kind=kind).observe(age)
+    except Exception:
+        pass
+
+
+def _observe_provider(kind: str, elapsed: float, outcome: str) -> None:
+    try:
+        from memory_metrics import weather_provider_latency_seconds
+        provider = "openweathermap" if OPENWEATHERMAP_API_KEY else "open_meteo"
+        weather_provider_latency_seconds.labels(provider=provider, kind=kind, outcome=outcome).observe(elapsed)
+    except Exception:
+        pass
+
+
+async def _timed_fetch(kind: str, key: tuple, fetch) -> dict:
+    before = _weather_cache.get(key)
+    started = time.perf_counter()
+    result = await fetch()
+    # The fetchers swallow provider errors and hand back a stale reading or an
+    # error dict; only a fresh cache write means the provider answered.
+    after = _weather_cache.get(key)
+    _observe_provider(kind, time.perf_counter() - started, "ok" if after is not None and after is not before else "error")
+    return result
+
+
+def _inflight_done(key: tuple, task: asyncio.Task) -> None:
+    if _weather_inflight.get(key) is task:
+        del _weather_inflight[key]
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("weather fetch for %s failed", key, exc_info=task.exception())
+
+
+def _revalidate(kind: str, lat: float, lon: float, fetch) -> asyncio.Task:
+    """The fetch in flight for these coords, starting one if there is none."""
+    key = _ckey(kind, lat, lon)
+    task = _weather_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_timed_fetch(kind, key, fetch), name=f"weather_fetch_{kind}")
+        _weather_inflight[key] = task
+        task.add_done_callback(functools.partial(_inflight_done, key))
+    return task
+
+
+async def _serve(kind: str, lat: float, lon: float, fetch) -> dict:
+    """Stale-while-revalidate read of one keyed reading.
+
+    Fresh → served. Past the TTL but within ``_stale_max_s()`` → served as-is
+    while one background fetch revalidates it. Otherwise the caller waits on
+    the (shared) fetch, shielded so one cancelled caller doesn't abort it for
+    the others.
+    """
+    entry = _weather_cache.get(_ckey(kind, lat, lon))
+    if entry is not None:
+        age = time.monotonic() - entry["ts"]
+        if age < _WEATHER_TTL_S:
+            _observe_cache(kind, "fresh", age)
+            return entry["data"]
+        if age < _stale_max_s():
+            _revalidate(kind, lat, lon, fetch)
+            _observe_cache(kind, "stale", age)
+            return entry["data"]
+    coalesced = _ckey(kind, lat, lon) in _weather_inflight
+    result = await asyncio.shield(_revalidate(kind, lat, lon, fetch))
+    _observe_cache(kind, "coalesced" if coalesced else "miss", 0.0)
+    return result
+
+
+def _weather_cache_path() -> str:
+    return env_str("ZOE_WEATHER_CACHE_PATH", os.path.expanduser("~/.zoe/weather_cache.json"))
+
+
+def _save_weather_cache(entries: list) -> bool:
+    """Write a snapshot of readings atomically. Returns True on a durable write."""
+    path = _weather_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entries, fh)
+        os.replace(tmp, path)  # atomic
+        return True
+    except Exception as exc:
+        logger.warning("weather: could not persist readings to %s (%s)", path, exc)
+        return False
+
+
+def _cache_snapshot() -> list:
+    now = time.time()
+    return [
+        {"kind": key[0], "lat": key[1], "lon": key[2], "wall": entry["wall"], "data": entry["data"]}
+        for key, entry in _weather_cache.items()
+        if "wall" in entry and now - entry["wall"] < _PERSIST_MAX_AGE_S
+    ]
+
+
+async def flush_weather_cache() -> bool:
+    """Persist the cache if anything changed since the last flush."""
+    global _weather_dirty
+    if not _weather_dirty:
+        return False
+    _weather_dirty = False
+    return await asyncio.to_thread(_save_weather_cache, _cache_snapshot())
+
+
+def load_weather_cache() -> int:
+    """Seed the cache from the last persisted readings, keeping each one's age.
+
+    A reading younger than the TTL is served as fresh, an older one goes
+    through stale-while-revalidate, so the first panel after a restart is not
+    a cold provider round trip. Entries already in memory win. Returns the
+    number of readings loaded.
+    """
+    try:
+        with open(_weather_cache_path(), "r", encoding="utf-8") as fh:
+            entries = json.load(fh)
+    except FileNotFoundError:
+        return 0
+    except Exception as exc:  # corrupt/unreadable → start cold, never break startup
+        logger.warning("weather: persisted readings unreadable (%s), ignoring", exc)
+        return 0
+    now_wall, now_mono = time.time(), time.monotonic()
+    loaded = 0
+    for item in entries if isinstance(entries, list) else []:
+        try:
+            key = _ckey(item["kind"], item["lat"], item["lon"])
+            age = max(0.0, now_wall - float(item["wall"]))
+            data = item["data"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if age >= _PERSIST_MAX_AGE_S or not isinstance(data, dict) or key in _weather_cache:
+            continue
+        _weather_cache[key] = {"ts": now_mono - age, "wall": float(item["wall"]), "data": data}
+        loaded += 1
+    return loaded
 
 # Default location: Geraldton, Western Australia
 DEFAULT_CITY = "Geraldton"
@@ -146,7 +309,7 @@ async def _geocode(name: str) -> Optional[tuple]:
     if not q:
         return None
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session("open_meteo", timeout=10.0) as client:
             r = await client.get(
                 "https://geocoding-api.open-meteo.com/v1/search",
                 params={"name": q, "count": 1, "language": "en", "format": "json"},
@@ -263,7 +426,7 @@ async def _fetch_openmeteo_current(lat: float, lon: float, city: str, country: s
         "wind_speed_unit": "ms",  # m/s like OpenWeatherMap metric
     }
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session("open_meteo", timeout=10.0) as client:
             r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
             r.raise_for_status()
             data = r.json()
@@ -338,7 +501,7 @@ async def _fetch_openmeteo_forecast(lat: float, lon: float) -> dict:
             "timezone": "auto", "forecast_days": 6,
         }
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_clients.session("open_meteo", timeout=10.0) as client:
                 r = await client.get("https://api.open-meteo.com/v1/forecast", params=params)
                 r.raise_for_status()
                 data = r.json()
@@ -401,7 +564,7 @@ async def _fetch_openmeteo_forecast(lat: float, lon: float) -> dict:
 async def _fetch_owm_current(lat: float, lon: float, city: str, country: str) -> dict:
     params = {"appid": OPENWEATHERMAP_API_KEY, "units": "metric", "lat": lat, "lon": lon}
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session("openweathermap", timeout=10.0) as client:
             r = await client.get("https://api.openweathermap.org/data/2.5/weather", params=params)
             r.raise_for_status()
             data = r.json()
@@ -436,7 +599,7 @@ async def _fetch_owm_current(lat: float, lon: float, city: str, country: str) ->
 async def _fetch_owm_forecast(lat: float, lon: float) -> dict:
     params = {"appid": OPENWEATHERMAP_API_KEY, "units": "metric", "cnt": 40, "lat": lat, "lon": lon}
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with http_clients.session("openweathermap", timeout=10.0) as client:
             r = await client.get("https://api.openweathermap.org/data/2.5/forecast", params=params)
             r.raise_for_status()
             data = r.json()
@@ -505,24 +668,97 @@ async def _fetch_owm_forecast(lat: float, lon: float) -> dict:
 
 # ─── Public route helpers ─────────────────────────────────────────────────────
 
+def _provider_fetch(kind: str, lat, lon, city=None, country=None):
+    """Zero-arg coroutine factory for the configured provider's fetch."""
+    if kind == "current":
+        if OPENWEATHERMAP_API_KEY:
+            return lambda: _fetch_owm_current(lat, lon, city, country)
+        return lambda: _fetch_openmeteo_current(lat, lon, city, country)
+    if OPENWEATHERMAP_API_KEY:
+        return lambda: _fetch_owm_forecast(lat, lon)
+    return lambda: _fetch_openmeteo_forecast(lat, lon)
+
+
 async def _get_current(lat, lon, city, country):
     """Current weather for coords — fresh keyed-cache hit short-circuits the
-    provider call (voice replies stay instant on the panel-warmed home area)."""
-    hit = _cache_get("current", lat, lon)
-    if hit is not None:
-        return hit
-    if OPENWEATHERMAP_API_KEY:
-        return await _fetch_owm_current(lat, lon, city, country)
-    return await _fetch_openmeteo_current(lat, lon, city, country)
+    provider call (voice replies stay instant on the panel-warmed home area),
+    and a recently expired one is served while it revalidates."""
+    return await _serve("current", lat, lon, _provider_fetch("current", lat, lon, city, country))
 
 
 async def _get_forecast(lat, lon):
-    hit = _cache_get("forecast", lat, lon)
-    if hit is not None:
-        return hit
-    if OPENWEATHERMAP_API_KEY:
-        return await _fetch_owm_forecast(lat, lon)
-    return await _fetch_openmeteo_forecast(lat, lon)
+    return await _serve("forecast", lat, lon, _provider_fetch("forecast", lat, lon))
+
+
+# ─── Background refresh of household locations ────────────────────────────────
+
+async def _household_locations() -> list:
+    """(lat, lon, city, country) for the system default and every saved home area."""
+    from database import get_db_ctx
+
+    async with get_db_ctx() as db:
+        fallback = await _get_system_default_location(db)
+        cursor = await db.execute(
+            "SELECT latitude, longitude, city, country FROM weather_preferences "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+        rows = await cursor.fetchall()
+    locations: dict = {}
+    for prefs in [None, *(dict(r) for r in rows)]:
+        lat, lon, city, country = _resolve_location(prefs, fallback=fallback)
+        locations.setdefault(_ckey("", lat, lon), (lat, lon, city, country))
+    return list(locations.values())
+
+
+async def refresh_household_weather() -> int:
+    """Refresh household readings that are missing or due to expire soon.
+
+    A reading is due once it is within ``ZOE_WEATHER_REFRESH_LEAD_S`` of the
+    TTL, so the panels and the morning briefing keep hitting a fresh entry.
+    Current goes first: the Open-Meteo forecast reuses its hourly data.
+    Returns the number of readings refreshed.
+    """
+    due_age = _WEATHER_TTL_S - env_float("ZOE_WEATHER_REFRESH_LEAD_S", 90.0)
+    refreshed = 0
+    for lat, lon, city, country in await _household_locations():
+        for kind in ("current", "forecast"):
+            entry = _weather_cache.get(_ckey(kind, lat, lon))
+            if entry is not None and time.monotonic() - entry["ts"] < due_age:
+                continue
+            await _revalidate(kind, lat, lon, _provider_fetch(kind, lat, lon, city, country))
+            refreshed += 1
+    return refreshed
+
+
+async def _weather_refresh_loop() -> None:
+    interval = env_float("ZOE_WEATHER_REFRESH_INTERVAL_S", 60.0)
+    try:
+        while True:
+            try:
+                await refresh_household_weather()
+                await flush_weather_cache()
+            except Exception:
+                logger.warning("weather: household refresh failed (non-fatal)", exc_info=True)
+            await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        if _weather_dirty:
+            _save_weather_cache(_cache_snapshot())
+        raise
+
+
+def start_weather_refresh_background() -> asyncio.Task | None:
+    """Load persisted readings and start the household refresh loop.
+
+    Controlled by ZOE_WEATHER_REFRESH_ENABLED (default: true). Returns the
+    Task so main.py can cancel it on shutdown.
+    """
+    if not env_bool("ZOE_WEATHER_REFRESH_ENABLED", True):
+        logger.info("Weather background refresh disabled (ZOE_WEATHER_REFRESH_ENABLED=false)")
+        return None
+    loaded = load_weather_cache()
+    if loaded:
+        logger.info("weather: loaded %d persisted readings", loaded)
+    return asyncio.create_task(_weather_refresh_loop(), name="weather_refresh")
 
 
 # ─── Routes ───────────────────────────────────────────────────────────────────
@@ -643,7 +879,7 @@ async def search_locations(query: str = "", limit: int = 8, user: dict = Depends
 
     if OPENWEATHERMAP_API_KEY:
         try:
-            async with httpx.AsyncClient(timeout=8.0) as client:
+            async with http_clients.session("openweathermap", timeout=8.0) as client:
                 r = await client.get(
                     "http://api.openweathermap.org/geo/1.0/direct",
                     params={"q": query, "limit": min(limit, 10), "appid": OPENWEATHERMAP_API_KEY},
@@ -659,7 +895,7 @@ async def search_locations(query: str = "", limit: int = 8, user: dict = Depends
 
     # Open-Meteo geocoding (free, no key)
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
+        async with http_clients.session("open_meteo", timeout=8.0) as client:
             r = await client.get(
                 "https://geocoding-api.open-meteo.com/v1/search",
                 params={"name": query, "count": min(limit, 10), "language": "en", "format": "json"},
@@ -22,6 +22,7 @@ scripts/maintenance/router_shadow_report.py.
 """
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import os
@@ -32,6 +33,8 @@ from typing import Optional
 
 import numpy as np
 
+from embedding_service import EmbeddingService
+
 logger = __import__("logging").getLogger(__name__)
 
 # Dedicated logger for the SetFit-head shadow comparison lines so they can be
@@ -114,6 +117,11 @@ _MATRIX: Optional[np.ndarray] = None
 _LABELS: Optional[np.ndarray] = None
 _DOM_IDX: dict[str, np.ndarray] = {}
 _LOCK = threading.Lock()
+# Cache + micro-batcher in front of _MODEL (rebound whenever _MODEL changes).
+_EMBEDDER: Optional[EmbeddingService] = None
+_EMBEDDER_MODEL = None
+# (_MATRIX, _DOM_IDX) → domain-sorted matrix + reduceat segment starts.
+_LAYOUT: Optional[tuple] = None
 _MODEL_NAME = os.environ.get("ZOE_ROUTER_MODEL", "BAAI/bge-small-en-v1.5")
 
 # --- SetFit classifier head (labs/setfit-router PR #1296) -------------------
@@ -314,6 +322,48 @@ def _ensure_loaded():
     _ensure_head_loaded()
 
 
+def _embedder() -> EmbeddingService:
+    """The embedding cache/batcher bound to the current ``_MODEL``."""
+    global _EMBEDDER, _EMBEDDER_MODEL
+    model = _MODEL
+    svc = _EMBEDDER
+    if svc is None or _EMBEDDER_MODEL is not model:
+        svc = EmbeddingService(lambda texts: model.embed(texts))
+        _EMBEDDER, _EMBEDDER_MODEL = svc, model
+    return svc
+
+
+def embedding_stats() -> dict:
+    return _EMBEDDER.stats() if _EMBEDDER is not None else {}
+
+
+def _domain_layout() -> tuple:
+    """Example matrix re-ordered so each domain's rows are contiguous.
+
+    Returns ``(domains, sorted_matrix, starts)`` for one ``np.maximum.reduceat``
+    per turn; rebuilt only when ``_MATRIX`` / ``_DOM_IDX`` are replaced.
+    """
+    global _LAYOUT
+    matrix, dom_idx = _MATRIX, _DOM_IDX
+    cached = _LAYOUT
+    if cached is not None and cached[0] is matrix and cached[1] is dom_idx:
+        return cached[2]
+    domains = [d for d in ROUTES if len(dom_idx.get(d, ())) > 0]
+    order = np.concatenate([np.asarray(dom_idx[d], dtype=np.intp) for d in domains])
+    sizes = np.asarray([len(dom_idx[d]) for d in domains], dtype=np.intp)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    layout = (domains, np.ascontiguousarray(matrix[order]), starts)
+    _LAYOUT = (matrix, dom_idx, layout)
+    return layout
+
+
+def _domain_scores(v: np.ndarray) -> dict[str, float]:
+    """Best cosine similarity per domain for unit vector ``v``."""
+    domains, sorted_matrix, starts = _domain_layout()
+    maxima = np.maximum.reduceat(sorted_matrix @ v, starts)
+    return dict(zip(domains, maxima.tolist()))
+
+
 def _ensure_head_loaded():
     """Lazy-load the SetFit head (only when ZOE_ROUTER_HEAD != off)."""
     global _HEAD, _HEAD_FAILED
@@ -495,8 +545,7 @@ def route_two_stage(text: str) -> RouterDecision:
     t0 = time.perf_counter()
     try:
         _ensure_loaded()
-        v = np.asarray(next(iter(_MODEL.embed([text or ""]))), dtype=np.float32)
-        v /= (np.linalg.norm(v) + 1e-9)
+        v = _embedder().embed(text)
         import router_two_stage
 
         d = router_two_stage.decide(text, v)
@@ -523,10 +572,28 @@ def route(text: str) -> dict:
     """
     _ensure_loaded()
     t0 = time.perf_counter()
-    v = np.asarray(next(iter(_MODEL.embed([text or ""]))), dtype=np.float32)
-    v /= (np.linalg.norm(v) + 1e-9)
-    sims = _MATRIX @ v
-    scores = {d: float(sims[_DOM_IDX[d]].max()) for d in ROUTES}
+    return _route_vector(text, _embedder().embed(text), t0)
+
+
+async def aroute(text: str) -> dict:
+    """:func:`route` for coroutines: same result, never blocks the loop.
+
+    Concurrent calls from different turns share one ONNX ``embed`` call
+    (EmbeddingService micro-batching) and repeats are served from its cache.
+    The active two-stage decision makes a synchronous sidecar call, so that
+    mode finishes in a worker thread.
+    """
+    if _MODEL is None:
+        await asyncio.to_thread(_ensure_loaded)
+    t0 = time.perf_counter()
+    v = await _embedder().embed_async(text)
+    if head_mode() == "active":
+        return await asyncio.to_thread(_route_vector, text, v, t0)
+    return _route_vector(text, v, t0)
+
+
+def _route_vector(text: str, v: np.ndarray, t0: float) -> dict:
+    scores = _domain_scores(v)
     domain = max(scores, key=scores.get)
     score = scores[domain]
     thr = threshold()
@@ -198,12 +198,18 @@ async def list_devices() -> Optional[list[dict[str, Any]]]:
 
     Sources: real HA lights (/lights, dimmable) + switches (/switches) + helper
     toggles (input_boolean via /entities), which is how a headless HA models a
-    simulated home. If EVERY source is unreachable the bridge is down; a reachable
-    bridge with no devices returns [] (an inviting empty card, not the offline one).
+    simulated home. The bridge serves all three in one /devices snapshot (from
+    its in-memory state mirror); a bridge without /devices gets the three calls.
+    If EVERY source is unreachable the bridge is down; a reachable bridge with
+    no devices returns [] (an inviting empty card, not the offline one).
     """
-    lights = await _ha_get("/lights")
-    switches = await _ha_get("/switches")
-    helpers = await _ha_get("/entities?domain=input_boolean")
+    snapshot = await _ha_get("/devices")
+    if isinstance(snapshot, dict) and "lights" in snapshot:
+        lights, switches, helpers = snapshot, snapshot, snapshot
+    else:
+        lights = await _ha_get("/lights")
+        switches = await _ha_get("/switches")
+        helpers = await _ha_get("/entities?domain=input_boolean")
     if lights is None and switches is None and helpers is None:
         return None  # bridge unreachable — caller renders the offline card
     devices: list[dict[str, Any]] = []
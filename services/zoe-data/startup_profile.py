@@ -0,0 +1,270 @@
+"""
+startup_profile.py — where zoe-data's boot time goes.
+
+After a restart a Pi takes a long time before ``/health`` is green, and the
+cost is spread over ~50 router imports, the lifespan's setup steps and a
+handful of model warmups. This module records all three so the slow parts are
+visible instead of guessed at:
+
+* **imports** — ``start_import_timer()`` (called first thing in ``main``)
+  installs a meta-path hook that times each module's execution, cumulative
+  (with the modules it imports) and self. It is removed once the lifespan has
+  finished starting, so steady-state imports pay nothing.
+* **phases** — ``with phase("init_db"):`` around each lifespan step, plus
+  ``mark()`` for instants ("app_built", "lifespan_ready"). Offsets are seconds
+  since this module was imported.
+* **warmups** — ``WarmupScheduler`` runs the background warmups in priority
+  order, at most ``ZOE_WARMUP_CONCURRENCY`` (default 2) at a time, instead of
+  all at once competing with the first requests for the Pi's four cores.
+
+``snapshot()`` is served at ``GET /api/system/startup`` (admin).
+Set ``ZOE_STARTUP_PROFILE=0`` to skip the import hook; phases and warmups are
+always recorded (a few dict appends).
+"""
+import asyncio
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from typed_env import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+_T0 = time.monotonic()
+
+_phases: list[dict] = []
+_marks: dict[str, float] = {}
+_warmups: list[dict] = []
+# module name -> [cumulative seconds, self seconds]
+_imports: dict[str, list[float]] = {}
+
+
+def _since_start() -> float:
+    return round(time.monotonic() - _T0, 4)
+
+
+# ── Import timing ───────────────────────────────────────────────────────────
+
+
+class _TimedLoader:
+    """Wraps a loader for one ``exec_module`` call, then gets out of the way."""
+
+    def __init__(self, loader, timer: "_ImportTimer") -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def exec_module(self, module) -> None:
+        # Put the real loader back before the module runs, so nothing that
+        # inspects __loader__ / __spec__.loader ever sees the wrapper.
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._timer.run(module.__name__, self._loader, module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        local = self._local
+        if getattr(local, "finding", False):
+            return None
+        local.finding = True
+        try:
+            finders = sys.meta_path[sys.meta_path.index(self) + 1:]
+            for finder in finders:
+                find = getattr(finder, "find_spec", None)
+                if find is None:
+                    continue
+                spec = find(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def run(self, name: str, loader, module) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # time spent in nested imports
+        start = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            _imports[name] = [elapsed, max(0.0, elapsed - nested)]
+            if stack:
+                stack[-1] += elapsed
+
+
+_timer: Optional[_ImportTimer] = None
+
+
+def start_import_timer() -> bool:
+    """Install the import hook (idempotent). False when ZOE_STARTUP_PROFILE=0."""
+    global _timer
+    if _timer is not None:
+        return True
+    if not env_bool("ZOE_STARTUP_PROFILE", True):
+        return False
+    _timer = _ImportTimer()
+    sys.meta_path.insert(0, _timer)
+    return True
+
+
+def stop_import_timer() -> None:
+    global _timer
+    if _timer is None:
+        return
+    try:
+        sys.meta_path.remove(_timer)
+    except ValueError:
+        pass
+    _timer = None
+
+
+# ── Phases ──────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def phase(name: str):
+    """Time one startup step. Failures are recorded and re-raised."""
+    started = _since_start()
+    t0 = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        _phases.append({
+            "name": name,
+            "start_s": started,
+            "duration_s": round(time.perf_counter() - t0, 4),
+            "ok": ok,
+        })
+
+
+def mark(name: str) -> None:
+    """Record an instant (first occurrence wins)."""
+    _marks.setdefault(name, _since_start())
+
+
+# ── Warmups ─────────────────────────────────────────────────────────────────
+
+
+@dataclass(order=True)
+class _Warmup:
+    priority: int
+    seq: int
+    name: str = field(compare=False)
+    factory: Callable[[], Awaitable] = field(compare=False)
+    timeout_s: Optional[float] = field(compare=False, default=None)
+    delay_s: float = field(compare=False, default=0.0)
+
+
+class WarmupScheduler:
+    """Run startup warmups lowest ``priority`` first, a bounded number at a time.
+
+    ``add()`` only queues; ``start()`` returns one Task that drives the queue.
+    A warmup that fails or times out is logged and recorded, never raised.
+    ``delay_s`` waits before asking for a slot, so a warmup that needs a
+    dependency to come up first does not hold a slot while it waits.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None) -> None:
+        self._queue: list[_Warmup] = []
+        self._concurrency = concurrency
+
+    def add(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable],
+        *,
+        priority: int,
+        timeout_s: Optional[float] = None,
+        delay_s: float = 0.0,
+    ) -> None:
+        self._queue.append(_Warmup(priority, len(self._queue), name, factory, timeout_s, delay_s))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def _run_one(self, warmup: _Warmup, gate: asyncio.Semaphore) -> None:
+        if warmup.delay_s > 0:
+            await asyncio.sleep(warmup.delay_s)
+        queued_at = _since_start()
+        async with gate:
+            record = {"name": warmup.name, "priority": warmup.priority,
+                      "queued_s": queued_at, "start_s": _since_start()}
+            t0 = time.perf_counter()
+            try:
+                await asyncio.wait_for(warmup.factory(), timeout=warmup.timeout_s)
+                record["status"] = "ok"
+            except asyncio.TimeoutError:
+                record["status"] = "timeout"
+                logger.warning("warmup %s timed out after %.0fs (non-fatal)", warmup.name, warmup.timeout_s)
+            except asyncio.CancelledError:
+                record["status"] = "cancelled"
+                raise
+            except Exception as exc:
+                record["status"] = "error"
+                record["error"] = str(exc)[:200]
+                logger.warning("warmup %s failed (non-fatal): %s", warmup.name, exc)
+            finally:
+                record["duration_s"] = round(time.perf_counter() - t0, 4)
+                _warmups.append(record)
+
+    async def run(self) -> None:
+        concurrency = self._concurrency or env_int("ZOE_WARMUP_CONCURRENCY", 2)
+        gate = asyncio.Semaphore(max(1, concurrency))
+        ordered, self._queue = sorted(self._queue), []
+        # Tasks are created in priority order, and Semaphore wakes waiters FIFO,
+        # so a slot always goes to the most important warmup still waiting.
+        await asyncio.gather(*(self._run_one(w, gate) for w in ordered))
+
+    def start(self) -> asyncio.Task:
+        return asyncio.create_task(self.run(), name="startup_warmups")
+
+
+# ── Report ──────────────────────────────────────────────────────────────────
+
+
+def snapshot(top: int = 40) -> dict:
+    """Phases, marks, warmups and the slowest imports, for the admin endpoint."""
+    by_cumulative = sorted(_imports.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+    by_self = sorted(_imports.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+    return {
+        "uptime_s": _since_start(),
+        "marks": dict(_marks),
+        "phases": list(_phases),
+        "warmups": sorted(_warmups, key=lambda w: w["start_s"]),
+        "imports": {
+            "profiling": _timer is not None,
+            "modules": len(_imports),
+            "total_self_s": round(sum(v[1] for v in _imports.values()), 4),
+            "slowest_cumulative": [
+                {"module": name, "cumulative_s": round(cum, 4), "self_s": round(own, 4)}
+                for name, (cum, own) in by_cumulative
+            ],
+            "slowest_self": [
+                {"module": name, "self_s": round(own, 4)} for name, (_, own) in by_self
+            ],
+        },
+    }
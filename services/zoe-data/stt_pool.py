@@ -0,0 +1,306 @@
+"""
+stt_pool.py — a small pool of STT model instances behind a priority queue.
+
+Moonshine used to run every transcription through one global inference lock on
+one shared transcriber, so two panels talking at once — or an ambient segment
+landing during a command turn — queued behind each other in arrival order.
+``SttPool`` keeps up to ``size`` instances, each owned by its own worker thread
+(one inference per instance at a time, so no per-call lock is needed), and
+serves jobs lowest ``priority`` first:
+
+* ``INTERACTIVE`` — a live command turn (panel ``/turn``, LiveKit, streaming
+  segments of a LiveKit utterance);
+* ``BACKGROUND`` — ambient capture and instrument traffic (the replay gate).
+
+Workers are started lazily: the first on the first job, another only when a
+job is queued while every live worker is busy, up to ``size``. A worker builds
+its instance on its own thread before taking jobs, so the model load never
+blocks the event loop; an instance that fails to build (OOM) just ends that
+worker, leaving the pool at its previous size.
+
+``size`` comes from ``ZOE_STT_WORKERS`` (``auto`` by default: at most half the
+cores, and no more instances than fit in MemAvailable after a reserve — see
+``auto_size``). When ``ZOE_STT_MAX_QUEUE`` jobs are already waiting, a new job
+either displaces the lowest-priority waiting job (when it outranks it) or is
+refused; either way the loser gets ``SttOverloaded`` straight away instead of
+waiting behind work that will not finish in time.
+
+Each job records its queue wait and inference time (histograms labelled by
+priority); ``stats()`` feeds ``/health``'s ``stt`` block.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from typed_env import env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+_PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class SttOverloaded(RuntimeError):
+    """The STT queue is full and this job lost its place."""
+
+
+def _mem_available_mb() -> Optional[int]:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def auto_size() -> int:
+    """Instances that fit this box: ≤ half the cores, ≤ 4, and each needs
+    ``ZOE_STT_INSTANCE_MB`` (default 400) of MemAvailable beyond
+    ``ZOE_STT_RESERVE_MB`` (default 1024). Never below 1."""
+    by_cores = max(1, (os.cpu_count() or 2) // 2)
+    size = min(by_cores, 4)
+    available = _mem_available_mb()
+    if available is not None:
+        per_instance = max(1, env_int("ZOE_STT_INSTANCE_MB", 400))
+        spare = available - env_int("ZOE_STT_RESERVE_MB", 1024)
+        size = min(size, spare // per_instance)
+    return max(1, size)
+
+
+def configured_size() -> int:
+    raw = env_str("ZOE_STT_WORKERS", "auto").strip().lower()
+    if raw in ("", "auto", "0"):
+        return auto_size()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("ZOE_STT_WORKERS=%r is not a number — sizing automatically", raw)
+        return auto_size()
+
+
+def _observe(priority: int, wait_s: float, infer_s: Optional[float], shed: bool = False) -> None:
+    try:
+        from memory_metrics import stt_inference_seconds, stt_queue_wait_seconds, stt_shed_count
+
+        label = _PRIORITY_NAMES.get(priority, str(priority))
+        if shed:
+            stt_shed_count.labels(priority=label).inc()
+            return
+        stt_queue_wait_seconds.labels(priority=label).observe(wait_s)
+        if infer_s is not None:
+            stt_inference_seconds.labels(priority=label).observe(infer_s)
+    except Exception:
+        pass
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "fn", "future", "queued_at")
+
+    def __init__(self, priority: int, seq: int, fn: Callable[[Any], Any]) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.fn = fn
+        self.future: Future = Future()
+        self.queued_at = time.perf_counter()
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SttPool:
+    """``submit(fn, priority)`` runs ``fn(instance)`` on the next free worker.
+
+    ``factory(slot)`` builds the instance for worker ``slot`` on that worker's
+    thread. Slot 0 is asked again for every job, so it can hand back a shared,
+    lazily loaded model. ``warmer(instance)`` is the warm-up pass ``warm()`` runs.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], Any],
+        *,
+        size: int,
+        max_queue: int,
+        warmer: Callable[[Any], Any] = lambda _instance: None,
+    ) -> None:
+        self._factory = factory
+        self._warmer = warmer
+        self.size = max(1, size)
+        self.max_queue = max(1, max_queue)
+        self._cond = threading.Condition()
+        self._heap: list[_Job] = []
+        self._seq = itertools.count()
+        self._workers = 0
+        self._idle = 0
+        self._starting = 0
+        self._warm_epoch = 0
+        self._slots: set[int] = set()  # workers started or starting
+        self._warm_waiters: list[tuple[set, Future]] = []  # (slots still to warm, Future)
+        self._counts = {"done": 0, "failed": 0, "shed": 0}
+        self._last: dict = {}
+
+    # ── submission ──────────────────────────────────────────────────────────
+
+    def submit(self, fn: Callable[[Any], Any], priority: int = INTERACTIVE) -> Future:
+        job = _Job(priority, next(self._seq), fn)
+        shed: Optional[_Job] = None
+        with self._cond:
+            if len(self._heap) >= self.max_queue:
+                worst = max(self._heap)
+                shed = job if not job < worst else worst
+                if shed is worst:
+                    self._heap.remove(worst)
+                    heapq.heapify(self._heap)
+                self._counts["shed"] += 1
+            if shed is not job:
+                heapq.heappush(self._heap, job)
+                self._maybe_grow()
+                self._cond.notify()
+        if shed is not None:
+            logger.warning(
+                "STT queue full (%d waiting) — shedding a %s job",
+                self.max_queue, _PRIORITY_NAMES.get(shed.priority, shed.priority),
+            )
+            _observe(shed.priority, 0.0, None, shed=True)
+            if shed.future.set_running_or_notify_cancel():
+                shed.future.set_exception(SttOverloaded("STT queue is full"))
+        return job.future
+
+    async def run(self, fn: Callable[[Any], Any], priority: int = INTERACTIVE):
+        """Await ``fn(instance)``. Cancelling the awaiter drops a still-queued job."""
+        return await asyncio.wrap_future(self.submit(fn, priority))
+
+    def warm(self) -> Future:
+        """Ask every worker to run ``warmer`` on its instance, once no interactive
+        job is waiting. Resolves when they all have (starting the first worker
+        if there is none yet)."""
+        done: Future = Future()
+        with self._cond:
+            self._warm_epoch += 1
+            if self._workers + self._starting == 0:
+                self._spawn()
+            self._warm_waiters.append((set(self._slots), done))
+            self._cond.notify_all()
+        return done
+
+    # ── workers ─────────────────────────────────────────────────────────────
+
+    def _maybe_grow(self) -> None:
+        # Lock held, job just pushed: start a worker if none is free to take it.
+        live = self._workers + self._starting
+        if live == 0 or (self._idle == 0 and self._starting == 0 and live < self.size):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        slot = self._workers + self._starting
+        self._starting += 1
+        self._slots.add(slot)
+        threading.Thread(target=self._worker, args=(slot,), name=f"stt-worker-{slot}", daemon=True).start()
+
+    def _worker(self, slot: int) -> None:
+        instance = None
+        if slot:
+            try:
+                instance = self._factory(slot)
+            except Exception as exc:
+                logger.warning("STT worker %d: instance load failed (%s) — pool stays at %d", slot, exc, slot)
+                with self._cond:
+                    self._starting -= 1
+                    self.size = min(self.size, slot)
+                    self._slots.discard(slot)
+                    self._warmed_one(slot)
+                return
+            logger.info("STT worker %d ready", slot)
+        with self._cond:
+            self._starting -= 1
+            self._workers += 1
+        warmed = 0
+        while True:
+            with self._cond:
+                self._idle += 1
+                while not self._heap and warmed >= self._warm_epoch:
+                    self._cond.wait()
+                self._idle -= 1
+                interactive_waiting = bool(self._heap) and self._heap[0].priority == INTERACTIVE
+                if warmed < self._warm_epoch and not interactive_waiting:
+                    warmed, job = self._warm_epoch, None
+                else:
+                    job = heapq.heappop(self._heap)
+            if job is None:
+                self._warm(slot, instance)
+            else:
+                self._run_job(job, slot, instance)
+
+    def _instance(self, slot: int, instance):
+        return instance if slot else self._factory(0)
+
+    def _warm(self, slot: int, instance) -> None:
+        error: Optional[Exception] = None
+        try:
+            self._warmer(self._instance(slot, instance))
+        except Exception as exc:
+            error = exc
+            logger.debug("STT worker %d warm-up failed (non-fatal): %s", slot, exc)
+        with self._cond:
+            self._warmed_one(slot, error)
+
+    def _warmed_one(self, slot: int, error: Optional[Exception] = None) -> None:
+        # Lock held: worker ``slot`` finished (or gave up on) its warm-up pass.
+        # Only waiters registered while this slot was live count it, so a slot
+        # that fails to load can't resolve a waiter whose workers are still cold.
+        remaining = []
+        for pending, done in self._warm_waiters:
+            if slot not in pending:
+                remaining.append((pending, done))
+                continue
+            pending.discard(slot)
+            if pending:
+                remaining.append((pending, done))
+            elif error is not None:
+                done.set_exception(error)
+            else:
+                done.set_result(True)
+        self._warm_waiters = remaining
+
+    def _run_job(self, job: _Job, slot: int, instance) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return  # the awaiter went away while it was queued
+        started = time.perf_counter()
+        wait_s = started - job.queued_at
+        infer_s: Optional[float] = None
+        try:
+            result = job.fn(self._instance(slot, instance))
+        except Exception as exc:
+            self._counts["failed"] += 1
+            job.future.set_exception(exc)
+        else:
+            infer_s = time.perf_counter() - started
+            self._counts["done"] += 1
+            job.future.set_result(result)
+        self._last = {
+            "priority": _PRIORITY_NAMES.get(job.priority, job.priority),
+            "queue_wait_ms": round(wait_s * 1000, 1),
+            "inference_ms": round(infer_s * 1000, 1) if infer_s is not None else None,
+        }
+        _observe(job.priority, wait_s, infer_s)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "workers": self._workers,
+                "busy": self._workers - self._idle,
+                "queued": len(self._heap),
+                "max_queue": self.max_queue,
+                **self._counts,
+                "last": dict(self._last),
+            }
@@ -148,3 +148,66 @@ def test_brain_tool_sentinel_malformed_is_skipped():
     import json as _json
     s = "__TOOL__:" + _json.dumps({"phase": "start", "name": "x"})  # no id
     assert list(brain_tool_sentinel_events(s, assistant_message_id="m", tool_names=tool_names)) == []
+
+
+def _legacy_chunks(text, min_chars, newline_at=48):
+    """The old per-character batching, minus the clock (interval never elapses)."""
+    out, buf = [], ""
+    for idx, ch in enumerate(text):
+        buf += ch
+        if len(buf) >= min_chars or (ch == "\n" and len(buf) >= newline_at) or idx == len(text) - 1:
+            out.append(buf)
+            buf = ""
+    return out
+
+
+@pytest.mark.parametrize("min_chars", [1, 3, 47, 72, 240])
+def test_chunk_boundaries_match_per_character_batching(min_chars):
+    text = "".join(
+        ("short\n" if i % 3 else "a longer line that runs well past forty-eight characters\n") + "x" * (i % 97)
+        for i in range(60)
+    )
+
+    async def _run():
+        rec = AgRunRecorder()
+        lines = [
+            line
+            async for line in iter_text_message_chunks(
+                EventEncoder(), rec, "m1", text, min_chars=min_chars, max_interval_s=3600
+            )
+        ]
+        return lines, rec.events
+
+    lines, events = asyncio.run(_run())
+    deltas = [e["delta"] for e in events]
+    assert deltas == _legacy_chunks(text, min_chars)
+    assert "".join(deltas) == text
+    assert len(lines) == len(events)
+
+
+def test_elapsed_interval_flushes_every_character():
+    async def _run():
+        rec = AgRunRecorder()
+        async for _ in iter_text_message_chunks(EventEncoder(), rec, "m1", "Hello\nWorld", max_interval_s=0):
+            pass
+        return [e["delta"] for e in rec.events]
+
+    assert asyncio.run(_run()) == list("Hello\nWorld")
+
+
+def test_emit_matches_encoder_wire_format():
+    """The recorded dict is the wire payload, and the line is EventEncoder's byte for byte."""
+    import json as _json
+
+    enc = EventEncoder()
+    rec = AgRunRecorder()
+    events = [
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"),
+        CustomEvent(name="zoe.session", value={"sessionId": "s", "temp": 21.5, "note": "café “ok”"}),
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="t", tool_call_name="x"),
+    ]
+    for ev in events:
+        line = rec.emit(enc, ev)
+        assert line == enc.encode(ev)
+        assert rec.events[-1] == _json.loads(line[len("data: "):])
+    assert "parentMessageId" not in rec.events[-1]
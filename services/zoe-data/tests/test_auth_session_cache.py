@@ -0,0 +1,133 @@
+"""Session validation cache: single-flight misses, negative caching, LRU bound,
+and zoe-auth's invalidation push.
+
+No zoe-auth: ``_validate_with_auth_service`` is swapped for a fake that counts
+calls and can be held open to line concurrent requests up behind one miss.
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import auth
+import routers.auth as auth_router
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _request(session_id):
+    req = MagicMock()
+    req.headers = {"X-Session-ID": session_id}
+    return req
+
+
+@pytest.fixture
+def zoe_auth(monkeypatch):
+    """Fake zoe-auth: 'bad-*' sessions are rejected, others map to user-<sid>."""
+    state = {"calls": [], "gate": None}
+
+    async def _validate(session_id):
+        state["calls"].append(session_id)
+        if state["gate"] is not None:
+            await state["gate"].wait()
+        if session_id.startswith("bad"):
+            return None
+        return {"user_id": f"user-{session_id}", "role": "member", "username": "", "permissions": []}
+
+    monkeypatch.setattr(auth, "_validate_with_auth_service", _validate)
+    monkeypatch.setattr(auth, "_session_cache", {})
+    monkeypatch.setattr(auth, "_validations_in_flight", {})
+    return state
+
+
+async def test_concurrent_misses_share_one_validation(zoe_auth):
+    zoe_auth["gate"] = asyncio.Event()
+    requests = [asyncio.ensure_future(auth.get_current_user(_request("s1"))) for _ in range(20)]
+    await asyncio.sleep(0)
+    assert auth.session_cache_stats()["in_flight"] == 1
+    zoe_auth["gate"].set()
+
+    users = await asyncio.gather(*requests)
+
+    assert zoe_auth["calls"] == ["s1"]
+    assert {u["user_id"] for u in users} == {"user-s1"}
+    await auth.get_current_user(_request("s1"))  # cached now
+    assert zoe_auth["calls"] == ["s1"]
+    assert auth.session_cache_stats()["in_flight"] == 0
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_validation(zoe_auth):
+    zoe_auth["gate"] = asyncio.Event()
+    leader = asyncio.ensure_future(auth.get_current_user(_request("s1")))
+    follower = asyncio.ensure_future(auth.get_current_user(_request("s1")))
+    await asyncio.sleep(0)
+    leader.cancel()
+    zoe_auth["gate"].set()
+
+    assert (await follower)["user_id"] == "user-s1"
+    assert zoe_auth["calls"] == ["s1"]
+
+
+async def test_invalid_sessions_are_negatively_cached_briefly(zoe_auth, monkeypatch):
+    for _ in range(3):
+        with pytest.raises(auth.HTTPException) as exc:
+            await auth.get_current_user(_request("bad-1"))
+        assert exc.value.status_code == 401
+    assert zoe_auth["calls"] == ["bad-1"]
+    assert auth.session_cache_stats()["negative"] == 1
+
+    monkeypatch.setattr(auth, "NEGATIVE_CACHE_TTL_SECONDS", 0)
+    with pytest.raises(auth.HTTPException):
+        await auth.get_current_user(_request("bad-1"))
+    assert zoe_auth["calls"] == ["bad-1", "bad-1"]
+
+
+async def test_cache_is_a_bounded_lru(zoe_auth, monkeypatch):
+    monkeypatch.setattr(auth, "_SESSION_CACHE_MAX", 3)
+    for sid in ("a", "b", "c"):
+        await auth.get_current_user(_request(sid))
+    await auth.get_current_user(_request("a"))  # touch: b is now least recent
+    await auth.get_current_user(_request("d"))
+
+    assert list(auth._session_cache) == ["c", "a", "d"]
+
+
+async def test_invalidation_during_a_validation_keeps_the_stale_answer_out(zoe_auth):
+    zoe_auth["gate"] = asyncio.Event()
+    pending = asyncio.ensure_future(auth.get_current_user(_request("s1")))
+    await asyncio.sleep(0)
+    auth.invalidate_sessions(session_ids=["s1"])
+    zoe_auth["gate"].set()
+    await pending
+
+    assert "s1" not in auth._session_cache
+    zoe_auth["gate"] = None
+    await auth.get_current_user(_request("s1"))
+    assert zoe_auth["calls"] == ["s1", "s1"]
+
+
+def test_zoe_auth_push_drops_sessions_and_users(zoe_auth, monkeypatch):
+    for sid in ("s1", "s2", "s3"):
+        asyncio.run(auth.get_current_user(_request(sid)))
+    monkeypatch.setattr(auth, "_ZOE_INTERNAL_TOKEN", "tok")
+    app = FastAPI()
+    app.include_router(auth_router.router)
+    client = TestClient(app)
+
+    denied = client.post("/api/auth/invalidate", json={"session_ids": ["s1"]})
+    assert denied.status_code == 403
+    assert len(auth._session_cache) == 3
+
+    resp = client.post(
+        "/api/auth/invalidate",
+        json={"session_ids": ["s1"], "user_ids": ["user-s2"], "reasons": ["logout", "role_change"]},
+        headers={"X-Internal-Token": "tok"},
+    )
+    assert resp.json() == {"ok": True, "dropped": 2}
+    assert list(auth._session_cache) == ["s3"]
+
+    resp = client.post("/api/auth/invalidate", json={"all": True}, headers={"X-Internal-Token": "tok"})
+    assert resp.json()["dropped"] == 1
+    assert auth._session_cache == {}
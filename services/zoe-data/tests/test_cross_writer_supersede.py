@@ -223,7 +223,7 @@ def _patch_turn_digest(monkeypatch, svc, facts):
         async def post(self, *a, **k):
             return _FakeResp()
 
-    monkeypatch.setattr(memory_digest.httpx, "AsyncClient", _FakeClient)
+    monkeypatch.setattr(memory_digest.http_clients.httpx, "AsyncClient", _FakeClient)
 
     # Stub zoe_agent so the light word-overlap predup sees no existing blob and
     # the cache invalidation is a no-op (keeps the test slim — no zoe_agent import).
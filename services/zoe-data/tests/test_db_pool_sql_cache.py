@@ -0,0 +1,77 @@
+"""db_pool SQL translation cache: one rewrite per distinct SQL text.
+
+No Postgres: a fake asyncpg connection records which native call each
+statement was routed to.
+"""
+import pytest
+
+import db_pool
+
+pytestmark = pytest.mark.ci_safe
+
+
+class _FakeConn:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args))
+        return [{"n": 1}]
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args))
+        return "UPDATE 2"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    db_pool._translate_sql.cache_clear()
+    yield
+    db_pool._translate_sql.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "sql, expected, placeholders, returns_rows",
+    [
+        ("SELECT * FROM t WHERE a = ? AND b = ?", "SELECT * FROM t WHERE a = $1 AND b = $2", 2, True),
+        ("  (select 1)", "  (select 1)", 0, True),
+        ("WITH x AS (SELECT 1) SELECT * FROM x", "WITH x AS (SELECT 1) SELECT * FROM x", 0, True),
+        ("INSERT INTO t VALUES (?, now()) RETURNING id", "INSERT INTO t VALUES ($1, NOW()::text) RETURNING id", 1, True),
+        ("UPDATE t SET at = datetime('now') WHERE id = ?", "UPDATE t SET at = CURRENT_TIMESTAMP::text WHERE id = $1", 1, False),
+        (
+            "DELETE FROM t WHERE at < datetime('now', '-7 days')",
+            "DELETE FROM t WHERE at < (CURRENT_TIMESTAMP - INTERVAL '7 days')::text",
+            0,
+            False,
+        ),
+        ("UPDATE t SET note = 'now() ?' WHERE d = ?", "UPDATE t SET note = 'now() ?' WHERE d = $1", 1, False),
+    ],
+)
+def test_translation_plan(sql, expected, placeholders, returns_rows):
+    assert db_pool._translate_sql(sql) == (expected, placeholders, returns_rows)
+
+
+async def test_repeated_statements_translate_once_and_route_by_plan():
+    conn = db_pool.AsyncpgCompat(_FakeConn())
+    select = "SELECT * FROM reminders WHERE user_id = ?"
+    update = "UPDATE reminders SET done = 1 WHERE id = ?"
+
+    for i in range(5):
+        cursor = await conn.execute(select, (f"u{i}",))
+        assert await cursor.fetchall() == [{"n": 1}]
+        cursor = await conn.execute(update, i)
+        assert cursor.rowcount == 2
+
+    stats = db_pool.sql_cache_stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (2, 8, 2)
+    calls = conn._conn.calls
+    assert {c[0] for c in calls if c[1].startswith("SELECT")} == {"fetch"}
+    assert {c[0] for c in calls if c[1].startswith("UPDATE")} == {"execute"}
+    assert calls[-1] == ("execute", "UPDATE reminders SET done = 1 WHERE id = $1", (4,))
+
+
+def test_cache_is_bounded():
+    maxsize = db_pool.sql_cache_stats()["maxsize"]
+    for i in range(maxsize + 10):
+        db_pool._translate_sql(f"SELECT {i}")
+    assert db_pool.sql_cache_stats()["size"] == maxsize
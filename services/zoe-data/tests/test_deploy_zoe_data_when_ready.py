@@ -301,6 +301,30 @@ def test_confirmed_deploy_preflight_allows_faster_whisper_docstring(tmp_path):
     assert expected_url in curl_log.read_text()
 
 
+def test_confirmed_deploy_preflight_accepts_staged_warmup_scheduler(tmp_path):
+    live = _seed_live_tree(tmp_path)
+    main = live / "services" / "zoe-data" / "main.py"
+    main.write_text(
+        "async def startup():\n"
+        "    _warmups = startup_profile.WarmupScheduler()\n"
+        "    _warmups.add(\"moonshine_warmup\", warm_moonshine, priority=10)\n"
+    )
+    _git(live, "add", "services/zoe-data/main.py")
+    _git(live, "commit", "-m", "stage warmups")
+    _git(live, "push", "origin", "main")
+    wrapper, _deploy_live, marker = _copy_wrapper_bundle(tmp_path)
+    fake_bin, _curl_log = _install_url_aware_curl_shim(tmp_path, "http://127.0.0.1:18000/health")
+
+    proc = _run(
+        [str(wrapper), "--deploy", "--yes-restart-production"],
+        env=_env(live, {"PATH": f"{fake_bin}:{os.environ['PATH']}"}),
+    )
+
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert marker.exists()
+    assert "PASS target-main" in proc.stdout
+
+
 def test_confirmed_deploy_with_failed_gates_aborts_before_deploy_live(tmp_path):
     live = _seed_live_tree(tmp_path)
     _git(live, "checkout", "-b", "feature/not-ready")
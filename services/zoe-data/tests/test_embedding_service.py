@@ -0,0 +1,155 @@
+"""Router embedding service: LRU+TTL cache, async micro-batching, reduceat scores.
+
+The embedding model is faked (deterministic per-text vectors, call log), so no
+fastembed download — slim-dep-green (ci_safe).
+"""
+import asyncio
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+semantic_router = pytest.importorskip("semantic_router")
+
+from embedding_service import EmbeddingService, normalize_key  # noqa: E402
+
+pytestmark = pytest.mark.ci_safe
+
+
+class _FakeModel:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        for t in texts:
+            seed = sum(map(ord, normalize_key(t))) or 1
+            yield np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+
+
+def _service(model, **kw):
+    return EmbeddingService(model.embed, **kw)
+
+
+def test_sync_embed_caches_by_normalized_text():
+    model = _FakeModel()
+    svc = _service(model)
+    a = svc.embed("What's the  weather")
+    b = svc.embed("  what's the weather ")
+    assert a is b
+    assert len(model.calls) == 1
+    assert abs(float(np.linalg.norm(a)) - 1.0) < 1e-5
+    with pytest.raises(ValueError):
+        a[0] = 0.0  # shared cache entry is read-only
+    assert svc.stats()["hits"] == 1 and svc.stats()["misses"] == 1
+
+
+def test_lru_evicts_oldest_and_ttl_expires():
+    model = _FakeModel()
+    svc = _service(model, cache_size=2, ttl_s=0.05)
+    svc.embed("a")
+    svc.embed("b")
+    svc.embed("a")      # refresh a → b is now least recent
+    svc.embed("c")      # evicts b
+    assert len(model.calls) == 3
+    svc.embed("a")
+    assert len(model.calls) == 3
+    svc.embed("b")
+    assert len(model.calls) == 4
+    time.sleep(0.06)
+    svc.embed("b")
+    assert len(model.calls) == 5
+
+
+async def test_concurrent_misses_share_one_embed_call():
+    model = _FakeModel()
+    svc = _service(model, batch_window_s=0.01, max_batch=32)
+    texts = ["set a timer", "add milk", "SET A TIMER", "what time is it", "add milk"]
+    vecs = await asyncio.gather(*(svc.embed_async(t) for t in texts))
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0]) == sorted(["set a timer", "add milk", "what time is it"])
+    assert vecs[0] is vecs[2] and vecs[1] is vecs[4]
+    stats = svc.stats()
+    assert stats["misses"] == 3 and stats["coalesced"] == 2
+    # now cached
+    assert await svc.embed_async("add milk") is vecs[1]
+    assert len(model.calls) == 1
+
+
+async def test_max_batch_flushes_without_waiting_for_window():
+    model = _FakeModel()
+    svc = _service(model, batch_window_s=5.0, max_batch=4)
+    vecs = await asyncio.wait_for(
+        asyncio.gather(*(svc.embed_async(f"utterance {i}") for i in range(4))), timeout=1.0,
+    )
+    assert len(vecs) == 4 and [len(c) for c in model.calls] == [4]
+
+
+async def test_embed_failure_reaches_every_waiter_and_is_not_cached():
+    class _Broken:
+        def embed(self, texts):
+            raise RuntimeError("onnx down")
+
+    svc = EmbeddingService(_Broken().embed, batch_window_s=0.001)
+    results = await asyncio.gather(svc.embed_async("x"), svc.embed_async("y"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert svc.stats()["cache_entries"] == 0
+
+
+def _fake_router(monkeypatch, model):
+    labels = np.asarray(["chat", "weather", "lists", "weather", "chat", "lists", "timers"])
+    matrix = np.stack(list(model.embed(
+        ["hi", "rain today", "add milk", "forecast", "thanks", "shopping", "timer"]
+    )))
+    model.calls.clear()
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    monkeypatch.setattr(semantic_router, "ROUTES",
+                        {"weather": [], "lists": [], "timers": [], "chat": []})
+    monkeypatch.setattr(semantic_router, "_MODEL", model)
+    monkeypatch.setattr(semantic_router, "_MATRIX", matrix)
+    monkeypatch.setattr(semantic_router, "_LABELS", labels)
+    monkeypatch.setattr(semantic_router, "_DOM_IDX",
+                        {d: np.where(labels == d)[0] for d in ("weather", "lists", "timers", "chat")})
+    monkeypatch.delenv("ZOE_ROUTER_HEAD", raising=False)
+    return matrix, labels
+
+
+def test_reduceat_scores_match_per_domain_max(monkeypatch):
+    model = _FakeModel()
+    matrix, labels = _fake_router(monkeypatch, model)
+    for text in ("will it rain", "add eggs", "start a timer", "hello"):
+        out = semantic_router.route(text)
+        v = semantic_router._embedder().embed(text)
+        sims = matrix @ v
+        expected = {d: round(float(sims[labels == d].max()), 3) for d in ("weather", "lists", "timers", "chat")}
+        assert out["scores"] == dict(sorted(expected.items(), key=lambda x: -x[1]))
+        assert out["domain"] == max(expected, key=expected.get)
+
+
+async def test_aroute_matches_route_and_batches_concurrent_turns(monkeypatch):
+    model = _FakeModel()
+    _fake_router(monkeypatch, model)
+    texts = ["will it rain", "add eggs", "start a timer"]
+    outs = await asyncio.gather(*(semantic_router.aroute(t) for t in texts))
+    assert len(model.calls) == 1 and len(model.calls[0]) == 3
+    for text, out in zip(texts, outs):
+        sync = semantic_router.route(text)  # cache hit: no further embed
+        assert (out["domain"], out["scores"]) == (sync["domain"], sync["scores"])
+    assert len(model.calls) == 1
+
+
+def test_cache_metrics_are_exported():
+    from memory_metrics import REGISTRY
+
+    def sample(result):
+        return REGISTRY.get_sample_value("zoe_router_embed_cache_count_total", {"result": result}) or 0.0
+
+    before_hit, before_miss = sample("hit"), sample("miss")
+    svc = _service(_FakeModel())
+    svc.embed("metrics probe")
+    svc.embed("metrics probe")
+    assert sample("miss") == before_miss + 1
+    assert sample("hit") == before_hit + 1
+    assert (REGISTRY.get_sample_value("zoe_router_embed_batch_size_count") or 0) >= 1
@@ -64,10 +64,14 @@ def test_dispatches_for_real_domain_with_correct_ctx(monkeypatch):
 
 
 def test_routes_via_semantic_router_when_no_decision(monkeypatch):
-    # router_decision=None → resolve() must consult semantic_router.route().
+    # router_decision=None → resolve() must consult semantic_router.aroute().
     monkeypatch.setattr(expert_dispatch, "is_enabled", lambda: True)
     monkeypatch.setattr(semantic_router, "is_enabled", lambda: True)
-    monkeypatch.setattr(semantic_router, "route", lambda text: {"domain": "weather", "score": 0.9})
+
+    async def _route(text):
+        return {"domain": "weather", "score": 0.9}
+
+    monkeypatch.setattr(semantic_router, "aroute", _route)
     seen = {}
 
     async def _fake_dispatch(domain, text, ctx, *, write_ok=True):
@@ -84,8 +88,12 @@ def test_none_when_semantic_router_disabled(monkeypatch):
     monkeypatch.setattr(expert_dispatch, "is_enabled", lambda: True)
     monkeypatch.setattr(semantic_router, "is_enabled", lambda: False)
     called = {"routed": 0}
-    monkeypatch.setattr(semantic_router, "route",
-                        lambda text: called.__setitem__("routed", called["routed"] + 1) or {"domain": "weather"})
+
+    async def _route(text):
+        called["routed"] += 1
+        return {"domain": "weather"}
+
+    monkeypatch.setattr(semantic_router, "aroute", _route)
     assert _run(fast_path.resolve("hi", "u", "s")) is None
     assert called["routed"] == 0  # never routed when the router is disabled
 
@@ -186,10 +186,10 @@ def test_tier0_hit_short_circuits_router(monkeypatch):
     monkeypatch.setattr(intent_router, "execute_intent", _fake_exec)
 
     # Router must never be consulted on a Tier-0 hit.
-    def _route_boom(text):
-        raise AssertionError("semantic_router.route should not be called")
+    async def _route_boom(text):
+        raise AssertionError("semantic_router.aroute should not be called")
 
-    monkeypatch.setattr(semantic_router, "route", _route_boom)
+    monkeypatch.setattr(semantic_router, "aroute", _route_boom)
     monkeypatch.setattr(semantic_router, "is_enabled",
                         lambda: (_ for _ in ()).throw(
                             AssertionError("is_enabled should not be called")))
@@ -411,11 +411,11 @@ def test_none_when_semantic_router_disabled(monkeypatch):
     monkeypatch.setattr(semantic_router, "is_enabled", lambda: False)
     called = {"routed": 0}
 
-    def _route(text):
+    async def _route(text):
         called["routed"] += 1
         return {"domain": "weather", "score": 0.9}
 
-    monkeypatch.setattr(semantic_router, "route", _route)
+    monkeypatch.setattr(semantic_router, "aroute", _route)
     # No router_decision → resolve consults is_enabled() (False) → None,
     # and route() is never called.
     out = _run(fast_tiers.resolve("hi", "u", "s"))
@@ -423,10 +423,13 @@ def test_none_when_semantic_router_disabled(monkeypatch):
 
 
 def test_routes_via_semantic_router_when_no_decision(monkeypatch):
-    # router_decision=None → resolve() consults semantic_router.route().
+    # router_decision=None → resolve() consults semantic_router.aroute().
     _enable(monkeypatch)
-    monkeypatch.setattr(semantic_router, "route",
-                        lambda text: {"domain": "weather", "score": 0.9})
+
+    async def _route(text):
+        return {"domain": "weather", "score": 0.9}
+
+    monkeypatch.setattr(semantic_router, "aroute", _route)
     seen = {}
 
     async def _fake_dispatch(domain, text, ctx, *, write_ok=True):
@@ -456,10 +459,10 @@ def test_swallows_dispatch_errors(monkeypatch):
 def test_swallows_router_errors(monkeypatch):
     _enable(monkeypatch)
 
-    def _route_boom(text):
+    async def _route_boom(text):
         raise RuntimeError("router exploded")
 
-    monkeypatch.setattr(semantic_router, "route", _route_boom)
+    monkeypatch.setattr(semantic_router, "aroute", _route_boom)
     out = _run(fast_tiers.resolve("x", "u", "s"))
     assert out is None
 
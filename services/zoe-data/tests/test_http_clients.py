@@ -0,0 +1,124 @@
+"""Shared per-upstream httpx clients (http_clients).
+
+No network: ``start(transport=...)`` routes every upstream through an
+``httpx.MockTransport``; a wrapper fires httpcore's ``connect_tcp`` trace event
+on the first request only, standing in for a real pool opening one socket.
+"""
+import httpx
+import pytest
+
+import http_clients
+from memory_metrics import (
+    http_upstream_error_count,
+    http_upstream_latency_seconds,
+    http_upstream_request_count,
+)
+
+pytestmark = pytest.mark.ci_safe
+
+
+class _OneSocketTransport(httpx.AsyncBaseTransport):
+    def __init__(self, handler):
+        self._inner = httpx.MockTransport(handler)
+        self.connected = False
+
+    async def handle_async_request(self, request):
+        trace = request.extensions.get("trace")
+        if not self.connected and trace is not None:
+            await trace("connection.connect_tcp.started", {})
+            self.connected = True
+        return await self._inner.handle_async_request(request)
+
+
+def _count(upstream, connection):
+    return http_upstream_request_count.labels(upstream=upstream, connection=connection)._value.get()
+
+
+@pytest.fixture
+async def registry():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.url.path == "/down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    await http_clients.start(transport=_OneSocketTransport(handler))
+    yield seen
+    await http_clients.aclose_all()
+
+
+async def test_sessions_share_one_client_and_report_reuse(registry):
+    new0, reused0 = _count("zoe_auth", "new"), _count("zoe_auth", "reused")
+    latency0 = http_upstream_latency_seconds.labels(upstream="zoe_auth")._sum.get()
+
+    async with http_clients.session("zoe_auth", timeout=2.5) as a:
+        await a.get("http://auth/api/auth/user")
+        async with http_clients.session("zoe_auth") as b:
+            r = await b.get("http://auth/api/auth/user", timeout=9.0)
+    assert r.json() == {"ok": True}
+    assert a._client is b._client is http_clients.get_client("zoe_auth")
+    assert not a._client.is_closed  # leaving the block keeps the pool open
+
+    # the per-call timeout defaults each request; an explicit one still wins
+    assert registry[0].extensions["timeout"]["read"] == 2.5
+    assert registry[1].extensions["timeout"]["read"] == 9.0
+    assert (_count("zoe_auth", "new") - new0, _count("zoe_auth", "reused") - reused0) == (1, 1)
+    assert http_upstream_latency_seconds.labels(upstream="zoe_auth")._sum.get() > latency0
+
+
+async def test_transport_error_recycles_after_inflight_sessions_finish(registry):
+    errors0 = http_upstream_error_count.labels(upstream="llm", error="ConnectError")._value.get()
+
+    async with http_clients.session("llm") as slow:
+        with pytest.raises(httpx.ConnectError):
+            async with http_clients.session("llm") as failing:
+                await failing.post("http://llm/down")
+        old = slow._client
+        # the broken client is out of the registry, but the other caller's
+        # request is still allowed to finish on it
+        assert http_clients.get_client("llm") is not old
+        assert not old.is_closed
+        assert (await slow.get("http://llm/v1/models")).status_code == 200
+    assert old.is_closed
+    assert http_upstream_error_count.labels(upstream="llm", error="ConnectError")._value.get() == errors0 + 1
+
+
+async def test_outside_the_lifespan_each_session_is_a_one_shot_client(monkeypatch):
+    made = []
+
+    class _Client:
+        def __init__(self, **kwargs):
+            made.append(kwargs)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_):
+            return None
+
+    monkeypatch.setattr(http_clients.httpx, "AsyncClient", _Client)
+    async with http_clients.session("open_meteo", timeout=8.0) as c1:
+        pass
+    async with http_clients.session("open_meteo") as c2:
+        pass
+    assert c1 is not c2
+    assert made == [{"timeout": 8.0}, {"timeout": http_clients.UPSTREAMS["open_meteo"].timeout}]
+    assert http_clients.pool_stats() == {}
+
+    with pytest.raises(KeyError):
+        async with http_clients.session("nowhere"):
+            pass
+
+
+async def test_kill_switch_and_shutdown(registry, monkeypatch):
+    assert set(http_clients.pool_stats()) == set(http_clients.UPSTREAMS)
+    monkeypatch.setenv("ZOE_HTTP_SHARED_CLIENTS", "0")
+    async with http_clients.session("hermes") as client:
+        assert isinstance(client, httpx.AsyncClient)
+    clients = [http_clients.get_client(name) for name in http_clients.UPSTREAMS]
+
+    await http_clients.aclose_all()
+    assert all(c.is_closed for c in clients)
+    assert http_clients.pool_stats() == {}
@@ -0,0 +1,120 @@
+"""Compiled intent matcher: same first-match-wins answers, fewer regexes run.
+
+``fixtures/intent_parity_corpus.jsonl`` was RECORDED from the if/return
+``detect_intent`` ladder immediately before it became the compiled rule table:
+every string literal in the intent test suites plus the pi-intent eval cases
+(and wake-word / punctuation variants of the hits), with the intent + slots the
+old code returned. Any drift in the table — a re-ordered rule, a lost
+fall-through, a trigger literal the index derived wrongly — shows up here as a
+concrete utterance.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import intent_router
+from intent_matcher import (
+    CompiledIntentMatcher,
+    IntentRule,
+    MatchTurn,
+    derive_triggers,
+    fold_for_triggers,
+)
+
+pytestmark = pytest.mark.ci_safe
+
+CORPUS = [
+    json.loads(line)
+    for line in (Path(__file__).parent / "fixtures" / "intent_parity_corpus.jsonl").read_text().splitlines()
+    if line.strip()
+]
+
+
+def _answer(intent):
+    return (intent.name, intent.slots) if intent is not None else (None, None)
+
+
+def test_corpus_is_substantial():
+    hits = [c for c in CORPUS if c["intent"]]
+    assert len(CORPUS) > 2000
+    assert len({c["intent"] for c in hits}) > 40
+
+
+def test_detect_intent_matches_recorded_ladder():
+    drift = []
+    for case in CORPUS:
+        got = _answer(intent_router.detect_intent(case["text"], log_miss=False))
+        if got != (case["intent"], case["slots"]):
+            drift.append((case["text"], got, case["intent"]))
+    assert not drift, drift[:10]
+
+
+def test_trigger_index_never_changes_an_answer():
+    matcher = intent_router._INTENT_MATCHER
+    for case in CORPUS:
+        turn = MatchTurn(t=intent_router._normalize_chat_intent_text(case["text"]), text=case["text"])
+        assert _answer(matcher.match(turn)) == _answer(matcher.match(turn, use_index=False)), case["text"]
+
+
+def test_index_skips_most_rules():
+    matcher = CompiledIntentMatcher(intent_router._INTENT_RULES, intent_router.Intent)
+    for case in CORPUS:
+        matcher.match(MatchTurn(t=intent_router._normalize_chat_intent_text(case["text"]), text=case["text"]))
+    stats = matcher.stats()
+    assert stats["calls"] == len(CORPUS)
+    assert stats["indexed_rules"] >= stats["rules"] - 5
+    assert stats["mean_rules_evaluated"] < stats["rules"] / 5
+
+
+@pytest.mark.parametrize("pattern,expected", [
+    (r"^what lists do i have\??$", {"what lists do i have"}),
+    (r"^(?:show|list) (?:my )?reminders$", {"reminders"}),
+    (r"\bturn\s+off\s+everything\b|\blights?\s+on\b", {"everything", "light"}),
+    # sre factors the shared "p" out of the branch; the longer tails win.
+    (r"^(?:play|put on)\s+(.+)$", {"lay", "ut on"}),
+])
+def test_derive_triggers(pattern, expected):
+    assert derive_triggers(re.compile(pattern, re.I)) == frozenset(expected)
+
+
+def test_unindexable_pattern_is_always_a_candidate():
+    assert derive_triggers(re.compile(r"^(\d+)\s*[+*/-]\s*(\d+)$")) is None
+    matcher = CompiledIntentMatcher(
+        [IntentRule("calc", re.compile(r"^(\d+)\s*[+*/-]\s*(\d+)$"))],
+        lambda name, slots: (name, slots),
+    )
+    assert matcher.match(MatchTurn(t="2+2", text="2+2")) == ("calc", {})
+
+
+def test_ignorecase_folding_keeps_index_a_superset():
+    # Python's IGNORECASE treats dotless i / long s as i / s; the scan must too.
+    pattern = re.compile(r"\bthis\b", re.I)
+    matcher = CompiledIntentMatcher([IntentRule("x", pattern, mode="search")], lambda n, s: n)
+    for text in ("THıS", "thiſ", "tHİs"):
+        if pattern.search(text):
+            assert matcher.match(MatchTurn(t=text, text=text)) == "x"
+    assert fold_for_triggers("ſİı") == "sii"
+
+
+def test_rejecting_extractor_falls_through_to_next_rule():
+    rules = [
+        IntentRule("first", re.compile(r"^add (.+)$"), lambda m, turn: None),
+        IntentRule("second", re.compile(r"^add (.+)$"), lambda m, turn: {"item": m.group(1)}),
+    ]
+    matcher = CompiledIntentMatcher(rules, lambda n, s: (n, s))
+    assert matcher.match(MatchTurn(t="add milk", text="add milk")) == ("second", {"item": "milk"})
+    rows = {r["rule"]: r for r in matcher.stats()["per_rule"]}
+    assert rows["000:first"]["evaluations"] == 1 and rows["000:first"]["hits"] == 0
+    assert rows["001:second"]["hits"] == 1
+
+
+def test_stats_are_exposed_from_intent_router():
+    intent_router.detect_intent("what's the weather", log_miss=False)
+    stats = intent_router.intent_matcher_stats(top=3)
+    assert stats["calls"] >= 1
+    assert len(stats["per_rule"]) == 3
+    assert {"rule", "intent", "evaluations", "hits", "total_ms", "mean_us"} <= set(stats["per_rule"][0])
@@ -0,0 +1,121 @@
+"""KeyedState: idle TTL, LRU size cap, and never evicting a busy lock."""
+import asyncio
+
+import pytest
+
+import keyed_state
+from keyed_state import KeyedState
+from memory_metrics import keyed_state_evicted_count, keyed_state_size
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _age(state, key, seconds):
+    value, touched = state._data[key]
+    state._data[key] = (value, touched - seconds)
+
+
+def test_idle_entries_expire_on_access_and_on_sweep():
+    state = KeyedState("test_ttl", ttl_s=60, max_size=10)
+    state["a"] = {"n": 1}
+    state["b"] = {"n": 2}
+    state["c"] = {"n": 3}
+    _age(state, "a", 61)
+    _age(state, "b", 61)
+
+    assert state.get("a") is None
+    assert "b" not in state
+    assert state["c"] == {"n": 3}
+    assert state.sweep() == 1  # "b"; "a" was already dropped on access
+    assert list(state) == ["c"]
+
+
+def test_iteration_skips_expired_entries_instead_of_raising():
+    state = KeyedState("test_iter", ttl_s=60, max_size=10)
+    state["a"] = 1
+    state["b"] = 2
+    state["c"] = 3
+    _age(state, "b", 61)
+
+    assert list(state) == ["a", "c"]
+    assert state.items() == [("a", 1), ("c", 3)]
+    assert state.values() == [1, 3]
+    seen = []
+    for key, _ in state.items():
+        seen.append(key)
+        _age(state, "c", 61)  # expires mid-loop: no KeyError
+    assert seen == ["a", "c"] and list(state) == ["a"]
+
+
+def test_reads_keep_an_entry_alive():
+    state = KeyedState("test_touch", ttl_s=60, max_size=10)
+    state["panel"] = {"bound_user_id": "u1"}
+    _age(state, "panel", 50)
+    state.setdefault("panel", {})["skybridge_context"] = {}
+    _age(state, "panel", 50)
+
+    assert state.sweep() == 0
+    assert state["panel"] == {"bound_user_id": "u1", "skybridge_context": {}}
+
+
+def test_size_cap_evicts_least_recently_used_first():
+    state = KeyedState("test_size", ttl_s=3600, max_size=3)
+    evicted0 = keyed_state_evicted_count.labels(name="test_size", reason="size")._value.get()
+    for key in "abc":
+        state[key] = key
+    state.get("a")  # a is now the most recently used
+    state["d"] = "d"
+
+    assert list(state) == ["c", "a", "d"]
+    assert keyed_state_evicted_count.labels(name="test_size", reason="size")._value.get() - evicted0 == 1
+
+
+async def test_held_or_contended_lock_is_never_evicted():
+    locks = KeyedState("test_locks", ttl_s=60, max_size=2)
+    held, waited, idle = asyncio.Lock(), asyncio.Lock(), asyncio.Lock()
+    locks["held"], locks["waited"] = held, waited
+    await held.acquire()
+    await waited.acquire()
+    waiter = asyncio.create_task(waited.acquire())
+    await asyncio.sleep(0)
+    waited.release()  # the waiter is now owed the lock but hasn't run yet
+
+    locks["idle"] = idle  # over the cap, but both older entries are busy
+    assert list(locks) == ["held", "waited", "idle"]
+    for key in ("held", "waited", "idle"):
+        _age(locks, key, 120)
+    assert locks.sweep() == 1
+    assert locks.get("held") is held
+
+    held.release()
+    await waiter
+    waited.release()
+    assert locks.sweep() == 1  # only "waited": reading "held" above touched it
+    assert list(locks) == ["held"]
+
+
+def test_sweep_all_publishes_registry_sizes():
+    state = KeyedState("test_gauge", ttl_s=60, max_size=10)
+    state["x"] = 1
+    state["y"] = 2
+    _age(state, "y", 61)
+
+    keyed_state.sweep_all()
+
+    assert keyed_state_size.labels(name="test_gauge")._value.get() == 1
+    assert {"name": "test_gauge", "size": 1, "busy": 0, "max_size": 10, "ttl_s": 60.0} in keyed_state.registry_stats()
+
+
+async def test_chat_session_locks_are_reused_then_evicted_when_idle():
+    from routers import chat
+
+    first = chat._get_session_lock("keyed-state-session")
+    assert chat._get_session_lock("keyed-state-session") is first
+    async with first:
+        _age(chat._SESSION_LOCKS, "keyed-state-session", chat._SESSION_LOCKS.ttl_s + 1)
+        chat._SESSION_LOCKS.sweep()
+        assert chat._get_session_lock("keyed-state-session") is first
+
+    _age(chat._SESSION_LOCKS, "keyed-state-session", chat._SESSION_LOCKS.ttl_s + 1)
+    chat._SESSION_LOCKS.sweep()
+    assert "keyed-state-session" not in chat._SESSION_LOCKS
@@ -0,0 +1,127 @@
+"""Binary audio framing on the LiveKit data channel: packet format, chunking,
+and the per-room negotiation that keeps un-upgraded panels on JSON audio."""
+import io
+import json
+import sys
+import types
+import wave
+
+import pytest
+
+import livekit_audio_framing as framing
+import routers.voice_livekit as v
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _wav(n_samples, rate=24000, channels=1):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\x01\x02" * n_samples * channels)
+    return buf.getvalue()
+
+
+class _Participant:
+    def __init__(self):
+        self.sent = []
+
+    async def publish_data(self, data, reliable=True):
+        self.sent.append(data)
+
+
+@pytest.fixture
+def room(monkeypatch):
+    monkeypatch.setattr(v, "_active_participant_sids", {"panel-a", "panel-b"})
+    monkeypatch.setattr(v, "_binary_audio_sids", set())
+    monkeypatch.delenv("ZOE_LIVEKIT_BINARY_AUDIO", raising=False)
+    monkeypatch.setenv("ZOE_LIVEKIT_AUDIO_CHUNK_MS", "100")
+    return _Participant()
+
+
+def test_frame_round_trip():
+    packet = framing.encode(
+        turn=70000, seq=3, chunk=1, codec=framing.CODEC_PCM16, channels=1,
+        sample_rate=24000, sentence_end=True, reply_end=False, payload=b"\x00\x01",
+    )
+    assert framing.is_frame(packet) and not framing.is_frame(b'{"type": "audio"}')
+    frame = framing.decode(packet)
+    assert (frame.turn, frame.seq, frame.chunk, frame.sample_rate) == (70000 & 0xFFFF, 3, 1, 24000)
+    assert frame.sentence_end and not frame.reply_end and frame.payload == b"\x00\x01"
+
+
+def test_sentence_is_split_into_whole_sample_chunks():
+    pcm, rate, channels = framing.wav_pcm(_wav(2500, rate=10000, channels=2))
+    frames = [framing.decode(p) for p in framing.sentence_frames(
+        pcm, turn=1, seq=0, sample_rate=rate, channels=channels, reply_end=True, chunk_ms=100,
+    )]
+    assert [len(f.payload) for f in frames] == [4000] * 2 + [2000]
+    assert [f.chunk for f in frames] == [0, 1, 2]
+    assert [(f.sentence_end, f.reply_end) for f in frames] == [(False, False)] * 2 + [(True, True)]
+    assert b"".join(f.payload for f in frames) == pcm
+
+
+async def test_json_audio_until_every_panel_negotiates(room):
+    v._binary_audio_sids.add("panel-a")
+    await v._send_audio(room, _wav(2400), "audio/wav", turn=v._next_audio_turn())
+    assert len(room.sent) == 1 and room.sent[0].startswith(b"{")
+    assert v._VOICE_HEALTH["audio_framing"] == "json"
+
+    v._binary_audio_sids.add("panel-b")
+    await v._send_audio(room, _wav(4800), "audio/wav", turn=7, seq=1, final=True)
+    frames = [framing.decode(p) for p in room.sent[1:]]
+    assert len(frames) == 2 and {f.turn for f in frames} == {7} and {f.seq for f in frames} == {1}
+    assert frames[-1].reply_end and v._VOICE_HEALTH["audio_framing"] == framing.FRAMING_NAME
+
+
+async def test_non_pcm_body_and_kill_switch_keep_json(room, monkeypatch):
+    v._binary_audio_sids.update({"panel-a", "panel-b"})
+    await v._send_audio(room, b"ID3mp3-bytes", "audio/mpeg", turn=1)
+    monkeypatch.setenv("ZOE_LIVEKIT_BINARY_AUDIO", "0")
+    await v._send_audio(room, _wav(10), "audio/wav", turn=2)
+    assert all(p.startswith(b"{") for p in room.sent) and len(room.sent) == 2
+
+
+async def test_failure_marker_is_a_header_only_frame(room):
+    v._binary_audio_sids.update({"panel-a", "panel-b"})
+    await v._send_audio(room, b"", "audio/wav", turn=4, seq=2, final=True)
+    (frame,) = [framing.decode(p) for p in room.sent]
+    assert frame.payload == b"" and frame.seq == 2 and frame.sentence_end and frame.reply_end
+
+
+class _TTS:
+    def __init__(self, body, media_type):
+        self.body, self.media_type = body, media_type
+
+
+def _fake_tts(monkeypatch, replies):
+    vt = types.ModuleType("routers.voice_tts")
+    vt._split_sentences = lambda text: [s for s in text.split(". ") if s]
+    queue = list(replies)
+
+    async def synthesize(payload, caller=None):
+        return queue.pop(0)
+
+    vt.synthesize = synthesize
+    monkeypatch.setitem(sys.modules, "routers.voice_tts", vt)
+
+
+async def test_mp3_first_sentence_keeps_the_whole_turn_on_json(room, monkeypatch):
+    v._binary_audio_sids.update({"panel-a", "panel-b"})
+    _fake_tts(monkeypatch, [_TTS(b"ID3mp3", "audio/mpeg"), _TTS(_wav(2400), "audio/wav")])
+    await v._stream_sentence_audio(room, "One. Two", "jason")
+    messages = [json.loads(p) for p in room.sent]
+    assert [(m["seq"], m["final"]) for m in messages] == [(0, False), (1, True)]
+
+
+async def test_mp3_mid_turn_ends_a_binary_turn_with_text_and_a_binary_marker(room, monkeypatch):
+    v._binary_audio_sids.update({"panel-a", "panel-b"})
+    _fake_tts(monkeypatch, [_TTS(_wav(2400), "audio/wav"), _TTS(b"ID3mp3", "audio/mpeg")])
+    await v._stream_sentence_audio(room, "One. Two", "jason")
+    first, text, marker = room.sent
+    assert framing.decode(first).seq == 0 and not framing.decode(first).reply_end
+    assert json.loads(text) == {"type": "text", "content": "Two"}
+    end = framing.decode(marker)
+    assert end.payload == b"" and end.seq == 1 and end.reply_end
@@ -80,14 +80,14 @@ def _install_fakes(monkeypatch, *, transcript, brain, synth=None):
 
     vt = types.ModuleType("routers.voice_tts")
 
-    async def _transcribe_audio(_path):
+    async def _transcribe_pcm(_frames):
         return transcript
 
     async def _default_synth(payload, caller=None):
         synth_calls.append({"payload": payload, "caller": caller})
         return _FakeTTSResponse()
 
-    vt._transcribe_audio = _transcribe_audio
+    vt._transcribe_pcm = _transcribe_pcm
     vt.synthesize = synth or _default_synth
     monkeypatch.setitem(sys.modules, "routers.voice_tts", vt)
 
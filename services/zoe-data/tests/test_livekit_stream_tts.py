@@ -68,14 +68,14 @@ def _install_fakes(monkeypatch, *, reply):
 
     vt = types.ModuleType("routers.voice_tts")
 
-    async def _transcribe_audio(_path):
+    async def _transcribe_pcm(_frames):
         return "hello zoe"
 
     async def _synth(payload, caller=None):
         synth_calls.append({"payload": payload, "caller": caller})
         return _FakeTTSResponse()
 
-    vt._transcribe_audio = _transcribe_audio
+    vt._transcribe_pcm = _transcribe_pcm
     vt.synthesize = _synth
     vt._split_sentences = _split_like_prod
     monkeypatch.setitem(sys.modules, "routers.voice_tts", vt)
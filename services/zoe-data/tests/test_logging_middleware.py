@@ -86,3 +86,34 @@ def test_middleware_mints_unique_request_id_and_echoes_header():
     rid3, meta3 = asyncio.run(_run({"X-Request-ID": "corr-123", "authorization": "Bearer t"}))
     assert rid3 == "corr-123"
     assert meta3["authenticated"] is True
+
+
+@pytest.mark.skipif(not mw._JSON_LOGGING_AVAILABLE, reason="python-json-logger not installed")
+def test_request_context_survives_the_hop_to_the_listener_thread():
+    import io
+    import json
+
+    from logging_setup import QueuedHandler
+
+    stream = io.StringIO()
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(mw.ZoeJsonFormatter("%(timestamp)s %(level)s %(logger_name)s %(request_id)s %(message)s"))
+    handler = QueuedHandler(sink)
+    handler.addFilter(mw._StampRequestMetadata())
+    log = logging.getLogger("zoe.json.hop")
+    log.addHandler(handler)
+    log.propagate = False
+    token = mw._request_metadata_ctx.set({"request_id": "req-42", "path": "/api/chat"})
+    try:
+        log.warning("turn finished")
+        handler.flush()
+    finally:
+        mw._request_metadata_ctx.reset(token)
+        log.removeHandler(handler)
+        log.propagate = True
+        handler.close()
+
+    line = json.loads(stream.getvalue().strip())
+    assert line["request_id"] == "req-42"
+    assert line["path"] == "/api/chat"
+    assert "zoe_request_metadata" not in line
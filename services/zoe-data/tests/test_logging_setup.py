@@ -19,6 +19,7 @@ import logging
 import logging.handlers
 import os
 import sys
+import threading
 from pathlib import Path
 
 import pytest
@@ -29,7 +30,9 @@ from logging_setup import (  # noqa: E402
     DEFAULT_BACKUP_COUNT,
     DEFAULT_MAX_BYTES,
     HANDLER_NAME,
+    QueuedHandler,
     configure_logging,
+    parse_sample_rules,
 )
 
 pytestmark = pytest.mark.ci_safe
@@ -79,6 +82,8 @@ def clear_log_env(monkeypatch):
         "ZOE_LOG_DIR",
         "ZOE_LOG_MAX_BYTES",
         "ZOE_LOG_BACKUP_COUNT",
+        "ZOE_LOG_QUEUE_MAX",
+        "ZOE_LOG_SAMPLE",
     ):
         monkeypatch.delenv(var, raising=False)
 
@@ -172,9 +177,9 @@ def test_rotation_is_bounded(tmp_path, monkeypatch):
     monkeypatch.setenv("ZOE_LOG_BACKUP_COUNT", "2")
     handler = configure_logging(log_dir=tmp_path)
 
-    assert isinstance(handler, logging.handlers.RotatingFileHandler)
-    assert handler.maxBytes == 2048
-    assert handler.backupCount == 2
+    assert isinstance(handler.sink, logging.handlers.RotatingFileHandler)
+    assert handler.sink.maxBytes == 2048
+    assert handler.sink.backupCount == 2
 
     log = logging.getLogger("zoe.chatty")
     for i in range(400):
@@ -193,8 +198,8 @@ def test_garbage_rotation_env_falls_back_to_defaults(tmp_path, monkeypatch):
     monkeypatch.setenv("ZOE_LOG_BACKUP_COUNT", "-3")
     handler = configure_logging(log_dir=tmp_path)
 
-    assert handler.maxBytes == DEFAULT_MAX_BYTES
-    assert handler.backupCount == DEFAULT_BACKUP_COUNT
+    assert handler.sink.maxBytes == DEFAULT_MAX_BYTES
+    assert handler.sink.backupCount == DEFAULT_BACKUP_COUNT
 
 
 def test_unwritable_dir_returns_none_and_does_not_raise(tmp_path):
@@ -226,4 +231,82 @@ def test_env_log_dir_is_honoured(tmp_path, monkeypatch):
     handler = configure_logging()
 
     assert handler is not None
-    assert Path(handler.baseFilename).parent == target
+    assert Path(handler.sink.baseFilename).parent == target
+
+
+class _GatedSink(logging.Handler):
+    """Records which thread wrote, and can be held shut like a stalled SD card."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.gate.wait(5)
+        self.threads.add(threading.get_ident())
+        self.lines.append(self.format(record))
+
+
+def test_file_write_happens_off_the_logging_thread(tmp_path):
+    handler = configure_logging(log_dir=tmp_path)
+    written = []
+    real_emit = handler.sink.emit
+    handler.sink.emit = lambda record: (written.append(threading.get_ident()), real_emit(record))
+
+    logging.getLogger("zoe.turn").info("reply sent")
+    handler.flush()
+
+    assert "reply sent" in _read_log(tmp_path)
+    assert written and threading.get_ident() not in written
+
+
+def test_full_queue_drops_and_reports_instead_of_blocking():
+    sink = _GatedSink()
+    sink.gate.clear()
+    handler = QueuedHandler(sink, maxsize=2)
+    log = logging.getLogger("zoe.flood")
+    log.addHandler(handler)
+    log.propagate = False
+    try:
+        for i in range(10):
+            log.warning("line %d", i)  # listener holds one; the queue holds two
+        assert handler.dropped >= 7
+        sink.gate.set()
+        handler.flush()
+        log.warning("after")
+        handler.flush()
+    finally:
+        log.removeHandler(handler)
+        log.propagate = True
+        handler.close()
+
+    assert sink.lines[-1] == "after"
+    assert sink.lines[-2] == f"log queue full: dropped {handler.dropped} records"
+
+
+def test_sampling_keeps_one_in_n_below_the_rule_level():
+    assert parse_sample_rules("zoe.router_head_shadow:INFO=10, bad, x:NOPE=3, y:DEBUG=1") == {
+        "zoe.router_head_shadow": (logging.INFO, 10),
+    }
+    sink = _GatedSink()
+    handler = QueuedHandler(sink, sample=parse_sample_rules("zoe.router_head_shadow:INFO=10"))
+    shadow = logging.getLogger("zoe.router_head_shadow")
+    shadow.addHandler(handler)
+    shadow.setLevel(logging.INFO)
+    shadow.propagate = False
+    try:
+        for i in range(25):
+            shadow.info("shadow %d", i)
+        shadow.warning("disagreement")
+        handler.flush()
+    finally:
+        shadow.removeHandler(handler)
+        shadow.setLevel(logging.NOTSET)
+        shadow.propagate = True
+        handler.close()
+
+    assert sink.lines == ["shadow 0", "shadow 10", "shadow 20", "disagreement"]
+    assert handler.sampled_out == 22
@@ -0,0 +1,130 @@
+"""mcp_server stdio dispatch: the tool registry and concurrent tools/call.
+
+``handle_tool`` is swapped for a fake whose tools sleep or block on an event,
+and the dispatcher reads from an in-memory ``StreamReader`` — no DB, no pipes.
+"""
+import asyncio
+import json
+
+import pytest
+
+import mcp_server
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _call(msg_id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": msg_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    state = {"started": [], "cancelled": [], "gate": asyncio.Event(), "running": 0, "peak": 0}
+
+    async def handle_tool(name, args, actor_context=None):
+        state["started"].append(name)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            if name == "slow":
+                await state["gate"].wait()
+            elif name == "sleep":
+                await asyncio.sleep(args["s"])
+            return json.dumps({"tool": name})
+        except asyncio.CancelledError:
+            state["cancelled"].append(name)
+            raise
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(mcp_server, "handle_tool", handle_tool)
+    return state
+
+
+def _dispatcher(**kwargs):
+    out = []
+    return mcp_server._StdioDispatcher(lambda line: out.append(json.loads(line)), **kwargs), out
+
+
+def _texts(out):
+    return {r["id"]: json.loads(r["result"]["content"][0]["text"]) for r in out}
+
+
+def test_registry_covers_every_advertised_tool():
+    advertised = {tool["name"] for tool in mcp_server.TOOLS}
+    assert advertised <= set(mcp_server._TOOL_HANDLERS)
+    assert mcp_server._TOOL_HANDLERS["memory_add"] is mcp_server._TOOL_HANDLERS["memory_forget"]
+    with pytest.raises(RuntimeError, match="duplicate"):
+        mcp_server._tool("zoe_get_time")(lambda *a: None)
+
+
+async def test_unknown_tool_is_still_an_error_result(monkeypatch):
+    async def _actor(*_args):
+        return {"user_id": "u1"}
+
+    monkeypatch.setattr(mcp_server, "_resolve_mcp_actor", _actor)
+    assert await mcp_server._execute_tool(None, "nope", {}) == {"error": "Unknown tool: nope"}
+
+
+async def test_fast_calls_answer_ahead_of_a_slow_one(fake_tools):
+    dispatcher, out = _dispatcher(max_inflight=4)
+    dispatcher.dispatch(_call(1, "slow"))
+    dispatcher.dispatch(_call(2, "fast"))
+    dispatcher.dispatch({"jsonrpc": "2.0", "id": 3, "method": "tools/list"})
+    await asyncio.sleep(0.01)
+
+    assert [r["id"] for r in out] == [3, 2]
+    assert dispatcher.inflight() == 1
+    fake_tools["gate"].set()
+    await asyncio.sleep(0.01)
+    assert [r["id"] for r in out] == [3, 2, 1]
+    assert _texts(out[1:]) == {2: {"tool": "fast"}, 1: {"tool": "slow"}}
+
+
+async def test_inflight_limit_queues_the_overflow(fake_tools):
+    dispatcher, out = _dispatcher(max_inflight=2)
+    for i in range(5):
+        dispatcher.dispatch(_call(i, "sleep", s=0.01))
+    await asyncio.sleep(0.1)
+    assert fake_tools["peak"] == 2
+    assert sorted(r["id"] for r in out) == [0, 1, 2, 3, 4]
+
+
+async def test_cancelled_call_gets_no_response(fake_tools):
+    dispatcher, out = _dispatcher()
+    dispatcher.dispatch(_call("a", "slow"))
+    dispatcher.dispatch(_call("b", "fast"))
+    await asyncio.sleep(0)
+    dispatcher.dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                         "params": {"requestId": "a", "reason": "timeout"}})
+    await asyncio.sleep(0.01)
+
+    assert fake_tools["cancelled"] == ["slow"]
+    assert [r["id"] for r in out] == ["b"]
+    assert dispatcher.inflight() == 0
+    assert dispatcher.cancel("a") is False  # already gone
+
+
+async def test_per_tool_timeout_returns_an_error_result(fake_tools, monkeypatch):
+    monkeypatch.setenv("ZOE_MCP_TOOL_TIMEOUT_S", "0.02")
+    monkeypatch.setitem(mcp_server._MCP_TOOL_TIMEOUT_OVERRIDES_S, "sleep", 1.0)
+    dispatcher, out = _dispatcher()
+    dispatcher.dispatch(_call(1, "slow"))
+    dispatcher.dispatch(_call(2, "sleep", s=0.05))
+    await asyncio.sleep(0.1)
+
+    assert _texts(out) == {1: {"error": "slow timed out after 0.02s"}, 2: {"tool": "sleep"}}
+    assert fake_tools["cancelled"] == ["slow"]
+
+
+async def test_eof_waits_for_calls_already_accepted(fake_tools):
+    reader = asyncio.StreamReader()
+    reader.feed_data((json.dumps(_call(7, "sleep", s=0.02)) + "\n").encode())
+    reader.feed_data(b"not json\n")
+    reader.feed_data((json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + "\n").encode())
+    reader.feed_eof()
+    dispatcher, out = _dispatcher()
+
+    await dispatcher.serve(reader)
+    assert _texts(out) == {7: {"tool": "sleep"}}
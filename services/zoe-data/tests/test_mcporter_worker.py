@@ -0,0 +1,260 @@
+"""The warm mcporter worker: one mcp_server stdio child, multiplexed by id.
+
+Drives a tiny fake MCP stdio server (plain Python, no DB) so the lifecycle —
+handshake once, concurrent calls answered out of order, crash → respawn,
+slow call → cancelled, wedged child → recycle, start failure → spawn
+fallback — is exercised for real over pipes without the zoe-data import chain.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import mcporter_worker
+from mcporter_worker import (
+    McpStdioWorker,
+    WorkerCallFailed,
+    WorkerUnavailable,
+    coerce_arguments,
+    parse_mcporter_command,
+)
+
+pytestmark = pytest.mark.ci_safe
+
+FAKE_SERVER = textwrap.dedent('''
+    import json, os, sys
+
+    held = None
+    cancelled = []
+
+    def reply(msg, result):
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}) + "\\n")
+        sys.stdout.flush()
+
+    def text(msg, payload):
+        reply(msg, {"content": [{"type": "text", "text": json.dumps(payload)}], "isError": False})
+
+    for line in sys.stdin:
+        msg = json.loads(line)
+        method = msg.get("method")
+        if method == "notifications/cancelled":
+            cancelled.append(msg["params"]["requestId"])
+        if msg.get("id") is None:
+            continue
+        if method == "initialize":
+            reply(msg, {"protocolVersion": "2024-11-05", "capabilities": {}})
+        elif method == "tools/list":
+            reply(msg, {"tools": [{"name": "echo", "inputSchema": {"properties": {
+                "amount": {"type": "number"}, "limit": {"type": "integer"},
+                "done": {"type": "boolean"}, "text": {"type": "string"}}}}]})
+        elif method == "tools/call":
+            name = msg["params"]["name"]
+            args = msg["params"]["arguments"]
+            if name == "crash":
+                sys.exit(3)
+            if name == "hang":
+                continue
+            if name == "cancelled":
+                text(msg, {"args": cancelled})
+                continue
+            if name == "refuse":
+                reply(msg, {"content": [{"type": "text", "text": "list not found"}], "isError": True})
+                continue
+            if name == "env":
+                text(msg, sorted(os.environ))
+                continue
+            if name == "held":
+                held = msg
+                continue
+            text(msg, {"pid": os.getpid(), "args": args})
+            if held is not None:
+                text(held, {"pid": os.getpid(), "held": True})
+                held = None
+''')
+
+
+@pytest.fixture
+def server_cmd(tmp_path):
+    path = tmp_path / "fake_mcp_server.py"
+    path.write_text(FAKE_SERVER)
+    return [sys.executable, str(path)]
+
+
+def test_parse_mcporter_command_round_trips_build_command():
+    from intent_router import MCPORTER
+
+    cmd = f'{MCPORTER} call zoe-data.list_add_item list_type=shopping text="oat milk" user_id=u1'
+    assert parse_mcporter_command(cmd) == (
+        "list_add_item", {"list_type": "shopping", "text": "oat milk", "user_id": "u1"},
+    )
+    assert parse_mcporter_command("echo hello") is None
+    assert parse_mcporter_command("mcporter-safe call other.tool a=1") is None
+    assert parse_mcporter_command('mcporter-safe call zoe-data.x "unterminated') is None
+
+
+def test_coerce_arguments_follows_schema():
+    schema = {"properties": {
+        "amount": {"type": "number"}, "limit": {"type": "integer"},
+        "done": {"type": "boolean"}, "tags": {"type": "array"}, "note": {"type": "string"},
+    }}
+    out = coerce_arguments(
+        {"amount": "12.50", "limit": "5", "done": "true", "tags": '["a"]', "note": "42", "extra": "x"},
+        schema,
+    )
+    assert out == {"amount": 12.5, "limit": 5, "done": True, "tags": ["a"], "note": "42", "extra": "x"}
+    assert coerce_arguments({"limit": "many"}, schema) == {"limit": "many"}
+
+
+async def test_concurrent_calls_share_one_child_and_match_by_id(server_cmd):
+    worker = McpStdioWorker(server_cmd)
+    try:
+        warm = json.loads(await worker.call_tool("echo", {}))
+        # "held" is only answered after the NEXT request: responses arrive out of order.
+        held = asyncio.create_task(worker.call_tool("held", {}))
+        await asyncio.sleep(0.05)
+        results = await asyncio.gather(*(
+            worker.call_tool("echo", {"text": str(i), "amount": "1.5"}) for i in range(8)
+        ))
+        held_out = json.loads(await held)
+    finally:
+        await worker.close()
+    decoded = [json.loads(r) for r in results]
+    assert [d["args"]["text"] for d in decoded] == [str(i) for i in range(8)]
+    assert decoded[0]["args"]["amount"] == 1.5
+    assert held_out["held"] is True
+    assert {d["pid"] for d in decoded} | {held_out["pid"]} == {warm["pid"]}
+    assert worker.stats()["starts"] == 1
+
+
+async def test_tool_error_text_is_returned_not_raised(server_cmd):
+    worker = McpStdioWorker(server_cmd)
+    try:
+        assert await worker.call_tool("refuse", {}) == "list not found"
+        assert worker.stats()["failures"] == 1 and worker.alive
+    finally:
+        await worker.close()
+
+
+async def test_crash_fails_in_flight_call_and_next_call_respawns(server_cmd):
+    worker = McpStdioWorker(server_cmd)
+    try:
+        first = json.loads(await worker.call_tool("echo", {}))
+        with pytest.raises(WorkerCallFailed):
+            await worker.call_tool("crash", {})
+        second = json.loads(await worker.call_tool("echo", {}))
+    finally:
+        await worker.close()
+    assert first["pid"] != second["pid"]
+    assert worker.stats()["starts"] == 2
+
+
+async def test_slow_call_is_cancelled_but_the_child_is_kept(server_cmd):
+    worker = McpStdioWorker(server_cmd, call_timeout=0.3)
+    try:
+        first = json.loads(await worker.call_tool("echo", {}))
+        with pytest.raises(WorkerCallFailed, match="timed out"):
+            await worker.call_tool("hang", {})
+        second = json.loads(await worker.call_tool("echo", {}))
+        cancelled = json.loads(await worker.call_tool("cancelled", {}))
+    finally:
+        await worker.close()
+    assert first["pid"] == second["pid"]
+    assert cancelled["args"] == [4]  # ids 1-3: initialize, tools/list, echo
+
+
+async def test_wedged_child_times_out_twice_and_is_recycled(server_cmd):
+    worker = McpStdioWorker(server_cmd, call_timeout=0.3)
+    try:
+        first = json.loads(await worker.call_tool("echo", {}))
+        for _ in range(mcporter_worker.RECYCLE_AFTER_TIMEOUTS):
+            with pytest.raises(WorkerCallFailed, match="timed out"):
+                await worker.call_tool("hang", {})
+        second = json.loads(await worker.call_tool("echo", {}))
+    finally:
+        await worker.close()
+    assert first["pid"] != second["pid"]
+
+
+async def test_start_failure_is_unavailable_and_backs_off():
+    worker = McpStdioWorker([sys.executable, "-c", "import sys; sys.exit(1)"])
+    with pytest.raises(WorkerUnavailable, match="failed to start"):
+        await worker.call_tool("echo", {})
+    with pytest.raises(WorkerUnavailable, match="backing off"):
+        await worker.call_tool("echo", {})
+    await worker.close()
+
+
+async def test_child_gets_the_sanitized_stdio_env(server_cmd):
+    worker = McpStdioWorker(server_cmd, env={
+        "PATH": "/usr/bin:/bin", "HOME": "/home/zoe", "POSTGRES_URL": "postgres://stale", "BASH_FUNC_x%%": "() { :; }",
+    })
+    try:
+        keys = json.loads(await worker.call_tool("env", {}))
+    finally:
+        await worker.close()
+    assert "PATH" in keys and "HOME" in keys
+    assert "POSTGRES_URL" not in keys and "BASH_FUNC_x%%" not in keys
+
+
+async def test_send_without_a_child_is_unavailable_not_failed():
+    worker = McpStdioWorker([sys.executable, "-c", "pass"])
+    with pytest.raises(WorkerUnavailable):
+        await worker._send({"jsonrpc": "2.0", "id": 1, "method": "tools/call"})
+
+
+async def test_run_mcporter_falls_back_to_spawn_when_worker_cannot_start(monkeypatch):
+    import async_subprocess
+    import intent_router
+
+    spawned = []
+
+    async def fake_spawn(cmd, **_kwargs):
+        spawned.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, b'{"ok": true}\n', b"")
+
+    monkeypatch.setattr(mcporter_worker, "_WORKER", None)
+    monkeypatch.setenv(mcporter_worker.MCPORTER_WORKER_CMD_ENV, f"{sys.executable} -c 'raise SystemExit(1)'")
+    monkeypatch.setattr(async_subprocess, "run_to_completion", fake_spawn)
+    try:
+        out = await intent_router._run_mcporter("mcporter-safe call zoe-data.reminder_list user_id=u1")
+    finally:
+        await mcporter_worker.shutdown_worker()
+    assert out == '{"ok": true}'
+    assert spawned and spawned[0][:3] == ["mcporter-safe", "call", "zoe-data.reminder_list"]
+
+
+async def test_run_mcporter_does_not_replay_a_failed_worker_call(monkeypatch):
+    import async_subprocess
+    import intent_router
+
+    class Crashed:
+        async def call_tool(self, tool, args):
+            raise WorkerCallFailed("worker exited")
+
+    async def fail_spawn(cmd, **_kwargs):
+        raise AssertionError("a sent call must not be replayed through mcporter")
+
+    monkeypatch.setattr(mcporter_worker, "get_worker", lambda env=None: Crashed())
+    monkeypatch.setattr(async_subprocess, "run_to_completion", fail_spawn)
+    assert await intent_router._run_mcporter("mcporter-safe call zoe-data.list_add_item text=x") is None
+
+
+async def test_spawn_mode_bypasses_worker(monkeypatch):
+    import async_subprocess
+    import intent_router
+
+    def no_worker(env=None):
+        raise AssertionError("ZOE_MCPORTER_MODE=spawn must not touch the worker")
+
+    async def fake_spawn(cmd, **_kwargs):
+        return subprocess.CompletedProcess(cmd, 0, b"spawned", b"")
+
+    monkeypatch.setenv(mcporter_worker.MCPORTER_MODE_ENV, "spawn")
+    monkeypatch.setattr(mcporter_worker, "get_worker", no_worker)
+    monkeypatch.setattr(async_subprocess, "run_to_completion", fake_spawn)
+    assert await intent_router._run_mcporter("mcporter-safe call zoe-data.reminder_list") == "spawned"
@@ -0,0 +1,138 @@
+"""Weekly consolidation: indexed near-duplicate merge + batched contradiction reads.
+
+No Chroma, no LLM: a fake MemoryService records reviews, and
+``_is_contradiction`` is patched. Runs in the slim ``ci_safe`` lane.
+"""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import memory_digest
+from memory_service import MemoryRef
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _row(i, text, *, confidence=0.7, added=None, status="approved"):
+    return MemoryRef(
+        id=f"m{i}",
+        text=text,
+        metadata={
+            "confidence": confidence,
+            "added_at": added or f"2026-01-{(i % 28) + 1:02d}T00:00:{i % 60:02d}Z",
+            "status": status,
+        },
+    )
+
+
+class _FakeSvc:
+    def __init__(self, rows):
+        self.rows = {r.id: r for r in rows}
+        self.reviews = []
+        self.get_many_calls = 0
+
+    async def list_by_status(self, *, user_id, status, limit):
+        return [r for r in self.rows.values() if r.metadata["status"] == status][:limit]
+
+    async def review(self, mem_id, *, decision, edits, actor, note):
+        self.reviews.append((mem_id, edits))
+        self.rows[mem_id].metadata["status"] = "superseded"
+
+    async def get_many(self, ids):
+        self.get_many_calls += 1
+        return {i: self.rows[i] for i in ids if i in self.rows}
+
+    async def get(self, mem_id):
+        raise AssertionError("contradiction pass must batch its status reads")
+
+
+def _pairwise_reference(rows):
+    """The pre-index algorithm: first keeper at overlap >= 0.85 absorbs the row."""
+    rows = sorted(
+        rows,
+        key=lambda r: (-float(r.metadata.get("confidence", 0.7) or 0.7), r.metadata.get("added_at", "")),
+    )
+    keepers, merges = [], []
+    for ref in rows:
+        text = (ref.text or "").strip()
+        if not text:
+            continue
+        match = next((k for k in keepers if memory_digest._text_overlap(text, k.text) >= 0.85), None)
+        if match is None:
+            keepers.append(ref)
+        else:
+            merges.append((ref.id, match.text))
+    return merges
+
+
+@pytest.mark.asyncio
+async def test_merge_matches_the_pairwise_scan():
+    rng = random.Random(3)
+    vocab = ["user", "loves", "italian", "cuisine", "really", "coffee", "black", "dog",
+             "named", "rex", "works", "nurse", "hospital", "sister", "lives", "perth"]
+    rows = [
+        _row(0, "user loves italian cuisine", confidence=0.9),
+        _row(1, "the user really loves italian cuisine"),
+        _row(2, "user has a dog named rex"),
+        _row(3, "   "),
+    ]
+    rows += [_row(i, " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 7)))) for i in range(4, 120)]
+    expected = _pairwise_reference(rows)
+    svc = _FakeSvc(rows)
+
+    merged = await memory_digest._merge_near_duplicates(svc, "jason")
+
+    assert merged == len(expected) and svc.reviews == expected
+    assert ("m1", "user loves italian cuisine") in svc.reviews
+
+
+@pytest.mark.asyncio
+async def test_merge_candidate_work_stays_near_linear(monkeypatch):
+    rows = [_row(i, f"fact {i} about topic{i} with detail{i} and extra{i % 7}") for i in range(3000)]
+    calls = 0
+    real = memory_digest._set_overlap
+
+    def counting(a, b):
+        nonlocal calls
+        calls += 1
+        return real(a, b)
+
+    monkeypatch.setattr(memory_digest, "_set_overlap", counting)
+    assert await memory_digest._merge_near_duplicates(_FakeSvc(rows), "jason") == 0
+    assert calls < 3 * len(rows)  # pairwise would be ~4.5M
+
+
+@pytest.mark.asyncio
+async def test_contradictions_read_statuses_once_and_skip_superseded(monkeypatch):
+    rows = [
+        _row(0, "user works as a nurse at the hospital", added="2026-03-01T00:00:00Z"),
+        _row(1, "user works as a teacher at the school", added="2026-02-01T00:00:00Z"),
+        _row(2, "user works as a chef at the hospital", added="2026-01-01T00:00:00Z"),
+        _row(3, "user works as a pilot", added="2025-12-01T00:00:00Z", status="superseded"),
+    ]
+    asked = []
+
+    async def fake_is_contradiction(new, old):
+        asked.append((new, old))
+        return True
+
+    monkeypatch.setattr(memory_digest, "_is_contradiction", fake_is_contradiction)
+    svc = _FakeSvc(rows)
+    svc.rows["m3"].metadata["status"] = "approved"  # listed as approved...
+    listed = await svc.list_by_status(user_id="jason", status="approved", limit=200)
+    svc.rows["m3"].metadata["status"] = "superseded"  # ...but superseded before the pass
+    svc.list_by_status = lambda **_k: _async(listed)
+
+    resolved = await memory_digest._resolve_contradictions(svc, "jason")
+
+    assert svc.get_many_calls == 1
+    # m0 supersedes m1 and m2; the superseded rows are never compared again,
+    # and m3 (stale in the listing) is never sent to the LLM.
+    assert resolved == 2
+    assert [old for _new, old in asked] == [rows[1].text, rows[2].text]
+
+
+async def _async(value):
+    return value
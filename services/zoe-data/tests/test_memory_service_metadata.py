@@ -519,7 +519,9 @@ def test_metadata_prompt_read_blocks_cross_user_disputed_and_superseded_rows():
     rows = service._metadata_read("jason", limit=10)
 
     assert {row.id for row in rows} == {"own", "wing_only", "mixed", "shared"}
-    assert {"visibility": "family"} in collection.seen_get_where["$or"]
+    owner_clause, status_clause, _expiry_clause = collection.seen_get_where["$and"]
+    assert {"visibility": "family"} in owner_clause["$or"]
+    assert set(status_clause["status"]["$nin"]) == memory_service._BLOCKED_READ_STATUSES
 
 
 def test_semantic_search_blocks_cross_user_disputed_and_superseded_rows():
@@ -630,3 +632,189 @@ def test_audit_collection_reuses_cached_persistent_client_per_data_dir(
         normalized,
         os.path.realpath(str(other_dir)),
     ]
+
+
+def test_read_fields_score_matches_added_at_parse_path():
+    now = datetime(2026, 6, 28, 18, 0, tzinfo=timezone.utc)
+    legacy = {"confidence": 0.8, "access_count": 3, "added_at": "2026-03-01T09:30:00Z",
+              "expires_at": "2026-07-01T00:00:00Z"}
+    typed = memory_service._with_read_fields(legacy)
+
+    assert typed["read_schema"] == memory_service._READ_SCHEMA_VERSION
+    assert typed["expires_at_ts"] == datetime(2026, 7, 1, tzinfo=timezone.utc).timestamp()
+    assert memory_service._prompt_score(typed, now) == pytest.approx(
+        memory_service._prompt_score(legacy, now), rel=1e-9
+    )
+    # no expiry → far-future sentinel, so the pushdown `$gt now` keeps the row
+    assert memory_service._with_read_fields({"added_at": "2026-01-01T00:00:00Z"})[
+        "expires_at_ts"
+    ] == memory_service._NEVER_EXPIRES_TS
+
+
+class _CountingCollection(_FakeCollection):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.get_calls = 0
+
+    def get(self, **kwargs):
+        self.get_calls += 1
+        return super().get(**kwargs)
+
+
+def _prompt_row(status="approved", added="2026-01-01T00:00:00Z", **extra):
+    return {"user_id": "jason", "visibility": "personal", "status": status,
+            "confidence": 0.7, "added_at": added, **extra}
+
+
+def test_prompt_hot_set_serves_repeat_reads_and_tracks_writes():
+    collection = _CountingCollection(
+        get_result={
+            "ids": ["a", "b"],
+            "documents": ["Fact A", "Fact B"],
+            "metadatas": [_prompt_row(added="2026-01-02T00:00:00Z"), _prompt_row()],
+        }
+    )
+    service = MemoryService(data_dir="/tmp/zoe-test-memory-hot-set")
+    service._collection = lambda: collection
+
+    assert [r.id for r in service._metadata_read("jason", limit=10)] == ["a", "b"]
+    assert [r.id for r in service._metadata_read("jason", limit=10)] == ["a", "b"]
+    assert collection.get_calls == 1
+
+    # ingest/review splice rows in and out without a re-read
+    fresh = memory_service.MemoryRef(id="c", text="Fact C", metadata=_prompt_row(added="2026-01-03T00:00:00Z"))
+    service._note_prompt_rows([fresh])
+    rejected = memory_service.MemoryRef(id="a", text="Fact A", metadata=_prompt_row(status="rejected"))
+    service._note_prompt_rows([rejected])
+    rows = service._metadata_read("jason", limit=10)
+    assert [r.id for r in rows] == ["c", "b"]
+    assert collection.get_calls == 1
+
+    # an access tick re-ranks a cached row in place
+    service._touch_prompt_rows({"b": _prompt_row(access_count=5)})
+    assert [r.id for r in service._metadata_read("jason", limit=10)] == ["b", "c"]
+
+    # callers get copies: mutating a result never reaches the hot set
+    rows = service._metadata_read("jason", limit=1)
+    rows[0].metadata["status"] = "archived"
+    assert [r.id for r in service._metadata_read("jason", limit=1)] == ["b"]
+
+    service._invalidate_prompt_hot("jason")
+    service._metadata_read("jason", limit=10)
+    assert collection.get_calls == 2
+
+
+def test_prompt_hot_set_drops_after_a_write_from_another_process(tmp_path):
+    collection = _CountingCollection(
+        get_result={"ids": ["a"], "documents": ["Fact A"], "metadatas": [_prompt_row()]}
+    )
+    zoe_data = MemoryService(data_dir=str(tmp_path))
+    zoe_data._collection = lambda: collection
+    mcp_child = MemoryService(data_dir=str(tmp_path))  # same palace, own hot sets
+
+    zoe_data._metadata_read("jason", limit=10)
+    zoe_data._note_prompt_rows([memory_service.MemoryRef(id="b", text="Fact B", metadata=_prompt_row())])
+    zoe_data._metadata_read("jason", limit=10)
+    assert collection.get_calls == 1  # its own writes are patched in, not re-read
+
+    mcp_child._note_prompt_rows([memory_service.MemoryRef(id="a", text="Fact A", metadata=_prompt_row(status="rejected"))])
+    zoe_data._metadata_read("jason", limit=10)
+    assert collection.get_calls == 2
+    zoe_data._metadata_read("jason", limit=10)
+    assert collection.get_calls == 2
+
+
+class _TickCollection:
+    def __init__(self, metas):
+        self.metas = {k: dict(v) for k, v in metas.items()}
+        self.updates = []
+
+    def get(self, ids=None, **kwargs):
+        found = [i for i in ids if i in self.metas]
+        return {"ids": found, "metadatas": [dict(self.metas[i]) for i in found]}
+
+    def update(self, ids, metadatas):
+        self.updates.append(list(ids))
+        for i, m in zip(ids, metadatas):
+            self.metas[i] = dict(m)
+
+
+def _tick_service(monkeypatch, write_behind, near_cap=False):
+    monkeypatch.setenv("ZOE_MEMORY_TICK_WRITE_BEHIND", "1" if write_behind else "0")
+    base = _prompt_row()
+    if near_cap:
+        # one slot left under the cap: later distinct queries must freeze the count
+        hashes = [f"{n:016x}" for n in range(memory_service._MAX_QUERY_HASHES - 1)]
+        base.update(_query_hashes=",".join(hashes), unique_query_count=len(hashes))
+    collection = _TickCollection({"a": base, "b": _prompt_row()})
+    service = MemoryService(data_dir="/tmp/zoe-test-memory-ticks")
+    service._collection = lambda: collection
+    return service, collection
+
+
+async def _tick_script(service):
+    for ids, query in [(["a", "b"], "Where do I park?"), (["a"], "where do i park?"),
+                       (["a"], "what's my wifi"), (["b"], None), (["a"], "dentist time")]:
+        await service.tick_access("jason", ids, query=query)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("near_cap", [False, True])
+async def test_write_behind_ticks_coalesce_and_match_sync_counts(monkeypatch, near_cap):
+    sync_service, sync_col = _tick_service(monkeypatch, write_behind=False, near_cap=near_cap)
+    await _tick_script(sync_service)
+
+    service, collection = _tick_service(monkeypatch, write_behind=True, near_cap=near_cap)
+    await _tick_script(service)
+    assert collection.updates == []  # nothing hits Chroma on the turn path
+
+    assert await service.flush_access_ticks() == 2
+    assert collection.updates == [["a", "b"]]  # one batched update per user
+    for mem_id in ("a", "b"):
+        for key in ("access_count", "unique_query_count", "_query_hashes"):
+            assert collection.metas[mem_id].get(key) == sync_col.metas[mem_id].get(key)
+    assert collection.metas["a"]["access_count"] == 4
+    assert await service.flush_access_ticks() == 0
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_at_size_threshold_and_on_shutdown(monkeypatch):
+    monkeypatch.setattr(memory_service, "_TICK_FLUSH_MAX_IDS", 2)
+    service, collection = _tick_service(monkeypatch, write_behind=True)
+
+    await service.tick_access("jason", ["a"])
+    await asyncio.sleep(0.05)
+    assert collection.updates == []  # below threshold: waits for the timer
+    await service.tick_access("jason", ["b"])
+    for _ in range(50):
+        if collection.updates:
+            break
+        await asyncio.sleep(0.01)
+    assert collection.updates == [["a", "b"]]
+
+    await service.tick_access("jason", ["a"])
+    monkeypatch.setattr(memory_service, "_service_singleton", service)
+    await memory_service.shutdown_memory_service()
+    assert collection.updates[-1] == ["a"]
+    assert collection.metas["a"]["access_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_requeues_ticks_it_had_not_written(monkeypatch):
+    service, collection = _tick_service(monkeypatch, write_behind=True)
+    await service.tick_access("jason", ["a", "b"], query="where do i park?")
+
+    lock = service._user_locks.setdefault("jason", asyncio.Lock())
+    await lock.acquire()  # flush is stuck behind the user lock, like a slow write
+    flush = asyncio.create_task(service.flush_access_ticks())
+    await asyncio.sleep(0.01)
+    await service.tick_access("jason", ["a"], query="what's my wifi")  # lands meanwhile
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(flush, timeout=0.05)
+    lock.release()
+
+    assert collection.updates == []
+    assert await service.flush_access_ticks() == 2
+    assert collection.metas["a"]["access_count"] == 2
+    assert collection.metas["a"]["unique_query_count"] == 2
+    assert collection.metas["b"]["access_count"] == 1
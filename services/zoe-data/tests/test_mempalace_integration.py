@@ -39,9 +39,28 @@ class _FakeCollection:
             if id_ not in self._store:
                 self._store[id_] = {"document": doc, "metadata": dict(meta)}
 
+    @staticmethod
+    def _match_op(meta: dict, key: str, op: str, arg) -> bool:
+        # Chroma 0.6 semantics: $ne / $nin also match rows missing the key.
+        if key not in meta:
+            return op in ("$ne", "$nin")
+        value = meta[key]
+        if op == "$eq":
+            return value == arg
+        if op == "$ne":
+            return value != arg
+        if op == "$in":
+            return value in arg
+        if op == "$nin":
+            return value not in arg
+        if isinstance(value, str) or isinstance(arg, str):
+            return False
+        return {"$gt": value > arg, "$gte": value >= arg,
+                "$lt": value < arg, "$lte": value <= arg}[op]
+
     @staticmethod
     def _match_where(meta: dict, where: dict | None) -> bool:
-        """Minimal Chroma where-clause evaluator supporting $or / $and."""
+        """Minimal Chroma where-clause evaluator: $or / $and + comparison operators."""
         if not where:
             return True
         for k, v in where.items():
@@ -51,6 +70,9 @@ class _FakeCollection:
             elif k == "$and":
                 if not all(_FakeCollection._match_where(meta, clause) for clause in v):
                     return False
+            elif isinstance(v, dict):
+                if not all(_FakeCollection._match_op(meta, k, op, arg) for op, arg in v.items()):
+                    return False
             else:
                 if meta.get(k) != v:
                     return False
@@ -0,0 +1,152 @@
+"""Tests for the indexed, segmented pipeline journal behind pipeline_store."""
+
+import json
+import os
+
+import pytest
+
+pytestmark = pytest.mark.ci_safe  # GitHub-CI opt-in: runs in validate.yml's `-m ci_safe` lane
+
+import pipeline_journal as journal
+import pipeline_store as store
+from pipeline_evidence import PipelineState
+
+
+@pytest.fixture
+def isolated_store(tmp_path, monkeypatch):
+    path = tmp_path / "runs.jsonl"
+    monkeypatch.setenv("ZOE_PIPELINE_STORE_PATH", str(path))
+    monkeypatch.setenv("ZOE_PIPELINE_STORE_MAX_SEGMENTS", "100")
+    monkeypatch.setattr(journal, "_JOURNALS", {})
+    return path
+
+
+def _fresh_process(monkeypatch):
+    """Drop in-memory journals, as a new process would start."""
+    monkeypatch.setattr(journal, "_JOURNALS", {})
+
+
+def _save(ref: str, times: int = 1) -> PipelineState:
+    state = store.load_latest_state(ref) or PipelineState(task_ref=ref, phase="implement")
+    for i in range(times):
+        state = store.save_state(state, event=f"tick-{i}", extra={"pad": "x" * 200})
+    return state
+
+
+def _latest_by_scan(path, ref):
+    with path.open("r", encoding="utf-8") as handle:
+        return store._latest_state_from_lines(handle, ref)
+
+
+def test_loads_seek_through_the_sidecar_index(isolated_store, monkeypatch):
+    saved = {ref: _save(ref, times=3) for ref in ("multica:a", "multica:b")}
+    assert journal.index_path(isolated_store).is_file()
+
+    _fresh_process(monkeypatch)
+    monkeypatch.setattr(
+        journal.PipelineJournal, "_rebuild",
+        lambda *a, **k: pytest.fail("a valid sidecar must not trigger a rebuild"),
+    )
+    for ref, state in saved.items():
+        loaded = store.load_latest_state(ref)
+        assert loaded is not None and loaded.journal_revision == state.journal_revision == 3
+
+
+@pytest.mark.parametrize("damage", ["missing", "garbage", "rewritten"])
+def test_stale_or_missing_index_is_rebuilt(isolated_store, monkeypatch, damage):
+    _save("multica:a", times=2)
+    _save("multica:b", times=2)
+    idx = journal.index_path(isolated_store)
+    if damage == "missing":
+        idx.unlink()
+    elif damage == "garbage":
+        idx.write_text("{not json", encoding="utf-8")
+    else:
+        # an out-of-band in-place rewrite (e.g. compact_pipeline_state) that
+        # keeps only the last line moves every offset the index holds
+        last = isolated_store.read_bytes().splitlines(keepends=True)[-1]
+        isolated_store.write_bytes(last + last)
+
+    _fresh_process(monkeypatch)
+    assert store.load_latest_state("multica:b").journal_revision == 2
+    expected_a = _latest_by_scan(isolated_store, "multica:a")
+    loaded_a = store.load_latest_state("multica:a")
+    assert (loaded_a and loaded_a.journal_revision) == (expected_a and expected_a.journal_revision)
+
+
+def test_lines_appended_around_the_index_are_picked_up(isolated_store):
+    state = _save("multica:a")
+    foreign = state.model_copy(update={"journal_revision": 7, "status": "blocked"})
+    with isolated_store.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"event": "manual", "task_ref": "multica:a", "state": foreign.model_dump()}) + "\n")
+
+    loaded = store.load_latest_state("multica:a")
+    assert loaded.journal_revision == 7 and loaded.status == "blocked"
+    assert store.save_state(loaded, event="next").journal_revision == 8
+
+
+def test_torn_final_line_is_terminated_before_the_next_append(isolated_store):
+    _save("multica:a")
+    with isolated_store.open("a", encoding="utf-8") as fh:
+        fh.write('{"event": "crashed mid-wri')
+
+    saved = _save("multica:a")
+    assert store.load_latest_state("multica:a").journal_revision == saved.journal_revision
+    assert _latest_by_scan(isolated_store, "multica:a").journal_revision == saved.journal_revision
+
+
+def test_rollover_seals_segments_in_place_and_keeps_the_tail(isolated_store, monkeypatch):
+    monkeypatch.setenv("ZOE_PIPELINE_STORE_SEGMENT_MB", "0.004")  # ~4 KB
+    monkeypatch.setattr(journal, "SEGMENT_KEEP_TAIL", 2)
+    _save("multica:first")
+    inode = os.stat(isolated_store).st_ino
+    saved = {}
+    for round_ in range(6):
+        for ref in ("multica:a", "multica:b", "multica:c"):
+            saved[ref] = _save(ref)
+
+    segments = journal._discover_segments(isolated_store)
+    assert len(segments) >= 2
+    assert os.stat(isolated_store).st_ino == inode  # rewritten in place, never renamed
+    tail = isolated_store.read_text(encoding="utf-8").splitlines()
+    assert 1 <= len(tail) <= 3  # the kept tail plus any appends since the last roll
+    assert json.loads(tail[-1])["task_ref"] == "multica:c"
+
+    for ref, state in saved.items():
+        assert store.load_latest_state(ref).journal_revision == state.journal_revision
+    assert store.load_latest_state("multica:first").journal_revision == 1
+
+    # recovery sees the same latest states across segments + active file
+    journal.index_path(isolated_store).unlink()
+    _fresh_process(monkeypatch)
+    for ref, state in saved.items():
+        assert store.load_latest_state(ref).journal_revision == state.journal_revision
+
+
+def test_segment_compaction_keeps_only_live_records(isolated_store, monkeypatch):
+    monkeypatch.setenv("ZOE_PIPELINE_STORE_SEGMENT_MB", "0.004")
+    monkeypatch.setattr(journal, "SEGMENT_KEEP_TAIL", 1)
+    saved = {}
+    for _ in range(8):
+        for ref in ("multica:a", "multica:b"):
+            saved[ref] = _save(ref)
+    before = journal._discover_segments(isolated_store)
+    assert len(before) >= 2
+
+    report = journal.journal_for(isolated_store).compact_segments()
+
+    assert report["compacted"] and report["bytes_after"] < report["bytes_before"]
+    assert journal._discover_segments(isolated_store) == [before[-1]]
+    for ref, state in saved.items():
+        assert store.load_latest_state(ref).journal_revision == state.journal_revision
+    _fresh_process(monkeypatch)
+    assert journal.journal_for(isolated_store).rebuild_index() == 2
+    for ref, state in saved.items():
+        assert store.load_latest_state(ref).journal_revision == state.journal_revision
+
+
+def test_stale_save_still_conflicts_using_the_indexed_revision(isolated_store):
+    state = _save("multica:a", times=2)
+    stale = state.model_copy(update={"journal_revision": 1})
+    with pytest.raises(store.PipelineStateConflict, match="latest revision 2"):
+        store.save_state(stale, event="stale")
@@ -0,0 +1,171 @@
+"""Tier-2 trigger evaluation: concurrent checks, per-trigger timeout, shared snapshot.
+
+No Postgres: ``_get_compat_db`` is swapped for a fake that hands each caller its
+own connection object, and the fake cursors answer the snapshot's three
+set-based queries by SQL shape.
+"""
+import asyncio
+import contextlib
+from datetime import datetime
+
+import pytest
+
+import proactive.engine as engine
+import proactive.triggers.evening_windown as ew
+from proactive.triggers.base import ProactiveTrigger, TriggerResult, TriggerSnapshot
+
+pytestmark = pytest.mark.ci_safe
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def __aiter__(self):
+        self._it = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _SnapshotDB:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, sql, params=()):
+        self.queries.append(sql)
+        s = sql.lower()
+        if "left join users" in s:
+            return _Cursor([("alice", "Alice"), ("bob", None), ("carol", "Carol")])
+        if "from proactive_pending" in s:
+            return _Cursor([
+                ("evening_windown", "bob", 1),
+                ("morning_checkin", "alice", 0),
+                ("morning_checkin", "carol", 1),
+            ])
+        if "journal" in s:
+            return _Cursor([("carol",)])
+        raise AssertionError(f"unexpected SQL: {sql}")
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    """Each acquire yields a fresh _SnapshotDB; records how many are held at once."""
+    state = {"held": 0, "peak": 0, "conns": []}
+
+    @contextlib.asynccontextmanager
+    async def _fake_db():
+        db = _SnapshotDB()
+        state["conns"].append(db)
+        state["held"] += 1
+        state["peak"] = max(state["peak"], state["held"])
+        try:
+            yield db
+        finally:
+            state["held"] -= 1
+
+    monkeypatch.setattr(engine, "_get_compat_db", _fake_db)
+    return state
+
+
+class _SleepyTrigger(ProactiveTrigger):
+    def __init__(self, trigger_type, delay, *, boom=False):
+        self.trigger_type = trigger_type
+        self.delay = delay
+        self.boom = boom
+        self.seen = None
+
+    async def check(self, db, snapshot=None):
+        self.seen = snapshot
+        await asyncio.sleep(self.delay)
+        if self.boom:
+            raise RuntimeError("kaput")
+        return [TriggerResult(user_id="alice", message=self.trigger_type, trigger_type=self.trigger_type)]
+
+
+async def test_snapshot_loads_once_with_set_based_queries():
+    db = _SnapshotDB()
+    snap = await TriggerSnapshot.load(db)
+
+    assert len(db.queries) == 3
+    assert snap.active_users == {"alice": "Alice", "bob": "", "carol": "Carol"}
+    assert snap.fired_today("evening_windown") == {"bob"}
+    assert snap.fired_today("morning_checkin") == {"alice", "carol"}
+    assert snap.fired_today("morning_checkin", unclaimed_only=True) == {"alice"}
+    assert snap.journal_users == {"carol"}
+
+
+async def test_triggers_run_concurrently_within_their_pool_slice(fake_pool, monkeypatch):
+    monkeypatch.setenv("ZOE_PROACTIVE_TRIGGER_CONCURRENCY", "2")
+    triggers = [_SleepyTrigger(f"t{i}", 0.1) for i in range(4)]
+
+    started = asyncio.get_running_loop().time()
+    results = await engine.evaluate_triggers(triggers)
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert [r.trigger_type for r in results] == ["t0", "t1", "t2", "t3"]
+    assert elapsed < 0.35  # two waves of two, not four sequential checks
+    assert fake_pool["peak"] <= 2
+    # one snapshot read, then one connection per trigger, all sharing the snapshot
+    assert len(fake_pool["conns"]) == 1 + len(triggers)
+    assert all(t.seen is triggers[0].seen and t.seen is not None for t in triggers)
+
+
+async def test_slow_or_failing_trigger_does_not_sink_the_cycle(fake_pool, monkeypatch):
+    monkeypatch.setenv("ZOE_PROACTIVE_TRIGGER_TIMEOUT_S", "0.05")
+    observed = []
+    monkeypatch.setattr(engine, "_observe_trigger_check",
+                        lambda name, elapsed, outcome: observed.append((name, outcome)))
+    triggers = [
+        _SleepyTrigger("fast", 0),
+        _SleepyTrigger("wedged", 5),
+        _SleepyTrigger("broken", 0, boom=True),
+    ]
+
+    results = await engine.evaluate_triggers(triggers)
+
+    assert [r.trigger_type for r in results] == ["fast"]
+    assert sorted(observed) == [("broken", "error"), ("fast", "ok"), ("wedged", "timeout")]
+    assert fake_pool["held"] == 0  # the timed-out check released its connection
+
+
+async def test_snapshot_failure_falls_back_to_direct_queries(monkeypatch):
+    @contextlib.asynccontextmanager
+    async def _down():
+        raise RuntimeError("pool exhausted")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(engine, "_get_compat_db", _down)
+    assert await engine._load_trigger_snapshot() is None
+
+
+async def test_evening_trigger_reads_only_the_snapshot(monkeypatch):
+    class _Now(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 7, 5, 21, 15, tzinfo=tz)
+
+    class _NoQueries:
+        def execute(self, *_a, **_k):
+            raise AssertionError("snapshot path must not query per user")
+
+    monkeypatch.setattr(ew, "datetime", _Now)
+    snap = await TriggerSnapshot.load(_SnapshotDB())
+
+    results = await ew.EveningWindDownTrigger().check(_NoQueries(), snapshot=snap)
+
+    # bob already got tonight's prompt, carol journalled recently
+    assert [r.user_id for r in results] == ["alice"]
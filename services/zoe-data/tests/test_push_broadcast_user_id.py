@@ -6,6 +6,7 @@ scoped WS notification (reminders, notes, journal, lists, calendar, people,
 transactions).
 """
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 import pytest
 
@@ -21,6 +22,7 @@ def _make_ws():
     """Return a mock WebSocket; user_id mapping is tracked in broadcaster state."""
     ws = MagicMock()
     ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
@@ -35,6 +37,7 @@ async def _connect(bc, ws, channel="test", user_id=None):
     await bc.connect(ws, channel=channel, user_id=user_id)
     # reset the send_json call count after the connect ack
     ws.send_json.reset_mock()
+    ws.send_text = AsyncMock()
 
 
 # ── signature ────────────────────────────────────────────────────────────────
@@ -61,8 +64,8 @@ async def test_broadcast_global_reaches_all(bc):
 
     delivered = await bc.broadcast("ch", "evt", {}, user_id=None)
     assert delivered == 2
-    ws_a.send_json.assert_awaited_once()
-    ws_b.send_json.assert_awaited_once()
+    ws_a.send_text.assert_awaited_once()
+    ws_b.send_text.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -75,8 +78,8 @@ async def test_broadcast_scoped_only_reaches_owner(bc):
 
     delivered = await bc.broadcast("ch", "evt", {}, user_id="u1")
     assert delivered == 1
-    ws_a.send_json.assert_awaited_once()
-    ws_b.send_json.assert_not_called()
+    ws_a.send_text.assert_awaited_once()
+    ws_b.send_text.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -91,9 +94,9 @@ async def test_broadcast_scoped_includes_anon_connections(bc):
 
     delivered = await bc.broadcast("ch", "evt", {}, user_id="u1")
     assert delivered == 2  # owner + anon
-    ws_owner.send_json.assert_awaited_once()
-    ws_anon.send_json.assert_awaited_once()
-    ws_other.send_json.assert_not_called()
+    ws_owner.send_text.assert_awaited_once()
+    ws_anon.send_text.assert_awaited_once()
+    ws_other.send_text.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -119,15 +122,15 @@ async def test_broadcast_survives_connection_set_mutation_during_send(bc):
         bc._connections["ch"].add(ws_new_2)
         await asyncio.sleep(0)
 
-    ws_a.send_json.side_effect = mutate_connections
+    ws_a.send_text.side_effect = mutate_connections
 
     delivered = await bc.broadcast("ch", "evt", {}, user_id="u1")
 
     assert delivered == 2
-    ws_a.send_json.assert_awaited_once()
-    ws_b.send_json.assert_awaited_once()
-    ws_new_1.send_json.assert_not_called()
-    ws_new_2.send_json.assert_not_called()
+    ws_a.send_text.assert_awaited_once()
+    ws_b.send_text.assert_awaited_once()
+    ws_new_1.send_text.assert_not_called()
+    ws_new_2.send_text.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -135,7 +138,7 @@ async def test_broadcast_prunes_dead_panel_socket_from_all_state(bc):
     """Failed sends remove dead sockets from channel sets and metadata maps."""
     ws = _make_ws()
     await _connect_panel(bc, ws, panel_id="panel-1")
-    ws.send_json.side_effect = RuntimeError("socket closed")
+    ws.send_text.side_effect = RuntimeError("socket closed")
 
     delivered = await bc.broadcast("all", "evt", {})
 
@@ -150,7 +153,8 @@ async def _connect_panel(bc, ws, panel_id='panel-1'):
     ws.accept = AsyncMock()
     ws.send_json = AsyncMock()
     await bc.connect_panel(ws, panel_id=panel_id)
-    ws.send_json.reset_mock()
+    ws.send_text.reset_mock()
+    ws.send_text = AsyncMock()
 
 
 @pytest.mark.asyncio
@@ -162,8 +166,8 @@ async def test_broadcast_to_panel_reports_dedicated_panel_delivery(bc):
     delivered = await bc.broadcast_to_panel('panel-1', 'ui_action', {'panel_id': 'panel-1'})
 
     assert delivered == 1
-    ws.send_json.assert_awaited_once()
-    message = ws.send_json.await_args.args[0]
+    ws.send_text.assert_awaited_once()
+    message = json.loads(ws.send_text.await_args.args[0])
     assert message['channel'] == 'panel_panel-1'
     assert message['type'] == 'ui_action'
 
@@ -177,7 +181,7 @@ async def test_broadcast_to_panel_fallback_does_not_report_delivery(bc):
     delivered = await bc.broadcast_to_panel('panel-1', 'ui_action', {'panel_id': 'panel-1'})
 
     assert delivered == 0
-    ws.send_json.assert_awaited_once()
-    message = ws.send_json.await_args.args[0]
+    ws.send_text.assert_awaited_once()
+    message = json.loads(ws.send_text.await_args.args[0])
     assert message['channel'] == 'all'
     assert message['type'] == 'ui_action'
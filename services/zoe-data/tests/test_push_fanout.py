@@ -0,0 +1,177 @@
+"""PushBroadcaster fan-out: per-connection queues, slow consumers, replay.
+
+Sockets are small fakes whose ``send_text`` can be held open on an event or
+made to hang, standing in for a half-dead panel on a bad Wi-Fi link.
+"""
+import asyncio
+import json
+
+import pytest
+
+from memory_metrics import push_dropped_count, push_send_latency_seconds
+from push import PushBroadcaster
+
+pytestmark = pytest.mark.ci_safe
+
+
+class _Socket:
+    def __init__(self, gate=None, hang=False):
+        self.gate = gate
+        self.hang = hang
+        self.frames = []
+        self.closed = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, payload):
+        pass
+
+    async def send_text(self, text):
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.gate is not None:
+            await self.gate.wait()
+        self.frames.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed.append(code)
+
+    def messages(self):
+        return [json.loads(f) for f in self.frames]
+
+
+async def _settle():
+    await asyncio.sleep(0.01)  # let the writer tasks drain
+
+
+async def test_slow_socket_does_not_hold_up_the_others():
+    bc = PushBroadcaster(delivery_wait_s=0.05)
+    slow, fast = _Socket(gate=asyncio.Event()), _Socket()
+    await bc.connect(slow, "lists", user_id="u1")
+    await bc.connect(fast, "lists", user_id="u1")
+
+    delivered = await bc.broadcast("lists", "list_updated", {"id": 1})
+
+    assert delivered == 1
+    assert fast.messages()[0]["data"] == {"id": 1}
+    assert slow.frames == []
+    slow.gate.set()
+    await _settle()
+    # serialized once: both sockets were handed the very same string
+    assert slow.frames[0] is fast.frames[0]
+
+
+async def test_overflow_coalesces_backlog_into_one_resync_frame():
+    bc = PushBroadcaster(queue_max=2, delivery_wait_s=0)
+    slow = _Socket(gate=asyncio.Event())
+    await bc.connect(slow, "all")
+    dropped0 = push_dropped_count.labels(kind="anon", reason="coalesced")._value.get()
+
+    await bc.broadcast("all", "evt", {"n": 1})
+    await _settle()  # writer picks up #1 and blocks on the socket
+    for n in range(2, 7):
+        await bc.broadcast("all", "evt", {"n": n})
+    assert bc.stats()["connections"][0]["resync_pending"] is True
+    slow.gate.set()
+    await _settle()
+
+    msgs = slow.messages()
+    assert [m.get("data", {}).get("n") for m in msgs[:1]] == [1]
+    assert msgs[1] == {"type": "resync", "since_sequence": 1, "current_sequence": 6, "epoch": bc.epoch}
+    assert len(msgs) == 2
+    assert push_dropped_count.labels(kind="anon", reason="coalesced")._value.get() - dropped0 == 5
+
+    await bc.broadcast("all", "evt", {"n": 7})  # queue is live again after the resync
+    await _settle()
+    assert slow.messages()[-1]["data"] == {"n": 7}
+
+
+async def test_send_timeout_drops_the_connection():
+    bc = PushBroadcaster(send_timeout_s=0.01, delivery_wait_s=0.5)
+    stuck, ok = _Socket(hang=True), _Socket()
+    await bc.connect_panel(stuck, "kitchen")
+    await bc.connect(ok, "all")
+    latency0 = push_send_latency_seconds.labels(kind="anon")._sum.get()
+
+    assert await bc.broadcast("all", "evt", {}) == 1
+    await _settle()
+
+    assert stuck not in bc._connections["all"]
+    assert stuck not in bc._connections["panel_kitchen"]
+    assert stuck.closed == [1013]
+    assert await bc.broadcast_to_panel("kitchen", "ui_action", {}) == 0
+    assert push_send_latency_seconds.labels(kind="anon")._sum.get() > latency0
+
+
+async def test_catchup_replays_missed_events_for_that_user():
+    bc = PushBroadcaster()
+    ws = _Socket()
+    await bc.connect(ws, "lists", user_id="u1")
+    await bc.broadcast("lists", "a", {}, user_id="u1")
+    await bc.broadcast("lists", "b", {}, user_id="u2")  # someone else's
+    await bc.broadcast("lists", "c", {})
+    await bc.broadcast("calendar", "d", {})  # not subscribed
+    await _settle()
+    ws.frames.clear()
+
+    await bc.catchup(ws, 0)
+    await _settle()
+
+    msgs = ws.messages()
+    assert [(m["type"], m["sequence"]) for m in msgs[:-1]] == [("a", 1), ("c", 3)]
+    assert msgs[-1] == {"type": "catchup", "since_sequence": 0, "current_sequence": 4,
+                        "epoch": bc.epoch, "replayed": 2}
+
+
+async def test_catchup_beyond_the_ring_recommends_full_refresh():
+    bc = PushBroadcaster(replay_max=2)
+    ws = _Socket()
+    await bc.connect(ws, "all")
+    for _ in range(4):
+        await bc.broadcast("all", "evt", {})
+    await _settle()
+    ws.frames.clear()
+
+    await bc.catchup(ws, 1)  # #2 was evicted
+    await bc.catchup(ws, 2)  # #3 and #4 are still held
+    await bc.catchup(ws, 99)  # a sequence from before a restart
+    await _settle()
+
+    summaries = [m for m in ws.messages() if m["type"] == "catchup"]
+    assert [s["replayed"] for s in summaries] == [0, 2, 0]
+    assert summaries[0]["message"] == "Full state refresh recommended"
+
+
+async def test_catchup_from_another_boot_recommends_full_refresh():
+    before = PushBroadcaster()
+    bc = PushBroadcaster()  # the restarted process
+    ws = _Socket()
+    await bc.connect(ws, "all")
+    for _ in range(5):
+        await bc.broadcast("all", "evt", {})
+    await _settle()
+    assert ws.messages()[0]["epoch"] == bc.epoch != before.epoch
+    ws.frames.clear()
+
+    # seq 3 is below the new counter, so only the epoch reveals the restart
+    await bc.catchup(ws, 3, before.epoch)
+    await bc.catchup(ws, 3, bc.epoch)
+    await _settle()
+
+    summaries = [m for m in ws.messages() if m["type"] == "catchup"]
+    assert [s["replayed"] for s in summaries] == [0, 2]
+
+
+async def test_briefly_backlogged_connection_counts_as_delivered():
+    bc = PushBroadcaster(delivery_wait_s=0.5)
+    ws = _Socket(gate=asyncio.Event())
+    await bc.connect_panel(ws, "kitchen")
+    first = asyncio.ensure_future(bc.broadcast("all", "evt", {}))
+    await _settle()  # writer is mid-send: the panel is backlogged
+
+    nav = asyncio.ensure_future(bc.broadcast_to_panel("kitchen", "ui_action", {}))
+    await _settle()
+    ws.gate.set()
+    assert await first == 1
+    assert await nav == 1
@@ -183,7 +183,7 @@ async def test_weather_provider_fallback_returns_generic_error_and_logs(monkeypa
         async def get(self, *args, **kwargs):
             return FakeResponse()
 
-    monkeypatch.setattr(weather.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr(weather.http_clients.httpx, "AsyncClient", FakeClient)
 
     with caplog.at_level("ERROR", logger=weather.logger.name):
         result = await weather._fetch_openmeteo_current(1.0, 2.0, "Perth", "AU")
@@ -215,7 +215,7 @@ async def test_weather_cached_fallback_success_shape_unchanged(monkeypatch):
         async def get(self, *args, **kwargs):
             raise RuntimeError("provider down")
 
-    monkeypatch.setattr(weather.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr(weather.http_clients.httpx, "AsyncClient", FakeClient)
 
     result = await weather._fetch_openmeteo_current(1.0, 2.0, "Perth", "AU")
 
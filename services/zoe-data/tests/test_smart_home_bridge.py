@@ -585,6 +585,28 @@ async def test_internal_filter_does_not_hide_real_lookalike_devices(monkeypatch)
     assert names == {"Satellite Dish", "Assistance Light", "Zoe Touch Lamp"}
 
 
+@pytest.mark.asyncio
+async def test_devices_snapshot_replaces_the_per_domain_calls(monkeypatch):
+    # A bridge with the /devices snapshot answers the whole card in one call.
+    paths = []
+
+    async def _get(path):
+        paths.append(path)
+        if path == "/devices":
+            return {
+                "lights": [{"entity_id": "light.lamp", "name": "Lamp", "state": "on", "brightness": 90}],
+                "switches": [{"entity_id": "switch.plug", "name": "Plug", "state": "off"}],
+                "entities": [{"entity_id": "input_boolean.fan", "state": "on",
+                              "attributes": {"friendly_name": "Fan"}}],
+                "count": 3,
+            }
+        return None
+    monkeypatch.setattr(smart_home_service, "_ha_get", _get)
+    names = {d["name"] for d in await smart_home_service.list_devices()}
+    assert names == {"Lamp", "Plug", "Fan"}
+    assert paths == ["/devices"]
+
+
 @pytest.mark.parametrize("q", [
     "add a device",
     "set up a device",
@@ -0,0 +1,127 @@
+"""Startup profiling: import timer, phases, staged warmups, lazy router mounts."""
+import asyncio
+import importlib
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+import startup_profile
+from lazy_routers import LazyRouter, LazyRouterMiddleware
+
+pytestmark = pytest.mark.ci_safe
+
+
+def test_import_timer_records_self_and_cumulative_time(tmp_path, monkeypatch):
+    (tmp_path / "zz_profiled_leaf.py").write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / "zz_profiled_root.py").write_text("import zz_profiled_leaf\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    startup_profile.stop_import_timer()  # left running by any earlier `import main`
+    assert startup_profile.start_import_timer() is True
+    try:
+        import zz_profiled_root
+    finally:
+        startup_profile.stop_import_timer()
+        sys.modules.pop("zz_profiled_root", None)
+        sys.modules.pop("zz_profiled_leaf", None)
+
+    cumulative, own = startup_profile._imports["zz_profiled_root"]
+    assert cumulative >= 0.02 and own < 0.02
+    assert startup_profile._imports["zz_profiled_leaf"][1] >= 0.02
+    assert type(zz_profiled_root.__loader__).__name__ != "_TimedLoader"
+    assert not any(type(f).__name__ == "_ImportTimer" for f in sys.meta_path)
+
+
+def test_phase_records_failures_and_reraises():
+    with startup_profile.phase("test_phase_ok"):
+        pass
+    with pytest.raises(RuntimeError):
+        with startup_profile.phase("test_phase_boom"):
+            raise RuntimeError("boom")
+
+    phases = {p["name"]: p for p in startup_profile.snapshot()["phases"]}
+    assert phases["test_phase_ok"]["ok"] is True
+    assert phases["test_phase_boom"]["ok"] is False
+
+
+async def test_warmups_run_by_priority_within_the_concurrency_cap():
+    ran, running, peak = [], [0], [0]
+
+    def warmup(name, fail=False):
+        async def run():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            ran.append(name)
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            if fail:
+                raise RuntimeError("no model")
+        return run
+
+    scheduler = startup_profile.WarmupScheduler(concurrency=2)
+    scheduler.add("test_stitch", warmup("test_stitch"), priority=50)
+    scheduler.add("test_kv", warmup("test_kv", fail=True), priority=30)
+    scheduler.add("test_stt", warmup("test_stt"), priority=10)
+    scheduler.add("test_router", warmup("test_router"), priority=20)
+    await scheduler.start()
+
+    assert ran == ["test_stt", "test_router", "test_kv", "test_stitch"]
+    assert peak[0] == 2
+    status = {w["name"]: w["status"] for w in startup_profile.snapshot()["warmups"]}
+    assert status["test_kv"] == "error" and status["test_stt"] == "ok"
+
+
+async def test_hung_warmup_times_out_and_delayed_warmup_waits_outside_the_slot():
+    ran = []
+
+    async def hang():
+        await asyncio.Event().wait()
+
+    async def quick():
+        ran.append("quick")
+
+    scheduler = startup_profile.WarmupScheduler(concurrency=1)
+    scheduler.add("test_delayed", quick, priority=10, delay_s=0.05)
+    scheduler.add("test_hung", hang, priority=20, timeout_s=0.1)
+    scheduler.add("test_after_hung", quick, priority=30)
+    await asyncio.wait_for(scheduler.start(), timeout=2.0)
+
+    warmups = {w["name"]: w for w in startup_profile.snapshot()["warmups"]}
+    assert warmups["test_hung"]["status"] == "timeout"
+    assert warmups["test_after_hung"]["status"] == "ok" and ran == ["quick", "quick"]
+    # the single slot went to the hung warmup while the delayed one slept
+    assert warmups["test_hung"]["start_s"] < warmups["test_delayed"]["start_s"]
+
+
+def test_lazy_router_is_imported_and_mounted_on_first_request(monkeypatch):
+    module = types.ModuleType("zz_lazy_router_mod")
+    module.router = APIRouter(prefix="/api/zz-lazy")
+
+    @module.router.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    imported = []
+    real_import = importlib.import_module
+
+    def import_module(name):
+        imported.append(name)
+        return module if name == "zz_lazy_router_mod" else real_import(name)
+
+    monkeypatch.setattr("lazy_routers.importlib.import_module", import_module)
+    app = FastAPI()
+    app.add_middleware(
+        LazyRouterMiddleware,
+        target=app,
+        routers=(LazyRouter("zz", "/api/zz-lazy", "zz_lazy_router_mod"),),
+    )
+    client = TestClient(app)
+
+    assert client.get("/api/other").status_code == 404
+    assert imported == []
+    assert client.get("/api/zz-lazy/ping").json() == {"pong": True}
+    assert client.get("/api/zz-lazy/ping").status_code == 200
+    assert imported == ["zz_lazy_router_mod"]
+    assert any(p["name"] == "lazy_router:zz" for p in startup_profile.snapshot()["phases"])
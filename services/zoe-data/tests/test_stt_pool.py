@@ -0,0 +1,125 @@
+"""STT worker pool: priority order, lazy growth, load shedding, wake warm-up."""
+import threading
+import time
+
+import pytest
+
+import stt_pool
+from stt_pool import BACKGROUND, INTERACTIVE, SttOverloaded, SttPool
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _pool(size=1, max_queue=4, built=None, warmed=None):
+    def factory(slot):
+        if built is not None:
+            built.append(slot)
+        return f"model-{slot}"
+
+    warmer = (lambda inst: warmed.append(inst)) if warmed is not None else (lambda inst: None)
+    return SttPool(factory, size=size, max_queue=max_queue, warmer=warmer)
+
+
+def _blocker(pool, priority=INTERACTIVE):
+    started, release = threading.Event(), threading.Event()
+
+    def job(instance):
+        started.set()
+        release.wait(5)
+        return instance
+
+    fut = pool.submit(job, priority)
+    assert started.wait(5)
+    return fut, release
+
+
+def test_interactive_jobs_run_before_queued_background_work():
+    pool = _pool()
+    order = []
+    busy, release = _blocker(pool)
+    background = pool.submit(lambda inst: order.append("ambient"), BACKGROUND)
+    interactive = pool.submit(lambda inst: order.append("command"), INTERACTIVE)
+    release.set()
+
+    for fut in (busy, background, interactive):
+        fut.result(timeout=5)
+    assert order == ["command", "ambient"]
+    assert pool.stats()["last"]["priority"] == "background"
+
+
+def test_second_instance_is_built_only_under_contention():
+    built = []
+    pool = _pool(size=2, built=built)
+    assert pool.submit(lambda inst: inst).result(timeout=5) == "model-0"
+    assert built == [0]
+
+    busy, release = _blocker(pool)
+    assert pool.submit(lambda inst: inst).result(timeout=5) == "model-1"
+    release.set()
+    assert busy.result(timeout=5) == "model-0"
+    assert sorted(set(built)) == [0, 1] and pool.stats()["workers"] == 2
+
+
+def test_full_queue_sheds_the_lowest_priority_job():
+    pool = _pool(max_queue=1)
+    busy, release = _blocker(pool)
+    ambient = pool.submit(lambda inst: "ambient", BACKGROUND)
+    command = pool.submit(lambda inst: "command", INTERACTIVE)  # displaces ambient
+    late_ambient = pool.submit(lambda inst: "late", BACKGROUND)  # refused outright
+
+    with pytest.raises(SttOverloaded):
+        ambient.result(timeout=5)
+    with pytest.raises(SttOverloaded):
+        late_ambient.result(timeout=5)
+    release.set()
+    assert command.result(timeout=5) == "command"
+    assert pool.stats()["shed"] == 2
+
+
+def test_warm_runs_on_every_worker_instance():
+    warmed = []
+    pool = _pool(size=2, warmed=warmed)
+    busy, release = _blocker(pool)
+    pool.submit(lambda inst: inst).result(timeout=5)  # grows to two workers
+    release.set()
+    busy.result(timeout=5)
+
+    pool.warm().result(timeout=5)
+    assert sorted(warmed) == ["model-0", "model-1"]
+
+
+def test_failed_slot_load_does_not_resolve_an_earlier_warm_waiter():
+    warmed = []
+    load_failed = threading.Event()
+
+    def factory(slot):
+        if slot:
+            load_failed.set()
+            raise MemoryError("no room for a second model")
+        return "model-0"
+
+    pool = SttPool(factory, size=2, max_queue=4, warmer=warmed.append)
+    busy, release = _blocker(pool)
+    waiter = pool.warm()  # counts slot 0 only; slot 0 is busy
+    queued = pool.submit(lambda inst: inst)  # contention: slot 1 starts and fails
+    assert load_failed.wait(5)
+    deadline = time.monotonic() + 5
+    while pool.stats()["size"] != 1 and time.monotonic() < deadline:
+        time.sleep(0.01)  # the failed worker has given up its slot
+
+    assert pool.stats()["size"] == 1 and not waiter.done()
+    release.set()
+    waiter.result(timeout=5)
+    assert warmed == ["model-0"] and queued.result(timeout=5) == "model-0"
+
+
+def test_auto_size_respects_memory_and_reserve(monkeypatch):
+    monkeypatch.setattr(stt_pool.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(stt_pool, "_mem_available_mb", lambda: 2000)
+    monkeypatch.setenv("ZOE_STT_INSTANCE_MB", "400")
+    monkeypatch.setenv("ZOE_STT_RESERVE_MB", "1024")
+    assert stt_pool.auto_size() == 2
+    monkeypatch.setattr(stt_pool, "_mem_available_mb", lambda: 900)
+    assert stt_pool.auto_size() == 1
+    monkeypatch.setenv("ZOE_STT_WORKERS", "3")
+    assert stt_pool.configured_size() == 3
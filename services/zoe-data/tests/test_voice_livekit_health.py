@@ -82,10 +82,10 @@ def test_record_voice_connected_counts_reconnects():
 async def test_pipeline_failure_updates_health(monkeypatch):
     from routers import voice_tts
 
-    async def _boom(path: str) -> str:
+    async def _boom(frames) -> str:
         raise RuntimeError("stt unavailable")
 
-    monkeypatch.setattr(voice_tts, "_transcribe_audio", _boom)
+    monkeypatch.setattr(voice_tts, "_transcribe_pcm", _boom)
     local = _LocalParticipant()
 
     await voice_livekit._run_pipeline(local, [b"\x00\x00" * 160], "u1", "s1")
@@ -101,7 +101,7 @@ async def test_pipeline_failure_updates_health(monkeypatch):
 async def test_pipeline_emits_processing_ack_before_slow_response(monkeypatch):
     from routers import voice_tts
 
-    async def _fake_transcribe(_path: str) -> str:
+    async def _fake_transcribe(_frames) -> str:
         return "will I need an umbrella later"
 
     async def _fake_agent(message, session_id, user_id, voice_mode=False):
@@ -119,7 +119,7 @@ async def test_pipeline_emits_processing_ack_before_slow_response(monkeypatch):
     async def _fake_synthesize(_payload, caller=None):
         return Audio()
 
-    monkeypatch.setattr(voice_tts, "_transcribe_audio", _fake_transcribe)
+    monkeypatch.setattr(voice_tts, "_transcribe_pcm", _fake_transcribe)
     monkeypatch.setattr(voice_tts, "synthesize", _fake_synthesize)
     # Pipeline behaviour is brain-agnostic; pin the legacy brain so the dispatch
     # routes to the mocked zoe_agent (default is now zoe-core).
@@ -0,0 +1,146 @@
+"""Speaker-ID engine: resident profile matrix, top-k matching, invalidation.
+
+``ProfileIndex`` replaces the per-request ``SELECT`` + per-row cosine loop in
+``/api/voice/identify``. No resemblyzer, no live DB (the compat-DB context
+manager is faked), so this runs in the slim ``ci_safe`` lane.
+"""
+from __future__ import annotations
+
+import base64
+import contextlib
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import routers.voice_tts as voice_tts  # noqa: E402
+from voice_speaker_id import ProfileIndex, _cosine_similarity  # noqa: E402
+
+pytestmark = pytest.mark.ci_safe
+
+
+def _emb(seed, dim=16):
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32).tobytes()
+
+
+ROWS = [(f"pid-{i}", f"user-{i}", f"User {i}", _emb(i)) for i in range(6)]
+
+
+def _loaded(rows=ROWS):
+    idx = ProfileIndex(ttl_s=0)
+    assert idx.load(rows, idx.generation)
+    return idx
+
+
+def test_top_k_matches_per_row_cosine_ranking():
+    idx = _loaded()
+    query = _emb(3)
+    ranked = idx.top_k(query, k=3)
+    expected = sorted(ROWS, key=lambda r: -_cosine_similarity(query, r[3]))[:3]
+    assert [c["profile_id"] for c in ranked] == [r[0] for r in expected]
+    for c, r in zip(ranked, expected):
+        assert c["score"] == pytest.approx(_cosine_similarity(query, r[3]), abs=1e-5)
+    assert ranked[0]["profile_id"] == "pid-3" and ranked[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_mismatched_dims_are_skipped_and_unusable_queries_rank_nothing():
+    idx = _loaded(ROWS + [("pid-odd", "odd", "Odd", _emb(9, dim=8)), ("pid-none", "n", "N", None)])
+    assert len(idx) == len(ROWS)
+    assert idx.top_k(_emb(1, dim=8)) == []
+    assert idx.top_k(np.zeros(16, dtype=np.float32).tobytes()) == []
+
+
+def test_load_that_raced_an_invalidate_is_discarded():
+    idx = ProfileIndex(ttl_s=0)
+    gen = idx.generation
+    idx.invalidate()  # e.g. an enroll committed while identify was querying
+    assert idx.load(ROWS, gen) is False
+    assert not idx.fresh and len(idx) == 0
+    assert idx.load(ROWS, idx.generation) is True and idx.fresh
+
+
+class _CountingDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.selects = 0
+
+    def execute(self, sql, params=()):
+        self.selects += 1
+        rows = self.rows
+
+        class _Cur:
+            async def fetchall(self):
+                return rows
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Cur()
+
+
+@pytest.fixture
+def fake_profiles(monkeypatch):
+    db = _CountingDB(ROWS)
+
+    @contextlib.asynccontextmanager
+    async def fake_ctx():
+        yield db
+
+    mod = types.ModuleType("db_compat")
+    mod.get_compat_db = fake_ctx
+    monkeypatch.setitem(sys.modules, "db_compat", mod)
+    monkeypatch.setattr(voice_tts, "_SPEAKER_PROFILES", ProfileIndex(ttl_s=0))
+    monkeypatch.setenv("ZOE_SPEAKER_ID_THRESHOLD", "0.9")
+    return db
+
+
+def _identify(emb):
+    payload = {"embedding_base64": base64.b64encode(emb).decode(), "top_k": 2}
+    return voice_tts.voice_identify(payload, caller={"source": "device"})
+
+
+@pytest.mark.asyncio
+async def test_identify_reads_profiles_once_until_invalidated(fake_profiles):
+    out = await _identify(_emb(2))
+    assert out["identified"] is True and out["user_id"] == "user-2"
+    assert len(out["candidates"]) == 2 and out["candidates"][0]["profile_id"] == "pid-2"
+
+    out = await _identify(_emb(4))
+    assert out["user_id"] == "user-4"
+    assert fake_profiles.selects == 1  # served from the resident matrix
+
+    voice_tts._SPEAKER_PROFILES.invalidate()
+    await _identify(_emb(4))
+    assert fake_profiles.selects == 2
+
+
+@pytest.mark.asyncio
+async def test_identify_below_threshold_reports_best_confidence(fake_profiles):
+    out = await _identify(_emb(99))
+    assert out["identified"] is False
+    assert out["best_confidence"] == out["candidates"][0]["confidence"]
+    assert out["threshold"] == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_identify_truncated_embedding_is_unidentified_not_an_error(fake_profiles):
+    out = await _identify(_emb(2)[:-1])  # 63 bytes: not whole float32s
+    assert out["identified"] is False and out["best_confidence"] == 0.0
+    assert out["candidates"] == []
+
+
+@pytest.mark.asyncio
+async def test_identify_with_only_incomparable_profiles_is_a_plain_non_match(fake_profiles):
+    fake_profiles.rows = [("pid-a", "a", "A", _emb(1, dim=8)[:-1]), ("pid-b", "b", "B", None)]
+    out = await _identify(_emb(2))
+    assert "reason" not in out
+    assert out["identified"] is False and out["best_confidence"] == 0.0
+
+    fake_profiles.rows = []
+    voice_tts._SPEAKER_PROFILES.invalidate()
+    assert (await _identify(_emb(2)))["reason"] == "no_profiles"
@@ -0,0 +1,123 @@
+"""Streaming STT (ZOE_VOICE_STREAMING_STT): segments cut at pauses, tail-only finalize."""
+import asyncio
+
+import pytest
+
+import routers.voice_livekit as v
+import voice_stream_stt
+from voice_stream_stt import UtteranceStream
+
+pytestmark = pytest.mark.ci_safe
+
+_FRAME = b"\x01\x00" * 320  # 20 ms of 16 kHz int16
+
+
+class _Recorder:
+    def __init__(self, fail_on: int = -1):
+        self.calls = []
+        self._fail_on = fail_on
+
+    async def __call__(self, frames):
+        self.calls.append(list(frames))
+        if len(self.calls) - 1 == self._fail_on:
+            raise RuntimeError("moonshine OOM")
+        return f"part{len(self.calls)}"
+
+
+def _feed(stream, frames, silence_counts):
+    for count in silence_counts:
+        frames.append(_FRAME)
+        stream.observe(count)
+
+
+@pytest.fixture
+def voice_tts_stubs(monkeypatch):
+    full, captured = [], []
+
+    async def transcribe_pcm(pcm, sample_rate=16000, capture=True):
+        full.append(len(pcm))
+        return "one pass"
+
+    async def capture_stt(wav_path, primary, *, pcm=None, sample_rate=16000):
+        captured.append((primary, len(pcm)))
+
+    monkeypatch.setattr("routers.voice_tts._transcribe_pcm", transcribe_pcm)
+    monkeypatch.setattr("routers.voice_tts._maybe_capture_stt", capture_stt)
+    return full, captured
+
+
+async def test_segments_cut_at_pauses_and_only_the_tail_is_finalized(voice_tts_stubs):
+    full, captured = voice_tts_stubs
+    frames, rec = [], _Recorder()
+    stream = UtteranceStream(frames, transcribe=rec, min_segment_s=1.0, pause_hops=3)
+
+    _feed(stream, frames, [0] * 30 + [1, 2])  # 0.6 s of speech, short pause: no cut
+    _feed(stream, frames, [0] * 25 + [1, 2, 3])  # 1.1 s voiced since start, pause: cut
+    assert stream.committed == len(frames) == 60 and len(stream.segments) == 1
+    _feed(stream, frames, [0] * 10 + [1, 2, 3, 4, 5])  # tail: too short to cut
+
+    assert await stream.finalize(list(frames)) == "part1 part2"
+    assert [len(c) for c in rec.calls] == [60, 15]
+    assert full == [] and captured == [("part1 part2", 75)]
+
+
+async def test_silent_tail_after_a_cut_is_not_transcribed(voice_tts_stubs):
+    frames, rec = [], _Recorder()
+    stream = UtteranceStream(frames, transcribe=rec, min_segment_s=0.5, pause_hops=2)
+    _feed(stream, frames, [0] * 30 + list(range(1, 21)))
+
+    assert await stream.finalize(list(frames)) == "part1"
+    assert len(rec.calls) == 1
+
+
+async def test_failed_segment_falls_back_to_one_pass(voice_tts_stubs):
+    full, captured = voice_tts_stubs
+    frames, rec = [], _Recorder(fail_on=0)
+    stream = UtteranceStream(frames, transcribe=rec, min_segment_s=0.5, pause_hops=2)
+    _feed(stream, frames, [0] * 30 + [1, 2] + [0] * 10)
+
+    assert await stream.finalize(list(frames)) == "one pass"
+    assert full == [42] and captured == []
+
+
+async def test_end_turn_hands_the_stream_to_the_pipeline(monkeypatch):
+    monkeypatch.setenv("ZOE_VOICE_STREAMING_STT", "1")
+    monkeypatch.setenv("ZOE_VOICE_STREAMING_STT_MIN_S", "0.5")
+    monkeypatch.setenv("ZOE_VOICE_STREAMING_STT_PAUSE_HOPS", "2")
+    segment_started = asyncio.Event()
+
+    async def segment(frames):
+        segment_started.set()
+        return "hello"
+
+    monkeypatch.setattr(voice_stream_stt, "_moonshine_segment", segment)
+    handed = []
+
+    async def fake_pipeline(local_participant, frames, user_id, session_id):
+        handed.append(frames)
+
+    monkeypatch.setattr(v, "_run_pipeline", fake_pipeline)
+    ps = v._make_participant_state("sid-stream")
+    ps["state"] = v._ParticipantState.LISTENING
+    for count in [0] * 30 + [1, 2]:
+        ps["frames"].append(_FRAME)
+        ps["silence_count"] = count
+        voice_stream_stt.observe(ps)
+    await segment_started.wait()
+
+    v._end_turn("sid-stream", ps, local_participant=None)
+    await ps["pipeline_task"]
+
+    assert handed[0].stt_stream.committed == 32 and len(handed[0]) == 32
+    assert "stt_stream" not in ps and ps["frames"] == []
+
+
+async def test_flag_off_keeps_the_plain_snapshot(monkeypatch):
+    monkeypatch.delenv("ZOE_VOICE_STREAMING_STT", raising=False)
+    ps = v._make_participant_state("sid-plain")
+    for _ in range(40):
+        ps["frames"].append(_FRAME)
+        voice_stream_stt.observe(ps)
+
+    snap = voice_stream_stt.snapshot(ps, ps["frames"])
+    assert type(snap) is list and len(snap) == 40 and "stt_stream" not in ps
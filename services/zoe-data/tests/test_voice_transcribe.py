@@ -585,3 +585,54 @@ def test_maybe_capture_stt_saves_corpus_without_whisper_ab(monkeypatch, tmp_path
     saved = list(sample_dir.glob("*.wav"))
     assert len(saved) == 1  # corpus capture kept
     assert spawned == []  # no background whisper A/B scheduled
+
+
+def test_pcm_frames_match_the_wav_file_path_sample_for_sample(tmp_path):
+    """The in-memory path must hand Moonshine exactly what the WAV path did —
+    any per-sample edit regresses real-corpus clips (see _prepare_audio...)."""
+    import wave
+    import numpy as np
+    from routers import voice_tts
+
+    pcm = (np.sin(np.linspace(0, 300, 4000)) * 20000).astype("<i2")
+    pcm[:3] = [-32768, 32767, 0]
+    frames = [pcm[i:i + 320].tobytes() for i in range(0, pcm.size, 320)]
+    wav = tmp_path / "utt.wav"
+    with wave.open(str(wav), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"".join(frames))
+    with wave.open(str(wav), "rb") as wf:
+        from_file = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+    from_frames = voice_tts._pcm16_to_float32(frames)
+
+    assert from_frames.dtype == np.float32
+    assert np.array_equal(from_frames, from_file)
+    assert np.array_equal(voice_tts._pcm16_to_float32(b"".join(frames)), from_file)
+
+
+def test_transcribe_pcm_runs_moonshine_without_a_temp_file(monkeypatch, tmp_path):
+    import types
+    from routers import voice_tts
+
+    seen = {}
+
+    class _Tr:
+        def transcribe_without_streaming(self, audio, sr):
+            seen["n"], seen["sr"] = len(audio), sr
+            return types.SimpleNamespace(lines=[types.SimpleNamespace(text="Hey Zoe."),
+                                                types.SimpleNamespace(text="Lights off.")])
+
+    monkeypatch.setattr(voice_tts, "_ensure_moonshine", lambda: _Tr())
+    monkeypatch.setattr(voice_tts.tempfile, "NamedTemporaryFile", None)  # any temp file would crash
+    monkeypatch.setenv("ZOE_VOICE_SAVE_AUDIO", "1")
+    monkeypatch.setenv("ZOE_VOICE_SAMPLE_DIR", str(tmp_path))
+
+    text = asyncio.run(voice_tts._transcribe_pcm([b"\x01\x00" * 160, b"\x02\x00" * 160]))
+
+    assert text and "zoe" not in text.lower()
+    assert seen == {"n": 320, "sr": 16000}
+    saved = list(tmp_path.glob("*.wav"))  # corpus capture still writes a WAV
+    assert len(saved) == 1 and saved[0].stat().st_size == 44 + 640
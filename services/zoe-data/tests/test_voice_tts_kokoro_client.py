@@ -8,15 +8,16 @@ re-open one once it's been closed.
 import pytest
 import asyncio
 
+import http_clients
 import tts_waterfall as v
 
 pytestmark = pytest.mark.ci_safe
 
 
 def test_client_is_reused_across_calls(monkeypatch):
-    # monkeypatch.setattr (not direct assignment) so the singleton is restored on
+    # monkeypatch.setattr (not direct assignment) so the registry is restored on
     # teardown and a live client isn't leaked into other test files.
-    monkeypatch.setattr(v, "_KOKORO_HTTP", None)
+    monkeypatch.setattr(http_clients, "_clients", {})
     c1 = v._kokoro_http_client()
     c2 = v._kokoro_http_client()
     assert c1 is c2, "sidecar client should be pooled, not recreated per sentence"
@@ -25,7 +26,7 @@ def test_client_is_reused_across_calls(monkeypatch):
 
 
 def test_client_reopened_after_close(monkeypatch):
-    monkeypatch.setattr(v, "_KOKORO_HTTP", None)
+    monkeypatch.setattr(http_clients, "_clients", {})
     c1 = v._kokoro_http_client()
     asyncio.run(c1.aclose())
     c2 = v._kokoro_http_client()
@@ -0,0 +1,116 @@
+"""Weather cache: single-flight fetches, stale-while-revalidate, persistence.
+
+The provider fetchers are replaced with counting fakes that write the keyed
+cache the way the real ones do; no network.
+"""
+import asyncio
+import time
+
+import pytest
+
+from routers import weather
+
+pytestmark = pytest.mark.ci_safe
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    monkeypatch.setattr(weather, "_weather_cache", {})
+    monkeypatch.setattr(weather, "_weather_inflight", {})
+    monkeypatch.setattr(weather, "OPENWEATHERMAP_API_KEY", "")
+    calls = []
+    gate = asyncio.Event()
+    gate.set()
+
+    async def fetch_current(lat, lon, city, country):
+        calls.append(("current", lat, lon))
+        await gate.wait()
+        reading = {"temp": 20 + len(calls), "city": city}
+        weather._cache_put("current", lat, lon, reading)
+        return reading
+
+    async def fetch_forecast(lat, lon):
+        calls.append(("forecast", lat, lon))
+        reading = {"hourly": [], "daily": []}
+        weather._cache_put("forecast", lat, lon, reading)
+        return reading
+
+    monkeypatch.setattr(weather, "_fetch_openmeteo_current", fetch_current)
+    monkeypatch.setattr(weather, "_fetch_openmeteo_forecast", fetch_forecast)
+    return calls, gate
+
+
+def _age(kind, lat, lon, seconds):
+    weather._weather_cache[weather._ckey(kind, lat, lon)]["ts"] = time.monotonic() - seconds
+
+
+async def test_concurrent_misses_share_one_provider_fetch(fake_provider):
+    calls, gate = fake_provider
+    gate.clear()
+    waiters = [asyncio.create_task(weather._get_current(1.0, 2.0, "Perth", "AU")) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    results = await asyncio.gather(*waiters)
+
+    assert calls == [("current", 1.0, 2.0)]
+    assert all(r is results[0] for r in results)
+    assert weather._weather_inflight == {}
+
+
+async def test_expired_reading_is_served_while_it_revalidates(fake_provider, monkeypatch):
+    calls, _ = fake_provider
+    monkeypatch.setenv("ZOE_WEATHER_STALE_MAX_S", "3600")
+    weather._cache_put("current", 1.0, 2.0, {"temp": 9})
+    _age("current", 1.0, 2.0, weather._WEATHER_TTL_S + 5)
+
+    assert await weather._get_current(1.0, 2.0, "Perth", "AU") == {"temp": 9}
+    await asyncio.sleep(0)
+
+    assert calls == [("current", 1.0, 2.0)]
+    assert (await weather._get_current(1.0, 2.0, "Perth", "AU"))["temp"] == 21
+    assert len(calls) == 1
+
+
+async def test_reading_past_stale_max_waits_for_the_provider(fake_provider, monkeypatch):
+    calls, _ = fake_provider
+    monkeypatch.setenv("ZOE_WEATHER_STALE_MAX_S", "900")
+    weather._cache_put("current", 1.0, 2.0, {"temp": 9})
+    _age("current", 1.0, 2.0, 1000)
+
+    assert (await weather._get_current(1.0, 2.0, "Perth", "AU"))["temp"] == 21
+    assert len(calls) == 1
+
+
+async def test_household_refresh_only_touches_due_readings(fake_provider, monkeypatch):
+    calls, _ = fake_provider
+    monkeypatch.setenv("ZOE_WEATHER_REFRESH_LEAD_S", "60")
+
+    async def locations():
+        return [(1.0, 2.0, "Home", "AU"), (3.0, 4.0, "Nan's", "AU")]
+
+    monkeypatch.setattr(weather, "_household_locations", locations)
+    weather._cache_put("current", 1.0, 2.0, {"temp": 1})
+    weather._cache_put("forecast", 1.0, 2.0, {"hourly": []})
+    _age("forecast", 1.0, 2.0, weather._WEATHER_TTL_S - 30)  # inside the lead window
+
+    assert await weather.refresh_household_weather() == 3
+    assert sorted(calls) == [("current", 3.0, 4.0), ("forecast", 1.0, 2.0), ("forecast", 3.0, 4.0)]
+
+
+async def test_persisted_readings_survive_a_restart_with_their_age(fake_provider, monkeypatch, tmp_path):
+    monkeypatch.setenv("ZOE_WEATHER_CACHE_PATH", str(tmp_path / "weather.json"))
+    weather._cache_put("current", 1.0, 2.0, {"temp": 17})
+    weather._weather_cache[weather._ckey("current", 1.0, 2.0)]["wall"] -= 120
+    assert await weather.flush_weather_cache() is True
+    assert await weather.flush_weather_cache() is False  # nothing new since
+
+    monkeypatch.setattr(weather, "_weather_cache", {})
+    assert weather.load_weather_cache() == 1
+
+    entry = weather._weather_cache[weather._ckey("current", 1.0, 2.0)]
+    assert entry["data"] == {"temp": 17}
+    assert 119 <= time.monotonic() - entry["ts"] < 125
+    (tmp_path / "weather.json").write_text("{not json")
+    monkeypatch.setattr(weather, "_weather_cache", {})
+    assert weather.load_weather_cache() == 0
@@ -101,7 +101,7 @@ async def test_openweather_forecast_filters_by_remote_location_timezone(monkeypa
         async def get(self, *args, **kwargs):
             return FakeResponse()
 
-    monkeypatch.setattr(weather.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr(weather.http_clients.httpx, "AsyncClient", FakeClient)
 
     forecast = await weather._fetch_owm_forecast(-31.95, 115.86)
 
@@ -143,7 +143,7 @@ async def test_openweather_forecast_bad_provider_timezone_keeps_valid_rows(monke
         async def get(self, *args, **kwargs):
             return FakeResponse()
 
-    monkeypatch.setattr(weather.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr(weather.http_clients.httpx, "AsyncClient", FakeClient)
 
     forecast = await weather._fetch_owm_forecast(-31.95, 115.86)
 
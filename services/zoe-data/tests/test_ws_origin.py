@@ -210,6 +210,8 @@ def test_authenticated_ws_accepts_allowed_origin(client, monkeypatch):
         headers={"origin": "https://zoe.local", "X-Session-ID": "sess-1"},
     ) as ws:
         # Successful accept emits the broadcaster handshake frame for the channel.
-        assert ws.receive_json() == {"type": "connected", "channel": "lists", "sequence": 0}
+        assert ws.receive_json() == {
+            "type": "connected", "channel": "lists", "sequence": 0, "epoch": _bc.epoch,
+        }
         ws.send_text("ping")
         assert ws.receive_json() == {"type": "pong"}
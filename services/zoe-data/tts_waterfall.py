@@ -25,6 +25,7 @@ from typing import Any, Optional
 
 import httpx
 
+import http_clients
 import voice_settings
 
 logger = logging.getLogger(__name__)
@@ -231,18 +232,10 @@ def _clean_for_speech(text: str) -> str:
 # Pooled client for the Kokoro sidecar, reused across sentences so each spoken
 # sentence doesn't pay a fresh TCP/connection setup (the sidecar is hit once per
 # sentence on the streaming voice path — per-call AsyncClient added fixed latency
-# to every inter-sentence boundary).
-_KOKORO_HTTP: "Optional[httpx.AsyncClient]" = None
-
-
+# to every inter-sentence boundary). The client itself is the "kokoro" entry in
+# the process-wide http_clients registry, which owns its limits and lifecycle.
 def _kokoro_http_client() -> "httpx.AsyncClient":
-    global _KOKORO_HTTP
-    if _KOKORO_HTTP is None or _KOKORO_HTTP.is_closed:
-        _KOKORO_HTTP = httpx.AsyncClient(
-            timeout=15.0,
-            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
-        )
-    return _KOKORO_HTTP
+    return http_clients.get_client("kokoro")
 
 
 async def _synthesize_kokoro_sidecar(text: str, voice: Optional[str] = None) -> Optional[bytes]:
@@ -290,14 +283,8 @@ async def _synthesize_kokoro_sidecar(text: str, voice: Optional[str] = None) ->
         # per-call `async with` did, so a timed-out / reset connection would be
         # re-checked-out for the next sentence and fail again. Recycle the pooled
         # client so the next call reconnects cleanly.
-        global _KOKORO_HTTP
         logger.debug("kokoro-sidecar transport error, recycling pooled client: %s", exc)
-        try:
-            if _KOKORO_HTTP is not None:
-                await _KOKORO_HTTP.aclose()
-        except Exception:
-            pass
-        _KOKORO_HTTP = None
+        await http_clients.recycle("kokoro", client)
         return None
     except Exception as exc:
         logger.debug("kokoro-sidecar unavailable: %s", exc)
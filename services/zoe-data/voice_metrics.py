@@ -10,7 +10,7 @@ All metrics share the same ``REGISTRY`` as ``memory_metrics`` so the existing
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 from memory_metrics import REGISTRY
 
@@ -56,6 +56,22 @@ voice_failure_reason_count = Counter(
     registry=REGISTRY,
 )
 
+speaker_id_identify_seconds = Histogram(
+    "zoe_speaker_id_identify_seconds",
+    "Server-side /api/voice/identify latency (seconds), labelled by query "
+    "source: embedding (panel-computed) or audio (encoded here).",
+    ["source"],
+    buckets=(0.001, 0.0025, 0.005, 0.010, 0.025, 0.050, 0.100, 0.250,
+             0.500, 1.0, 2.0, 5.0),
+    registry=REGISTRY,
+)
+
+speaker_id_encoder_load_seconds = Gauge(
+    "zoe_speaker_id_encoder_load_seconds",
+    "Time (seconds) the resident resemblyzer encoder took to load.",
+    registry=REGISTRY,
+)
+
 
 __all__ = [
     "voice_stage_seconds",
@@ -63,4 +79,6 @@ __all__ = [
     "voice_intent_hit_count",
     "voice_identity_source_count",
     "voice_failure_reason_count",
+    "speaker_id_identify_seconds",
+    "speaker_id_encoder_load_seconds",
 ]
@@ -1,9 +1,61 @@
+"""Server-side speaker identification: resident encoder + profile matrix.
+
+* One ``resemblyzer.VoiceEncoder`` per process, loaded on first use and run on
+  a dedicated single-thread executor (:func:`run_encoder`) so the model is
+  never rebuilt per request and never blocks the event loop.
+* :data:`PROFILE_INDEX` keeps the consented ``speaker_profiles`` embeddings as
+  one L2-normalized float32 matrix. ``/api/voice/identify`` reloads it only
+  after :meth:`ProfileIndex.invalidate` (enroll / delete) or when the TTL
+  lapses, and scores every profile with a single matrix-vector product.
+
+Identify latency and encoder load time are exported via ``voice_metrics``.
+"""
+import asyncio
 import logging
-from typing import Optional
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Sequence
 
 
 logger = logging.getLogger(__name__)
 
+_ENCODER: Any = None
+_ENCODER_LOCK = threading.Lock()
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+DEFAULT_PROFILE_TTL_S = 300.0
+DEFAULT_TOP_K = 3
+
+
+def _record_encoder_load(seconds: float) -> None:
+    try:
+        from voice_metrics import speaker_id_encoder_load_seconds
+
+        speaker_id_encoder_load_seconds.set(seconds)
+    except Exception:
+        pass
+
+
+def _get_encoder():
+    """The process-wide VoiceEncoder (raises ImportError without resemblyzer)."""
+    global _ENCODER
+    if _ENCODER is not None:
+        return _ENCODER
+    with _ENCODER_LOCK:
+        if _ENCODER is None:
+            from resemblyzer import VoiceEncoder  # type: ignore
+
+            t0 = time.perf_counter()
+            _ENCODER = VoiceEncoder()
+            elapsed = time.perf_counter() - t0
+            _record_encoder_load(elapsed)
+            logger.info("speaker-id: resemblyzer encoder loaded in %.2fs", elapsed)
+    return _ENCODER
+
 
 def _compute_resemblyzer_embedding(wav_path: str) -> Optional[bytes]:
     """Compute a 256-dim resemblyzer voice embedding from a WAV file.
@@ -11,9 +63,9 @@ def _compute_resemblyzer_embedding(wav_path: str) -> Optional[bytes]:
     Returns raw float32 bytes or None if resemblyzer is not installed.
     """
     try:
-        from resemblyzer import VoiceEncoder, preprocess_wav  # type: ignore
+        from resemblyzer import preprocess_wav  # type: ignore
         import numpy as np
-        encoder = VoiceEncoder()
+        encoder = _get_encoder()
         wav = preprocess_wav(wav_path)
         embedding = encoder.embed_utterance(wav)  # shape: (256,)
         return embedding.astype(np.float32).tobytes()
@@ -25,6 +77,22 @@ def _compute_resemblyzer_embedding(wav_path: str) -> Optional[bytes]:
         return None
 
 
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                # One worker: the encoder is not re-entrant and a single warm
+                # model serialises cheaply; callers queue instead of reloading.
+                _EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speaker-id")
+    return _EXECUTOR
+
+
+async def run_encoder(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` on the speaker-ID encoder thread."""
+    return await asyncio.get_running_loop().run_in_executor(_executor(), fn, *args)
+
+
 def _cosine_similarity(a: bytes, b: bytes) -> float:
     """Cosine similarity between two float32 byte blobs."""
     try:
@@ -38,3 +106,108 @@ def _cosine_similarity(a: bytes, b: bytes) -> float:
         return float(np.dot(va, vb) / (na * nb))
     except Exception:
         return 0.0
+
+
+class ProfileIndex:
+    """Consented speaker profiles as an L2-normalized ``(n, dim)`` matrix.
+
+    ``load`` is handed the ``(id, user_id, display_name, embedding_blob)`` rows
+    together with the :attr:`generation` read before the query; a load that
+    raced an :meth:`invalidate` is discarded so a stale snapshot never sticks.
+    """
+
+    def __init__(self, ttl_s: Optional[float] = None):
+        if ttl_s is None:
+            try:
+                ttl_s = float(os.environ.get("ZOE_SPEAKER_PROFILE_CACHE_TTL_S", DEFAULT_PROFILE_TTL_S))
+            except ValueError:
+                ttl_s = DEFAULT_PROFILE_TTL_S
+        self.ttl_s = ttl_s
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._matrix = None
+        self._meta: list[tuple] = []
+        # Consented profiles in the last load, comparable or not: only zero
+        # means "no_profiles"; the rest just never match.
+        self.enrolled = 0
+
+    @property
+    def fresh(self) -> bool:
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            return False
+        return self.ttl_s <= 0 or time.monotonic() - loaded_at < self.ttl_s
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._loaded_at = None
+
+    def load(self, rows: Iterable[Sequence[Any]], generation: int) -> bool:
+        """Replace the snapshot; False (and no-op) if invalidated meanwhile."""
+        import numpy as np
+
+        rows = list(rows)
+        enrolled = len(rows)
+        rows = [r for r in rows if r[3] and len(bytes(r[3])) % 4 == 0]
+        # Embeddings of a foreign width (older model, corrupt blob) can't share
+        # the matrix; they scored 0.0 under the per-row loop, so drop them.
+        dims = Counter(len(bytes(r[3])) // 4 for r in rows)
+        dim = dims.most_common(1)[0][0] if dims else 0
+        kept = [r for r in rows if len(bytes(r[3])) // 4 == dim and dim > 0]
+        if len(kept) != len(rows):
+            logger.warning("speaker-id: skipped %d profile(s) with embedding dim != %d",
+                           len(rows) - len(kept), dim)
+        if kept:
+            M = np.stack([np.frombuffer(bytes(r[3]), dtype=np.float32) for r in kept])
+            M = M / (np.linalg.norm(M, axis=1, keepdims=True) + 1e-9)
+            M = M.astype(np.float32)
+        else:
+            M = np.zeros((0, dim), dtype=np.float32)
+        M.setflags(write=False)
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._matrix = M
+            self._meta = [(r[0], r[1], r[2]) for r in kept]
+            self.enrolled = enrolled
+            self._loaded_at = time.monotonic()
+        return True
+
+    def top_k(self, query: bytes, k: int = DEFAULT_TOP_K) -> list[dict]:
+        """Best ``k`` profiles for ``query`` by cosine similarity, descending."""
+        import numpy as np
+
+        with self._lock:
+            M, meta = self._matrix, self._meta
+        if M is None or not meta:
+            return []
+        if len(query) % 4:
+            logger.warning("speaker-id: query is %d bytes, not whole float32s", len(query))
+            return []
+        q = np.frombuffer(query, dtype=np.float32)
+        if q.shape[0] != M.shape[1]:
+            logger.warning("speaker-id: query dim %d != profile dim %d", q.shape[0], M.shape[1])
+            return []
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return []
+        scores = M @ (q / norm)
+        k = max(1, min(int(k), len(meta)))
+        if k < len(meta):
+            idx = np.argpartition(-scores, k - 1)[:k]
+            idx = idx[np.argsort(-scores[idx], kind="stable")]
+        else:
+            idx = np.argsort(-scores, kind="stable")
+        return [
+            {"profile_id": meta[i][0], "user_id": meta[i][1],
+             "display_name": meta[i][2], "score": float(scores[i])}
+            for i in idx.tolist()
+        ]
+
+
+PROFILE_INDEX = ProfileIndex()
@@ -0,0 +1,174 @@
+"""Incremental (streaming) STT for LiveKit turns — flag-gated, default OFF.
+
+Today Moonshine only runs once ``_end_turn`` has decided the speaker stopped,
+so the whole transcription cost of the utterance lands after end-of-speech.
+With ``ZOE_VOICE_STREAMING_STT=1`` the LISTENING branch of the LiveKit frame
+loop hands each frame to an ``UtteranceStream``. Whenever the speaker pauses
+(``silence_count`` reaches ``ZOE_VOICE_STREAMING_STT_PAUSE_HOPS``, default 8 —
+well short of the 20-hop end-of-speech window) and at least ``ZOE_VOICE_STREAMING_STT_MIN_S`` of
+voiced audio has accumulated since the last cut, the audio up to that pause is
+transcribed in the background. At end-of-turn only the tail after the last cut
+is left to transcribe; the segment texts are joined in order.
+
+Segments are only ever cut inside a VAD pause, never on a timer, so a word is
+not split across two Moonshine calls. If any segment fails the whole utterance
+is re-transcribed in one pass, so streaming can only change *when* the text is
+ready, never lose it. Corpus capture (``ZOE_VOICE_SAVE_AUDIO``) still saves the
+whole utterance once, against the joined transcript.
+
+A stream is bound to the live ``ps["frames"]`` list by identity: every reset
+(noise discard, barge-in, PTT) swaps that list, which is how a stale stream is
+detected and its segment tasks cancelled.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from typed_env import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_BYTES_PER_S = 32000  # 16 kHz mono int16
+
+Transcriber = Callable[[list], Awaitable[str]]
+
+
+def enabled() -> bool:
+    """ZOE_VOICE_STREAMING_STT — read per frame like the other voice opt-ins."""
+    return env_bool("ZOE_VOICE_STREAMING_STT", False)
+
+
+def _min_segment_s() -> float:
+    return max(0.5, env_float("ZOE_VOICE_STREAMING_STT_MIN_S", 1.5))
+
+
+def _pause_hops() -> int:
+    return max(1, env_int("ZOE_VOICE_STREAMING_STT_PAUSE_HOPS", 8))
+
+
+async def _moonshine_segment(frames: list) -> str:
+    from routers.voice_tts import _transcribe_pcm
+
+    return await _transcribe_pcm(frames, capture=False)
+
+
+class Utterance(list):
+    """A turn's frames, plus the stream that already transcribed part of them.
+
+    A plain list to everything else, so ``_run_pipeline``'s signature (and
+    every caller and test double of it) is unchanged.
+    """
+
+    def __init__(self, frames, stream: "UtteranceStream") -> None:
+        super().__init__(frames)
+        self.stt_stream = stream
+
+
+class UtteranceStream:
+    """Background transcription of one utterance, cut at intra-turn pauses."""
+
+    def __init__(
+        self,
+        frames: list,
+        *,
+        transcribe: Optional[Transcriber] = None,
+        min_segment_s: Optional[float] = None,
+        pause_hops: Optional[int] = None,
+    ) -> None:
+        self.frames = frames
+        self._transcribe = transcribe or _moonshine_segment
+        self._min_bytes = int((min_segment_s if min_segment_s is not None else _min_segment_s()) * _BYTES_PER_S)
+        self._pause_hops = pause_hops if pause_hops is not None else _pause_hops()
+        self.committed = 0  # frames[:committed] belong to a segment already
+        self._voiced_bytes = 0  # voiced audio since the last cut
+        self.segments: list[asyncio.Task] = []
+
+    def bound_to(self, frames: list) -> bool:
+        return self.frames is frames
+
+    def observe(self, silence_count: int) -> None:
+        """Call after each LISTENING frame is appended, with the latest VAD
+        verdict; starts a segment when the speaker pauses after enough speech."""
+        if silence_count == 0 and self.frames:
+            self._voiced_bytes += len(self.frames[-1])
+            return
+        if silence_count < self._pause_hops or self._voiced_bytes < self._min_bytes:
+            return
+        cut = len(self.frames)
+        segment = self.frames[self.committed:cut]
+        self.committed = cut
+        self._voiced_bytes = 0
+        self.segments.append(asyncio.ensure_future(self._transcribe(segment)))
+        logger.debug("streaming STT: segment %d started (%d frames)", len(self.segments), len(segment))
+
+    def pending_tail(self, frames: list) -> list:
+        """What ``finalize`` still has to transcribe after the last cut. Once a
+        cut has happened, a tail with no voiced frame is just the end-of-speech
+        silence window, so there is nothing left."""
+        tail = frames[self.committed:]
+        if self.segments and not self._voiced_bytes:
+            return []
+        return tail
+
+    def cancel(self) -> None:
+        for task in self.segments:
+            task.cancel()
+
+    async def finalize(self, frames: list) -> str:
+        """Transcript of ``frames``: finished segments + the un-cut tail.
+
+        Raises like ``_transcribe_pcm`` only when the one-pass fallback does."""
+        from routers.voice_tts import _maybe_capture_stt, _transcribe_pcm
+
+        text = None
+        try:
+            parts = await asyncio.gather(*self.segments)
+            tail = self.pending_tail(frames)
+            if tail:
+                parts.append(await self._transcribe(tail))
+            text = " ".join(p.strip() for p in parts if p and p.strip())
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        except Exception as exc:
+            self.cancel()
+            logger.warning("streaming STT: segment failed (%s) — re-transcribing whole utterance", exc)
+        if text is None:
+            return await _transcribe_pcm(frames)
+        await _maybe_capture_stt(None, text, pcm=frames)
+        return text
+
+
+def take(ps: dict) -> Optional[UtteranceStream]:
+    """Detach the participant's stream for the utterance being ended (None if
+    streaming is off or the stream is stale)."""
+    stream = ps.pop("stt_stream", None)
+    if stream is None:
+        return None
+    if not stream.bound_to(ps.get("frames")):
+        stream.cancel()
+        return None
+    return stream
+
+
+def observe(ps: dict) -> None:
+    """LISTENING-frame hook: (re)bind the participant's stream and feed it."""
+    if not enabled():
+        return
+    stream = ps.get("stt_stream")
+    if stream is None or not stream.bound_to(ps["frames"]):
+        if stream is not None:
+            stream.cancel()
+        stream = ps["stt_stream"] = UtteranceStream(ps["frames"])
+    stream.observe(ps.get("silence_count", 0))
+
+
+def snapshot(ps: dict, frames: list) -> list:
+    """The end-of-turn frame snapshot, carrying the stream when it cut at least
+    one segment (a short turn takes the ordinary one-pass path)."""
+    stream = take(ps)
+    if stream is None or not stream.segments:
+        return list(frames)
+    return Utterance(frames, stream)
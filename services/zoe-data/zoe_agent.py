@@ -40,6 +40,7 @@ os.environ.setdefault("ORT_DISABLE_GPU", "1")
 
 import httpx
 
+import http_clients
 from agent_safety import CommandRejected, check_bash_command, guard_browser_page, is_public_url
 from typed_env import env_int, env_str
 
@@ -1688,7 +1689,7 @@ async def _context_enhance(message: str, portrait: str, user_id: str) -> str:
             "temperature": 0.5,
             "stream": False,
         }
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with http_clients.session("llm", timeout=15.0) as client:
             resp = await client.post(url, json=payload)
             resp.raise_for_status()
             text = (
@@ -1711,7 +1712,7 @@ async def _ha_control(entity_id: str, action: str, data: dict | None = None) ->
     """Call /devices/control on the HA bridge."""
     body = {"entity_id": entity_id, "action": action, "data": data or {}}
     try:
-        async with httpx.AsyncClient(timeout=_TOOL_TIMEOUT) as client:
+        async with http_clients.session("home_assistant", timeout=_TOOL_TIMEOUT) as client:
             r = await client.post(f"{_HA_BRIDGE}/devices/control", json=body)
             r.raise_for_status()
             return r.json()
@@ -3150,7 +3151,7 @@ async def _dispatch_tool(tool_name: str, args: dict, user_id: str = "guest") ->
 
     if tool_name == "list_openclaw_plugins":
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
+            async with http_clients.session("loopback", timeout=5) as client:
                 base_url = _zoe_base_url()
                 r = await client.get(f"{base_url}/api/openclaw/plugins")
                 plugin_data = r.json() if r.status_code == 200 else {"plugins": []}
@@ -3164,7 +3165,7 @@ async def _dispatch_tool(tool_name: str, args: dict, user_id: str = "guest") ->
 
     if tool_name == "list_openclaw_skills":
         try:
-            async with httpx.AsyncClient(timeout=8) as client:
+            async with http_clients.session("loopback", timeout=8) as client:
                 base_url = _zoe_base_url()
                 r = await client.get(f"{base_url}/api/openclaw/skills")
                 skill_data = r.json() if r.status_code == 200 else {"skills": []}
@@ -3485,9 +3486,9 @@ async def warmup_kv_cache() -> None:
     system prompt). After warmup, the prompt tokens are cached and subsequent queries
     only pay for their unique user message tokens (~1s vs ~2s for uncached first query).
 
-    Called from the zoe-data startup lifespan event.
+    Called from the zoe-data startup lifespan event, which schedules it ~8s
+    after boot so Gemma can finish loading the 3.5GB model (~6s) first.
     """
-    await asyncio.sleep(8)  # Give Gemma time to finish loading the 3.5GB model (~6s)
     # Use the stable system prompt (no datetime/user) so the KV cache prefix is
     # byte-identical to what real chat turns will see. This is the key fix —
     # previously the warmup used _ZOE_SOUL (with dynamic datetime) which invalidated
@@ -3575,7 +3576,7 @@ async def _llm_call(
 
     effective_timeout = timeout_s if timeout_s is not None else _llm_timeout_s(voice_mode=False)
     _t0 = time.monotonic()
-    async with httpx.AsyncClient(timeout=effective_timeout) as client:
+    async with http_clients.session("llm", timeout=effective_timeout) as client:
         r = await client.post(url, json=payload)
         r.raise_for_status()
     _latency_ms = int((time.monotonic() - _t0) * 1000)
@@ -4268,7 +4269,7 @@ async def run_zoe_agent_streaming(
         streaming_tool_args_buf = ""
 
         try:
-            async with httpx.AsyncClient(timeout=_llm_timeout_s(voice_mode=voice_mode)) as client:
+            async with http_clients.session("llm", timeout=_llm_timeout_s(voice_mode=voice_mode)) as client:
                 async with client.stream("POST", url, json=payload) as resp:
                     resp.raise_for_status()
                     last_hb = time.monotonic()
@@ -193,6 +193,7 @@ async def test_tick_access_uses_update_not_upsert(svc):
     svc._fake.write_calls.clear()
 
     await svc.tick_access("u1", [ref.id], query="what does jason drink")
+    await svc.flush_access_ticks()
 
     methods = [c["method"] for c in svc._fake.write_calls]
     assert "update" in methods, "tick_access must write via col.update"
@@ -289,6 +290,7 @@ async def test_query_hashes_blob_is_bounded(svc):
     # Surface this memory under many distinct queries.
     for i in range(_MAX_QUERY_HASHES + 50):
         await svc.tick_access("u1", [ref.id], query=f"distinct query {i}")
+    await svc.flush_access_ticks()
 
     meta = svc._fake.rows[ref.id]["metadata"]
     stored = [h for h in (meta.get("_query_hashes") or "").split(",") if h]
@@ -308,6 +310,7 @@ async def test_unique_query_count_does_not_inflate_after_saturation(svc):
     # Fill the window exactly to the cap with distinct queries.
     for i in range(_MAX_QUERY_HASHES):
         await svc.tick_access("u1", [ref.id], query=f"q{i}")
+    await svc.flush_access_ticks()
     meta = svc._fake.rows[ref.id]["metadata"]
     assert meta["unique_query_count"] == _MAX_QUERY_HASHES
     assert len([h for h in meta["_query_hashes"].split(",") if h]) == _MAX_QUERY_HASHES
@@ -315,12 +318,14 @@ async def test_unique_query_count_does_not_inflate_after_saturation(svc):
     # A brand-new distinct query after saturation must not bump the count: the
     # window is full and we can no longer distinguish new from already-dropped.
     await svc.tick_access("u1", [ref.id], query="a totally new query")
+    await svc.flush_access_ticks()
     meta = svc._fake.rows[ref.id]["metadata"]
     assert meta["unique_query_count"] == _MAX_QUERY_HASHES, "saturated count must freeze"
 
     # Re-issuing one of the earliest queries (the kind the old sliding window would
     # have evicted and then re-counted) must also leave the count untouched.
     await svc.tick_access("u1", [ref.id], query="q0")
+    await svc.flush_access_ticks()
     meta = svc._fake.rows[ref.id]["metadata"]
     assert meta["unique_query_count"] == _MAX_QUERY_HASHES, "re-seen query must not re-count"
     # access_count keeps climbing even while the distinct-query signal is frozen.